@@ -9,7 +9,7 @@ celery_app = Celery(
     "github_repo_evaluator",
     broker=os.getenv("REDIS_URL", "redis://localhost:6379/0"),
     backend=os.getenv("REDIS_URL", "redis://localhost:6379/0"),
-    include=["app.tasks.scan_tasks"]
+    include=["app.tasks.scan_tasks", "app.tasks.analysis_tasks"]
 )
 
 # Celery configuration
@@ -24,9 +24,12 @@ celery_app.conf.update(
         "app.tasks.scan_tasks.scan_user_repositories": {"queue": "scan_queue"},
         "app.tasks.scan_tasks.scan_single_repository": {"queue": "scan_queue"},
         "app.tasks.scan_tasks.analyze_repository_content": {"queue": "analysis_queue"},
+        "app.tasks.analysis_tasks.*": {"queue": "analysis_queue"},
     },
     worker_prefetch_multiplier=1,
     task_acks_late=True,
+    # Requeue jobs whose worker died so deep analyses resume from their checkpoints
+    task_reject_on_worker_lost=True,
     worker_max_tasks_per_child=1000,
     task_time_limit=30 * 60,  # 30 minutes
     task_soft_time_limit=25 * 60,  # 25 minutes
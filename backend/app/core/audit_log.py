@@ -1,32 +1,190 @@
 """
 Audit Logging
 Logs sensitive operations for security and compliance
+
+Entries are buffered in a bounded ring and written to the audit_logs
+collection in batches (insert_many) by a background task, so audited
+requests never wait on a database round trip.
 """
 
+import asyncio
 import logging
+from collections import deque
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from app.core.config import settings
+
 logger = logging.getLogger(__name__)
 
+# Fraction of the buffer above which enqueues are counted as backpressure
+BACKPRESSURE_THRESHOLD = 0.8
+
 
 class AuditLogger:
     """
     Logs sensitive operations for audit trail
     
-    Stores audit logs in database for compliance and security monitoring
+    Stores audit logs in database for compliance and security monitoring.
+    Writes are fire-and-forget: entries are flushed when `batch_size` are
+    pending or every `flush_interval` seconds, and drained by `stop()`.
     """
     
-    def __init__(self, database: Optional[AsyncIOMotorDatabase] = None):
+    def __init__(
+        self,
+        database: Optional[AsyncIOMotorDatabase] = None,
+        buffer_size: int = 10000,
+        batch_size: int = 200,
+        flush_interval: float = 2.0
+    ):
         """
         Initialize audit logger
         
         Args:
             database: MongoDB database instance (optional)
+            buffer_size: Maximum pending entries; the oldest are dropped beyond it
+            batch_size: Pending entries that trigger an immediate flush (and insert_many size)
+            flush_interval: Maximum seconds an entry waits before being written
         """
         self.db = database
         self.logger = logger
+        self.buffer_size = buffer_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        
+        self._buffer: deque = deque(maxlen=buffer_size)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._stopping = False
+        
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.backpressure_events = 0
+        self.failed_writes = 0
+        self.batches = 0
+    
+    def start(self) -> None:
+        """Start the background flush task (must be called from a running event loop)"""
+        if self._flusher is not None and not self._flusher.done():
+            return
+        
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flusher = asyncio.create_task(self._flush_loop())
+    
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stop the flush task and write every pending entry
+        
+        Args:
+            timeout: Maximum seconds to wait for the final drain
+        """
+        self._stopping = True
+        if self._flusher is not None:
+            self._wakeup.set()
+            try:
+                await asyncio.wait_for(self._flusher, timeout=timeout)
+            except asyncio.TimeoutError:
+                self._flusher.cancel()
+                self.logger.warning("Audit log drain timed out with %d entries pending", len(self._buffer))
+            except Exception as e:
+                self.logger.error("Audit log flush task failed: %s", e)
+            self._flusher = None
+        
+        if self._buffer:
+            await self.flush()
+    
+    def record(self, entry: Dict[str, Any]) -> None:
+        """
+        Queue an audit entry for the next batch write (never blocks)
+        
+        Args:
+            entry: Audit document to insert
+        """
+        if self.db is None:
+            return
+        
+        pending = len(self._buffer)
+        if pending >= self.buffer_size:
+            # deque(maxlen) evicts the oldest entry on append
+            self.dropped += 1
+        elif pending >= self.buffer_size * BACKPRESSURE_THRESHOLD:
+            self.backpressure_events += 1
+        
+        self._buffer.append(entry)
+        self.enqueued += 1
+        
+        if self._flusher is None or self._flusher.done():
+            try:
+                self.start()
+            except RuntimeError:
+                # No running loop: entries wait for the next start()/flush()
+                return
+        
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+    
+    async def flush(self) -> int:
+        """
+        Write pending entries with insert_many, batch_size at a time
+        
+        Returns:
+            Number of entries written
+        """
+        if self.db is None or not self._buffer:
+            return 0
+        
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        
+        written = 0
+        async with self._flush_lock:
+            while self._buffer:
+                batch: List[Dict[str, Any]] = [
+                    self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))
+                ]
+                try:
+                    await self.db.audit_logs.insert_many(batch, ordered=False)
+                    written += len(batch)
+                    self.written += len(batch)
+                    self.batches += 1
+                except Exception as db_error:
+                    self.failed_writes += len(batch)
+                    self.logger.error("Failed to store %d audit logs in database: %s", len(batch), db_error)
+        
+        return written
+    
+    async def _flush_loop(self) -> None:
+        """Flush on size (wakeup event) or time (flush_interval) until stopped"""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+        
+        await self.flush()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get buffer, write, drop and backpressure counters"""
+        return {
+            "pending": len(self._buffer),
+            "buffer_size": self.buffer_size,
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval,
+            "running": self._flusher is not None and not self._flusher.done(),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "backpressure_events": self.backpressure_events,
+            "failed_writes": self.failed_writes
+        }
     
     async def log_operation(
         self,
@@ -67,17 +225,12 @@ class AuditLogger:
             
             # Log to application logger
             self.logger.info(
-                f"AUDIT: {operation} - User: {user_id}, "
-                f"Resource: {resource_type}/{resource_id}, "
-                f"Action: {action}, Status: {status}"
+                "AUDIT: %s - User: %s, Resource: %s/%s, Action: %s, Status: %s",
+                operation, user_id, resource_type, resource_id, action, status
             )
             
-            # Store in database if available
-            if self.db is not None:
-                try:
-                    await self.db.audit_logs.insert_one(audit_entry)
-                except Exception as db_error:
-                    self.logger.error(f"Failed to store audit log in database: {db_error}")
+            # Queue for the next batch write if a database is available
+            self.record(audit_entry)
             
         except Exception as e:
             self.logger.error(f"Audit logging failed: {e}")
@@ -217,12 +370,26 @@ def get_audit_logger(database: Optional[AsyncIOMotorDatabase] = None) -> AuditLo
     """
     global _audit_logger
     
-    if _audit_logger is None or (database and _audit_logger.db is None):
-        _audit_logger = AuditLogger(database)
+    if _audit_logger is None:
+        _audit_logger = AuditLogger(
+            database,
+            buffer_size=settings.audit_buffer_size,
+            batch_size=settings.audit_batch_size,
+            flush_interval=settings.audit_flush_interval
+        )
+    elif database is not None and _audit_logger.db is None:
+        _audit_logger.db = database
     
     return _audit_logger
 
 
+async def shutdown_audit_logger():
+    """Drain pending audit entries to the database (call on application shutdown)"""
+    if _audit_logger is not None:
+        await _audit_logger.stop()
+        logger.info("Audit logger drained: %s", _audit_logger.get_stats())
+
+
 # Convenience functions
 async def audit_log(
     operation: str,
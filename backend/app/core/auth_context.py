@@ -0,0 +1,199 @@
+"""
+Request Authentication Context
+Verifies the bearer token once per request (ASGI middleware) and stores the
+principal on request.state, plus a short-TTL cache of user documents so
+authenticated endpoints do not query the users collections on every call.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.security import verify_token
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AuthContext:
+    """Principal resolved from the Authorization header of one request"""
+    token: Optional[str] = None
+    claims: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def authenticated(self) -> bool:
+        return bool(self.claims) and self.error is None
+
+    @property
+    def user_id(self) -> Optional[str]:
+        return self.claims.get("sub")
+
+    @property
+    def user_type(self) -> Optional[str]:
+        return self.claims.get("user_type")
+
+
+def resolve_auth_context(authorization: Optional[str]) -> AuthContext:
+    """
+    Build the auth context for an Authorization header value
+
+    Args:
+        authorization: Raw header value ("Bearer <token>") or None
+
+    Returns:
+        AuthContext with verified claims, or with `error` set when the token is invalid
+    """
+    if not authorization or not authorization.startswith("Bearer "):
+        return AuthContext()
+
+    token = authorization[len("Bearer "):].strip()
+    try:
+        return AuthContext(token=token, claims=verify_token(token))
+    except HTTPException as e:
+        return AuthContext(token=token, error=e.detail)
+    except Exception as e:
+        return AuthContext(token=token, error=str(e))
+
+
+def get_auth_context(request) -> AuthContext:
+    """
+    Get the request's auth context, resolving it once if the middleware did not run
+
+    Args:
+        request: Starlette/FastAPI request
+
+    Returns:
+        The memoized AuthContext stored on request.state.auth
+    """
+    context = getattr(request.state, "auth", None)
+    if context is None:
+        context = resolve_auth_context(request.headers.get("Authorization"))
+        request.state.auth = context
+    return context
+
+
+class AuthContextMiddleware:
+    """
+    ASGI middleware resolving the auth context once per HTTP/WebSocket request
+
+    Stores the context as request.state.auth and, for valid tokens, the
+    user_id / user_type / token_payload attributes read by rate limiting.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket"):
+            authorization = None
+            for name, value in scope.get("headers", ()):
+                if name == b"authorization":
+                    authorization = value.decode("latin-1")
+                    break
+
+            context = resolve_auth_context(authorization)
+            state = scope.setdefault("state", {})
+            state["auth"] = context
+            if context.authenticated:
+                state["user_id"] = context.user_id
+                state["user_type"] = context.user_type
+                state["token_payload"] = context.claims
+
+        await self.app(scope, receive, send)
+
+
+class UserDocumentCache:
+    """Short-TTL LRU of user documents keyed by (collection, user_id)"""
+
+    def __init__(self, ttl: float = 30.0, max_size: int = 1024):
+        """
+        Args:
+            ttl: Seconds a user document is served from memory
+            max_size: Maximum cached documents
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, collection: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of a cached user document, or None if absent or expired"""
+        key = (collection, user_id)
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(entry[1])
+
+    def set(self, collection: str, user_id: str, document: Dict[str, Any]) -> None:
+        """Cache a user document"""
+        key = (collection, user_id)
+        self._entries[key] = (time.monotonic(), dict(document))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get_or_load(
+        self,
+        collection: str,
+        user_id: str,
+        loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a user document, calling `loader` on a miss (missing users are not cached)
+
+        Args:
+            collection: Collection the document comes from
+            user_id: Token subject
+            loader: Coroutine factory querying the database
+
+        Returns:
+            A copy of the user document, or None if the loader found nothing
+        """
+        document = self.get(collection, user_id)
+        if document is not None:
+            return document
+
+        document = await loader()
+        if document:
+            self.set(collection, user_id, document)
+            return dict(document)
+        return None
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user's documents from every collection (call after profile or token updates)"""
+        for key in [key for key in self._entries if key[1] == user_id]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
+# Global user document cache instance
+user_document_cache = UserDocumentCache(
+    ttl=settings.auth_user_cache_ttl,
+    max_size=settings.auth_user_cache_size
+)
@@ -25,6 +25,12 @@ class Settings(BaseSettings):
         env="MONGODB_URL"
     )
     database_name: str = Field(default="broskies_hub", env="DATABASE_NAME")
+    # Pool sizing: "auto" detects serverless / kubernetes / server; sizes default per deployment
+    mongo_deployment: str = Field(default="auto", env="MONGO_DEPLOYMENT")
+    mongo_max_pool_size: Optional[int] = Field(default=None, env="MONGO_MAX_POOL_SIZE")
+    mongo_min_pool_size: Optional[int] = Field(default=None, env="MONGO_MIN_POOL_SIZE")
+    mongo_wait_queue_timeout_ms: int = Field(default=10000, env="MONGO_WAIT_QUEUE_TIMEOUT_MS")
+    mongo_heartbeat_frequency_ms: int = Field(default=10000, env="MONGO_HEARTBEAT_FREQUENCY_MS")
     
     # Security Configuration
     secret_key: str = Field(
@@ -33,11 +39,29 @@ class Settings(BaseSettings):
     )
     algorithm: str = Field(default="HS256", env="JWT_ALGORITHM")
     access_token_expire_minutes: int = Field(default=30, env="ACCESS_TOKEN_EXPIRE_MINUTES")
+    auth_token_cache_size: int = Field(default=1024, env="AUTH_TOKEN_CACHE_SIZE")
+    auth_user_cache_size: int = Field(default=1024, env="AUTH_USER_CACHE_SIZE")
+    auth_user_cache_ttl: float = Field(default=30.0, env="AUTH_USER_CACHE_TTL")
     
     # GitHub OAuth Configuration
     github_client_id: Optional[str] = Field(default=None, env="GITHUB_CLIENT_ID")
     github_client_secret: Optional[str] = Field(default=None, env="GITHUB_CLIENT_SECRET")
     github_token: Optional[str] = Field(default=None, env="GITHUB_TOKEN")
+    github_api_url: str = Field(default="https://api.github.com", env="GITHUB_API_URL")
+    github_http_cache_enabled: bool = Field(default=True, env="GITHUB_HTTP_CACHE_ENABLED")
+    github_http_cache_ttl: int = Field(default=604800, env="GITHUB_HTTP_CACHE_TTL")  # 7 days
+    github_http_cache_dir: Optional[str] = Field(default=None, env="GITHUB_HTTP_CACHE_DIR")
+    # Per-user contribution calendars: local reads between syncs, incremental
+    # `from` syncs after sync_interval, a full refetch after full_refresh (seconds)
+    contribution_calendar_store_enabled: bool = Field(default=True, env="CONTRIBUTION_CALENDAR_STORE_ENABLED")
+    contribution_calendar_sync_interval: int = Field(default=300, env="CONTRIBUTION_CALENDAR_SYNC_INTERVAL")
+    contribution_calendar_full_refresh: int = Field(default=86400, env="CONTRIBUTION_CALENDAR_FULL_REFRESH")
+    contribution_calendar_dir: Optional[str] = Field(default=None, env="CONTRIBUTION_CALENDAR_DIR")
+    # Shared keep-alive HTTP pool for outbound GitHub requests
+    http_pool_max_connections: int = Field(default=100, env="HTTP_POOL_MAX_CONNECTIONS")
+    http_pool_max_connections_per_host: int = Field(default=30, env="HTTP_POOL_MAX_CONNECTIONS_PER_HOST")
+    http_pool_dns_cache_ttl: int = Field(default=300, env="HTTP_POOL_DNS_CACHE_TTL")
+    http_pool_keepalive_timeout: float = Field(default=30.0, env="HTTP_POOL_KEEPALIVE_TIMEOUT")
     
     # Google OAuth Configuration
     google_client_id: Optional[str] = Field(default=None, env="GOOGLE_CLIENT_ID")
@@ -65,9 +89,42 @@ class Settings(BaseSettings):
     rate_limit_enabled: bool = Field(default=True, env="RATE_LIMIT_ENABLED")
     rate_limit_requests_per_minute: int = Field(default=100, env="RATE_LIMIT_REQUESTS_PER_MINUTE")
     
+    # Scan Queue (admission control for quick scans, deep analyses and HR refreshes)
+    scan_queue_max_concurrent: int = Field(default=5, env="SCAN_QUEUE_MAX_CONCURRENT")
+    scan_queue_max_queued: int = Field(default=1000, env="SCAN_QUEUE_MAX_QUEUED")
+    scan_queue_max_cpu_percent: float = Field(default=85.0, env="SCAN_QUEUE_MAX_CPU_PERCENT")
+    scan_queue_max_loop_lag_ms: float = Field(default=250.0, env="SCAN_QUEUE_MAX_LOOP_LAG_MS")
+    scan_queue_min_rate_limit_remaining: int = Field(default=100, env="SCAN_QUEUE_MIN_RATE_LIMIT_REMAINING")
+    scan_queue_aging_dispatches: int = Field(default=10, env="SCAN_QUEUE_AGING_DISPATCHES")
+    
+    # Deep Analysis Jobs ("local" runs them in the API process through the scan queue,
+    # "celery" dispatches analyses to the analysis_queue worker)
+    deep_analysis_backend: str = Field(default="local", env="DEEP_ANALYSIS_BACKEND")
+    # Code extraction budget per deep analysis (shared by all its repositories)
+    deep_analysis_max_bytes: int = Field(default=8388608, env="DEEP_ANALYSIS_MAX_BYTES")  # 8 MiB
+    deep_analysis_max_files: int = Field(default=600, env="DEEP_ANALYSIS_MAX_FILES")
+    deep_analysis_extraction_seconds: float = Field(default=30.0, env="DEEP_ANALYSIS_EXTRACTION_SECONDS")
+    deep_analysis_download_window: int = Field(default=8, env="DEEP_ANALYSIS_DOWNLOAD_WINDOW")
+    
+    # Repository Evaluation (larger files are analyzed from a head and tail sample)
+    evaluation_max_file_bytes: int = Field(default=524288, env="EVALUATION_MAX_FILE_BYTES")  # 512 KiB
+    
+    # Scan Results (stale-while-revalidate serving of /scan/results)
+    scan_results_stale_after: float = Field(default=1800.0, env="SCAN_RESULTS_STALE_AFTER")
+    scan_results_max_concurrent_refreshes: int = Field(default=4, env="SCAN_RESULTS_MAX_CONCURRENT_REFRESHES")
+    
+    # Audit Log (buffered, batched writes to the audit_logs collection)
+    audit_buffer_size: int = Field(default=10000, env="AUDIT_BUFFER_SIZE")
+    audit_batch_size: int = Field(default=200, env="AUDIT_BATCH_SIZE")
+    audit_flush_interval: float = Field(default=2.0, env="AUDIT_FLUSH_INTERVAL")
+    
     # Logging Configuration
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
     json_logging: bool = Field(default=False, env="JSON_LOGGING")
+    log_async: bool = Field(default=True, env="LOG_ASYNC")
+    log_queue_size: int = Field(default=10000, env="LOG_QUEUE_SIZE")
+    log_sample_max_per_window: int = Field(default=50, env="LOG_SAMPLE_MAX_PER_WINDOW")
+    log_sample_window_seconds: float = Field(default=10.0, env="LOG_SAMPLE_WINDOW_SECONDS")
     
     class Config:
         env_file = ".env"
@@ -142,6 +199,10 @@ class Settings(BaseSettings):
         
         return uris
     
+    def get_github_graphql_url(self) -> str:
+        """Get GitHub GraphQL endpoint (follows GITHUB_API_URL, e.g. a local fake server)"""
+        return f"{self.github_api_url.rstrip('/')}/graphql"
+    
     def get_google_redirect_uri(self) -> str:
         """Get Google OAuth redirect URI"""
         base_url = self.get_api_base_url()
@@ -2,16 +2,40 @@
 Comprehensive logging configuration for the GitHub Repository Evaluator
 """
 
+import atexit
+import copy
 import logging
 import logging.config
+import queue
 import sys
 import json
+import threading
+import time
 from datetime import datetime
-from typing import Any, Dict
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, Tuple
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RECORD_ATTRIBUTES = frozenset([
+    'name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 'filename',
+    'module', 'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
+    'thread', 'threadName', 'processName', 'process', 'getMessage', 'exc_info',
+    'exc_text', 'stack_info', 'message', 'taskName'
+])
+
+# Active writer-thread listener (see setup_logging / shutdown_logging)
+_queue_listener: Optional[QueueListener] = None
+_atexit_registered = False
+
 class JSONFormatter(logging.Formatter):
-    """Custom JSON formatter for structured logging"""
+    """Custom JSON formatter for structured logging (orjson when installed)"""
     
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON"""
@@ -30,24 +54,26 @@ class JSONFormatter(logging.Formatter):
             "process": record.process,
         }
         
-        # Add exception info if present
+        # Add exception info if present (pre-rendered when queued by AsyncQueueHandler)
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_data["exception"] = record.exc_text
         
         # Add extra fields from the record
-        extra_fields = {}
-        for key, value in record.__dict__.items():
-            if key not in [
-                'name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 'filename',
-                'module', 'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
-                'thread', 'threadName', 'processName', 'process', 'getMessage', 'exc_info',
-                'exc_text', 'stack_info', 'message'
-            ]:
-                extra_fields[key] = value
+        extra_fields = {
+            key: value for key, value in record.__dict__.items()
+            if key not in _RECORD_ATTRIBUTES
+        }
         
         if extra_fields:
             log_data["extra"] = extra_fields
         
+        if ORJSON_AVAILABLE:
+            try:
+                return orjson.dumps(log_data, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+            except TypeError:
+                pass
         return json.dumps(log_data, default=str, ensure_ascii=False)
 
 class ColoredFormatter(logging.Formatter):
@@ -94,16 +120,123 @@ class ColoredFormatter(logging.Formatter):
         # Add exception info if present
         if record.exc_info:
             formatted_message += f"\n{self.formatException(record.exc_info)}"
+        elif record.exc_text:
+            formatted_message += f"\n{record.exc_text}"
         
         return formatted_message
 
+
+class SamplingFilter(logging.Filter):
+    """
+    Rate-limits repetitive records per (logger, message template)
+    
+    At most `max_per_window` records with the same template pass per
+    `window` seconds; the rest are dropped and counted, and the first record
+    of the next window carries the count as `sampled_suppressed`. Records at
+    or above `min_level_exempt` (warnings and errors by default) always pass.
+    Templates are only shared by %-style calls, so hot paths should log with
+    `logger.info("... %s", value)` rather than f-strings.
+    """
+    
+    def __init__(
+        self,
+        max_per_window: int = 50,
+        window: float = 10.0,
+        min_level_exempt: int = logging.WARNING,
+        max_keys: int = 10000
+    ):
+        super().__init__()
+        self.max_per_window = max_per_window
+        self.window = window
+        self.min_level_exempt = min_level_exempt
+        self.max_keys = max_keys
+        # (logger, template) -> [window start, passed, suppressed]
+        self._windows: Dict[Tuple[str, str], list] = {}
+        self._lock = threading.Lock()
+        self.suppressed_total = 0
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.min_level_exempt:
+            return True
+        
+        key = (record.name, record.msg if isinstance(record.msg, str) else repr(type(record.msg)))
+        now = time.monotonic()
+        
+        with self._lock:
+            state = self._windows.get(key)
+            if state is None:
+                if len(self._windows) >= self.max_keys:
+                    self._windows.clear()
+                state = self._windows[key] = [now, 0, 0]
+            elif now - state[0] >= self.window:
+                if state[2]:
+                    record.sampled_suppressed = state[2]
+                state[0], state[1], state[2] = now, 0, 0
+            
+            if state[1] < self.max_per_window:
+                state[1] += 1
+                return True
+            
+            state[2] += 1
+            self.suppressed_total += 1
+            return False
+
+
+class AsyncQueueHandler(QueueHandler):
+    """
+    QueueHandler that hands records to the writer thread without blocking
+    
+    The message is merged with its args and any exception is rendered on the
+    calling thread (both can reference mutable state); formatting, JSON
+    serialization and I/O happen on the QueueListener thread. Records are
+    dropped and counted when the bounded queue is full.
+    """
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_exception_formatter = logging.Formatter()
+
 def setup_logging(
     log_level: str = "INFO",
     log_file: str = None,
     enable_json_logging: bool = False,
-    enable_console_logging: bool = True
+    enable_console_logging: bool = True,
+    async_logging: bool = True,
+    queue_size: int = 10000,
+    sample_max_per_window: int = 50,
+    sample_window_seconds: float = 10.0
 ) -> None:
-    """Setup comprehensive logging configuration"""
+    """
+    Setup comprehensive logging configuration
+    
+    With async_logging the root handlers are moved behind a bounded queue
+    drained by a QueueListener writer thread, so request handlers only pay
+    for building the record. Repetitive sub-WARNING records are rate-limited
+    by a SamplingFilter (disabled when sample_max_per_window is 0).
+    """
+    
+    # Stop the writer thread of a previous configuration before rebuilding handlers
+    shutdown_logging()
     
     # Create logs directory if it doesn't exist
     if log_file:
@@ -243,6 +376,31 @@ def setup_logging(
     # Apply configuration
     logging.config.dictConfig(config)
     
+    root_logger = logging.getLogger()
+    sampling_filter = SamplingFilter(sample_max_per_window, sample_window_seconds) if sample_max_per_window > 0 else None
+    
+    if async_logging and root_logger.handlers:
+        global _queue_listener, _atexit_registered
+        
+        handlers = list(root_logger.handlers)
+        queue_handler = AsyncQueueHandler(queue.Queue(maxsize=queue_size))
+        if sampling_filter:
+            queue_handler.addFilter(sampling_filter)
+        
+        for handler in handlers:
+            root_logger.removeHandler(handler)
+        root_logger.addHandler(queue_handler)
+        
+        _queue_listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+        _queue_listener.start()
+        
+        if not _atexit_registered:
+            atexit.register(shutdown_logging)
+            _atexit_registered = True
+    elif sampling_filter:
+        for handler in root_logger.handlers:
+            handler.addFilter(sampling_filter)
+    
     # Log configuration success
     logger = logging.getLogger("app.core.logging")
     logger.info(
@@ -251,10 +409,46 @@ def setup_logging(
             "log_level": log_level,
             "log_file": log_file,
             "json_logging": enable_json_logging,
-            "console_logging": enable_console_logging
+            "console_logging": enable_console_logging,
+            "async_logging": async_logging
         }
     )
 
+def shutdown_logging() -> None:
+    """Flush queued records and stop the logging writer thread (no-op when synchronous)"""
+    global _queue_listener
+    
+    listener, _queue_listener = _queue_listener, None
+    if listener is None:
+        return
+    
+    listener.stop()
+    
+    # Route later records straight to the real handlers
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        if isinstance(handler, AsyncQueueHandler):
+            root_logger.removeHandler(handler)
+            for target in listener.handlers:
+                for log_filter in handler.filters:
+                    target.addFilter(log_filter)
+                root_logger.addHandler(target)
+
+def get_logging_stats() -> Dict[str, Any]:
+    """Get queue depth, dropped and sampled-out record counts of the logging pipeline"""
+    stats = {"async": _queue_listener is not None, "orjson": ORJSON_AVAILABLE}
+    
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, AsyncQueueHandler):
+            stats["queue_depth"] = handler.queue.qsize()
+            stats["queue_capacity"] = handler.queue.maxsize
+            stats["dropped"] = handler.dropped
+        for log_filter in handler.filters:
+            if isinstance(log_filter, SamplingFilter):
+                stats["sampled_out"] = log_filter.suppressed_total
+    
+    return stats
+
 class LoggerMixin:
     """Mixin class to add logging capabilities to any class"""
     
@@ -1,5 +1,8 @@
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Union, Dict, Any
+from typing import Optional, Union, Dict, Any, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
@@ -9,6 +12,69 @@ from app.core.config import settings
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
+# Seconds a verified token without an exp claim stays cached
+UNBOUNDED_TOKEN_CACHE_SECONDS = 300
+
+# Marker for "get_current_user_optional has not run for this request yet"
+_UNRESOLVED = object()
+
+
+class VerifiedTokenCache:
+    """LRU of verified token -> claims; entries never outlive the token's exp"""
+    
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Get the cached claims for a token, or None if absent or expired"""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            claims, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[token]
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return claims
+    
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        """Cache verified claims until the token expires"""
+        exp = claims.get("exp")
+        expires_at = float(exp) if exp else time.time() + UNBOUNDED_TOKEN_CACHE_SECONDS
+        
+        with self._lock:
+            self._entries[token] = (claims, expires_at)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
+verified_token_cache = VerifiedTokenCache(max_size=settings.auth_token_cache_size)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
@@ -39,7 +105,11 @@ def create_refresh_token(data: dict) -> str:
     return encoded_jwt
 
 def verify_token(token: str) -> Dict[str, Any]:
-    """Verify and decode JWT token"""
+    """Verify and decode JWT token (signature checks are cached per token until exp)"""
+    cached = verified_token_cache.get(token)
+    if cached is not None:
+        return dict(cached)
+    
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         
@@ -52,7 +122,8 @@ def verify_token(token: str) -> Dict[str, Any]:
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        return payload
+        verified_token_cache.put(token, payload)
+        return dict(payload)
     except JWTError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -111,62 +182,61 @@ async def get_current_user_optional(request) -> Optional[Any]:
     - X-User-Type: internal = internal user
     - Authorization: Bearer <token> = internal user  
     - No headers = external user
+    
+    The token is verified once per request (see app.core.auth_context) and the
+    result is memoized on request.state for later calls in the same request.
     """
     import logging
+    from app.core.auth_context import get_auth_context
     logger = logging.getLogger(__name__)
     
+    memoized = getattr(request.state, "optional_user", _UNRESOLVED)
+    if memoized is not _UNRESOLVED:
+        return memoized
+    
+    current_user = None
     try:
-        # Debug: Log all headers
-        logger.info(f"🔍 Headers received: {dict(request.headers)}")
-        
         # Method 1: Check for X-User-Type header (simple override)
         user_type_header = request.headers.get("X-User-Type")
-        logger.info(f"🔍 X-User-Type header: {user_type_header}")
         
         if user_type_header and user_type_header.lower() == "internal":
-            logger.info("✅ Creating internal user from X-User-Type header")
+            logger.debug("Creating internal user from X-User-Type header")
             # Create a simple mock user for internal type
-            mock_user = type('MockUser', (), {
+            current_user = type('MockUser', (), {
                 'id': '507f1f77bcf86cd799439011',
                 'email': 'internal@example.com',
                 'user_type': 'developer',
                 'github_username': 'internal_user',
                 'github_token': None  # MockUser doesn't have a real GitHub token
             })()
-            return mock_user
-        
-        # Method 2: Check for Authorization header (JWT-based)
-        auth_header = request.headers.get("Authorization")
-        if auth_header and auth_header.startswith("Bearer "):
-            logger.info("🔍 Processing JWT token")
-            token = auth_header.split(" ")[1]
+        else:
+            # Method 2: Authorization header (JWT-based), verified once per request
+            context = get_auth_context(request)
+            if context.error:
+                logger.debug("Ignoring invalid bearer token: %s", context.error)
             
-            # Verify token
-            payload = verify_token(token)
-            user_id = payload.get("sub")
-            user_type = payload.get("user_type")
-            email = payload.get("email")
+            user_id = context.user_id
+            user_type = context.user_type
+            email = context.claims.get("email")
             
-            if user_id and user_type == "developer":
-                logger.info("✅ Creating internal user from JWT token")
+            if context.authenticated and user_id and user_type == "developer":
+                logger.debug("Creating internal user from JWT token")
                 # Create mock user for valid JWT
-                mock_user = type('MockUser', (), {
+                current_user = type('MockUser', (), {
                     'id': user_id,
                     'email': email or 'jwt@example.com',
                     'user_type': user_type,
                     'github_username': email.split('@')[0] if email and '@' in email else 'jwt_user',
                     'github_token': None  # MockUser doesn't have a real GitHub token
                 })()
-                return mock_user
-        
-        # No authentication found
-        logger.info("🌐 No authentication found - external user")
-        return None
         
     except Exception as e:
         logger.error(f"❌ Authentication error: {e}")
         # Any error means no authentication
-        return None
+        current_user = None
+    
+    request.state.optional_user = current_user
+    return current_user
 
 
 async def get_current_hr_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
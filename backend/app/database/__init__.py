@@ -1,8 +1,13 @@
 """
 Database package for comprehensive GitHub integration.
+
+Only the connection helpers are imported eagerly. Schema management,
+migrations and utilities pull in the full model layer, so they are loaded
+on first attribute access.
 """
 
 # Import from the main database module
+import importlib
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
@@ -17,13 +22,34 @@ except ImportError:
     get_database = None
     Collections = None
 
-from .schema_manager import SchemaManager, initialize_database_schema, get_database_health
-from .migrations import DatabaseMigrator, run_full_migration, cleanup_database, validate_database_integrity
-from .utils import DatabaseUtils, ensure_indexes_exist, convert_object_ids, validate_document_schema
+# Lazily imported exports: attribute name -> submodule
+_LAZY_EXPORTS = {
+    "SchemaManager": ".schema_manager",
+    "initialize_database_schema": ".schema_manager",
+    "get_database_health": ".schema_manager",
+    "DatabaseMigrator": ".migrations",
+    "run_full_migration": ".migrations",
+    "cleanup_database": ".migrations",
+    "validate_database_integrity": ".migrations",
+    "DatabaseUtils": ".utils",
+    "ensure_indexes_exist": ".utils",
+    "convert_object_ids": ".utils",
+    "validate_document_schema": ".utils",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "db_manager", "get_database", "Collections",
     "SchemaManager", "initialize_database_schema", "get_database_health",
     "DatabaseMigrator", "run_full_migration", "cleanup_database", "validate_database_integrity",
     "DatabaseUtils", "ensure_indexes_exist", "convert_object_ids", "validate_document_schema"
-]
\ No newline at end of file
+]
@@ -1,24 +1,22 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 from app.core.config import settings
+from app.database.connection_manager import mongo_connection_manager
 import logging
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
 class DatabaseManager:
+    """Application database handle backed by the shared connection manager"""
     client: Optional[AsyncIOMotorClient] = None
     db = None
 
     async def connect_to_database(self):
         try:
             logger.info("Connecting to MongoDB...")
-            self.client = AsyncIOMotorClient(
-                settings.mongodb_url,
-                uuidRepresentation="standard",
-            )
-            self.db = self.client[settings.database_name]
-            # Ping
-            await self.client.admin.command('ping')
+            # Pool sized for the deployment; verified with one ping at startup
+            self.db = await mongo_connection_manager.connect(settings.mongodb_url, settings.database_name)
+            self.client = mongo_connection_manager.client
             logger.info(f"✅ Connected to MongoDB Database: {settings.database_name}")
         except Exception as e:
             logger.error(f"❌ Could not connect to MongoDB: {e}")
@@ -26,8 +24,9 @@ class DatabaseManager:
 
     async def close_database_connection(self):
         if self.client:
-            self.client.close()
-            logger.info("MongoDB Connection closed.")
+            await mongo_connection_manager.close()
+            self.client = None
+            self.db = None
 
     def get_database(self):
         return self.db
@@ -0,0 +1,350 @@
+"""
+MongoDB Connection Manager
+Owns the single AsyncIOMotorClient shared by app.db_connection,
+app.database.connection.db_manager and the ConnectionPoolManager.
+
+The pool is sized for the deployment (serverless, kubernetes or a plain
+server) and health comes from the driver's background heartbeats, so
+requests never issue their own ping. Connection checkouts are monitored to
+report pool wait times.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (maxPoolSize, minPoolSize) per deployment when not configured explicitly
+DEFAULT_POOL_SIZES = {
+    "serverless": (1, 0),
+    "kubernetes": (100, 10),
+    "server": (50, 5),
+}
+
+# Pool wait samples kept for the percentile metrics
+WAIT_SAMPLE_SIZE = 1000
+
+# Consecutive failed heartbeats before the connection is reported unhealthy
+UNHEALTHY_AFTER_FAILURES = 2
+
+
+def detect_deployment() -> str:
+    """
+    Detect where the API is running
+
+    Returns:
+        "serverless" (Vercel / AWS Lambda), "kubernetes", or "server"
+    """
+    configured = (settings.mongo_deployment or "auto").lower()
+    if configured in DEFAULT_POOL_SIZES:
+        return configured
+
+    if os.getenv("VERCEL") or os.getenv("VERCEL_ENV") or os.getenv("AWS_LAMBDA_FUNCTION_NAME"):
+        return "serverless"
+    if os.getenv("KUBERNETES_SERVICE_HOST"):
+        return "kubernetes"
+    return "server"
+
+
+def get_pool_config(deployment: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Get motor client pool options for a deployment
+
+    Args:
+        deployment: Deployment kind (detected when omitted)
+
+    Returns:
+        Keyword arguments for AsyncIOMotorClient
+    """
+    deployment = deployment or detect_deployment()
+    max_pool, min_pool = DEFAULT_POOL_SIZES[deployment]
+    if settings.mongo_max_pool_size:
+        max_pool = settings.mongo_max_pool_size
+    if settings.mongo_min_pool_size is not None:
+        min_pool = settings.mongo_min_pool_size
+
+    return {
+        "maxPoolSize": max_pool,
+        "minPoolSize": min(min_pool, max_pool),
+        "maxIdleTimeMS": 60000,
+        "waitQueueTimeoutMS": settings.mongo_wait_queue_timeout_ms,
+        "heartbeatFrequencyMS": settings.mongo_heartbeat_frequency_ms,
+        "serverSelectionTimeoutMS": 30000,
+        "connectTimeoutMS": 30000,
+        "socketTimeoutMS": 45000,
+        "retryWrites": True,
+        "retryReads": True,
+    }
+
+
+class PoolWaitMonitor(monitoring.ConnectionPoolListener):
+    """Measures how long operations wait to check a connection out of the pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = threading.local()
+        self._waits = deque(maxlen=WAIT_SAMPLE_SIZE)
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.checked_in = 0
+        self.created = 0
+        self.closed = 0
+        self.max_wait_ms = 0.0
+        self.total_wait_ms = 0.0
+
+    def connection_check_out_started(self, event):
+        # Checkout start and result are published on the same driver thread
+        self._started.at = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        started = getattr(self._started, "at", None)
+        wait_ms = (time.perf_counter() - started) * 1000 if started is not None else 0.0
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            self._waits.append(wait_ms)
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_in += 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.created += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.closed += 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._waits)
+            in_use = self.checkouts - self.checked_in
+            return {
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "in_use": max(in_use, 0),
+                "open_connections": self.created - self.closed,
+                "avg_wait_ms": self.total_wait_ms / self.checkouts if self.checkouts else 0.0,
+                "p95_wait_ms": waits[int(len(waits) * 0.95) - 1] if waits else 0.0,
+                "max_wait_ms": self.max_wait_ms,
+            }
+
+
+class HeartbeatMonitor(monitoring.ServerHeartbeatListener):
+    """Tracks connection health from the driver's background server heartbeats"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.last_success: Optional[float] = None
+        self.last_failure: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.last_rtt_ms: Optional[float] = None
+        self.consecutive_failures = 0
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        with self._lock:
+            self.last_success = time.time()
+            self.last_rtt_ms = event.duration * 1000
+            self.consecutive_failures = 0
+
+    def failed(self, event):
+        with self._lock:
+            self.last_failure = time.time()
+            self.last_error = str(event.reply)
+            self.consecutive_failures += 1
+
+    @property
+    def healthy(self) -> Optional[bool]:
+        """True/False once a heartbeat has completed, None before the first one"""
+        with self._lock:
+            if self.consecutive_failures >= UNHEALTHY_AFTER_FAILURES:
+                return False
+            if self.last_success is None:
+                return None if self.last_failure is None else False
+            return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "last_success": self.last_success,
+                "last_failure": self.last_failure,
+                "last_error": self.last_error,
+                "last_rtt_ms": self.last_rtt_ms,
+                "consecutive_failures": self.consecutive_failures,
+            }
+
+
+class MongoConnectionManager:
+    """Deployment-aware owner of the shared MongoDB client"""
+
+    def __init__(self):
+        self.client: Optional[AsyncIOMotorClient] = None
+        self.database = None
+        self.database_name: Optional[str] = None
+        self.deployment: Optional[str] = None
+        self.pool_config: Dict[str, Any] = {}
+        self.pool_monitor = PoolWaitMonitor()
+        self.heartbeat_monitor = HeartbeatMonitor()
+        self.connected_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self.client is not None and self.database is not None
+
+    def _create_client(self, url: str, **params) -> AsyncIOMotorClient:
+        return AsyncIOMotorClient(
+            url,
+            uuidRepresentation="standard",
+            event_listeners=[self.pool_monitor, self.heartbeat_monitor],
+            **params
+        )
+
+    async def connect(
+        self,
+        url: Optional[str] = None,
+        database_name: Optional[str] = None,
+        verify_timeout: float = 15.0,
+        **overrides
+    ):
+        """
+        Create the shared client once and verify it with a single ping
+
+        Args:
+            url: MongoDB connection string (settings.mongodb_url by default)
+            database_name: Database to return a handle for (settings.database_name
+                by default); the client is shared, so every caller gets the
+                database it asked for regardless of who connected first
+            verify_timeout: Seconds to wait for the startup ping
+            **overrides: Extra AsyncIOMotorClient options (override the pool config)
+
+        Returns:
+            The database handle
+        """
+        if self.connected:
+            return self.get_database(database_name)
+
+        async with self._lock:
+            if self.connected:
+                return self.get_database(database_name)
+
+            self.deployment = detect_deployment()
+            self.pool_config = {**get_pool_config(self.deployment), **overrides}
+            self.database_name = settings.database_name
+
+            client = self._create_client(url or settings.mongodb_url, **self.pool_config)
+            try:
+                await asyncio.wait_for(client.admin.command("ping"), timeout=verify_timeout)
+            except Exception:
+                client.close()
+                raise
+
+            self.client = client
+            self.database = client[self.database_name]
+            self.connected_at = time.time()
+            logger.info(
+                "MongoDB connected (%s deployment, maxPoolSize=%s, minPoolSize=%s)",
+                self.deployment, self.pool_config["maxPoolSize"], self.pool_config["minPoolSize"]
+            )
+            return self.get_database(database_name)
+
+    def get_database(self, name: Optional[str] = None):
+        """
+        Get a database handle on the shared client
+
+        Args:
+            name: Database name (settings.database_name when omitted)
+
+        Returns:
+            The database handle, or None until connect() succeeds
+        """
+        if not self.connected:
+            return None
+        if name is None or name == self.database_name:
+            return self.database
+        return self.client[name]
+
+    async def close(self):
+        """Close the shared client"""
+        async with self._lock:
+            if self.client is not None:
+                try:
+                    self.client.close()
+                except Exception as e:
+                    logger.debug("Error closing MongoDB client: %s", e)
+                logger.info("MongoDB connection closed")
+            self.client = None
+            self.database = None
+            self.connected_at = None
+
+    async def check_health(self) -> bool:
+        """
+        Report health from the latest heartbeats, pinging only if none has completed yet
+
+        Returns:
+            True if the server is reachable
+        """
+        if not self.connected:
+            return False
+
+        healthy = self.heartbeat_monitor.healthy
+        if healthy is not None:
+            return healthy
+
+        try:
+            await asyncio.wait_for(self.client.admin.command("ping"), timeout=5.0)
+            return True
+        except Exception as e:
+            logger.warning("MongoDB health check failed: %s", e)
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool configuration, wait-time metrics and heartbeat health"""
+        return {
+            "connected": self.connected,
+            "deployment": self.deployment or detect_deployment(),
+            "database": self.database_name,
+            "max_pool_size": self.pool_config.get("maxPoolSize"),
+            "min_pool_size": self.pool_config.get("minPoolSize"),
+            "healthy": self.heartbeat_monitor.healthy if self.connected else False,
+            "heartbeat": self.heartbeat_monitor.get_stats(),
+            "pool": self.pool_monitor.get_stats(),
+        }
+
+
+# Global MongoDB connection manager instance
+mongo_connection_manager = MongoConnectionManager()
@@ -6,6 +6,8 @@ import os
 import time
 from typing import Optional, Dict, Any
 
+from app.database.connection_manager import get_pool_config, mongo_connection_manager
+
 logger = logging.getLogger(__name__)
 
 class ServerlessDatabase:
@@ -25,19 +27,23 @@ class ServerlessDatabase:
 db = ServerlessDatabase()
 
 async def get_database():
-    """Get database connection optimized for serverless with lazy loading and connection pooling"""
-    # Fast path: return existing valid connection
-    if db.database is not None and time.time() - db.last_activity < db.connection_timeout:
+    """
+    Get the database handle on the shared client
+
+    Connection health comes from the driver's background heartbeats
+    (see app.database.connection_manager), so this never pings inline.
+    """
+    # Fast path: return existing connection
+    if db.database is not None:
         db.last_activity = time.time()
         return db.database
     
-    # Slow path: need to check/establish connection
-    if db.database is None or await _is_connection_stale():
-        async with db._connection_lock:
-            # Double-check after acquiring lock (avoid race condition)
-            if db.database is None or await _is_connection_stale():
-                logger.info("Establishing database connection for serverless function...")
-                await connect_to_mongo_serverless()
+    # Slow path: establish the shared connection once
+    async with db._connection_lock:
+        # Double-check after acquiring lock (avoid race condition)
+        if db.database is None:
+            logger.info("Establishing database connection for serverless function...")
+            await connect_to_mongo_serverless()
     
     # Update last activity timestamp
     db.last_activity = time.time()
@@ -67,24 +73,6 @@ async def get_scores_database():
     logger.debug("Connected to git_Evaluator database for scores_comparison collection (DEPRECATED)")
     return main_db
 
-async def _is_connection_stale() -> bool:
-    """Check if the database connection is stale for serverless environment"""
-    if db.client is None or db.database is None:
-        return True
-    
-    # Check if connection has been idle too long
-    if time.time() - db.last_activity > db.connection_timeout:
-        logger.info("Database connection idle timeout reached, will reconnect")
-        return True
-    
-    # Quick ping test for connection health
-    try:
-        await asyncio.wait_for(db.client.admin.command('ping'), timeout=2.0)
-        return False
-    except Exception as e:
-        logger.warning(f"Database connection health check failed: {e}")
-        return True
-
 async def safe_db_operation(operation_func, fallback_result=None, operation_name="database operation"):
     """Safely execute database operations with serverless-optimized retry logic"""
     max_operation_retries = 2
@@ -189,16 +177,36 @@ async def connect_to_mongo_serverless():
     finally:
         db.is_connecting = False
 
+async def connect_worker_database():
+    """
+    Connect the shared client for a worker process (Celery), without the in-memory fallback
+
+    Workers write analysis state that the API reads back, so a worker that
+    cannot reach MongoDB must fail its jobs rather than record them in memory.
+
+    Returns:
+        The database handle, or None when every connection attempt failed
+    """
+    if db.database is not None and not getattr(db.database, 'is_mock', False):
+        return db.database
+
+    if not await _connect_with_retry():
+        logger.error("Worker could not connect to MongoDB")
+        return None
+
+    db.last_activity = time.time()
+    return db.database
+
 async def _cleanup_stale_connections():
-    """Clean up any stale database connections"""
-    if db.client:
-        try:
-            db.client.close()
-        except Exception as e:
-            logger.debug(f"Error closing stale connection: {e}")
-        finally:
-            db.client = None
-            db.database = None
+    """
+    Drop this module's handles before reconnecting
+
+    The client is the shared one (app.database.connection_manager), still used
+    by DatabaseManager and its pool/heartbeat listeners; the driver recovers its
+    own connections, and only the lifespan closes the client at shutdown.
+    """
+    db.client = None
+    db.database = None
 
 async def _connect_with_retry():
     """Connect to MongoDB with exponential backoff retry logic"""
@@ -216,21 +224,16 @@ async def _connect_with_retry():
             logger.info(f"Database: {connection_config['database_name']}")
             logger.info(f"Connection params: {list(connection_config['params'].keys())}")
             
-            # Create client with serverless-optimized settings
-            client = AsyncIOMotorClient(
+            # Create (or reuse) the shared client; verified with a single ping
+            await mongo_connection_manager.connect(
                 connection_config["url"],
-                **connection_config["params"]
-            )
-            
-            # Test connection with longer timeout for replica set discovery
-            await asyncio.wait_for(
-                client.admin.command('ping'), 
-                timeout=15.0  # Increased timeout for replica set discovery
+                connection_config["database_name"],
+                verify_timeout=15.0  # Increased timeout for replica set discovery
             )
             
             # Success! Set up the connection
-            db.client = client
-            db.database = client[connection_config["database_name"]]
+            db.client = mongo_connection_manager.client
+            db.database = mongo_connection_manager.get_database(connection_config["database_name"])
             
             logger.info(f"✅ Connected to MongoDB: {connection_config['database_name']}")
             return True
@@ -245,13 +248,7 @@ async def _connect_with_retry():
                 delay = base_delay * (2 ** attempt)  # Exponential backoff
                 logger.info(f"Retrying in {delay} seconds...")
                 await asyncio.sleep(delay)
-            
-            try:
-                if 'client' in locals():
-                    client.close()
-            except:
-                pass
-    
+
     return False
 
 def _get_serverless_connection_config() -> Dict[str, Any]:
@@ -279,19 +276,8 @@ def _get_serverless_connection_config() -> Dict[str, Any]:
         # Reconstruct URL without database name
         mongodb_url = f"{base_url}?{query_params}" if query_params else base_url
     
-    # Optimized connection parameters with longer timeouts for network issues
-    connection_params = {
-        "serverSelectionTimeoutMS": 30000,  # Increased from 10s to 30s
-        "connectTimeoutMS": 30000,  # Increased from 10s to 30s
-        "socketTimeoutMS": 45000,  # Added socket timeout
-        "maxPoolSize": 1,  # Keep minimal for serverless
-        "minPoolSize": 0,  # No minimum connections
-        "retryWrites": True,
-        "retryReads": True,  # Added retry reads
-        "maxIdleTimeMS": 60000,  # Close idle connections after 60s
-        "heartbeatFrequencyMS": 30000,  # Heartbeat every 30s
-        "tlsAllowInvalidCertificates": False,  # Ensure SSL is properly configured
-    }
+    # Pool size and timeouts depend on the deployment (1 connection on serverless)
+    connection_params = get_pool_config()
     
     # For regular mongodb:// connections (not Atlas), add database to URL if needed
     if not mongodb_url.startswith("mongodb+srv://") and database_name not in mongodb_url:
@@ -650,16 +636,11 @@ async def create_basic_indexes():
         # Don't raise, just log the warning
 
 async def close_mongo_connection():
-    """Close database connection"""
+    """Release this module's database handles (the shared client is closed by the lifespan)"""
     if db.client:
-        try:
-            db.client.close()
-            logger.info("Disconnected from MongoDB")
-        except Exception as e:
-            logger.warning(f"Error closing MongoDB connection: {e}")
-        finally:
-            db.client = None
-            db.database = None
+        logger.info("Released MongoDB handles")
+    db.client = None
+    db.database = None
 
 async def handle_connection_error():
     """Handle persistent connection errors by switching to fallback"""
@@ -678,29 +659,9 @@ async def create_indexes():
 
 async def monitor_connection_health():
     """Lightweight connection monitoring for serverless environment"""
-    # In serverless, we don't need continuous monitoring
-    # Instead, we check connection health on-demand in get_database()
-    logger.info("Serverless mode: Using on-demand connection health checks")
-    
-    # Optional: Set up a cleanup task for idle connections
-    asyncio.create_task(_cleanup_idle_connections())
-
-async def _cleanup_idle_connections():
-    """Clean up idle connections in serverless environment"""
-    while True:
-        try:
-            await asyncio.sleep(60)  # Check every minute
-            
-            if (db.client and 
-                time.time() - db.last_activity > db.connection_timeout and
-                not hasattr(db.database, 'is_mock')):
-                
-                logger.info("Closing idle database connection in serverless environment")
-                await _cleanup_stale_connections()
-                
-        except Exception as e:
-            logger.debug(f"Idle connection cleanup error: {e}")
-            await asyncio.sleep(30)
+    # The driver's background heartbeats track health and maxIdleTimeMS
+    # closes idle pooled sockets, so no polling task is needed
+    logger.info("Using driver heartbeats for database connection health")
 
 async def get_db_health():
     """Get database health information"""
@@ -717,10 +678,21 @@ async def get_db_health():
             
             # Real MongoDB connection
             if db.client is not None:
-                await asyncio.wait_for(db.client.admin.command('ping'), timeout=8.0)
+                if db.client is mongo_connection_manager.client:
+                    healthy = await mongo_connection_manager.check_health()
+                else:
+                    await asyncio.wait_for(db.client.admin.command('ping'), timeout=8.0)
+                    healthy = True
+                if healthy:
+                    return {
+                        "healthy": True, 
+                        "message": "MongoDB connection successful",
+                        "type": "mongodb",
+                        "pool": mongo_connection_manager.get_stats()
+                    }
                 return {
-                    "healthy": True, 
-                    "message": "MongoDB connection successful",
+                    "healthy": False,
+                    "error": mongo_connection_manager.heartbeat_monitor.last_error,
                     "type": "mongodb"
                 }
             
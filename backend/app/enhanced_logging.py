@@ -5,18 +5,22 @@ Provides differentiated logging with visual markers for internal and external us
 
 import logging
 import time
+from collections import deque
 from typing import Optional, Dict, Any, Literal
 from datetime import datetime
 import json
 
 UserType = Literal["internal", "external"]
 
+AUDIT_TRAIL_SIZE = 1000
+
 class EnhancedLogger:
     """Enhanced logging service with user type differentiation and audit trail"""
     
     def __init__(self, logger_name: str = __name__):
         self.logger = logging.getLogger(logger_name)
-        self.audit_trail: list = []
+        # Ring buffer: only the most recent AUDIT_TRAIL_SIZE entries are kept
+        self.audit_trail: deque = deque(maxlen=AUDIT_TRAIL_SIZE)
         
     def log_internal_operation(self, message: str, user_id: Optional[str] = None, 
                              operation_type: str = "operation", **kwargs):
@@ -232,10 +236,8 @@ class EnhancedLogger:
             "context": context
         }
         
-        # Keep only last 1000 entries to prevent memory issues
+        # The deque evicts the oldest entry once AUDIT_TRAIL_SIZE is reached
         self.audit_trail.append(audit_entry)
-        if len(self.audit_trail) > 1000:
-            self.audit_trail = self.audit_trail[-1000:]
     
     def get_audit_trail(self, user_type: Optional[UserType] = None, 
                        operation_type: Optional[str] = None,
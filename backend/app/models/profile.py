@@ -200,6 +200,8 @@ def get_indian_colleges():
     """Get Indian colleges list (lazy loaded)"""
     return load_indian_colleges()
 
-# For backward compatibility
-# Expose valid list for consumers
-INDIAN_COLLEGES = get_indian_colleges()
\ No newline at end of file
+def __getattr__(name):
+    """Load INDIAN_COLLEGES on first access instead of at import time"""
+    if name == "INDIAN_COLLEGES":
+        return get_indian_colleges()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
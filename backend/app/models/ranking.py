@@ -0,0 +1,167 @@
+"""
+Ranking Records
+Compact user records and columnar score vectors for ranking hot loops
+"""
+
+from typing import Any, AsyncIterable, Dict, Iterable, List, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+
+# Fields a ranking pass reads from a user document; everything else in the
+# profile (descriptions, timestamps, repository counts) is never loaded
+RANKED_USER_FIELDS = (
+    'user_id',
+    'github_username',
+    'overall_score',
+    'region',
+    'state',
+    'district',
+    'university',
+    'university_short',
+)
+
+
+def ranked_user_projection(name_field: str = 'name') -> Dict[str, int]:
+    """
+    Build the MongoDB projection that loads only what a RankedUser keeps
+
+    Args:
+        name_field: Document field holding the display name
+            ('full_name' in user_profiles, 'name' in ranking collections)
+
+    Returns:
+        Projection dict for find()
+    """
+    projection = {field: 1 for field in RANKED_USER_FIELDS}
+    projection[name_field] = 1
+    projection['_id'] = 0
+    return projection
+
+
+class RankedUser:
+    """
+    One user's ranking inputs
+
+    Uses __slots__ so a region or university with tens of thousands of
+    users costs a few pointers per user instead of a dict or pydantic model.
+    """
+
+    __slots__ = (
+        'user_id',
+        'github_username',
+        'name',
+        'overall_score',
+        'region',
+        'state',
+        'district',
+        'university',
+        'university_short',
+    )
+
+    def __init__(
+        self,
+        user_id: str,
+        github_username: Optional[str],
+        name: Optional[str],
+        overall_score: Optional[float],
+        region: Optional[str] = None,
+        state: Optional[str] = None,
+        district: Optional[str] = None,
+        university: Optional[str] = None,
+        university_short: Optional[str] = None
+    ):
+        self.user_id = user_id
+        self.github_username = github_username
+        self.name = name
+        self.overall_score = overall_score
+        self.region = region
+        self.state = state
+        self.district = district
+        self.university = university
+        self.university_short = university_short
+
+    @classmethod
+    def from_document(cls, doc: Dict[str, Any], name_field: str = 'name') -> 'RankedUser':
+        """
+        Build a record from a (projected) MongoDB document
+
+        Args:
+            doc: User document
+            name_field: Document field holding the display name
+
+        Returns:
+            RankedUser
+        """
+        return cls(
+            doc.get('user_id'),
+            doc.get('github_username'),
+            doc.get(name_field),
+            doc.get('overall_score'),
+            doc.get('region'),
+            doc.get('state'),
+            doc.get('district'),
+            doc.get('university'),
+            doc.get('university_short')
+        )
+
+    def __repr__(self) -> str:
+        return f"RankedUser(user_id={self.user_id!r}, overall_score={self.overall_score!r})"
+
+
+class RankedGroup:
+    """
+    The users of one comparison group (a region, district or university)
+    with their scores held as one column
+
+    scores[i] is users[i].overall_score as a float64 NumPy array, or a list
+    of floats when NumPy is not installed.
+    """
+
+    __slots__ = ('users', 'scores')
+
+    def __init__(self, users: List[RankedUser]):
+        self.users = users
+        self.scores = score_vector(user.overall_score for user in users)
+
+    @classmethod
+    async def from_cursor(cls, cursor: AsyncIterable[Dict[str, Any]], name_field: str = 'name') -> 'RankedGroup':
+        """
+        Build a group straight from a MongoDB cursor, one document at a time
+
+        Args:
+            cursor: Cursor (or any async iterable) over projected user documents
+            name_field: Document field holding the display name
+
+        Returns:
+            RankedGroup
+        """
+        return cls([RankedUser.from_document(doc, name_field) async for doc in cursor])
+
+    def score_list(self) -> List[float]:
+        """Scores as a plain list of floats"""
+        return self.scores.tolist() if NUMPY_AVAILABLE else list(self.scores)
+
+    def __len__(self) -> int:
+        return len(self.users)
+
+
+def score_vector(scores: Iterable[Optional[float]]) -> Any:
+    """
+    Collect scores into a float64 vector (missing scores become 0.0)
+
+    Args:
+        scores: Scores, possibly None
+
+    Returns:
+        NumPy float64 array, or a list of floats without NumPy
+    """
+    values = [float(score or 0.0) for score in scores]
+    if NUMPY_AVAILABLE:
+        return np.array(values, dtype=np.float64)
+    return values
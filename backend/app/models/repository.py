@@ -137,6 +137,13 @@ class Repository(BaseModel):
     # Analysis status (Stage 2 - Deep Analysis)
     analyzed: bool = False
     analyzed_at: Optional[datetime] = None
+    # Commit the analysis was computed at, and the per-file ACID aggregates
+    # (ACIDAccumulator.to_dict) rescans apply commit diffs to
+    analyzed_commit_sha: Optional[str] = None
+    analysis_aggregates: Optional[Dict[str, Any]] = None
+    # Files the aggregates still miss (extraction budget spent or download
+    # failed); the next rescan downloads them along with the commit diff
+    analysis_pending_files: Optional[List[str]] = None
 
 class RepositoryCreate(BaseModel):
     user_id: str
@@ -10,6 +10,7 @@ from datetime import datetime
 import logging
 
 from app.core.security import get_current_user_token
+from app.core.auth_context import user_document_cache
 from app.database import get_database
 from app.models.user import User
 
@@ -130,7 +131,9 @@ async def get_current_user(
         
         if user_type == "developer" and db is not None:
             try:
-                user_doc = await db.users.find_one({"_id": user_id})
+                user_doc = await user_document_cache.get_or_load(
+                    "users", user_id, lambda: db.users.find_one({"_id": user_id})
+                )
                 if user_doc:
                     return User(**user_doc)
             except Exception as e:
@@ -11,6 +11,7 @@ from github import Github
 
 from app.core.config import settings
 from app.core.security import create_access_token, create_refresh_token, verify_token, verify_refresh_token, get_current_user_token
+from app.core.auth_context import user_document_cache
 from app.database import get_database
 from app.models.user import User, UserCreate, HRUser, HRUserCreate
 from app.services.github_oauth import GitHubOAuthService
@@ -116,6 +117,7 @@ async def github_callback(
                         "email": github_user_info["email"]
                     }}
                 )
+                user_document_cache.invalidate(str(existing_user["_id"]))
         else:
             # Create new user
             user_data = UserCreate(
@@ -213,6 +215,7 @@ async def developer_login(
                     {"_id": existing_user["_id"]},
                     {"$set": {"github_token": request.github_token}}
                 )
+                user_document_cache.invalidate(str(existing_user["_id"]))
         else:
             # Create new user
             user_data = UserCreate(
@@ -524,11 +527,15 @@ async def get_current_user(
         user_type = payload.get("user_type")
         
         if user_type == "developer":
-            user_doc = await db.users.find_one({"_id": user_id})
+            user_doc = await user_document_cache.get_or_load(
+                "users", user_id, lambda: db.users.find_one({"_id": user_id})
+            )
             if user_doc:
                 return User(**convert_objectid_to_string(user_doc))
         elif user_type == "hr":
-            user_doc = await db.hr_users.find_one({"_id": user_id})
+            user_doc = await user_document_cache.get_or_load(
+                "hr_users", user_id, lambda: db.hr_users.find_one({"_id": user_id})
+            )
             if user_doc:
                 return HRUser(**convert_objectid_to_string(user_doc))
         
@@ -8,8 +8,10 @@ from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any
 from datetime import datetime
 import logging
+import uuid
 
 from app.core.security import get_current_user_token
+from app.core.auth_context import user_document_cache
 from app.core.security import get_current_user_optional
 from app.models.user import User
 from app.user_type_detector import UserTypeDetector, detect_user_type_from_request, get_user_database
@@ -85,12 +87,14 @@ async def get_current_user(
         
         if user_type == "developer":
             try:
-                # Use new database routing system
-                db = await get_user_database(request, "user_data") if request else None
-                if db is not None:
-                    user_doc = await db.users.find_one({"_id": user_id})
-                    if user_doc:
-                        return User(**user_doc)
+                async def load_user():
+                    # Use new database routing system
+                    db = await get_user_database(request, "user_data") if request else None
+                    return await db.users.find_one({"_id": user_id}) if db is not None else None
+                
+                user_doc = await user_document_cache.get_or_load("users", user_id, load_user)
+                if user_doc:
+                    return User(**user_doc)
             except Exception as e:
                 logger.warning(f"🔐 [DATABASE_ROUTING] Database query failed: {e}")
         
@@ -188,6 +192,10 @@ async def deep_analyze_unified(
             
             # Use authenticated user's GitHub token (with fallback for MockUser)
             github_token = getattr(current_user, 'github_token', None)
+            # Durable jobs look the token up by user id instead of carrying it
+            token_user_id = getattr(current_user, 'id', None) if github_token else None
+            # Their /scan/results snapshot is invalidated when the analysis completes
+            results_user_id = str(current_user.id)
             if not github_token:
                 # Fallback to system GitHub token for MockUser or users without tokens
                 from app.core.config import settings
@@ -207,6 +215,8 @@ async def deep_analyze_unified(
                                 max_repositories=max_repositories)
             
             # Use system GitHub token for external users
+            token_user_id = None
+            results_user_id = None
             import os
             github_token = os.getenv("GITHUB_TOKEN")
             if not github_token:
@@ -291,16 +301,8 @@ async def deep_analyze_unified(
             log_external_analysis("Starting analysis with new routing system", user_id,
                                 database=storage_location)
         
-        # Start analysis with new database routing
-        analysis_id = await orchestrator.initiate_analysis(
-            username=username,
-            repositories=repositories,
-            max_evaluate=max_repositories,
-            github_token=github_token
-        )
-        
-        # Log successful analysis start
-        log_database_op(user_type, storage_location, "store", f"analysis_{analysis_id}", True, user_id)
+        # Generated up front so the scan document is tagged before the job can finish
+        analysis_id = str(uuid.uuid4())
         
         # Create the new document immediately with old data and new score
         try:
@@ -359,20 +361,21 @@ async def deep_analyze_unified(
             logger.error(f"❌ [IMMEDIATE_DOC_CREATION] Error creating document: {doc_error}")
             # Don't fail the analysis if document creation fails
         
-        # Start background task to update the document when analysis completes
-        import asyncio
-        asyncio.create_task(
-            _update_analysis_document_when_complete(
-                analysis_id=analysis_id,
-                username=username,
-                user_type=user_type,
-                user_id=user_id,
-                database=database,
-                scan_collection=scan_collection,
-                orchestrator=orchestrator
-            )
+        # Start analysis with new database routing; the job's completion event
+        # writes the results onto the document tagged above
+        await orchestrator.initiate_analysis(
+            username=username,
+            repositories=repositories,
+            max_evaluate=max_repositories,
+            github_token=github_token,
+            scan_target={'scan_collection': scan_collection, 'results_user_id': results_user_id},
+            analysis_id=analysis_id,
+            token_user_id=token_user_id
         )
         
+        # Log successful analysis start
+        log_database_op(user_type, storage_location, "store", f"analysis_{analysis_id}", True, user_id)
+        
         # Estimate time
         repos_to_evaluate = min(len(repositories), max_repositories)
         estimated_time = f"{30 + (repos_to_evaluate * 2)}-{45 + (repos_to_evaluate * 3)} seconds"
@@ -666,15 +669,14 @@ async def quick_analyze_username(
                 logger.error(f"❌ [EXTERNAL_IMMEDIATE_DOC] Error creating document: {doc_error}")
                 # Don't fail the analysis if document creation fails
             
-            # Start analysis in background using new routing
+            # Start analysis in background using new routing (in-process; not
+            # a durable job, an API restart abandons it)
             import asyncio
             asyncio.create_task(
                 _execute_deep_analysis_with_routing(
                     username=username,
                     analysis_id=analysis_id,
                     repositories=repos_to_analyze,
-                    github_token=github_token,
-                    user_id=user_id,
                     user_type=user_type,
                     database=database,
                     analysis_collection=analysis_collection,
@@ -912,8 +914,6 @@ async def _execute_deep_analysis_with_routing(
     username: str,
     analysis_id: str,
     repositories: list,
-    github_token: str,
-    user_id: str,
     user_type: str,
     database,
     analysis_collection: str,
@@ -998,7 +998,7 @@ async def _execute_deep_analysis_with_routing(
         logger.error(f"🔐 [INTERNAL_DEEP_ANALYSIS] Traceback: {traceback.format_exc()}")
         
         # Mark as failed
-        if database:
+        if database is not None:
             await database[analysis_collection].update_one(
                 {'analysis_id': analysis_id},
                 {'$set': {
@@ -1142,107 +1142,6 @@ async def _execute_external_deep_analysis_optimized(
             )
 
 
-async def _monitor_analysis_and_update_scan_data(
-    analysis_id: str,
-    username: str,
-    user_type: str,
-    database,
-    scan_collection: str,
-    orchestrator
-):
-    """
-    Monitor analysis completion and update scan data with results
-    
-    This function polls the orchestrator for analysis completion and then
-    updates the original quick scan document with the analysis results.
-    """
-    logger.info(f"🔄 [SCAN_UPDATE] Starting monitoring for analysis {analysis_id}")
-    
-    try:
-        import asyncio
-        
-        # Poll for completion (max 5 minutes)
-        max_attempts = 60  # 5 minutes with 5-second intervals
-        attempt = 0
-        
-        while attempt < max_attempts:
-            try:
-                # Check analysis status
-                status_data = await orchestrator.get_analysis_status(analysis_id)
-                
-                if status_data and status_data.get('status') == 'completed':
-                    logger.info(f"🔄 [SCAN_UPDATE] Analysis {analysis_id} completed, updating scan data")
-                    
-                    # Get analysis results
-                    results = await orchestrator.get_analysis_results(analysis_id)
-                    
-                    if results:
-                        # Extract overall score from results
-                        overall_score = results.get('overall_score', 0)
-                        if overall_score == 0:
-                            # Try to calculate from repository scores
-                            repositories = results.get('repositories', [])
-                            if repositories:
-                                scores = [repo.get('overall_score', 0) for repo in repositories if repo.get('overall_score', 0) > 0]
-                                if scores:
-                                    overall_score = sum(scores) / len(scores)
-                        
-                        # Update the original scan document
-                        update_data = {
-                            'deepAnalysisComplete': True,
-                            'needsDeepAnalysis': False,
-                            'analyzedAt': datetime.utcnow().isoformat(),
-                            'overallScore': round(overall_score, 1),
-                            'analyzed': True
-                        }
-                        
-                        # Add individual scores if available
-                        if results.get('activity_score'):
-                            update_data['activityScore'] = results.get('activity_score')
-                        if results.get('consistency_score'):
-                            update_data['consistencyScore'] = results.get('consistency_score')
-                        if results.get('innovation_score'):
-                            update_data['innovationScore'] = results.get('innovation_score')
-                        if results.get('delivery_score'):
-                            update_data['deliveryScore'] = results.get('delivery_score')
-                        
-                        # Update scan data with case-insensitive query
-                        result = await database[scan_collection].update_one(
-                            {'username': {"$regex": f"^{username}$", "$options": "i"}},
-                            {'$set': update_data}
-                        )
-                        
-                        if result.modified_count > 0:
-                            logger.info(f"✅ [SCAN_UPDATE] Successfully updated scan data for {username}")
-                            logger.info(f"   - Overall Score: {overall_score}")
-                            logger.info(f"   - Deep Analysis Complete: True")
-                        else:
-                            logger.warning(f"⚠️ [SCAN_UPDATE] No scan document updated for {username}")
-                    
-                    break
-                    
-                elif status_data and status_data.get('status') in ['failed', 'error']:
-                    logger.error(f"❌ [SCAN_UPDATE] Analysis {analysis_id} failed")
-                    break
-                    
-                else:
-                    # Still in progress, wait and retry
-                    await asyncio.sleep(5)
-                    attempt += 1
-                    
-            except Exception as poll_error:
-                logger.warning(f"⚠️ [SCAN_UPDATE] Error polling analysis status: {poll_error}")
-                await asyncio.sleep(5)
-                attempt += 1
-        
-        if attempt >= max_attempts:
-            logger.warning(f"⚠️ [SCAN_UPDATE] Timeout waiting for analysis {analysis_id} to complete")
-            
-    except Exception as e:
-        logger.error(f"❌ [SCAN_UPDATE] Error monitoring analysis {analysis_id}: {e}")
-        import traceback
-        logger.error(f"❌ [SCAN_UPDATE] Traceback: {traceback.format_exc()}")
-
 @router.post("/update-scan-data/{username}/{analysis_id}")
 async def update_scan_data_with_analysis(
     username: str,
@@ -2059,147 +1958,6 @@ async def get_combined_scan_results(
     except Exception as e:
         logger.error(f"❌ [COMBINED_RESULTS] Error getting combined results: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-async def _update_analysis_document_when_complete(
-    analysis_id: str,
-    username: str,
-    user_type: str,
-    user_id: str,
-    database,
-    scan_collection: str,
-    orchestrator
-):
-    """
-    Monitor analysis completion and update the existing analysis document with real results
-    
-    This function polls the orchestrator for analysis completion and then
-    updates the existing 'updated_with_deep_analysis' document with real scores.
-    """
-    logger.info(f"🔄 [ANALYSIS_UPDATE] Starting monitoring for analysis {analysis_id}")
-    logger.info(f"   - User: {username}")
-    logger.info(f"   - User ID: {user_id} (Type: {type(user_id)})")
-    
-    try:
-        import asyncio
-        
-        # Poll for completion (max 5 minutes)
-        max_attempts = 60  # 5 minutes with 5-second intervals
-        attempt = 0
-        
-        while attempt < max_attempts:
-            try:
-                # Check analysis status
-                status_data = await orchestrator.get_analysis_status(analysis_id)
-                status_val = status_data.get('status') if status_data else 'unknown'
-                logger.info(f"🔄 [ANALYSIS_UPDATE_POLL] Attempt {attempt+1}/{max_attempts}: Status = {status_val}")
-                
-                if status_data and status_val == 'complete':
-                    logger.info(f"🔄 [ANALYSIS_UPDATE] Analysis {analysis_id} completed, updating document")
-                    
-                    # Get analysis results
-                    results = await orchestrator.get_analysis_results(analysis_id)
-                    logger.info(f"🔄 [ANALYSIS_UPDATE] Results retrieved: {bool(results)}")
-                    
-                    # Calculate overall score - Use REAL results
-                    # Orchestrator returns 'overallScore' (camelCase) but we check both to be safe
-                    overall_score = results.get('overallScore') or results.get('overall_score', 0) if results else 0
-                    logger.info(f"🔄 [ANALYSIS_UPDATE] Raw Overall Score: {overall_score}")
-                    
-                    if overall_score == 0 and results:
-                        # Try to calculate from repository scores if overall is explicitly 0 but repos exist
-                        repositories = results.get('repositories', [])
-                        if repositories:
-                            scores = [repo.get('overall_score', 0) for repo in repositories if repo.get('overall_score', 0) > 0]
-                            if scores:
-                                overall_score = sum(scores) / len(scores)
-                                logger.info(f"🔄 [ANALYSIS_UPDATE] Calculated Overall Score from Repos: {overall_score}")
-
-                    # FALLBACK: Check for acid_score if overall_score is still 0 (User Request)
-                    if overall_score == 0 and results:
-                         if 'acid_score' in results:
-                             if isinstance(results['acid_score'], dict):
-                                 overall_score = results['acid_score'].get('overall', 0)
-                             elif isinstance(results['acid_score'], (int, float)):
-                                 overall_score = results['acid_score']
-                             logger.info(f"🔄 [ANALYSIS_UPDATE] Using acid_score as fallback: {overall_score}")
-
-                    # Update the existing analysis document
-                    update_data = {
-                        'overallScore': round(overall_score, 1),
-                        'overall_score': round(overall_score, 1),
-                        'analyzedAt': datetime.utcnow().isoformat(),
-                        'updated_at': datetime.utcnow(),
-                        'deepAnalysisInProgress': False, # DONE - Not in progress anymore
-                        'deepAnalysisComplete': True,    # DONE - Complete
-                        
-                        # Update detailed scores with real results
-                        'activityScore': results.get('activity_score', 0) if results else 0,
-                        'consistencyScore': results.get('consistency_score', 0) if results else 0,
-                        'innovationScore': results.get('innovation_score', 0) if results else 0,
-                        'deliveryScore': results.get('delivery_score', 0) if results else 0,
-                        
-                        # Analysis completion metadata
-                        'analysis_completed_at': datetime.utcnow().isoformat(),
-                        'real_analysis_complete': True,
-                        
-                        # Summary (from results or defaults)
-                        'analysis_summary': results.get('analysis_summary', {}) if results else {}
-                    }
-                    
-                    logger.info(f"🔄 [ANALYSIS_UPDATE] Updating document with query: analysis_id={analysis_id}")
-                    
-                    # Update the document with the analysis_id - Loosened query to avoid user_id mismatches
-                    result = await database[scan_collection].update_one(
-                        {
-                            'analysis_id': analysis_id
-                        },
-                        {'$set': update_data}
-                    )
-                    
-                    if result.modified_count > 0:
-                        logger.info(f"✅ [ANALYSIS_UPDATE] Updated analysis document for {username}")
-                        logger.info(f"   - Analysis ID: {analysis_id}")
-                        logger.info(f"   - Updated Overall Score: {overall_score}")
-                        logger.info(f"   - Documents Modified: {result.modified_count}")
-                    else:
-                        logger.warning(f"⚠️ [ANALYSIS_UPDATE] No document found with analysis_id={analysis_id}. matched_count={result.matched_count}")
-                        # Fallback try with username just in case analysis_id is somehow wrong in doc (unlikely but possible if manually created)
-                        
-                    break
-                    
-                elif status_data and status_data.get('status') in ['failed', 'error']:
-                    logger.error(f"❌ [ANALYSIS_UPDATE] Analysis {analysis_id} failed. Status: {status_val}")
-                    # Update document to reflect failure
-                    await database[scan_collection].update_one(
-                        {
-                            'analysis_id': analysis_id,
-                            'document_type': 'updated_with_deep_analysis'
-                        },
-                        {'$set': {
-                            'deepAnalysisInProgress': False,
-                            'deepAnalysisComplete': False,
-                             'deepAnalysisError': True
-                        }}
-                    )
-                    break
-                    
-                else:
-                    # Still in progress, wait and retry
-                    # logger.debug(f"⏳ [ANALYSIS_UPDATE] Analysis still in progress... ({attempt})")
-                    await asyncio.sleep(5)
-                    attempt += 1
-                    
-            except Exception as poll_error:
-                logger.warning(f"⚠️ [ANALYSIS_UPDATE] Error polling analysis status: {poll_error}")
-                await asyncio.sleep(5)
-                attempt += 1
-        
-        if attempt >= max_attempts:
-            logger.warning(f"⚠️ [ANALYSIS_UPDATE] Timeout waiting for analysis {analysis_id} to complete")
-            
-    except Exception as e:
-        logger.error(f"❌ [ANALYSIS_UPDATE] Error monitoring analysis {analysis_id}: {e}")
-        import traceback
-        logger.error(f"❌ [ANALYSIS_UPDATE] Traceback: {traceback.format_exc()}")
 @router.post("/create-score-document/{username}")
 async def create_score_document_with_old_data(
     username: str,
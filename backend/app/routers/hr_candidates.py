@@ -6,13 +6,17 @@ instantly by fetching data from the HR database with fallback to regular databas
 """
 
 import logging
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Dict, Any
 from app.db_connection import get_database
 from app.services.candidate_profile_service import CandidateProfileService
 from app.services.hr_data_handler import store_hr_data, retrieve_hr_data, HRDataType
 from app.core.security import verify_token
+from app.services.concurrent_data_fetcher import RequestPriority
+from app.services.scan_queue_manager import (
+    scan_queue_manager, ScanType, ScanQueueFullError, HR_REFRESH_OWNER, HR_REFRESH_HEADERS
+)
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 logger = logging.getLogger(__name__)
@@ -592,47 +596,72 @@ async def get_mock_candidates() -> Dict[str, Any]:
 @router.post("/{username}/refresh")
 async def refresh_candidate_profile(
     username: str,
+    request: Request,
     db: AsyncIOMotorDatabase = Depends(get_database)
 ) -> Dict[str, Any]:
     """
     Trigger a fresh scan for a candidate profile
     
-    This endpoint initiates a new comprehensive scan for the candidate,
-    which will update their profile data in the database. The scan runs
-    asynchronously and the updated profile can be fetched after completion.
+    This endpoint queues a new comprehensive scan for the candidate,
+    which will update their profile data in the database. All HR refreshes
+    share one fair-queuing slot at low priority, so bulk refreshes do not
+    delay developer scans. The updated profile can be fetched after completion.
     
     Args:
         username: GitHub username (case-sensitive)
+        request: Incoming request (its routing headers are passed to the scan)
         db: Database connection
         
     Returns:
-        Scan initiation status with scan_id for tracking
+        Scan initiation status with job_id and estimated start time for tracking
         
     Raises:
+        503: Scan queue is full
         500: Failed to initiate scan
     """
     try:
         logger.info(f"HR requesting profile refresh for: {username}")
         
-        # Import scan function
-        from app.routers.scan import scan_external_github_user
-        
-        # Trigger a fresh scan with force_refresh=True
-        scan_result = await scan_external_github_user(username, force_refresh=True)
+        # Queue a fresh scan with force_refresh=True
+        job_id = await scan_queue_manager.submit_scan_job(
+            ScanType.HR_REFRESH,
+            user_id=HR_REFRESH_OWNER,
+            target=username,
+            parameters={'headers': {
+                name: request.headers[name] for name in HR_REFRESH_HEADERS if name in request.headers
+            }},
+            priority=RequestPriority.LOW
+        )
+        job = await scan_queue_manager.get_job_status(job_id)
         
-        logger.info(f"Profile refresh initiated for {username}")
+        logger.info(f"Profile refresh queued for {username} (job {job_id})")
         
         return {
             "success": True,
             "message": f"Profile refresh initiated for {username}",
             "username": username,
-            "scan_initiated": True
+            "scan_initiated": True,
+            "job_id": job_id,
+            "queue_position": scan_queue_manager.get_queue_position(job_id),
+            "estimated_start_at": job.estimated_start_at.isoformat() if job and job.estimated_start_at else None
         }
         
     except HTTPException as e:
         # Re-raise HTTP exceptions
         raise e
     
+    except ScanQueueFullError as e:
+        logger.warning(f"Scan queue full, rejecting refresh for {username}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                "error": "Scan queue full",
+                "message": "Too many scans are queued, please retry shortly",
+                "username": username
+            },
+            headers={"Retry-After": "60"}
+        )
+    
     except Exception as e:
         # Handle other errors
         logger.error(f"Error refreshing candidate profile for {username}: {e}")
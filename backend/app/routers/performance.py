@@ -9,7 +9,13 @@ from app.routers.auth import get_current_user
 from app.services.cache_service import cache_service
 from app.services.performance_service import performance_service
 from app.services.concurrent_data_fetcher import concurrent_fetcher
-from app.services.connection_pool_manager import connection_pool_manager
+from app.services.github_http_cache import github_http_cache
+from app.services.scan_results_refresher import scan_results_refresher
+from app.core.auth_context import user_document_cache
+from app.core.security import verified_token_cache
+from app.core.audit_log import get_audit_logger
+from app.database.connection_manager import mongo_connection_manager
+from app.services.connection_pool_manager import connection_pool_manager, get_http_pool
 from app.services.scan_queue_manager import scan_queue_manager
 
 router = APIRouter()
@@ -414,10 +420,12 @@ async def get_concurrent_fetcher_stats(
     """Get concurrent data fetcher performance statistics"""
     try:
         stats = concurrent_fetcher.get_stats()
+        latency = concurrent_fetcher.get_latency_stats()
         active_requests = concurrent_fetcher.get_active_requests()
         
         return {
             "stats": stats,
+            "latency": latency,
             "active_requests": active_requests,
             "timestamp": datetime.utcnow().isoformat()
         }
@@ -425,6 +433,91 @@ async def get_concurrent_fetcher_stats(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get concurrent fetcher stats: {str(e)}")
 
+@router.get("/github-http-cache/stats")
+async def get_github_http_cache_stats(
+    current_user = Depends(get_current_user)
+):
+    """Get GitHub conditional-request cache statistics (hits, 304s, misses)"""
+    try:
+        return {
+            "stats": github_http_cache.get_stats(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get GitHub HTTP cache stats: {str(e)}")
+
+@router.get("/auth-cache/stats")
+async def get_auth_cache_stats(
+    current_user = Depends(get_current_user)
+):
+    """Get verified-token and user-document cache statistics"""
+    try:
+        return {
+            "verified_tokens": verified_token_cache.get_stats(),
+            "user_documents": user_document_cache.get_stats(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get auth cache stats: {str(e)}")
+
+@router.get("/scan-results/stats")
+async def get_scan_results_refresh_stats(
+    current_user = Depends(get_current_user)
+):
+    """Get /scan/results serving statistics (fresh, stale and missing hits, background refreshes)"""
+    try:
+        return {
+            "stats": scan_results_refresher.get_stats(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get scan results refresh stats: {str(e)}")
+
+@router.get("/audit-log/stats")
+async def get_audit_log_stats(
+    current_user = Depends(get_current_user)
+):
+    """Get audit log writer statistics (pending, written, dropped and backpressure counters)"""
+    try:
+        return {
+            "stats": get_audit_logger().get_stats(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get audit log stats: {str(e)}")
+
+@router.get("/mongo-pool/stats")
+async def get_mongo_pool_stats(
+    current_user = Depends(get_current_user)
+):
+    """Get MongoDB pool sizing, checkout wait times and heartbeat health"""
+    try:
+        return {
+            "stats": mongo_connection_manager.get_stats(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get MongoDB pool stats: {str(e)}")
+
+@router.get("/http-pool/stats")
+async def get_http_pool_stats(
+    current_user = Depends(get_current_user)
+):
+    """Get shared GitHub HTTP pool statistics (connection reuse, DNS cache, connect/TTFB/download times)"""
+    try:
+        return {
+            "stats": get_http_pool().get_timing_stats(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get HTTP pool stats: {str(e)}")
+
 @router.get("/connection-pools/stats")
 async def get_connection_pool_stats(
     current_user = Depends(get_current_user)
@@ -471,12 +564,28 @@ async def get_scan_queue_stats(
             },
             "running": scan_queue_manager.running,
             "max_concurrent_scans": scan_queue_manager.max_concurrent_scans,
+            "admission": scan_queue_manager.get_admission_status(),
             "timestamp": datetime.utcnow().isoformat()
         }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get scan queue stats: {str(e)}")
 
+@router.get("/scan-queue/jobs/{job_id}")
+async def get_scan_queue_job(
+    job_id: str,
+    current_user = Depends(get_current_user)
+):
+    """Get a scan job's status, queue position and estimated start time"""
+    job = await scan_queue_manager.get_job_status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Scan job {job_id} not found")
+    
+    return {
+        "job": job.to_dict(position=scan_queue_manager.get_queue_position(job_id)),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
 @router.post("/concurrent-fetcher/test")
 async def test_concurrent_fetcher(
     num_requests: int = Query(default=5, ge=1, le=20, description="Number of test requests"),
@@ -500,10 +609,11 @@ async def test_concurrent_fetcher(
         request_ids = []
         
         for i in range(num_requests):
-            request_id = f"test_request_{i}_{int(time.time())}"
-            await concurrent_fetcher.submit_request(
-                request_id=request_id,
-                func=test_function,
+            name = f"test_request_{i}_{int(time.time())}"
+            request_id = await concurrent_fetcher.submit_request(
+                name,
+                test_function,
+                name,
                 delay=0.1 + (i * 0.05)  # Varying delays
             )
             request_ids.append(request_id)
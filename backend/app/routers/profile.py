@@ -16,6 +16,7 @@ from app.models.profile import (
 )
 from app.models.user import User
 from app.core.security import get_current_user_token
+from app.core.auth_context import user_document_cache
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.database import get_database, Collections
 
@@ -183,6 +184,7 @@ async def setup_user_profile(
             profile_update_op,
             upsert=True
         )
+        user_document_cache.invalidate(user_id)
         
         # Fetch the saved profile to return
         saved_profile_doc = await db[Collections.INTERNAL_USERS_PROFILE].find_one({"_id": internal_user_oid})
@@ -281,6 +283,7 @@ async def update_user_profile(
                 {"_id": internal_user_oid},
                 {"$set": update_data}
             )
+            user_document_cache.invalidate(user_id)
             updated_doc = await db[Collections.INTERNAL_USERS_PROFILE].find_one({"_id": internal_user_oid})
             
             # Ensure github_username is present
@@ -10,8 +10,12 @@ from datetime import datetime
 import logging
 
 from app.core.security import get_current_user_token
+from app.core.auth_context import user_document_cache
 from app.user_type_detector import UserTypeDetector, detect_user_type_from_request, get_user_database
 from app.models.user import User
+from app.services.concurrent_data_fetcher import RequestPriority
+from app.services.scan_queue_manager import scan_queue_manager, ScanType, ScanQueueFullError
+from app.services.scan_results_refresher import scan_results_refresher
 
 logger = logging.getLogger(__name__)
 
@@ -61,12 +65,14 @@ async def get_current_user(
         
         if user_type == "developer":
             try:
-                # Use new database routing system
-                db = await get_user_database(request, "user_data") if request else None
-                if db is not None:
-                    user_doc = await db.users.find_one({"_id": user_id})
-                    if user_doc:
-                        return User(**user_doc)
+                async def load_user():
+                    # Use new database routing system
+                    db = await get_user_database(request, "user_data") if request else None
+                    return await db.users.find_one({"_id": user_id}) if db is not None else None
+                
+                user_doc = await user_document_cache.get_or_load("users", user_id, load_user)
+                if user_doc:
+                    return User(**user_doc)
             except Exception as e:
                 logger.warning(f"🔐 [DATABASE_ROUTING] Database query failed: {e}")
         
@@ -174,19 +180,32 @@ async def quick_scan(
         
         # Initialize scan orchestrator with internal user context
         from backend.scoring.orchestration.scan_orchestrator import ScanOrchestrator
+        from app.services.scan_progress_emitter import ScanProgressEmitter
+        from app.websocket.scan_websocket import websocket_manager
+        
+        orchestrator = ScanOrchestrator(database=database, logger=logger)
         
-        orchestrator = ScanOrchestrator(database=db, logger=logger)
+        # Stream scored repository pages to the UI while later pages are fetched
+        progress_emitter = ScanProgressEmitter(
+            f"quick_scan_{user_id}_{int(start_time)}",
+            str(current_user.id),
+            websocket_manager
+        )
         
-        # Execute quick scan with new database routing
+        # Execute quick scan through the scan queue (admission control, per-user fairness)
         logger.info(f"🔐 [INTERNAL_QUICK_SCAN] Executing orchestrator with new routing...")
-        result = await orchestrator.execute_quick_scan(
-            username=username,
-            token=current_user.github_token,
-            user_id=user_id,  # Use routed user ID
-            store_results=False,
-            user_type=user_type,  # Use detected user type
-            authenticated_user_id=str(current_user.id),  # Keep original ID for reference
-            database=database  # Use routed database
+        result = await scan_queue_manager.run_scan_job(
+            ScanType.QUICK_SCAN,
+            user_id=str(current_user.id),
+            target=username,
+            parameters={
+                'orchestrator': orchestrator,
+                'token': current_user.github_token,
+                'scan_user_id': user_id,  # Use routed user ID
+                'store_results': False,
+                'progress_emitter': progress_emitter
+            },
+            priority=RequestPriority.HIGH
         )
         
         # Format repositories for response (matching fast_scan format)
@@ -271,6 +290,9 @@ async def quick_scan(
                     await database[scan_collection].insert_one(cache_data)
                     logger.info(f"🔐 [INTERNAL_QUICK_SCAN] ✅ Inserted new document")
                 
+                # The persisted /scan/results snapshot predates this scan
+                await scan_results_refresher.invalidate(str(current_user.id))
+                
                 logger.info(f"🔐 [INTERNAL_QUICK_SCAN] ✅ Stored in {storage_location}")
                 logger.info(f"🔐 [INTERNAL_QUICK_SCAN] Collection: {scan_collection}")
                 logger.info(f"🔐 [INTERNAL_QUICK_SCAN] User ID: {user_id}")
@@ -291,6 +313,13 @@ async def quick_scan(
         
     except HTTPException:
         raise
+    except ScanQueueFullError as e:
+        logger.warning(f"[QUICK SCAN] Scan queue full, rejecting scan for {username}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Scan queue is full, please retry shortly",
+            headers={"Retry-After": "30"}
+        )
     except Exception as e:
         elapsed = time.time() - start_time
         logger.error(f"[QUICK SCAN] ❌ Failed for {username} after {elapsed:.2f}s: {e}")
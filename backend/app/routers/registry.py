@@ -0,0 +1,98 @@
+"""
+Router Registry
+Single table of the API routers mounted by main.py.
+
+Router modules are imported only when they are mounted, so debug and test
+routers excluded from production are never imported there (along with the
+services they pull in).
+"""
+
+import importlib
+import logging
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional
+
+from fastapi import FastAPI
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RouterSpec:
+    """A router module and how it is mounted"""
+    module: str
+    prefix: str = ""
+    tags: List[str] = field(default_factory=list)
+    debug_only: bool = False
+
+
+# Mount order matters where prefixes overlap (e.g. the /scan routers)
+ROUTER_SPECS = [
+    RouterSpec("app.routers.auth", "/auth", ["authentication"]),
+    RouterSpec("app.routers.scan", "/scan", ["scanning"]),
+    RouterSpec("app.routers.scan_simple", "/scan", ["scanning"]),
+    RouterSpec("app.routers.test_endpoint", "/test", ["testing"], debug_only=True),
+    RouterSpec("app.routers.evaluation", "/evaluation", ["evaluation"]),
+    RouterSpec("app.routers.performance", "/performance", ["performance"]),
+    RouterSpec("app.routers.security", "/security", ["security"]),
+    RouterSpec("app.routers.profile", "/profile", ["profile"]),
+    RouterSpec("app.routers.rankings", "/rankings", ["rankings"]),
+    RouterSpec("app.routers.rankings_enhanced", "/rankings/v2", ["rankings-enhanced"]),
+    RouterSpec("app.routers.debug_rankings", "/debug/rankings", ["debug-rankings"], debug_only=True),
+    RouterSpec("app.routers.debug_users", "/debug/users", ["debug-users"], debug_only=True),
+    RouterSpec("app.routers.fast_scan", "/scan", ["fast-scan"]),
+    RouterSpec("app.api.debug", "/debug", ["debug"], debug_only=True),
+    # New scoring system routers
+    RouterSpec("app.routers.quick_scan", tags=["quick-scan"]),
+    RouterSpec("app.routers.deep_analysis", tags=["deep-analysis"]),
+    RouterSpec("app.routers.analytics_api", tags=["analytics"]),
+    # HR Dashboard routers
+    RouterSpec("app.routers.hr_auth", tags=["hr-authentication"]),
+    RouterSpec("app.routers.hr_candidates", tags=["hr-candidates"]),
+    RouterSpec("app.routers.hr_admin", tags=["hr-admin"]),
+    RouterSpec("app.routers.scores", tags=["scores"]),
+    RouterSpec("app.routers.health", tags=["health-monitoring"]),
+]
+
+
+def iter_router_specs(include_debug: bool) -> Iterator[RouterSpec]:
+    """
+    Iterate over the routers to mount
+
+    Args:
+        include_debug: Whether debug and test routers are mounted
+
+    Returns:
+        Router specs in mount order
+    """
+    for spec in ROUTER_SPECS:
+        if spec.debug_only and not include_debug:
+            continue
+        yield spec
+
+
+def include_routers(app: FastAPI, include_debug: Optional[bool] = None) -> List[str]:
+    """
+    Import and mount the API routers
+
+    Args:
+        app: Application to mount the routers on
+        include_debug: Mount debug and test routers (default: outside production)
+
+    Returns:
+        Module names of the mounted routers
+    """
+    if include_debug is None:
+        from app.core.config import settings
+        include_debug = not settings.is_production()
+
+    mounted = []
+    for spec in iter_router_specs(include_debug):
+        module = importlib.import_module(spec.module)
+        app.include_router(module.router, prefix=spec.prefix, tags=list(spec.tags))
+        mounted.append(spec.module)
+
+    skipped = len(ROUTER_SPECS) - len(mounted)
+    if skipped:
+        logger.info("Skipped %d debug/test routers in production", skipped)
+    return mounted
@@ -16,11 +16,13 @@ from app.models.analysis_response import (
     ErrorResponse
 )
 from app.services.cache_service import cache_service
+from app.services.contribution_calendar_store import WEEKDAY_NAMES, contribution_level
 
 logger = logging.getLogger(__name__)
 
 from app.database import get_database
 from app.core.security import get_current_user_token
+from app.core.auth_context import user_document_cache
 from app.core.validation import (
     ScanRequest, GitHubUrlRequest, PaginationParams, SearchParams,
     InputSanitizer, ValidationError
@@ -36,6 +38,7 @@ from app.services.ml_evaluation_service import ml_service
 from app.tasks.scan_tasks import scan_user_repositories, scan_single_repository, get_scan_progress, get_scan_result
 from app.services.cache_service import cache_service
 from app.services.performance_service import performance_service
+from app.services.scan_results_refresher import scan_results_refresher
 from app.services.scan_progress_tracker import (
     start_scan_progress, update_scan_phase, update_repository_progress,
     report_scan_error, report_scan_warning, complete_scan_progress,
@@ -283,6 +286,29 @@ class ScanProgress(BaseModel):
 # In-memory storage for scan progress (in production, use Redis)
 scan_progress_store = {}
 
+async def load_internal_user(db, user_id: str) -> Optional[User]:
+    """Load an internal user record by id (cached for a short TTL)"""
+    async def load_internal_user_document():
+        # Use correct collection
+        user_doc = await db[Collections.INTERNAL_USERS].find_one({"user_id": user_id})
+        
+        # Fallback to ObjectId lookup if not found by string ID
+        if not user_doc:
+            from bson import ObjectId
+            if ObjectId.is_valid(user_id):
+                user_doc = await db[Collections.INTERNAL_USERS].find_one({"_id": ObjectId(user_id)})
+        return user_doc
+    
+    # Short-TTL cache: repeated calls skip the 1-2 find_one round trips
+    user_doc = await user_document_cache.get_or_load(Collections.INTERNAL_USERS, user_id, load_internal_user_document)
+    if not user_doc:
+        return None
+    
+    # Map internal user to User model
+    # Ensure _id is string
+    user_doc["_id"] = str(user_doc["_id"])
+    return User(**user_doc)
+
 async def get_current_user(
     current_user_token: dict = Depends(get_current_user_token),
     db = Depends(get_database)
@@ -294,20 +320,9 @@ async def get_current_user(
         
         if user_type == "developer" and db is not None:
             try:
-                # Use correct collection
-                user_doc = await db[Collections.INTERNAL_USERS].find_one({"user_id": user_id})
-                
-                # Fallback to ObjectId lookup if not found by string ID
-                if not user_doc:
-                    from bson import ObjectId
-                    if ObjectId.is_valid(user_id):
-                        user_doc = await db[Collections.INTERNAL_USERS].find_one({"_id": ObjectId(user_id)})
-                
-                if user_doc:
-                    # Map internal user to User model
-                    # Ensure _id is string
-                    user_doc["_id"] = str(user_doc["_id"])
-                    return User(**user_doc)
+                user = await load_internal_user(db, user_id)
+                if user:
+                    return user
             except Exception as e:
                 logger.warning(f"Database query failed: {e}")
         
@@ -450,7 +465,7 @@ async def get_scan_results(
     user_id: str,
     current_user: User = Depends(get_current_user)
 ):
-    """Get scan results for a user with caching"""
+    """Get the last persisted scan results for a user (refreshed in the background when stale)"""
     try:
         # Validate user_id format
         if not user_id or len(user_id.strip()) == 0:
@@ -463,229 +478,257 @@ async def get_scan_results(
         logger.info(f"Getting scan results for user_id: {user_id}, current_user: {current_user.id if current_user else 'None'}")
         
         # Verify user can access these results
-        if str(current_user.id) != user_id and current_user.user_type != "hr":
-            raise HTTPException(status_code=403, detail="Access denied to this user's data")
-        
-        # Try cache first
-        cached_results = await cache_service.get_scan_results(user_id)
-        if cached_results:
-            return cached_results
-        
-        # Use optimized performance service for better query performance
-        try:
-            repositories = await performance_service.get_optimized_user_repositories(user_id)
-            evaluations = await performance_service.get_optimized_user_evaluations(user_id)
-        except Exception as e:
-            logger.warning(f"Performance service failed: {e}")
-            repositories = []
-            evaluations = []
-        
-        # If no scan data exists, fetch real GitHub data with enhanced analysis
-        if not evaluations or not repositories:
-            return await get_real_github_stats(current_user)
-        
-        # Calculate overall statistics from existing scan data
-        if not evaluations:
-            return {
+        subject_user = current_user
+        if str(current_user.id) != user_id:
+            if current_user.user_type != "hr":
+                raise HTTPException(status_code=403, detail="Access denied to this user's data")
+            
+            # HR view of another user: results are computed (and persisted under
+            # user_id) from that user's record, never from the HR user's
+            users_db = await get_database()
+            subject_user = await load_internal_user(users_db, user_id) if users_db is not None else None
+            if subject_user is None:
+                raise HTTPException(status_code=404, detail="User not found")
+        
+        # Serve the last persisted result; stale or missing results are
+        # recomputed in the background and announced over the WebSocket
+        return await scan_results_refresher.serve(
+            db,
+            user_id,
+            lambda: compute_scan_results(user_id, subject_user, db),
+            empty_results={
                 "userId": user_id,
                 "overallScore": 0,
-                "repositoryCount": len(repositories),
+                "repositoryCount": 0,
                 "lastScanDate": None,
                 "languages": [],
                 "techStack": [],
                 "roadmap": []
             }
+        )
         
-        # Calculate overall score
-        total_score = sum(eval_data["acid_score"]["overall"] for eval_data in evaluations)
-        overall_score = total_score / len(evaluations) if evaluations else 0
-        
-        # Get language statistics
-        language_stats = {}
-        for repo in repositories:
-            if repo.get("languages"):
-                for lang, lines in repo["languages"].items():
-                    if lang not in language_stats:
-                        language_stats[lang] = {"lines": 0, "repos": 0}
-                    language_stats[lang]["lines"] += lines
-                    language_stats[lang]["repos"] += 1
-        
-        # Convert to percentage
-        total_lines = sum(stats["lines"] for stats in language_stats.values())
-        languages = []
-        if total_lines > 0:
-            for lang, stats in language_stats.items():
-                languages.append({
-                    "language": lang,
-                    "percentage": round((stats["lines"] / total_lines) * 100, 1),
-                    "linesOfCode": stats["lines"],
-                    "repositories": stats["repos"]
-                })
-        
-        # Sort by percentage
-        languages.sort(key=lambda x: x["percentage"], reverse=True)
-        
-        # Get latest scan date
-        latest_eval = max(evaluations, key=lambda x: x["created_at"]) if evaluations else None
-        last_scan_date = latest_eval["created_at"] if latest_eval else None
-        
-        # Extract tech stack from repositories
-        tech_stack = await extract_tech_stack_from_repositories(repositories)
-        
-        # Generate learning roadmap
-        roadmap = generate_learning_roadmap(languages, tech_stack, overall_score)
-        
-        scan_results = {
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error in get_scan_results: {str(e)}")
+        import traceback
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=f"Failed to get scan results: {str(e)}")
+
+
+async def compute_scan_results(user_id: str, user: User, db) -> Dict[str, Any]:
+    """
+    Compute scan results from stored evaluations (or live GitHub data when none exist)
+    
+    Runs as the background refresh job behind GET /scan/results; also stores
+    user_overall_details and comparison scores and triggers the ranking sync.
+    The results are persisted under user_id, so user must be that user's own
+    record, never the viewer's (the live GitHub fallback scans that account).
+    """
+    # Use optimized performance service for better query performance
+    try:
+        repositories = await performance_service.get_optimized_user_repositories(user_id)
+        evaluations = await performance_service.get_optimized_user_evaluations(user_id)
+    except Exception as e:
+        logger.warning(f"Performance service failed: {e}")
+        repositories = []
+        evaluations = []
+    
+    # If no scan data exists, fetch real GitHub data with enhanced analysis
+    if not evaluations or not repositories:
+        return await get_real_github_stats(user)
+    
+    # Calculate overall statistics from existing scan data
+    if not evaluations:
+        return {
             "userId": user_id,
-            "overallScore": round(overall_score, 1),
+            "overallScore": 0,
             "repositoryCount": len(repositories),
-            "lastScanDate": last_scan_date.isoformat() if last_scan_date else None,
-            "languages": languages[:10],  # Top 10 languages
-            "techStack": tech_stack,
-            "roadmap": roadmap
+            "lastScanDate": None,
+            "languages": [],
+            "techStack": [],
+            "roadmap": []
         }
+    
+    # Calculate overall score
+    total_score = sum(eval_data["acid_score"]["overall"] for eval_data in evaluations)
+    overall_score = total_score / len(evaluations) if evaluations else 0
+    
+    # Get language statistics
+    language_stats = {}
+    for repo in repositories:
+        if repo.get("languages"):
+            for lang, lines in repo["languages"].items():
+                if lang not in language_stats:
+                    language_stats[lang] = {"lines": 0, "repos": 0}
+                language_stats[lang]["lines"] += lines
+                language_stats[lang]["repos"] += 1
+    
+    # Convert to percentage
+    total_lines = sum(stats["lines"] for stats in language_stats.values())
+    languages = []
+    if total_lines > 0:
+        for lang, stats in language_stats.items():
+            languages.append({
+                "language": lang,
+                "percentage": round((stats["lines"] / total_lines) * 100, 1),
+                "linesOfCode": stats["lines"],
+                "repositories": stats["repos"]
+            })
+    
+    # Sort by percentage
+    languages.sort(key=lambda x: x["percentage"], reverse=True)
+    
+    # Get latest scan date
+    latest_eval = max(evaluations, key=lambda x: x["created_at"]) if evaluations else None
+    last_scan_date = latest_eval["created_at"] if latest_eval else None
+    
+    # Extract tech stack from repositories
+    tech_stack = await extract_tech_stack_from_repositories(repositories)
+    
+    # Generate learning roadmap
+    roadmap = generate_learning_roadmap(languages, tech_stack, overall_score)
+    
+    scan_results = {
+        "userId": user_id,
+        "overallScore": round(overall_score, 1),
+        "repositoryCount": len(repositories),
+        "lastScanDate": last_scan_date.isoformat() if last_scan_date else None,
+        "languages": languages[:10],  # Top 10 languages
+        "techStack": tech_stack,
+        "roadmap": roadmap
+    }
+    
+    # CRITICAL: Populate user_overall_details collection for ranking system
+    try:
+        if overall_score > 0 and user.github_username:
+            logger.info(f"📊 [USER_OVERALL_DETAILS] Storing scan results for {user.github_username}")
+            
+            # Prepare overall details document
+            overall_details = {
+                "user_id": user_id,
+                "github_username": user.github_username,
+                "overall_score": round(overall_score, 1),
+                "repository_count": len(repositories),
+                "evaluated_repository_count": len(evaluations),
+                "languages": languages[:10],
+                "tech_stack": tech_stack,
+                "last_scan_date": last_scan_date,
+                "updated_at": datetime.utcnow(),
+                "scan_type": "internal"
+            }
+            
+            # Upsert into user_overall_details collection
+            await db.user_overall_details.update_one(
+                {"user_id": user_id},
+                {"$set": overall_details},
+                upsert=True
+            )
+            
+            logger.info(f"✅ [USER_OVERALL_DETAILS] Successfully stored scan results")
+            logger.info(f"   - Username: {user.github_username}")
+            logger.info(f"   - Overall Score: {round(overall_score, 1)}")
+            logger.info(f"   - Repository Count: {len(repositories)}")
+    except Exception as details_error:
+        logger.error(f"❌ [USER_OVERALL_DETAILS] Error storing scan results: {details_error}")
+        # Don't fail the request if storage fails
+    
+    # Store scores in scores_comparison collection (for authenticated users)
+    try:
+        from app.services.score_extractor import ScoreExtractor
+        from app.services.score_storage_service import get_score_storage_service
+        from app.db_connection import get_scores_database
         
-        # CRITICAL: Populate user_overall_details collection for ranking system
-        try:
-            if overall_score > 0 and current_user.github_username:
-                logger.info(f"📊 [USER_OVERALL_DETAILS] Storing scan results for {current_user.github_username}")
+        logger.info(f"[SCORE STORAGE] Storing authenticated user scores for {user.github_username}")
+        
+        # Get scores database connection
+        scores_db = await get_scores_database()
+        
+        if scores_db and overall_score > 0 and user.github_username:
+            # Extract flagship and significant repositories
+            # Add scores to repositories for extraction
+            repos_with_scores = []
+            for repo in repositories:
+                # Find matching evaluation
+                matching_eval = next(
+                    (e for e in evaluations if e.get("repo_id") == str(repo.get("_id"))),
+                    None
+                )
+                if matching_eval:
+                    repo['overall_score'] = matching_eval.get("acid_score", {}).get("overall", 0)
+                    repo['acid_scores'] = matching_eval.get("acid_score", {})
+                    repos_with_scores.append(repo)
+            
+            if repos_with_scores:
+                flagship_repos, significant_repos = ScoreExtractor.extract_scores_from_repositories(
+                    repos_with_scores,
+                    overall_score
+                )
                 
-                # Prepare overall details document
-                overall_details = {
-                    "user_id": user_id,
-                    "github_username": current_user.github_username,
-                    "overall_score": round(overall_score, 1),
-                    "repository_count": len(repositories),
-                    "evaluated_repository_count": len(evaluations),
-                    "languages": languages[:10],
-                    "tech_stack": tech_stack,
-                    "last_scan_date": last_scan_date,
-                    "updated_at": datetime.utcnow(),
-                    "scan_type": "internal"
+                # Get user info for metadata
+                user_metadata = {
+                    "github_username": user.github_username,
+                    "name": user.name or user.github_username,
+                    "bio": None,
+                    "location": None,
+                    "company": None,
+                    "total_repositories_analyzed": len(repos_with_scores),
+                    "total_stars": sum(repo.get("stars", 0) for repo in repositories),
+                    "total_forks": sum(repo.get("forks", 0) for repo in repositories),
+                    "top_languages": [
+                        {"language": lang["language"], "count": lang["repositories"]}
+                        for lang in languages[:5]
+                    ]
                 }
                 
-                # Upsert into user_overall_details collection
-                await db.user_overall_details.update_one(
-                    {"user_id": user_id},
-                    {"$set": overall_details},
-                    upsert=True
-                )
+                # Get score storage service
+                score_service = await get_score_storage_service(scores_db)
                 
-                logger.info(f"✅ [USER_OVERALL_DETAILS] Successfully stored scan results")
-                logger.info(f"   - Username: {current_user.github_username}")
-                logger.info(f"   - Overall Score: {round(overall_score, 1)}")
-                logger.info(f"   - Repository Count: {len(repositories)}")
-        except Exception as details_error:
-            logger.error(f"❌ [USER_OVERALL_DETAILS] Error storing scan results: {details_error}")
-            # Don't fail the request if storage fails
-        
-        # Store scores in scores_comparison collection (for authenticated users)
-        try:
-            from app.services.score_extractor import ScoreExtractor
-            from app.services.score_storage_service import get_score_storage_service
-            from app.db_connection import get_scores_database
-            
-            logger.info(f"[SCORE STORAGE] Storing authenticated user scores for {current_user.github_username}")
-            
-            # Get scores database connection
-            scores_db = await get_scores_database()
-            
-            if scores_db and overall_score > 0 and current_user.github_username:
-                # Extract flagship and significant repositories
-                # Add scores to repositories for extraction
-                repos_with_scores = []
-                for repo in repositories:
-                    # Find matching evaluation
-                    matching_eval = next(
-                        (e for e in evaluations if e.get("repo_id") == str(repo.get("_id"))),
-                        None
-                    )
-                    if matching_eval:
-                        repo['overall_score'] = matching_eval.get("acid_score", {}).get("overall", 0)
-                        repo['acid_scores'] = matching_eval.get("acid_score", {})
-                        repos_with_scores.append(repo)
+                # Store scores
+                success = await score_service.store_user_scores(
+                    username=user.github_username,
+                    user_id=str(user.id),
+                    overall_score=overall_score,
+                    flagship_repos=flagship_repos,
+                    significant_repos=significant_repos,
+                    metadata=user_metadata
+                )
                 
-                if repos_with_scores:
-                    flagship_repos, significant_repos = ScoreExtractor.extract_scores_from_repositories(
-                        repos_with_scores,
-                        overall_score
-                    )
-                    
-                    # Get user info for metadata
-                    user_metadata = {
-                        "github_username": current_user.github_username,
-                        "name": current_user.name or current_user.github_username,
-                        "bio": None,
-                        "location": None,
-                        "company": None,
-                        "total_repositories_analyzed": len(repos_with_scores),
-                        "total_stars": sum(repo.get("stars", 0) for repo in repositories),
-                        "total_forks": sum(repo.get("forks", 0) for repo in repositories),
-                        "top_languages": [
-                            {"language": lang["language"], "count": lang["repositories"]}
-                            for lang in languages[:5]
-                        ]
-                    }
-                    
-                    # Get score storage service
-                    score_service = await get_score_storage_service(scores_db)
-                    
-                    # Store scores
-                    success = await score_service.store_user_scores(
-                        username=current_user.github_username,
-                        user_id=str(current_user.id),
-                        overall_score=overall_score,
-                        flagship_repos=flagship_repos,
-                        significant_repos=significant_repos,
-                        metadata=user_metadata
-                    )
-                    
-                    if success:
-                        logger.info(f"✅ [SCORE STORAGE] Successfully stored authenticated user scores")
-                        logger.info(f"   - Username: {current_user.github_username}")
-                        logger.info(f"   - Overall Score: {overall_score}")
-                        logger.info(f"   - Flagship Repos: {len(flagship_repos)}")
-                        logger.info(f"   - Significant Repos: {len(significant_repos)}")
-                    else:
-                        logger.warning(f"⚠️ [SCORE STORAGE] Failed to store authenticated user scores")
-            else:
-                if not scores_db:
-                    logger.warning(f"[SCORE STORAGE] Scores database not available")
-                elif not current_user.github_username:
-                    logger.info(f"[SCORE STORAGE] No GitHub username for authenticated user")
+                if success:
+                    logger.info(f"✅ [SCORE STORAGE] Successfully stored authenticated user scores")
+                    logger.info(f"   - Username: {user.github_username}")
+                    logger.info(f"   - Overall Score: {overall_score}")
+                    logger.info(f"   - Flagship Repos: {len(flagship_repos)}")
+                    logger.info(f"   - Significant Repos: {len(significant_repos)}")
                 else:
-                    logger.info(f"[SCORE STORAGE] No score to store (score: {overall_score})")
-                    
-        except Exception as score_error:
-            logger.error(f"❌ [SCORE STORAGE] Error storing authenticated user scores: {score_error}")
-            # Don't fail the request if score storage fails
-        
-        # Trigger ranking sync after scan completion (for internal scans only)
-        try:
-            if overall_score > 0 and current_user.github_username:
-                logger.info(f"🎯 Triggering ranking sync after scan completion")
-                scanner = GitHubScanner(current_user.github_token)
-                await scanner.trigger_ranking_sync_after_scan(
-                    user_id=str(current_user.id),
-                    scan_type='self',  # This is an internal scan
-                    db=db
-                )
-        except Exception as ranking_error:
-            logger.error(f"❌ [RANKING SYNC] Error triggering ranking sync: {ranking_error}")
-            # Don't fail the request if ranking sync fails
-        
-        # Cache the scan results for 30 minutes
-        await cache_service.cache_scan_results(user_id, scan_results, 1800)
-        
-        return scan_results
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in get_scan_results: {str(e)}")
-        import traceback
-        logger.error(f"Traceback: {traceback.format_exc()}")
-        raise HTTPException(status_code=500, detail=f"Failed to get scan results: {str(e)}")
+                    logger.warning(f"⚠️ [SCORE STORAGE] Failed to store authenticated user scores")
+        else:
+            if not scores_db:
+                logger.warning(f"[SCORE STORAGE] Scores database not available")
+            elif not user.github_username:
+                logger.info(f"[SCORE STORAGE] No GitHub username for authenticated user")
+            else:
+                logger.info(f"[SCORE STORAGE] No score to store (score: {overall_score})")
+                
+    except Exception as score_error:
+        logger.error(f"❌ [SCORE STORAGE] Error storing authenticated user scores: {score_error}")
+        # Don't fail the request if score storage fails
+    
+    # Trigger ranking sync after scan completion (for internal scans only)
+    try:
+        if overall_score > 0 and user.github_username:
+            logger.info(f"🎯 Triggering ranking sync after scan completion")
+            scanner = GitHubScanner(user.github_token)
+            await scanner.trigger_ranking_sync_after_scan(
+                user_id=str(user.id),
+                scan_type='self',  # This is an internal scan
+                db=db
+            )
+    except Exception as ranking_error:
+        logger.error(f"❌ [RANKING SYNC] Error triggering ranking sync: {ranking_error}")
+        # Don't fail the request if ranking sync fails
+    
+    return scan_results
 
 async def get_real_github_stats(user: User):
     """Fetch comprehensive real-time GitHub statistics for a user"""
@@ -2136,7 +2179,8 @@ async def get_github_user_info(username: str, request: Request):
         
         # Get user information directly from GitHub API
         logger.info(f"Fetching user info from GitHub API for: {username}")
-        import httpx
+        import aiohttp
+        from app.services.connection_pool_manager import get_http_pool
         
         headers = {
             "Authorization": f"token {github_token}",
@@ -2144,36 +2188,39 @@ async def get_github_user_info(username: str, request: Request):
             "User-Agent": "BroskiesHub-API"
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.get(f"https://api.github.com/users/{username}", headers=headers)
-                
-                if response.status_code == 404:
+        try:
+            async with get_http_pool().request(
+                "GET",
+                f"https://api.github.com/users/{username}",
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=30.0)
+            ) as response:
+                if response.status == 404:
                     raise HTTPException(
                         status_code=404,
                         detail=f"GitHub user '{username}' not found"
                     )
-                elif response.status_code != 200:
-                    logger.error(f"GitHub API error: {response.status_code} - {response.text}")
+                elif response.status != 200:
+                    logger.error(f"GitHub API error: {response.status} - {await response.text()}")
                     raise HTTPException(
                         status_code=503,
                         detail="GitHub API service is temporarily unavailable. Please try again later."
                     )
                 
-                user_info = response.json()
+                user_info = await response.json()
                 
-            except httpx.TimeoutException:
-                logger.error(f"GitHub API timeout for user: {username}")
-                raise HTTPException(
-                    status_code=503,
-                    detail="GitHub API request timed out. Please try again later."
-                )
-            except Exception as e:
-                logger.error(f"GitHub API request failed: {e}")
-                raise HTTPException(
-                    status_code=503,
-                    detail="GitHub API service is temporarily unavailable. Please try again later."
-                )
+        except asyncio.TimeoutError:
+            logger.error(f"GitHub API timeout for user: {username}")
+            raise HTTPException(
+                status_code=503,
+                detail="GitHub API request timed out. Please try again later."
+            )
+        except Exception as e:
+            logger.error(f"GitHub API request failed: {e}")
+            raise HTTPException(
+                status_code=503,
+                detail="GitHub API service is temporarily unavailable. Please try again later."
+            )
         
         logger.info(f"Successfully retrieved user info for: {username}")
         
@@ -2226,15 +2273,17 @@ async def get_contribution_calendar(
     try:
         logger.info(f"Getting contribution calendar for: {username}")
         
-        # Check cache first for contribution calendar data
-        cache_key = f"contribution_calendar_{username}_{from_date or 'all'}"
-        try:
-            cached_calendar = await cache_service.get(cache_key, "contribution_calendars")
-            if cached_calendar:
-                logger.info(f"Returning cached contribution calendar for: {username}")
-                return cached_calendar
-        except Exception as cache_error:
-            logger.warning(f"Cache get failed for contribution calendar: {cache_error}")
+        # The default window is served from the stored calendar (a local read
+        # between syncs); only explicit windows are cached as whole responses
+        cache_key = f"contribution_calendar_{username}_{from_date}"
+        if from_date:
+            try:
+                cached_calendar = await cache_service.get(cache_key, "contribution_calendars")
+                if cached_calendar:
+                    logger.info(f"Returning cached contribution calendar for: {username}")
+                    return cached_calendar
+            except Exception as cache_error:
+                logger.warning(f"Cache get failed for contribution calendar: {cache_error}")
         
         # Import GraphQL client
         from app.services.github_graphql_client import GitHubGraphQLClient
@@ -2269,12 +2318,13 @@ async def get_contribution_calendar(
                 "cache_duration": 3600  # 1 hour cache
             }
             
-            # Cache the enhanced calendar data for 1 hour
-            try:
-                await cache_service.set(cache_key, response, "contribution_calendars", 3600)
-                logger.info(f"Cached contribution calendar for: {username}")
-            except Exception as cache_error:
-                logger.warning(f"Cache set failed for contribution calendar: {cache_error}")
+            # Cache explicit windows for 1 hour
+            if from_date:
+                try:
+                    await cache_service.set(cache_key, response, "contribution_calendars", 3600)
+                    logger.info(f"Cached contribution calendar for: {username}")
+                except Exception as cache_error:
+                    logger.warning(f"Cache set failed for contribution calendar: {cache_error}")
             
             return response
             
@@ -2632,111 +2682,35 @@ async def scan_external_github_user(
             # FETCH PR/ISSUE DATA FOR REPOSITORIES
             # ============================================================================
             # Fetch PR and issue data for repositories (up to first 20 to avoid rate limits)
+            # with one batched GraphQL query per 10 repositories
             logger.info(f"[PR/ISSUE FETCH] Fetching PR/issue data for repositories")
-            from app.services.github_api_service import GitHubAPIService
-            github_api = GitHubAPIService(github_token, cache_service=cache_service)
+            from app.services.github_graphql_client import GitHubGraphQLClient
+            from app.services.repository_activity import summarize_issues, summarize_pull_requests
             
-            for idx, repo in enumerate(repositories[:20]):  # Limit to first 20 repos
-                try:
-                    repo_full_name = repo.get('full_name')
-                    if not repo_full_name or '/' not in repo_full_name:
+            scored_repositories = [
+                repo for repo in repositories[:20]  # Limit to first 20 repos
+                if '/' in (repo.get('full_name') or '')
+            ]
+            try:
+                activity = await GitHubGraphQLClient(github_token).get_repository_activity(
+                    [repo['full_name'] for repo in scored_repositories]
+                )
+                
+                for repo in scored_repositories:
+                    repository_activity = activity['repositories'].get(repo['full_name'])
+                    if not repository_activity:
                         continue
                     
-                    owner, repo_name = repo_full_name.split('/')
-                    logger.info(f"[PR/ISSUE] Fetching data for {repo_full_name}")
-                    
-                    # Fetch PRs
-                    prs = await github_api.get_pull_requests(owner, repo_name, state='all', per_page=100)
-                    
-                    if prs:
-                        open_prs = [pr for pr in prs if pr.get('state') == 'open']
-                        closed_prs = [pr for pr in prs if pr.get('state') == 'closed' and not pr.get('merged_at')]
-                        merged_prs = [pr for pr in prs if pr.get('merged_at')]
-                        
-                        # Calculate average merge time
-                        merge_times = []
-                        for pr in merged_prs:
-                            if pr.get('created_at') and pr.get('merged_at'):
-                                created = datetime.fromisoformat(pr['created_at'].replace('Z', '+00:00'))
-                                merged = datetime.fromisoformat(pr['merged_at'].replace('Z', '+00:00'))
-                                merge_times.append((merged - created).total_seconds() / 3600)
-                        
-                        avg_merge_time = sum(merge_times) / len(merge_times) if merge_times else None
-                        
-                        # Format recent PRs
-                        recent_prs = []
-                        for pr in prs[:10]:
-                            recent_prs.append({
-                                'number': pr.get('number'),
-                                'title': pr.get('title'),
-                                'author': pr.get('user', {}).get('login', 'unknown'),
-                                'state': 'merged' if pr.get('merged_at') else pr.get('state', 'open'),
-                                'createdAt': pr.get('created_at'),
-                                'mergedAt': pr.get('merged_at'),
-                                'url': pr.get('html_url', '')
-                            })
-                        
-                        repo['pull_requests'] = {
-                            'total': len(prs),
-                            'open': len(open_prs),
-                            'closed': len(closed_prs),
-                            'merged': len(merged_prs),
-                            'recent': recent_prs,
-                            'avgTimeToMerge': avg_merge_time
-                        }
-                        logger.info(f"[PR/ISSUE] Fetched {len(prs)} PRs for {repo_name}")
-                    
-                    # Fetch Issues
-                    issues = await github_api.get_issues(owner, repo_name, state='all', per_page=100)
+                    pull_requests = summarize_pull_requests(repository_activity['pull_requests'])
+                    if pull_requests:
+                        repo['pull_requests'] = pull_requests
                     
+                    issues = summarize_issues(repository_activity['issues'])
                     if issues:
-                        open_issues = [issue for issue in issues if issue.get('state') == 'open']
-                        closed_issues = [issue for issue in issues if issue.get('state') == 'closed']
-                        
-                        # Calculate average close time
-                        close_times = []
-                        for issue in closed_issues:
-                            if issue.get('created_at') and issue.get('closed_at'):
-                                created = datetime.fromisoformat(issue['created_at'].replace('Z', '+00:00'))
-                                closed = datetime.fromisoformat(issue['closed_at'].replace('Z', '+00:00'))
-                                close_times.append((closed - created).total_seconds() / 3600)
-                        
-                        avg_close_time = sum(close_times) / len(close_times) if close_times else None
-                        
-                        # Aggregate labels
-                        labels_dist = {}
-                        for issue in issues:
-                            for label in issue.get('labels', []):
-                                label_name = label.get('name', 'unknown')
-                                labels_dist[label_name] = labels_dist.get(label_name, 0) + 1
-                        
-                        # Format recent issues
-                        recent_issues = []
-                        for issue in issues[:10]:
-                            recent_issues.append({
-                                'number': issue.get('number'),
-                                'title': issue.get('title'),
-                                'author': issue.get('user', {}).get('login', 'unknown'),
-                                'state': issue.get('state', 'open'),
-                                'createdAt': issue.get('created_at'),
-                                'closedAt': issue.get('closed_at'),
-                                'url': issue.get('html_url', ''),
-                                'labels': [label.get('name') for label in issue.get('labels', [])]
-                            })
-                        
-                        repo['issues'] = {
-                            'total': len(issues),
-                            'open': len(open_issues),
-                            'closed': len(closed_issues),
-                            'recent': recent_issues,
-                            'avgTimeToClose': avg_close_time,
-                            'labelsDistribution': labels_dist
-                        }
-                        logger.info(f"[PR/ISSUE] Fetched {len(issues)} issues for {repo_name}")
-                    
-                except Exception as e:
-                    logger.error(f"[PR/ISSUE] Failed to fetch PR/issue data for {repo.get('name')}: {e}")
-                    continue
+                        repo['issues'] = issues
+                
+            except Exception as e:
+                logger.error(f"[PR/ISSUE] Failed to fetch PR/issue data: {e}")
             
             logger.info(f"[PR/ISSUE FETCH] Completed PR/issue data fetching")
             
@@ -4082,73 +4056,30 @@ async def store_external_scan_data(username: str, user_info: dict, repositories:
         logger.error(f"Storage error traceback: {traceback.format_exc()}")
 
 async def _calculate_contribution_metrics(calendar_data: Dict[str, Any], username: str) -> Dict[str, Any]:
-    """Calculate contribution streaks and activity patterns from calendar data"""
+    """
+    Summarize contribution streaks and activity patterns from calendar data
+
+    Streaks, weekday and monthly totals and per-count day numbers are kept
+    current by the contribution calendar store, so this only reshapes them.
+    """
     try:
         logger.info(f"Calculating contribution metrics for: {username}")
         
-        # Extract contribution days from GraphQL response
-        contribution_days = calendar_data.get("contributionCalendar", {}).get("weeks", [])
-        
-        # Flatten contribution days
-        all_days = []
-        for week in contribution_days:
-            for day in week.get("contributionDays", []):
-                all_days.append({
-                    "date": day.get("date"),
-                    "contributionCount": day.get("contributionCount", 0),
-                    "level": day.get("color", 0)  # GitHub uses color levels 0-4
-                })
+        days = calendar_data.get("calendar_data", [])
+        streaks = calendar_data.get("contribution_streaks", {})
+        patterns = calendar_data.get("contribution_patterns", {})
         
-        # Sort by date
-        all_days.sort(key=lambda x: x["date"])
-        
-        # Calculate streaks
-        current_streak = 0
-        longest_streak = 0
-        temp_streak = 0
-        
-        # Calculate from most recent day backwards
-        today = datetime.now().date()
-        for day in reversed(all_days):
-            day_date = datetime.fromisoformat(day["date"]).date()
-            
-            if day["contributionCount"] > 0:
-                if day_date == today or (today - day_date).days <= current_streak + 1:
-                    temp_streak += 1
-                    if day_date == today or (today - day_date).days == current_streak:
-                        current_streak = temp_streak
-                else:
-                    break
-            else:
-                if day_date == today:
-                    continue  # Skip today if no contributions
-                else:
-                    break
-        
-        # Find longest streak
-        temp_streak = 0
-        for day in all_days:
-            if day["contributionCount"] > 0:
-                temp_streak += 1
-                longest_streak = max(longest_streak, temp_streak)
-            else:
-                temp_streak = 0
+        total_contributions = calendar_data.get("total_contributions", 0)
+        current_streak = streaks.get("current_streak", 0)
+        longest_streak = streaks.get("longest_streak", 0)
         
-        # Calculate activity patterns
-        day_patterns = {"Monday": 0, "Tuesday": 0, "Wednesday": 0, "Thursday": 0, "Friday": 0, "Saturday": 0, "Sunday": 0}
+        # Activity patterns by weekday and month name
+        weekday_totals = patterns.get("weekday_totals", {})
+        day_patterns = {name: weekday_totals.get(name, 0) for name in WEEKDAY_NAMES}
         month_patterns = {}
-        total_contributions = 0
-        
-        for day in all_days:
-            contributions = day["contributionCount"]
-            total_contributions += contributions
-            
+        for month_key, contributions in patterns.get("monthly_trends", {}).items():
             if contributions > 0:
-                day_date = datetime.fromisoformat(day["date"])
-                day_name = day_date.strftime("%A")
-                month_name = day_date.strftime("%B")
-                
-                day_patterns[day_name] += contributions
+                month_name = datetime.strptime(month_key, "%Y-%m").strftime("%B")
                 month_patterns[month_name] = month_patterns.get(month_name, 0) + contributions
         
         # Find most active day and month
@@ -4156,9 +4087,14 @@ async def _calculate_contribution_metrics(calendar_data: Dict[str, Any], usernam
         most_active_month = max(month_patterns.items(), key=lambda x: x[1])[0] if month_patterns else "January"
         
         # Calculate average contributions per day
-        active_days = len([day for day in all_days if day["contributionCount"] > 0])
+        active_days = patterns.get("total_active_days", 0)
         avg_contributions_per_active_day = total_contributions / active_days if active_days > 0 else 0
         
+        # Days per contribution level, from the number of days at each count
+        level_days = [0] * 5
+        for count, days_at_count in calendar_data.get("contribution_levels", {}).items():
+            level_days[contribution_level(int(count))] += days_at_count
+        
         # Enhanced calendar data
         enhanced_calendar = {
             **calendar_data,
@@ -4167,7 +4103,7 @@ async def _calculate_contribution_metrics(calendar_data: Dict[str, Any], usernam
                 "current_streak": current_streak,
                 "longest_streak": longest_streak,
                 "active_days": active_days,
-                "total_days": len(all_days),
+                "total_days": len(days),
                 "average_contributions_per_active_day": round(avg_contributions_per_active_day, 2)
             },
             "activity_patterns": {
@@ -4176,14 +4112,15 @@ async def _calculate_contribution_metrics(calendar_data: Dict[str, Any], usernam
                 "month_distribution": month_patterns,
                 "most_active_month": most_active_month
             },
-            "contribution_levels": {
-                "level_0": len([d for d in all_days if d["contributionCount"] == 0]),
-                "level_1": len([d for d in all_days if 1 <= d["contributionCount"] <= 3]),
-                "level_2": len([d for d in all_days if 4 <= d["contributionCount"] <= 6]),
-                "level_3": len([d for d in all_days if 7 <= d["contributionCount"] <= 9]),
-                "level_4": len([d for d in all_days if d["contributionCount"] >= 10])
-            },
-            "processed_days": all_days
+            "contribution_levels": {f"level_{level}": count for level, count in enumerate(level_days)},
+            "processed_days": [
+                {
+                    "date": day.get("date"),
+                    "contributionCount": day.get("count", 0),
+                    "level": day.get("color", 0)
+                }
+                for day in days
+            ]
         }
         
         logger.info(f"Calculated contribution metrics for {username}: {total_contributions} total contributions, {current_streak} current streak")
@@ -0,0 +1,216 @@
+"""
+Analysis Jobs
+Durable execution of deep analyses outside the API request loop.
+
+Analyses are dispatched to the Celery worker consuming ``analysis_queue``
+(DEEP_ANALYSIS_BACKEND=celery). Every evaluated repository is checkpointed in
+the analysis_states document, so a job redelivered after a worker restart
+skips the repositories it already finished. When an analysis finishes, the
+scan document it was started from is updated by handle_analysis_finished()
+instead of a request-side poller.
+
+With DEEP_ANALYSIS_BACKEND=local (the default), or when the broker cannot be
+reached, jobs run in the API process as before.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_QUEUE = "analysis_queue"
+
+
+def durable_jobs_enabled() -> bool:
+    """Whether deep analyses are dispatched to the Celery analysis worker"""
+    return (settings.deep_analysis_backend or "").lower() == "celery"
+
+
+def enqueue_durable_job(task_name: str, **kwargs) -> Optional[str]:
+    """
+    Publish a job to the analysis worker
+
+    Args:
+        task_name: Task in app.tasks.analysis_tasks
+        **kwargs: Task keyword arguments (must be JSON serializable)
+
+    Returns:
+        The Celery task id, or None when durable jobs are disabled or the
+        job could not be published (the caller then runs it in-process)
+    """
+    if not durable_jobs_enabled():
+        return None
+
+    try:
+        from app.tasks import analysis_tasks
+
+        task = getattr(analysis_tasks, task_name)
+        # retry=False: fail fast when the broker is down instead of stalling the request
+        result = task.apply_async(kwargs=kwargs, queue=ANALYSIS_QUEUE, retry=False)
+        logger.info("Queued %s job %s on %s", task_name, result.id, ANALYSIS_QUEUE)
+        return result.id
+    except Exception as e:
+        logger.warning("Could not queue %s job, running it in-process: %s", task_name, e)
+        return None
+
+
+async def get_job_database():
+    """
+    Database holding analysis states and the scan documents jobs update
+
+    This is the connection get_analysis_orchestrator() stores analysis state
+    on (app.db_connection), which the analysis worker connects at process start.
+
+    Raises:
+        RuntimeError: When MongoDB is unavailable (only the in-memory fallback is left)
+    """
+    from app.db_connection import get_database
+
+    database = await get_database()
+    if database is None or getattr(database, 'is_mock', False):
+        raise RuntimeError("Database not available for analysis job")
+    return database
+
+
+async def resolve_job_github_token(token_user_id: Optional[str] = None) -> Optional[str]:
+    """
+    GitHub token for a job, looked up in the worker instead of travelling with the job
+
+    Args:
+        token_user_id: User whose stored token the analysis was started with
+
+    Returns:
+        The user's token, or the system token (settings.github_token)
+    """
+    if token_user_id:
+        from app.database.connection_manager import mongo_connection_manager
+
+        users_database = mongo_connection_manager.get_database(settings.database_name)
+        if users_database is not None:
+            try:
+                user = await users_database.users.find_one({'_id': token_user_id}, {'github_token': 1})
+                if user and user.get('github_token'):
+                    return user['github_token']
+            except Exception as e:
+                logger.warning("Could not load the GitHub token of user %s: %s", token_user_id, e)
+        logger.info("No stored GitHub token for user %s, using the system token", token_user_id)
+
+    return settings.github_token
+
+
+def _overall_score(state: Dict[str, Any]) -> float:
+    """Overall score of a finished analysis, falling back to repository scores"""
+    overall_score = state.get('overall_score') or 0
+
+    if not overall_score:
+        scores = [
+            repo.get('overall_score', 0) for repo in state.get('repositories', [])
+            if (repo.get('overall_score') or 0) > 0
+        ]
+        if scores:
+            overall_score = sum(scores) / len(scores)
+
+    if not overall_score:
+        acid_score = state.get('acid_score')
+        if isinstance(acid_score, dict):
+            overall_score = acid_score.get('overall', 0)
+        elif isinstance(acid_score, (int, float)):
+            overall_score = acid_score
+
+    return float(overall_score or 0)
+
+
+async def handle_analysis_finished(state: Dict[str, Any], database=None):
+    """
+    Completion event: copy a finished analysis onto the scan document it was started from
+
+    Args:
+        state: Final analysis state (must carry the scan_target recorded at initiation)
+        database: Database handle (the shared database when omitted)
+    """
+    target = state.get('scan_target')
+    analysis_id = state.get('analysis_id')
+    if not target or not target.get('scan_collection'):
+        return
+
+    if database is None:
+        try:
+            database = await get_job_database()
+        except RuntimeError as e:
+            logger.error("[%s] Cannot record analysis completion: %s", analysis_id, e)
+            return
+
+    collection = database[target['scan_collection']]
+    status = str(getattr(state.get('status'), 'value', state.get('status')))
+
+    if status == 'complete':
+        overall_score = round(_overall_score(state), 1)
+        result = await collection.update_one(
+            {'analysis_id': analysis_id},
+            {'$set': {
+                'overallScore': overall_score,
+                'overall_score': overall_score,
+                'analyzedAt': datetime.utcnow().isoformat(),
+                'updated_at': datetime.utcnow(),
+                'deepAnalysisInProgress': False,
+                'deepAnalysisComplete': True,
+                'activityScore': state.get('activity_score', 0),
+                'consistencyScore': state.get('consistency_score', 0),
+                'innovationScore': state.get('innovation_score', 0),
+                'deliveryScore': state.get('delivery_score', 0),
+                'analysis_completed_at': datetime.utcnow().isoformat(),
+                'real_analysis_complete': True,
+                'analysis_summary': state.get('analysis_summary', {})
+            }}
+        )
+        if result.modified_count:
+            logger.info("[%s] Scan document updated for %s (overall score %s)",
+                        analysis_id, state.get('username'), overall_score)
+        else:
+            logger.warning("[%s] No scan document found with this analysis_id", analysis_id)
+
+        # The user's persisted /scan/results snapshot predates this analysis
+        if target.get('results_user_id'):
+            from app.services.scan_results_refresher import scan_results_refresher
+            await scan_results_refresher.invalidate(target['results_user_id'], database)
+
+    elif status == 'failed':
+        await collection.update_one(
+            {'analysis_id': analysis_id, 'document_type': 'updated_with_deep_analysis'},
+            {'$set': {
+                'deepAnalysisInProgress': False,
+                'deepAnalysisComplete': False,
+                'deepAnalysisError': True
+            }}
+        )
+        logger.error("[%s] Analysis failed: %s", analysis_id, state.get('error'))
+
+
+async def run_orchestrated_analysis(
+    analysis_id: str,
+    username: str,
+    repositories: List[Dict[str, Any]],
+    max_evaluate: int = 15,
+    token_user_id: Optional[str] = None
+):
+    """
+    Run (or resume) an orchestrated analysis against the persistent state storage
+
+    Args:
+        analysis_id: Analysis initiated by AnalysisOrchestrator.initiate_analysis
+        username: GitHub username
+        repositories: Repositories passed to initiate_analysis
+        max_evaluate: Maximum number of repositories to evaluate
+        token_user_id: User whose stored GitHub token to use (system token when omitted)
+    """
+    from app.services.analysis_orchestrator import AnalysisOrchestrator
+    from app.services.analysis_state_storage import AnalysisStateStorage
+
+    database = await get_job_database()
+    github_token = await resolve_job_github_token(token_user_id)
+
+    orchestrator = AnalysisOrchestrator(state_storage=AnalysisStateStorage(database))
+    await orchestrator.run_analysis(analysis_id, username, repositories, max_evaluate, github_token)
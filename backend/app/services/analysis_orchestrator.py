@@ -16,6 +16,8 @@ from app.services.evaluation_engine import EvaluationEngine
 from app.services.analysis_state_storage import AnalysisStateStorage
 from app.services.enhanced_evaluation_service import EnhancedEvaluationService
 from app.services.score_calculation_service import ScoreCalculationService
+from app.services.scan_queue_manager import scan_queue_manager, ScanType
+from app.services.analysis_jobs import enqueue_durable_job, handle_analysis_finished
 
 logger = logging.getLogger(__name__)
 analytics_logger = logging.getLogger("analytics")
@@ -61,21 +63,38 @@ class AnalysisOrchestrator:
         username: str, 
         repositories: List[Dict[str, Any]],
         max_evaluate: int = 15,
-        github_token: Optional[str] = None
+        github_token: Optional[str] = None,
+        owner: Optional[str] = None,
+        scan_target: Optional[Dict[str, Any]] = None,
+        analysis_id: Optional[str] = None,
+        token_user_id: Optional[str] = None
     ) -> str:
         """
         Initiate repository analysis process.
         
+        With persistent state storage the analysis is dispatched as a durable
+        job to the analysis worker (see app.services.analysis_jobs). Otherwise
+        it is queued on the scan queue manager (admission control and per-owner
+        fair scheduling); the state carries the queue job id and the estimated
+        start time.
+        
         Args:
             username: GitHub username
             repositories: List of repository dictionaries
             max_evaluate: Maximum number of repositories to evaluate (default: 15)
             github_token: Optional GitHub token for API access
+            owner: Fairness key for the scan queue (defaults to username)
+            scan_target: Scan document to update on completion
+                         ({'scan_collection': ...}), applied by the completion event
+            analysis_id: Identifier to use (generated when omitted)
+            token_user_id: User whose stored GitHub token github_token is; durable
+                           jobs carry this id and the worker looks the token up,
+                           so the token is never written to the broker
             
         Returns:
             analysis_id: Unique identifier for this analysis
         """
-        analysis_id = str(uuid.uuid4())
+        analysis_id = analysis_id or str(uuid.uuid4())
         
         logger.info(
             f"Initiating analysis for user '{username}': "
@@ -108,13 +127,48 @@ class AnalysisOrchestrator:
             'current_phase': 'started',
             'current_message': 'Analysis initiated',
             'error': None,
-            'max_evaluate': max_evaluate
+            'max_evaluate': max_evaluate,
+            'scan_target': scan_target,
+            'checkpoints': []
         })
         
-        # Start async analysis
-        asyncio.create_task(
-            self.run_analysis(analysis_id, username, repositories, max_evaluate, github_token)
-        )
+        # Durable job on the analysis worker; needs state the worker can read
+        job_id = None
+        if not isinstance(self.state_storage, InMemoryStateStorage):
+            job_id = enqueue_durable_job(
+                'run_deep_analysis',
+                analysis_id=analysis_id,
+                username=username,
+                repositories=repositories,
+                max_evaluate=max_evaluate,
+                token_user_id=token_user_id
+            )
+        
+        if job_id:
+            await self.state_storage.update_state(analysis_id, {'job_id': job_id, 'job_backend': 'celery'})
+        # Queue the analysis; run it directly when the queue is not running (scripts, tests)
+        elif scan_queue_manager.running:
+            job_id = await scan_queue_manager.submit_scan_job(
+                ScanType.DEEP_ANALYSIS,
+                user_id=owner or username,
+                target=username,
+                parameters={
+                    'orchestrator': self,
+                    'analysis_id': analysis_id,
+                    'repositories': repositories,
+                    'max_evaluate': max_evaluate,
+                    'github_token': github_token
+                }
+            )
+            job = await scan_queue_manager.get_job_status(job_id)
+            await self.state_storage.update_state(analysis_id, {
+                'queue_job_id': job_id,
+                'estimated_start_at': job.estimated_start_at.isoformat() if job and job.estimated_start_at else None
+            })
+        else:
+            asyncio.create_task(
+                self.run_analysis(analysis_id, username, repositories, max_evaluate, github_token)
+            )
         
         return analysis_id
     
@@ -140,6 +194,13 @@ class AnalysisOrchestrator:
         analysis_start_time = time.time()
         phase_times = {}
         
+        # A redelivered job whose analysis already finished only re-emits the completion event
+        state = await self.state_storage.get_state(analysis_id)
+        if state and state.get('status') in (AnalysisStatus.COMPLETE, AnalysisStatus.FAILED):
+            logger.info(f"[{analysis_id}] Analysis already {state.get('status')}, not running it again")
+            await self._publish_completion(analysis_id)
+            return
+        
         try:
             total_repos = len(repositories)
             logger.info(f"[{analysis_id}] Starting analysis for {username}: {total_repos} repositories, max_evaluate={max_evaluate}")
@@ -318,6 +379,17 @@ class AnalysisOrchestrator:
         except Exception as e:
             logger.error(f"[{analysis_id}] Analysis failed: {e}", exc_info=True)
             await self._store_error(analysis_id, str(e))
+        
+        await self._publish_completion(analysis_id)
+    
+    async def _publish_completion(self, analysis_id: str):
+        """Completion event: update the scan document the analysis was started from"""
+        try:
+            state = await self.state_storage.get_state(analysis_id)
+            if state:
+                await handle_analysis_finished(state)
+        except Exception as e:
+            logger.error(f"[{analysis_id}] Failed to apply analysis completion: {e}")
     
     async def _score_repositories(self, repositories: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -334,9 +406,10 @@ class AnalysisOrchestrator:
         import time
         start_time = time.time()
         
-        # Batch process scores (synchronous but fast)
-        for repo in repositories:
-            repo['importance_score'] = self.scorer.calculate_importance_score(repo)
+        # Batch process scores (vectorized, synchronous)
+        importance_scores = self.scorer.calculate_importance_scores(repositories)
+        for repo, importance_score in zip(repositories, importance_scores):
+            repo['importance_score'] = importance_score
             repo['analyzed'] = True
         
         elapsed_time = time.time() - start_time
@@ -375,14 +448,29 @@ class AnalysisOrchestrator:
         evaluated_repos = []
         total = len(repositories)
         
+        # Repositories finished before a restart are restored from their checkpoints
+        checkpoints = await self.state_storage.get_checkpoints(analysis_id)
+        pending = []
+        for repo in repositories:
+            evaluation = checkpoints.get(self._checkpoint_key(repo))
+            if evaluation is None:
+                pending.append(repo)
+            else:
+                repo['evaluation'] = evaluation
+                repo['evaluated'] = True
+                evaluated_repos.append(repo)
+        completed = len(evaluated_repos)
+        if completed:
+            logger.info(f"[{analysis_id}] Resuming: {completed}/{total} repositories restored from checkpoints")
+        repositories = pending
+        
         # Parallel evaluation with batch size of 3 to avoid overwhelming the system
         batch_size = 3
-        completed = 0
         
         logger.info(f"[{analysis_id}] Starting parallel evaluation of {total} repositories (batch size: {batch_size})")
         
-        for batch_start in range(0, total, batch_size):
-            batch_end = min(batch_start + batch_size, total)
+        for batch_start in range(0, len(repositories), batch_size):
+            batch_end = min(batch_start + batch_size, len(repositories))
             batch = repositories[batch_start:batch_end]
             
             # Create evaluation tasks for this batch
@@ -407,6 +495,7 @@ class AnalysisOrchestrator:
                     repo['evaluation'] = result
                     repo['evaluated'] = True
                     evaluated_repos.append(repo)
+                    await self.state_storage.save_checkpoint(analysis_id, self._checkpoint_key(repo), result)
                 
                 completed += 1
                 
@@ -434,6 +523,11 @@ class AnalysisOrchestrator:
         
         return evaluated_repos
     
+    @staticmethod
+    def _checkpoint_key(repo: Dict[str, Any]) -> str:
+        """Key identifying a repository's checkpoint"""
+        return repo.get('full_name') or repo['name']
+    
     async def _evaluate_single_repository_safe(
         self,
         analysis_id: str,
@@ -802,3 +896,15 @@ class InMemoryStateStorage:
         """Delete analysis state"""
         if analysis_id in self._storage:
             del self._storage[analysis_id]
+    
+    async def save_checkpoint(self, analysis_id: str, repository: str, evaluation: Dict[str, Any]):
+        """Record a finished repository evaluation"""
+        if analysis_id in self._storage:
+            self._storage[analysis_id].setdefault('checkpoints', []).append(
+                {'repository': repository, 'evaluation': evaluation}
+            )
+    
+    async def get_checkpoints(self, analysis_id: str) -> Dict[str, Dict[str, Any]]:
+        """Get checkpointed repository evaluations keyed by repository"""
+        state = self._storage.get(analysis_id) or {}
+        return {c['repository']: c['evaluation'] for c in state.get('checkpoints', [])}
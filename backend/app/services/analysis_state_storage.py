@@ -385,6 +385,50 @@ class AnalysisStateStorage:
             logger.error(f"Failed to update results for {analysis_id}: {e}")
             raise
     
+    async def save_checkpoint(self, analysis_id: str, repository: str, evaluation: Dict[str, Any]):
+        """
+        Record a finished repository evaluation so a resumed job can skip it.
+        
+        A lost checkpoint only means the repository is evaluated again, so
+        failures are logged rather than raised.
+        
+        Args:
+            analysis_id: Analysis identifier
+            repository: Repository key (full name, or name)
+            evaluation: Evaluation data for the repository
+        """
+        try:
+            await self.collection.update_one(
+                {'analysis_id': analysis_id},
+                {'$push': {'checkpoints': {
+                    'repository': repository,
+                    'evaluation': evaluation,
+                    'completed_at': datetime.utcnow()
+                }}}
+            )
+        except Exception as e:
+            logger.warning(f"Failed to checkpoint {repository} for {analysis_id}: {e}")
+    
+    async def get_checkpoints(self, analysis_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the repository evaluations already checkpointed for an analysis.
+        
+        Args:
+            analysis_id: Analysis identifier
+            
+        Returns:
+            Evaluation data keyed by repository
+        """
+        try:
+            state = await self.collection.find_one({'analysis_id': analysis_id}, {'checkpoints': 1})
+            return {
+                checkpoint['repository']: checkpoint['evaluation']
+                for checkpoint in (state or {}).get('checkpoints') or []
+            }
+        except Exception as e:
+            logger.error(f"Failed to get checkpoints for {analysis_id}: {e}")
+            return {}
+    
     async def find_latest_complete_analysis(self, username: str) -> Optional[Dict[str, Any]]:
         """
         Find the most recent completed analysis for a username.
@@ -5,6 +5,7 @@ Provides utilities for invalidating cached data
 import logging
 from typing import List, Optional
 from app.services.cache_service import cache_service
+from app.services.scan_results_refresher import scan_results_refresher
 
 logger = logging.getLogger(__name__)
 
@@ -91,6 +92,32 @@ class CacheInvalidationService:
             logger.error(f"Failed to invalidate scan cache for {scan_id}: {e}")
             return False
     
+    async def invalidate_on_scan_completion(self, user_id: str, repository_names: Optional[List[str]] = None) -> bool:
+        """
+        Invalidate everything derived from a user's previous scan
+        
+        Args:
+            user_id: User whose scan completed
+            repository_names: Full names (owner/repo) of the repositories scanned
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            await self.invalidate_user_cache(user_id)
+            for repo_full_name in repository_names or []:
+                await self.invalidate_repository_cache(repo_full_name)
+            
+            # Persisted /scan/results snapshot (MongoDB and Redis)
+            await scan_results_refresher.invalidate(user_id)
+            
+            logger.info(f"Invalidated cache after scan completion for user {user_id}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to invalidate cache after scan for {user_id}: {e}")
+            return False
+    
     async def invalidate_analysis_cache(self, username: str) -> bool:
         """
         Invalidate cached analysis data for a user
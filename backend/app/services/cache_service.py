@@ -231,6 +231,23 @@ class CacheService:
     async def get_importance_scores(self, username: str) -> Optional[dict]:
         """Get cached importance scores"""
         return await self.get(username, prefix="importance_scores")
+    
+    async def cache_scan_results(
+        self,
+        user_id: str,
+        results: dict,
+        ttl: int = 1800
+    ) -> bool:
+        """Cache scan results for a user (30 minutes default)"""
+        return await self.set(user_id, results, prefix="scan_results", ttl=ttl)
+    
+    async def get_scan_results(self, user_id: str) -> Optional[dict]:
+        """Get cached scan results for a user"""
+        return await self.get(user_id, prefix="scan_results")
+    
+    async def invalidate_scan_results(self, user_id: str) -> bool:
+        """Invalidate cached scan results for a user"""
+        return await self.delete(user_id, prefix="scan_results")
 
 
 # Global cache service instance
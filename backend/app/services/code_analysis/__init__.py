@@ -0,0 +1,17 @@
+"""
+Code Analysis
+Grammar-driven, single-pass source metrics for every supported language
+"""
+
+from .grammars import GRAMMARS, LanguageGrammar, get_grammar
+from .analyzer import ClassSpan, FunctionSpan, SourceMetrics, analyze_source
+
+__all__ = [
+    'GRAMMARS',
+    'LanguageGrammar',
+    'get_grammar',
+    'ClassSpan',
+    'FunctionSpan',
+    'SourceMetrics',
+    'analyze_source'
+]
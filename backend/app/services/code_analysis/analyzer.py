@@ -0,0 +1,576 @@
+"""
+Source Analyzer
+Single-pass, grammar-driven source metrics for every supported language.
+
+Each file is tokenized once by a regex compiled from its language grammar,
+and one linear walk over the tokens tracks lines, blocks and declarations.
+Line counts, function and class spans, cyclomatic and cognitive complexity,
+Halstead counts and code-smell indicators all come out of that walk, so the
+evaluation engine never re-scans a file per metric.
+"""
+
+import math
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List
+
+from .grammars import BRACES, END, INDENT, OPERATORS, LanguageGrammar, get_grammar
+
+# Token kinds (group numbers of the tokenizer regex)
+_NEWLINE, _COMMENT, _STRING, _NAME, _NUMBER, _OPERATOR = range(1, 7)
+
+# Open block kinds
+_FUNCTION, _CLASS, _CONTROL, _BLOCK = range(4)
+
+# Block layout: [kind, name, parameters, start_line, cyclomatic_at_start, indent, methods]
+# Pending declaration layout (BRACES, until its `{`): [kind, name, parameters, paren_depth, flag]
+# where flag is "declared by keyword" for functions and "condition closed" for control structures
+_NAME_SLOT, _PARAMS_SLOT = 1, 2
+
+_MEMBER_ACCESS = frozenset({'.', '?.'})
+_CLOSERS = frozenset({')', ']', '}'})
+
+# Code-smell thresholds
+LONG_LINE_CHARS = 120
+LONG_FUNCTION_LINES = 50
+MAX_PARAMETERS = 5
+DEEP_NESTING_LEVEL = 4
+
+
+@dataclass
+class FunctionSpan:
+    """A function or method and the lines it spans"""
+    name: str
+    start_line: int
+    end_line: int
+    cyclomatic_complexity: int = 1
+    parameters: int = 0
+
+    @property
+    def lines(self) -> int:
+        return self.end_line - self.start_line + 1
+
+
+@dataclass
+class ClassSpan:
+    """A class-like declaration (class, struct, interface, module...) and its methods"""
+    name: str
+    start_line: int
+    end_line: int
+    method_count: int = 0
+
+    @property
+    def lines(self) -> int:
+        return self.end_line - self.start_line + 1
+
+
+@dataclass
+class SourceMetrics:
+    """Everything measured in one pass over a source file"""
+    language: str
+    total_lines: int = 0
+    code_lines: int = 0
+    comment_lines: int = 0
+    blank_lines: int = 0
+    cyclomatic_complexity: int = 1
+    cognitive_complexity: int = 0
+    max_nesting: int = 0
+    functions: List[FunctionSpan] = field(default_factory=list)
+    classes: List[ClassSpan] = field(default_factory=list)
+    distinct_operators: int = 0
+    distinct_operands: int = 0
+    total_operators: int = 0
+    total_operands: int = 0
+    long_lines: int = 0
+    magic_numbers: int = 0
+    duplicate_lines: int = 0
+    deeply_nested_lines: int = 0
+
+    @property
+    def non_blank_lines(self) -> int:
+        return self.code_lines + self.comment_lines
+
+    @property
+    def long_functions(self) -> int:
+        return sum(1 for function in self.functions if function.lines > LONG_FUNCTION_LINES)
+
+    @property
+    def functions_with_many_parameters(self) -> int:
+        return sum(1 for function in self.functions if function.parameters > MAX_PARAMETERS)
+
+    def halstead(self) -> Dict[str, float]:
+        """
+        Halstead metrics from the operator and operand counts
+
+        Returns:
+            Dictionary with vocabulary, length, volume, difficulty and effort
+        """
+        n1, n2 = self.distinct_operators, self.distinct_operands
+        vocabulary = n1 + n2
+        length = self.total_operators + self.total_operands
+        volume = length * math.log2(vocabulary) if vocabulary > 0 else 0
+        difficulty = (n1 / 2) * (self.total_operands / n2) if n2 > 0 else 0
+        return {
+            "vocabulary": vocabulary,
+            "length": length,
+            "volume": volume,
+            "difficulty": difficulty,
+            "effort": difficulty * volume
+        }
+
+
+@lru_cache(maxsize=None)
+def _tokenizer(grammar: LanguageGrammar) -> "re.Pattern":
+    """
+    Compile a grammar's tokenizer on first use
+
+    Leading spaces and tabs are folded into each token, so the walk only
+    ever sees newlines, comments, strings, names, numbers and operators.
+    """
+    comments = [
+        rf'(?s:{re.escape(start)}.*?(?:{re.escape(end)}|\Z))' for start, end in grammar.block_comments
+    ] + [rf'{re.escape(prefix)}[^\n]*' for prefix in grammar.line_comments]
+
+    strings = [rf'(?s:{re.escape(quote)}.*?(?:{re.escape(quote)}|\Z))' for quote in grammar.multiline_strings]
+    if grammar.char_literals:
+        strings.append(r"'(?:\\.|[^\\'\n])'")
+    for quote in grammar.string_delimiters:
+        q = re.escape(quote)
+        strings.append(rf'{q}(?:[^{q}\\\n]|\\.)*{q}?')
+
+    operators = '|'.join(re.escape(op) for op in OPERATORS)
+    suffix = rf'(?:[{re.escape(grammar.name_suffixes)}](?!=))?' if grammar.name_suffixes else ''
+
+    return re.compile(
+        r'[ \t\r\f\v]*(?:'
+        r'(\n)'
+        rf'|({"|".join(comments) or "(?!)"})'
+        rf'|({"|".join(strings) or "(?!)"})'
+        rf'|((?:[^\W\d]|\$)[\w$]*{suffix})'
+        r'|(\d[\w.]*)'
+        rf'|({operators}|[^\w\s])'
+        r')'
+    )
+
+
+def _close(block: list, end_line: int, cyclomatic: int,
+           functions: List[FunctionSpan], classes: List[ClassSpan]) -> int:
+    """Record a closed block; returns 1 if it was a control structure"""
+    kind = block[0]
+    if kind == _FUNCTION:
+        functions.append(FunctionSpan(
+            block[1] or 'anonymous', block[3], max(end_line, block[3]), 1 + cyclomatic - block[4], block[2]
+        ))
+    elif kind == _CLASS:
+        classes.append(ClassSpan(block[1] or 'anonymous', block[3], max(end_line, block[3]), block[6]))
+    elif kind == _CONTROL:
+        return 1
+    return 0
+
+
+def _attach_method(blocks: list) -> None:
+    """Count a new function as a method of the innermost enclosing class, if any"""
+    for block in reversed(blocks):
+        if block[0] == _CLASS:
+            block[6] += 1
+            return
+        if block[0] == _FUNCTION:
+            return
+
+
+def analyze_source(code: str, language: str) -> SourceMetrics:
+    """
+    Measure a source file in one linear pass
+
+    Args:
+        code: File content
+        language: Language name (selects the grammar; unknown languages
+            are only split into code, comment and blank lines)
+
+    Returns:
+        SourceMetrics for the file
+    """
+    grammar = get_grammar(language)
+    metrics = SourceMetrics(language=language, total_lines=code.count('\n') + 1)
+
+    braces = grammar.block_style == BRACES
+    indented = grammar.block_style == INDENT
+    end_style = grammar.block_style == END
+    keywords = grammar.keywords
+    branch_keywords = grammar.branch_keywords
+    nesting_keywords = grammar.nesting_keywords
+    else_keywords = grammar.else_keywords
+    logical_operators = grammar.logical_operators
+    conditional_operators = grammar.conditional_operators
+    function_keywords = grammar.function_keywords
+    class_keywords = grammar.class_keywords
+    block_openers = grammar.block_openers
+    lambda_arrows = grammar.lambda_arrows
+    call_signatures = grammar.call_signatures
+    docstrings = grammar.docstrings
+
+    functions = metrics.functions
+    classes = metrics.classes
+
+    operator_set = set()
+    operand_set = set()
+    total_operators = total_operands = magic_numbers = 0
+    cyclomatic = 1
+    cognitive = 0
+    max_nesting = 0
+
+    # Line state
+    line = 1
+    line_start = 0
+    line_has_code = line_has_comment = line_has_operand = False
+    code_lines = comment_lines = blank_lines = long_lines = duplicate_lines = nested_lines = 0
+    seen_lines = set()
+    last_code_line = 0
+
+    # Block state
+    blocks = []
+    control_depth = 0
+    parens = []          # open '(' groups: [owner, commas, bracket_depth]
+    bracket_depth = 0
+    last_params = 0
+    pending = None       # BRACES: declaration or control structure awaiting its '{'
+    declaration = None   # declaration still waiting for its name / parameters
+    declaration_depth = 0
+    binding = None       # name being assigned (`name =` / `name:`), for anonymous functions
+    arrow = False
+    arrow_name = None
+    arrow_params = 0
+    at_line_start = at_statement = True
+    statement_indent = 0
+    opened_on_line = False
+    prev = ''
+    prev_kind = 0
+
+    for match in _tokenizer(grammar).finditer(code):
+        kind = match.lastindex
+        if kind == _NEWLINE:
+            newline_at = match.start(kind)
+            newlines = 1
+        else:
+            text = match.group(kind)
+            newlines = 0
+
+            if kind == _COMMENT:
+                line_has_comment = True
+                if '\n' in text:
+                    newlines = text.count('\n')
+                    newline_at = match.start(kind) + text.index('\n')
+                else:
+                    continue
+            else:
+                start = match.start(kind)
+
+                if at_line_start and (indented or end_style):
+                    at_line_start = False
+                    if indented:
+                        statement_indent = start - line_start
+                        while blocks and blocks[-1][5] >= statement_indent:
+                            control_depth -= _close(blocks.pop(), last_code_line, cyclomatic, functions, classes)
+
+                if arrow:
+                    arrow = False
+                    if text == '{':
+                        pending = [_FUNCTION, arrow_name or 'lambda', arrow_params, len(parens), False]
+                    elif arrow_name:
+                        functions.append(FunctionSpan(arrow_name, line, line, 1, arrow_params))
+                        binding = None
+
+                if kind == _NAME:
+                    if text in logical_operators:
+                        cyclomatic += 1
+                        cognitive += 1
+                    if text in keywords and prev not in _MEMBER_ACCESS:
+                        total_operators += 1
+                        operator_set.add(text)
+
+                        if text in nesting_keywords or text in else_keywords or text in branch_keywords:
+                            in_class_header = braces and pending is not None and pending[0] == _CLASS
+                            if not in_class_header:
+                                if text in branch_keywords:
+                                    cyclomatic += 1
+                                if text in nesting_keywords:
+                                    if prev not in else_keywords:
+                                        cognitive += 1 + control_depth
+                                    opens = True
+                                elif text in else_keywords:
+                                    cognitive += 1
+                                    opens = not end_style
+                                else:
+                                    opens = False
+
+                                if opens:
+                                    if braces:
+                                        pending = [_CONTROL, None, 0, len(parens), False]
+                                    elif at_statement or (end_style and prev in ('=', '||=', '(')):
+                                        blocks.append([_CONTROL, None, 0, line, cyclomatic, statement_indent, 0])
+                                        control_depth += 1
+                                        if control_depth > max_nesting:
+                                            max_nesting = control_depth
+                                        opened_on_line = True
+
+                        elif text in function_keywords:
+                            if braces:
+                                pending = [_FUNCTION, None, 0, len(parens), True]
+                                declaration = pending
+                            else:
+                                _attach_method(blocks)
+                                declaration = [_FUNCTION, None, 0, line, cyclomatic, statement_indent, 0]
+                                blocks.append(declaration)
+                                opened_on_line = True
+                            declaration_depth = len(parens)
+
+                        elif text in class_keywords:
+                            if braces:
+                                # Go declares the name first: `type Name struct`
+                                named = prev if prev_kind == _NAME and prev not in keywords else None
+                                pending = [_CLASS, named, 0, len(parens), True]
+                                declaration = pending
+                            else:
+                                declaration = [_CLASS, None, 0, line, cyclomatic, statement_indent, 0]
+                                blocks.append(declaration)
+                                opened_on_line = True
+                            declaration_depth = len(parens)
+
+                        elif end_style:
+                            if text == 'end':
+                                if blocks:
+                                    control_depth -= _close(blocks.pop(), line, cyclomatic, functions, classes)
+                            elif text in block_openers and not (text == 'do' and opened_on_line):
+                                blocks.append([_BLOCK, None, 0, line, cyclomatic, statement_indent, 0])
+                                opened_on_line = True
+
+                        if text != 'async':
+                            at_statement = False
+                    else:
+                        total_operands += 1
+                        operand_set.add(text)
+                        line_has_operand = True
+                        if (declaration is not None and len(parens) == declaration_depth
+                                and (declaration[_NAME_SLOT] is None or prev in _MEMBER_ACCESS)):
+                            declaration[_NAME_SLOT] = text
+                        at_statement = False
+
+                elif kind == _OPERATOR:
+                    if text not in _CLOSERS:
+                        total_operators += 1
+                        operator_set.add(text)
+
+                    if text == '(':
+                        bracket_depth += 1
+                        owner = None
+                        if (declaration is not None and len(parens) == declaration_depth
+                                and (declaration[_NAME_SLOT] is None or prev == declaration[_NAME_SLOT]
+                                     or prev == '>')):
+                            owner = declaration
+                        elif prev_kind == _NAME and prev not in keywords:
+                            owner = prev
+                        parens.append([owner, 0, bracket_depth])
+                    elif text == ')':
+                        bracket_depth = max(0, bracket_depth - 1)
+                        if parens:
+                            owner, commas, _ = parens.pop()
+                            last_params = commas + 1 if prev != '(' else 0
+                            if pending is not None:
+                                if len(parens) < pending[3]:
+                                    pending = None
+                                elif pending[0] == _CONTROL and len(parens) == pending[3]:
+                                    pending[4] = True   # condition closed: `if (x) stmt;` has no block
+                            if owner.__class__ is list:
+                                owner[_PARAMS_SLOT] = last_params
+                                if owner[_NAME_SLOT] is not None:
+                                    declaration = None
+                            elif owner is not None and call_signatures and pending is None:
+                                pending = [_FUNCTION, owner, last_params, len(parens), False]
+                    elif text == ',':
+                        if parens and parens[-1][2] == bracket_depth:
+                            parens[-1][1] += 1
+                    elif text == '{':
+                        bracket_depth += 1
+                        if braces:
+                            declared = pending
+                            pending = None
+                            declaration = None
+                            if declared is None:
+                                blocks.append([_BLOCK, None, 0, line, cyclomatic, 0, 0])
+                            else:
+                                block_kind = declared[0]
+                                name = declared[1] or (binding if block_kind == _FUNCTION else None)
+                                if block_kind == _FUNCTION:
+                                    _attach_method(blocks)
+                                elif block_kind == _CONTROL:
+                                    control_depth += 1
+                                    if control_depth > max_nesting:
+                                        max_nesting = control_depth
+                                blocks.append([block_kind, name, declared[2], line, cyclomatic, 0, 0])
+                            binding = None
+                        elif end_style:
+                            blocks.append([_BLOCK, None, 0, line, cyclomatic, statement_indent, 0])
+                    elif text == '}':
+                        bracket_depth = max(0, bracket_depth - 1)
+                        if braces or end_style:
+                            pending = None
+                            binding = None
+                            if blocks:
+                                control_depth -= _close(blocks.pop(), line, cyclomatic, functions, classes)
+                    elif text == '[':
+                        bracket_depth += 1
+                    elif text == ']':
+                        bracket_depth = max(0, bracket_depth - 1)
+                    elif text == ';':
+                        if (pending is not None and len(parens) <= pending[3]
+                                and (pending[0] != _CONTROL or pending[4])):
+                            # Go's `for i := 0; i < n; i++ {` keeps its pending block
+                            pending = None
+                        if not parens:
+                            declaration = None
+                            binding = None
+                        at_statement = not braces
+                        prev, prev_kind = text, kind
+                        line_has_code = True
+                        last_code_line = line
+                        continue
+                    elif text == '=':
+                        if pending is not None and pending[0] == _FUNCTION and len(parens) == pending[3]:
+                            if pending[4]:
+                                # Expression-bodied function: `fun twice(x: Int) = x * 2`
+                                functions.append(FunctionSpan(pending[1] or 'anonymous', line, line, 1, pending[2]))
+                            pending = None
+                            declaration = None
+                        if not parens and prev_kind == _NAME:
+                            binding = prev
+                    elif text == ':':
+                        if not parens and prev_kind == _NAME and prev not in keywords:
+                            binding = prev
+                    elif text in lambda_arrows:
+                        arrow = True
+                        if pending is not None and pending[0] == _FUNCTION:
+                            # Expression-bodied member: `int Twice(int x) => x * 2;`
+                            arrow_name, arrow_params = pending[1], pending[2]
+                            pending = None
+                        else:
+                            arrow_name = binding
+                            arrow_params = last_params if prev == ')' else (1 if prev_kind == _NAME else 0)
+                    elif text in logical_operators:
+                        cyclomatic += 1
+                        cognitive += 1
+                    elif text in conditional_operators:
+                        cyclomatic += 1
+                    at_statement = False
+
+                elif kind == _STRING:
+                    if docstrings and at_statement:
+                        # A bare string statement documents the code around it
+                        line_has_comment = True
+                        at_statement = False
+                        if '\n' in text:
+                            newlines = text.count('\n')
+                            newline_at = start + text.index('\n')
+                            kind = _COMMENT
+                        last_code_line = line + newlines
+                        prev, prev_kind = text, _STRING
+                        if not newlines:
+                            continue
+                    else:
+                        total_operands += 1
+                        operand_set.add(text)
+                        line_has_operand = True
+                        at_statement = False
+                        if '\n' in text:
+                            newlines = text.count('\n')
+                            newline_at = start + text.index('\n')
+
+                else:  # _NUMBER
+                    total_operands += 1
+                    operand_set.add(text)
+                    line_has_operand = True
+                    at_statement = False
+                    if text[1:2].isdigit():
+                        magic_numbers += 1
+
+                if kind != _COMMENT:
+                    line_has_code = True
+                    last_code_line = line + newlines
+                    prev, prev_kind = text, kind
+                if not newlines:
+                    continue
+
+        # Finish the line ending at newline_at
+        if line_has_code:
+            code_lines += 1
+            if control_depth >= DEEP_NESTING_LEVEL:
+                nested_lines += 1
+            if line_has_operand:
+                stripped = code[line_start:newline_at].strip()
+                if stripped in seen_lines:
+                    duplicate_lines += 1
+                else:
+                    seen_lines.add(stripped)
+        elif line_has_comment:
+            comment_lines += 1
+        else:
+            blank_lines += 1
+        if newline_at - line_start > LONG_LINE_CHARS:
+            long_lines += 1
+        line += 1
+
+        if kind == _NEWLINE:
+            line_start = match.end()
+            line_has_code = line_has_comment = line_has_operand = False
+            prev_kind = _NEWLINE  # a name on the previous line names nothing on this one
+            if not parens:
+                binding = None
+                if not braces:
+                    declaration = None
+            if (indented or end_style) and bracket_depth == 0 and prev != '\\':
+                at_line_start = at_statement = True
+                opened_on_line = False
+        else:
+            # Lines inside a multi-line comment or string
+            if kind == _COMMENT:
+                comment_lines += newlines - 1
+            else:
+                code_lines += newlines - 1
+            line += newlines - 1
+            line_start = match.start(kind) + text.rindex('\n') + 1
+            line_has_code = kind != _COMMENT
+            line_has_comment = not line_has_code
+            line_has_operand = False
+
+    # Last line (no trailing newline)
+    if line_has_code:
+        code_lines += 1
+        if line_has_operand and code[line_start:].strip() in seen_lines:
+            duplicate_lines += 1
+    elif line_has_comment:
+        comment_lines += 1
+    else:
+        blank_lines += 1
+    if len(code) - line_start > LONG_LINE_CHARS:
+        long_lines += 1
+
+    while blocks:
+        _close(blocks.pop(), last_code_line, cyclomatic, functions, classes)
+    functions.sort(key=lambda function: function.start_line)
+    classes.sort(key=lambda cls: cls.start_line)
+
+    metrics.code_lines = code_lines
+    metrics.comment_lines = comment_lines
+    metrics.blank_lines = blank_lines
+    metrics.cyclomatic_complexity = cyclomatic
+    metrics.cognitive_complexity = cognitive
+    metrics.max_nesting = max_nesting
+    metrics.distinct_operators = len(operator_set)
+    metrics.distinct_operands = len(operand_set)
+    metrics.total_operators = total_operators
+    metrics.total_operands = total_operands
+    metrics.long_lines = long_lines
+    metrics.magic_numbers = magic_numbers
+    metrics.duplicate_lines = duplicate_lines
+    metrics.deeply_nested_lines = nested_lines
+    return metrics
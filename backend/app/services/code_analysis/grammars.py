@@ -0,0 +1,308 @@
+"""
+Language Grammars
+Per-language token tables driving the source analyzer.
+
+A grammar is plain data: comment and string delimiters, the keywords that
+branch, nest or declare functions and classes, and how blocks are delimited.
+Adding a language means adding a table here, not writing a new analyzer.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Tuple
+
+# How a language delimits blocks
+BRACES = 'braces'    # { ... }
+INDENT = 'indent'    # indentation after a header line (Python)
+END = 'end'          # keyword ... end (Ruby)
+
+
+@dataclass(frozen=True)
+class LanguageGrammar:
+    """Token tables for one language"""
+    name: str
+    block_style: str = BRACES
+    line_comments: Tuple[str, ...] = ('//',)
+    block_comments: Tuple[Tuple[str, str], ...] = (('/*', '*/'),)
+    # Single-line strings with backslash escapes
+    string_delimiters: Tuple[str, ...] = ('"', "'")
+    # Strings that may span lines (no escapes), e.g. triple quotes or backticks
+    multiline_strings: Tuple[str, ...] = ()
+    # ' starts a one-character literal rather than a string (Rust lifetimes)
+    char_literals: bool = False
+    # A bare string statement is documentation (Python docstrings)
+    docstrings: bool = False
+    keywords: FrozenSet[str] = frozenset()
+    # +1 cyclomatic complexity each
+    branch_keywords: FrozenSet[str] = frozenset()
+    # Structures that nest: +1 cognitive complexity plus the current nesting
+    nesting_keywords: FrozenSet[str] = frozenset()
+    # Continue the previous structure (else, elif): +1 cognitive complexity
+    else_keywords: FrozenSet[str] = frozenset()
+    # && || and or: +1 cyclomatic and +1 cognitive complexity each
+    logical_operators: FrozenSet[str] = frozenset({'&&', '||'})
+    # Ternary operators: +1 cyclomatic complexity each
+    conditional_operators: FrozenSet[str] = frozenset({'?'})
+    function_keywords: FrozenSet[str] = frozenset()
+    class_keywords: FrozenSet[str] = frozenset()
+    # Keywords opening an end-terminated block that is neither control flow
+    # nor a declaration (END style only)
+    block_openers: FrozenSet[str] = frozenset()
+    # Arrows introducing a lambda; one followed by a block is a function
+    lambda_arrows: FrozenSet[str] = frozenset()
+    # `name(params) {` declares a function (C-family methods)
+    call_signatures: bool = False
+    # Characters that may end an identifier (Ruby's `empty?` and `save!`)
+    name_suffixes: str = ''
+
+
+# Multi-character operators shared by every language, longest first
+OPERATORS = (
+    '>>>=', '<<=', '>>=', '**=', '...', '===', '!==', '<=>', '>>>',
+    '::', '->', '=>', '?:', '==', '!=', '<=', '>=', '&&', '||', '??', '?.',
+    '++', '--', '+=', '-=', '*=', '/=', '%=', '&=', '|=', '^=', '<<', '>>', '**', '..',
+)
+
+_C_FAMILY_BRANCHES = frozenset({'if', 'for', 'while', 'case', 'catch'})
+_C_FAMILY_NESTING = frozenset({'if', 'for', 'while', 'switch', 'catch', 'do'})
+
+_JAVASCRIPT_KEYWORDS = frozenset({
+    'break', 'case', 'catch', 'class', 'const', 'continue', 'debugger', 'default', 'delete',
+    'do', 'else', 'export', 'extends', 'finally', 'for', 'function', 'if', 'import', 'in',
+    'instanceof', 'let', 'new', 'of', 'return', 'super', 'switch', 'this', 'throw', 'try',
+    'typeof', 'var', 'void', 'while', 'with', 'yield', 'async', 'await', 'static'
+})
+
+_JAVA_KEYWORDS = frozenset({
+    'abstract', 'assert', 'boolean', 'break', 'byte', 'case', 'catch', 'char', 'class', 'const',
+    'continue', 'default', 'do', 'double', 'else', 'enum', 'extends', 'final', 'finally', 'float',
+    'for', 'if', 'implements', 'import', 'instanceof', 'int', 'interface', 'long', 'native', 'new',
+    'package', 'private', 'protected', 'public', 'return', 'short', 'static', 'super', 'switch',
+    'synchronized', 'this', 'throw', 'throws', 'transient', 'try', 'void', 'volatile', 'while', 'var'
+})
+
+PYTHON = LanguageGrammar(
+    name='Python',
+    block_style=INDENT,
+    line_comments=('#',),
+    block_comments=(),
+    multiline_strings=('"""', "'''"),
+    docstrings=True,
+    keywords=frozenset({
+        'False', 'None', 'True', 'and', 'as', 'assert', 'async', 'await', 'break', 'class',
+        'continue', 'def', 'del', 'elif', 'else', 'except', 'finally', 'for', 'from', 'global',
+        'if', 'import', 'in', 'is', 'lambda', 'nonlocal', 'not', 'or', 'pass', 'raise',
+        'return', 'try', 'while', 'with', 'yield'
+    }),
+    branch_keywords=frozenset({'if', 'elif', 'for', 'while', 'except'}),
+    nesting_keywords=frozenset({'if', 'for', 'while', 'except'}),
+    else_keywords=frozenset({'elif', 'else'}),
+    logical_operators=frozenset({'and', 'or'}),
+    conditional_operators=frozenset(),
+    function_keywords=frozenset({'def'}),
+    class_keywords=frozenset({'class'}),
+)
+
+JAVASCRIPT = LanguageGrammar(
+    name='JavaScript',
+    multiline_strings=('`',),
+    keywords=_JAVASCRIPT_KEYWORDS,
+    branch_keywords=_C_FAMILY_BRANCHES,
+    nesting_keywords=_C_FAMILY_NESTING,
+    else_keywords=frozenset({'else'}),
+    function_keywords=frozenset({'function'}),
+    class_keywords=frozenset({'class'}),
+    lambda_arrows=frozenset({'=>'}),
+    call_signatures=True,
+)
+
+TYPESCRIPT = LanguageGrammar(
+    name='TypeScript',
+    multiline_strings=('`',),
+    keywords=_JAVASCRIPT_KEYWORDS | frozenset({
+        'interface', 'type', 'enum', 'implements', 'namespace', 'declare', 'readonly',
+        'private', 'protected', 'public', 'abstract', 'keyof', 'as'
+    }),
+    branch_keywords=_C_FAMILY_BRANCHES,
+    nesting_keywords=_C_FAMILY_NESTING,
+    else_keywords=frozenset({'else'}),
+    function_keywords=frozenset({'function'}),
+    class_keywords=frozenset({'class', 'interface', 'enum'}),
+    lambda_arrows=frozenset({'=>'}),
+    call_signatures=True,
+)
+
+JAVA = LanguageGrammar(
+    name='Java',
+    keywords=_JAVA_KEYWORDS,
+    branch_keywords=_C_FAMILY_BRANCHES,
+    nesting_keywords=_C_FAMILY_NESTING,
+    else_keywords=frozenset({'else'}),
+    class_keywords=frozenset({'class', 'interface', 'enum', 'record'}),
+    lambda_arrows=frozenset({'->'}),
+    call_signatures=True,
+)
+
+GO = LanguageGrammar(
+    name='Go',
+    multiline_strings=('`',),
+    keywords=frozenset({
+        'break', 'case', 'chan', 'const', 'continue', 'default', 'defer', 'else', 'fallthrough',
+        'for', 'func', 'go', 'goto', 'if', 'import', 'interface', 'map', 'package', 'range',
+        'return', 'select', 'struct', 'switch', 'type', 'var'
+    }),
+    branch_keywords=frozenset({'if', 'for', 'case'}),
+    nesting_keywords=frozenset({'if', 'for', 'switch', 'select'}),
+    else_keywords=frozenset({'else'}),
+    conditional_operators=frozenset(),
+    function_keywords=frozenset({'func'}),
+    class_keywords=frozenset({'struct', 'interface'}),
+)
+
+CPP = LanguageGrammar(
+    name='C++',
+    keywords=frozenset({
+        'auto', 'bool', 'break', 'case', 'catch', 'char', 'class', 'const', 'constexpr', 'continue',
+        'default', 'delete', 'do', 'double', 'else', 'enum', 'explicit', 'extern', 'float', 'for',
+        'friend', 'goto', 'if', 'inline', 'int', 'long', 'namespace', 'new', 'noexcept', 'nullptr',
+        'operator', 'override', 'private', 'protected', 'public', 'return', 'short', 'signed',
+        'sizeof', 'static', 'struct', 'switch', 'template', 'this', 'throw', 'try', 'typedef',
+        'typename', 'union', 'unsigned', 'using', 'virtual', 'void', 'volatile', 'while'
+    }),
+    branch_keywords=_C_FAMILY_BRANCHES,
+    nesting_keywords=_C_FAMILY_NESTING,
+    else_keywords=frozenset({'else'}),
+    class_keywords=frozenset({'class', 'struct', 'union'}),
+    call_signatures=True,
+)
+
+CSHARP = LanguageGrammar(
+    name='C#',
+    keywords=_JAVA_KEYWORDS | frozenset({
+        'async', 'await', 'base', 'bool', 'decimal', 'delegate', 'event', 'foreach', 'get', 'in',
+        'internal', 'is', 'lock', 'namespace', 'object', 'out', 'override', 'params', 'readonly',
+        'ref', 'sealed', 'set', 'string', 'struct', 'using', 'virtual', 'where', 'yield'
+    }),
+    branch_keywords=_C_FAMILY_BRANCHES | frozenset({'foreach'}),
+    nesting_keywords=_C_FAMILY_NESTING | frozenset({'foreach'}),
+    else_keywords=frozenset({'else'}),
+    logical_operators=frozenset({'&&', '||', '??'}),
+    class_keywords=frozenset({'class', 'interface', 'struct', 'enum', 'record'}),
+    lambda_arrows=frozenset({'=>'}),
+    call_signatures=True,
+)
+
+RUBY = LanguageGrammar(
+    name='Ruby',
+    block_style=END,
+    line_comments=('#',),
+    block_comments=(('=begin', '=end'),),
+    keywords=frozenset({
+        'alias', 'and', 'begin', 'break', 'case', 'class', 'def', 'do', 'else', 'elsif', 'end',
+        'ensure', 'false', 'for', 'if', 'in', 'module', 'next', 'nil', 'not', 'or', 'redo',
+        'rescue', 'retry', 'return', 'self', 'super', 'then', 'true', 'undef', 'unless', 'until',
+        'when', 'while', 'yield'
+    }),
+    branch_keywords=frozenset({'if', 'elsif', 'unless', 'while', 'until', 'for', 'when', 'rescue'}),
+    nesting_keywords=frozenset({'if', 'unless', 'while', 'until', 'for', 'case'}),
+    else_keywords=frozenset({'elsif', 'else'}),
+    logical_operators=frozenset({'&&', '||', 'and', 'or'}),
+    function_keywords=frozenset({'def'}),
+    class_keywords=frozenset({'class', 'module'}),
+    block_openers=frozenset({'begin', 'do'}),
+    name_suffixes='?!',
+)
+
+PHP = LanguageGrammar(
+    name='PHP',
+    line_comments=('//', '#'),
+    keywords=frozenset({
+        'abstract', 'array', 'as', 'break', 'case', 'catch', 'class', 'clone', 'const', 'continue',
+        'declare', 'default', 'do', 'echo', 'else', 'elseif', 'enum', 'extends', 'final', 'finally',
+        'fn', 'for', 'foreach', 'function', 'global', 'if', 'implements', 'include', 'instanceof',
+        'interface', 'match', 'namespace', 'new', 'private', 'protected', 'public', 'require',
+        'return', 'static', 'switch', 'throw', 'trait', 'try', 'use', 'while', 'yield'
+    }),
+    branch_keywords=_C_FAMILY_BRANCHES | frozenset({'elseif', 'foreach'}),
+    nesting_keywords=_C_FAMILY_NESTING | frozenset({'foreach', 'match'}),
+    else_keywords=frozenset({'else', 'elseif'}),
+    logical_operators=frozenset({'&&', '||', 'and', 'or'}),
+    function_keywords=frozenset({'function', 'fn'}),
+    class_keywords=frozenset({'class', 'interface', 'trait', 'enum'}),
+)
+
+SWIFT = LanguageGrammar(
+    name='Swift',
+    string_delimiters=('"',),
+    multiline_strings=('"""',),
+    keywords=frozenset({
+        'as', 'break', 'case', 'catch', 'class', 'continue', 'default', 'defer', 'do', 'else',
+        'enum', 'extension', 'fallthrough', 'for', 'func', 'guard', 'if', 'import', 'in', 'init',
+        'let', 'private', 'protocol', 'public', 'repeat', 'return', 'self', 'static', 'struct',
+        'switch', 'throw', 'throws', 'try', 'var', 'where', 'while'
+    }),
+    branch_keywords=frozenset({'if', 'guard', 'for', 'while', 'case', 'catch'}),
+    nesting_keywords=frozenset({'if', 'guard', 'for', 'while', 'switch', 'catch', 'repeat'}),
+    else_keywords=frozenset({'else'}),
+    function_keywords=frozenset({'func', 'init'}),
+    class_keywords=frozenset({'class', 'struct', 'enum', 'protocol', 'extension'}),
+)
+
+KOTLIN = LanguageGrammar(
+    name='Kotlin',
+    multiline_strings=('"""',),
+    keywords=frozenset({
+        'as', 'break', 'catch', 'class', 'companion', 'constructor', 'continue', 'data', 'do',
+        'else', 'enum', 'false', 'finally', 'for', 'fun', 'if', 'import', 'in', 'init', 'interface',
+        'is', 'null', 'object', 'override', 'package', 'private', 'protected', 'public', 'return',
+        'sealed', 'super', 'this', 'throw', 'true', 'try', 'val', 'var', 'when', 'while'
+    }),
+    branch_keywords=frozenset({'if', 'for', 'while', 'when', 'catch'}),
+    nesting_keywords=frozenset({'if', 'for', 'while', 'when', 'catch', 'do'}),
+    else_keywords=frozenset({'else'}),
+    logical_operators=frozenset({'&&', '||', '?:'}),
+    function_keywords=frozenset({'fun'}),
+    class_keywords=frozenset({'class', 'interface', 'object'}),
+)
+
+RUST = LanguageGrammar(
+    name='Rust',
+    string_delimiters=('"',),
+    char_literals=True,
+    keywords=frozenset({
+        'as', 'async', 'await', 'break', 'const', 'continue', 'crate', 'dyn', 'else', 'enum',
+        'extern', 'false', 'fn', 'for', 'if', 'impl', 'in', 'let', 'loop', 'match', 'mod', 'move',
+        'mut', 'pub', 'ref', 'return', 'self', 'Self', 'static', 'struct', 'super', 'trait', 'true',
+        'type', 'unsafe', 'use', 'where', 'while'
+    }),
+    branch_keywords=frozenset({'if', 'for', 'while', 'loop', 'match'}),
+    nesting_keywords=frozenset({'if', 'for', 'while', 'loop', 'match'}),
+    else_keywords=frozenset({'else'}),
+    conditional_operators=frozenset({'?'}),
+    function_keywords=frozenset({'fn'}),
+    class_keywords=frozenset({'struct', 'enum', 'trait', 'impl'}),
+)
+
+# Files in other languages are only split into lines and comments
+GENERIC = LanguageGrammar(
+    name='Generic',
+    line_comments=('//', '#'),
+    conditional_operators=frozenset(),
+)
+
+GRAMMARS: Dict[str, LanguageGrammar] = {
+    grammar.name: grammar
+    for grammar in (PYTHON, JAVASCRIPT, TYPESCRIPT, JAVA, GO, CPP, CSHARP, RUBY, PHP, SWIFT, KOTLIN, RUST)
+}
+
+
+def get_grammar(language: str) -> LanguageGrammar:
+    """
+    Grammar for a language name as reported by GitHub
+
+    Args:
+        language: Language name (e.g. "Python", "C++")
+
+    Returns:
+        The language's grammar, or GENERIC for languages without one
+    """
+    return GRAMMARS.get(language, GENERIC)
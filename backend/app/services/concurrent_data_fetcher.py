@@ -6,10 +6,12 @@ to improve performance when scanning multiple repositories or fetching large dat
 """
 
 import asyncio
+import functools
+import itertools
 import logging
 from typing import Dict, List, Any, Optional, Callable, Tuple
 from datetime import datetime, timedelta
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque
 import time
 from dataclasses import dataclass
 from enum import Enum
@@ -42,7 +44,10 @@ class ConcurrentRequest:
     max_retries: int = 3
     timeout: float = 30.0
     created_at: datetime = None
-    
+    future: Optional[asyncio.Future] = None
+    submitted_at: float = 0.0
+    enqueued_at: float = 0.0
+
     def __post_init__(self):
         if self.created_at is None:
             self.created_at = datetime.now()
@@ -112,17 +117,48 @@ class RateLimitManager:
         async with self.lock:
             now = datetime.now()
             self.request_history[api_type].append(now)
-            
+
             # Update rate limit info from response headers
             if response_headers:
-                if 'x-ratelimit-remaining' in response_headers:
-                    self.api_limits[api_type]['remaining'] = int(
-                        response_headers['x-ratelimit-remaining']
-                    )
-                
-                if 'x-ratelimit-reset' in response_headers:
-                    reset_timestamp = int(response_headers['x-ratelimit-reset'])
-                    self.api_limits[api_type]['reset_time'] = datetime.fromtimestamp(reset_timestamp)
+                self.update_limits(api_type, response_headers)
+
+    def update_limits(self, api_type: str, response_headers: Dict[str, str]):
+        """
+        Update rate limit info from GitHub X-RateLimit-* response headers
+
+        Called by the GitHub clients after every response so the fetcher's
+        worker scaling sees the real shared quota.
+        """
+        headers = {key.lower(): value for key, value in response_headers.items()}
+        api_info = self.api_limits.setdefault(
+            api_type, {'limit': 5000, 'remaining': 5000, 'reset_time': None}
+        )
+        try:
+            if 'x-ratelimit-limit' in headers:
+                api_info['limit'] = int(headers['x-ratelimit-limit'])
+            if 'x-ratelimit-remaining' in headers:
+                api_info['remaining'] = int(headers['x-ratelimit-remaining'])
+            if 'x-ratelimit-reset' in headers:
+                api_info['reset_time'] = datetime.fromtimestamp(int(headers['x-ratelimit-reset']))
+        except (TypeError, ValueError):
+            logger.debug(f"Ignoring malformed rate limit headers for {api_type}")
+
+    def headroom(self) -> float:
+        """
+        Fraction of the tightest GitHub rate limit still available (0.0 - 1.0)
+
+        A bucket whose reset time has passed counts as full.
+        """
+        now = datetime.now()
+        fractions = []
+        for api_info in self.api_limits.values():
+            limit = api_info.get('limit') or 0
+            reset_time = api_info.get('reset_time')
+            if limit <= 0 or (reset_time and now > reset_time):
+                fractions.append(1.0)
+            else:
+                fractions.append(max(0.0, min(1.0, api_info.get('remaining', 0) / limit)))
+        return min(fractions) if fractions else 1.0
     
     async def wait_for_rate_limit(self, api_type: str) -> float:
         """Wait until we can make a request, return wait time"""
@@ -140,61 +176,113 @@ class RateLimitManager:
         
         return wait_time
 
+# Samples kept per latency metric for percentile reporting
+LATENCY_SAMPLE_SIZE = 1000
+
+
+def _percentile(samples: List[float], percentile: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, int(round(percentile / 100.0 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
 class ConcurrentDataFetcher:
-    """High-performance concurrent data fetching service"""
-    
-    def __init__(self, max_concurrent_requests: int = 10, max_queue_size: int = 1000):
+    """
+    High-performance concurrent data fetching service
+
+    Each submitted request owns an asyncio.Future that is resolved with its
+    RequestResult, so waiters wake up as soon as the work finishes. Cancelling
+    a waiter (or timing out) cancels the request, whether it is still queued
+    or already running. Results nobody collects are dropped after
+    `result_ttl` seconds.
+
+    The worker pool scales between `min_workers` and `max_concurrent_requests`
+    with queue depth; the upper bound shrinks with the remaining GitHub
+    rate-limit headroom, and idle workers above the target exit.
+    """
+
+    def __init__(self,
+                 max_concurrent_requests: int = 10,
+                 max_queue_size: int = 1000,
+                 min_workers: int = 2,
+                 result_ttl: float = 300.0,
+                 max_retained_results: int = 1000,
+                 idle_timeout: float = 30.0):
         self.max_concurrent_requests = max_concurrent_requests
+        self.min_workers = max(1, min(min_workers, max_concurrent_requests))
         self.max_queue_size = max_queue_size
+        self.result_ttl = result_ttl
+        self.max_retained_results = max_retained_results
+        self.idle_timeout = idle_timeout
         self.request_queue = asyncio.PriorityQueue(maxsize=max_queue_size)
         self.active_requests = {}
-        self.completed_requests = {}
         self.rate_limiter = RateLimitManager()
         self.semaphore = asyncio.Semaphore(max_concurrent_requests)
-        self.worker_tasks = []
+        self.worker_tasks = set()
         self.running = False
+        self._futures: Dict[str, asyncio.Future] = {}
+        # Completed but not yet collected request ids -> completion time
+        self._retained_results: "OrderedDict[str, float]" = OrderedDict()
+        self._sequence = itertools.count()
+        self._worker_ids = itertools.count()
+        self._latency = {
+            'queue_wait': deque(maxlen=LATENCY_SAMPLE_SIZE),
+            'service_time': deque(maxlen=LATENCY_SAMPLE_SIZE),
+            'total': deque(maxlen=LATENCY_SAMPLE_SIZE)
+        }
         self.stats = {
             'total_requests': 0,
             'successful_requests': 0,
             'failed_requests': 0,
+            'cancelled_requests': 0,
+            'expired_results': 0,
             'total_duration': 0.0,
             'average_duration': 0.0,
             'rate_limit_waits': 0,
-            'retries': 0
+            'retries': 0,
+            'workers_started': 0,
+            'workers_stopped': 0
         }
-    
+
     async def start(self):
         """Start the concurrent fetcher workers"""
         if self.running:
             return
-        
+
         self.running = True
-        
-        # Start worker tasks
-        for i in range(self.max_concurrent_requests):
-            task = asyncio.create_task(self._worker(f"worker-{i}"))
-            self.worker_tasks.append(task)
-        
+        self._scale_workers()
+
         logger.info(f"Started {len(self.worker_tasks)} concurrent fetcher workers")
-    
+
     async def stop(self):
-        """Stop the concurrent fetcher workers"""
+        """Stop the concurrent fetcher workers and cancel outstanding requests"""
         if not self.running:
             return
-        
+
         self.running = False
-        
+
         # Cancel all worker tasks
-        for task in self.worker_tasks:
+        workers = list(self.worker_tasks)
+        for task in workers:
             task.cancel()
-        
+
         # Wait for tasks to complete
-        await asyncio.gather(*self.worker_tasks, return_exceptions=True)
+        await asyncio.gather(*workers, return_exceptions=True)
         self.worker_tasks.clear()
-        
+
+        # Nothing will resolve the remaining futures any more
+        for future in list(self._futures.values()):
+            if not future.done():
+                future.cancel()
+        self._futures.clear()
+        self._retained_results.clear()
+
         logger.info("Stopped concurrent fetcher workers")
-    
-    async def submit_request(self, 
+
+    async def submit_request(self,
                            request_id: str,
                            func: Callable,
                            *args,
@@ -202,11 +290,22 @@ class ConcurrentDataFetcher:
                            timeout: float = 30.0,
                            max_retries: int = 3,
                            **kwargs) -> str:
-        """Submit a request for concurrent execution"""
-        
+        """
+        Submit a request for concurrent execution
+
+        Returns:
+            The request id to pass to get_result; a suffix is added when the
+            given id is still in use by an uncollected request
+        """
+
         if self.request_queue.qsize() >= self.max_queue_size:
             raise Exception("Request queue is full")
-        
+
+        request_id = self._unique_request_id(request_id)
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(functools.partial(self._on_request_done, request_id))
+
+        now = time.monotonic()
         request = ConcurrentRequest(
             id=request_id,
             func=func,
@@ -214,31 +313,43 @@ class ConcurrentDataFetcher:
             kwargs=kwargs,
             priority=priority,
             timeout=timeout,
-            max_retries=max_retries
+            max_retries=max_retries,
+            future=future,
+            submitted_at=now,
+            enqueued_at=now
         )
-        
-        # Priority queue uses negative values for higher priority
-        priority_value = -priority.value
-        await self.request_queue.put((priority_value, request))
-        
+        self._futures[request_id] = future
+
+        await self._enqueue(request)
+
         self.stats['total_requests'] += 1
+        self._scale_workers()
         logger.debug(f"Submitted request {request_id} with priority {priority.name}")
-        
+
         return request_id
-    
+
     async def get_result(self, request_id: str, timeout: float = None) -> RequestResult:
-        """Get the result of a submitted request"""
-        start_time = time.time()
-        
-        while request_id not in self.completed_requests:
-            if timeout and (time.time() - start_time) > timeout:
-                raise asyncio.TimeoutError(f"Request {request_id} timed out")
-            
-            await asyncio.sleep(0.1)
-        
-        result = self.completed_requests.pop(request_id)
-        return result
-    
+        """
+        Get the result of a submitted request
+
+        Cancelling the caller, or hitting the timeout, cancels the request.
+
+        Raises:
+            KeyError: If the request is unknown, already collected or expired
+            asyncio.TimeoutError: If the request did not finish in time
+        """
+        future = self._futures.get(request_id)
+        if future is None:
+            raise KeyError(f"Unknown or expired request {request_id}")
+
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError(f"Request {request_id} timed out")
+        finally:
+            self._futures.pop(request_id, None)
+            self._retained_results.pop(request_id, None)
+
     async def submit_and_wait(self,
                             request_id: str,
                             func: Callable,
@@ -248,75 +359,156 @@ class ConcurrentDataFetcher:
                             max_retries: int = 3,
                             **kwargs) -> RequestResult:
         """Submit a request and wait for its completion"""
-        
-        await self.submit_request(
+
+        request_id = await self.submit_request(
             request_id, func, *args,
             priority=priority, timeout=timeout, max_retries=max_retries, **kwargs
         )
-        
+
         return await self.get_result(request_id, timeout=timeout + 10)
-    
+
     async def submit_batch(self,
                           requests: List[Tuple[str, Callable, tuple, dict]],
                           priority: RequestPriority = RequestPriority.NORMAL,
                           timeout: float = 30.0) -> List[RequestResult]:
         """Submit multiple requests and wait for all to complete"""
-        
+
         request_ids = []
-        
+
         # Submit all requests
         for request_id, func, args, kwargs in requests:
-            await self.submit_request(
+            request_ids.append(await self.submit_request(
                 request_id, func, *args,
                 priority=priority, timeout=timeout, **kwargs
-            )
-            request_ids.append(request_id)
-        
-        # Wait for all results
-        results = []
-        for request_id in request_ids:
-            result = await self.get_result(request_id, timeout=timeout + 10)
-            results.append(result)
-        
-        return results
-    
+            ))
+
+        # Wait for all results; they resolve concurrently
+        return list(await asyncio.gather(*[
+            self.get_result(request_id, timeout=timeout + 10)
+            for request_id in request_ids
+        ]))
+
+    async def _enqueue(self, request: ConcurrentRequest):
+        """Queue a request; the sequence number keeps FIFO order within a priority"""
+        await self.request_queue.put((-request.priority.value, next(self._sequence), request))
+
+    def _unique_request_id(self, request_id: str) -> str:
+        if request_id not in self._futures:
+            return request_id
+        suffix = 2
+        while f"{request_id}#{suffix}" in self._futures:
+            suffix += 1
+        return f"{request_id}#{suffix}"
+
+    def _on_request_done(self, request_id: str, future: asyncio.Future):
+        """Future callback: propagate cancellation or retain the result for collection"""
+        if future.cancelled():
+            self.stats['cancelled_requests'] += 1
+            self._futures.pop(request_id, None)
+            active = self.active_requests.get(request_id)
+            if active and active.get('task') is not None:
+                active['task'].cancel()
+            return
+
+        self._retained_results[request_id] = time.monotonic()
+        self._purge_expired_results()
+
+    def _purge_expired_results(self):
+        """Drop uncollected results older than result_ttl or beyond max_retained_results"""
+        cutoff = time.monotonic() - self.result_ttl
+        while self._retained_results:
+            request_id, completed_at = next(iter(self._retained_results.items()))
+            if completed_at > cutoff and len(self._retained_results) <= self.max_retained_results:
+                break
+            self._retained_results.popitem(last=False)
+            self._futures.pop(request_id, None)
+            self.stats['expired_results'] += 1
+
+    def _worker_ceiling(self) -> int:
+        """Maximum workers allowed by the remaining GitHub rate-limit headroom"""
+        spare = self.max_concurrent_requests - self.min_workers
+        return self.min_workers + int(spare * self.rate_limiter.headroom())
+
+    def _desired_workers(self) -> int:
+        backlog = self.request_queue.qsize() + len(self.active_requests)
+        return max(self.min_workers, min(self._worker_ceiling(), backlog))
+
+    def _scale_workers(self):
+        """Start workers until the pool matches queue depth and rate-limit headroom"""
+        if not self.running:
+            return
+        while len(self.worker_tasks) < self._desired_workers():
+            worker_name = f"worker-{next(self._worker_ids)}"
+            task = asyncio.create_task(self._worker(worker_name))
+            self.worker_tasks.add(task)
+            self.stats['workers_started'] += 1
+
     async def _worker(self, worker_name: str):
         """Worker task that processes requests from the queue"""
         logger.debug(f"Started worker {worker_name}")
-        
-        while self.running:
-            try:
-                # Get next request from queue
+
+        try:
+            while self.running:
                 try:
-                    priority, request = await asyncio.wait_for(
-                        self.request_queue.get(), timeout=1.0
-                    )
-                except asyncio.TimeoutError:
-                    continue
-                
-                # Process the request
-                await self._process_request(request, worker_name)
-                
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Worker {worker_name} error: {e}")
-                await asyncio.sleep(1)
-        
+                    # Get next request from queue
+                    try:
+                        _, _, request = await asyncio.wait_for(
+                            self.request_queue.get(), timeout=self.idle_timeout
+                        )
+                    except asyncio.TimeoutError:
+                        if len(self.worker_tasks) > self._desired_workers():
+                            break
+                        continue
+
+                    # Process the request
+                    await self._process_request(request, worker_name)
+
+                    # Shrink when the rate-limit headroom no longer supports this many workers
+                    if len(self.worker_tasks) > max(self._worker_ceiling(), self.min_workers):
+                        break
+
+                except asyncio.CancelledError:
+                    break
+                except Exception as e:
+                    logger.error(f"Worker {worker_name} error: {e}")
+                    await asyncio.sleep(1)
+        finally:
+            self.worker_tasks.discard(asyncio.current_task())
+            self.stats['workers_stopped'] += 1
+
         logger.debug(f"Stopped worker {worker_name}")
-    
+
+    async def _execute(self, request: ConcurrentRequest) -> Any:
+        if asyncio.iscoroutinefunction(request.func):
+            return await asyncio.wait_for(
+                request.func(*request.args, **request.kwargs),
+                timeout=request.timeout
+            )
+        return await asyncio.wait_for(
+            asyncio.get_running_loop().run_in_executor(
+                None, functools.partial(request.func, *request.args, **request.kwargs)
+            ),
+            timeout=request.timeout
+        )
+
     async def _process_request(self, request: ConcurrentRequest, worker_name: str):
         """Process a single request"""
+        if request.future.done():
+            # Cancelled (or expired) while it was queued
+            return
+
         async with self.semaphore:
-            start_time = time.time()
-            
+            start_time = time.monotonic()
+            self._latency['queue_wait'].append(start_time - request.enqueued_at)
+
             try:
                 self.active_requests[request.id] = {
                     'request': request,
                     'worker': worker_name,
-                    'start_time': start_time
+                    'start_time': start_time,
+                    'task': None
                 }
-                
+
                 # Check rate limits if this is a GitHub API request
                 api_type = self._detect_api_type(request.func)
                 if api_type:
@@ -324,27 +516,18 @@ class ConcurrentDataFetcher:
                     if wait_time > 0:
                         self.stats['rate_limit_waits'] += 1
                         logger.debug(f"Waited {wait_time:.2f}s for rate limit on {api_type}")
-                
-                # Execute the request
-                if asyncio.iscoroutinefunction(request.func):
-                    result = await asyncio.wait_for(
-                        request.func(*request.args, **request.kwargs),
-                        timeout=request.timeout
-                    )
-                else:
-                    result = await asyncio.wait_for(
-                        asyncio.get_event_loop().run_in_executor(
-                            None, request.func, *request.args
-                        ),
-                        timeout=request.timeout
-                    )
-                
+
+                # Execute the request as its own task so a cancelled waiter can stop it
+                execution = asyncio.ensure_future(self._execute(request))
+                self.active_requests[request.id]['task'] = execution
+                result = await execution
+
                 # Record successful request
                 if api_type:
                     await self.rate_limiter.record_request(api_type)
-                
-                duration = time.time() - start_time
-                
+
+                duration = time.monotonic() - start_time
+
                 request_result = RequestResult(
                     request_id=request.id,
                     success=True,
@@ -352,32 +535,36 @@ class ConcurrentDataFetcher:
                     duration=duration,
                     retry_count=request.retry_count
                 )
-                
+
                 self.stats['successful_requests'] += 1
-                self.stats['total_duration'] += duration
-                self._update_average_duration()
-                
+
                 logger.debug(f"Request {request.id} completed successfully in {duration:.2f}s")
-                
+
+            except asyncio.CancelledError:
+                if self.running and request.future.cancelled():
+                    logger.debug(f"Request {request.id} cancelled by its caller")
+                    return
+                raise
+
             except Exception as e:
-                duration = time.time() - start_time
-                
+                duration = time.monotonic() - start_time
+
                 # Handle retries
-                if request.retry_count < request.max_retries:
+                if request.retry_count < request.max_retries and not request.future.done():
                     request.retry_count += 1
                     self.stats['retries'] += 1
-                    
+
                     # Exponential backoff
                     delay = min(2 ** request.retry_count, 30)
                     await asyncio.sleep(delay)
-                    
+
                     logger.debug(f"Retrying request {request.id} (attempt {request.retry_count + 1})")
-                    
+
                     # Re-queue the request
-                    priority_value = -request.priority.value
-                    await self.request_queue.put((priority_value, request))
+                    request.enqueued_at = time.monotonic()
+                    await self._enqueue(request)
                     return
-                
+
                 # Max retries exceeded
                 request_result = RequestResult(
                     request_id=request.id,
@@ -386,62 +573,90 @@ class ConcurrentDataFetcher:
                     duration=duration,
                     retry_count=request.retry_count
                 )
-                
+
                 self.stats['failed_requests'] += 1
-                self.stats['total_duration'] += duration
-                self._update_average_duration()
-                
+
                 logger.warning(f"Request {request.id} failed after {request.retry_count} retries: {e}")
-            
+
             finally:
-                # Clean up and store result
-                if request.id in self.active_requests:
-                    del self.active_requests[request.id]
-                
-                self.completed_requests[request.id] = request_result
-    
+                self.active_requests.pop(request.id, None)
+
+            self.stats['total_duration'] += duration
+            self._update_average_duration()
+            self._latency['service_time'].append(duration)
+            self._latency['total'].append(time.monotonic() - request.submitted_at)
+
+            if not request.future.done():
+                request.future.set_result(request_result)
+
     def _detect_api_type(self, func: Callable) -> Optional[str]:
         """Detect API type from function name/module for rate limiting"""
         func_name = getattr(func, '__name__', '')
         module_name = getattr(func, '__module__', '')
-        
+
         if 'github' in module_name.lower() or 'github' in func_name.lower():
             if 'graphql' in func_name.lower() or 'graphql' in module_name.lower():
                 return 'github_graphql'
             return 'github_rest'
-        
+
         return None
-    
+
     def _update_average_duration(self):
         """Update average duration statistics"""
         total_completed = self.stats['successful_requests'] + self.stats['failed_requests']
         if total_completed > 0:
             self.stats['average_duration'] = self.stats['total_duration'] / total_completed
-    
+
     def get_stats(self) -> Dict[str, Any]:
         """Get performance statistics"""
+        self._purge_expired_results()
         return {
             **self.stats,
             'active_requests': len(self.active_requests),
             'queued_requests': self.request_queue.qsize(),
+            'pending_results': len(self._futures),
+            'retained_results': len(self._retained_results),
             'worker_count': len(self.worker_tasks),
+            'min_workers': self.min_workers,
+            'max_workers': self.max_concurrent_requests,
+            'rate_limit_headroom': round(self.rate_limiter.headroom(), 3),
             'running': self.running
         }
-    
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get latency percentiles (seconds) over the most recent requests
+
+        Returns:
+            queue_wait (submit to start), service_time (execution) and
+            total (submit to completion) with avg/p50/p95/max each
+        """
+        summary = {}
+        for name, samples in self._latency.items():
+            values = list(samples)
+            summary[name] = {
+                'samples': len(values),
+                'avg': round(sum(values) / len(values), 4) if values else 0.0,
+                'p50': round(_percentile(values, 50), 4),
+                'p95': round(_percentile(values, 95), 4),
+                'max': round(max(values), 4) if values else 0.0
+            }
+        return summary
+
     def get_active_requests(self) -> Dict[str, Any]:
         """Get information about currently active requests"""
-        now = time.time()
+        now = time.monotonic()
         active_info = {}
-        
+
         for request_id, info in self.active_requests.items():
             duration = now - info['start_time']
             active_info[request_id] = {
                 'worker': info['worker'],
                 'duration': duration,
                 'priority': info['request'].priority.name,
-                'function': info['request'].func.__name__
+                'function': getattr(info['request'].func, '__name__', repr(info['request'].func))
             }
-        
+
         return active_info
 
 # Global concurrent fetcher instance
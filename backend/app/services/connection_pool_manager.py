@@ -10,6 +10,7 @@ import logging
 from typing import Dict, List, Any, Optional, AsyncContextManager
 from datetime import datetime, timedelta
 from contextlib import asynccontextmanager
+from collections import deque
 from dataclasses import dataclass
 import time
 
@@ -35,8 +36,15 @@ except ImportError:
     REDIS_AVAILABLE = False
     redis = None
 
+from app.core.config import settings
+from app.core.monitoring import MetricType, record_metric
+from app.database.connection_manager import get_pool_config, mongo_connection_manager
+
 logger = logging.getLogger(__name__)
 
+# Timing samples kept per phase for the pool statistics
+TIMING_SAMPLE_SIZE = 1000
+
 @dataclass
 class PoolStats:
     """Connection pool statistics"""
@@ -49,61 +57,126 @@ class PoolStats:
     average_connection_time: float = 0.0
     peak_connections: int = 0
 
+@dataclass
+class RequestTiming:
+    """Per-request timing filled in by the HTTP pool's trace hooks"""
+    host: str = ""
+    started: float = 0.0
+    connect_ms: Optional[float] = None
+    ttfb_ms: Optional[float] = None
+    download_ms: Optional[float] = None
+    reused_connection: bool = True
+    _connect_started: float = 0.0
+    _headers_at: float = 0.0
+
+
 class HTTPConnectionPool:
-    """HTTP connection pool for API requests"""
+    """
+    Shared keep-alive HTTP connection pool for outbound GitHub requests
+    
+    One aiohttp session (per event loop) with a global and per-host
+    connection cap and a DNS cache. Trace hooks record connect, time to
+    first byte and download times, plus the connection reuse rate.
+    """
     
     def __init__(self, 
                  max_connections: int = 100,
                  max_connections_per_host: int = 30,
-                 timeout: float = 30.0):
+                 timeout: float = 30.0,
+                 dns_cache_ttl: int = 300,
+                 keepalive_timeout: float = 30.0):
         
         self.max_connections = max_connections
         self.max_connections_per_host = max_connections_per_host
         self.timeout = timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
         self.stats = PoolStats()
         self.connection_times = []
         
+        self.session = None
+        self._loop = None
+        self.requests = 0
+        self.reused_connections = 0
+        self.new_connections = 0
+        self.dns_cache_hits = 0
+        self.dns_cache_misses = 0
+        self.failed_requests = 0
+        self._timings = {
+            "connect": deque(maxlen=TIMING_SAMPLE_SIZE),
+            "ttfb": deque(maxlen=TIMING_SAMPLE_SIZE),
+            "download": deque(maxlen=TIMING_SAMPLE_SIZE)
+        }
+        
         if not AIOHTTP_AVAILABLE:
             logger.warning("aiohttp not available, HTTP connection pooling disabled")
-            self.session = None
-            return
-        
+    
+    def _create_session(self):
+        """Create the pooled session with DNS caching and timing hooks"""
         # Connection pool configuration
         connector = aiohttp.TCPConnector(
-            limit=max_connections,
-            limit_per_host=max_connections_per_host,
-            ttl_dns_cache=300,
+            limit=self.max_connections,
+            limit_per_host=self.max_connections_per_host,
+            ttl_dns_cache=self.dns_cache_ttl,
             use_dns_cache=True,
-            keepalive_timeout=30,
+            keepalive_timeout=self.keepalive_timeout,
             enable_cleanup_closed=True
         )
         
         # Timeout configuration
         timeout_config = aiohttp.ClientTimeout(
-            total=timeout,
+            total=self.timeout,
             connect=10.0,
-            sock_read=timeout
+            sock_read=self.timeout
         )
         
-        self.session = aiohttp.ClientSession(
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_create_start.append(self._on_connection_create_start)
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(self._on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(self._on_dns_cache_miss)
+        trace_config.on_request_end.append(self._on_request_end)
+        trace_config.on_request_exception.append(self._on_request_exception)
+        
+        return aiohttp.ClientSession(
             connector=connector,
             timeout=timeout_config,
+            trace_configs=[trace_config],
             headers={
                 'User-Agent': 'GitHub-Scanner/1.0'
             }
         )
+    
+    def shared_session(self):
+        """
+        Get the pooled session for the running event loop (created on first use)
+        
+        Returns:
+            aiohttp.ClientSession shared by every caller on this loop
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise RuntimeError("aiohttp not available, cannot create HTTP session")
+        
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self._loop is not loop:
+            self.session = self._create_session()
+            self._loop = loop
+        return self.session
         
     async def close(self):
         """Close the HTTP connection pool"""
-        if self.session and not self.session.closed:
+        if self.session and not self.session.closed and self._loop is asyncio.get_running_loop():
             await self.session.close()
             logger.info("HTTP connection pool closed")
+        self.session = None
+        self._loop = None
     
     @asynccontextmanager
     async def get_session(self):
         """Get an HTTP session from the pool"""
-        if not AIOHTTP_AVAILABLE or self.session is None:
-            raise RuntimeError("aiohttp not available, cannot create HTTP session")
+        session = self.shared_session()
         
         start_time = time.time()
         
@@ -114,7 +187,7 @@ class HTTPConnectionPool:
                 self.stats.active_connections
             )
             
-            yield self.session
+            yield session
             
             # Record successful connection
             connection_time = time.time() - start_time
@@ -134,57 +207,164 @@ class HTTPConnectionPool:
         finally:
             self.stats.active_connections -= 1
     
+    @asynccontextmanager
+    async def request(self, method: str, url: str, **kwargs):
+        """
+        Send a request on the pooled session, timing the body download as well
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: aiohttp request options (headers, params, json, data, timeout)
+            
+        Yields:
+            aiohttp.ClientResponse (read the body inside the block)
+        """
+        session = self.shared_session()
+        timing = RequestTiming()
+        
+        async with session.request(method, url, trace_request_ctx=timing, **kwargs) as response:
+            try:
+                yield response
+            finally:
+                if timing._headers_at:
+                    timing.download_ms = (time.perf_counter() - timing._headers_at) * 1000
+                    self._record(timing)
+    
+    # aiohttp trace hooks (trace_config_ctx is per request)
+    
+    async def _on_request_start(self, session, trace_config_ctx, params):
+        timing = trace_config_ctx.trace_request_ctx
+        if not isinstance(timing, RequestTiming):
+            # Plain session.get(...) call: recorded when headers arrive
+            timing = RequestTiming()
+            trace_config_ctx.record_on_headers = True
+        timing.host = params.url.host or ""
+        timing.started = time.perf_counter()
+        trace_config_ctx.timing = timing
+        self.requests += 1
+    
+    async def _on_connection_create_start(self, session, trace_config_ctx, params):
+        trace_config_ctx.timing.reused_connection = False
+        trace_config_ctx.timing._connect_started = time.perf_counter()
+    
+    async def _on_connection_create_end(self, session, trace_config_ctx, params):
+        timing = trace_config_ctx.timing
+        timing.connect_ms = (time.perf_counter() - timing._connect_started) * 1000
+        self.new_connections += 1
+    
+    async def _on_connection_reuseconn(self, session, trace_config_ctx, params):
+        self.reused_connections += 1
+    
+    async def _on_dns_cache_hit(self, session, trace_config_ctx, params):
+        self.dns_cache_hits += 1
+    
+    async def _on_dns_cache_miss(self, session, trace_config_ctx, params):
+        self.dns_cache_misses += 1
+    
+    async def _on_request_end(self, session, trace_config_ctx, params):
+        timing = trace_config_ctx.timing
+        timing._headers_at = time.perf_counter()
+        timing.ttfb_ms = (timing._headers_at - timing.started) * 1000
+        if getattr(trace_config_ctx, "record_on_headers", False):
+            self._record(timing)
+    
+    async def _on_request_exception(self, session, trace_config_ctx, params):
+        self.failed_requests += 1
+    
+    def _record(self, timing: RequestTiming):
+        """Keep timing samples and publish them to the metrics registry"""
+        labels = {"host": timing.host}
+        phases = (("connect", timing.connect_ms), ("ttfb", timing.ttfb_ms), ("download", timing.download_ms))
+        for phase, value in phases:
+            if value is None:
+                continue
+            self._timings[phase].append(value)
+            record_metric(f"http_{phase}_ms", value, MetricType.HISTOGRAM, labels, "ms")
+    
+    def get_timing_stats(self) -> Dict[str, Any]:
+        """Get connection reuse, DNS cache and per-phase timing statistics"""
+        connections = self.reused_connections + self.new_connections
+        timings = {}
+        for phase, samples in self._timings.items():
+            ordered = sorted(samples)
+            timings[phase] = {
+                "samples": len(ordered),
+                "avg_ms": sum(ordered) / len(ordered) if ordered else 0.0,
+                "p95_ms": ordered[int(len(ordered) * 0.95) - 1] if ordered else 0.0
+            }
+        
+        return {
+            "requests": self.requests,
+            "failed_requests": self.failed_requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "reuse_rate": self.reused_connections / connections if connections else 0.0,
+            "dns_cache_hits": self.dns_cache_hits,
+            "dns_cache_misses": self.dns_cache_misses,
+            "max_connections": self.max_connections,
+            "max_connections_per_host": self.max_connections_per_host,
+            "timings": timings
+        }
+    
     def get_stats(self) -> PoolStats:
         """Get connection pool statistics"""
         # Update current stats
-        if hasattr(self.session, '_connector') and self.session._connector:
+        if self.session is not None and getattr(self.session, '_connector', None):
             connector = self.session._connector
             self.stats.total_connections = len(connector._conns)
             self.stats.idle_connections = sum(
                 len(conns) for conns in connector._conns.values()
             )
+        self.stats.created_connections = self.new_connections
         
         return self.stats
 
 class MongoConnectionPool:
-    """MongoDB connection pool manager"""
+    """MongoDB connection pool backed by the shared connection manager"""
     
     def __init__(self, 
                  connection_string: str,
                  database_name: str,
-                 max_pool_size: int = 50,
-                 min_pool_size: int = 5):
+                 max_pool_size: Optional[int] = None,
+                 min_pool_size: Optional[int] = None):
         
         self.connection_string = connection_string
         self.database_name = database_name
-        self.max_pool_size = max_pool_size
-        self.min_pool_size = min_pool_size
         self.stats = PoolStats()
+        self._owns_client = False
+        
+        # Sizes come from the deployment-aware pool config unless given explicitly
+        pool_config = get_pool_config()
+        self.max_pool_size = max_pool_size or pool_config["maxPoolSize"]
+        self.min_pool_size = min_pool_size if min_pool_size is not None else pool_config["minPoolSize"]
         
         if not MOTOR_AVAILABLE:
             logger.warning("motor not available, MongoDB connection pooling disabled")
-            self.client = None
-            self.database = None
-            return
         
-        # Create MongoDB client with connection pooling
-        self.client = motor.motor_asyncio.AsyncIOMotorClient(
-            connection_string,
-            maxPoolSize=max_pool_size,
-            minPoolSize=min_pool_size,
-            maxIdleTimeMS=30000,
-            waitQueueTimeoutMS=5000,
-            serverSelectionTimeoutMS=5000,
-            connectTimeoutMS=10000,
-            socketTimeoutMS=20000
-        )
-        
-        self.database = self.client[database_name]
+    @property
+    def client(self):
+        return mongo_connection_manager.client
+    
+    @property
+    def database(self):
+        return mongo_connection_manager.get_database(self.database_name)
+    
+    async def connect(self):
+        """Connect the shared client if the application has not already done so"""
+        if not MOTOR_AVAILABLE:
+            return
+        if mongo_connection_manager.connected:
+            return
+        overrides = {"maxPoolSize": self.max_pool_size, "minPoolSize": self.min_pool_size}
+        await mongo_connection_manager.connect(self.connection_string, self.database_name, **overrides)
+        self._owns_client = True
         
     async def close(self):
-        """Close the MongoDB connection pool"""
-        if self.client:
-            self.client.close()
+        """Close the MongoDB connection pool (only if this pool opened the shared client)"""
+        if self.client and self._owns_client:
+            await mongo_connection_manager.close()
+            self._owns_client = False
             logger.info("MongoDB connection pool closed")
     
     @asynccontextmanager
@@ -215,17 +395,24 @@ class MongoConnectionPool:
             self.stats.active_connections -= 1
     
     async def ping(self) -> bool:
-        """Test MongoDB connection"""
+        """Test MongoDB connection (from driver heartbeats when available)"""
         try:
-            await self.client.admin.command('ping')
-            return True
+            return await mongo_connection_manager.check_health()
         except Exception as e:
             logger.error(f"MongoDB ping failed: {e}")
             return False
     
     def get_stats(self) -> PoolStats:
         """Get MongoDB connection pool statistics"""
+        pool = mongo_connection_manager.pool_monitor.get_stats()
+        self.stats.total_connections = pool["open_connections"]
+        self.stats.idle_connections = max(pool["open_connections"] - pool["in_use"], 0)
+        self.stats.peak_connections = max(self.stats.peak_connections, pool["in_use"])
         return self.stats
+    
+    def get_wait_stats(self) -> Dict[str, Any]:
+        """Get pool wait-time metrics and heartbeat health of the shared client"""
+        return mongo_connection_manager.get_stats()
 
 class RedisConnectionPool:
     """Redis connection pool manager"""
@@ -319,12 +506,15 @@ class ConnectionPoolManager:
                         mongo_connection_string: str = None,
                         mongo_database: str = None,
                         redis_url: str = None,
-                        http_max_connections: int = 100):
+                        http_max_connections: Optional[int] = None):
         """Initialize all connection pools"""
         
         try:
-            # Initialize HTTP connection pool
-            self.http_pool = HTTPConnectionPool(max_connections=http_max_connections)
+            # Initialize the shared HTTP connection pool (may already exist from lazy use)
+            http_pool = self.get_http_pool()
+            if http_max_connections:
+                http_pool.max_connections = http_max_connections
+            _configure_scoring_http_session(http_pool)
             logger.info("HTTP connection pool initialized")
             
             # Initialize MongoDB connection pool
@@ -333,6 +523,7 @@ class ConnectionPoolManager:
                     mongo_connection_string, 
                     mongo_database
                 )
+                await self.mongo_pool.connect()
                 
                 # Test connection
                 if await self.mongo_pool.ping():
@@ -373,9 +564,14 @@ class ConnectionPoolManager:
         logger.info("All connection pools closed")
     
     def get_http_pool(self) -> HTTPConnectionPool:
-        """Get HTTP connection pool"""
+        """Get the shared HTTP connection pool, creating it from settings on first use"""
         if not self.http_pool:
-            raise RuntimeError("HTTP connection pool not initialized")
+            self.http_pool = HTTPConnectionPool(
+                max_connections=settings.http_pool_max_connections,
+                max_connections_per_host=settings.http_pool_max_connections_per_host,
+                dns_cache_ttl=settings.http_pool_dns_cache_ttl,
+                keepalive_timeout=settings.http_pool_keepalive_timeout
+            )
         return self.http_pool
     
     def get_mongo_pool(self) -> MongoConnectionPool:
@@ -410,11 +606,11 @@ class ConnectionPoolManager:
         health = {}
         
         if self.http_pool:
-            # HTTP pool is healthy if session is not closed
+            # HTTP pool is healthy if its session is open or can be created on demand
             if self.http_pool.session is not None:
                 health['http'] = not self.http_pool.session.closed
             else:
-                health['http'] = False  # aiohttp not available
+                health['http'] = AIOHTTP_AVAILABLE
         
         if self.mongo_pool:
             health['mongodb'] = await self.mongo_pool.ping()
@@ -424,13 +620,26 @@ class ConnectionPoolManager:
         
         return health
 
+def _configure_scoring_http_session(http_pool: HTTPConnectionPool):
+    """Route the scoring package's GitHub requests through the shared pool"""
+    try:
+        from backend.scoring.github.http_session import set_session_provider
+    except ImportError:
+        logger.debug("Scoring package not importable, its GitHub clients keep per-call sessions")
+        return
+    set_session_provider(http_pool.shared_session)
+
 # Global connection pool manager instance
 connection_pool_manager = ConnectionPoolManager()
 
+def get_http_pool() -> HTTPConnectionPool:
+    """Get the shared HTTP connection pool used for every outbound GitHub call"""
+    return connection_pool_manager.get_http_pool()
+
 async def initialize_connection_pools(mongo_connection_string: str = None,
                                     mongo_database: str = None,
                                     redis_url: str = None,
-                                    http_max_connections: int = 100):
+                                    http_max_connections: Optional[int] = None):
     """Initialize the global connection pool manager"""
     await connection_pool_manager.initialize(
         mongo_connection_string=mongo_connection_string,
@@ -0,0 +1,516 @@
+"""
+Contribution Calendar Store
+Per-user GitHub contribution calendars kept as compact day-count arrays
+
+A user's first sync downloads the one-year calendar. Later syncs ask GraphQL
+only for the days since the last stored day (contributionsCollection `from`),
+overwrite that day, append the new ones and drop the days that slid out of
+the window. Streaks and contribution patterns are running aggregates updated
+for the changed days only, so reading a calendar never rescans the year.
+
+Records live in a small in-process LRU backed by Redis (via CacheService)
+or, when Redis is unavailable, an optional on-disk directory.
+"""
+
+import json
+import logging
+import os
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.cache_service import cache_service
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "contribution_calendar"
+
+# Bump when the persisted layout changes; older records are refetched
+FORMAT_VERSION = 1
+
+# Days kept per user, matching the default one-year calendar query
+CALENDAR_WINDOW_DAYS = 365
+
+DEFAULT_DAY_COLOR = '#ebedf0'
+
+WEEKDAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def contribution_level(count: int) -> int:
+    """Convert contribution count to level (0-4)"""
+    if count == 0:
+        return 0
+    elif count <= 3:
+        return 1
+    elif count <= 6:
+        return 2
+    elif count <= 9:
+        return 3
+    else:
+        return 4
+
+
+class ContributionCalendar:
+    """
+    One user's contribution calendar
+
+    counts[i] and colors[i] describe day start + i; colors index palette.
+    Everything else is a running aggregate over those days, kept current by
+    merge() and trim().
+    """
+
+    __slots__ = (
+        'username',
+        'start',
+        'counts',
+        'colors',
+        'palette',
+        'runs',
+        'weekday_totals',
+        'weekday_days',
+        'monthly_totals',
+        'count_days',
+        'total_contributions',
+        'summary',
+        'synced_at',
+        'summary_synced_at',
+    )
+
+    def __init__(self, username: str, start: Optional[date] = None):
+        self.username = username
+        self.start = start
+        self.counts = array('I')
+        self.colors = array('B')
+        self.palette: List[str] = []
+        # Runs of days with contributions as [first day ordinal, length], oldest first
+        self.runs: List[List[int]] = []
+        # Indexed by date.weekday() (Monday = 0)
+        self.weekday_totals = [0] * 7
+        self.weekday_days = [0] * 7
+        # 'YYYY-MM' -> contributions, oldest month first
+        self.monthly_totals: Dict[str, int] = {}
+        # Contribution count -> number of days with that count
+        self.count_days: Dict[int, int] = {}
+        self.total_contributions = 0
+        # Totals and repository breakdowns from the last full query
+        self.summary: Dict[str, Any] = {}
+        self.synced_at = 0.0
+        self.summary_synced_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    @property
+    def end(self) -> Optional[date]:
+        """Last stored day"""
+        if not self.counts:
+            return None
+        return self.start + timedelta(days=len(self.counts) - 1)
+
+    def day(self, index: int) -> date:
+        return self.start + timedelta(days=index)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def merge(self, days: Iterable[Tuple[str, int, Optional[str]]]) -> int:
+        """
+        Merge fetched days into the calendar
+
+        Days inside the stored range overwrite the stored count, later days
+        are appended (missing days in between are stored as zero) and days
+        before the stored range are ignored.
+
+        Args:
+            days: (ISO date, contribution count, color) tuples
+
+        Returns:
+            Number of stored days that were added or changed
+        """
+        first_changed = None
+        changed = 0
+
+        for day_str, count, color in sorted(days, key=lambda d: d[0]):
+            day = date.fromisoformat(day_str)
+            if self.start is None or not self.counts and day > self.start:
+                self.start = day
+
+            index = (day - self.start).days
+            if index < 0:
+                continue
+
+            while len(self.counts) < index:
+                self._append(0, DEFAULT_DAY_COLOR)
+                changed += 1
+                if first_changed is None:
+                    first_changed = len(self.counts) - 1
+
+            color_index = self._color_index(color or DEFAULT_DAY_COLOR)
+            if index == len(self.counts):
+                self._append(count, None, color_index)
+            elif self.counts[index] == count and self.colors[index] == color_index:
+                continue
+            else:
+                self._account(index, self.counts[index], -1)
+                self.counts[index] = count
+                self.colors[index] = color_index
+                self._account(index, count, 1)
+
+            changed += 1
+            if first_changed is None or index < first_changed:
+                first_changed = index
+
+        if first_changed is not None:
+            self._rebuild_runs_from(first_changed)
+        return changed
+
+    def trim(self, first_day: date) -> int:
+        """
+        Drop the days before first_day
+
+        Args:
+            first_day: Oldest day to keep
+
+        Returns:
+            Number of days dropped
+        """
+        if self.start is None or first_day <= self.start:
+            return 0
+
+        dropped = min((first_day - self.start).days, len(self.counts))
+        for index in range(dropped):
+            self._account(index, self.counts[index], -1)
+        del self.counts[:dropped]
+        del self.colors[:dropped]
+        self.start = first_day if not self.counts else self.start + timedelta(days=dropped)
+
+        first_ordinal = self.start.toordinal()
+        while self.runs and self.runs[0][0] + self.runs[0][1] <= first_ordinal:
+            self.runs.pop(0)
+        if self.runs and self.runs[0][0] < first_ordinal:
+            run_start, length = self.runs[0]
+            self.runs[0] = [first_ordinal, length - (first_ordinal - run_start)]
+
+        first_month = self.start.strftime('%Y-%m')
+        for month in [m for m in self.monthly_totals if m < first_month]:
+            del self.monthly_totals[month]
+
+        return dropped
+
+    def _color_index(self, color: str) -> int:
+        try:
+            return self.palette.index(color)
+        except ValueError:
+            self.palette.append(color)
+            return len(self.palette) - 1
+
+    def _append(self, count: int, color: Optional[str], color_index: Optional[int] = None) -> None:
+        self.counts.append(count)
+        self.colors.append(self._color_index(color) if color_index is None else color_index)
+        self._account(len(self.counts) - 1, count, 1)
+
+    def _account(self, index: int, count: int, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) one day from the running aggregates"""
+        day = self.day(index)
+        weekday = day.weekday()
+        month = day.strftime('%Y-%m')
+
+        self.weekday_totals[weekday] += sign * count
+        self.weekday_days[weekday] += sign
+        self.monthly_totals[month] = self.monthly_totals.get(month, 0) + sign * count
+        self.total_contributions += sign * count
+
+        days = self.count_days.get(count, 0) + sign
+        if days:
+            self.count_days[count] = days
+        else:
+            self.count_days.pop(count, None)
+
+    def _rebuild_runs_from(self, index: int) -> None:
+        """Recompute the contribution runs from a stored day onwards"""
+        ordinal = self.start.toordinal() + index
+
+        while self.runs and self.runs[-1][0] >= ordinal:
+            self.runs.pop()
+        if self.runs and self.runs[-1][0] + self.runs[-1][1] > ordinal:
+            self.runs[-1][1] = ordinal - self.runs[-1][0]
+
+        for position in range(index, len(self.counts)):
+            if not self.counts[position]:
+                continue
+            day_ordinal = self.start.toordinal() + position
+            if self.runs and self.runs[-1][0] + self.runs[-1][1] == day_ordinal:
+                self.runs[-1][1] += 1
+            else:
+                self.runs.append([day_ordinal, 1])
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def calendar_days(self) -> List[Dict[str, Any]]:
+        """Stored days in the shape of the GraphQL client's calendar_data"""
+        start_ordinal = self.start.toordinal() if self.start else 0
+        # GitHub numbers weekdays from Sunday = 0
+        github_weekday = (self.start.weekday() + 1) % 7 if self.start else 0
+        days = []
+        for index, (count, color_index) in enumerate(zip(self.counts, self.colors)):
+            days.append({
+                'date': date.fromordinal(start_ordinal + index).isoformat(),
+                'count': count,
+                'weekday': (github_weekday + index) % 7,
+                'level': contribution_level(count),
+                'color': self.palette[color_index]
+            })
+        return days
+
+    def current_streak(self, today: Optional[date] = None) -> int:
+        """Consecutive days with contributions ending at the last stored day up to today"""
+        if not self.counts:
+            return 0
+
+        today = today or date.today()
+        index = min(len(self.counts) - 1, (today - self.start).days)
+        if index < 0 or not self.counts[index]:
+            return 0
+
+        ordinal = self.start.toordinal() + index
+        run = self.runs[bisect_right(self.runs, [ordinal, float('inf')]) - 1]
+        return ordinal - run[0] + 1
+
+    def streaks(self, today: Optional[date] = None) -> Dict[str, Any]:
+        """Current and longest streak plus the ten longest streak ranges"""
+        if not self.counts:
+            return {"current_streak": 0, "longest_streak": 0, "streak_ranges": []}
+
+        longest = sorted(self.runs, key=lambda run: run[1], reverse=True)[:10]
+        return {
+            "current_streak": self.current_streak(today),
+            "longest_streak": longest[0][1] if longest else 0,
+            "streak_ranges": [
+                {
+                    "start": date.fromordinal(run_start).isoformat(),
+                    "end": date.fromordinal(run_start + length - 1).isoformat(),
+                    "length": length
+                }
+                for run_start, length in longest
+            ]
+        }
+
+    def patterns(self) -> Dict[str, Any]:
+        """Weekday averages and totals, monthly trends and active-day counts"""
+        if not self.counts:
+            return {}
+
+        weekday_averages = {}
+        for weekday, name in enumerate(WEEKDAY_NAMES):
+            days = self.weekday_days[weekday]
+            weekday_averages[name] = round(self.weekday_totals[weekday] / days, 2) if days > 0 else 0
+
+        most_active_day = max(weekday_averages.items(), key=lambda x: x[1])
+
+        return {
+            "weekday_averages": weekday_averages,
+            "weekday_totals": dict(zip(WEEKDAY_NAMES, self.weekday_totals)),
+            "most_active_day": {
+                "day": most_active_day[0],
+                "average_contributions": most_active_day[1]
+            },
+            "monthly_trends": dict(self.monthly_totals),
+            "total_active_days": len(self.counts) - self.count_days.get(0, 0),
+            "total_days": len(self.counts)
+        }
+
+    def level_days(self) -> List[int]:
+        """Number of days at each contribution level 0-4"""
+        levels = [0] * 5
+        for count, days in self.count_days.items():
+            levels[contribution_level(count)] += days
+        return levels
+
+    def busiest_day(self) -> Dict[str, Any]:
+        """Earliest day with the highest contribution count"""
+        best = max(self.counts, default=0)
+        if not best:
+            return {"date": None, "count": 0}
+        return {"date": self.day(self.counts.index(best)).isoformat(), "count": best}
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'version': FORMAT_VERSION,
+            'username': self.username,
+            'start': self.start.isoformat() if self.start else None,
+            'counts': self.counts.tolist(),
+            'colors': self.colors.tolist(),
+            'palette': self.palette,
+            'runs': self.runs,
+            'weekday_totals': self.weekday_totals,
+            'weekday_days': self.weekday_days,
+            'monthly_totals': self.monthly_totals,
+            'count_days': [[count, days] for count, days in self.count_days.items()],
+            'total_contributions': self.total_contributions,
+            'summary': self.summary,
+            'synced_at': self.synced_at,
+            'summary_synced_at': self.summary_synced_at
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Optional['ContributionCalendar']:
+        if data.get('version') != FORMAT_VERSION:
+            return None
+
+        record = cls(data['username'], date.fromisoformat(data['start']) if data.get('start') else None)
+        record.counts = array('I', data['counts'])
+        record.colors = array('B', data['colors'])
+        record.palette = list(data['palette'])
+        record.runs = [list(run) for run in data['runs']]
+        record.weekday_totals = list(data['weekday_totals'])
+        record.weekday_days = list(data['weekday_days'])
+        record.monthly_totals = dict(data['monthly_totals'])
+        record.count_days = {count: days for count, days in data['count_days']}
+        record.total_contributions = data['total_contributions']
+        record.summary = data.get('summary') or {}
+        record.synced_at = data.get('synced_at', 0.0)
+        record.summary_synced_at = data.get('summary_synced_at', 0.0)
+        return record
+
+
+class ContributionCalendarStore:
+    """
+    Persisted per-user contribution calendars
+
+    Usage from the GraphQL client:
+        record = await contribution_calendar_store.load(username)
+        ... full fetch when record is None, else merge() the days since record.end ...
+        await contribution_calendar_store.save(record)
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        ttl_seconds: int = 30 * 24 * 3600,
+        max_memory_entries: int = 1024,
+        cache_dir: Optional[str] = None,
+        redis_cache=None
+    ):
+        """
+        Initialize the calendar store
+
+        Args:
+            enabled: Disable to make every load a miss (every request refetches)
+            ttl_seconds: How long idle calendars are kept in Redis/on disk
+            max_memory_entries: Size of the in-process LRU
+            cache_dir: Directory for on-disk records when Redis is unavailable
+            redis_cache: CacheService instance (defaults to the global one)
+        """
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.cache_dir = cache_dir
+        self.redis_cache = redis_cache if redis_cache is not None else cache_service
+        self._memory: "OrderedDict[str, ContributionCalendar]" = OrderedDict()
+        self.stats = {"loads": 0, "misses": 0, "saves": 0, "errors": 0}
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(username: str) -> str:
+        return username.lower()
+
+    async def load(self, username: str) -> Optional[ContributionCalendar]:
+        """
+        Find a user's stored calendar
+
+        Returns:
+            ContributionCalendar, or None if the user was never synced
+        """
+        if not self.enabled:
+            return None
+
+        key = self.make_key(username)
+        record = self._memory.get(key)
+        if record is None:
+            record = await self._load(key)
+            if record is not None:
+                self._remember(key, record)
+        else:
+            self._memory.move_to_end(key)
+
+        self.stats["loads" if record is not None else "misses"] += 1
+        return record
+
+    async def save(self, record: ContributionCalendar) -> None:
+        """Store a user's calendar in memory and the persistent backend"""
+        if not self.enabled:
+            return
+
+        key = self.make_key(record.username)
+        self._remember(key, record)
+        await self._save(key, record)
+        self.stats["saves"] += 1
+
+    def clear_memory(self) -> None:
+        self._memory.clear()
+
+    def _remember(self, key: str, record: ContributionCalendar) -> None:
+        self._memory[key] = record
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _backend_name(self) -> str:
+        if self.redis_cache is not None and self.redis_cache.redis_client is not None:
+            return "redis"
+        if self.cache_dir:
+            return "disk"
+        return "memory"
+
+    async def _load(self, key: str) -> Optional[ContributionCalendar]:
+        backend = self._backend_name()
+        try:
+            if backend == "redis":
+                data = await self.redis_cache.get(key, prefix=CACHE_PREFIX)
+            elif backend == "disk":
+                path = os.path.join(self.cache_dir, f"{key}.json")
+                if not os.path.exists(path):
+                    return None
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            else:
+                return None
+            return ContributionCalendar.from_dict(data) if isinstance(data, dict) else None
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Contribution calendar store read failed: {e}")
+            return None
+
+    async def _save(self, key: str, record: ContributionCalendar) -> None:
+        backend = self._backend_name()
+        try:
+            if backend == "redis":
+                await self.redis_cache.set(key, record.to_dict(), prefix=CACHE_PREFIX, ttl=self.ttl_seconds)
+            elif backend == "disk":
+                path = os.path.join(self.cache_dir, f"{key}.json")
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(record.to_dict(), f)
+                os.replace(tmp_path, path)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Contribution calendar store write failed: {e}")
+
+
+# Global contribution calendar store instance
+contribution_calendar_store = ContributionCalendarStore(
+    enabled=settings.contribution_calendar_store_enabled,
+    cache_dir=settings.contribution_calendar_dir
+)
@@ -8,6 +8,8 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.database import Collections
+from app.models.ranking import RankedGroup, ranked_user_projection
+from app.services.ranking.score_distribution import ScoreDistribution
 
 logger = logging.getLogger(__name__)
 
@@ -54,33 +56,39 @@ class EnhancedRankingService:
                 "total": 1
             }
         
-        total = len(all_scores)
-        
-        # Count scores strictly below user's score
-        scores_below = sum(1 for score in all_scores if score < user_score)
+        return self._accurate_percentiles(ScoreDistribution(all_scores), [user_score])[0]
+    
+    def _accurate_percentiles(self, distribution: ScoreDistribution, user_scores: List[float]) -> List[Dict[str, float]]:
+        """
+        Percentile and rank of several scores against one sorted group
         
-        # Count scores equal to user's score
-        scores_equal = sum(1 for score in all_scores if score == user_score)
+        Args:
+            distribution: Sorted scores of the comparison group
+            user_scores: Scores to place in the group
         
-        # Count scores strictly above user's score
-        scores_above = sum(1 for score in all_scores if score > user_score)
+        Returns:
+            One calculate_accurate_percentile() result per score, in order
+        """
+        total = len(distribution)
+        scores_below, scores_equal, scores_above = distribution.counts(user_scores)
         
         # Percentile: percentage of scores below you (100% = best, 0% = worst)
         # This represents "you scored better than X% of users"
-        percentile = (scores_below / total) * 100
+        percentiles = distribution.percentiles(user_scores)
         
         # Rank: position in descending order (1 = best)
         # All users with same score get same rank
-        rank = scores_above + 1
-        
-        return {
-            "percentile": round(percentile, 1),
-            "rank": rank,
-            "total": total,
-            "scores_above": scores_above,
-            "scores_equal": scores_equal,
-            "scores_below": scores_below
-        }
+        return [
+            {
+                "percentile": percentile,
+                "rank": above + 1,
+                "total": total,
+                "scores_above": above,
+                "scores_equal": equal,
+                "scores_below": below
+            }
+            for percentile, below, equal, above in zip(percentiles, scores_below, scores_equal, scores_above)
+        ]
     
     async def batch_update_regional_rankings(self, district: str) -> Dict[str, Any]:
         """
@@ -98,14 +106,15 @@ class EnhancedRankingService:
             # Fetch all users in district with scores
             # NOTE: Using user_rankings as source. If this should be internal_users, update here.
             # For now, keeping legacy behavior but noting it.
-            users = await self.db.user_rankings.find(
+            group = await RankedGroup.from_cursor(self.db.user_rankings.find(
                 {
                     "district": district,
                     "overall_score": {"$ne": None, "$gt": 0}
-                }
-            ).to_list(None)
+                },
+                ranked_user_projection()
+            ))
             
-            if not users:
+            if not group.users:
                 logger.warning(f"No users found in district: {district}")
                 return {
                     "success": True,
@@ -114,28 +123,26 @@ class EnhancedRankingService:
                     "message": "No users in district"
                 }
             
-            # Extract all scores
-            all_scores = [u["overall_score"] for u in users]
-            total_users = len(users)
+            distribution = ScoreDistribution(group.scores)
+            total_users = len(group)
             
             logger.info(f"Found {total_users} users in district {district}")
             
-            # Calculate statistics
-            avg_score = sum(all_scores) / total_users
-            sorted_scores = sorted(all_scores, reverse=True)
-            median_score = sorted_scores[total_users // 2]
+            # Calculate statistics (median is the middle of the descending order)
+            avg_score = distribution.mean
+            median_score = distribution.lower_median
+            rankings = self._accurate_percentiles(distribution, group.scores)
             
             # Update each user's ranking
             updates_count = 0
             view_only_docs = []
             
-            for user in users:
-                user_score = user["overall_score"]
-                ranking_data = self.calculate_accurate_percentile(user_score, all_scores)
+            for user, ranking_data in zip(group.users, rankings):
+                user_score = user.overall_score
                 
                 # Update user_rankings collection (primary)
                 await self.db.user_rankings.update_one(
-                    {"user_id": user["user_id"]},
+                    {"user_id": user.user_id},
                     {
                         "$set": {
                             "regional_rank": ranking_data["rank"],
@@ -150,12 +157,12 @@ class EnhancedRankingService:
                 
                 # Prepare view-only document
                 view_only_docs.append({
-                    "user_id": user["user_id"],
-                    "github_username": user.get("github_username"),
-                    "name": user.get("name"),
+                    "user_id": user.user_id,
+                    "github_username": user.github_username,
+                    "name": user.name,
                     "district": district,
-                    "state": user.get("state"),
-                    "region": user.get("region"),
+                    "state": user.state,
+                    "region": user.region,
                     "overall_score": user_score,
                     "rank": ranking_data["rank"],
                     "total_users": total_users,
@@ -207,14 +214,15 @@ class EnhancedRankingService:
             logger.info(f"🔄 Batch updating university rankings for: {university_short}")
             
             # Fetch all users in university with scores
-            users = await self.db.user_rankings.find(
+            group = await RankedGroup.from_cursor(self.db.user_rankings.find(
                 {
                     "university_short": university_short,
                     "overall_score": {"$ne": None, "$gt": 0}
-                }
-            ).to_list(None)
+                },
+                ranked_user_projection()
+            ))
             
-            if not users:
+            if not group.users:
                 logger.warning(f"No users found in university: {university_short}")
                 return {
                     "success": True,
@@ -223,28 +231,26 @@ class EnhancedRankingService:
                     "message": "No users in university"
                 }
             
-            # Extract all scores
-            all_scores = [u["overall_score"] for u in users]
-            total_users = len(users)
+            distribution = ScoreDistribution(group.scores)
+            total_users = len(group)
             
             logger.info(f"Found {total_users} users in university {university_short}")
             
-            # Calculate statistics
-            avg_score = sum(all_scores) / total_users
-            sorted_scores = sorted(all_scores, reverse=True)
-            median_score = sorted_scores[total_users // 2]
+            # Calculate statistics (median is the middle of the descending order)
+            avg_score = distribution.mean
+            median_score = distribution.lower_median
+            rankings = self._accurate_percentiles(distribution, group.scores)
             
             # Update each user's ranking
             updates_count = 0
             view_only_docs = []
             
-            for user in users:
-                user_score = user["overall_score"]
-                ranking_data = self.calculate_accurate_percentile(user_score, all_scores)
+            for user, ranking_data in zip(group.users, rankings):
+                user_score = user.overall_score
                 
                 # Update user_rankings collection (primary)
                 await self.db.user_rankings.update_one(
-                    {"user_id": user["user_id"]},
+                    {"user_id": user.user_id},
                     {
                         "$set": {
                             "university_rank": ranking_data["rank"],
@@ -259,10 +265,10 @@ class EnhancedRankingService:
                 
                 # Prepare view-only document
                 view_only_docs.append({
-                    "user_id": user["user_id"],
-                    "github_username": user.get("github_username"),
-                    "name": user.get("name"),
-                    "university": user.get("university"),
+                    "user_id": user.user_id,
+                    "github_username": user.github_username,
+                    "name": user.name,
+                    "university": user.university,
                     "university_short": university_short,
                     "overall_score": user_score,
                     "rank": ranking_data["rank"],
@@ -425,10 +431,13 @@ class EnhancedRankingService:
                 collection = self.db[Collections.UNIVERSITY_RANKINGS]
                 filter_field = "university_short"
             
-            # Get all rankings
-            rankings = await collection.find({filter_field: identifier}).to_list(None)
+            # Only the scores are needed
+            scores = [
+                r["overall_score"]
+                async for r in collection.find({filter_field: identifier}, {"overall_score": 1, "_id": 0})
+            ]
             
-            if not rankings:
+            if not scores:
                 return {
                     "total_users": 0,
                     "avg_score": 0,
@@ -437,16 +446,14 @@ class EnhancedRankingService:
                     "max_score": 0
                 }
             
-            scores = [r["overall_score"] for r in rankings]
-            scores.sort()
+            distribution = ScoreDistribution(sorted(scores))
+            q1_score, _, q3_score = distribution.quartiles()
             
             return {
-                "total_users": len(scores),
-                "avg_score": round(sum(scores) / len(scores), 1),
-                "median_score": round(scores[len(scores) // 2], 1),
-                "min_score": round(min(scores), 1),
-                "max_score": round(max(scores), 1),
-                "score_distribution": self._calculate_distribution(scores)
+                **distribution.summary(),
+                "q1_score": round(q1_score, 1),
+                "q3_score": round(q3_score, 1),
+                "score_distribution": distribution.bucket_counts()
             }
             
         except Exception as e:
@@ -455,24 +462,4 @@ class EnhancedRankingService:
     
     def _calculate_distribution(self, scores: List[float]) -> Dict[str, int]:
         """Calculate score distribution in ranges"""
-        distribution = {
-            "0-20": 0,
-            "20-40": 0,
-            "40-60": 0,
-            "60-80": 0,
-            "80-100": 0
-        }
-        
-        for score in scores:
-            if score < 20:
-                distribution["0-20"] += 1
-            elif score < 40:
-                distribution["20-40"] += 1
-            elif score < 60:
-                distribution["40-60"] += 1
-            elif score < 80:
-                distribution["60-80"] += 1
-            else:
-                distribution["80-100"] += 1
-        
-        return distribution
+        return ScoreDistribution(scores).bucket_counts()
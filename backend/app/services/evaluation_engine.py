@@ -2,7 +2,8 @@ import re
 import ast
 import json
 import hashlib
-from typing import Dict, List, Any, Optional, Tuple
+import sys
+from typing import AsyncIterable, AsyncIterator, Dict, Iterator, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import math
 import logging
@@ -11,9 +12,129 @@ import statistics
 import subprocess
 import tempfile
 import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache, partial
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
+
+from app.services.code_analysis import GRAMMARS, SourceMetrics, analyze_source
 
 logger = logging.getLogger(__name__)
 
+# Per-evaluation memo of single-pass source metrics, so every stage of
+# evaluate_repository reads the same analysis of a file. A context variable
+# rather than engine state: concurrent evaluations on one engine (asyncio
+# tasks) each get their own memo.
+_metrics_memo: ContextVar[Optional[Dict[Tuple[str, str], SourceMetrics]]] = ContextVar(
+    "evaluation_metrics_memo", default=None
+)
+
+
+@lru_cache(maxsize=None)
+def _compiled(pattern: str, flags: int = 0) -> "re.Pattern":
+    """
+    Compile a pattern-table regex on first use.
+
+    The language, framework and security tables hold plain strings, so
+    nothing is compiled at import or when an engine is created; each pattern
+    is compiled once per process the first time an analysis needs it, rather
+    than competing for slots in re's small internal cache.
+
+    Args:
+        pattern: Regular expression source
+        flags: re flags
+
+    Returns:
+        The compiled pattern
+    """
+    return re.compile(pattern, flags)
+
+
+# Files larger than this are analyzed from a head and tail sample (minified
+# bundles and generated code would otherwise dominate memory and time)
+MAX_ANALYZED_FILE_BYTES = 512 * 1024
+
+# CI configuration files by platform
+CI_INDICATORS = {
+    "GitHub Actions": [".github/workflows/", "workflow.yml", "action.yml"],
+    "GitLab CI": [".gitlab-ci.yml"],
+    "Travis CI": [".travis.yml"],
+    "CircleCI": [".circleci/config.yml"],
+    "Jenkins": ["Jenkinsfile"]
+}
+
+# Documentation file patterns
+DOC_FILE_PATTERNS = {
+    "readme": r"readme\.(md|txt|rst)$",
+    "changelog": r"(changelog|changes|history)\.(md|txt|rst)$",
+    "license": r"(license|licence|copying)(\.(md|txt|rst))?$",
+    "contributing": r"contributing\.(md|txt|rst)$",
+    "api_docs": r"(api|docs?)\.(md|txt|rst)$",
+    "installation": r"(install|setup)\.(md|txt|rst)$"
+}
+
+# Test commands that show a CI configuration runs the test suite
+CI_TEST_COMMANDS = r'npm test|pytest|mvn test|go test|cargo test'
+
+# Hardcoded credentials checked by the security practices assessment
+SECRET_ASSIGNMENT_PATTERNS = [r'password\s*=\s*["\'][^"\']+["\']', r'api_key\s*=\s*["\'][^"\']+["\']']
+
+
+def _sample_content(content: str, max_chars: int) -> Tuple[str, bool]:
+    """
+    Bound the text analyzed for one file.
+
+    Oversized content keeps its first and last max_chars / 2 characters,
+    trimmed to whole lines, so imports, headers and trailing definitions are
+    still seen.
+
+    Args:
+        content: File content
+        max_chars: Largest content analyzed as-is
+
+    Returns:
+        Tuple of (content to analyze, whether it was sampled)
+    """
+    if len(content) <= max_chars:
+        return content, False
+
+    half = max_chars // 2
+    head = content[:half]
+    cut = head.rfind('\n')
+    if cut > 0:
+        head = head[:cut]
+
+    tail = content[-half:]
+    cut = tail.find('\n')
+    if 0 <= cut < len(tail) - 1:
+        tail = tail[cut + 1:]
+
+    return head + '\n' + tail, True
+
+
+def _process_max_rss_bytes() -> Optional[int]:
+    """
+    Largest resident set size this process has reached, in bytes (None if unavailable)
+
+    This is the process-lifetime high-water mark: it never goes down, so in a
+    long-running worker it reflects the largest job so far, not one evaluation.
+    """
+    if not RESOURCE_AVAILABLE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+async def _iterate(items: List[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+    for item in items:
+        yield item
+
 
 class PenaltySystem:
     """
@@ -266,120 +387,31 @@ class PenaltySystem:
 
 
 class EvaluationEngine:
-    def __init__(self):
+    def __init__(self, max_file_bytes: int = MAX_ANALYZED_FILE_BYTES):
+        # Larger files are analyzed from a head and tail sample
+        self.max_file_bytes = max_file_bytes
+        
+        # Python gets the AST analyzer; every other language shares the
+        # grammar-driven one (see app.services.code_analysis.grammars)
         self.language_analyzers = {
-            'Python': self._analyze_python_code,
-            'JavaScript': self._analyze_javascript_code,
-            'TypeScript': self._analyze_typescript_code,
-            'Java': self._analyze_java_code,
-            'Go': self._analyze_go_code,
-            'C++': self._analyze_cpp_code,
-            'C#': self._analyze_csharp_code,
-            'Ruby': self._analyze_ruby_code,
-            'PHP': self._analyze_php_code,
-            'Swift': self._analyze_swift_code,
-            'Kotlin': self._analyze_kotlin_code,
-            'Rust': self._analyze_rust_code,
+            language: partial(self._analyze_source_code, language=language) for language in GRAMMARS
         }
+        self.language_analyzers['Python'] = self._analyze_python_code
         
         # Enhanced language support for 12 programming languages
         self.supported_languages = {
-            'Python': {
-                'extensions': ['.py', '.pyw', '.pyi'],
-                'ast_parser': True,
-                'complexity_patterns': [r'\bif\b', r'\belif\b', r'\bwhile\b', r'\bfor\b', r'\btry\b', r'\bexcept\b', r'\band\b', r'\bor\b'],
-                'function_patterns': [r'def\s+\w+\s*\('],
-                'class_patterns': [r'class\s+\w+'],
-                'comment_patterns': [r'#.*', r'""".*?"""', r"'''.*?'''"]
-            },
-            'JavaScript': {
-                'extensions': ['.js', '.jsx', '.mjs'],
-                'ast_parser': False,
-                'complexity_patterns': [r'\bif\b', r'\belse\s+if\b', r'\bwhile\b', r'\bfor\b', r'\btry\b', r'\bcatch\b', r'&&', r'\|\|', r'\?'],
-                'function_patterns': [r'function\s+\w+\s*\(', r'\w+\s*:\s*function\s*\(', r'const\s+\w+\s*=\s*\([^)]*\)\s*=>', r'let\s+\w+\s*=\s*\([^)]*\)\s*=>'],
-                'class_patterns': [r'class\s+\w+'],
-                'comment_patterns': [r'//.*', r'/\*.*?\*/']
-            },
-            'TypeScript': {
-                'extensions': ['.ts', '.tsx'],
-                'ast_parser': False,
-                'complexity_patterns': [r'\bif\b', r'\belse\s+if\b', r'\bwhile\b', r'\bfor\b', r'\btry\b', r'\bcatch\b', r'&&', r'\|\|', r'\?'],
-                'function_patterns': [r'function\s+\w+\s*\(', r'\w+\s*:\s*function\s*\(', r'const\s+\w+\s*=\s*\([^)]*\)\s*=>', r'let\s+\w+\s*=\s*\([^)]*\)\s*=>'],
-                'class_patterns': [r'class\s+\w+', r'interface\s+\w+'],
-                'comment_patterns': [r'//.*', r'/\*.*?\*/']
-            },
-            'Java': {
-                'extensions': ['.java'],
-                'ast_parser': False,
-                'complexity_patterns': [r'\bif\b', r'\belse\s+if\b', r'\bwhile\b', r'\bfor\b', r'\btry\b', r'\bcatch\b', r'&&', r'\|\|', r'\?', r'\bcase\b'],
-                'function_patterns': [r'(public|private|protected)\s+\w+\s+\w+\s*\([^)]*\)\s*{'],
-                'class_patterns': [r'(public\s+)?class\s+\w+', r'interface\s+\w+'],
-                'comment_patterns': [r'//.*', r'/\*.*?\*/']
-            },
-            'Go': {
-                'extensions': ['.go'],
-                'ast_parser': False,
-                'complexity_patterns': [r'\bif\b', r'\bfor\b', r'\bswitch\b', r'\bcase\b', r'&&', r'\|\|'],
-                'function_patterns': [r'func\s+\w+\s*\([^)]*\)'],
-                'class_patterns': [r'type\s+\w+\s+struct', r'type\s+\w+\s+interface'],
-                'comment_patterns': [r'//.*', r'/\*.*?\*/']
-            },
-            'C++': {
-                'extensions': ['.cpp', '.cc', '.cxx', '.c++', '.h', '.hpp'],
-                'ast_parser': False,
-                'complexity_patterns': [r'\bif\b', r'\belse\s+if\b', r'\bwhile\b', r'\bfor\b', r'\btry\b', r'\bcatch\b', r'&&', r'\|\|', r'\?'],
-                'function_patterns': [r'\w+\s+\w+\s*\([^)]*\)\s*{'],
-                'class_patterns': [r'class\s+\w+', r'struct\s+\w+'],
-                'comment_patterns': [r'//.*', r'/\*.*?\*/']
-            },
-            'C#': {
-                'extensions': ['.cs'],
-                'ast_parser': False,
-                'complexity_patterns': [r'\bif\b', r'\belse\s+if\b', r'\bwhile\b', r'\bfor\b', r'\btry\b', r'\bcatch\b', r'&&', r'\|\|', r'\?'],
-                'function_patterns': [r'(public|private|protected)\s+\w+\s+\w+\s*\([^)]*\)'],
-                'class_patterns': [r'(public\s+)?class\s+\w+', r'interface\s+\w+'],
-                'comment_patterns': [r'//.*', r'/\*.*?\*/']
-            },
-            'Ruby': {
-                'extensions': ['.rb'],
-                'ast_parser': False,
-                'complexity_patterns': [r'\bif\b', r'\bwhile\b', r'\bfor\b', r'\bcase\b', r'\bwhen\b', r'&&', r'\|\|'],
-                'function_patterns': [r'def\s+\w+'],
-                'class_patterns': [r'class\s+\w+', r'module\s+\w+'],
-                'comment_patterns': [r'#.*']
-            },
-            'PHP': {
-                'extensions': ['.php'],
-                'ast_parser': False,
-                'complexity_patterns': [r'\bif\b', r'\belse\s+if\b', r'\bwhile\b', r'\bfor\b', r'\btry\b', r'\bcatch\b', r'&&', r'\|\|', r'\?'],
-                'function_patterns': [r'function\s+\w+\s*\('],
-                'class_patterns': [r'class\s+\w+'],
-                'comment_patterns': [r'//.*', r'#.*', r'/\*.*?\*/']
-            },
-            'Swift': {
-                'extensions': ['.swift'],
-                'ast_parser': False,
-                'complexity_patterns': [r'\bif\b', r'\bwhile\b', r'\bfor\b', r'\bswitch\b', r'\bcase\b', r'&&', r'\|\|'],
-                'function_patterns': [r'func\s+\w+\s*\('],
-                'class_patterns': [r'class\s+\w+', r'struct\s+\w+'],
-                'comment_patterns': [r'//.*', r'/\*.*?\*/']
-            },
-            'Kotlin': {
-                'extensions': ['.kt', '.kts'],
-                'ast_parser': False,
-                'complexity_patterns': [r'\bif\b', r'\belse\s+if\b', r'\bwhile\b', r'\bfor\b', r'\btry\b', r'\bcatch\b', r'&&', r'\|\|', r'\?'],
-                'function_patterns': [r'fun\s+\w+\s*\('],
-                'class_patterns': [r'class\s+\w+', r'interface\s+\w+'],
-                'comment_patterns': [r'//.*', r'/\*.*?\*/']
-            },
-            'Rust': {
-                'extensions': ['.rs'],
-                'ast_parser': False,
-                'complexity_patterns': [r'\bif\b', r'\bwhile\b', r'\bfor\b', r'\bmatch\b', r'&&', r'\|\|'],
-                'function_patterns': [r'fn\s+\w+\s*\('],
-                'class_patterns': [r'struct\s+\w+', r'enum\s+\w+', r'trait\s+\w+'],
-                'comment_patterns': [r'//.*', r'/\*.*?\*/']
-            }
+            'Python': {'extensions': ['.py', '.pyw', '.pyi'], 'ast_parser': True},
+            'JavaScript': {'extensions': ['.js', '.jsx', '.mjs'], 'ast_parser': False},
+            'TypeScript': {'extensions': ['.ts', '.tsx'], 'ast_parser': False},
+            'Java': {'extensions': ['.java'], 'ast_parser': False},
+            'Go': {'extensions': ['.go'], 'ast_parser': False},
+            'C++': {'extensions': ['.cpp', '.cc', '.cxx', '.c++', '.h', '.hpp'], 'ast_parser': False},
+            'C#': {'extensions': ['.cs'], 'ast_parser': False},
+            'Ruby': {'extensions': ['.rb'], 'ast_parser': False},
+            'PHP': {'extensions': ['.php'], 'ast_parser': False},
+            'Swift': {'extensions': ['.swift'], 'ast_parser': False},
+            'Kotlin': {'extensions': ['.kt', '.kts'], 'ast_parser': False},
+            'Rust': {'extensions': ['.rs'], 'ast_parser': False}
         }
         
         # Framework detection patterns
@@ -682,47 +714,87 @@ class EvaluationEngine:
             structure_analysis: Repository structure analysis
         """
         
+        return await self.evaluate_repository_stream(
+            repo_data, _iterate(contents), commit_history, structure_analysis
+        )
+    
+    async def evaluate_repository_stream(self, repo_data: Dict[str, Any], files: AsyncIterable[Dict[str, Any]],
+                                         commit_history: Dict[str, Any], structure_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Evaluate a repository whose files arrive one at a time
+        
+        Each file is reduced to a content-free digest as soon as it arrives,
+        so at most one file's content is held by the evaluation at a time.
+        The result carries a "memory_profile" describing what was held.
+        
+        Args:
+            repo_data: Basic repository metadata
+            files: Async iterable of file dicts (name, path, language, content)
+            commit_history: Commit history and statistics
+            structure_analysis: Repository structure analysis
+            
+        Returns:
+            The same evaluation result as evaluate_repository
+        """
+        
         logger.info(f"Starting comprehensive evaluation for repository: {repo_data.get('name', 'unknown')}")
         
+        memory_profile = {
+            "files": 0,
+            "sampled_files": 0,
+            "analyzed_bytes": 0,
+            "peak_file_bytes": 0,
+            "max_file_bytes": self.max_file_bytes,
+            "process_max_rss_bytes": None
+        }
+        
+        digests = []
+        async for file_info in files:
+            digest = self._digest_file(file_info)
+            # Drop the file before the next one is requested
+            del file_info
+            digests.append(digest)
+            
+            memory_profile["files"] += 1
+            memory_profile["analyzed_bytes"] += digest["size"]
+            memory_profile["peak_file_bytes"] = max(memory_profile["peak_file_bytes"], digest["size"])
+            if digest["sampled"]:
+                memory_profile["sampled_files"] += 1
+        
         # Enhanced file structure analysis
-        file_structure_analysis = await self._analyze_file_structure(contents, repo_data)
+        file_structure_analysis = await self._analyze_file_structure(digests, repo_data)
         
         # Analyze repository structure and metadata
         repo_stats = self._analyze_repository_metadata(repo_data, structure_analysis)
         
         # Enhanced code content analysis with framework detection
-        code_analysis = await self._analyze_code_content_enhanced(contents)
+        code_analysis = await self._analyze_code_content_enhanced(digests)
         
         # Programming language and framework identification
-        language_framework_analysis = await self._analyze_languages_and_frameworks(contents, repo_data)
+        language_framework_analysis = await self._analyze_languages_and_frameworks(digests, repo_data)
         
         # Code complexity analysis with maintainability scoring
-        complexity_analysis = await self._analyze_code_complexity_comprehensive(contents)
+        complexity_analysis = await self._analyze_code_complexity_comprehensive(digests)
         
         # Documentation coverage assessment
-        documentation_analysis = await self._analyze_documentation_coverage(contents, repo_data)
+        documentation_analysis = await self._analyze_documentation_coverage(digests, repo_data)
         
         # Analyze commit patterns and development practices
         commit_analysis = self._analyze_commit_patterns(commit_history)
         
         # Security vulnerability analysis
-        security_analysis = self._analyze_security_vulnerabilities(contents)
+        security_analysis = self._analyze_security_vulnerabilities(digests)
         
         # Best practices assessment
-        best_practices_analysis = await self._analyze_best_practices(contents, repo_data, commit_history)
+        best_practices_analysis = await self._analyze_best_practices(digests, repo_data, commit_history)
         
         # Perform comprehensive code complexity analysis
         comprehensive_complexity_analysis = {}
-        for file_info in contents:
-            if file_info.get("content") and file_info.get("language"):
-                file_complexity = self._analyze_code_complexity_strict(
-                    file_info["content"], 
-                    file_info["language"], 
-                    file_info.get("path", "")
-                )
-                if file_info["language"] not in comprehensive_complexity_analysis:
-                    comprehensive_complexity_analysis[file_info["language"]] = []
-                comprehensive_complexity_analysis[file_info["language"]].append(file_complexity)
+        for digest in digests:
+            if "strict_complexity" in digest:
+                if digest["language"] not in comprehensive_complexity_analysis:
+                    comprehensive_complexity_analysis[digest["language"]] = []
+                comprehensive_complexity_analysis[digest["language"]].append(digest["strict_complexity"])
         
         # Aggregate complexity metrics across all files
         aggregated_complexity = self._aggregate_complexity_metrics(comprehensive_complexity_analysis)
@@ -751,6 +823,9 @@ class EvaluationEngine:
         # Calculate overall repository score
         overall_score = self._calculate_overall_score(acid_scores, quality_metrics, complexity_metrics)
         
+        # Process-wide maximum, not this evaluation's peak (see _process_max_rss_bytes)
+        memory_profile["process_max_rss_bytes"] = _process_max_rss_bytes()
+        
         evaluation_result = {
             "repository_id": repo_data.get("id"),
             "repository_name": repo_data.get("name"),
@@ -774,9 +849,10 @@ class EvaluationEngine:
                 "supported_languages": list(self.supported_languages.keys()),
                 "complexity_thresholds": self.complexity_thresholds,
                 "acid_criteria_weights": self.acid_criteria,
-                "total_files_analyzed": len(contents),
+                "total_files_analyzed": len(digests),
                 "languages_detected": list(comprehensive_complexity_analysis.keys())
             },
+            "memory_profile": memory_profile,
             "evaluation_timestamp": datetime.utcnow().isoformat(),
             "evaluation_version": "4.0"
         }
@@ -785,11 +861,112 @@ class EvaluationEngine:
         
         return evaluation_result
     
-    async def _analyze_code_content(self, contents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _digest_file(self, file_info: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Reduce one file to the per-file results every evaluation stage needs
+        
+        The digest keeps the file's name, path and language (with the same
+        keys present as in file_info) but not its content. Content longer
+        than max_file_bytes characters is analyzed from a head and tail sample.
+        
+        Args:
+            file_info: File dict with name, path, language and content
+            
+        Returns:
+            Content-free digest of the file
+        """
+        digest = {key: file_info[key] for key in ("name", "path", "language") if key in file_info}
+        content = file_info.get("content") or ""
+        digest["size"] = len(content)
+        content, digest["sampled"] = _sample_content(content, self.max_file_bytes)
+        
+        file_name = file_info.get("name", "")
+        language = file_info.get("language", "Unknown")
+        
+        with self._memoized_source_metrics():
+            # Documentation stages look at every file, with or without content
+            digest["metrics"] = self._source_metrics(content, language)
+            digest["has_docstrings"] = self._has_adequate_docstrings(content, file_info.get("language", ""))
+            for doc_type, pattern in DOC_FILE_PATTERNS.items():
+                if re.match(pattern, file_name.lower(), re.IGNORECASE):
+                    digest["doc_type"] = doc_type
+                    digest["doc_quality"] = self._assess_doc_quality(content, doc_type)
+                    break
+            
+            if not content:
+                return digest
+            
+            lowered = content.lower()
+            digest["non_blank_lines"] = digest["metrics"].non_blank_lines
+            digest["complexity_indicator"] = self._analyze_code_complexity(content, language)
+            digest["frameworks"] = self._detect_frameworks_comprehensive(content, language, file_name)
+            digest["design_patterns"] = self._detect_design_patterns(content, language)
+            digest["code_smells"] = self._detect_code_smells(content, language)
+            digest["security_findings"] = self._find_security_issues(content)
+            digest["has_hardcoded_secrets"] = any(
+                re.search(pattern, content, re.IGNORECASE) for pattern in SECRET_ASSIGNMENT_PATTERNS
+            )
+            digest["mentions_git"] = "git" in lowered
+            digest["mentions_typescript"] = "typescript" in lowered
+            digest["runs_ci_tests"] = bool(re.search(CI_TEST_COMMANDS, content, re.IGNORECASE))
+            
+            if language != "Unknown":
+                digest["language_features"] = self._analyze_language_features(content, language)
+            
+            if not self._is_non_code_file(file_name):
+                digest["file_complexity"] = {
+                    "cyclomatic_complexity": self._calculate_cyclomatic_complexity(content, language),
+                    "cognitive_complexity": self._calculate_cognitive_complexity(content, language),
+                    "halstead_metrics": self._calculate_halstead_metrics(content, language),
+                    "maintainability_score": self._calculate_file_maintainability(content, language)
+                }
+            
+            if file_info.get("language"):
+                digest["strict_complexity"] = self._analyze_code_complexity_strict(
+                    content, file_info["language"], file_info.get("path", "")
+                )
+        
+        return digest
+    
+    @contextmanager
+    def _memoized_source_metrics(self) -> Iterator[None]:
+        """Share one analysis per file across every stage run inside the block"""
+        if _metrics_memo.get() is not None:
+            yield
+            return
+        
+        token = _metrics_memo.set({})
+        try:
+            yield
+        finally:
+            _metrics_memo.reset(token)
+    
+    def _source_metrics(self, content: str, language: str) -> SourceMetrics:
+        """
+        Single-pass source metrics for a file, memoized for the running evaluation
+        
+        Args:
+            content: File content
+            language: Language name
+            
+        Returns:
+            SourceMetrics from the grammar-driven analyzer
+        """
+        memo = _metrics_memo.get()
+        if memo is None:
+            return analyze_source(content, language)
+        
+        key = (language, content)
+        metrics = memo.get(key)
+        if metrics is None:
+            metrics = memo[key] = analyze_source(content, language)
+        return metrics
+    
+    async def _analyze_code_content(self, digests: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Comprehensive code content analysis"""
         
         analysis = {
-            "total_files": len(contents),
+            "total_files": len(digests),
             "total_lines": 0,
             "code_lines": 0,
             "comment_lines": 0,
@@ -805,39 +982,36 @@ class EvaluationEngine:
             "config_file_count": 0
         }
         
-        for file_info in contents:
-            if not file_info.get("content"):
+        for digest in digests:
+            if not digest["size"]:
                 continue
                 
-            content = file_info["content"]
-            file_name = file_info.get("name", "")
-            file_path = file_info.get("path", "")
-            language = file_info.get("language", "Unknown")
+            metrics = digest["metrics"]
+            file_name = digest.get("name", "")
+            file_path = digest.get("path", "")
+            language = digest.get("language", "Unknown")
             
             # Count lines
-            lines = content.split('\n')
-            analysis["total_lines"] += len(lines)
+            analysis["total_lines"] += metrics.total_lines
             
             # Analyze line types
-            code_lines, comment_lines, blank_lines = self._analyze_line_types(content, language)
-            analysis["code_lines"] += code_lines
-            analysis["comment_lines"] += comment_lines
-            analysis["blank_lines"] += blank_lines
+            analysis["code_lines"] += metrics.code_lines
+            analysis["comment_lines"] += metrics.comment_lines
+            analysis["blank_lines"] += metrics.blank_lines
             
             # Language breakdown
-            analysis["language_breakdown"][language] += len(lines)
+            analysis["language_breakdown"][language] += metrics.total_lines
             
             # File type analysis
             file_type = self._get_file_type(file_name)
             analysis["file_type_breakdown"][file_type] += 1
             
             # Count functions and classes
-            functions, classes = self._count_code_structures(content, language)
-            analysis["function_count"] += functions
-            analysis["class_count"] += classes
+            analysis["function_count"] += len(metrics.functions)
+            analysis["class_count"] += len(metrics.classes)
             
             # Complexity analysis
-            complexity = self._analyze_code_complexity(content, language)
+            complexity = digest["complexity_indicator"]
             if language not in analysis["complexity_indicators"]:
                 analysis["complexity_indicators"][language] = []
             analysis["complexity_indicators"][language].append(complexity)
@@ -873,7 +1047,7 @@ class EvaluationEngine:
         
         return analysis
     
-    async def _analyze_file_structure(self, contents: List[Dict[str, Any]], repo_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def _analyze_file_structure(self, digests: List[Dict[str, Any]], repo_data: Dict[str, Any]) -> Dict[str, Any]:
         """Comprehensive file structure analysis"""
         
         structure_analysis = {
@@ -892,9 +1066,8 @@ class EvaluationEngine:
         file_paths = []
         max_depth = 0
         
-        for file_info in contents:
-            file_path = file_info.get("path", "")
-            file_name = file_info.get("name", "")
+        for digest in digests:
+            file_path = digest.get("path", "")
             
             if not file_path:
                 continue
@@ -929,11 +1102,11 @@ class EvaluationEngine:
         
         return structure_analysis
     
-    async def _analyze_code_content_enhanced(self, contents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def _analyze_code_content_enhanced(self, digests: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Enhanced code content analysis with framework detection"""
         
         # Start with base analysis
-        analysis = await self._analyze_code_content(contents)
+        analysis = await self._analyze_code_content(digests)
         
         # Add enhanced metrics
         analysis["framework_usage"] = {}
@@ -942,17 +1115,12 @@ class EvaluationEngine:
         analysis["maintainability_index"] = 0
         analysis["technical_debt_indicators"] = {}
         
-        for file_info in contents:
-            content = file_info.get("content", "")
-            language = file_info.get("language", "Unknown")
-            file_name = file_info.get("name", "")
-            
-            if not content:
+        for digest in digests:
+            if not digest["size"]:
                 continue
             
             # Detect frameworks and libraries
-            frameworks = self._detect_frameworks_comprehensive(content, language, file_name)
-            for framework, confidence in frameworks.items():
+            for framework, confidence in digest["frameworks"].items():
                 if framework not in analysis["framework_usage"]:
                     analysis["framework_usage"][framework] = {"files": 0, "confidence": 0}
                 analysis["framework_usage"][framework]["files"] += 1
@@ -961,15 +1129,13 @@ class EvaluationEngine:
                 )
             
             # Detect design patterns
-            patterns = self._detect_design_patterns(content, language)
-            for pattern in patterns:
+            for pattern in digest["design_patterns"]:
                 if pattern not in analysis["design_patterns"]:
                     analysis["design_patterns"][pattern] = 0
                 analysis["design_patterns"][pattern] += 1
             
             # Detect code smells
-            smells = self._detect_code_smells(content, language)
-            for smell, count in smells.items():
+            for smell, count in digest["code_smells"].items():
                 if smell not in analysis["code_smells"]:
                     analysis["code_smells"][smell] = 0
                 analysis["code_smells"][smell] += count
@@ -982,7 +1148,7 @@ class EvaluationEngine:
         
         return analysis
     
-    async def _analyze_languages_and_frameworks(self, contents: List[Dict[str, Any]], repo_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def _analyze_languages_and_frameworks(self, digests: List[Dict[str, Any]], repo_data: Dict[str, Any]) -> Dict[str, Any]:
         """Comprehensive programming language and framework identification"""
         
         analysis = {
@@ -998,25 +1164,20 @@ class EvaluationEngine:
         language_stats = defaultdict(lambda: {"lines": 0, "files": 0, "complexity": 0})
         framework_confidence = defaultdict(float)
         
-        for file_info in contents:
-            content = file_info.get("content", "")
-            language = file_info.get("language", "Unknown")
-            file_name = file_info.get("name", "")
+        for digest in digests:
+            language = digest.get("language", "Unknown")
             
-            if not content or language == "Unknown":
+            if not digest["size"] or language == "Unknown":
                 continue
             
-            lines = len([line for line in content.split('\n') if line.strip()])
-            language_stats[language]["lines"] += lines
+            language_stats[language]["lines"] += digest["non_blank_lines"]
             language_stats[language]["files"] += 1
             
             # Analyze language-specific features
-            features = self._analyze_language_features(content, language)
-            language_stats[language]["complexity"] += features.get("complexity", 0)
+            language_stats[language]["complexity"] += digest["language_features"].get("complexity", 0)
             
             # Detect frameworks with confidence scoring
-            frameworks = self._detect_frameworks_comprehensive(content, language, file_name)
-            for framework, confidence in frameworks.items():
+            for framework, confidence in digest["frameworks"].items():
                 framework_confidence[framework] = max(framework_confidence[framework], confidence)
         
         # Categorize languages by usage
@@ -1055,11 +1216,11 @@ class EvaluationEngine:
         analysis["proficiency_indicators"] = self._assess_language_proficiency(language_stats)
         
         # Detect modern practices
-        analysis["modern_practices"] = self._detect_modern_practices(contents)
+        analysis["modern_practices"] = self._detect_modern_practices(digests)
         
         return analysis
     
-    async def _analyze_code_complexity_comprehensive(self, contents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def _analyze_code_complexity_comprehensive(self, digests: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Comprehensive code complexity analysis with maintainability scoring"""
         
         analysis = {
@@ -1074,30 +1235,21 @@ class EvaluationEngine:
         
         file_complexities = []
         
-        for file_info in contents:
-            content = file_info.get("content", "")
-            language = file_info.get("language", "Unknown")
-            file_name = file_info.get("name", "")
-            file_path = file_info.get("path", "")
-            
-            if not content or self._is_non_code_file(file_name):
+        for digest in digests:
+            if "file_complexity" not in digest:
                 continue
             
-            # Calculate various complexity metrics
-            cyclomatic = self._calculate_cyclomatic_complexity(content, language)
-            cognitive = self._calculate_cognitive_complexity(content, language)
-            halstead = self._calculate_halstead_metrics(content, language)
-            maintainability = self._calculate_file_maintainability(content, language)
+            file_name = digest.get("name", "")
+            cyclomatic = digest["file_complexity"]["cyclomatic_complexity"]
+            cognitive = digest["file_complexity"]["cognitive_complexity"]
+            maintainability = digest["file_complexity"]["maintainability_score"]
             
             file_complexity = {
                 "file": file_name,
-                "path": file_path,
-                "language": language,
-                "cyclomatic_complexity": cyclomatic,
-                "cognitive_complexity": cognitive,
-                "halstead_metrics": halstead,
-                "maintainability_score": maintainability,
-                "lines_of_code": len([line for line in content.split('\n') if line.strip()])
+                "path": digest.get("path", ""),
+                "language": digest.get("language", "Unknown"),
+                **digest["file_complexity"],
+                "lines_of_code": digest["non_blank_lines"]
             }
             
             file_complexities.append(file_complexity)
@@ -1140,7 +1292,7 @@ class EvaluationEngine:
         
         return analysis
     
-    async def _analyze_documentation_coverage(self, contents: List[Dict[str, Any]], repo_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def _analyze_documentation_coverage(self, digests: List[Dict[str, Any]], repo_data: Dict[str, Any]) -> Dict[str, Any]:
         """Comprehensive documentation coverage assessment"""
         
         analysis = {
@@ -1159,45 +1311,28 @@ class EvaluationEngine:
         inline_doc_lines = 0
         total_code_lines = 0
         
-        # Documentation file patterns
-        doc_patterns = {
-            "readme": r"readme\.(md|txt|rst)$",
-            "changelog": r"(changelog|changes|history)\.(md|txt|rst)$",
-            "license": r"(license|licence|copying)(\.(md|txt|rst))?$",
-            "contributing": r"contributing\.(md|txt|rst)$",
-            "api_docs": r"(api|docs?)\.(md|txt|rst)$",
-            "installation": r"(install|setup)\.(md|txt|rst)$"
-        }
-        
-        for file_info in contents:
-            content = file_info.get("content", "")
-            file_name = file_info.get("name", "").lower()
-            language = file_info.get("language", "Unknown")
+        for digest in digests:
+            file_name = digest.get("name", "").lower()
+            language = digest.get("language", "Unknown")
             
             # Check for documentation files
-            for doc_type, pattern in doc_patterns.items():
-                if re.match(pattern, file_name, re.IGNORECASE):
-                    doc_files.append({
-                        "type": doc_type,
-                        "file": file_info.get("name", ""),
-                        "size": len(content),
-                        "quality_score": self._assess_doc_quality(content, doc_type)
-                    })
-                    break
+            if "doc_type" in digest:
+                doc_files.append({
+                    "type": digest["doc_type"],
+                    "file": digest.get("name", ""),
+                    "size": digest["size"],
+                    "quality_score": digest["doc_quality"]
+                })
             
             # Analyze inline documentation in code files
             if self._is_code_file(file_name, language):
                 total_code_files += 1
-                lines = content.split('\n')
-                code_lines = len([line for line in lines if line.strip() and not self._is_comment_line(line.strip(), language)])
-                comment_lines = len([line for line in lines if line.strip() and self._is_comment_line(line.strip(), language)])
                 
-                total_code_lines += code_lines
-                inline_doc_lines += comment_lines
+                total_code_lines += digest["metrics"].code_lines
+                inline_doc_lines += digest["metrics"].comment_lines
                 
                 # Check for function/class documentation
-                has_docstrings = self._has_adequate_docstrings(content, language)
-                if has_docstrings:
+                if digest["has_docstrings"]:
                     code_files_with_docs += 1
         
         analysis["documentation_files"] = doc_files
@@ -1230,7 +1365,7 @@ class EvaluationEngine:
         
         return analysis
     
-    async def _analyze_best_practices(self, contents: List[Dict[str, Any]], repo_data: Dict[str, Any], commit_history: Dict[str, Any]) -> Dict[str, Any]:
+    async def _analyze_best_practices(self, digests: List[Dict[str, Any]], repo_data: Dict[str, Any], commit_history: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze adherence to software development best practices"""
         
         analysis = {
@@ -1245,22 +1380,22 @@ class EvaluationEngine:
         }
         
         # Analyze project structure best practices
-        analysis["project_structure"] = self._analyze_project_structure_practices(contents)
+        analysis["project_structure"] = self._analyze_project_structure_practices(digests)
         
         # Analyze code organization practices
-        analysis["code_organization"] = self._analyze_code_organization_practices(contents)
+        analysis["code_organization"] = self._analyze_code_organization_practices(digests)
         
         # Analyze testing practices
-        analysis["testing_practices"] = self._analyze_testing_practices(contents)
+        analysis["testing_practices"] = self._analyze_testing_practices(digests)
         
         # Analyze CI/CD practices
-        analysis["ci_cd_practices"] = self._analyze_ci_cd_practices(contents)
+        analysis["ci_cd_practices"] = self._analyze_ci_cd_practices(digests)
         
         # Analyze security practices
-        analysis["security_practices"] = self._analyze_security_practices(contents)
+        analysis["security_practices"] = self._analyze_security_practices(digests)
         
         # Analyze documentation practices
-        analysis["documentation_practices"] = self._analyze_documentation_practices(contents, repo_data)
+        analysis["documentation_practices"] = self._analyze_documentation_practices(digests, repo_data)
         
         # Analyze version control practices
         analysis["version_control_practices"] = self._analyze_version_control_practices(commit_history)
@@ -1609,7 +1744,7 @@ class EvaluationEngine:
             }
         except Exception as e:
             logger.debug(f"Python AST parsing failed: {e}")
-            return self._fallback_analysis(code, "Python")
+            return self._analyze_source_code(code, "Python")
     
     def _calculate_python_complexity_ast(self, tree: ast.AST) -> Dict[str, Any]:
         """Calculate comprehensive complexity metrics using AST"""
@@ -1831,353 +1966,29 @@ class EvaluationEngine:
         
         return class_analysis
     
-    def _analyze_javascript_code(self, code: str) -> Dict[str, Any]:
-        """Analyze JavaScript code for quality metrics"""
-        
-        # Function patterns
-        function_patterns = [
-            r'function\s+\w+\s*\(',
-            r'\w+\s*:\s*function\s*\(',
-            r'const\s+\w+\s*=\s*\([^)]*\)\s*=>',
-            r'let\s+\w+\s*=\s*\([^)]*\)\s*=>',
-            r'var\s+\w+\s*=\s*function'
-        ]
-        
-        functions = sum(len(re.findall(pattern, code)) for pattern in function_patterns)
-        classes = len(re.findall(r'class\s+\w+', code))
-        
-        # ES6+ features
-        es6_features = {
-            "arrow_functions": len(re.findall(r'=>', code)),
-            "template_literals": len(re.findall(r'`[^`]*`', code)),
-            "destructuring": len(re.findall(r'const\s*{[^}]+}\s*=|let\s*{[^}]+}\s*=', code)),
-            "async_await": len(re.findall(r'async\s+function|await\s+', code)),
-            "modules": len(re.findall(r'import\s+|export\s+', code))
-        }
-        
-        # Calculate complexity
-        complexity = self._calculate_js_complexity(code)
-        
-        return {
-            "functions": functions,
-            "classes": classes,
-            "complexity": complexity,
-            "es6_features": es6_features,
-            "framework_indicators": self._detect_js_frameworks(code)
-        }
-    
-    def _analyze_typescript_code(self, code: str) -> Dict[str, Any]:
-        """Analyze TypeScript code for quality metrics"""
-        
-        # Start with JavaScript analysis
-        js_analysis = self._analyze_javascript_code(code)
-        
-        # TypeScript-specific features
-        ts_features = {
-            "interfaces": len(re.findall(r'interface\s+\w+', code)),
-            "types": len(re.findall(r'type\s+\w+\s*=', code)),
-            "generics": len(re.findall(r'<[^>]+>', code)),
-            "decorators": len(re.findall(r'@\w+', code)),
-            "enums": len(re.findall(r'enum\s+\w+', code))
-        }
-        
-        js_analysis["typescript_features"] = ts_features
-        return js_analysis
-    
-    def _analyze_java_code(self, code: str) -> Dict[str, Any]:
-        """Analyze Java code for quality metrics"""
-        
-        # Method patterns
-        methods = len(re.findall(r'(public|private|protected)\s+\w+\s+\w+\s*\([^)]*\)\s*{', code))
-        classes = len(re.findall(r'(public\s+)?class\s+\w+', code))
-        interfaces = len(re.findall(r'interface\s+\w+', code))
-        
-        # Java-specific features
-        java_features = {
-            "annotations": len(re.findall(r'@\w+', code)),
-            "generics": len(re.findall(r'<[^>]+>', code)),
-            "lambda_expressions": len(re.findall(r'->', code)),
-            "streams": len(re.findall(r'\.stream\(\)', code)),
-            "try_catch": len(re.findall(r'try\s*{|catch\s*\(', code))
-        }
-        
-        complexity = self._calculate_java_complexity(code)
-        
-        return {
-            "functions": methods,
-            "classes": classes,
-            "interfaces": interfaces,
-            "complexity": complexity,
-            "java_features": java_features
-        }
-    
-    def _analyze_go_code(self, code: str) -> Dict[str, Any]:
-        """Analyze Go code for quality metrics"""
-        
-        functions = len(re.findall(r'func\s+\w+\s*\([^)]*\)', code))
-        structs = len(re.findall(r'type\s+\w+\s+struct', code))
-        interfaces = len(re.findall(r'type\s+\w+\s+interface', code))
-        
-        # Go-specific features
-        go_features = {
-            "goroutines": len(re.findall(r'go\s+\w+\(', code)),
-            "channels": len(re.findall(r'chan\s+\w+|<-\s*chan|chan\s*<-', code)),
-            "defer": len(re.findall(r'defer\s+', code)),
-            "error_handling": len(re.findall(r'if\s+err\s*!=\s*nil', code)),
-            "packages": len(re.findall(r'package\s+\w+', code))
-        }
-        
-        complexity = self._calculate_go_complexity(code)
-        
-        return {
-            "functions": functions,
-            "structs": structs,
-            "interfaces": interfaces,
-            "complexity": complexity,
-            "go_features": go_features
-        }
-    
-    def _analyze_cpp_code(self, code: str) -> Dict[str, Any]:
-        """Analyze C++ code for quality metrics"""
-        
-        functions = len(re.findall(r'\w+\s+\w+\s*\([^)]*\)\s*{', code))
-        classes = len(re.findall(r'class\s+\w+', code))
-        
-        cpp_features = {
-            "templates": len(re.findall(r'template\s*<', code)),
-            "namespaces": len(re.findall(r'namespace\s+\w+', code)),
-            "smart_pointers": len(re.findall(r'std::(unique_ptr|shared_ptr|weak_ptr)', code)),
-            "lambdas": len(re.findall(r'\[[^\]]*\]\s*\([^)]*\)', code))
-        }
-        
-        return {
-            "functions": functions,
-            "classes": classes,
-            "complexity": self._calculate_cpp_complexity(code),
-            "cpp_features": cpp_features
-        }
-    
-    def _analyze_csharp_code(self, code: str) -> Dict[str, Any]:
-        """Analyze C# code for quality metrics"""
-        
-        methods = len(re.findall(r'(public|private|protected)\s+\w+\s+\w+\s*\([^)]*\)', code))
-        classes = len(re.findall(r'(public\s+)?class\s+\w+', code))
-        
-        csharp_features = {
-            "properties": len(re.findall(r'{\s*get\s*;\s*set\s*;}', code)),
-            "linq": len(re.findall(r'\.Where\(|\.Select\(|\.OrderBy\(', code)),
-            "async_await": len(re.findall(r'async\s+\w+|await\s+', code)),
-            "attributes": len(re.findall(r'\[\w+\]', code))
-        }
-        
-        return {
-            "functions": methods,
-            "classes": classes,
-            "complexity": self._calculate_csharp_complexity(code),
-            "csharp_features": csharp_features
-        }
-    
-    def _analyze_ruby_code(self, code: str) -> Dict[str, Any]:
-        """Analyze Ruby code for quality metrics"""
-        
-        methods = len(re.findall(r'def\s+\w+', code))
-        classes = len(re.findall(r'class\s+\w+', code))
-        modules = len(re.findall(r'module\s+\w+', code))
-        
-        return {
-            "functions": methods,
-            "classes": classes,
-            "modules": modules,
-            "complexity": self._calculate_ruby_complexity(code)
-        }
-    
-    def _analyze_php_code(self, code: str) -> Dict[str, Any]:
-        """Analyze PHP code for quality metrics"""
-        
-        functions = len(re.findall(r'function\s+\w+\s*\(', code))
-        classes = len(re.findall(r'class\s+\w+', code))
-        
-        return {
-            "functions": functions,
-            "classes": classes,
-            "complexity": self._calculate_php_complexity(code)
-        }
-    
-    def _analyze_swift_code(self, code: str) -> Dict[str, Any]:
-        """Analyze Swift code for quality metrics"""
-        
-        functions = len(re.findall(r'func\s+\w+\s*\(', code))
-        classes = len(re.findall(r'class\s+\w+', code))
-        structs = len(re.findall(r'struct\s+\w+', code))
-        
-        return {
-            "functions": functions,
-            "classes": classes,
-            "structs": structs,
-            "complexity": self._calculate_swift_complexity(code)
-        }
-    
-    def _analyze_kotlin_code(self, code: str) -> Dict[str, Any]:
-        """Analyze Kotlin code for quality metrics"""
-        
-        functions = len(re.findall(r'fun\s+\w+\s*\(', code))
-        classes = len(re.findall(r'class\s+\w+', code))
-        
-        return {
-            "functions": functions,
-            "classes": classes,
-            "complexity": self._calculate_kotlin_complexity(code)
-        }
-    
-    def _analyze_rust_code(self, code: str) -> Dict[str, Any]:
-        """Analyze Rust code for quality metrics"""
-        
-        functions = len(re.findall(r'fn\s+\w+\s*\(', code))
-        structs = len(re.findall(r'struct\s+\w+', code))
-        enums = len(re.findall(r'enum\s+\w+', code))
-        
-        rust_features = {
-            "match_expressions": len(re.findall(r'match\s+\w+', code)),
-            "lifetimes": len(re.findall(r"'[a-zA-Z]\w*", code)),
-            "traits": len(re.findall(r'trait\s+\w+', code)),
-            "macros": len(re.findall(r'\w+!', code))
-        }
-        
-        return {
-            "functions": functions,
-            "structs": structs,
-            "enums": enums,
-            "complexity": self._calculate_rust_complexity(code),
-            "rust_features": rust_features
-        }
-    
-    def _fallback_analysis(self, code: str, language: str) -> Dict[str, Any]:
-        """Fallback analysis when language-specific parsing fails"""
-        
-        lines = code.split('\n')
-        non_empty_lines = [line for line in lines if line.strip()]
-        
-        # Generic patterns
-        function_indicators = ['def ', 'function ', 'func ', 'fn ', 'method ']
-        class_indicators = ['class ', 'struct ', 'interface ']
-        
-        functions = sum(len([line for line in non_empty_lines if indicator in line.lower()]) 
-                       for indicator in function_indicators)
-        classes = sum(len([line for line in non_empty_lines if indicator in line.lower()]) 
-                     for indicator in class_indicators)
+    def _analyze_source_code(self, code: str, language: str) -> Dict[str, Any]:
+        """
+        Grammar-driven code analysis for any supported language
         
-        # Basic complexity estimate
-        complexity_indicators = ['if', 'while', 'for', 'switch', 'case', 'try', 'catch']
-        complexity = sum(code.lower().count(indicator) for indicator in complexity_indicators)
+        Args:
+            code: File content
+            language: Language name
+            
+        Returns:
+            Function and class counts, complexity and line counts from a
+            single pass over the file
+        """
+        metrics = self._source_metrics(code, language)
         
         return {
-            "functions": functions,
-            "classes": classes,
-            "complexity": max(1, complexity),
-            "lines": len(non_empty_lines),
-            "analysis_method": "fallback"
-        }
-    
-    # Language-specific complexity calculators
-    def _calculate_js_complexity(self, code: str) -> int:
-        """Calculate JavaScript-specific complexity"""
-        complexity = 1
-        patterns = [r'if\s*\(', r'while\s*\(', r'for\s*\(', r'switch\s*\(', 
-                   r'catch\s*\(', r'\?\s*:', r'&&', r'\|\|']
-        
-        for pattern in patterns:
-            complexity += len(re.findall(pattern, code))
-        
-        return complexity
-    
-    def _calculate_java_complexity(self, code: str) -> int:
-        """Calculate Java-specific complexity"""
-        complexity = 1
-        patterns = [r'if\s*\(', r'while\s*\(', r'for\s*\(', r'switch\s*\(',
-                   r'catch\s*\(', r'case\s+\w+:', r'&&', r'\|\|']
-        
-        for pattern in patterns:
-            complexity += len(re.findall(pattern, code))
-        
-        return complexity
-    
-    def _calculate_go_complexity(self, code: str) -> int:
-        """Calculate Go-specific complexity"""
-        complexity = 1
-        patterns = [r'if\s+', r'for\s+', r'switch\s+', r'case\s+', r'&&', r'\|\|']
-        
-        for pattern in patterns:
-            complexity += len(re.findall(pattern, code))
-        
-        return complexity
-    
-    def _calculate_cpp_complexity(self, code: str) -> int:
-        """Calculate C++-specific complexity"""
-        complexity = 1
-        patterns = [r'if\s*\(', r'while\s*\(', r'for\s*\(', r'switch\s*\(',
-                   r'catch\s*\(', r'case\s+\w+:', r'&&', r'\|\|']
-        
-        for pattern in patterns:
-            complexity += len(re.findall(pattern, code))
-        
-        return complexity
-    
-    def _calculate_csharp_complexity(self, code: str) -> int:
-        """Calculate C#-specific complexity"""
-        return self._calculate_java_complexity(code)  # Similar patterns
-    
-    def _calculate_ruby_complexity(self, code: str) -> int:
-        """Calculate Ruby-specific complexity"""
-        complexity = 1
-        patterns = [r'if\s+', r'while\s+', r'for\s+', r'case\s+', r'when\s+', r'&&', r'\|\|']
-        
-        for pattern in patterns:
-            complexity += len(re.findall(pattern, code))
-        
-        return complexity
-    
-    def _calculate_php_complexity(self, code: str) -> int:
-        """Calculate PHP-specific complexity"""
-        return self._calculate_js_complexity(code)  # Similar patterns
-    
-    def _calculate_swift_complexity(self, code: str) -> int:
-        """Calculate Swift-specific complexity"""
-        complexity = 1
-        patterns = [r'if\s+', r'while\s+', r'for\s+', r'switch\s+', r'case\s+', r'&&', r'\|\|']
-        
-        for pattern in patterns:
-            complexity += len(re.findall(pattern, code))
-        
-        return complexity
-    
-    def _calculate_kotlin_complexity(self, code: str) -> int:
-        """Calculate Kotlin-specific complexity"""
-        return self._calculate_java_complexity(code)  # Similar patterns
-    
-    def _calculate_rust_complexity(self, code: str) -> int:
-        """Calculate Rust-specific complexity"""
-        complexity = 1
-        patterns = [r'if\s+', r'while\s+', r'for\s+', r'match\s+', r'&&', r'\|\|']
-        
-        for pattern in patterns:
-            complexity += len(re.findall(pattern, code))
-        
-        return complexity
-    
-    def _detect_js_frameworks(self, code: str) -> Dict[str, bool]:
-        """Detect JavaScript frameworks and libraries"""
-        
-        frameworks = {
-            "react": bool(re.search(r'import.*react|from\s+["\']react["\']', code, re.IGNORECASE)),
-            "vue": bool(re.search(r'import.*vue|from\s+["\']vue["\']', code, re.IGNORECASE)),
-            "angular": bool(re.search(r'@angular|import.*@angular', code, re.IGNORECASE)),
-            "express": bool(re.search(r'express\(\)|require\(["\']express["\']', code, re.IGNORECASE)),
-            "lodash": bool(re.search(r'import.*lodash|require\(["\']lodash["\']', code, re.IGNORECASE)),
-            "jquery": bool(re.search(r'\$\(|\$\.', code)),
-            "node": bool(re.search(r'require\(|module\.exports|process\.', code))
+            "functions": len(metrics.functions),
+            "classes": len(metrics.classes),
+            "complexity": metrics.cyclomatic_complexity,
+            "cognitive_complexity": metrics.cognitive_complexity,
+            "lines": metrics.non_blank_lines,
+            "comment_lines": metrics.comment_lines,
+            "analysis_method": "grammar"
         }
-        
-        return frameworks
     
     # ==================== COMPREHENSIVE CODE COMPLEXITY ANALYSIS ====================
     
@@ -2203,7 +2014,8 @@ class EvaluationEngine:
         if language == "Python" and self.supported_languages[language]['ast_parser']:
             complexity_analysis = self._analyze_python_complexity_comprehensive(content, file_path)
         else:
-            complexity_analysis = self._analyze_generic_complexity_comprehensive(content, language, file_path)
+            with self._memoized_source_metrics():
+                complexity_analysis = self._analyze_generic_complexity_comprehensive(content, language, file_path)
         
         # Calculate overall quality score
         complexity_analysis["quality_score"] = self._calculate_code_quality_score(complexity_analysis)
@@ -2631,7 +2443,7 @@ class EvaluationEngine:
         return max(0, min(100, mi))
     
     def _analyze_generic_complexity_comprehensive(self, content: str, language: str, file_path: str) -> Dict[str, Any]:
-        """Comprehensive complexity analysis for non-Python languages using regex patterns"""
+        """Comprehensive complexity analysis for non-Python languages from single-pass source metrics"""
         
         complexity_analysis = {
             "cyclomatic_complexity": 1,  # Base complexity
@@ -2645,44 +2457,20 @@ class EvaluationEngine:
             "language_specific_metrics": {}
         }
         
-        if language not in self.supported_languages:
+        if language not in GRAMMARS:
             return complexity_analysis
         
-        lang_config = self.supported_languages[language]
-        
-        # Calculate cyclomatic complexity
-        for pattern in lang_config['complexity_patterns']:
-            matches = len(re.findall(pattern, content, re.IGNORECASE))
-            complexity_analysis["cyclomatic_complexity"] += matches
-        
-        # Calculate cognitive complexity (simplified)
-        lines = content.split('\n')
-        nesting_level = 0
-        max_nesting = 0
-        
-        for line in lines:
-            stripped = line.strip()
-            
-            # Increase nesting for control structures
-            for pattern in lang_config['complexity_patterns'][:4]:  # First 4 are usually control structures
-                if re.search(pattern, stripped, re.IGNORECASE):
-                    nesting_level += 1
-                    max_nesting = max(max_nesting, nesting_level)
-                    complexity_analysis["cognitive_complexity"] += nesting_level
-                    break
-            
-            # Decrease nesting for closing braces
-            if stripped in ['}', 'end', 'endif', 'endfor', 'endwhile']:
-                nesting_level = max(0, nesting_level - 1)
+        metrics = self._source_metrics(content, language)
         
-        complexity_analysis["nesting_depth"] = max_nesting
+        complexity_analysis["cyclomatic_complexity"] = metrics.cyclomatic_complexity
+        complexity_analysis["cognitive_complexity"] = metrics.cognitive_complexity
+        complexity_analysis["nesting_depth"] = metrics.max_nesting
         
         # Analyze functions and classes
         complexity_analysis["function_complexity"] = self._analyze_functions_generic(content, language)
         complexity_analysis["class_complexity"] = self._analyze_classes_generic(content, language)
         
-        # Calculate Halstead metrics (simplified)
-        complexity_analysis["halstead_metrics"] = self._calculate_halstead_metrics_generic(content, language)
+        complexity_analysis["halstead_metrics"] = metrics.halstead()
         
         # Detect code smells
         complexity_analysis["code_smells"] = self._detect_code_smells_generic(content, language)
@@ -2692,7 +2480,7 @@ class EvaluationEngine:
         
         # Calculate maintainability index
         complexity_analysis["maintainability_index"] = self._calculate_maintainability_index_generic(
-            complexity_analysis, content
+            complexity_analysis, metrics
         )
         
         return complexity_analysis
@@ -2700,244 +2488,77 @@ class EvaluationEngine:
     def _analyze_functions_generic(self, content: str, language: str) -> List[Dict[str, Any]]:
         """Analyze functions for non-Python languages"""
         
-        if language not in self.supported_languages:
+        if language not in GRAMMARS:
             return []
         
-        lang_config = self.supported_languages[language]
         function_complexities = []
         
-        for pattern in lang_config['function_patterns']:
-            matches = re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)
+        for function in self._source_metrics(content, language).functions:
+            cc = function.cyclomatic_complexity
             
-            for match in matches:
-                func_start = match.start()
-                func_name = self._extract_function_name(match.group(), language)
-                
-                # Find function end (simplified)
-                func_content = self._extract_function_content(content, func_start, language)
-                
-                func_complexity = {
-                    "name": func_name,
-                    "cyclomatic_complexity": 1,
-                    "lines_of_code": len(func_content.split('\n')),
-                    "complexity_rating": "low"
-                }
-                
-                # Calculate function complexity
-                for complexity_pattern in lang_config['complexity_patterns']:
-                    func_complexity["cyclomatic_complexity"] += len(
-                        re.findall(complexity_pattern, func_content, re.IGNORECASE)
-                    )
-                
-                # Determine complexity rating
-                cc = func_complexity["cyclomatic_complexity"]
-                if cc <= 5:
-                    func_complexity["complexity_rating"] = "low"
-                elif cc <= 10:
-                    func_complexity["complexity_rating"] = "medium"
-                elif cc <= 20:
-                    func_complexity["complexity_rating"] = "high"
-                else:
-                    func_complexity["complexity_rating"] = "very_high"
-                
-                function_complexities.append(func_complexity)
+            # Determine complexity rating
+            if cc <= 5:
+                rating = "low"
+            elif cc <= 10:
+                rating = "medium"
+            elif cc <= 20:
+                rating = "high"
+            else:
+                rating = "very_high"
+            
+            function_complexities.append({
+                "name": function.name,
+                "cyclomatic_complexity": cc,
+                "lines_of_code": function.lines,
+                "parameters": function.parameters,
+                "complexity_rating": rating
+            })
         
         return function_complexities
     
     def _analyze_classes_generic(self, content: str, language: str) -> List[Dict[str, Any]]:
         """Analyze classes for non-Python languages"""
         
-        if language not in self.supported_languages:
+        if language not in GRAMMARS:
             return []
         
-        lang_config = self.supported_languages[language]
         class_complexities = []
         
-        for pattern in lang_config['class_patterns']:
-            matches = re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)
+        for cls in self._source_metrics(content, language).classes:
+            method_count = cls.method_count
             
-            for match in matches:
-                class_start = match.start()
-                class_name = self._extract_class_name(match.group(), language)
-                
-                # Find class content (simplified)
-                class_content = self._extract_class_content(content, class_start, language)
-                
-                # Count methods in class
-                method_count = 0
-                for func_pattern in lang_config['function_patterns']:
-                    method_count += len(re.findall(func_pattern, class_content, re.IGNORECASE))
-                
-                class_complexity = {
-                    "name": class_name,
-                    "method_count": method_count,
-                    "lines_of_code": len(class_content.split('\n')),
-                    "complexity_rating": "low"
-                }
-                
-                # Determine complexity rating based on method count
-                if method_count <= 5:
-                    class_complexity["complexity_rating"] = "low"
-                elif method_count <= 15:
-                    class_complexity["complexity_rating"] = "medium"
-                elif method_count <= 30:
-                    class_complexity["complexity_rating"] = "high"
-                else:
-                    class_complexity["complexity_rating"] = "very_high"
-                
-                class_complexities.append(class_complexity)
-        
-        return class_complexities
-    
-    def _extract_function_name(self, match_text: str, language: str) -> str:
-        """Extract function name from regex match"""
-        
-        # Language-specific function name extraction
-        if language in ["JavaScript", "TypeScript"]:
-            # Handle various JS function patterns
-            if "function" in match_text:
-                name_match = re.search(r'function\s+(\w+)', match_text)
-            elif "=>" in match_text:
-                name_match = re.search(r'(const|let|var)\s+(\w+)', match_text)
-                return name_match.group(2) if name_match else "anonymous"
+            # Determine complexity rating based on method count
+            if method_count <= 5:
+                rating = "low"
+            elif method_count <= 15:
+                rating = "medium"
+            elif method_count <= 30:
+                rating = "high"
             else:
-                name_match = re.search(r'(\w+)\s*:', match_text)
-        elif language == "Python":
-            name_match = re.search(r'def\s+(\w+)', match_text)
-        elif language in ["Java", "C#"]:
-            name_match = re.search(r'\w+\s+(\w+)\s*\(', match_text)
-        elif language == "Go":
-            name_match = re.search(r'func\s+(\w+)', match_text)
-        elif language == "Rust":
-            name_match = re.search(r'fn\s+(\w+)', match_text)
-        else:
-            name_match = re.search(r'(\w+)', match_text)
-        
-        return name_match.group(1) if name_match else "unknown"
-    
-    def _extract_class_name(self, match_text: str, language: str) -> str:
-        """Extract class name from regex match"""
-        
-        if language in ["Java", "C#", "C++", "JavaScript", "TypeScript", "Python"]:
-            name_match = re.search(r'class\s+(\w+)', match_text)
-        elif language == "Go":
-            name_match = re.search(r'type\s+(\w+)\s+struct', match_text)
-        elif language == "Rust":
-            name_match = re.search(r'struct\s+(\w+)', match_text)
-        else:
-            name_match = re.search(r'(\w+)', match_text)
-        
-        return name_match.group(1) if name_match else "unknown"
-    
-    def _extract_function_content(self, content: str, start_pos: int, language: str) -> str:
-        """Extract function content (simplified implementation)"""
-        
-        lines = content[start_pos:].split('\n')
-        
-        if language in ["JavaScript", "TypeScript", "Java", "C#", "C++", "Go", "Rust"]:
-            # Brace-based languages
-            brace_count = 0
-            func_lines = []
-            
-            for line in lines:
-                func_lines.append(line)
-                brace_count += line.count('{') - line.count('}')
-                
-                if brace_count == 0 and '{' in ''.join(func_lines):
-                    break
+                rating = "very_high"
             
-            return '\n'.join(func_lines)
-        
-        else:
-            # Indentation-based or other languages
-            return '\n'.join(lines[:50])  # Simplified: take first 50 lines
-    
-    def _extract_class_content(self, content: str, start_pos: int, language: str) -> str:
-        """Extract class content (simplified implementation)"""
-        
-        return self._extract_function_content(content, start_pos, language)
-    
-    def _calculate_halstead_metrics_generic(self, content: str, language: str) -> Dict[str, float]:
-        """Calculate Halstead metrics for generic languages"""
-        
-        # Generic operator and operand patterns
-        operator_patterns = [r'\+', r'-', r'\*', r'/', r'=', r'==', r'!=', r'<', r'>', r'<=', r'>=', r'&&', r'\|\|']
-        operand_patterns = [r'\b[a-zA-Z_]\w*\b', r'\b\d+\b', r'["\'][^"\']*["\']']
-        
-        operators = set()
-        operands = set()
-        operator_count = 0
-        operand_count = 0
-        
-        # Count operators
-        for pattern in operator_patterns:
-            matches = re.findall(pattern, content)
-            operators.update(matches)
-            operator_count += len(matches)
-        
-        # Count operands
-        for pattern in operand_patterns:
-            matches = re.findall(pattern, content)
-            operands.update(matches)
-            operand_count += len(matches)
-        
-        # Calculate Halstead metrics
-        n1 = len(operators)
-        n2 = len(operands)
-        N1 = operator_count
-        N2 = operand_count
-        
-        vocabulary = n1 + n2
-        length = N1 + N2
-        volume = length * math.log2(vocabulary) if vocabulary > 0 else 0
-        difficulty = (n1 / 2) * (N2 / n2) if n2 > 0 else 0
-        effort = difficulty * volume
+            class_complexities.append({
+                "name": cls.name,
+                "method_count": method_count,
+                "lines_of_code": cls.lines,
+                "complexity_rating": rating
+            })
         
-        return {
-            "vocabulary": vocabulary,
-            "length": length,
-            "volume": volume,
-            "difficulty": difficulty,
-            "effort": effort
-        }
+        return class_complexities
     
     def _detect_code_smells_generic(self, content: str, language: str) -> Dict[str, int]:
         """Detect code smells for generic languages"""
         
-        code_smells = {
-            "long_functions": 0,
-            "long_lines": 0,
-            "deep_nesting": 0,
-            "duplicate_code": 0,
-            "magic_numbers": 0,
-            "too_many_parameters": 0
-        }
-        
-        lines = content.split('\n')
+        metrics = self._source_metrics(content, language)
         
-        # Long lines (> 120 characters)
-        code_smells["long_lines"] = len([line for line in lines if len(line) > 120])
-        
-        # Magic numbers
-        magic_number_pattern = r'\b\d{2,}\b'
-        code_smells["magic_numbers"] = len(re.findall(magic_number_pattern, content))
-        
-        # Duplicate code (simplified)
-        stripped_lines = [line.strip() for line in lines if line.strip()]
-        unique_lines = set(stripped_lines)
-        code_smells["duplicate_code"] = len(stripped_lines) - len(unique_lines)
-        
-        # Deep nesting (> 4 levels of indentation)
-        for line in lines:
-            if language == "Python":
-                indent_level = (len(line) - len(line.lstrip())) // 4
-            else:
-                indent_level = line.count('{') - line.count('}')
-            
-            if indent_level > 4:
-                code_smells["deep_nesting"] += 1
-        
-        return code_smells
+        return {
+            "long_functions": metrics.long_functions,
+            "long_lines": metrics.long_lines,
+            "deep_nesting": metrics.deeply_nested_lines,
+            "duplicate_code": metrics.duplicate_lines,
+            "magic_numbers": metrics.magic_numbers,
+            "too_many_parameters": metrics.functions_with_many_parameters
+        }
     
     def _analyze_language_specific_features(self, content: str, language: str) -> Dict[str, Any]:
         """Analyze language-specific features and modern practices"""
@@ -3003,26 +2624,19 @@ class EvaluationEngine:
         # Framework detection
         for framework, patterns in self.framework_patterns.items():
             for pattern in patterns:
-                if re.search(pattern, content, re.IGNORECASE):
+                if _compiled(pattern, re.IGNORECASE).search(content):
                     features["framework_usage"].append(framework)
                     break
         
         return features
     
-    def _calculate_maintainability_index_generic(self, complexity_analysis: Dict[str, Any], content: str) -> float:
+    def _calculate_maintainability_index_generic(self, complexity_analysis: Dict[str, Any], metrics: SourceMetrics) -> float:
         """Calculate maintainability index for generic languages"""
         
         # Simplified maintainability index calculation
         cyclomatic_complexity = complexity_analysis["cyclomatic_complexity"]
-        lines_of_code = len([line for line in content.split('\n') if line.strip()])
-        
-        # Comment ratio
-        comment_lines = 0
-        for line in content.split('\n'):
-            if re.search(r'//|#|/\*|\*/', line.strip()):
-                comment_lines += 1
-        
-        comment_ratio = comment_lines / max(lines_of_code, 1)
+        lines_of_code = metrics.non_blank_lines
+        comment_ratio = metrics.comment_lines / max(lines_of_code, 1)
         
         # Simplified maintainability index
         mi = 100 - (cyclomatic_complexity * 2) - (lines_of_code * 0.01) + (comment_ratio * 20)
@@ -3064,44 +2678,6 @@ class EvaluationEngine:
         
         return max(0, min(100, score))   
  
-    def _analyze_line_types(self, content: str, language: str) -> Tuple[int, int, int]:
-        """Analyze code lines, comment lines, and blank lines"""
-        lines = content.split('\n')
-        code_lines = 0
-        comment_lines = 0
-        blank_lines = 0
-        
-        for line in lines:
-            stripped = line.strip()
-            if not stripped:
-                blank_lines += 1
-            elif self._is_comment_line(stripped, language):
-                comment_lines += 1
-            else:
-                code_lines += 1
-                
-        return code_lines, comment_lines, blank_lines
-    
-    def _is_comment_line(self, line: str, language: str) -> bool:
-        """Check if a line is a comment"""
-        comment_patterns = {
-            'Python': [r'^\s*#', r'^\s*"""', r'^\s*\'\'\''],
-            'JavaScript': [r'^\s*//', r'^\s*/\*'],
-            'TypeScript': [r'^\s*//', r'^\s*/\*'],
-            'Java': [r'^\s*//', r'^\s*/\*'],
-            'C++': [r'^\s*//', r'^\s*/\*'],
-            'C#': [r'^\s*//', r'^\s*/\*'],
-            'Go': [r'^\s*//', r'^\s*/\*'],
-            'Rust': [r'^\s*//', r'^\s*/\*'],
-            'Ruby': [r'^\s*#'],
-            'PHP': [r'^\s*//', r'^\s*#', r'^\s*/\*'],
-            'Swift': [r'^\s*//', r'^\s*/\*'],
-            'Kotlin': [r'^\s*//', r'^\s*/\*']
-        }
-        
-        patterns = comment_patterns.get(language, [r'^\s*//', r'^\s*#'])
-        return any(re.match(pattern, line) for pattern in patterns)
-    
     def _get_file_type(self, filename: str) -> str:
         """Determine file type from filename"""
         if '.' not in filename:
@@ -3123,50 +2699,14 @@ class EvaluationEngine:
         
         return type_mapping.get(extension, 'other')
     
-    def _count_code_structures(self, content: str, language: str) -> Tuple[int, int]:
-        """Count functions and classes in code"""
-        function_count = 0
-        class_count = 0
-        
-        # Language-specific patterns
-        if language == 'Python':
-            function_count = len(re.findall(r'^\s*def\s+\w+\s*\(', content, re.MULTILINE))
-            class_count = len(re.findall(r'^\s*class\s+\w+', content, re.MULTILINE))
-        elif language in ['JavaScript', 'TypeScript']:
-            function_count = len(re.findall(r'function\s+\w+\s*\(|=>\s*{|\w+\s*:\s*function', content))
-            class_count = len(re.findall(r'class\s+\w+', content))
-        elif language == 'Java':
-            function_count = len(re.findall(r'(public|private|protected)\s+\w+\s+\w+\s*\(', content))
-            class_count = len(re.findall(r'(public\s+)?class\s+\w+', content))
-        elif language in ['C++', 'C#']:
-            function_count = len(re.findall(r'\w+\s+\w+\s*\([^)]*\)\s*{', content))
-            class_count = len(re.findall(r'class\s+\w+', content))
-        elif language == 'Go':
-            function_count = len(re.findall(r'func\s+\w+\s*\(', content))
-            class_count = len(re.findall(r'type\s+\w+\s+struct', content))
-        elif language == 'Rust':
-            function_count = len(re.findall(r'fn\s+\w+\s*\(', content))
-            class_count = len(re.findall(r'struct\s+\w+|enum\s+\w+', content))
-        
-        return function_count, class_count
-    
     def _analyze_code_complexity(self, content: str, language: str) -> float:
         """Calculate cyclomatic complexity estimate"""
-        complexity = 1  # Base complexity
-        
-        # Count decision points
-        decision_keywords = [
-            'if', 'else', 'elif', 'while', 'for', 'switch', 'case',
-            'try', 'catch', 'except', 'finally', 'and', 'or', '&&', '||'
-        ]
-        
-        for keyword in decision_keywords:
-            complexity += len(re.findall(rf'\b{keyword}\b', content, re.IGNORECASE))
+        metrics = self._source_metrics(content, language)
         
         # Normalize by lines of code
-        lines = len([line for line in content.split('\n') if line.strip()])
-        if lines > 0:
-            complexity = complexity / lines * 100  # Complexity per 100 lines
+        complexity = metrics.cyclomatic_complexity
+        if metrics.non_blank_lines > 0:
+            complexity = complexity / metrics.non_blank_lines * 100  # Complexity per 100 lines
         
         return min(complexity, 100)  # Cap at 100
     
@@ -3397,7 +2937,7 @@ class EvaluationEngine:
             "size_consistency": size_consistency
         }
     
-    def _analyze_security_vulnerabilities(self, contents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_security_vulnerabilities(self, digests: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze code for potential security vulnerabilities"""
         
         vulnerabilities = {
@@ -3411,32 +2951,15 @@ class EvaluationEngine:
             "detailed_findings": []
         }
         
-        for file_info in contents:
-            content = file_info.get("content", "")
-            filename = file_info.get("name", "")
-            
-            if not content:
+        for digest in digests:
+            if not digest["size"]:
                 continue
             
-            file_issues = 0
-            
-            # Check each vulnerability category
-            for vuln_type, patterns in self.security_patterns.items():
-                for pattern in patterns:
-                    matches = re.findall(pattern, content, re.IGNORECASE | re.MULTILINE)
-                    if matches:
-                        vulnerabilities[vuln_type] += len(matches)
-                        vulnerabilities["files_with_issues"].add(filename)
-                        file_issues += len(matches)
-                        
-                        # Add detailed findings
-                        for match in matches:
-                            vulnerabilities["detailed_findings"].append({
-                                "file": filename,
-                                "type": vuln_type,
-                                "pattern": pattern,
-                                "match": match[:100]  # Truncate long matches
-                            })
+            filename = digest.get("name", "")
+            for finding in digest["security_findings"]:
+                vulnerabilities[finding["type"]] += 1
+                vulnerabilities["files_with_issues"].add(filename)
+                vulnerabilities["detailed_findings"].append({"file": filename, **finding})
         
         # Calculate total issues and security score
         vulnerabilities["total_issues"] = sum([
@@ -3447,7 +2970,7 @@ class EvaluationEngine:
         ])
         
         # Security score (100 - penalty for issues)
-        total_files = len(contents)
+        total_files = len(digests)
         if total_files > 0:
             issue_ratio = vulnerabilities["total_issues"] / total_files
             vulnerabilities["security_score"] = max(0, 100 - (issue_ratio * 50))
@@ -3457,6 +2980,27 @@ class EvaluationEngine:
         
         return vulnerabilities
     
+    def _find_security_issues(self, content: str) -> List[Dict[str, Any]]:
+        """
+        Match one file's content against every security pattern
+        
+        Args:
+            content: File content
+            
+        Returns:
+            One finding (type, pattern, truncated match) per match
+        """
+        findings = []
+        for vuln_type, patterns in self.security_patterns.items():
+            for pattern in patterns:
+                for match in _compiled(pattern, re.IGNORECASE | re.MULTILINE).findall(content):
+                    findings.append({
+                        "type": vuln_type,
+                        "pattern": pattern,
+                        "match": match[:100]  # Truncate long matches
+                    })
+        return findings
+    
     def _calculate_comprehensive_acid_scores(self, repo_data: Dict[str, Any], repo_stats: Dict[str, Any], 
                                       code_analysis: Dict[str, Any], commit_analysis: Dict[str, Any],
                                       security_analysis: Dict[str, Any], complexity_analysis: Dict[str, Any] = None) -> Dict[str, float]:
@@ -5153,7 +4697,7 @@ class EvaluationEngine:
         
         return proficiency
     
-    def _detect_modern_practices(self, contents: List[Dict[str, Any]]) -> Dict[str, bool]:
+    def _detect_modern_practices(self, digests: List[Dict[str, Any]]) -> Dict[str, bool]:
         """Detect modern development practices"""
         
         practices = {
@@ -5166,11 +4710,10 @@ class EvaluationEngine:
             "type_checking": False
         }
         
-        all_content = " ".join([file_info.get("content", "") for file_info in contents])
-        all_filenames = " ".join([file_info.get("name", "") for file_info in contents])
+        all_filenames = " ".join([digest.get("name", "") for digest in digests])
         
         # Check for various practices
-        if ".git" in all_filenames or "git" in all_content.lower():
+        if ".git" in all_filenames or any(digest.get("mentions_git") for digest in digests):
             practices["version_control"] = True
         
         if any(dep_file in all_filenames for dep_file in ["package.json", "requirements.txt", "pom.xml", "Cargo.toml"]):
@@ -5188,94 +4731,22 @@ class EvaluationEngine:
         if any(lint_file in all_filenames for lint_file in [".eslintrc", ".pylintrc", "tslint.json"]):
             practices["linting"] = True
         
-        if "typescript" in all_content.lower() or ".ts" in all_filenames:
+        if any(digest.get("mentions_typescript") for digest in digests) or ".ts" in all_filenames:
             practices["type_checking"] = True
         
         return practices
     
     def _calculate_cyclomatic_complexity(self, content: str, language: str) -> float:
         """Calculate cyclomatic complexity for a file"""
-        
-        complexity = 1  # Base complexity
-        
-        # Decision points that increase complexity
-        decision_patterns = {
-            "Python": [r'\bif\b', r'\belif\b', r'\bwhile\b', r'\bfor\b', r'\btry\b', r'\bexcept\b', r'\band\b', r'\bor\b'],
-            "JavaScript": [r'\bif\b', r'\belse\s+if\b', r'\bwhile\b', r'\bfor\b', r'\btry\b', r'\bcatch\b', r'&&', r'\|\|', r'\?'],
-            "Java": [r'\bif\b', r'\belse\s+if\b', r'\bwhile\b', r'\bfor\b', r'\btry\b', r'\bcatch\b', r'&&', r'\|\|', r'\?', r'\bcase\b'],
-            "TypeScript": [r'\bif\b', r'\belse\s+if\b', r'\bwhile\b', r'\bfor\b', r'\btry\b', r'\bcatch\b', r'&&', r'\|\|', r'\?']
-        }
-        
-        patterns = decision_patterns.get(language, decision_patterns["JavaScript"])
-        
-        for pattern in patterns:
-            matches = len(re.findall(pattern, content, re.IGNORECASE))
-            complexity += matches
-        
-        return complexity
+        return self._source_metrics(content, language).cyclomatic_complexity
     
     def _calculate_cognitive_complexity(self, content: str, language: str) -> float:
         """Calculate cognitive complexity (how hard code is to understand)"""
-        
-        complexity = 0
-        nesting_level = 0
-        
-        lines = content.split('\n')
-        
-        for line in lines:
-            stripped = line.strip()
-            
-            # Increase nesting for control structures
-            if re.search(r'\b(if|while|for|try|def|function|class)\b', stripped):
-                nesting_level += 1
-                complexity += nesting_level  # Nested structures are harder to understand
-            
-            # Decrease nesting for closing braces/dedentation
-            if stripped in ['}', 'end'] or (language == "Python" and len(line) - len(line.lstrip()) < nesting_level * 4):
-                nesting_level = max(0, nesting_level - 1)
-            
-            # Additional complexity for logical operators
-            complexity += len(re.findall(r'&&|\|\||and\s+|or\s+', stripped))
-        
-        return complexity
+        return self._source_metrics(content, language).cognitive_complexity
     
     def _calculate_halstead_metrics(self, content: str, language: str) -> Dict[str, float]:
         """Calculate Halstead complexity metrics"""
-        
-        # Simple implementation - count operators and operands
-        operators = set()
-        operands = set()
-        
-        # Common operators across languages
-        operator_patterns = [r'\+', r'-', r'\*', r'/', r'=', r'==', r'!=', r'<', r'>', r'<=', r'>=', r'&&', r'\|\|']
-        
-        for pattern in operator_patterns:
-            matches = re.findall(pattern, content)
-            operators.update(matches)
-        
-        # Simple operand detection (variables, numbers, strings)
-        operand_matches = re.findall(r'\b[a-zA-Z_]\w*\b|\b\d+\b|["\'][^"\']*["\']', content)
-        operands.update(operand_matches)
-        
-        n1 = len(operators)  # Number of distinct operators
-        n2 = len(operands)   # Number of distinct operands
-        N1 = sum(len(re.findall(pattern, content)) for pattern in operator_patterns)  # Total operators
-        N2 = len(operand_matches)  # Total operands
-        
-        # Halstead metrics
-        vocabulary = n1 + n2
-        length = N1 + N2
-        volume = length * math.log2(vocabulary) if vocabulary > 0 else 0
-        difficulty = (n1 / 2) * (N2 / n2) if n2 > 0 else 0
-        effort = difficulty * volume
-        
-        return {
-            "vocabulary": vocabulary,
-            "length": length,
-            "volume": volume,
-            "difficulty": difficulty,
-            "effort": effort
-        }
+        return self._source_metrics(content, language).halstead()
     
     def _calculate_file_maintainability(self, content: str, language: str) -> float:
         """Calculate maintainability score for a single file"""
@@ -5287,14 +4758,13 @@ class EvaluationEngine:
         score -= min(complexity * 2, 40)
         
         # Penalize long files
-        lines = len([line for line in content.split('\n') if line.strip()])
+        metrics = self._source_metrics(content, language)
+        lines = metrics.non_blank_lines
         if lines > 500:
             score -= min((lines - 500) * 0.1, 20)
         
         # Reward comments
-        comment_lines = len([line for line in content.split('\n') 
-                           if line.strip() and self._is_comment_line(line.strip(), language)])
-        comment_ratio = comment_lines / max(lines, 1)
+        comment_ratio = metrics.comment_lines / max(lines, 1)
         score += min(comment_ratio * 30, 15)
         
         # Penalize code smells
@@ -5422,7 +4892,7 @@ class EvaluationEngine:
         
         return missing
     
-    def _analyze_project_structure_practices(self, contents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_project_structure_practices(self, digests: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze project structure best practices"""
         
         practices = {
@@ -5434,7 +4904,7 @@ class EvaluationEngine:
             "score": 0
         }
         
-        file_paths = [file_info.get("path", "") for file_info in contents]
+        file_paths = [digest.get("path", "") for digest in digests]
         all_paths = " ".join(file_paths).lower()
         
         if "src/" in all_paths or "lib/" in all_paths:
@@ -5461,7 +4931,7 @@ class EvaluationEngine:
         
         return practices
     
-    def _analyze_code_organization_practices(self, contents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_code_organization_practices(self, digests: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze code organization practices"""
         
         practices = {
@@ -5472,11 +4942,9 @@ class EvaluationEngine:
         }
         
         file_sizes = []
-        for file_info in contents:
-            content = file_info.get("content", "")
-            if content and self._is_code_file(file_info.get("name", ""), file_info.get("language", "")):
-                lines = len([line for line in content.split('\n') if line.strip()])
-                file_sizes.append(lines)
+        for digest in digests:
+            if digest["size"] and self._is_code_file(digest.get("name", ""), digest.get("language", "")):
+                file_sizes.append(digest["non_blank_lines"])
         
         # Check file sizes
         if file_sizes:
@@ -5488,13 +4956,13 @@ class EvaluationEngine:
                 practices["score"] += 30
         
         # Check modular structure (multiple files)
-        code_files = len([f for f in contents if self._is_code_file(f.get("name", ""), f.get("language", ""))])
+        code_files = len([d for d in digests if self._is_code_file(d.get("name", ""), d.get("language", ""))])
         if code_files >= 3:
             practices["modular_structure"] = True
             practices["score"] += 35
         
         # Check naming consistency (simplified)
-        file_names = [file_info.get("name", "") for file_info in contents]
+        file_names = [digest.get("name", "") for digest in digests]
         naming_analysis = self._analyze_naming_conventions([f for f in file_names if f])
         if naming_analysis.get("consistency_score", 0) > 70:
             practices["consistent_naming"] = True
@@ -5502,7 +4970,7 @@ class EvaluationEngine:
         
         return practices
     
-    def _analyze_testing_practices(self, contents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_testing_practices(self, digests: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze testing practices"""
         
         practices = {
@@ -5515,13 +4983,13 @@ class EvaluationEngine:
         test_files = 0
         code_files = 0
         
-        for file_info in contents:
-            file_name = file_info.get("name", "")
-            file_path = file_info.get("path", "")
+        for digest in digests:
+            file_name = digest.get("name", "")
+            file_path = digest.get("path", "")
             
             if self._is_test_file(file_name, file_path):
                 test_files += 1
-            elif self._is_code_file(file_name, file_info.get("language", "")):
+            elif self._is_code_file(file_name, digest.get("language", "")):
                 code_files += 1
         
         if test_files > 0:
@@ -5535,14 +5003,14 @@ class EvaluationEngine:
                 practices["score"] += min(coverage_estimate * 0.4, 40)
             
             # Check test organization
-            test_paths = [f.get("path", "") for f in contents if self._is_test_file(f.get("name", ""), f.get("path", ""))]
+            test_paths = [d.get("path", "") for d in digests if self._is_test_file(d.get("name", ""), d.get("path", ""))]
             if any("test/" in path or "__test__/" in path for path in test_paths):
                 practices["test_organization"] = True
                 practices["score"] += 20
         
         return practices
     
-    def _analyze_ci_cd_practices(self, contents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_ci_cd_practices(self, digests: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze CI/CD practices"""
         
         practices = {
@@ -5552,19 +5020,11 @@ class EvaluationEngine:
             "score": 0
         }
         
-        file_names = [file_info.get("name", "") for file_info in contents]
-        file_paths = [file_info.get("path", "") for file_info in contents]
+        file_names = [digest.get("name", "") for digest in digests]
+        file_paths = [digest.get("path", "") for digest in digests]
         
         # Check for CI/CD configuration files
-        ci_indicators = {
-            "GitHub Actions": [".github/workflows/", "workflow.yml", "action.yml"],
-            "GitLab CI": [".gitlab-ci.yml"],
-            "Travis CI": [".travis.yml"],
-            "CircleCI": [".circleci/config.yml"],
-            "Jenkins": ["Jenkinsfile"]
-        }
-        
-        for platform, indicators in ci_indicators.items():
+        for platform, indicators in CI_INDICATORS.items():
             if any(indicator in " ".join(file_paths + file_names) for indicator in indicators):
                 practices["has_ci_config"] = True
                 practices["ci_platform"] = platform
@@ -5574,20 +5034,19 @@ class EvaluationEngine:
         # Check for automated testing in CI
         if practices["has_ci_config"]:
             # Look for test commands in CI files
-            ci_files = [f for f in contents if any(indicator in f.get("path", "") + f.get("name", "") 
-                                                 for indicators in ci_indicators.values() 
+            ci_files = [d for d in digests if any(indicator in d.get("path", "") + d.get("name", "") 
+                                                 for indicators in CI_INDICATORS.values() 
                                                  for indicator in indicators)]
             
             for ci_file in ci_files:
-                content = ci_file.get("content", "")
-                if re.search(r'npm test|pytest|mvn test|go test|cargo test', content, re.IGNORECASE):
+                if ci_file.get("runs_ci_tests"):
                     practices["automated_testing"] = True
                     practices["score"] += 30
                     break
         
         return practices
     
-    def _analyze_security_practices(self, contents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_security_practices(self, digests: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze security practices"""
         
         practices = {
@@ -5597,8 +5056,7 @@ class EvaluationEngine:
             "security_score": 100
         }
         
-        file_names = [file_info.get("name", "") for file_info in contents]
-        all_content = " ".join([file_info.get("content", "") for file_info in contents])
+        file_names = [digest.get("name", "") for digest in digests]
         
         # Check for security configuration
         security_files = [".gitignore", "security.md", ".env.example"]
@@ -5610,8 +5068,7 @@ class EvaluationEngine:
             practices["dependency_scanning"] = True
         
         # Check secrets management (no hardcoded secrets)
-        secret_patterns = [r'password\s*=\s*["\'][^"\']+["\']', r'api_key\s*=\s*["\'][^"\']+["\']']
-        has_secrets = any(re.search(pattern, all_content, re.IGNORECASE) for pattern in secret_patterns)
+        has_secrets = any(digest.get("has_hardcoded_secrets") for digest in digests)
         
         if not has_secrets:
             practices["secrets_management"] = True
@@ -5620,7 +5077,7 @@ class EvaluationEngine:
         
         return practices
     
-    def _analyze_documentation_practices(self, contents: List[Dict[str, Any]], repo_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _analyze_documentation_practices(self, digests: List[Dict[str, Any]], repo_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze documentation practices"""
         
         practices = {
@@ -5631,7 +5088,7 @@ class EvaluationEngine:
             "score": 0
         }
         
-        file_names = [file_info.get("name", "").lower() for file_info in contents]
+        file_names = [digest.get("name", "").lower() for digest in digests]
         
         # Check for README
         if any("readme" in name for name in file_names):
@@ -5647,10 +5104,10 @@ class EvaluationEngine:
         code_files_with_docs = 0
         total_code_files = 0
         
-        for file_info in contents:
-            if self._is_code_file(file_info.get("name", ""), file_info.get("language", "")):
+        for digest in digests:
+            if self._is_code_file(digest.get("name", ""), digest.get("language", "")):
                 total_code_files += 1
-                if self._has_adequate_docstrings(file_info.get("content", ""), file_info.get("language", "")):
+                if digest["has_docstrings"]:
                     code_files_with_docs += 1
         
         if total_code_files > 0 and code_files_with_docs / total_code_files > 0.5:
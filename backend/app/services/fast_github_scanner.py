@@ -14,6 +14,9 @@ from dataclasses import dataclass
 from collections import defaultdict
 import json
 
+from app.core.config import settings
+from app.services.connection_pool_manager import get_http_pool
+from app.services.github_http_cache import github_http_cache
 from app.services.repository_importance_scorer import RepositoryImportanceScorer
 
 logger = logging.getLogger(__name__)
@@ -35,6 +38,7 @@ class FastGitHubScanner:
     def __init__(self, github_token: str, config: Optional[FastScanConfig] = None):
         self.github_token = github_token
         self.config = config or FastScanConfig()
+        self.base_url = settings.github_api_url.rstrip('/')
         self.session: Optional[aiohttp.ClientSession] = None
         self.cache: Dict[str, Tuple[Any, datetime]] = {}
         
@@ -50,30 +54,22 @@ class FastGitHubScanner:
         }
     
     async def __aenter__(self):
-        """Async context manager entry"""
-        connector = aiohttp.TCPConnector(
-            limit=self.config.max_concurrent,
-            limit_per_host=self.config.max_concurrent,
-            ttl_dns_cache=300,
-            use_dns_cache=True
-        )
-        timeout = aiohttp.ClientTimeout(total=self.config.timeout)
-        
-        self.session = aiohttp.ClientSession(
-            connector=connector,
-            timeout=timeout,
-            headers={
-                'Authorization': f'token {self.github_token}',
-                'Accept': 'application/vnd.github.v3+json',
-                'User-Agent': 'BrokiesV2-FastScanner/1.0'
-            }
-        )
+        """Async context manager entry (borrows the shared GitHub connection pool)"""
+        self.http_pool = get_http_pool()
+        self.session = self.http_pool.shared_session()
+        self.headers = {
+            'Authorization': f'token {self.github_token}',
+            'Accept': 'application/vnd.github.v3+json',
+            'User-Agent': 'BrokiesV2-FastScanner/1.0'
+        }
+        self.request_timeout = aiohttp.ClientTimeout(total=self.config.timeout)
+        # Per-scan concurrency cap (the pool itself enforces the per-host cap)
+        self._request_slots = asyncio.Semaphore(self.config.max_concurrent)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        """Async context manager exit (the shared session stays open for reuse)"""
+        self.session = None
     
     def _get_cache_key(self, endpoint: str, params: Dict = None) -> str:
         """Generate cache key for endpoint"""
@@ -108,13 +104,35 @@ class FastGitHubScanner:
         if not self.session:
             raise RuntimeError("Session not initialized. Use async context manager.")
         
-        url = f"https://api.github.com{endpoint}"
+        url = f"{self.base_url}{endpoint}"
+        
+        # Shared conditional-request cache (survives across scans, 304s are free)
+        http_cache_key, http_cached = await github_http_cache.lookup(url, params, self.github_token)
+        if http_cached and http_cached.is_fresh():
+            data = github_http_cache.serve_fresh(http_cached)
+            self._set_cache(cache_key, data)
+            return data
+        
+        headers = dict(self.headers)
+        if http_cached:
+            headers.update(http_cached.conditional_headers())
         
         try:
-            async with self.session.get(url, params=params or {}) as response:
-                if response.status == 200:
+            async with self._request_slots, self.http_pool.request(
+                "GET",
+                url,
+                params=params or {},
+                headers=headers,
+                timeout=self.request_timeout
+            ) as response:
+                if response.status == 304 and http_cached:
+                    data = await github_http_cache.revalidated(http_cache_key, http_cached, response.headers)
+                    self._set_cache(cache_key, data)
+                    return data
+                elif response.status == 200:
                     data = await response.json()
                     self._set_cache(cache_key, data)
+                    await github_http_cache.store(http_cache_key, url, response.headers, data)
                     return data
                 elif response.status == 404:
                     logger.warning(f"Resource not found: {endpoint}")
@@ -412,9 +430,8 @@ class FastGitHubScanner:
         logger.info(f"📊 [CATEGORIZATION] Processing {len(all_repo_analyses)} repositories for categorization")
         logger.info(f"📊 [CATEGORIZATION] Evaluated: {len(evaluated_analyses)}, Display-only: {len(display_only_analyses)}")
         
-        for repo in all_repo_analyses:
-            # Calculate importance score
-            importance_score = importance_scorer.calculate_importance_score(repo)
+        importance_scores = importance_scorer.calculate_importance_scores(all_repo_analyses)
+        for repo, importance_score in zip(all_repo_analyses, importance_scores):
             repo['importance_score'] = importance_score
             logger.debug(f"📊 [CATEGORIZATION] {repo.get('name')}: importance_score={importance_score}")
         
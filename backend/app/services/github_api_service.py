@@ -7,9 +7,15 @@ import asyncio
 import time
 import logging
 from typing import Dict, Any, Optional, List
-import httpx
+import aiohttp
 from fastapi import HTTPException, status
 
+from app.core.config import settings
+from app.services.connection_pool_manager import get_http_pool
+from app.services.github_http_cache import github_http_cache
+from app.services.github_graphql_client import GitHubGraphQLClient
+from app.services.concurrent_data_fetcher import concurrent_fetcher
+
 logger = logging.getLogger(__name__)
 
 class GitHubAPIService:
@@ -17,7 +23,7 @@ class GitHubAPIService:
     
     def __init__(self, access_token: str, cache_service=None):
         self.access_token = access_token
-        self.base_url = "https://api.github.com"
+        self.base_url = settings.github_api_url.rstrip("/")
         self.timeout = 30.0  # 30 second timeout for serverless
         self.max_retries = 3
         self.rate_limit_remaining = None
@@ -33,21 +39,39 @@ class GitHubAPIService:
             "User-Agent": "BroskiesHub/1.0"
         }
         
+        # Conditional request: 304 responses do not count against the rate limit
+        cache_key, cached = None, None
+        if method.upper() == "GET":
+            cache_key, cached = await github_http_cache.lookup(url, params, self.access_token)
+            if cached and cached.is_fresh():
+                return github_http_cache.serve_fresh(cached)
+            if cached:
+                headers.update(cached.conditional_headers())
+        
         for attempt in range(self.max_retries):
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    if method.upper() == "GET":
-                        response = await client.get(url, headers=headers, params=params)
-                    elif method.upper() == "POST":
-                        response = await client.post(url, headers=headers, json=data)
-                    else:
-                        raise ValueError(f"Unsupported HTTP method: {method}")
-                    
+                if method.upper() == "GET":
+                    request_options = {"params": params}
+                elif method.upper() == "POST":
+                    request_options = {"json": data}
+                else:
+                    raise ValueError(f"Unsupported HTTP method: {method}")
+                
+                async with get_http_pool().request(
+                    method.upper(),
+                    url,
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                    **request_options
+                ) as response:
                     # Update rate limit info
                     self._update_rate_limit_info(response.headers)
                     
+                    if response.status == 304 and cached:
+                        return await github_http_cache.revalidated(cache_key, cached, response.headers)
+                    
                     # Handle rate limiting
-                    if response.status_code == 403 and "rate limit" in response.text.lower():
+                    if response.status == 403 and "rate limit" in (await response.text()).lower():
                         if attempt < self.max_retries - 1:
                             wait_time = self._calculate_wait_time()
                             logger.warning(f"Rate limit hit, waiting {wait_time}s (attempt {attempt + 1})")
@@ -60,20 +84,20 @@ class GitHubAPIService:
                             )
                     
                     # Handle other errors
-                    if response.status_code == 401:
+                    if response.status == 401:
                         raise HTTPException(
                             status_code=status.HTTP_401_UNAUTHORIZED,
                             detail="GitHub token is invalid or expired"
                         )
-                    elif response.status_code == 404:
+                    elif response.status == 404:
                         raise HTTPException(
                             status_code=status.HTTP_404_NOT_FOUND,
                             detail="GitHub resource not found"
                         )
-                    elif response.status_code >= 500:
+                    elif response.status >= 500:
                         if attempt < self.max_retries - 1:
                             wait_time = 2 ** attempt  # Exponential backoff
-                            logger.warning(f"Server error {response.status_code}, retrying in {wait_time}s")
+                            logger.warning(f"Server error {response.status}, retrying in {wait_time}s")
                             await asyncio.sleep(wait_time)
                             continue
                         else:
@@ -81,15 +105,18 @@ class GitHubAPIService:
                                 status_code=status.HTTP_502_BAD_GATEWAY,
                                 detail="GitHub API server error"
                             )
-                    elif response.status_code >= 400:
+                    elif response.status >= 400:
                         raise HTTPException(
-                            status_code=response.status_code,
-                            detail=f"GitHub API error: {response.text}"
+                            status_code=response.status,
+                            detail=f"GitHub API error: {await response.text()}"
                         )
                     
-                    return response.json()
+                    result = await response.json(content_type=None)
+                    if cache_key and response.status == 200:
+                        await github_http_cache.store(cache_key, url, response.headers, result)
+                    return result
                     
-            except httpx.TimeoutException:
+            except asyncio.TimeoutError:
                 if attempt < self.max_retries - 1:
                     wait_time = 2 ** attempt
                     logger.warning(f"Request timeout, retrying in {wait_time}s (attempt {attempt + 1})")
@@ -100,7 +127,7 @@ class GitHubAPIService:
                         status_code=status.HTTP_504_GATEWAY_TIMEOUT,
                         detail="GitHub API request timeout"
                     )
-            except httpx.RequestError as e:
+            except aiohttp.ClientError as e:
                 if attempt < self.max_retries - 1:
                     wait_time = 2 ** attempt
                     logger.warning(f"Request error: {e}, retrying in {wait_time}s")
@@ -124,6 +151,9 @@ class GitHubAPIService:
                 self.rate_limit_remaining = int(headers['X-RateLimit-Remaining'])
             if 'X-RateLimit-Reset' in headers:
                 self.rate_limit_reset = int(headers['X-RateLimit-Reset'])
+
+            # Share the quota with the concurrent fetcher's worker scaling
+            concurrent_fetcher.rate_limiter.update_limits('github_rest', headers)
                 
             logger.debug(f"Rate limit: {self.rate_limit_remaining} remaining, resets at {self.rate_limit_reset}")
         except (ValueError, KeyError) as e:
@@ -411,19 +441,23 @@ class GitHubAPIService:
         url = f"{self.base_url}/repos/{owner}/{repo}/projects"
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, headers=headers, params=params)
-                
+            async with get_http_pool().request(
+                "GET",
+                url,
+                headers=headers,
+                params=params,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            ) as response:
                 # Update rate limit info
                 self._update_rate_limit_info(response.headers)
                 
-                if response.status_code == 404:
+                if response.status == 404:
                     # Projects might not be enabled for this repo
                     logger.debug(f"Projects not available for {owner}/{repo}")
                     return []
                 
                 response.raise_for_status()
-                projects = response.json()
+                projects = await response.json(content_type=None)
                 
                 # Cache the results (1 hour TTL)
                 if self.cache_service and projects:
@@ -452,39 +486,58 @@ class GitHubAPIService:
             
         Requirements: 2.1, 2.2, 6.1, 6.2
         """
-        # Check cache first (longer TTL for counts)
-        cache_key = f"{owner}/{repo}:counts"
-        if self.cache_service:
-            cached_counts = await self.cache_service.get(cache_key, prefix="github_counts")
-            if cached_counts:
-                logger.debug(f"Retrieved PR/issue counts from cache: {cache_key}")
-                return cached_counts
+        full_name = f"{owner}/{repo}"
+        counts = await self.get_pr_issue_counts_batch([full_name])
+        return counts.get(full_name) or {
+            "pull_requests": {"total": 0, "open": 0, "closed": 0, "merged": 0},
+            "issues": {"total": 0, "open": 0, "closed": 0}
+        }
+    
+    async def get_pr_issue_counts_batch(self, repositories: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get PR and issue counts for many repositories in one GraphQL round trip.
         
-        # Fetch first page to get counts from headers/data
-        prs_open = await self.get_pull_requests(owner, repo, state="open", per_page=1)
-        prs_closed = await self.get_pull_requests(owner, repo, state="closed", per_page=1)
-        issues_open = await self.get_issues(owner, repo, state="open", per_page=1)
-        issues_closed = await self.get_issues(owner, repo, state="closed", per_page=1)
+        Counts come from `totalCount` of state-filtered pullRequests/issues
+        connections, so they are exact rather than the length of a listing
+        page. Closed pull requests exclude merged ones.
         
-        # Get repository data for total counts
-        repo_data = await self.get_repository(owner, repo)
+        Args:
+            repositories: Repository full names ("owner/name")
+            
+        Returns:
+            Dictionary of full name -> PR and issue counts (repositories that
+            could not be resolved are left out)
+        """
+        counts = {}
+        missing = []
         
-        counts = {
-            "pull_requests": {
-                "total": repo_data.get("open_issues_count", 0),  # This includes PRs
-                "open": len(prs_open) if prs_open else 0,
-                "closed": len(prs_closed) if prs_closed else 0
-            },
-            "issues": {
-                "total": repo_data.get("open_issues_count", 0),
-                "open": len(issues_open) if issues_open else 0,
-                "closed": len(issues_closed) if issues_closed else 0
+        # Check cache first (longer TTL for counts)
+        for full_name in repositories:
+            cached_counts = None
+            if self.cache_service:
+                cached_counts = await self.cache_service.get(f"{full_name}:counts", prefix="github_counts")
+            if cached_counts:
+                logger.debug(f"Retrieved PR/issue counts from cache: {full_name}:counts")
+                counts[full_name] = cached_counts
+            else:
+                missing.append(full_name)
+        
+        if not missing:
+            return counts
+        
+        activity = await GitHubGraphQLClient(self.access_token).get_repository_activity(missing, items_first=0)
+        
+        for full_name, repository_activity in activity["repositories"].items():
+            pull_requests = repository_activity["pull_requests"]
+            issues = repository_activity["issues"]
+            counts[full_name] = {
+                "pull_requests": {key: pull_requests[key] for key in ("total", "open", "closed", "merged")},
+                "issues": {key: issues[key] for key in ("total", "open", "closed")}
             }
-        }
-        
-        # Cache the results (2 hours TTL)
-        if self.cache_service:
-            await self.cache_service.set(cache_key, counts, prefix="github_counts", ttl=7200)
+            
+            # Cache the results (2 hours TTL)
+            if self.cache_service:
+                await self.cache_service.set(f"{full_name}:counts", counts[full_name], prefix="github_counts", ttl=7200)
         
         return counts
     
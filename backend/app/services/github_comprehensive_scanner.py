@@ -11,6 +11,7 @@ This service provides detailed GitHub data extraction including:
 
 import asyncio
 import logging
+import time
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict, Counter
@@ -18,6 +19,7 @@ from github import Github, GithubException
 import requests
 import json
 
+from app.core.config import settings
 from .github_graphql_client import GitHubGraphQLClient
 from .pull_request_analyzer import PullRequestAnalyzer
 from .issue_analyzer import IssueAnalyzer
@@ -27,11 +29,14 @@ from .connection_pool_manager import connection_pool_manager
 
 logger = logging.getLogger(__name__)
 
+# Seconds a repository snapshot is shared between profile sections and scans
+REPOSITORY_SNAPSHOT_TTL = 300
+
 class GitHubComprehensiveScanner:
     """Enhanced GitHub scanner for comprehensive data extraction with concurrent processing"""
     
     def __init__(self, github_token: str):
-        self.github = Github(github_token, per_page=100)
+        self.github = Github(github_token, base_url=settings.github_api_url, per_page=100)
         self.token = github_token
         self.headers = {
             'Authorization': f'token {github_token}',
@@ -41,6 +46,8 @@ class GitHubComprehensiveScanner:
         self.pr_analyzer = PullRequestAnalyzer(github_token)
         self.issue_analyzer = IssueAnalyzer(github_token)
         self.user = None
+        # login -> (fetched at, snapshot task); see _get_repository_snapshot
+        self._repository_snapshots: Dict[str, Tuple[float, asyncio.Future]] = {}
         
         # Resource management settings
         self.max_concurrent_repos = 5
@@ -206,26 +213,15 @@ class GitHubComprehensiveScanner:
             return {"total_estimated": 200}  # Conservative estimate
     
     async def make_github_api_request(self, url: str, headers: Dict[str, str] = None) -> Dict[str, Any]:
-        """Make GitHub API request using connection pool"""
+        """Make GitHub API request using the shared connection pool"""
         try:
-            # Use connection pool if available
-            if connection_pool_manager.initialized:
-                http_pool = connection_pool_manager.get_http_pool()
-                
-                async with http_pool.get_session() as session:
-                    request_headers = {**self.headers}
-                    if headers:
-                        request_headers.update(headers)
-                    
-                    async with session.get(url, headers=request_headers) as response:
-                        response.raise_for_status()
-                        return await response.json()
-            else:
-                # Fallback to requests library
-                import requests
-                response = requests.get(url, headers=self.headers)
+            request_headers = {**self.headers}
+            if headers:
+                request_headers.update(headers)
+            
+            async with connection_pool_manager.get_http_pool().request("GET", url, headers=request_headers) as response:
                 response.raise_for_status()
-                return response.json()
+                return await response.json()
                 
         except Exception as e:
             logger.error(f"GitHub API request failed for {url}: {e}")
@@ -485,10 +481,80 @@ class GitHubComprehensiveScanner:
             "longest_streak": longest_streak
         }
     
+    async def _get_repository_snapshot(self, user) -> List[Dict[str, Any]]:
+        """
+        Get the user's public repositories with languages and topics, fetched once
+
+        Section builders run concurrently and share one in-flight GraphQL
+        snapshot instead of each paginating the REST listing and calling
+        get_languages() / get_topics() per repository.
+        """
+        login = user.login
+        cached = self._repository_snapshots.get(login)
+        if cached is None or time.monotonic() - cached[0] > REPOSITORY_SNAPSHOT_TTL:
+            cached = (time.monotonic(), asyncio.ensure_future(self._fetch_repository_snapshot(user)))
+            self._repository_snapshots[login] = cached
+
+        try:
+            # Shielded: a section timing out must not cancel the shared fetch
+            return await asyncio.shield(cached[1])
+        except Exception:
+            if self._repository_snapshots.get(login) is cached:
+                del self._repository_snapshots[login]
+            raise
+
+    async def _fetch_repository_snapshot(self, user) -> List[Dict[str, Any]]:
+        """GraphQL snapshot, falling back to a single REST listing without per-repo calls"""
+        try:
+            return await self.graphql_client.get_repository_snapshot(user.login)
+        except Exception as e:
+            logger.warning(f"GraphQL repository snapshot failed for {user.login}, using REST listing: {e}")
+
+        return [
+            {
+                "id": repo.id,
+                "name": repo.name,
+                "full_name": repo.full_name,
+                "description": repo.description,
+                "language": repo.language,
+                "stargazers_count": repo.stargazers_count,
+                "forks_count": repo.forks_count,
+                "watchers_count": repo.watchers_count,
+                "size": repo.size,
+                "created_at": repo.created_at,
+                "updated_at": repo.updated_at,
+                "pushed_at": repo.pushed_at,
+                "html_url": repo.html_url,
+                "clone_url": repo.clone_url,
+                "private": repo.private,
+                "fork": repo.fork,
+                "archived": repo.archived,
+                "disabled": repo.disabled,
+                # The listing payload already carries topics; byte counts need per-repo calls
+                "topics": list(repo.topics or []),
+                "languages": {},
+                "license": {"name": repo.license.name, "key": repo.license.key} if repo.license else None,
+                "default_branch": repo.default_branch,
+                "open_issues_count": repo.open_issues_count
+            }
+            for repo in user.get_repos(type='public', sort='updated')
+        ]
+
+    @staticmethod
+    def _repository_summary(repo: Dict[str, Any]) -> Dict[str, Any]:
+        """Serializable repository dictionary from a snapshot entry"""
+        return {
+            **repo,
+            "description": repo.get("description") or "",
+            "created_at": repo["created_at"].isoformat() if repo.get("created_at") else None,
+            "updated_at": repo["updated_at"].isoformat() if repo.get("updated_at") else None,
+            "pushed_at": repo["pushed_at"].isoformat() if repo.get("pushed_at") else None
+        }
+
     async def _get_repository_overview(self, user) -> Dict[str, Any]:
         """Get comprehensive repository overview"""
         try:
-            repos = list(user.get_repos(type='public', sort='updated'))
+            repos = await self._get_repository_snapshot(user)
             
             overview = {
                 "total_repositories": len(repos),
@@ -511,65 +577,61 @@ class GitHubComprehensiveScanner:
             
             for repo in repos:
                 # Basic counts
-                if repo.fork:
+                if repo["fork"]:
                     overview["forked_repositories"] += 1
                 else:
                     overview["original_repositories"] += 1
                 
                 # Metrics
-                overview["total_stars"] += repo.stargazers_count
-                overview["total_forks"] += repo.forks_count
-                overview["total_watchers"] += repo.watchers_count
+                overview["total_stars"] += repo["stargazers_count"]
+                overview["total_forks"] += repo["forks_count"]
+                overview["total_watchers"] += repo["watchers_count"]
                 
                 # Languages
-                if repo.language:
-                    overview["languages"][repo.language] += 1
+                if repo["language"]:
+                    overview["languages"][repo["language"]] += 1
                 
                 # Topics
-                try:
-                    topics = repo.get_topics()
-                    for topic in topics:
-                        overview["topics"][topic] += 1
-                except:
-                    pass
+                for topic in repo["topics"]:
+                    overview["topics"][topic] += 1
                 
                 # Size tracking
-                overview["repository_sizes"].append(repo.size)
+                overview["repository_sizes"].append(repo["size"])
                 
                 # Creation timeline
-                year = repo.created_at.year
-                overview["creation_timeline"][str(year)] += 1
+                if repo["created_at"]:
+                    overview["creation_timeline"][str(repo["created_at"].year)] += 1
                 
                 # Most starred/forked
-                if repo.stargazers_count > most_starred["stars"]:
+                if repo["stargazers_count"] > most_starred["stars"]:
                     most_starred = {
-                        "stars": repo.stargazers_count,
+                        "stars": repo["stargazers_count"],
                         "repo": {
-                            "name": repo.name,
-                            "description": repo.description,
-                            "html_url": repo.html_url,
-                            "language": repo.language
+                            "name": repo["name"],
+                            "description": repo["description"],
+                            "html_url": repo["html_url"],
+                            "language": repo["language"]
                         }
                     }
                 
-                if repo.forks_count > most_forked["forks"]:
+                if repo["forks_count"] > most_forked["forks"]:
                     most_forked = {
-                        "forks": repo.forks_count,
+                        "forks": repo["forks_count"],
                         "repo": {
-                            "name": repo.name,
-                            "description": repo.description,
-                            "html_url": repo.html_url,
-                            "language": repo.language
+                            "name": repo["name"],
+                            "description": repo["description"],
+                            "html_url": repo["html_url"],
+                            "language": repo["language"]
                         }
                     }
                 
                 # Recently updated (last 30 days)
-                if (datetime.now() - repo.updated_at.replace(tzinfo=None)).days <= 30:
+                if repo["updated_at"] and (datetime.now() - repo["updated_at"].replace(tzinfo=None)).days <= 30:
                     overview["recently_updated"].append({
-                        "name": repo.name,
-                        "updated_at": repo.updated_at.isoformat(),
-                        "language": repo.language,
-                        "stars": repo.stargazers_count
+                        "name": repo["name"],
+                        "updated_at": repo["updated_at"].isoformat(),
+                        "language": repo["language"],
+                        "stars": repo["stargazers_count"]
                     })
             
             # Convert defaultdicts and add calculated fields
@@ -584,52 +646,13 @@ class GitHubComprehensiveScanner:
             overview["recently_updated"].sort(key=lambda x: x["updated_at"], reverse=True)
             overview["recently_updated"] = overview["recently_updated"][:10]
             
-            # Add the actual repositories list for external access
+            # Add the actual repositories list for external access (all repositories)
             repositories_list = []
-            
-            # Process ALL repos with full details
-            for i, repo in enumerate(repos):  # Include all repositories
-                try:
-                    repo_data = {
-                        "id": repo.id,
-                        "name": repo.name,
-                        "full_name": repo.full_name,
-                        "description": repo.description or "",
-                        "language": repo.language,
-                        "stargazers_count": repo.stargazers_count,
-                        "forks_count": repo.forks_count,
-                        "watchers_count": repo.watchers_count,
-                        "size": repo.size,
-                        "created_at": repo.created_at.isoformat(),
-                        "updated_at": repo.updated_at.isoformat(),
-                        "pushed_at": repo.pushed_at.isoformat() if repo.pushed_at else None,
-                        "html_url": repo.html_url,
-                        "clone_url": repo.clone_url,
-                        "private": repo.private,
-                        "fork": repo.fork,
-                        "archived": repo.archived,
-                        "disabled": repo.disabled,
-                        "topics": list(repo.get_topics()) if hasattr(repo, 'get_topics') else [],
-                        "license": {"name": repo.license.name, "key": repo.license.key} if repo.license else None,
-                        "default_branch": repo.default_branch,
-                        "open_issues_count": repo.open_issues_count,
-                        "evaluate_for_scoring": True  # Mark for detailed evaluation
-                    }
-                    repositories_list.append(repo_data)
-                except Exception as e:
-                    logger.error(f"Error processing repository {repo.name}: {e}")
-                    # Still add basic info even if detailed processing fails
-                    try:
-                        repo_data = {
-                            "id": repo.id,
-                            "name": repo.name,
-                            "language": repo.language,
-                            "stargazers_count": repo.stargazers_count,
-                            "error": str(e)
-                        }
-                        repositories_list.append(repo_data)
-                    except:
-                        pass
+            for repo in repos:
+                repo_data = self._repository_summary(repo)
+                repo_data.pop("languages", None)
+                repo_data["evaluate_for_scoring"] = True  # Mark for detailed evaluation
+                repositories_list.append(repo_data)
             
             overview["repositories"] = repositories_list
             overview["evaluated_repositories_count"] = len(repos)
@@ -697,7 +720,7 @@ class GitHubComprehensiveScanner:
     async def _get_language_statistics(self, user) -> Dict[str, Any]:
         """Get comprehensive language usage statistics"""
         try:
-            repos = list(user.get_repos(type='public'))
+            repos = await self._get_repository_snapshot(user)
             
             language_stats = {
                 "total_languages": 0,
@@ -714,20 +737,16 @@ class GitHubComprehensiveScanner:
             total_bytes = 0
             
             for repo in repos:
-                if repo.language:
-                    lang_data = language_stats["language_breakdown"][repo.language]
+                if repo["language"]:
+                    lang_data = language_stats["language_breakdown"][repo["language"]]
                     lang_data["repositories"] += 1
-                    lang_data["stars"] += repo.stargazers_count
-                    lang_data["forks"] += repo.forks_count
+                    lang_data["stars"] += repo["stargazers_count"]
+                    lang_data["forks"] += repo["forks_count"]
                 
-                # Get detailed language breakdown for this repo
-                try:
-                    languages = repo.get_languages()
-                    for lang, bytes_count in languages.items():
-                        language_stats["language_breakdown"][lang]["total_bytes"] += bytes_count
-                        total_bytes += bytes_count
-                except:
-                    pass
+                # Detailed language breakdown for this repo (from the snapshot)
+                for lang, bytes_count in repo["languages"].items():
+                    language_stats["language_breakdown"][lang]["total_bytes"] += bytes_count
+                    total_bytes += bytes_count
             
             # Convert to regular dict and calculate percentages
             language_breakdown = {}
@@ -764,15 +783,15 @@ class GitHubComprehensiveScanner:
     async def _get_achievement_metrics(self, user) -> Dict[str, Any]:
         """Calculate achievement-like metrics"""
         try:
-            repos = list(user.get_repos(type='public'))
+            repos = await self._get_repository_snapshot(user)
             
             achievements = {
-                "total_stars_earned": sum(repo.stargazers_count for repo in repos),
-                "total_forks_earned": sum(repo.forks_count for repo in repos),
-                "repositories_with_stars": len([repo for repo in repos if repo.stargazers_count > 0]),
-                "repositories_with_forks": len([repo for repo in repos if repo.forks_count > 0]),
-                "popular_repositories": len([repo for repo in repos if repo.stargazers_count >= 10]),
-                "highly_popular_repositories": len([repo for repo in repos if repo.stargazers_count >= 100]),
+                "total_stars_earned": sum(repo["stargazers_count"] for repo in repos),
+                "total_forks_earned": sum(repo["forks_count"] for repo in repos),
+                "repositories_with_stars": len([repo for repo in repos if repo["stargazers_count"] > 0]),
+                "repositories_with_forks": len([repo for repo in repos if repo["forks_count"] > 0]),
+                "popular_repositories": len([repo for repo in repos if repo["stargazers_count"] >= 10]),
+                "highly_popular_repositories": len([repo for repo in repos if repo["stargazers_count"] >= 100]),
                 "account_age_years": (datetime.now() - user.created_at.replace(tzinfo=None)).days / 365.25,
                 "repositories_per_year": 0,
                 "consistency_score": 0
@@ -785,7 +804,7 @@ class GitHubComprehensiveScanner:
             # Calculate consistency score based on regular activity
             if repos:
                 # Check if user has been consistently active (repositories spread over time)
-                creation_years = set(repo.created_at.year for repo in repos)
+                creation_years = set(repo["created_at"].year for repo in repos if repo["created_at"])
                 current_year = datetime.now().year
                 account_years = current_year - user.created_at.year + 1
                 
@@ -1592,108 +1611,13 @@ class GitHubComprehensiveScanner:
             return []
     
     async def get_user_repositories_concurrent(self, username: str, max_repos: int = 50) -> List[Dict[str, Any]]:
-        """Get user repositories with concurrent language analysis"""
+        """Get user repositories with languages and topics from the shared repository snapshot"""
         try:
             user = self.github.get_user(username)
-            repos = list(user.get_repos(type='public', sort='updated')[:max_repos])
-            
-            if not repos:
-                return []
-            
-            # Prepare concurrent requests for repository language analysis
-            requests = []
-            for repo in repos:
-                request_id = f"repo_languages_{repo.full_name}"
-                requests.append((
-                    request_id,
-                    self._get_repository_languages_concurrent,
-                    (repo,),
-                    {}
-                ))
-            
-            # Submit batch for language analysis
-            results = await concurrent_fetcher.submit_batch(
-                requests,
-                priority=RequestPriority.NORMAL,
-                timeout=60.0
-            )
-            
-            # Build repository list with language data
-            repo_data = []
-            for i, result in enumerate(results):
-                repo = repos[i]
-                
-                # Basic repository data
-                repo_info = {
-                    "id": repo.id,
-                    "name": repo.name,
-                    "full_name": repo.full_name,
-                    "description": repo.description or "",
-                    "language": repo.language,
-                    "stargazers_count": repo.stargazers_count,
-                    "forks_count": repo.forks_count,
-                    "watchers_count": repo.watchers_count,
-                    "size": repo.size,
-                    "created_at": repo.created_at.isoformat(),
-                    "updated_at": repo.updated_at.isoformat(),
-                    "pushed_at": repo.pushed_at.isoformat() if repo.pushed_at else None,
-                    "html_url": repo.html_url,
-                    "clone_url": repo.clone_url,
-                    "private": repo.private,
-                    "fork": repo.fork,
-                    "archived": repo.archived,
-                    "disabled": repo.disabled,
-                    "default_branch": repo.default_branch,
-                    "open_issues_count": repo.open_issues_count
-                }
-                
-                # Add language data from concurrent analysis
-                if result.success:
-                    repo_info.update(result.result)
-                else:
-                    logger.warning(f"Language analysis failed for {repo.full_name}: {result.error}")
-                    repo_info["languages"] = {}
-                    repo_info["topics"] = []
-                
-                repo_data.append(repo_info)
+            repos = await self._get_repository_snapshot(user)
             
-            return repo_data
+            return [self._repository_summary(repo) for repo in repos[:max_repos]]
             
         except Exception as e:
             logger.error(f"Error getting user repositories concurrently: {e}")
             return []
-    
-    async def _get_repository_languages_concurrent(self, repo) -> Dict[str, Any]:
-        """Get repository languages and topics (for concurrent processing)"""
-        try:
-            # Get languages
-            languages = repo.get_languages()
-            
-            # Get topics
-            topics = []
-            try:
-                topics = list(repo.get_topics())
-            except:
-                pass
-            
-            # Get license info
-            license_info = None
-            if repo.license:
-                license_info = {
-                    "name": repo.license.name,
-                    "key": repo.license.key
-                }
-            
-            return {
-                "languages": languages,
-                "topics": topics,
-                "license": license_info
-            }
-            
-        except Exception as e:
-            logger.warning(f"Error getting repository languages for {repo.full_name}: {e}")
-            return {
-                "languages": {},
-                "topics": [],
-                "license": None
-            }
\ No newline at end of file
@@ -10,13 +10,14 @@ This service provides fast GitHub data extraction with minimal API calls:
 
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict, Counter
 from github import Github, GithubException
 import requests
 import json
 
+from app.core.config import settings
 from .github_graphql_client import GitHubGraphQLClient
 from .performance_service import performance_service
 from .concurrent_data_fetcher import concurrent_fetcher, RequestPriority
@@ -27,7 +28,7 @@ class GitHubFastScanner:
     """Fast GitHub scanner optimized for speed with minimal API calls"""
     
     def __init__(self, github_token: str):
-        self.github = Github(github_token, per_page=100)
+        self.github = Github(github_token, base_url=settings.github_api_url, per_page=100)
         self.token = github_token
         self.headers = {
             'Authorization': f'token {github_token}',
@@ -230,17 +231,15 @@ class GitHubFastScanner:
     async def _get_contribution_stats_fast(self, username: str) -> Dict[str, Any]:
         """Get contribution statistics optimized for speed"""
         try:
-            # Use GraphQL for efficient contribution data
+            # Served from the stored calendar; streaks are kept current by the store
             contribution_data = await self.graphql_client.get_contribution_calendar(username)
             
-            # Extract key metrics quickly
-            if contribution_data and "contributionCalendar" in contribution_data:
-                calendar = contribution_data["contributionCalendar"]
+            if contribution_data:
                 return {
-                    "total_contributions": calendar.get("totalContributions", 0),
-                    "contribution_calendar": calendar.get("weeks", []),
-                    "current_streak": self._calculate_streak_fast(calendar.get("weeks", [])),
-                    "most_active_day": self._find_most_active_day(calendar.get("weeks", []))
+                    "total_contributions": contribution_data.get("total_contributions", 0),
+                    "contribution_calendar": contribution_data.get("calendar_data", []),
+                    "current_streak": contribution_data.get("contribution_streaks", {}).get("current_streak", 0),
+                    "most_active_day": contribution_data.get("busiest_day", {"date": None, "count": 0})
                 }
             
             return {"total_contributions": 0, "contribution_calendar": []}
@@ -249,48 +248,6 @@ class GitHubFastScanner:
             logger.warning(f"Fast contribution stats failed: {e}")
             return {"total_contributions": 0, "contribution_calendar": []}
     
-    def _calculate_streak_fast(self, weeks: List[Dict]) -> int:
-        """Calculate current contribution streak quickly"""
-        if not weeks:
-            return 0
-        
-        current_streak = 0
-        today = datetime.now().date()
-        
-        # Flatten weeks into days and reverse for recent-first order
-        all_days = []
-        for week in weeks:
-            all_days.extend(week.get("contributionDays", []))
-        
-        # Calculate current streak from today backwards
-        for day in reversed(all_days):
-            day_date = datetime.fromisoformat(day["date"]).date()
-            if day_date > today:
-                continue
-            if day["contributionCount"] > 0:
-                current_streak += 1
-            else:
-                break
-        
-        return current_streak
-    
-    def _find_most_active_day(self, weeks: List[Dict]) -> Dict[str, Any]:
-        """Find the most active contribution day"""
-        if not weeks:
-            return {"date": None, "count": 0}
-        
-        max_day = {"date": None, "count": 0}
-        
-        for week in weeks:
-            for day in week.get("contributionDays", []):
-                if day["contributionCount"] > max_day["count"]:
-                    max_day = {
-                        "date": day["date"],
-                        "count": day["contributionCount"]
-                    }
-        
-        return max_day
-    
     async def _get_language_stats_fast(self, user) -> Dict[str, Any]:
         """Get language statistics optimized for speed"""
         try:
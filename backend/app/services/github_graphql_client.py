@@ -7,14 +7,155 @@ including contribution calendars, repository relationships, and detailed analyti
 
 import asyncio
 import logging
-import requests
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
-from collections import defaultdict
+import time
+import aiohttp
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import date, datetime, timedelta
 import json
 
+from app.core.config import settings
+from app.services.concurrent_data_fetcher import concurrent_fetcher
+from app.services.connection_pool_manager import get_http_pool
+from app.services.contribution_calendar_store import (
+    CALENDAR_WINDOW_DAYS,
+    ContributionCalendar,
+    contribution_calendar_store,
+    contribution_level,
+)
+
 logger = logging.getLogger(__name__)
 
+# Aliased search(type: ISSUE) counts of a user's authored pull requests and
+# issues: alias -> (section, key, search qualifiers)
+USER_ACTIVITY_SEARCHES = {
+    "authoredPullRequests": ("pull_requests", "total", "is:pr"),
+    "authoredOpenPullRequests": ("pull_requests", "open", "is:pr is:open"),
+    "authoredClosedPullRequests": ("pull_requests", "closed", "is:pr is:closed is:unmerged"),
+    "authoredMergedPullRequests": ("pull_requests", "merged", "is:pr is:merged"),
+    "authoredIssues": ("issues", "total", "is:issue"),
+    "authoredOpenIssues": ("issues", "open", "is:issue is:open"),
+    "authoredClosedIssues": ("issues", "closed", "is:issue is:closed"),
+}
+
+# Fields of each aliased repository in a repository activity query
+REPOSITORY_ACTIVITY_FRAGMENTS = """
+fragment RepositoryActivity on Repository {
+    pullRequests {
+        totalCount
+    }
+    openPullRequests: pullRequests(states: OPEN) {
+        totalCount
+    }
+    closedPullRequests: pullRequests(states: CLOSED) {
+        totalCount
+    }
+    mergedPullRequests: pullRequests(states: MERGED) {
+        totalCount
+    }
+    recentPullRequests: pullRequests(first: $itemsFirst, orderBy: {field: UPDATED_AT, direction: DESC}) @include(if: $withItems) {
+        nodes {
+            ...PullRequestActivity
+        }
+    }
+    issues {
+        totalCount
+    }
+    openIssues: issues(states: OPEN) {
+        totalCount
+    }
+    closedIssues: issues(states: CLOSED) {
+        totalCount
+    }
+    recentIssues: issues(first: $itemsFirst, orderBy: {field: UPDATED_AT, direction: DESC}) @include(if: $withItems) {
+        nodes {
+            ...IssueActivity
+        }
+    }
+}
+
+fragment PullRequestActivity on PullRequest {
+    number
+    title
+    state
+    merged
+    url
+    createdAt
+    updatedAt
+    closedAt
+    mergedAt
+    additions
+    deletions
+    changedFiles
+    author {
+        login
+    }
+    commits {
+        totalCount
+    }
+    labels(first: 10) {
+        nodes {
+            name
+        }
+    }
+    body @include(if: $details)
+    files(first: 50) @include(if: $details) {
+        nodes {
+            path
+        }
+    }
+    reviews(first: 20) @include(if: $details) {
+        totalCount
+        nodes {
+            author {
+                login
+            }
+            state
+            submittedAt
+        }
+    }
+    comments @include(if: $details) {
+        totalCount
+    }
+}
+
+fragment IssueActivity on Issue {
+    number
+    title
+    state
+    url
+    createdAt
+    updatedAt
+    closedAt
+    author {
+        login
+    }
+    labels(first: 10) {
+        nodes {
+            name
+        }
+    }
+    body @include(if: $details)
+    assignees(first: 10) @include(if: $details) {
+        nodes {
+            login
+        }
+    }
+    milestone @include(if: $details) {
+        title
+    }
+    comments @include(if: $details) {
+        totalCount
+    }
+}
+"""
+
+
+def _parse_github_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse a GitHub ISO 8601 timestamp ("2024-01-01T00:00:00Z") into an aware datetime"""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
 class GitHubGraphQLClient:
     """Enhanced GitHub GraphQL client for complex data queries"""
     
@@ -25,12 +166,25 @@ class GitHubGraphQLClient:
             'Content-Type': 'application/json',
             'Accept': 'application/vnd.github.v4+json'
         }
-        self.endpoint = 'https://api.github.com/graphql'
+        self.endpoint = settings.get_github_graphql_url()
         self.rate_limit_remaining = 5000
         self.rate_limit_reset = None
     
-    async def execute_query(self, query: str, variables: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Execute a GraphQL query with error handling and rate limiting"""
+    async def execute_query(self, query: str, variables: Dict[str, Any] = None,
+                            allow_partial: bool = False) -> Dict[str, Any]:
+        """
+        Execute a GraphQL query with error handling and rate limiting
+
+        Args:
+            query: GraphQL query
+            variables: Query variables
+            allow_partial: For queries of independent aliased fields: when every
+                error names the alias it belongs to (errors[].path), return the
+                rest of the data without those aliases instead of failing
+
+        Returns:
+            The response data
+        """
         try:
             # Check rate limit before making request
             await self._check_rate_limit()
@@ -40,199 +194,309 @@ class GitHubGraphQLClient:
                 'variables': variables or {}
             }
             
-            response = requests.post(
+            async with get_http_pool().request(
+                "POST",
                 self.endpoint,
                 json=payload,
                 headers=self.headers,
-                timeout=30
-            )
-            
-            # Update rate limit info from response headers
-            self._update_rate_limit_info(response)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Check for GraphQL errors
-                if 'errors' in data:
-                    logger.error(f"GraphQL errors: {data['errors']}")
-                    raise Exception(f"GraphQL query failed: {data['errors']}")
+                timeout=aiohttp.ClientTimeout(total=30)
+            ) as response:
+                # Update rate limit info from response headers
+                self._update_rate_limit_info(response)
                 
-                return data.get('data', {})
-            else:
-                logger.error(f"GraphQL request failed with status {response.status_code}: {response.text}")
-                raise Exception(f"GraphQL request failed: {response.status_code}")
+                if response.status == 200:
+                    data = await response.json(content_type=None)
+                    
+                    # Check for GraphQL errors
+                    if 'errors' in data:
+                        failed = self._failed_aliases(data['errors']) if allow_partial else None
+                        if not failed or not data.get('data'):
+                            logger.error(f"GraphQL errors: {data['errors']}")
+                            raise Exception(f"GraphQL query failed: {data['errors']}")
+
+                        logger.warning(f"GraphQL errors for {sorted(failed)}, keeping the other fields: {data['errors']}")
+                        return {alias: value for alias, value in data['data'].items() if alias not in failed}
+                    
+                    return data.get('data', {})
+                else:
+                    logger.error(f"GraphQL request failed with status {response.status}: {await response.text()}")
+                    raise Exception(f"GraphQL request failed: {response.status}")
                 
         except Exception as e:
             logger.error(f"GraphQL query execution failed: {e}")
             raise Exception(f"GraphQL query failed: {str(e)}")
     
+    @staticmethod
+    def _failed_aliases(errors: List[Dict[str, Any]]) -> Optional[set]:
+        """Top-level fields named by GraphQL errors, or None if an error names none"""
+        failed = set()
+        for error in errors:
+            path = error.get('path') or []
+            if not path or not isinstance(path[0], str):
+                return None
+            failed.add(path[0])
+        return failed
+
     async def get_contribution_calendar(self, username: str, from_date: Optional[str] = None) -> Dict[str, Any]:
-        """Get comprehensive contribution calendar data using GraphQL"""
+        """
+        Get comprehensive contribution calendar data using GraphQL
+
+        Without from_date the user's stored calendar is served: read locally
+        between syncs, topped up with only the days since its last stored day
+        every CONTRIBUTION_CALENDAR_SYNC_INTERVAL seconds, and refetched in
+        full (totals and repository breakdowns included) every
+        CONTRIBUTION_CALENDAR_FULL_REFRESH seconds. An explicit from_date
+        queries that window directly and is not stored.
+        """
         try:
-            # Calculate date range (default to last year)
-            if not from_date:
-                from_date = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%dT%H:%M:%SZ')
+            if from_date or not contribution_calendar_store.enabled:
+                record = await self._fetch_contribution_calendar(username, from_date or self._calendar_window_start())
+                return self._calendar_response(record)
             
-            query = """
-            query($username: String!, $from: DateTime!) {
-                user(login: $username) {
-                    contributionsCollection(from: $from) {
-                        totalCommitContributions
-                        totalIssueContributions
-                        totalPullRequestContributions
-                        totalPullRequestReviewContributions
-                        totalRepositoryContributions
-                        contributionCalendar {
-                            totalContributions
-                            weeks {
-                                contributionDays {
-                                    contributionCount
-                                    date
-                                    weekday
-                                    color
-                                }
+            record = await contribution_calendar_store.load(username)
+            now = time.time()
+            
+            if record is None or now - record.summary_synced_at >= settings.contribution_calendar_full_refresh:
+                record = await self._fetch_contribution_calendar(username, self._calendar_window_start())
+                await contribution_calendar_store.save(record)
+            elif now - record.synced_at >= settings.contribution_calendar_sync_interval:
+                if await self._sync_contribution_calendar(record):
+                    await contribution_calendar_store.save(record)
+            
+            return self._calendar_response(record)
+            
+        except Exception as e:
+            logger.error(f"Failed to get contribution calendar for {username}: {e}")
+            raise Exception(f"Contribution calendar query failed: {str(e)}")
+    
+    @staticmethod
+    def _calendar_window_start() -> str:
+        """Start of the default one-year calendar window"""
+        return (datetime.now() - timedelta(days=CALENDAR_WINDOW_DAYS)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    
+    async def _fetch_contribution_calendar(self, username: str, from_date: str) -> ContributionCalendar:
+        """Fetch a full calendar with totals and repository breakdowns into a new record"""
+        query = """
+        query($username: String!, $from: DateTime!) {
+            user(login: $username) {
+                contributionsCollection(from: $from) {
+                    totalCommitContributions
+                    totalIssueContributions
+                    totalPullRequestContributions
+                    totalPullRequestReviewContributions
+                    totalRepositoryContributions
+                    contributionCalendar {
+                        totalContributions
+                        weeks {
+                            contributionDays {
+                                contributionCount
+                                date
+                                weekday
+                                color
                             }
                         }
-                        commitContributionsByRepository(maxRepositories: 25) {
-                            repository {
-                                name
-                                owner {
-                                    login
-                                }
-                                url
-                                primaryLanguage {
-                                    name
-                                    color
-                                }
-                            }
-                            contributions(first: 100) {
-                                totalCount
+                    }
+                    commitContributionsByRepository(maxRepositories: 25) {
+                        repository {
+                            name
+                            owner {
+                                login
                             }
-                        }
-                        pullRequestContributionsByRepository(maxRepositories: 25) {
-                            repository {
+                            url
+                            primaryLanguage {
                                 name
-                                owner {
-                                    login
-                                }
-                                url
-                            }
-                            contributions(first: 100) {
-                                totalCount
+                                color
                             }
                         }
+                        contributions(first: 100) {
+                            totalCount
+                        }
                     }
-                    repositoriesContributedTo(first: 100, contributionTypes: [COMMIT, ISSUE, PULL_REQUEST, REPOSITORY]) {
-                        totalCount
-                        nodes {
+                    pullRequestContributionsByRepository(maxRepositories: 25) {
+                        repository {
                             name
                             owner {
                                 login
                             }
                             url
-                            primaryLanguage {
-                                name
+                        }
+                        contributions(first: 100) {
+                            totalCount
+                        }
+                    }
+                }
+                repositoriesContributedTo(first: 100, contributionTypes: [COMMIT, ISSUE, PULL_REQUEST, REPOSITORY]) {
+                    totalCount
+                    nodes {
+                        name
+                        owner {
+                            login
+                        }
+                        url
+                        primaryLanguage {
+                            name
+                            color
+                        }
+                        stargazerCount
+                        forkCount
+                    }
+                }
+            }
+        }
+        """
+        
+        variables = {
+            "username": username,
+            "from": from_date
+        }
+        
+        data = await self.execute_query(query, variables)
+        
+        if not data.get('user'):
+            raise Exception(f"User '{username}' not found")
+        
+        contributions = data['user']['contributionsCollection']
+        calendar = contributions['contributionCalendar']
+        
+        record = ContributionCalendar(username)
+        record.merge(self._calendar_days(calendar))
+        
+        # Process repository contributions
+        commit_repos = []
+        for repo_contrib in contributions.get('commitContributionsByRepository', []):
+            repo = repo_contrib['repository']
+            commit_repos.append({
+                'name': repo['name'],
+                'owner': repo['owner']['login'],
+                'url': repo['url'],
+                'language': repo['primaryLanguage']['name'] if repo.get('primaryLanguage') else None,
+                'language_color': repo['primaryLanguage']['color'] if repo.get('primaryLanguage') else None,
+                'contributions': repo_contrib['contributions']['totalCount']
+            })
+        
+        pr_repos = []
+        for repo_contrib in contributions.get('pullRequestContributionsByRepository', []):
+            repo = repo_contrib['repository']
+            pr_repos.append({
+                'name': repo['name'],
+                'owner': repo['owner']['login'],
+                'url': repo['url'],
+                'contributions': repo_contrib['contributions']['totalCount']
+            })
+        
+        # Process contributed repositories
+        contributed_repos = []
+        for repo in data['user']['repositoriesContributedTo'].get('nodes', []):
+            contributed_repos.append({
+                'name': repo['name'],
+                'owner': repo['owner']['login'],
+                'url': repo['url'],
+                'language': repo['primaryLanguage']['name'] if repo.get('primaryLanguage') else None,
+                'language_color': repo['primaryLanguage']['color'] if repo.get('primaryLanguage') else None,
+                'stars': repo['stargazerCount'],
+                'forks': repo['forkCount']
+            })
+        
+        record.summary = {
+            "total_commits": contributions['totalCommitContributions'],
+            "total_issues": contributions['totalIssueContributions'],
+            "total_pull_requests": contributions['totalPullRequestContributions'],
+            "total_reviews": contributions['totalPullRequestReviewContributions'],
+            "total_repositories": contributions['totalRepositoryContributions'],
+            "contributed_to_count": data['user']['repositoriesContributedTo']['totalCount'],
+            "commit_repositories": commit_repos,
+            "pull_request_repositories": pr_repos,
+            "contributed_repositories": contributed_repos
+        }
+        record.synced_at = record.summary_synced_at = time.time()
+        
+        return record
+
+    async def _sync_contribution_calendar(self, record: ContributionCalendar) -> bool:
+        """
+        Top up a stored calendar with the days since its last stored day
+        
+        The last stored day is fetched again because its count may have grown
+        since the previous sync; days older than the window are dropped.
+        
+        Returns:
+            True if the record was synced, False if the query failed (the
+            stored calendar is still served)
+        """
+        query = """
+        query($username: String!, $from: DateTime!) {
+            user(login: $username) {
+                contributionsCollection(from: $from) {
+                    contributionCalendar {
+                        weeks {
+                            contributionDays {
+                                contributionCount
+                                date
                                 color
                             }
-                            stargazerCount
-                            forkCount
                         }
                     }
                 }
             }
-            """
-            
-            variables = {
-                "username": username,
-                "from": from_date
-            }
-            
+        }
+        """
+        
+        since = record.end or date.today()
+        variables = {
+            "username": record.username,
+            "from": f"{since.isoformat()}T00:00:00Z"
+        }
+        
+        try:
             data = await self.execute_query(query, variables)
-            
-            if not data.get('user'):
-                raise Exception(f"User '{username}' not found")
-            
-            contributions = data['user']['contributionsCollection']
-            calendar = contributions['contributionCalendar']
-            
-            # Process calendar data
-            calendar_data = []
-            contribution_levels = defaultdict(int)
-            
-            for week in calendar['weeks']:
-                for day in week['contributionDays']:
-                    calendar_data.append({
-                        'date': day['date'],
-                        'count': day['contributionCount'],
-                        'weekday': day['weekday'],
-                        'level': self._get_contribution_level(day['contributionCount']),
-                        'color': day.get('color', '#ebedf0')
-                    })
-                    contribution_levels[day['contributionCount']] += 1
-            
-            # Calculate streaks and patterns
-            streaks = self._calculate_contribution_streaks(calendar_data)
-            patterns = self._analyze_contribution_patterns(calendar_data)
-            
-            # Process repository contributions
-            commit_repos = []
-            for repo_contrib in contributions.get('commitContributionsByRepository', []):
-                repo = repo_contrib['repository']
-                commit_repos.append({
-                    'name': repo['name'],
-                    'owner': repo['owner']['login'],
-                    'url': repo['url'],
-                    'language': repo['primaryLanguage']['name'] if repo.get('primaryLanguage') else None,
-                    'language_color': repo['primaryLanguage']['color'] if repo.get('primaryLanguage') else None,
-                    'contributions': repo_contrib['contributions']['totalCount']
-                })
-            
-            pr_repos = []
-            for repo_contrib in contributions.get('pullRequestContributionsByRepository', []):
-                repo = repo_contrib['repository']
-                pr_repos.append({
-                    'name': repo['name'],
-                    'owner': repo['owner']['login'],
-                    'url': repo['url'],
-                    'contributions': repo_contrib['contributions']['totalCount']
-                })
-            
-            # Process contributed repositories
-            contributed_repos = []
-            for repo in data['user']['repositoriesContributedTo'].get('nodes', []):
-                contributed_repos.append({
-                    'name': repo['name'],
-                    'owner': repo['owner']['login'],
-                    'url': repo['url'],
-                    'language': repo['primaryLanguage']['name'] if repo.get('primaryLanguage') else None,
-                    'language_color': repo['primaryLanguage']['color'] if repo.get('primaryLanguage') else None,
-                    'stars': repo['stargazerCount'],
-                    'forks': repo['forkCount']
-                })
-            
-            return {
-                "total_contributions": calendar['totalContributions'],
-                "total_commits": contributions['totalCommitContributions'],
-                "total_issues": contributions['totalIssueContributions'],
-                "total_pull_requests": contributions['totalPullRequestContributions'],
-                "total_reviews": contributions['totalPullRequestReviewContributions'],
-                "total_repositories": contributions['totalRepositoryContributions'],
-                "contributed_to_count": data['user']['repositoriesContributedTo']['totalCount'],
-                "calendar_data": calendar_data,
-                "contribution_streaks": streaks,
-                "contribution_patterns": patterns,
-                "contribution_levels": dict(contribution_levels),
-                "commit_repositories": commit_repos,
-                "pull_request_repositories": pr_repos,
-                "contributed_repositories": contributed_repos,
-                "data_source": "graphql",
-                "query_date": datetime.now().isoformat()
-            }
-            
+            calendar = data['user']['contributionsCollection']['contributionCalendar']
         except Exception as e:
-            logger.error(f"Failed to get contribution calendar for {username}: {e}")
-            raise Exception(f"Contribution calendar query failed: {str(e)}")
+            logger.warning(f"Incremental contribution calendar sync failed for {record.username}: {e}")
+            return False
+        
+        changed = record.merge(self._calendar_days(calendar))
+        dropped = record.trim(date.today() - timedelta(days=CALENDAR_WINDOW_DAYS))
+        record.synced_at = time.time()
+        
+        logger.debug(
+            f"Synced contribution calendar for {record.username} since {since}: "
+            f"{changed} days updated, {dropped} days dropped"
+        )
+        return True
+    
+    @staticmethod
+    def _calendar_days(calendar: Dict[str, Any]) -> List[Tuple[str, int, Optional[str]]]:
+        """Flatten GraphQL calendar weeks into (date, count, color) tuples"""
+        return [
+            (day['date'], day['contributionCount'], day.get('color'))
+            for week in calendar['weeks']
+            for day in week['contributionDays']
+        ]
+    
+    @staticmethod
+    def _calendar_response(record: ContributionCalendar) -> Dict[str, Any]:
+        """Build the calendar payload from a stored record"""
+        summary = record.summary
+        return {
+            "total_contributions": record.total_contributions,
+            "total_commits": summary.get("total_commits", 0),
+            "total_issues": summary.get("total_issues", 0),
+            "total_pull_requests": summary.get("total_pull_requests", 0),
+            "total_reviews": summary.get("total_reviews", 0),
+            "total_repositories": summary.get("total_repositories", 0),
+            "contributed_to_count": summary.get("contributed_to_count", 0),
+            "calendar_data": record.calendar_days(),
+            "contribution_streaks": record.streaks(),
+            "contribution_patterns": record.patterns(),
+            "contribution_levels": dict(record.count_days),
+            "busiest_day": record.busiest_day(),
+            "commit_repositories": summary.get("commit_repositories", []),
+            "pull_request_repositories": summary.get("pull_request_repositories", []),
+            "contributed_repositories": summary.get("contributed_repositories", []),
+            "data_source": "graphql",
+            "query_date": datetime.now().isoformat(),
+            "synced_at": datetime.fromtimestamp(record.synced_at).isoformat()
+        }
     
     async def get_repository_details(self, owner: str, name: str) -> Dict[str, Any]:
         """Get detailed repository information including PRs, issues, and relationships"""
@@ -594,121 +858,387 @@ class GitHubGraphQLClient:
         except Exception as e:
             logger.error(f"Failed to get organizations for {username}: {e}")
             raise Exception(f"Organizations query failed: {str(e)}")
-    
-    def _get_contribution_level(self, count: int) -> int:
-        """Convert contribution count to level (0-4)"""
-        if count == 0:
-            return 0
-        elif count <= 3:
-            return 1
-        elif count <= 6:
-            return 2
-        elif count <= 9:
-            return 3
-        else:
-            return 4
-    
-    def _calculate_contribution_streaks(self, calendar_data: List[Dict]) -> Dict[str, Any]:
-        """Calculate contribution streaks from calendar data"""
-        if not calendar_data:
-            return {"current_streak": 0, "longest_streak": 0, "streak_ranges": []}
-        
-        # Sort by date
-        sorted_data = sorted(calendar_data, key=lambda x: x['date'])
-        
-        current_streak = 0
-        longest_streak = 0
-        temp_streak = 0
-        streak_ranges = []
-        streak_start = None
-        
-        # Calculate streaks
-        for i, day in enumerate(sorted_data):
-            if day['count'] > 0:
-                if temp_streak == 0:
-                    streak_start = day['date']
-                temp_streak += 1
-                longest_streak = max(longest_streak, temp_streak)
-            else:
-                if temp_streak > 0:
-                    streak_ranges.append({
-                        "start": streak_start,
-                        "end": sorted_data[i-1]['date'] if i > 0 else streak_start,
-                        "length": temp_streak
-                    })
-                temp_streak = 0
-        
-        # Handle streak that continues to the end
-        if temp_streak > 0:
-            streak_ranges.append({
-                "start": streak_start,
-                "end": sorted_data[-1]['date'],
-                "length": temp_streak
-            })
-        
-        # Calculate current streak (from today backwards)
-        today = datetime.now().date()
-        for day in reversed(sorted_data):
-            day_date = datetime.fromisoformat(day['date']).date()
-            if day_date > today:
-                continue
-            if day['count'] > 0:
-                current_streak += 1
-            else:
-                break
-        
+
+    async def get_repository_snapshot(
+        self,
+        username: str,
+        max_repositories: int = 1000,
+        languages_first: int = 20,
+        topics_first: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Get a user's public repositories with languages and topics in bulk
+
+        One paginated query (100 repositories per page) replaces the REST
+        repository listing plus per-repository get_languages() / get_topics()
+        calls.
+
+        Args:
+            username: GitHub username
+            max_repositories: Stop after this many repositories
+            languages_first: Languages fetched per repository (largest first)
+            topics_first: Topics fetched per repository
+
+        Returns:
+            Repository dictionaries with REST field names plus `languages`
+            ({name: bytes}) and `topics`, most recently updated first
+        """
+        query = """
+        query($username: String!, $first: Int!, $after: String, $languagesFirst: Int!, $topicsFirst: Int!) {
+            user(login: $username) {
+                repositories(first: $first, after: $after, privacy: PUBLIC, ownerAffiliations: OWNER,
+                             orderBy: {field: UPDATED_AT, direction: DESC}) {
+                    totalCount
+                    pageInfo {
+                        hasNextPage
+                        endCursor
+                    }
+                    nodes {
+                        databaseId
+                        name
+                        nameWithOwner
+                        description
+                        url
+                        stargazerCount
+                        forkCount
+                        diskUsage
+                        createdAt
+                        updatedAt
+                        pushedAt
+                        isFork
+                        isPrivate
+                        isArchived
+                        isDisabled
+                        primaryLanguage {
+                            name
+                        }
+                        licenseInfo {
+                            name
+                            key
+                            spdxId
+                        }
+                        defaultBranchRef {
+                            name
+                        }
+                        issues(states: OPEN) {
+                            totalCount
+                        }
+                        pullRequests(states: OPEN) {
+                            totalCount
+                        }
+                        repositoryTopics(first: $topicsFirst) {
+                            nodes {
+                                topic {
+                                    name
+                                }
+                            }
+                        }
+                        languages(first: $languagesFirst, orderBy: {field: SIZE, direction: DESC}) {
+                            edges {
+                                size
+                                node {
+                                    name
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+        """
+
+        repositories = []
+        after = None
+
+        try:
+            while len(repositories) < max_repositories:
+                variables = {
+                    "username": username,
+                    "first": min(100, max_repositories - len(repositories)),
+                    "after": after,
+                    "languagesFirst": languages_first,
+                    "topicsFirst": topics_first
+                }
+                data = await self.execute_query(query, variables)
+
+                if not data.get('user'):
+                    raise Exception(f"User '{username}' not found")
+
+                page = data['user']['repositories']
+                repositories.extend(self._snapshot_repository(node) for node in page['nodes'])
+
+                if not page['pageInfo']['hasNextPage']:
+                    break
+                after = page['pageInfo']['endCursor']
+
+            logger.debug(f"Repository snapshot for {username}: {len(repositories)} repositories")
+            return repositories
+
+        except Exception as e:
+            logger.error(f"Failed to get repository snapshot for {username}: {e}")
+            raise Exception(f"Repository snapshot query failed: {str(e)}")
+
+    @staticmethod
+    def _snapshot_repository(node: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a GraphQL repository node to REST field names"""
+        url = node.get('url')
+        license_info = node.get('licenseInfo')
+
         return {
-            "current_streak": current_streak,
-            "longest_streak": longest_streak,
-            "streak_ranges": sorted(streak_ranges, key=lambda x: x['length'], reverse=True)[:10]
+            "id": node.get('databaseId'),
+            "name": node['name'],
+            "full_name": node.get('nameWithOwner'),
+            "description": node.get('description'),
+            "language": (node.get('primaryLanguage') or {}).get('name'),
+            "stargazers_count": node.get('stargazerCount', 0),
+            "forks_count": node.get('forkCount', 0),
+            # REST watchers_count mirrors the star count
+            "watchers_count": node.get('stargazerCount', 0),
+            "size": node.get('diskUsage') or 0,
+            "created_at": _parse_github_datetime(node.get('createdAt')),
+            "updated_at": _parse_github_datetime(node.get('updatedAt')),
+            "pushed_at": _parse_github_datetime(node.get('pushedAt')),
+            "html_url": url,
+            "clone_url": f"{url}.git" if url else None,
+            "private": node.get('isPrivate', False),
+            "fork": node.get('isFork', False),
+            "archived": node.get('isArchived', False),
+            "disabled": node.get('isDisabled', False),
+            "topics": [
+                topic_node['topic']['name']
+                for topic_node in (node.get('repositoryTopics') or {}).get('nodes', [])
+            ],
+            "languages": {
+                edge['node']['name']: edge['size']
+                for edge in (node.get('languages') or {}).get('edges', [])
+            },
+            "license": {
+                "name": license_info.get('name'),
+                "key": license_info.get('key') or (license_info.get('spdxId') or '').lower() or None
+            } if license_info else None,
+            "default_branch": (node.get('defaultBranchRef') or {}).get('name'),
+            # REST open_issues_count includes open pull requests
+            "open_issues_count": (
+                (node.get('issues') or {}).get('totalCount', 0)
+                + (node.get('pullRequests') or {}).get('totalCount', 0)
+            )
         }
-    
-    def _analyze_contribution_patterns(self, calendar_data: List[Dict]) -> Dict[str, Any]:
-        """Analyze contribution patterns by day of week and time periods"""
-        if not calendar_data:
-            return {}
-        
-        weekday_contributions = defaultdict(int)
-        weekday_counts = defaultdict(int)
-        monthly_contributions = defaultdict(int)
-        
-        for day in calendar_data:
-            date_obj = datetime.fromisoformat(day['date']).date()
-            weekday = date_obj.weekday()  # 0 = Monday, 6 = Sunday
-            month_key = date_obj.strftime('%Y-%m')
-            
-            weekday_contributions[weekday] += day['count']
-            weekday_counts[weekday] += 1
-            monthly_contributions[month_key] += day['count']
-        
-        # Calculate average contributions per weekday
-        weekday_averages = {}
-        weekday_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        
-        for weekday in range(7):
-            if weekday_counts[weekday] > 0:
-                weekday_averages[weekday_names[weekday]] = round(
-                    weekday_contributions[weekday] / weekday_counts[weekday], 2
+
+    async def get_repository_activity(
+        self,
+        repositories: List[str],
+        username: Optional[str] = None,
+        items_first: int = 50,
+        details: bool = False,
+        batch_size: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Get pull request and issue counts plus recent items for many repositories
+
+        Each query covers batch_size repositories as aliased `repository`
+        fields: exact open/closed/merged counts come from
+        `pullRequests(states: ...) { totalCount }` and
+        `issues(states: ...) { totalCount }`, and the most recently updated
+        items ride along in the same round trip. With a username the first
+        query also carries aliased `search(type: ISSUE)` counts of the pull
+        requests and issues that user authored anywhere on GitHub. This
+        replaces the per-repository REST listings the scanners paged through.
+        Repositories GitHub cannot resolve (deleted, renamed, inaccessible) are
+        left out without failing the rest of their batch.
+
+        Args:
+            repositories: Repository full names ("owner/name")
+            username: Also count pull requests and issues authored by this user
+            items_first: Recent pull requests and issues fetched per repository
+                (0 fetches counts only)
+            details: Include bodies, changed file paths, reviews, comments,
+                assignees and milestones of the recent items
+            batch_size: Repositories per query
+
+        Returns:
+            Dictionary with `repositories` ({full_name: {"pull_requests": ...,
+            "issues": ...}}) and `user` (authored counts, or None); counts use
+            GraphQL states, so "closed" pull requests exclude merged ones, and
+            items use REST field names
+        """
+        activity = {}
+        user_counts = None
+
+        try:
+            batches = [
+                repositories[i:i + batch_size] for i in range(0, len(repositories), batch_size)
+            ] or [[]]
+            for batch_index, batch in enumerate(batches):
+                count_user = username is not None and batch_index == 0
+                if not batch and not count_user:
+                    continue
+
+                query, variables = self._repository_activity_query(
+                    batch, username if count_user else None, items_first, details
                 )
-            else:
-                weekday_averages[weekday_names[weekday]] = 0
-        
-        # Find most active day
-        most_active_day = max(weekday_averages.items(), key=lambda x: x[1])
-        
-        # Calculate monthly trends
-        monthly_trends = dict(monthly_contributions)
-        
+                # A missing or inaccessible repository fails only its own alias
+                data = await self.execute_query(query, variables, allow_partial=True)
+
+                for index, full_name in enumerate(batch):
+                    node = data.get(f'repository{index}')
+                    if node:
+                        activity[full_name] = self._repository_activity(node)
+
+                if count_user:
+                    user_counts = {"pull_requests": {}, "issues": {}}
+                    for alias, (section, key, _) in USER_ACTIVITY_SEARCHES.items():
+                        user_counts[section][key] = (data.get(alias) or {}).get('issueCount', 0)
+
+            logger.debug(
+                f"Repository activity for {len(activity)} repositories in {len(batches)} queries"
+            )
+            return {
+                "repositories": activity,
+                "user": user_counts,
+                "data_source": "graphql",
+                "query_date": datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            logger.error(f"Failed to get repository activity: {e}")
+            raise Exception(f"Repository activity query failed: {str(e)}")
+
+    @staticmethod
+    def _repository_activity_query(
+        repositories: List[str],
+        username: Optional[str],
+        items_first: int,
+        details: bool
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build one aliased activity query for a batch of repositories"""
+        declarations = []
+        selections = []
+        variables = {}
+        fragments = ""
+
+        # GraphQL rejects unused variables and fragments
+        if repositories:
+            declarations = ["$itemsFirst: Int!", "$withItems: Boolean!", "$details: Boolean!"]
+            variables = {"itemsFirst": items_first, "withItems": items_first > 0, "details": details}
+            fragments = REPOSITORY_ACTIVITY_FRAGMENTS
+
+        for index, full_name in enumerate(repositories):
+            owner, name = full_name.split('/', 1)
+            declarations.extend([f"$owner{index}: String!", f"$name{index}: String!"])
+            selections.append(
+                f"repository{index}: repository(owner: $owner{index}, name: $name{index}) {{ ...RepositoryActivity }}"
+            )
+            variables[f"owner{index}"] = owner
+            variables[f"name{index}"] = name
+
+        if username is not None:
+            for alias, (_, _, qualifiers) in USER_ACTIVITY_SEARCHES.items():
+                declarations.append(f"${alias}: String!")
+                selections.append(f"{alias}: search(query: ${alias}, type: ISSUE) {{ issueCount }}")
+                variables[alias] = f"{qualifiers} author:{username}"
+
+        query = (
+            f"query({', '.join(declarations)}) {{\n    "
+            + "\n    ".join(selections)
+            + "\n}\n"
+            + fragments
+        )
+        return query, variables
+
+    @classmethod
+    def _repository_activity(cls, node: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert an aliased repository activity node to counts and REST-style items"""
+        def total(field: str) -> int:
+            return (node.get(field) or {}).get('totalCount', 0)
+
         return {
-            "weekday_averages": weekday_averages,
-            "most_active_day": {
-                "day": most_active_day[0],
-                "average_contributions": most_active_day[1]
+            "pull_requests": {
+                "total": total('pullRequests'),
+                "open": total('openPullRequests'),
+                "closed": total('closedPullRequests'),
+                "merged": total('mergedPullRequests'),
+                "items": [
+                    cls._rest_pull_request(pr)
+                    for pr in (node.get('recentPullRequests') or {}).get('nodes', [])
+                ]
             },
-            "monthly_trends": monthly_trends,
-            "total_active_days": len([day for day in calendar_data if day['count'] > 0]),
-            "total_days": len(calendar_data)
+            "issues": {
+                "total": total('issues'),
+                "open": total('openIssues'),
+                "closed": total('closedIssues'),
+                "items": [
+                    cls._rest_issue(issue)
+                    for issue in (node.get('recentIssues') or {}).get('nodes', [])
+                ]
+            }
+        }
+
+    @staticmethod
+    def _rest_pull_request(node: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a GraphQL pull request node to REST field names"""
+        pull_request = {
+            "number": node.get('number'),
+            "title": node.get('title'),
+            # REST reports merged pull requests as closed
+            "state": 'open' if node.get('state') == 'OPEN' else 'closed',
+            "merged": node.get('merged', False),
+            "user": {"login": (node.get('author') or {}).get('login', 'ghost')},
+            "created_at": node.get('createdAt'),
+            "updated_at": node.get('updatedAt'),
+            "closed_at": node.get('closedAt'),
+            "merged_at": node.get('mergedAt'),
+            "html_url": node.get('url'),
+            "additions": node.get('additions', 0),
+            "deletions": node.get('deletions', 0),
+            "changed_files": node.get('changedFiles', 0),
+            "commits": (node.get('commits') or {}).get('totalCount', 0),
+            "labels": [{"name": label['name']} for label in (node.get('labels') or {}).get('nodes', [])]
+        }
+        if 'body' in node:
+            reviews = node.get('reviews') or {}
+            pull_request.update({
+                "body": node.get('body'),
+                "files": [file['path'] for file in (node.get('files') or {}).get('nodes', [])],
+                "review_count": reviews.get('totalCount', 0),
+                "reviews": [
+                    {
+                        "user": {"login": (review.get('author') or {}).get('login', 'ghost')},
+                        "state": review.get('state'),
+                        "submitted_at": review.get('submittedAt')
+                    }
+                    for review in reviews.get('nodes', [])
+                ],
+                "comments": (node.get('comments') or {}).get('totalCount', 0)
+            })
+        return pull_request
+
+    @staticmethod
+    def _rest_issue(node: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a GraphQL issue node to REST field names"""
+        issue = {
+            "number": node.get('number'),
+            "title": node.get('title'),
+            "state": (node.get('state') or 'OPEN').lower(),
+            "user": {"login": (node.get('author') or {}).get('login', 'ghost')},
+            "created_at": node.get('createdAt'),
+            "updated_at": node.get('updatedAt'),
+            "closed_at": node.get('closedAt'),
+            "html_url": node.get('url'),
+            "labels": [{"name": label['name']} for label in (node.get('labels') or {}).get('nodes', [])]
         }
+        if 'body' in node:
+            milestone = node.get('milestone')
+            issue.update({
+                "body": node.get('body'),
+                "assignees": [{"login": user['login']} for user in (node.get('assignees') or {}).get('nodes', [])],
+                "milestone": {"title": milestone['title']} if milestone else None,
+                "comments": (node.get('comments') or {}).get('totalCount', 0)
+            })
+        return issue
+
+    def _get_contribution_level(self, count: int) -> int:
+        """Convert contribution count to level (0-4)"""
+        return contribution_level(count)
     
     async def _check_rate_limit(self):
         """Check and handle GraphQL API rate limits"""
@@ -728,5 +1258,8 @@ class GitHubGraphQLClient:
             if 'X-RateLimit-Reset' in response.headers:
                 reset_timestamp = int(response.headers['X-RateLimit-Reset'])
                 self.rate_limit_reset = datetime.fromtimestamp(reset_timestamp)
+
+            # Share the quota with the concurrent fetcher's worker scaling
+            concurrent_fetcher.rate_limiter.update_limits('github_graphql', response.headers)
         except (ValueError, KeyError) as e:
             logger.debug(f"Could not parse rate limit headers: {e}")
\ No newline at end of file
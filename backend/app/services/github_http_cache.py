@@ -0,0 +1,279 @@
+"""
+GitHub HTTP Response Cache
+Conditional-request (ETag / Last-Modified) cache shared by the GitHub REST clients
+
+GitHub does not count `304 Not Modified` responses against the rate limit, so
+re-scans that revalidate unchanged users, repositories, languages and trees
+cost almost nothing in quota or latency.
+
+Entries (validators + JSON body) live in a small in-process LRU backed by
+Redis (via CacheService) or, when Redis is unavailable, an optional on-disk
+directory.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from app.core.config import settings
+from app.services.cache_service import cache_service
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "github_http"
+
+_MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+
+@dataclass
+class CachedResponse:
+    """A cached GitHub response with its validators"""
+    url: str
+    body: Any
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    stored_at: float = 0.0
+    max_age: int = 0
+
+    def is_fresh(self) -> bool:
+        """Whether the entry can be served without revalidation (Cache-Control max-age)"""
+        return self.max_age > 0 and time.time() - self.stored_at < self.max_age
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers that turn the next request into a conditional request"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class GitHubHTTPCache:
+    """
+    Shared ETag/Last-Modified cache for GitHub GET requests
+
+    Usage from a client's request method:
+        key, cached = await github_http_cache.lookup(url, params, token)
+        if cached and cached.is_fresh():
+            return github_http_cache.serve_fresh(cached)
+        headers.update(cached.conditional_headers() if cached else {})
+        ... send request ...
+        if status == 304 and cached:
+            return await github_http_cache.revalidated(key, cached, response_headers)
+        if status == 200:
+            await github_http_cache.store(key, url, response_headers, body)
+
+    Counters:
+        hits: served from cache without a request (within max-age)
+        not_modified: revalidated with a 304 (free against the rate limit)
+        misses: full 200 responses downloaded
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        ttl_seconds: int = 7 * 24 * 3600,
+        max_memory_entries: int = 2048,
+        cache_dir: Optional[str] = None,
+        respect_max_age: bool = True,
+        redis_cache=None
+    ):
+        """
+        Initialize the HTTP cache
+
+        Args:
+            enabled: Disable to make every lookup a miss
+            ttl_seconds: How long validators are kept in Redis/on disk
+            max_memory_entries: Size of the in-process LRU
+            cache_dir: Directory for on-disk entries when Redis is unavailable
+            respect_max_age: Serve entries within Cache-Control max-age without revalidating
+            redis_cache: CacheService instance (defaults to the global one)
+        """
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.cache_dir = cache_dir
+        self.respect_max_age = respect_max_age
+        self.redis_cache = redis_cache if redis_cache is not None else cache_service
+        self._memory: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self.stats = {"hits": 0, "not_modified": 0, "misses": 0, "stores": 0, "errors": 0}
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Mapping[str, Any]] = None, token: Optional[str] = None) -> str:
+        """
+        Build a cache key for a GET request
+
+        The token is hashed into the key because GitHub varies responses
+        (private repositories, permissions) by credentials.
+        """
+        query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        token_hash = hashlib.sha256((token or "").encode()).hexdigest()[:16]
+        return hashlib.sha256(f"{url}?{query}|{token_hash}".encode()).hexdigest()
+
+    async def lookup(
+        self,
+        url: str,
+        params: Optional[Mapping[str, Any]] = None,
+        token: Optional[str] = None
+    ) -> Tuple[str, Optional[CachedResponse]]:
+        """
+        Find the cached response for a request
+
+        Returns:
+            Tuple of (cache key, cached response or None)
+        """
+        key = self.make_key(url, params, token)
+        if not self.enabled:
+            return key, None
+
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return key, entry
+
+        entry = await self._load(key)
+        if entry is not None:
+            self._remember(key, entry)
+        return key, entry
+
+    def serve_fresh(self, entry: CachedResponse) -> Any:
+        """Count and return a body served without any request"""
+        self.stats["hits"] += 1
+        return entry.body
+
+    async def revalidated(self, key: str, entry: CachedResponse, headers: Mapping[str, str]) -> Any:
+        """
+        Handle a 304 Not Modified: refresh the entry and return the cached body
+        """
+        self.stats["not_modified"] += 1
+        entry.stored_at = time.time()
+        entry.max_age = self._max_age(headers)
+        entry.etag = headers.get("ETag") or entry.etag
+        entry.last_modified = headers.get("Last-Modified") or entry.last_modified
+        self._remember(key, entry)
+        await self._save(key, entry)
+        return entry.body
+
+    async def store(self, key: str, url: str, headers: Mapping[str, str], body: Any) -> None:
+        """
+        Record a full 200 response; stored only when GitHub sent validators
+        """
+        self.stats["misses"] += 1
+        if not self.enabled:
+            return
+
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        entry = CachedResponse(
+            url=url,
+            body=body,
+            etag=etag,
+            last_modified=last_modified,
+            stored_at=time.time(),
+            max_age=self._max_age(headers)
+        )
+        self._remember(key, entry)
+        await self._save(key, entry)
+        self.stats["stores"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters plus hit ratio (hits and 304s over all lookups that reached a decision)"""
+        total = self.stats["hits"] + self.stats["not_modified"] + self.stats["misses"]
+        served = self.stats["hits"] + self.stats["not_modified"]
+        return {
+            **self.stats,
+            "memory_entries": len(self._memory),
+            "backend": self._backend_name(),
+            "hit_ratio": round(served / total, 3) if total else 0.0
+        }
+
+    def reset_stats(self) -> None:
+        for name in self.stats:
+            self.stats[name] = 0
+
+    def clear_memory(self) -> None:
+        self._memory.clear()
+
+    def _max_age(self, headers: Mapping[str, str]) -> int:
+        if not self.respect_max_age:
+            return 0
+        match = _MAX_AGE_PATTERN.search(headers.get("Cache-Control") or "")
+        return int(match.group(1)) if match else 0
+
+    def _remember(self, key: str, entry: CachedResponse) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _backend_name(self) -> str:
+        if self.redis_cache is not None and self.redis_cache.redis_client is not None:
+            return "redis"
+        if self.cache_dir:
+            return "disk"
+        return "memory"
+
+    async def _load(self, key: str) -> Optional[CachedResponse]:
+        backend = self._backend_name()
+        try:
+            if backend == "redis":
+                data = await self.redis_cache.get(key, prefix=CACHE_PREFIX)
+            elif backend == "disk":
+                path = os.path.join(self.cache_dir, f"{key}.json")
+                if not os.path.exists(path) or time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                    return None
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            else:
+                return None
+            return CachedResponse(**data) if isinstance(data, dict) else None
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"GitHub HTTP cache read failed: {e}")
+            return None
+
+    async def _save(self, key: str, entry: CachedResponse) -> None:
+        backend = self._backend_name()
+        try:
+            if backend == "redis":
+                await self.redis_cache.set(key, asdict(entry), prefix=CACHE_PREFIX, ttl=self.ttl_seconds)
+            elif backend == "disk":
+                path = os.path.join(self.cache_dir, f"{key}.json")
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(asdict(entry), f)
+                os.replace(tmp_path, path)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"GitHub HTTP cache write failed: {e}")
+
+
+# Global GitHub HTTP cache instance
+github_http_cache = GitHubHTTPCache(
+    enabled=settings.github_http_cache_enabled,
+    ttl_seconds=settings.github_http_cache_ttl,
+    cache_dir=settings.github_http_cache_dir
+)
+
+
+def configure_scoring_http_cache() -> None:
+    """Make github_http_cache the default cache of the scoring package's REST client"""
+    try:
+        from backend.scoring.github.http_cache import set_http_cache
+    except ImportError:
+        logger.debug("Scoring package not importable, its REST client stays uncached")
+        return
+    set_http_cache(github_http_cache)
@@ -1,13 +1,15 @@
 import asyncio
 import time
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 from github import Github, GithubException, RateLimitExceededException
 import base64
 import re
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+from app.core.config import settings
+
 logger = logging.getLogger(__name__)
 
 class GitHubAPIError(Exception):
@@ -152,7 +154,7 @@ class GitHubRateLimiter:
                     additional_wait = min(30 * (1.5 ** self.consecutive_rate_limits), self.max_wait_time)
                     total_wait = min(wait_time + additional_wait, self.max_wait_time)
                     
-                    logger.warning(f"GitHub API rate limit reached. Waiting {total_wait:.2f} seconds (serverless-optimized, attempt #{self.consecutive_rate_limits})")
+                    logger.warning("GitHub API rate limit reached. Waiting %.2f seconds (serverless-optimized, attempt #%s)", total_wait, self.consecutive_rate_limits)
                     
                     if progress_callback:
                         await progress_callback(f"Rate limit reached - waiting {total_wait:.0f} seconds")
@@ -178,7 +180,7 @@ class GitHubRateLimiter:
             
             if len(recent_requests) >= requests_per_minute:
                 wait_time = min(60 - (now - recent_requests[0]) + 1, 60)  # Max 1 minute wait
-                logger.warning(f"Serverless rate limit reached, waiting {wait_time:.2f} seconds")
+                logger.warning("Serverless rate limit reached, waiting %.2f seconds", wait_time)
                 
                 if progress_callback:
                     await progress_callback(f"Rate limit protection - waiting {wait_time:.0f} seconds")
@@ -212,13 +214,14 @@ class GitHubScanner:
             # Initialize with timeout and retry settings for serverless
             self.github = Github(
                 self.github_token, 
+                base_url=settings.github_api_url,
                 per_page=100,
                 timeout=30,  # 30 second timeout for serverless
                 retry=3      # Retry failed requests
             )
             logger.info("GitHub client initialized successfully")
         except Exception as e:
-            logger.error(f"Failed to initialize GitHub client: {e}")
+            logger.error("Failed to initialize GitHub client: %s", e)
             raise
     
     async def _validate_token(self):
@@ -230,13 +233,13 @@ class GitHubScanner:
             await self.rate_limiter.wait_if_needed()
             self.user = self.github.get_user()
             self._token_validated = True
-            logger.info(f"GitHub token validated for user: {self.user.login}")
+            logger.info("GitHub token validated for user: %s", self.user.login)
         except GithubException as e:
             github_error = self.error_handler.classify_github_exception(e)
-            logger.error(f"GitHub token validation failed: {github_error.user_friendly_message}")
+            logger.error("GitHub token validation failed: %s", github_error.user_friendly_message)
             raise Exception(f"GitHub authentication failed: {github_error.user_friendly_message}")
         except Exception as e:
-            logger.error(f"Failed to validate GitHub token: {e}")
+            logger.error("Failed to validate GitHub token: %s", e)
             raise Exception("GitHub authentication failed")
     
     async def refresh_token_if_needed(self):
@@ -246,7 +249,7 @@ class GitHubScanner:
             # For now, we'll just validate the current token
             await self._validate_token()
         except Exception as e:
-            logger.error(f"Token refresh/validation failed: {e}")
+            logger.error("Token refresh/validation failed: %s", e)
             raise
     
     async def handle_rate_limit_response(self, response_headers: dict):
@@ -257,9 +260,9 @@ class GitHubScanner:
                 reset_timestamp = int(response_headers.get('X-RateLimit-Reset', 0))
                 self.rate_limiter.update_rate_limit_info(remaining, reset_timestamp)
                 
-                logger.debug(f"Rate limit info updated: {remaining} requests remaining, resets at {reset_timestamp}")
+                logger.debug("Rate limit info updated: %s requests remaining, resets at %s", remaining, reset_timestamp)
         except (ValueError, KeyError) as e:
-            logger.warning(f"Could not parse rate limit headers: {e}")
+            logger.warning("Could not parse rate limit headers: %s", e)
     
     def get_rate_limit_status(self) -> Dict[str, Any]:
         """Get current rate limit status for monitoring"""
@@ -303,13 +306,13 @@ class GitHubScanner:
             start_timestamp = datetime.now().isoformat()
             
             # Log operation start with timestamp
-            logger.info(f"🚀 Starting repository fetch for user: {username}")
-            logger.info(f"   Timestamp: {start_timestamp}")
-            logger.info(f"   Parameters: max_display={max_display_repos}, include_forks={include_forks}")
+            logger.info("🚀 Starting repository fetch for user: %s", username)
+            logger.info("   Timestamp: %s", start_timestamp)
+            logger.info("   Parameters: max_display=%s, include_forks=%s", max_display_repos, include_forks)
             
             # Validate token first
             await self._validate_token()
-            logger.debug(f"Token validated successfully for {username}")
+            logger.debug("Token validated successfully for %s", username)
             
             await self.rate_limiter.wait_if_needed()
             user = self.github.get_user(username)
@@ -337,19 +340,19 @@ class GitHubScanner:
                 
                 # Apply display limit (max 35 repos returned)
                 if repo_count >= max_display_repos:
-                    logger.debug(f"Reached display limit of {max_display_repos} repositories")
+                    logger.debug("Reached display limit of %s repositories", max_display_repos)
                     break
                 
                 # Skip forks (always excluded per requirements)
                 if repo.fork:
                     skipped_forks += 1
-                    logger.debug(f"Skipping forked repository: {repo.name}")
+                    logger.debug("Skipping forked repository: %s", repo.name)
                     continue
                 
                 # Skip private repos (they shouldn't be in public list, but double-check)
                 if repo.private:
                     skipped_private += 1
-                    logger.debug(f"Skipping private repository: {repo.name}")
+                    logger.debug("Skipping private repository: %s", repo.name)
                     continue
                 
                 # Use retry logic with graceful degradation
@@ -375,7 +378,7 @@ class GitHubScanner:
                         "repository": repo.name,
                         "errors": errors
                     })
-                    logger.warning(f"Repository {repo.name} processed with errors: {errors}")
+                    logger.warning("Repository %s processed with errors: %s", repo.name, errors)
                 
                 repositories.append(repo_data)
                 repo_count += 1
@@ -388,11 +391,11 @@ class GitHubScanner:
                 
                 # Periodic progress logging every 10 repos
                 if repo_count % 10 == 0:
-                    logger.info(f"   Progress: {repo_count} repos processed")
+                    logger.info("   Progress: %s repos processed", repo_count)
                     # Log rate limit status
                     rate_limit_info = self.rate_limiter.rate_limit_remaining
                     if rate_limit_info is not None:
-                        logger.debug(f"   Rate limit: {rate_limit_info} requests remaining")
+                        logger.debug("   Rate limit: %s requests remaining", rate_limit_info)
             
             # Calculate statistics
             complete_data_count = sum(1 for repo in repositories if repo.get('has_complete_data', False))
@@ -414,23 +417,23 @@ class GitHubScanner:
             
             # Comprehensive summary logging
             logger.info("=" * 70)
-            logger.info(f"✅ Repository fetch completed for {username}")
+            logger.info("✅ Repository fetch completed for %s", username)
             logger.info(f"   📊 Summary:")
-            logger.info(f"      • Total found: {total_found} repositories")
-            logger.info(f"      • Excluded: {skipped_forks} forks, {skipped_private} private")
-            logger.info(f"      • Returned: {len(repositories)} repositories")
-            logger.info(f"      • Complete data: {complete_data_count}, Partial data: {partial_data_count}")
+            logger.info("      • Total found: %s repositories", total_found)
+            logger.info("      • Excluded: %s forks, %s private", skipped_forks, skipped_private)
+            logger.info("      • Returned: %s repositories", len(repositories))
+            logger.info("      • Complete data: %s, Partial data: %s", complete_data_count, partial_data_count)
             logger.info(f"   ⏱️  Performance:")
-            logger.info(f"      • Duration: {fetch_duration:.2f} seconds")
-            logger.info(f"      • API calls: ~{api_calls_made}")
-            logger.info(f"      • Avg time per repo: {fetch_duration/max(len(repositories), 1):.2f}s")
+            logger.info("      • Duration: %.2f seconds", fetch_duration)
+            logger.info("      • API calls: ~%s", api_calls_made)
+            logger.info("      • Avg time per repo: %.2fs", fetch_duration/max(len(repositories), 1))
             
             if repo_errors:
                 error_summary = metadata["errors"]
                 logger.warning(f"   ⚠️  Errors encountered:")
-                logger.warning(f"      • Repositories with errors: {error_summary['repositories_with_errors']}")
-                logger.warning(f"      • Total errors: {error_summary['total_errors']}")
-                logger.warning(f"      • Error types: {error_summary['error_types']}")
+                logger.warning("      • Repositories with errors: %s", error_summary['repositories_with_errors'])
+                logger.warning("      • Total errors: %s", error_summary['total_errors'])
+                logger.warning("      • Error types: %s", error_summary['error_types'])
             
             logger.info("=" * 70)
             
@@ -446,14 +449,14 @@ class GitHubScanner:
             
         except GithubException as e:
             github_error = self.error_handler.classify_github_exception(e)
-            logger.error(f"GitHub API error for user {username}: {github_error.user_friendly_message}")
+            logger.error("GitHub API error for user %s: %s", username, github_error.user_friendly_message)
             raise Exception(github_error.user_friendly_message)
         except Exception as e:
             if "network" in str(e).lower() or "connection" in str(e).lower():
                 network_error = self.error_handler.handle_network_error(e)
                 raise Exception(network_error.user_friendly_message)
             else:
-                logger.error(f"Error fetching repositories for {username}: {e}")
+                logger.error("Error fetching repositories for %s: %s", username, e)
                 raise Exception(f"Failed to fetch repositories: {str(e)}")
     
     def _get_basic_repository_data(self, repo) -> Dict[str, Any]:
@@ -522,7 +525,7 @@ class GitHubScanner:
                 "has_tests": False,
             }
         except Exception as e:
-            logger.error(f"Error extracting basic data for repository {repo.name if hasattr(repo, 'name') else 'unknown'}: {e}")
+            logger.error("Error extracting basic data for repository %s: %s", repo.name if hasattr(repo, 'name') else 'unknown', e)
             # Return absolute minimum data structure
             return {
                 "id": getattr(repo, 'id', 0),
@@ -588,24 +591,24 @@ class GitHubScanner:
                 detailed_data = await self._extract_repository_data(repo)
                 
                 # Success - return detailed data
-                logger.debug(f"Successfully extracted detailed data for {repo.name} on attempt {attempt + 1}")
+                logger.debug("Successfully extracted detailed data for %s on attempt %s", repo.name, attempt + 1)
                 return detailed_data, True, []
                 
             except RateLimitExceededException as e:
                 error_msg = f"Rate limit exceeded (attempt {attempt + 1}/{max_retries + 1})"
-                logger.warning(f"{error_msg} for repository {repo.name}")
+                logger.warning("%s for repository %s", error_msg, repo.name)
                 errors.append(error_msg)
                 
                 # If we have retries left, wait with exponential backoff
                 if attempt < max_retries:
                     # Exponential backoff: 60s, 120s, 300s (max)
                     wait_time = min(60 * (2 ** attempt), 300)
-                    logger.info(f"Waiting {wait_time}s before retry for {repo.name}")
+                    logger.info("Waiting %ss before retry for %s", wait_time, repo.name)
                     await asyncio.sleep(wait_time)
                     continue
                 else:
                     # No more retries - fall back to basic data
-                    logger.warning(f"Rate limit exceeded after {max_retries + 1} attempts for {repo.name}, using basic data")
+                    logger.warning("Rate limit exceeded after %s attempts for %s, using basic data", max_retries + 1, repo.name)
                     break
                     
             except GithubException as e:
@@ -613,18 +616,18 @@ class GitHubScanner:
                 if e.status in [403, 404]:
                     # Permission or not found errors - don't retry
                     error_msg = f"Access denied or not found: {e.status}"
-                    logger.warning(f"{error_msg} for repository {repo.name}")
+                    logger.warning("%s for repository %s", error_msg, repo.name)
                     errors.append(error_msg)
                     break
                 elif e.status >= 500:
                     # Server errors - retry with backoff
                     error_msg = f"GitHub server error: {e.status} (attempt {attempt + 1}/{max_retries + 1})"
-                    logger.warning(f"{error_msg} for repository {repo.name}")
+                    logger.warning("%s for repository %s", error_msg, repo.name)
                     errors.append(error_msg)
                     
                     if attempt < max_retries:
                         wait_time = min(30 * (2 ** attempt), 120)  # Shorter backoff for server errors
-                        logger.info(f"Waiting {wait_time}s before retry for {repo.name}")
+                        logger.info("Waiting %ss before retry for %s", wait_time, repo.name)
                         await asyncio.sleep(wait_time)
                         continue
                     else:
@@ -632,19 +635,19 @@ class GitHubScanner:
                 else:
                     # Other GitHub API errors - don't retry
                     error_msg = f"GitHub API error: {e.status} - {str(e)}"
-                    logger.warning(f"{error_msg} for repository {repo.name}")
+                    logger.warning("%s for repository %s", error_msg, repo.name)
                     errors.append(error_msg)
                     break
                     
             except (ConnectionError, TimeoutError) as e:
                 # Network errors - retry once
                 error_msg = f"Network error: {type(e).__name__} (attempt {attempt + 1}/{max_retries + 1})"
-                logger.warning(f"{error_msg} for repository {repo.name}")
+                logger.warning("%s for repository %s", error_msg, repo.name)
                 errors.append(error_msg)
                 
                 if attempt < max_retries:
                     wait_time = 30  # Fixed 30s wait for network errors
-                    logger.info(f"Waiting {wait_time}s before retry for {repo.name}")
+                    logger.info("Waiting %ss before retry for %s", wait_time, repo.name)
                     await asyncio.sleep(wait_time)
                     continue
                 else:
@@ -653,12 +656,12 @@ class GitHubScanner:
             except Exception as e:
                 # Unexpected errors - don't retry
                 error_msg = f"Unexpected error: {type(e).__name__} - {str(e)}"
-                logger.error(f"{error_msg} for repository {repo.name}")
+                logger.error("%s for repository %s", error_msg, repo.name)
                 errors.append(error_msg)
                 break
         
         # All retries failed or non-retryable error - fall back to basic data
-        logger.info(f"Falling back to basic data for {repo.name} due to errors: {errors}")
+        logger.info("Falling back to basic data for %s due to errors: %s", repo.name, errors)
         basic_data = self._get_basic_repository_data(repo)
         return basic_data, False, errors
     
@@ -743,7 +746,7 @@ class GitHubScanner:
                 await self.rate_limiter.wait_if_needed()
                 languages = repo.get_languages()
             except Exception as e:
-                logger.warning(f"Could not fetch languages for {repo.name}: {e}")
+                logger.warning("Could not fetch languages for %s: %s", repo.name, e)
             
             # Get topics
             topics = []
@@ -751,7 +754,7 @@ class GitHubScanner:
                 await self.rate_limiter.wait_if_needed()
                 topics = list(repo.get_topics())
             except Exception as e:
-                logger.warning(f"Could not fetch topics for {repo.name}: {e}")
+                logger.warning("Could not fetch topics for %s: %s", repo.name, e)
             
             # Get commit count (approximate)
             commit_count = 0
@@ -760,7 +763,7 @@ class GitHubScanner:
                 commits = repo.get_commits()
                 commit_count = commits.totalCount if hasattr(commits, 'totalCount') else 0
             except Exception as e:
-                logger.warning(f"Could not fetch commit count for {repo.name}: {e}")
+                logger.warning("Could not fetch commit count for %s: %s", repo.name, e)
             
             # Get contributor count
             contributor_count = 0
@@ -769,7 +772,7 @@ class GitHubScanner:
                 contributors = repo.get_contributors()
                 contributor_count = contributors.totalCount if hasattr(contributors, 'totalCount') else 0
             except Exception as e:
-                logger.warning(f"Could not fetch contributor count for {repo.name}: {e}")
+                logger.warning("Could not fetch contributor count for %s: %s", repo.name, e)
             
             # Check for important files
             has_readme = self._check_file_exists(repo, ['README.md', 'README.rst', 'README.txt', 'readme.md'])
@@ -814,7 +817,7 @@ class GitHubScanner:
             return repo_data
             
         except Exception as e:
-            logger.error(f"Error extracting data for repository {repo.name}: {e}")
+            logger.error("Error extracting data for repository %s: %s", repo.name, e)
             # Return minimal data if detailed extraction fails
             return {
                 "id": repo.id,
@@ -882,7 +885,7 @@ class GitHubScanner:
             return analysis
             
         except Exception as e:
-            logger.error(f"Error analyzing repository {repo_full_name}: {e}")
+            logger.error("Error analyzing repository %s: %s", repo_full_name, e)
             raise Exception(f"Repository analysis failed: {e}")
     
     async def _analyze_code_metrics(self, repo) -> Dict[str, Any]:
@@ -924,12 +927,12 @@ class GitHubScanner:
                             if self._is_code_file(content.name):
                                 metrics["code_files"] += 1
             except Exception as e:
-                logger.warning(f"Could not analyze repository structure: {e}")
+                logger.warning("Could not analyze repository structure: %s", e)
             
             return metrics
             
         except Exception as e:
-            logger.warning(f"Error analyzing code metrics: {e}")
+            logger.warning("Error analyzing code metrics: %s", e)
             return {}
     
     async def _analyze_commit_history(self, repo, limit: int = 100) -> Dict[str, Any]:
@@ -979,7 +982,7 @@ class GitHubScanner:
                         total_deletions += commit.stats.deletions
                 
                 except Exception as e:
-                    logger.warning(f"Error analyzing commit {commit.sha[:8]}: {e}")
+                    logger.warning("Error analyzing commit %s: %s", commit.sha[:8], e)
                     continue
             
             if commits:
@@ -992,7 +995,7 @@ class GitHubScanner:
             return analysis
             
         except Exception as e:
-            logger.warning(f"Error analyzing commit history: {e}")
+            logger.warning("Error analyzing commit history: %s", e)
             return {}
     
     async def _analyze_collaboration(self, repo) -> Dict[str, Any]:
@@ -1016,7 +1019,7 @@ class GitHubScanner:
                 contributors = list(repo.get_contributors()[:100])
                 collaboration["contributors"] = len(contributors)
             except Exception as e:
-                logger.warning(f"Could not fetch contributors: {e}")
+                logger.warning("Could not fetch contributors: %s", e)
             
             # Check for community health files
             collaboration["community_health"] = {
@@ -1031,7 +1034,7 @@ class GitHubScanner:
             return collaboration
             
         except Exception as e:
-            logger.warning(f"Error analyzing collaboration metrics: {e}")
+            logger.warning("Error analyzing collaboration metrics: %s", e)
             return {}
     
     async def _analyze_quality_indicators(self, repo) -> Dict[str, Any]:
@@ -1094,54 +1097,83 @@ class GitHubScanner:
             return quality
             
         except Exception as e:
-            logger.warning(f"Error analyzing quality indicators: {e}")
+            logger.warning("Error analyzing quality indicators: %s", e)
             return {}
 
-    async def fetch_repository_contents(self, repo_full_name: str, path: str = "") -> List[Dict[str, Any]]:
+    async def fetch_repository_contents(self, repo_full_name: str, path: str = "",
+                                        max_files: Optional[int] = None) -> List[Dict[str, Any]]:
         """Fetch repository file contents for analysis"""
+        return [file_info async for file_info in self.iter_repository_contents(repo_full_name, path, max_files)]
+    
+    async def iter_repository_contents(self, repo_full_name: str, path: str = "",
+                                       max_files: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield repository code files one at a time
+        
+        Callers that analyze each file as it arrives (see
+        EvaluationEngine.evaluate_repository_stream) never hold more than one
+        file's content.
+        
+        Args:
+            repo_full_name: Repository full name (owner/name)
+            path: Directory to start from
+            max_files: Stop after this many files (None for no limit)
+            
+        Yields:
+            File dicts with name, path, size, content and sha
+        """
+        walker = self._walk_repository_contents(repo_full_name, path)
+        yielded = 0
+        try:
+            async for file_info in walker:
+                yield file_info
+                yielded += 1
+                if max_files is not None and yielded >= max_files:
+                    break
+        finally:
+            await walker.aclose()
+    
+    async def _walk_repository_contents(self, repo_full_name: str, path: str) -> AsyncIterator[Dict[str, Any]]:
+        """Depth-first walk over the code files under path"""
         try:
             repo = self.github.get_repo(repo_full_name)
-            contents = []
-            
-            try:
-                repo_contents = repo.get_contents(path)
-                if not isinstance(repo_contents, list):
-                    repo_contents = [repo_contents]
-                
-                for content in repo_contents:
-                    if content.type == "file":
-                        # Only analyze code files
-                        if self._is_code_file(content.name):
-                            file_content = ""
-                            try:
-                                if content.encoding == "base64":
-                                    file_content = base64.b64decode(content.content).decode('utf-8', errors='ignore')
-                                else:
-                                    file_content = content.content
-                            except:
-                                continue  # Skip files that can't be decoded
-                            
-                            contents.append({
-                                "name": content.name,
-                                "path": content.path,
-                                "size": content.size,
-                                "content": file_content,
-                                "sha": content.sha
-                            })
-                    
-                    elif content.type == "dir" and not self._should_skip_directory(content.name):
-                        # Recursively get directory contents (limit depth)
-                        if path.count('/') < 3:  # Limit recursion depth
-                            dir_contents = await self.fetch_repository_contents(repo_full_name, content.path)
-                            contents.extend(dir_contents)
-            
-            except GithubException:
-                pass  # Skip if can't access contents
-            
-            return contents
-            
         except Exception as e:
             raise Exception(f"Error fetching repository contents: {e}")
+        
+        try:
+            repo_contents = repo.get_contents(path)
+        except GithubException:
+            return  # Skip if can't access contents
+        
+        if not isinstance(repo_contents, list):
+            repo_contents = [repo_contents]
+        
+        for content in repo_contents:
+            if content.type == "file":
+                # Only analyze code files
+                if self._is_code_file(content.name):
+                    file_content = ""
+                    try:
+                        if content.encoding == "base64":
+                            file_content = base64.b64decode(content.content).decode('utf-8', errors='ignore')
+                        else:
+                            file_content = content.content
+                    except:
+                        continue  # Skip files that can't be decoded
+                    
+                    yield {
+                        "name": content.name,
+                        "path": content.path,
+                        "size": content.size,
+                        "content": file_content,
+                        "sha": content.sha
+                    }
+            
+            elif content.type == "dir" and not self._should_skip_directory(content.name):
+                # Recursively get directory contents (limit depth)
+                if path.count('/') < 3:  # Limit recursion depth
+                    async for file_info in self._walk_repository_contents(repo_full_name, content.path):
+                        yield file_info
     
     def _is_code_file(self, filename: str) -> bool:
         """Check if file is a code file worth analyzing"""
@@ -1186,21 +1218,21 @@ class GitHubScanner:
                         "verified": commit.commit.verification.verified if hasattr(commit.commit, 'verification') else False
                     })
                 except Exception as e:
-                    logger.warning(f"Error processing commit {commit.sha[:8]}: {e}")
+                    logger.warning("Error processing commit %s: %s", commit.sha[:8], e)
                     continue
             
             return commits
             
         except GithubException as e:
             if e.status == 403:
-                logger.warning(f"Repository '{repo_full_name}' is private or access denied")
+                logger.warning("Repository '%s' is private or access denied", repo_full_name)
             elif e.status == 404:
-                logger.warning(f"Repository '{repo_full_name}' not found")
+                logger.warning("Repository '%s' not found", repo_full_name)
             else:
-                logger.warning(f"GitHub API error for repository {repo_full_name}: {e}")
+                logger.warning("GitHub API error for repository %s: %s", repo_full_name, e)
             return []
         except Exception as e:
-            logger.warning(f"Error fetching commit history for {repo_full_name}: {e}")
+            logger.warning("Error fetching commit history for %s: %s", repo_full_name, e)
             return []
     
     async def get_pull_requests_analysis(self, repo_full_name: str, limit: int = 50) -> Dict[str, Any]:
@@ -1257,7 +1289,7 @@ class GitHubScanner:
                     analysis["recent_prs"].append(pr_data)
                     
                 except Exception as e:
-                    logger.warning(f"Error processing PR #{pr.number}: {e}")
+                    logger.warning("Error processing PR #%s: %s", pr.number, e)
                     continue
             
             # Calculate average merge time
@@ -1271,16 +1303,16 @@ class GitHubScanner:
             
         except GithubException as e:
             if e.status == 403:
-                logger.warning(f"Repository '{repo_full_name}' is private or access denied")
+                logger.warning("Repository '%s' is private or access denied", repo_full_name)
                 return {"error": "Repository is private or access denied"}
             elif e.status == 404:
-                logger.warning(f"Repository '{repo_full_name}' not found")
+                logger.warning("Repository '%s' not found", repo_full_name)
                 return {"error": "Repository not found"}
             else:
-                logger.warning(f"GitHub API error for repository {repo_full_name}: {e}")
+                logger.warning("GitHub API error for repository %s: %s", repo_full_name, e)
                 return {"error": f"GitHub API error: {e}"}
         except Exception as e:
-            logger.warning(f"Error analyzing pull requests for {repo_full_name}: {e}")
+            logger.warning("Error analyzing pull requests for %s: %s", repo_full_name, e)
             return {"error": str(e)}
     
     async def get_issues_analysis(self, repo_full_name: str, limit: int = 50) -> Dict[str, Any]:
@@ -1341,7 +1373,7 @@ class GitHubScanner:
                     analysis["recent_issues"].append(issue_data)
                     
                 except Exception as e:
-                    logger.warning(f"Error processing issue #{issue.number}: {e}")
+                    logger.warning("Error processing issue #%s: %s", issue.number, e)
                     continue
             
             # Calculate average resolution time
@@ -1356,16 +1388,16 @@ class GitHubScanner:
             
         except GithubException as e:
             if e.status == 403:
-                logger.warning(f"Repository '{repo_full_name}' is private or access denied")
+                logger.warning("Repository '%s' is private or access denied", repo_full_name)
                 return {"error": "Repository is private or access denied"}
             elif e.status == 404:
-                logger.warning(f"Repository '{repo_full_name}' not found")
+                logger.warning("Repository '%s' not found", repo_full_name)
                 return {"error": "Repository not found"}
             else:
-                logger.warning(f"GitHub API error for repository {repo_full_name}: {e}")
+                logger.warning("GitHub API error for repository %s: %s", repo_full_name, e)
                 return {"error": f"GitHub API error: {e}"}
         except Exception as e:
-            logger.warning(f"Error analyzing issues for {repo_full_name}: {e}")
+            logger.warning("Error analyzing issues for %s: %s", repo_full_name, e)
             return {"error": str(e)}
     
     async def get_rate_limit_status(self) -> Dict[str, Any]:
@@ -1387,7 +1419,7 @@ class GitHubScanner:
                 }
             }
         except Exception as e:
-            logger.error(f"Error getting rate limit status: {e}")
+            logger.error("Error getting rate limit status: %s", e)
             return {}
     
     async def search_repositories(self, query: str, sort: str = "stars", order: str = "desc", limit: int = 30) -> List[Dict[str, Any]]:
@@ -1414,13 +1446,13 @@ class GitHubScanner:
                     results.append(repo_data)
                     count += 1
                 except Exception as e:
-                    logger.warning(f"Error processing search result {repo.name}: {e}")
+                    logger.warning("Error processing search result %s: %s", repo.name, e)
                     continue
             
             return results
             
         except Exception as e:
-            logger.error(f"Error searching repositories: {e}")
+            logger.error("Error searching repositories: %s", e)
             raise Exception(f"Repository search failed: {e}")
     
     async def validate_github_url(self, url: str) -> Tuple[bool, str, str]:
@@ -1448,7 +1480,7 @@ class GitHubScanner:
             return False, "", ""
             
         except Exception as e:
-            logger.error(f"Error validating GitHub URL: {e}")
+            logger.error("Error validating GitHub URL: %s", e)
             return False, "", ""
     
     async def get_user_info(self, username: str) -> Dict[str, Any]:
@@ -1484,14 +1516,14 @@ class GitHubScanner:
             
         except GithubException as e:
             github_error = self.error_handler.classify_github_exception(e)
-            logger.error(f"GitHub API error for user {username}: {github_error.user_friendly_message}")
+            logger.error("GitHub API error for user %s: %s", username, github_error.user_friendly_message)
             raise Exception(github_error.user_friendly_message)
         except Exception as e:
             if "network" in str(e).lower() or "connection" in str(e).lower():
                 network_error = self.error_handler.handle_network_error(e)
                 raise Exception(network_error.user_friendly_message)
             else:
-                logger.error(f"Error getting user info for {username}: {e}")
+                logger.error("Error getting user info for %s: %s", username, e)
                 raise Exception(f"Failed to get user information: {str(e)}")
     
     async def analyze_repository_structure(self, repo_full_name: str) -> Dict[str, Any]:
@@ -1563,10 +1595,10 @@ class GitHubScanner:
         try:
             # Only trigger for internal scans
             if scan_type not in ['self', 'internal', 'myself']:
-                logger.info(f"Skipping ranking sync for scan_type: {scan_type}")
+                logger.info("Skipping ranking sync for scan_type: %s", scan_type)
                 return
             
-            logger.info(f"🎯 Triggering ranking sync for user: {user_id}")
+            logger.info("🎯 Triggering ranking sync for user: %s", user_id)
             
             # Get database connection if not provided
             if db is None:
@@ -1581,7 +1613,7 @@ class GitHubScanner:
             profile = await db.user_profiles.find_one({"user_id": user_id})
             
             if not profile:
-                logger.info(f"User {user_id} has no profile, skipping ranking sync")
+                logger.info("User %s has no profile, skipping ranking sync", user_id)
                 return
             
             # Import ranking services
@@ -1595,13 +1627,13 @@ class GitHubScanner:
             result = await sync_service.sync_user_score(user_id)
             
             if result["success"]:
-                logger.info(f"✅ Rankings synced successfully for user {user_id}")
-                logger.info(f"   - Regional updated: {result.get('regional_updated', False)}")
-                logger.info(f"   - University updated: {result.get('university_updated', False)}")
-                logger.info(f"   - ACID Score: {result.get('acid_score', 0)}")
+                logger.info("✅ Rankings synced successfully for user %s", user_id)
+                logger.info("   - Regional updated: %s", result.get('regional_updated', False))
+                logger.info("   - University updated: %s", result.get('university_updated', False))
+                logger.info("   - ACID Score: %s", result.get('acid_score', 0))
             else:
-                logger.warning(f"⚠️ Ranking sync failed for user {user_id}: {result.get('error')}")
+                logger.warning("⚠️ Ranking sync failed for user %s: %s", user_id, result.get('error'))
         
         except Exception as e:
-            logger.error(f"❌ Error triggering ranking sync for user {user_id}: {e}")
+            logger.error("❌ Error triggering ranking sync for user %s: %s", user_id, e)
             # Don't raise exception - ranking sync failure shouldn't block scan completion
@@ -10,25 +10,41 @@ This service provides comprehensive analysis of GitHub issues including:
 
 import logging
 from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from collections import defaultdict, Counter
-from github import Github, GithubException
 import statistics
 
+from app.services.github_graphql_client import GitHubGraphQLClient
+
 logger = logging.getLogger(__name__)
 
+# Most recently updated issues fetched per repository
+RECENT_ISSUES = 15
+
 class IssueAnalyzer:
     """Comprehensive issue analysis service"""
     
     def __init__(self, github_token: str):
-        self.github = Github(github_token, per_page=100)
+        self.graphql_client = GitHubGraphQLClient(github_token)
         self.token = github_token
+    
+    async def _fetch_issue_activity(self, repositories: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Recent issues with assignees, milestones and comments for all repositories in one batched query"""
+        activity = await self.graphql_client.get_repository_activity(
+            repositories, items_first=RECENT_ISSUES, details=True
+        )
+        return {
+            full_name: repository_activity["issues"]
+            for full_name, repository_activity in activity["repositories"].items()
+        }
         
     async def analyze_user_issues(self, username: str, max_repos: int = 20) -> Dict[str, Any]:
         """Analyze issues across all user repositories"""
         try:
-            user = self.github.get_user(username)
-            repos = list(user.get_repos(type='public', sort='updated'))[:max_repos]
+            repos = await self.graphql_client.get_repository_snapshot(
+                username, max_repositories=max_repos, languages_first=0, topics_first=0
+            )
+            issue_activity = await self._fetch_issue_activity([repo["full_name"] for repo in repos])
             
             analysis = {
                 "summary": {
@@ -75,14 +91,16 @@ class IssueAnalyzer:
             
             for repo in repos:
                 try:
-                    repo_analysis = await self._analyze_repository_issues(repo, username)
+                    repo_analysis = await self._analyze_repository_issues(
+                        repo["full_name"], issue_activity.get(repo["full_name"]), username
+                    )
                     if repo_analysis["issue_count"] > 0:
                         repos_with_issues += 1
                         analysis["repository_breakdown"].append(repo_analysis)
                         all_issues.extend(repo_analysis["issues"])
                         
                 except Exception as e:
-                    logger.warning(f"Error analyzing issues for repository {repo.name}: {e}")
+                    logger.warning(f"Error analyzing issues for repository {repo['name']}: {e}")
                     continue
             
             analysis["summary"]["repositories_with_issues"] = repos_with_issues
@@ -101,26 +119,25 @@ class IssueAnalyzer:
             logger.error(f"Error analyzing user issues for {username}: {e}")
             return self._empty_issue_analysis()
     
-    async def _analyze_repository_issues(self, repo, username: str) -> Dict[str, Any]:
+    async def _analyze_repository_issues(self, repo_full_name: str, issues: Optional[Dict[str, Any]],
+                                         username: str) -> Dict[str, Any]:
         """Analyze issues for a specific repository"""
+        repo_name = repo_full_name.split('/')[-1]
         try:
-            # Get recent issues only for performance
-            all_issues = list(repo.get_issues(state='all', sort='updated'))[:15]  # Limit to 15 most recent
+            # Recent issues only, as fetched by the batched query (GraphQL
+            # issues never include pull requests)
+            all_issues = (issues or {}).get("items", [])[:RECENT_ISSUES]
             
-            # Filter out pull requests and get issues where user is author
+            # Get issues where user is author
             relevant_issues = []
             for issue in all_issues:
-                # Skip pull requests
-                if issue.pull_request:
-                    continue
-                    
                 # Only check if user is author for performance
-                if issue.user and issue.user.login == username:
+                if self._user_participated_in_issue(issue, username):
                     relevant_issues.append(issue)
             
             repo_analysis = {
-                "repository_name": repo.name,
-                "repository_full_name": repo.full_name,
+                "repository_name": repo_name,
+                "repository_full_name": repo_full_name,
                 "issue_count": len(relevant_issues),
                 "open_count": 0,
                 "closed_count": 0,
@@ -138,32 +155,32 @@ class IssueAnalyzer:
                     repo_analysis["issues"].append(issue_data)
                     
                     # Update counts
-                    if issue.state == 'open':
+                    if issue["state"] == 'open':
                         repo_analysis["open_count"] += 1
                     else:
                         repo_analysis["closed_count"] += 1
                         if "resolution_time_hours" in issue_data:
                             resolution_times.append(issue_data["resolution_time_hours"])
                     
-                    if issue.user.login == username:
+                    if issue["user"]["login"] == username:
                         repo_analysis["created_count"] += 1
                     else:
                         repo_analysis["participated_count"] += 1
-                        
+                
                 except Exception as e:
-                    logger.warning(f"Error extracting issue data for #{issue.number}: {e}")
+                    logger.warning(f"Error extracting issue data for #{issue.get('number')}: {e}")
                     continue
             
             if resolution_times:
                 repo_analysis["average_resolution_time"] = statistics.mean(resolution_times)
             
             return repo_analysis
-            
+        
         except Exception as e:
-            logger.error(f"Error analyzing repository {repo.name}: {e}")
+            logger.error(f"Error analyzing repository {repo_name}: {e}")
             return {
-                "repository_name": repo.name,
-                "repository_full_name": repo.full_name,
+                "repository_name": repo_name,
+                "repository_full_name": repo_full_name,
                 "issue_count": 0,
                 "open_count": 0,
                 "closed_count": 0,
@@ -173,48 +190,52 @@ class IssueAnalyzer:
                 "issues": []
             }
     
-    def _user_participated_in_issue(self, issue, username: str) -> bool:
+    def _user_participated_in_issue(self, issue: Dict[str, Any], username: str) -> bool:
         """Check if user participated in issue (simplified for performance)"""
         try:
             # Only check if user is author for performance
-            return issue.user and issue.user.login == username
-            
+            return issue["user"]["login"] == username
+        
         except Exception as e:
             logger.warning(f"Error checking issue participation: {e}")
             return False
     
-    async def _extract_issue_data(self, issue, username: str) -> Dict[str, Any]:
+    async def _extract_issue_data(self, issue: Dict[str, Any], username: str) -> Dict[str, Any]:
         """Extract comprehensive data from an issue"""
         try:
+            milestone = issue.get("milestone")
+            
             # Basic issue information
             issue_data = {
-                "number": issue.number,
-                "title": issue.title,
-                "state": issue.state,
-                "created_at": issue.created_at.isoformat(),
-                "updated_at": issue.updated_at.isoformat(),
-                "closed_at": issue.closed_at.isoformat() if issue.closed_at else None,
-                "author": issue.user.login,
-                "is_author": issue.user.login == username,
-                "body_length": len(issue.body or ""),
-                "url": issue.html_url,
-                "labels": [label.name for label in issue.labels],
-                "assignees": [assignee.login for assignee in issue.assignees] if issue.assignees else [],
-                "milestone": issue.milestone.title if issue.milestone else None
+                "number": issue["number"],
+                "title": issue["title"],
+                "state": issue["state"],
+                "created_at": issue["created_at"],
+                "updated_at": issue["updated_at"],
+                "closed_at": issue.get("closed_at"),
+                "author": issue["user"]["login"],
+                "is_author": issue["user"]["login"] == username,
+                "body_length": len(issue.get("body") or ""),
+                "url": issue["html_url"],
+                "labels": [label["name"] for label in issue["labels"]],
+                "assignees": [assignee["login"] for assignee in issue.get("assignees", [])],
+                "milestone": milestone["title"] if milestone else None
             }
             
             # Categorize issue type based on labels and title
             issue_data["issue_type"] = self._categorize_issue_type(issue)
             issue_data["priority"] = self._determine_priority(issue)
             
-            # Simplified comment analysis (skip for speed)
-            issue_data["comment_count"] = 0
-            issue_data["participants"] = [issue.user.login]
-            issue_data["user_participated"] = issue.user.login == username
+            # Comment information (fetched with the issue)
+            issue_data["comment_count"] = issue.get("comments", 0)
+            issue_data["participants"] = [issue["user"]["login"]]
+            issue_data["user_participated"] = issue["user"]["login"] == username
             
             # Simplified timing analysis
-            if issue.created_at and issue.closed_at:
-                resolution_time = (issue.closed_at - issue.created_at).total_seconds() / 3600  # hours
+            if issue.get("closed_at"):
+                created_at = datetime.fromisoformat(issue["created_at"].replace('Z', '+00:00'))
+                closed_at = datetime.fromisoformat(issue["closed_at"].replace('Z', '+00:00'))
+                resolution_time = (closed_at - created_at).total_seconds() / 3600  # hours
                 issue_data["resolution_time_hours"] = round(resolution_time, 2)
             
             # Quality indicators
@@ -224,21 +245,21 @@ class IssueAnalyzer:
             issue_data["is_stale"] = self._is_stale_issue(issue)
             
             return issue_data
-            
+        
         except Exception as e:
             logger.error(f"Error extracting issue data: {e}")
             return {
-                "number": issue.number,
-                "title": issue.title,
-                "state": issue.state,
+                "number": issue.get("number"),
+                "title": issue.get("title"),
+                "state": issue.get("state"),
                 "error": str(e)
             }
     
-    def _categorize_issue_type(self, issue) -> str:
+    def _categorize_issue_type(self, issue: Dict[str, Any]) -> str:
         """Categorize issue type based on labels and content"""
         try:
-            labels = [label.name.lower() for label in issue.labels]
-            title_body = (issue.title + " " + (issue.body or "")).lower()
+            labels = [label["name"].lower() for label in issue.get("labels", [])]
+            title_body = ((issue.get("title") or "") + " " + (issue.get("body") or "")).lower()
             
             # Check labels first
             if any(label in ['bug', 'defect', 'error'] for label in labels):
@@ -261,14 +282,14 @@ class IssueAnalyzer:
                 return 'question'
             
             return 'other'
-            
+        
         except Exception:
             return 'other'
     
-    def _determine_priority(self, issue) -> str:
+    def _determine_priority(self, issue: Dict[str, Any]) -> str:
         """Determine issue priority based on labels"""
         try:
-            labels = [label.name.lower() for label in issue.labels]
+            labels = [label["name"].lower() for label in issue.get("labels", [])]
             
             if any(label in ['critical', 'urgent', 'high priority', 'p0'] for label in labels):
                 return 'high'
@@ -285,21 +306,23 @@ class IssueAnalyzer:
                 return 'low'
             
             return 'medium'
-            
+        
         except Exception:
             return 'medium'
     
-    def _is_stale_issue(self, issue) -> bool:
+    def _is_stale_issue(self, issue: Dict[str, Any]) -> bool:
         """Check if issue is stale (no activity for 90+ days)"""
         try:
-            if issue.state == 'closed':
+            if issue["state"] == 'closed':
                 return False
             
-            last_activity = max(issue.created_at, issue.updated_at)
-            days_since_activity = (datetime.now() - last_activity.replace(tzinfo=None)).days
+            last_activity = datetime.fromisoformat(
+                max(issue["created_at"], issue["updated_at"]).replace('Z', '+00:00')
+            )
+            days_since_activity = (datetime.now(timezone.utc) - last_activity).days
             
             return days_since_activity > 90
-            
+        
         except Exception:
             return False
     
@@ -498,21 +521,27 @@ class IssueAnalyzer:
             
             analysis = self._empty_issue_analysis()
             
-            for repo_data in repositories:
+            repo_names = [
+                repo_data.get("full_name") or repo_data.get("name", "")
+                for repo_data in repositories
+            ]
+            issue_activity = await self._fetch_issue_activity(
+                [repo_name for repo_name in repo_names if '/' in repo_name]
+            )
+            
+            for repo_data, repo_name in zip(repositories, repo_names):
                 try:
-                    repo_name = repo_data.get("full_name") or repo_data.get("name", "")
                     if not repo_name:
                         continue
                     
-                    # Get repository object
-                    repo = self.github.get_repo(repo_name)
-                    
                     # Analyze this repository's issues
-                    repo_analysis = await self._analyze_repository_issues(repo, repo_data.get("owner", {}).get("login", ""))
+                    repo_analysis = await self._analyze_repository_issues(
+                        repo_name, issue_activity.get(repo_name), repo_data.get("owner", {}).get("login", "")
+                    )
                     
                     # Merge results into overall analysis
                     self._merge_issue_analysis(analysis, repo_analysis)
-                    
+                
                 except Exception as e:
                     logger.warning(f"Failed to analyze issues for repository {repo_data.get('name', 'unknown')}: {e}")
                     continue
@@ -522,7 +551,7 @@ class IssueAnalyzer:
             
             logger.info(f"Completed issue analysis for {len(repositories)} repositories")
             return analysis
-            
+        
         except Exception as e:
             logger.error(f"Error analyzing repositories issues: {e}")
             return self._empty_issue_analysis()
@@ -531,22 +560,23 @@ class IssueAnalyzer:
         """Merge repository issue analysis into main analysis"""
         try:
             # Merge summary data
-            main_analysis["summary"]["total_issues"] += repo_analysis["summary"]["total_issues"]
-            main_analysis["summary"]["open_issues"] += repo_analysis["summary"]["open_issues"]
-            main_analysis["summary"]["closed_issues"] += repo_analysis["summary"]["closed_issues"]
-            main_analysis["summary"]["issues_created"] += repo_analysis["summary"]["issues_created"]
-            main_analysis["summary"]["issues_participated"] += repo_analysis["summary"]["issues_participated"]
+            main_analysis["summary"]["total_issues"] += repo_analysis["issue_count"]
+            main_analysis["summary"]["open_issues"] += repo_analysis["open_count"]
+            main_analysis["summary"]["closed_issues"] += repo_analysis["closed_count"]
+            main_analysis["summary"]["issues_created"] += repo_analysis["created_count"]
+            main_analysis["summary"]["issues_participated"] += repo_analysis["participated_count"]
             
-            if repo_analysis["summary"]["total_issues"] > 0:
+            if repo_analysis["issue_count"] > 0:
                 main_analysis["summary"]["repositories_with_issues"] += 1
             
             # Merge collaboration data
             if isinstance(main_analysis["collaboration"]["unique_assignees"], list):
-                main_analysis["collaboration"]["unique_assignees"].extend(repo_analysis["collaboration"]["unique_assignees"])
+                for issue_data in repo_analysis["issues"]:
+                    main_analysis["collaboration"]["unique_assignees"].extend(issue_data.get("assignees", []))
             
             # Add repository breakdown
             main_analysis["repository_breakdown"].append(repo_analysis)
-            
+        
         except Exception as e:
             logger.warning(f"Error merging issue analysis: {e}")
     
@@ -5,12 +5,14 @@ Target: <35 seconds for 13 repositories
 """
 
 import asyncio
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, AsyncIterator, Optional, Tuple
 from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorDatabase
 import logging
 
+from app.core.config import settings
 from app.services.scoring import (
+    ACIDAccumulator,
     ComplexityAnalyzer,
     ACIDScorer,
     OverallScoreCalculator
@@ -21,6 +23,7 @@ from app.services.storage import (
     AnalysisStorageService,
     RankingStorageService
 )
+from .code_extraction import ExtractionBudget, stream_code_files
 from .progress_tracker import ProgressTracker
 
 logger = logging.getLogger(__name__)
@@ -32,7 +35,8 @@ class AnalysisOrchestrator:
     
     Workflow:
     1. Select Flagship and Significant repositories (limit 15)
-    2. Extract code from repositories (batch processing)
+    2. Stream code from repositories into the analyzers (batch processing,
+       under one byte/file/time budget per analysis)
     3. Analyze code and calculate ACID scores
     4. Calculate overall score
     5. Update rankings
@@ -119,10 +123,16 @@ class AnalysisOrchestrator:
             
             # Step 2: Analyze repositories in batches
             self.logger.info("Step 2: Analyzing repositories...")
+            budget = ExtractionBudget.from_settings()
             analyzed_repos = await self._analyze_repositories_batch(
                 repositories,
                 github_token,
-                user_id
+                user_id,
+                budget
+            )
+            self.logger.info(
+                f"Extracted {budget.files_used} files "
+                f"({budget.bytes_used / 1024:.0f} KiB) for analysis"
             )
             
             # Step 3: Calculate overall score
@@ -161,7 +171,9 @@ class AnalysisOrchestrator:
                 'overall_score': overall_breakdown.overall_score,
                 'flagship_average': overall_breakdown.flagship_average,
                 'significant_average': overall_breakdown.significant_average,
-                'analysis_time': round(analysis_time, 2)
+                'analysis_time': round(analysis_time, 2),
+                'files_analyzed': budget.files_used,
+                'bytes_analyzed': budget.bytes_used
             }
             
         except Exception as e:
@@ -204,7 +216,10 @@ class AnalysisOrchestrator:
                 'has_readme': getattr(repo, 'has_readme', False),
                 'has_license': getattr(repo, 'license', None) is not None,
                 'has_tests': getattr(repo, 'has_tests', False),
-                'has_ci_cd': getattr(repo, 'has_ci_cd', False)
+                'has_ci_cd': getattr(repo, 'has_ci_cd', False),
+                'analyzed_commit_sha': getattr(repo, 'analyzed_commit_sha', None),
+                'analysis_aggregates': getattr(repo, 'analysis_aggregates', None),
+                'analysis_pending_files': getattr(repo, 'analysis_pending_files', None) or []
             }
             for repo in repos
         ]
@@ -215,7 +230,8 @@ class AnalysisOrchestrator:
         self,
         repositories: List[Dict[str, Any]],
         github_token: str,
-        user_id: str
+        user_id: str,
+        budget: Optional[ExtractionBudget] = None
     ) -> List[Dict[str, Any]]:
         """
         Analyze repositories in batches
@@ -226,12 +242,14 @@ class AnalysisOrchestrator:
             repositories: List of repository dictionaries
             github_token: GitHub OAuth token
             user_id: User ID
+            budget: Code extraction budget shared by the batch (from settings if omitted)
             
         Returns:
             List of analyzed repository results
         """
         analyzed = []
         total = len(repositories)
+        budget = budget or ExtractionBudget.from_settings()
         
         # Process in batches
         for i in range(0, total, self.BATCH_SIZE):
@@ -246,7 +264,7 @@ class AnalysisOrchestrator:
             # Analyze batch in parallel
             batch_results = await asyncio.gather(
                 *[
-                    self._analyze_single_repository(repo, github_token, user_id)
+                    self._analyze_single_repository(repo, github_token, user_id, budget)
                     for repo in batch
                 ],
                 return_exceptions=True
@@ -279,15 +297,21 @@ class AnalysisOrchestrator:
         self,
         repo: Dict[str, Any],
         github_token: str,
-        user_id: str
+        user_id: str,
+        budget: Optional[ExtractionBudget] = None
     ) -> Dict[str, Any]:
         """
         Analyze a single repository
         
+        Files are analyzed one at a time as they are downloaded; only running
+        totals are kept, not the source. A repository analyzed before is
+        updated from the commit diff since that analysis.
+        
         Args:
             repo: Repository dictionary
             github_token: GitHub OAuth token
             user_id: User ID
+            budget: Code extraction budget of the analysis (from settings if omitted)
             
         Returns:
             Analysis results dictionary
@@ -298,10 +322,11 @@ class AnalysisOrchestrator:
         self.logger.info(f"Analyzing repository: {repo_name}")
         
         try:
-            # Step 1: Extract code files
-            files = await self._extract_code_files(repo, github_token)
+            # Steps 1-2: Stream code files into the complexity/ACID analysis
+            budget = budget or ExtractionBudget.from_settings()
+            analysis, commit_sha, pending = await self._collect_code_analysis(repo, github_token, budget)
             
-            if not files:
+            if not analysis.file_count:
                 self.logger.warning(f"No code files found in {repo_name}")
                 return {
                     'repo_id': repo_id,
@@ -309,8 +334,7 @@ class AnalysisOrchestrator:
                     'error': 'No code files found'
                 }
             
-            # Step 2: Analyze complexity
-            complexity = self.complexity_analyzer.analyze_repository(files)
+            complexity = analysis.complexity()
             
             # Step 3: Calculate ACID scores
             repo_metadata = {
@@ -320,10 +344,13 @@ class AnalysisOrchestrator:
                 'has_ci_cd': repo.get('has_ci_cd', False)
             }
             
-            acid_scores = self.acid_scorer.calculate_acid_scores(
-                files,
-                repo_metadata
-            )
+            acid_scores = analysis.scores(repo_metadata)
+            
+            if pending:
+                self.logger.warning(
+                    f"{repo_name}: {len(pending)} files not analyzed "
+                    f"(extraction budget spent or downloads failed), left for the next analysis"
+                )
             
             # Step 4: Calculate repository overall score
             repo_overall_score = acid_scores.overall
@@ -335,7 +362,11 @@ class AnalysisOrchestrator:
                 acid_scores,
                 complexity,
                 repo_overall_score,
-                files
+                analysis.language_lines,
+                analysis.file_count,
+                commit_sha=commit_sha,
+                aggregates=analysis.to_dict() if commit_sha else None,
+                pending_files=pending
             )
             
             self.logger.info(
@@ -354,7 +385,8 @@ class AnalysisOrchestrator:
                     'durability': acid_scores.durability,
                     'overall': acid_scores.overall
                 },
-                'overall_score': repo_overall_score
+                'overall_score': repo_overall_score,
+                'complete': not pending
             }
             
         except Exception as e:
@@ -366,38 +398,143 @@ class AnalysisOrchestrator:
                 'error': str(e)
             }
     
-    async def _extract_code_files(
+    async def _collect_code_analysis(
         self,
         repo: Dict[str, Any],
-        github_token: str
-    ) -> List[Tuple[str, str, str]]:
+        github_token: str,
+        budget: ExtractionBudget
+    ) -> Tuple[ACIDAccumulator, Optional[str], List[str]]:
         """
-        Extract code files from repository
+        Build the per-file ACID aggregate of a repository
+        
+        When the repository was analyzed before, only the files added,
+        modified or deleted since the stored commit are applied to the stored
+        aggregate, so a rescan costs in proportion to churn rather than
+        repository size. Otherwise (or if the diff cannot be used, e.g. after
+        a force push) every file is streamed.
+        
+        The extraction budget is shared by every repository of the analysis,
+        so an aggregate can be incomplete. Files it misses are returned as
+        pending and downloaded by the next rescan, even at an unchanged commit.
         
         Args:
             repo: Repository dictionary
             github_token: GitHub OAuth token
+            budget: Code extraction budget of the analysis
             
         Returns:
-            List of (filename, language, code) tuples
+            (aggregate, head commit SHA or None if it could not be determined,
+            paths of files the aggregate still misses)
         """
-        # This is a placeholder - actual implementation would use GitHub REST API
-        # to fetch file tree and download code files
-        
-        # For now, return empty list
-        # In production, this would:
-        # 1. Get file tree from GitHub REST API
-        # 2. Filter to code files (by extension)
-        # 3. Download up to MAX_FILES_PER_REPO files
-        # 4. Return list of (filename, language, code) tuples
-        
-        self.logger.warning(
-            f"Code extraction not implemented for {repo['name']} - "
-            "using mock data"
-        )
+        owner, name = self._owner_and_name(repo)
         
-        # Mock data for testing
-        return []
+        try:
+            commit_sha = await self.github_rest.get_head_commit(owner, name, github_token)
+        except Exception as e:
+            self.logger.warning(f"Could not resolve head commit of {repo['name']}: {e}")
+            commit_sha = None
+        
+        base_sha = repo.get('analyzed_commit_sha')
+        previous = ACIDAccumulator.from_dict(repo.get('analysis_aggregates'), self.acid_scorer)
+        missing = set(repo.get('analysis_pending_files') or [])
+        pending: List[str] = []
+        
+        if previous is not None and commit_sha and base_sha:
+            if base_sha == commit_sha and not missing:
+                self.logger.info(f"{repo['name']} unchanged since last analysis")
+                return previous, commit_sha, pending
+            
+            if base_sha == commit_sha:
+                changes = {'changed': [], 'removed': []}
+            else:
+                try:
+                    changes = await self.github_rest.compare_commits(
+                        owner, name, base_sha, commit_sha, github_token
+                    )
+                except Exception as e:
+                    self.logger.warning(f"Could not compare commits of {repo['name']}: {e}")
+                    changes = None
+            
+            if changes is not None:
+                for path in changes['removed']:
+                    previous.remove_file(path)
+                
+                changed = {entry['path']: entry for entry in changes['changed']}
+                missing -= set(changes['removed']) | set(changed)
+                if missing:
+                    # Files earlier analyses missed; those no longer listed were deleted
+                    try:
+                        listed = await self.github_rest.list_code_files(owner, name, github_token)
+                        for entry in listed:
+                            if entry['path'] in missing:
+                                changed[entry['path']] = entry
+                    except Exception as e:
+                        self.logger.warning(f"Could not list files of {repo['name']}: {e}")
+                        pending.extend(sorted(missing))
+                
+                # Modified files are replaced; new files only while under the per-repo limit
+                tracked = [entry for entry in changed.values() if entry['path'] in previous.files]
+                room = max(0, self.MAX_FILES_PER_REPO - previous.file_count)
+                added = [entry for entry in changed.values() if entry['path'] not in previous.files][:room]
+                
+                async for filename, language, code in self._stream_code_files(
+                    repo, github_token, budget, entries=tracked + added, pending=pending
+                ):
+                    previous.add_file(filename, language, code)
+                
+                self.logger.info(
+                    f"Incremental analysis of {repo['name']}: "
+                    f"{len(tracked) + len(added)} changed, {len(changes['removed'])} removed, "
+                    f"{len(pending)} pending"
+                )
+                return previous, commit_sha, pending
+        
+        analysis = ACIDAccumulator(self.acid_scorer)
+        async for filename, language, code in self._stream_code_files(
+            repo, github_token, budget, pending=pending
+        ):
+            analysis.add_file(filename, language, code)
+        return analysis, commit_sha, pending
+    
+    def _owner_and_name(self, repo: Dict[str, Any]) -> Tuple[str, str]:
+        """Owner and name of a repository dictionary"""
+        owner, _, name = (repo.get('full_name') or '').partition('/')
+        return owner, name or repo['name']
+    
+    def _stream_code_files(
+        self,
+        repo: Dict[str, Any],
+        github_token: str,
+        budget: ExtractionBudget,
+        entries: Optional[List[Dict[str, Any]]] = None,
+        pending: Optional[List[str]] = None
+    ) -> AsyncIterator[Tuple[str, str, str]]:
+        """
+        Stream code files from a repository in priority order
+        
+        Args:
+            repo: Repository dictionary
+            github_token: GitHub OAuth token
+            budget: Code extraction budget of the analysis
+            entries: Files to download (default: all code files)
+            pending: Receives the paths of files that could not be analyzed
+            
+        Returns:
+            Async iterator of (filename, language, code) tuples
+        """
+        owner, name = self._owner_and_name(repo)
+        
+        return stream_code_files(
+            self.github_rest,
+            owner,
+            name,
+            github_token,
+            budget,
+            max_files=self.MAX_FILES_PER_REPO,
+            window=settings.deep_analysis_download_window,
+            entries=entries,
+            pending=pending
+        )
     
     async def _store_analysis_results(
         self,
@@ -406,7 +543,11 @@ class AnalysisOrchestrator:
         acid_scores: Any,
         complexity: Any,
         overall_score: float,
-        files: List[Tuple[str, str, str]]
+        language_stats: Dict[str, int],
+        file_count: int,
+        commit_sha: Optional[str] = None,
+        aggregates: Optional[Dict[str, Any]] = None,
+        pending_files: Optional[List[str]] = None
     ) -> None:
         """
         Store analysis results in database
@@ -417,7 +558,11 @@ class AnalysisOrchestrator:
             acid_scores: ACID scores object
             complexity: Complexity metrics object
             overall_score: Overall repository score
-            files: List of analyzed files
+            language_stats: Lines of code per language
+            file_count: Number of analyzed files
+            commit_sha: Commit the analysis was computed at
+            aggregates: Per-file ACID aggregates (ACIDAccumulator.to_dict)
+            pending_files: Files the aggregates still miss
         """
         from app.models.repository import ACIDScore, QualityMetrics
         
@@ -438,13 +583,6 @@ class AnalysisOrchestrator:
             documentation=50.0  # Placeholder
         )
         
-        # Calculate language stats
-        language_stats = {}
-        for filename, language, code in files:
-            if language not in language_stats:
-                language_stats[language] = 0
-            language_stats[language] += len(code.split('\n'))
-        
         # Store complete evaluation
         await self.analysis_storage.update_complete_evaluation(
             repo_id=repo_id,
@@ -454,7 +592,7 @@ class AnalysisOrchestrator:
             complexity_score=complexity.cyclomatic_complexity,
             best_practices_score=acid_scores.overall,
             language_stats=language_stats,
-            file_count=len(files),
+            file_count=file_count,
             total_lines=complexity.lines_of_code
         )
         
@@ -476,7 +614,10 @@ class AnalysisOrchestrator:
                 'function_count': complexity.function_count,
                 'class_count': complexity.class_count
             },
-            overall_score=overall_score
+            overall_score=overall_score,
+            analyzed_commit_sha=commit_sha,
+            analysis_aggregates=aggregates,
+            analysis_pending_files=pending_files
         )
     
     async def _calculate_overall_score(
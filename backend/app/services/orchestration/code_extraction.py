@@ -0,0 +1,243 @@
+"""
+Code Extraction
+Streams repository files from the GitHub REST service into the analyzers.
+
+Files are downloaded in priority order (entry points and source directories
+first, generated and vendored code last) through a small window of in-flight
+downloads, and each file is handed to the caller as soon as it arrives. A
+per-analysis ExtractionBudget caps the bytes, files and time spent across all
+repositories of one deep analysis, so memory is bounded by the download
+window rather than by repository size.
+"""
+
+import asyncio
+import logging
+import posixpath
+import time
+from collections import deque
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# File names that usually hold a program's entry point
+ENTRY_POINT_NAMES = {
+    'main', 'app', 'index', 'server', 'cli', 'manage', '__main__',
+    'application', 'program', 'lib', 'mod'
+}
+
+# Directories that hold a project's own source code
+SOURCE_DIRS = {'src', 'lib', 'app', 'pkg', 'cmd', 'internal', 'core', 'api', 'server', 'services'}
+
+# Directories with supporting code that says less about the author
+SUPPORTING_DIRS = {'examples', 'example', 'samples', 'docs', 'doc', 'scripts', 'tools', 'benchmarks', 'demo'}
+
+# Path fragments of generated or vendored code
+GENERATED_MARKERS = (
+    'vendor/', 'third_party/', 'thirdparty/', 'external/', 'generated/', '__generated__/',
+    'migrations/', '.pb.go', '_pb2.py', '.generated.', '.g.dart', '.designer.', 'min.js'
+)
+
+# Priority tiers (lower is downloaded first)
+PRIORITY_ENTRY_POINT = 0
+PRIORITY_SOURCE = 1
+PRIORITY_OTHER = 2
+PRIORITY_SUPPORTING = 3
+PRIORITY_GENERATED = 4
+
+
+def file_priority(path: str) -> int:
+    """
+    Priority tier of a repository file by how much signal it carries
+
+    Args:
+        path: File path within the repository
+
+    Returns:
+        Priority tier (PRIORITY_ENTRY_POINT first ... PRIORITY_GENERATED last)
+    """
+    path_lower = path.lower()
+    if any(marker in path_lower for marker in GENERATED_MARKERS):
+        return PRIORITY_GENERATED
+
+    parts = path_lower.split('/')
+    directories = parts[:-1]
+    stem = posixpath.splitext(parts[-1])[0]
+
+    if directories and directories[0] in SUPPORTING_DIRS:
+        return PRIORITY_SUPPORTING
+    if stem in ENTRY_POINT_NAMES and len(directories) <= 2:
+        return PRIORITY_ENTRY_POINT
+    if any(directory in SOURCE_DIRS for directory in directories):
+        return PRIORITY_SOURCE
+    if not directories:
+        # Top-level modules of small projects
+        return PRIORITY_SOURCE
+    return PRIORITY_OTHER
+
+
+def _download_order(entry: Dict[str, Any]) -> Tuple[int, int, int, str]:
+    """Sort key: priority tier, then shallow paths, then smaller files"""
+    path = entry.get('path', '')
+    return file_priority(path), path.count('/'), entry.get('size') or 0, path
+
+
+class ExtractionBudget:
+    """
+    Bytes, files and time one deep analysis may spend on code extraction
+
+    Shared by every repository of the analysis; a file is only downloaded
+    after its size (from the Git tree) has been reserved.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        max_files: int,
+        time_limit: Optional[float] = None
+    ):
+        """
+        Initialize budget
+
+        Args:
+            max_bytes: Maximum source bytes downloaded per analysis
+            max_files: Maximum files downloaded per analysis
+            time_limit: Seconds after which no new downloads are started
+        """
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.deadline = time.monotonic() + time_limit if time_limit else None
+        self.bytes_used = 0
+        self.files_used = 0
+
+    @classmethod
+    def from_settings(cls) -> 'ExtractionBudget':
+        """Budget configured by DEEP_ANALYSIS_MAX_BYTES/_MAX_FILES/_EXTRACTION_SECONDS"""
+        from app.core.config import settings
+
+        return cls(
+            max_bytes=settings.deep_analysis_max_bytes,
+            max_files=settings.deep_analysis_max_files,
+            time_limit=settings.deep_analysis_extraction_seconds
+        )
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether no further file can be downloaded"""
+        if self.files_used >= self.max_files or self.bytes_used >= self.max_bytes:
+            return True
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def reserve(self, size: int) -> bool:
+        """
+        Reserve room for one file
+
+        Args:
+            size: File size in bytes
+
+        Returns:
+            True if the file fits in the remaining budget
+        """
+        if self.exhausted or self.bytes_used + size > self.max_bytes:
+            return False
+        self.bytes_used += size
+        self.files_used += 1
+        return True
+
+    def release(self, size: int) -> None:
+        """
+        Return the reservation of a file that could not be downloaded
+
+        Args:
+            size: File size in bytes
+        """
+        self.bytes_used = max(0, self.bytes_used - size)
+        self.files_used = max(0, self.files_used - 1)
+
+
+async def stream_code_files(
+    rest_service: Any,
+    owner: str,
+    repo: str,
+    token: str,
+    budget: ExtractionBudget,
+    max_files: int,
+    window: int = 8,
+    entries: Optional[List[Dict[str, Any]]] = None,
+    pending: Optional[List[str]] = None
+) -> AsyncIterator[Tuple[str, str, str]]:
+    """
+    Download a repository's code files in priority order, yielding each as it arrives
+
+    At most ``window`` downloads are in flight, and new ones are only started
+    when the consumer asks for the next file. Files are yielded in download
+    order so the analysis stays deterministic.
+
+    Args:
+        rest_service: GitHubRESTService (list_code_files/download_file)
+        owner: Repository owner
+        repo: Repository name
+        token: GitHub OAuth token
+        budget: Budget shared by the whole analysis
+        max_files: Maximum files taken from this repository
+        window: Maximum concurrent downloads
+        entries: Files to download (default: every code file of the repository).
+            Entries with an unknown size (0) are charged once downloaded.
+        pending: When given, receives the paths of files that were wanted but
+            not analyzed because the budget ran out or their download failed
+            (files beyond max_files are a deliberate sample, not pending)
+
+    Yields:
+        (filename, language, code) tuples
+    """
+    if entries is None:
+        entries = await rest_service.list_code_files(owner, repo, token)
+    queue = iter(sorted(entries, key=_download_order))
+    in_flight = deque()
+    started = 0
+
+    def fill_window():
+        nonlocal started
+        while len(in_flight) < window and started < max_files and not budget.exhausted:
+            entry = next(queue, None)
+            if entry is None:
+                return
+            size = entry.get('size') or 0
+            if not budget.reserve(size):
+                # Too large for what is left; smaller files may still fit
+                if pending is not None and size <= budget.max_bytes:
+                    pending.append(entry.get('path'))
+                continue
+            started += 1
+            in_flight.append((entry, asyncio.ensure_future(
+                rest_service.download_file(owner, repo, entry, token)
+            )))
+
+    try:
+        fill_window()
+        while in_flight:
+            entry, download = in_flight.popleft()
+            try:
+                result = await download
+            except Exception as e:
+                logger.debug(f"Failed to download {entry.get('path')}: {e}")
+                result = None
+
+            if not result:
+                budget.release(entry.get('size') or 0)
+                started -= 1
+                if pending is not None:
+                    pending.append(entry.get('path'))
+            elif not entry.get('size'):
+                budget.bytes_used += len(result['content'])
+            fill_window()
+
+            if result:
+                yield result['path'], result['language'], result['content']
+
+        if pending is not None and budget.exhausted:
+            # Files this repository still had room for when the budget ran out
+            pending.extend(entry.get('path') for entry in islice(queue, max(0, max_files - started)))
+    finally:
+        for _, download in in_flight:
+            download.cancel()
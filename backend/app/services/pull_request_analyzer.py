@@ -12,23 +12,41 @@ import logging
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict, Counter
-from github import Github, GithubException
 import statistics
 
+from app.services.github_graphql_client import GitHubGraphQLClient
+
 logger = logging.getLogger(__name__)
 
+# Most recently updated pull requests fetched per repository, and how many of
+# those are checked for the user's authorship
+RECENT_PULL_REQUESTS = 5
+ANALYZED_PULL_REQUESTS = 3
+
 class PullRequestAnalyzer:
     """Comprehensive pull request analysis service"""
     
     def __init__(self, github_token: str):
-        self.github = Github(github_token, per_page=100)
+        self.graphql_client = GitHubGraphQLClient(github_token)
         self.token = github_token
+    
+    async def _fetch_pull_request_activity(self, repositories: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Recent pull requests with reviews and changed files for all repositories in one batched query"""
+        activity = await self.graphql_client.get_repository_activity(
+            repositories, items_first=RECENT_PULL_REQUESTS, details=True
+        )
+        return {
+            full_name: repository_activity["pull_requests"]
+            for full_name, repository_activity in activity["repositories"].items()
+        }
         
     async def analyze_user_pull_requests(self, username: str, max_repos: int = 5) -> Dict[str, Any]:
         """Analyze pull requests across all user repositories"""
         try:
-            user = self.github.get_user(username)
-            repos = list(user.get_repos(type='public', sort='updated'))[:max_repos]
+            repos = await self.graphql_client.get_repository_snapshot(
+                username, max_repositories=max_repos, languages_first=0, topics_first=0
+            )
+            pull_request_activity = await self._fetch_pull_request_activity([repo["full_name"] for repo in repos])
             
             analysis = {
                 "summary": {
@@ -72,14 +90,16 @@ class PullRequestAnalyzer:
             
             for repo in repos:
                 try:
-                    repo_analysis = await self._analyze_repository_pull_requests(repo, username)
+                    repo_analysis = await self._analyze_repository_pull_requests(
+                        repo["full_name"], pull_request_activity.get(repo["full_name"]), username
+                    )
                     if repo_analysis["pull_request_count"] > 0:
                         repos_with_prs += 1
                         analysis["repository_breakdown"].append(repo_analysis)
                         all_prs.extend(repo_analysis["pull_requests"])
                         
                 except Exception as e:
-                    logger.warning(f"Error analyzing PRs for repository {repo.name}: {e}")
+                    logger.warning(f"Error analyzing PRs for repository {repo['name']}: {e}")
                     continue
             
             # Aggregate analysis from all repositories
@@ -99,21 +119,23 @@ class PullRequestAnalyzer:
             logger.error(f"Error analyzing user pull requests for {username}: {e}")
             return self._empty_pr_analysis()
     
-    async def _analyze_repository_pull_requests(self, repo, username: str) -> Dict[str, Any]:
+    async def _analyze_repository_pull_requests(self, repo_full_name: str, pull_requests: Optional[Dict[str, Any]],
+                                                username: str) -> Dict[str, Any]:
         """Analyze pull requests for a specific repository"""
+        repo_name = repo_full_name.split('/')[-1]
         try:
-            # Get pull requests (limit to recent ones for performance)
-            user_prs = list(repo.get_pulls(state='all', sort='updated'))[:5]  # Limit to 5 most recent
+            # Recent pull requests only, as fetched by the batched query
+            user_prs = (pull_requests or {}).get("items", [])[:RECENT_PULL_REQUESTS]
             
             # Filter PRs where user was involved (author only for performance)
             relevant_prs = []
-            for pr in user_prs[:3]:  # Further limit for analysis
-                if pr.user and pr.user.login == username:
+            for pr in user_prs[:ANALYZED_PULL_REQUESTS]:  # Further limit for analysis
+                if self._user_participated_in_pr(pr, username):
                     relevant_prs.append(pr)
             
             repo_analysis = {
-                "repository_name": repo.name,
-                "repository_full_name": repo.full_name,
+                "repository_name": repo_name,
+                "repository_full_name": repo_full_name,
                 "pull_request_count": len(relevant_prs),
                 "merged_count": 0,
                 "closed_count": 0,
@@ -133,34 +155,34 @@ class PullRequestAnalyzer:
                     repo_analysis["pull_requests"].append(pr_data)
                     
                     # Update counts
-                    if pr.state == 'closed' and pr.merged:
+                    if pr["state"] == 'closed' and pr["merged"]:
                         repo_analysis["merged_count"] += 1
-                    elif pr.state == 'closed':
+                    elif pr["state"] == 'closed':
                         repo_analysis["closed_count"] += 1
                     else:
                         repo_analysis["open_count"] += 1
                     
-                    if pr.user.login == username:
+                    if pr["user"]["login"] == username:
                         repo_analysis["authored_count"] += 1
                     
                     # Accumulate size metrics
                     total_additions += pr_data.get("additions", 0)
                     total_deletions += pr_data.get("deletions", 0)
-                    
+                
                 except Exception as e:
-                    logger.warning(f"Error extracting PR data for {pr.number}: {e}")
+                    logger.warning(f"Error extracting PR data for {pr.get('number')}: {e}")
                     continue
             
             if relevant_prs:
                 repo_analysis["average_pr_size"] = (total_additions + total_deletions) / len(relevant_prs)
             
             return repo_analysis
-            
+        
         except Exception as e:
-            logger.error(f"Error analyzing repository {repo.name}: {e}")
+            logger.error(f"Error analyzing repository {repo_name}: {e}")
             return {
-                "repository_name": repo.name,
-                "repository_full_name": repo.full_name,
+                "repository_name": repo_name,
+                "repository_full_name": repo_full_name,
                 "pull_request_count": 0,
                 "merged_count": 0,
                 "closed_count": 0,
@@ -171,40 +193,40 @@ class PullRequestAnalyzer:
                 "pull_requests": []
             }
     
-    def _user_participated_in_pr(self, pr, username: str) -> bool:
+    def _user_participated_in_pr(self, pr: Dict[str, Any], username: str) -> bool:
         """Check if user participated in PR as reviewer or commenter (simplified for performance)"""
         try:
             # Only check if user is author for performance
-            return pr.user and pr.user.login == username
-            
+            return pr["user"]["login"] == username
+        
         except Exception as e:
             logger.warning(f"Error checking PR participation: {e}")
             return False
     
-    async def _extract_pull_request_data(self, pr, username: str) -> Dict[str, Any]:
+    async def _extract_pull_request_data(self, pr: Dict[str, Any], username: str) -> Dict[str, Any]:
         """Extract comprehensive data from a pull request"""
         try:
             # Basic PR information
             pr_data = {
-                "number": pr.number,
-                "title": pr.title,
-                "state": pr.state,
-                "merged": pr.merged if hasattr(pr, 'merged') else False,
-                "created_at": pr.created_at.isoformat(),
-                "updated_at": pr.updated_at.isoformat(),
-                "closed_at": pr.closed_at.isoformat() if pr.closed_at else None,
-                "merged_at": pr.merged_at.isoformat() if hasattr(pr, 'merged_at') and pr.merged_at else None,
-                "author": pr.user.login,
-                "is_author": pr.user.login == username,
-                "additions": pr.additions,
-                "deletions": pr.deletions,
-                "changed_files": pr.changed_files,
-                "commits": pr.commits,
-                "url": pr.html_url
+                "number": pr["number"],
+                "title": pr["title"],
+                "state": pr["state"],
+                "merged": pr.get("merged", False),
+                "created_at": pr["created_at"],
+                "updated_at": pr["updated_at"],
+                "closed_at": pr.get("closed_at"),
+                "merged_at": pr.get("merged_at"),
+                "author": pr["user"]["login"],
+                "is_author": pr["user"]["login"] == username,
+                "additions": pr["additions"],
+                "deletions": pr["deletions"],
+                "changed_files": pr["changed_files"],
+                "commits": pr["commits"],
+                "url": pr["html_url"]
             }
             
             # Calculate PR size category
-            total_changes = pr.additions + pr.deletions
+            total_changes = pr["additions"] + pr["deletions"]
             if total_changes <= 50:
                 pr_data["size_category"] = "small"
             elif total_changes <= 200:
@@ -214,25 +236,30 @@ class PullRequestAnalyzer:
             else:
                 pr_data["size_category"] = "xl"
             
-            # Simplified review information (skip detailed analysis for speed)
-            pr_data["review_count"] = 0
-            pr_data["reviewers"] = []
-            pr_data["unique_reviewers"] = []
-            pr_data["approved_reviews"] = 0
-            pr_data["requested_changes"] = 0
-            
-            # Simplified comment information
-            pr_data["comment_count"] = 0
+            # Review information (fetched with the pull request)
+            reviews = pr.get("reviews", [])
+            reviewers = [review["user"]["login"] for review in reviews]
+            pr_data["review_count"] = pr.get("review_count", len(reviews))
+            pr_data["reviewers"] = reviewers
+            pr_data["unique_reviewers"] = list(dict.fromkeys(reviewers))
+            pr_data["approved_reviews"] = len([review for review in reviews if review["state"] == "APPROVED"])
+            pr_data["requested_changes"] = len([review for review in reviews if review["state"] == "CHANGES_REQUESTED"])
+            
+            # Comment information
+            pr_data["comment_count"] = pr.get("comments", 0)
             pr_data["discussion_participants"] = []
             
             # Timing analysis
-            if pr.created_at and pr.closed_at:
-                time_to_close = (pr.closed_at - pr.created_at).total_seconds() / 3600  # hours
+            created_at = datetime.fromisoformat(pr["created_at"].replace('Z', '+00:00'))
+            if pr.get("closed_at"):
+                closed_at = datetime.fromisoformat(pr["closed_at"].replace('Z', '+00:00'))
+                time_to_close = (closed_at - created_at).total_seconds() / 3600  # hours
                 pr_data["time_to_close_hours"] = round(time_to_close, 2)
             
-            if reviews and pr.created_at:
-                first_review_time = min(review.submitted_at for review in reviews if review.submitted_at)
-                time_to_first_review = (first_review_time - pr.created_at).total_seconds() / 3600
+            review_times = [review["submitted_at"] for review in reviews if review["submitted_at"]]
+            if review_times:
+                first_review_time = datetime.fromisoformat(min(review_times).replace('Z', '+00:00'))
+                time_to_first_review = (first_review_time - created_at).total_seconds() / 3600
                 pr_data["time_to_first_review_hours"] = round(time_to_first_review, 2)
             
             # Quality indicators
@@ -241,54 +268,43 @@ class PullRequestAnalyzer:
             pr_data["is_breaking_change"] = self._is_breaking_change(pr)
             
             return pr_data
-            
+        
         except Exception as e:
             logger.error(f"Error extracting PR data: {e}")
             return {
-                "number": pr.number,
-                "title": pr.title,
-                "state": pr.state,
+                "number": pr.get("number"),
+                "title": pr.get("title"),
+                "state": pr.get("state"),
                 "error": str(e)
             }
     
-    def _pr_has_tests(self, pr) -> bool:
+    def _pr_has_tests(self, pr: Dict[str, Any]) -> bool:
         """Check if PR includes test files"""
-        try:
-            files = list(pr.get_files())
-            test_patterns = ['test', 'spec', '__test__', '.test.', '.spec.']
-            
-            for file in files:
-                filename = file.filename.lower()
-                if any(pattern in filename for pattern in test_patterns):
-                    return True
-            return False
-        except:
-            return False
+        test_patterns = ['test', 'spec', '__test__', '.test.', '.spec.']
+        
+        for filename in pr.get("files", []):
+            filename = filename.lower()
+            if any(pattern in filename for pattern in test_patterns):
+                return True
+        return False
     
-    def _pr_has_documentation(self, pr) -> bool:
+    def _pr_has_documentation(self, pr: Dict[str, Any]) -> bool:
         """Check if PR includes documentation updates"""
-        try:
-            files = list(pr.get_files())
-            doc_patterns = ['readme', 'doc', '.md', 'changelog', 'contributing']
-            
-            for file in files:
-                filename = file.filename.lower()
-                if any(pattern in filename for pattern in doc_patterns):
-                    return True
-            return False
-        except:
-            return False
+        doc_patterns = ['readme', 'doc', '.md', 'changelog', 'contributing']
+        
+        for filename in pr.get("files", []):
+            filename = filename.lower()
+            if any(pattern in filename for pattern in doc_patterns):
+                return True
+        return False
     
-    def _is_breaking_change(self, pr) -> bool:
+    def _is_breaking_change(self, pr: Dict[str, Any]) -> bool:
         """Check if PR represents a breaking change"""
-        try:
-            # Check title and body for breaking change indicators
-            text = (pr.title + " " + (pr.body or "")).lower()
-            breaking_indicators = ['breaking', 'breaking change', 'major', 'incompatible', 'deprecated']
-            
-            return any(indicator in text for indicator in breaking_indicators)
-        except:
-            return False
+        # Check title and body for breaking change indicators
+        text = ((pr.get("title") or "") + " " + (pr.get("body") or "")).lower()
+        breaking_indicators = ['breaking', 'breaking change', 'major', 'incompatible', 'deprecated']
+        
+        return any(indicator in text for indicator in breaking_indicators)
     
     async def _calculate_aggregate_metrics(self, all_prs: List[Dict], analysis: Dict[str, Any]) -> None:
         """Calculate aggregate metrics across all pull requests"""
@@ -460,21 +476,27 @@ class PullRequestAnalyzer:
             
             analysis = self._empty_pr_analysis()
             
-            for repo_data in repositories:
+            repo_names = [
+                repo_data.get("full_name") or repo_data.get("name", "")
+                for repo_data in repositories
+            ]
+            pull_request_activity = await self._fetch_pull_request_activity(
+                [repo_name for repo_name in repo_names if '/' in repo_name]
+            )
+            
+            for repo_data, repo_name in zip(repositories, repo_names):
                 try:
-                    repo_name = repo_data.get("full_name") or repo_data.get("name", "")
                     if not repo_name:
                         continue
                     
-                    # Get repository object
-                    repo = self.github.get_repo(repo_name)
-                    
                     # Analyze this repository's pull requests
-                    repo_analysis = await self._analyze_repository_pull_requests(repo, repo_data.get("owner", {}).get("login", ""))
+                    repo_analysis = await self._analyze_repository_pull_requests(
+                        repo_name, pull_request_activity.get(repo_name), repo_data.get("owner", {}).get("login", "")
+                    )
                     
                     # Merge results into overall analysis
                     self._merge_pr_analysis(analysis, repo_analysis)
-                    
+                
                 except Exception as e:
                     logger.warning(f"Failed to analyze PRs for repository {repo_data.get('name', 'unknown')}: {e}")
                     continue
@@ -484,7 +506,7 @@ class PullRequestAnalyzer:
             
             logger.info(f"Completed PR analysis for {len(repositories)} repositories")
             return analysis
-            
+        
         except Exception as e:
             logger.error(f"Error analyzing repositories pull requests: {e}")
             return self._empty_pr_analysis()
@@ -493,21 +515,22 @@ class PullRequestAnalyzer:
         """Merge repository PR analysis into main analysis"""
         try:
             # Merge summary data
-            main_analysis["summary"]["total_pull_requests"] += repo_analysis["summary"]["total_pull_requests"]
-            main_analysis["summary"]["merged_pull_requests"] += repo_analysis["summary"]["merged_pull_requests"]
-            main_analysis["summary"]["closed_pull_requests"] += repo_analysis["summary"]["closed_pull_requests"]
-            main_analysis["summary"]["open_pull_requests"] += repo_analysis["summary"]["open_pull_requests"]
+            main_analysis["summary"]["total_pull_requests"] += repo_analysis["pull_request_count"]
+            main_analysis["summary"]["merged_pull_requests"] += repo_analysis["merged_count"]
+            main_analysis["summary"]["closed_pull_requests"] += repo_analysis["closed_count"]
+            main_analysis["summary"]["open_pull_requests"] += repo_analysis["open_count"]
             
-            if repo_analysis["summary"]["total_pull_requests"] > 0:
+            if repo_analysis["pull_request_count"] > 0:
                 main_analysis["summary"]["repositories_with_prs"] += 1
             
             # Merge collaboration data
             if isinstance(main_analysis["collaboration"]["unique_reviewers"], list):
-                main_analysis["collaboration"]["unique_reviewers"].extend(repo_analysis["collaboration"]["unique_reviewers"])
+                for pr_data in repo_analysis["pull_requests"]:
+                    main_analysis["collaboration"]["unique_reviewers"].extend(pr_data.get("unique_reviewers", []))
             
             # Add repository breakdown
             main_analysis["repository_breakdown"].append(repo_analysis)
-            
+        
         except Exception as e:
             logger.warning(f"Error merging PR analysis: {e}")
     
@@ -524,6 +547,6 @@ class PullRequestAnalyzer:
             # Remove duplicates from reviewers
             if isinstance(analysis["collaboration"]["unique_reviewers"], list):
                 analysis["collaboration"]["unique_reviewers"] = list(set(analysis["collaboration"]["unique_reviewers"]))
-            
+        
         except Exception as e:
             logger.warning(f"Error calculating final PR metrics: {e}")
\ No newline at end of file
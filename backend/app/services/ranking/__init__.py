@@ -5,8 +5,10 @@ Calculates and manages regional and university rankings
 
 from .regional_calculator import RegionalRankingCalculator
 from .university_calculator import UniversityRankingCalculator
+from .score_distribution import ScoreDistribution
 
 __all__ = [
     'RegionalRankingCalculator',
-    'UniversityRankingCalculator'
+    'UniversityRankingCalculator',
+    'ScoreDistribution'
 ]
@@ -9,6 +9,7 @@ import logging
 import re
 
 from app.services.storage import RankingStorageService, UserStorageService
+from app.services.ranking.score_distribution import ScoreDistribution
 
 logger = logging.getLogger(__name__)
 
@@ -62,7 +63,7 @@ class RegionalRankingCalculator:
         region = user.region or 'IN'
         
         # Get all users in region
-        users_in_region = await self.user_storage.get_users_by_region(region)
+        users_in_region = await self.user_storage.get_ranked_users_by_region(region)
         
         if not users_in_region:
             # User is the only one in region
@@ -120,7 +121,7 @@ class RegionalRankingCalculator:
         self.logger.info(f"Calculating rankings for region: {region}")
         
         # Get all users in region
-        users = await self.user_storage.get_users_by_region(region)
+        users = await self.user_storage.get_ranked_users_by_region(region)
         
         if not users:
             self.logger.warning(f"No users found in region: {region}")
@@ -144,7 +145,7 @@ class RegionalRankingCalculator:
             await self.ranking_storage.update_regional_ranking(
                 user_id=user.user_id,
                 github_username=user.github_username,
-                name=user.full_name,
+                name=user.name,
                 region=region,
                 state=user.state,
                 district=user.district,
@@ -209,24 +210,13 @@ class RegionalRankingCalculator:
         if not all_scores:
             return 1, 100.0, 1
         
-        # Sort scores in descending order
-        sorted_scores = sorted(all_scores, reverse=True)
+        # Rank is 1 + number of strictly higher scores; percentile counts
+        # everyone ranked below (higher is better)
+        distribution = ScoreDistribution(all_scores)
+        rank = distribution.competition_ranks([user_score])[0]
+        percentile = distribution.rank_percentiles([user_score])[0]
         
-        # Find rank (1-based)
-        rank = 1
-        for score in sorted_scores:
-            if score > user_score:
-                rank += 1
-            else:
-                break
-        
-        total_users = len(sorted_scores)
-        
-        # Calculate percentile (higher is better)
-        users_below = total_users - rank
-        percentile = (users_below / total_users * 100) if total_users > 1 else 100.0
-        
-        return rank, round(percentile, 1), total_users
+        return rank, percentile, len(distribution)
     
     async def _get_all_regions(self) -> List[str]:
         """
@@ -0,0 +1,250 @@
+"""
+Score Distribution
+Ranks, percentiles and summary statistics for a whole comparison group
+
+All ranking paths share these semantics:
+- rank is a competition rank: 1 + the number of strictly higher scores, so
+  tied users share a rank and the next rank skips past them
+- percentile is the share of the group with a strictly lower score
+  ("you scored better than X% of users"), rounded to one decimal
+- median is the upper middle score, sorted_scores[n // 2]
+
+The group is sorted once and every user's position is found by binary
+search over the sorted scores (numpy.searchsorted for the whole group at
+once, bisect when NumPy is not installed) instead of a linear scan per user.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+
+# Upper bounds of the score distribution buckets; the last bucket is open
+SCORE_BUCKET_EDGES = (20.0, 40.0, 60.0, 80.0)
+SCORE_BUCKET_LABELS = ('0-20', '20-40', '40-60', '60-80', '80-100')
+
+
+def clamp_scores(values: Sequence[float], low: float = 0.0, high: float = 100.0) -> Any:
+    """
+    Clamp scores into [low, high]
+
+    Args:
+        values: Scores
+        low: Lower bound
+        high: Upper bound
+
+    Returns:
+        Clamped scores (NumPy array, or a list without NumPy)
+    """
+    if NUMPY_AVAILABLE:
+        return np.clip(np.asarray(values, dtype=np.float64), low, high)
+    return [max(low, min(high, value)) for value in values]
+
+
+class ScoreDistribution:
+    """
+    The sorted scores of one comparison group
+
+    Every query takes a sequence of scores and answers for all of them in
+    one call, so ranking a group of n users costs one sort plus n binary
+    searches.
+    """
+
+    __slots__ = ('sorted_scores', 'total', 'score_sum')
+
+    def __init__(self, scores: Sequence[float]):
+        """
+        Sort a group's scores
+
+        Args:
+            scores: Scores of every user in the group (list or float64 array)
+        """
+        if NUMPY_AVAILABLE:
+            values = np.asarray(scores, dtype=np.float64)
+            self.sorted_scores = np.sort(values)
+            # Accumulated left to right, as sum() adds them, so means round
+            # exactly like the per-user code did
+            self.score_sum = float(np.cumsum(values)[-1]) if len(values) else 0.0
+        else:
+            values = [float(score) for score in scores]
+            self.sorted_scores = sorted(values)
+            self.score_sum = sum(values)
+        self.total = len(values)
+
+    def __len__(self) -> int:
+        return self.total
+
+    def _search(self, values: Sequence[float], side: str) -> Any:
+        """Insertion points of values in the sorted scores"""
+        if NUMPY_AVAILABLE:
+            return np.searchsorted(self.sorted_scores, np.asarray(values, dtype=np.float64), side=side)
+        search = bisect_left if side == 'left' else bisect_right
+        return [search(self.sorted_scores, value) for value in values]
+
+    def counts(self, values: Sequence[float]) -> Tuple[List[int], List[int], List[int]]:
+        """
+        Number of scores strictly below, equal to and strictly above each value
+
+        Args:
+            values: Scores to place in the group
+
+        Returns:
+            Tuple of (below, equal, above) lists, in input order
+        """
+        left = self._search(values, 'left')
+        right = self._search(values, 'right')
+        if NUMPY_AVAILABLE:
+            return left.tolist(), (right - left).tolist(), (self.total - right).tolist()
+        return (
+            left,
+            [r - l for l, r in zip(left, right)],
+            [self.total - r for r in right]
+        )
+
+    def competition_ranks(self, values: Sequence[float]) -> List[int]:
+        """
+        Competition rank of each value (1 = best, ties share a rank)
+
+        Args:
+            values: Scores to rank
+
+        Returns:
+            Ranks, in input order
+        """
+        right = self._search(values, 'right')
+        if NUMPY_AVAILABLE:
+            return (self.total + 1 - right).tolist()
+        return [self.total + 1 - r for r in right]
+
+    def percentiles(self, values: Sequence[float]) -> List[float]:
+        """
+        Percentage of the group strictly below each value, rounded to one decimal
+
+        A group of one is at 100.0; an empty group gives 0.0.
+
+        Args:
+            values: Scores to place in the group
+
+        Returns:
+            Percentiles, in input order
+        """
+        if self.total == 0:
+            return [0.0] * len(values)
+        if self.total == 1:
+            return [100.0] * len(values)
+
+        below = self._search(values, 'left')
+        if NUMPY_AVAILABLE:
+            fractions = (below / self.total * 100).tolist()
+        else:
+            fractions = [count / self.total * 100 for count in below]
+        return [round(fraction, 1) for fraction in fractions]
+
+    def rank_percentiles(self, values: Sequence[float]) -> List[float]:
+        """
+        Percentage of the group ranked below each value's competition rank
+
+        (total - rank) / total × 100, rounded to one decimal, so users tied
+        with the value count as below it. A group of one is at 100.0.
+
+        Args:
+            values: Scores to place in the group
+
+        Returns:
+            Percentiles, in input order
+        """
+        if self.total <= 1:
+            return [100.0] * len(values)
+
+        ranks = self.competition_ranks(values)
+        return [round((self.total - rank) / self.total * 100, 1) for rank in ranks]
+
+    def order_statistic(self, index: int) -> float:
+        """Score at an index of the ascending order"""
+        return float(self.sorted_scores[index])
+
+    @property
+    def mean(self) -> float:
+        """Average score (0.0 for an empty group)"""
+        return self.score_sum / self.total if self.total else 0.0
+
+    @property
+    def median(self) -> float:
+        """Upper middle score, sorted_scores[n // 2]"""
+        return self.order_statistic(self.total // 2)
+
+    @property
+    def lower_median(self) -> float:
+        """Lower middle score, sorted_scores[(n - 1) // 2]"""
+        return self.order_statistic((self.total - 1) // 2)
+
+    def quartiles(self) -> Tuple[float, float, float]:
+        """
+        First quartile, median and third quartile
+
+        Nearest-rank order statistics at n // 4, n // 2 and 3n // 4, the
+        same convention as median.
+
+        Returns:
+            Tuple of (q1, median, q3)
+        """
+        indices = [self.total // 4, self.total // 2, (3 * self.total) // 4]
+        if NUMPY_AVAILABLE:
+            return tuple(self.sorted_scores[indices].tolist())
+        return tuple(self.sorted_scores[index] for index in indices)
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Average, median, minimum and maximum, rounded to one decimal
+
+        Returns:
+            Dictionary with avg_score, median_score, min_score, max_score
+            and total_users (all zero for an empty group)
+        """
+        if not self.total:
+            return {
+                "avg_score": 0.0,
+                "median_score": 0.0,
+                "min_score": 0.0,
+                "max_score": 0.0,
+                "total_users": 0
+            }
+
+        return {
+            "avg_score": round(self.mean, 1),
+            "median_score": round(self.median, 1),
+            "min_score": round(self.order_statistic(0), 1),
+            "max_score": round(self.order_statistic(-1), 1),
+            "total_users": self.total
+        }
+
+    def histogram(self, edges: Sequence[float] = SCORE_BUCKET_EDGES) -> List[int]:
+        """
+        Number of scores per bucket
+
+        Bucket 0 holds scores below edges[0], bucket i scores in
+        [edges[i - 1], edges[i]) and the last bucket everything from
+        edges[-1] up.
+
+        Args:
+            edges: Ascending bucket bounds
+
+        Returns:
+            len(edges) + 1 counts
+        """
+        if NUMPY_AVAILABLE:
+            bounds = np.searchsorted(self.sorted_scores, np.asarray(edges, dtype=np.float64), side='left').tolist()
+        else:
+            bounds = [bisect_left(self.sorted_scores, edge) for edge in edges]
+        bounds = [0] + bounds + [self.total]
+        return [upper - lower for lower, upper in zip(bounds, bounds[1:])]
+
+    def bucket_counts(self) -> Dict[str, int]:
+        """Histogram over the standard 0-100 score buckets, keyed by label"""
+        return dict(zip(SCORE_BUCKET_LABELS, self.histogram(SCORE_BUCKET_EDGES)))
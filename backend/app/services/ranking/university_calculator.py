@@ -8,6 +8,7 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 import logging
 
 from app.services.storage import RankingStorageService, UserStorageService
+from app.services.ranking.score_distribution import ScoreDistribution
 
 logger = logging.getLogger(__name__)
 
@@ -61,7 +62,7 @@ class UniversityRankingCalculator:
             raise ValueError(f"User has no university: {user_id}")
         
         # Get all users in university
-        users_in_university = await self.user_storage.get_users_by_university(
+        users_in_university = await self.user_storage.get_ranked_users_by_university(
             user.university
         )
         
@@ -121,7 +122,7 @@ class UniversityRankingCalculator:
         self.logger.info(f"Calculating rankings for university: {university}")
         
         # Get all users in university
-        users = await self.user_storage.get_users_by_university(university)
+        users = await self.user_storage.get_ranked_users_by_university(university)
         
         if not users:
             self.logger.warning(f"No users found in university: {university}")
@@ -145,7 +146,7 @@ class UniversityRankingCalculator:
             await self.ranking_storage.update_university_ranking(
                 user_id=user.user_id,
                 github_username=user.github_username,
-                name=user.full_name,
+                name=user.name,
                 university=user.university,
                 university_short=user.university_short or user.university,
                 overall_score=user.overall_score or 0.0,
@@ -211,24 +212,13 @@ class UniversityRankingCalculator:
         if not all_scores:
             return 1, 100.0, 1
         
-        # Sort scores in descending order
-        sorted_scores = sorted(all_scores, reverse=True)
+        # Rank is 1 + number of strictly higher scores; percentile counts
+        # everyone ranked below (higher is better)
+        distribution = ScoreDistribution(all_scores)
+        rank = distribution.competition_ranks([user_score])[0]
+        percentile = distribution.rank_percentiles([user_score])[0]
         
-        # Find rank (1-based)
-        rank = 1
-        for score in sorted_scores:
-            if score > user_score:
-                rank += 1
-            else:
-                break
-        
-        total_users = len(sorted_scores)
-        
-        # Calculate percentile (higher is better)
-        users_below = total_users - rank
-        percentile = (users_below / total_users * 100) if total_users > 1 else 100.0
-        
-        return rank, round(percentile, 1), total_users
+        return rank, percentile, len(distribution)
     
     async def _get_all_universities(self) -> List[str]:
         """
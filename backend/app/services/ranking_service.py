@@ -11,6 +11,8 @@ from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pymongo import UpdateOne
 from app.database import Collections
+from app.models.ranking import RankedGroup
+from app.services.ranking.score_distribution import ScoreDistribution, clamp_scores
 
 logger = logging.getLogger(__name__)
 
@@ -121,43 +123,43 @@ class RankingService:
             
             # Execute aggregation
             cursor = self.db[Collections.INTERNAL_USERS].aggregate(pipeline)
-            all_joined_data = await cursor.to_list(None)
             
-            # Handle duplicates by keeping most recent record per github_username
+            # Handle duplicates by keeping most recent record per github_username,
+            # consuming the cursor as it streams so duplicates are never held
             unique_users = {}
             duplicate_count = 0
             
-            for user in all_joined_data:
+            async for user in cursor:
                 github_username = user["github_username"]
                 
                 if github_username in unique_users:
                     duplicate_count += 1
-                    logger.warning(f"Duplicate github_username found: {github_username}. Using most recent record.")
+                    logger.warning("Duplicate github_username found: %s. Using most recent record.", github_username)
                     continue
                 
                 # Validate user completeness
                 if self.validate_user_completeness(user):
                     unique_users[github_username] = user
                 else:
-                    logger.debug(f"User {user.get('user_id')} excluded due to incomplete data")
+                    logger.debug("User %s excluded due to incomplete data", user.get('user_id'))
             
             joined_data = list(unique_users.values())
             
             if duplicate_count > 0:
-                logger.warning(f"Found and resolved {duplicate_count} duplicate github usernames")
+                logger.warning("Found and resolved %s duplicate github usernames", duplicate_count)
             
-            logger.info(f"Successfully joined {len(joined_data)} complete user profiles")
+            logger.info("Successfully joined %s complete user profiles", len(joined_data))
             return joined_data
             
         except Exception as e:
-            logger.error(f"Error joining user data: {e}")
+            logger.error("Error joining user data: %s", e)
             # Return empty list for graceful degradation, but log the error
             if "timeout" in str(e).lower():
                 logger.error("Database timeout occurred during user data joining")
             elif "connection" in str(e).lower():
                 logger.error("Database connection error during user data joining")
             else:
-                logger.error(f"Unexpected error during user data joining: {type(e).__name__}")
+                logger.error("Unexpected error during user data joining: %s", type(e).__name__)
             return []
     
     def validate_user_completeness(self, user_data: Dict[str, Any]) -> bool:
@@ -190,39 +192,39 @@ class RankingService:
             
             # Check for None or empty values
             if value is None:
-                logger.debug(f"User {user_id} missing {description} ({field}): None")
+                logger.debug("User %s missing %s (%s): None", user_id, description, field)
                 return False
             
             # Check for empty strings
             if isinstance(value, str) and value.strip() == "":
-                logger.debug(f"User {user_id} missing {description} ({field}): empty string")
+                logger.debug("User %s missing %s (%s): empty string", user_id, description, field)
                 return False
             
             # Special validation for profile_completed
             if field == "profile_completed" and not value:
-                logger.debug(f"User {user_id} has incomplete profile")
+                logger.debug("User %s has incomplete profile", user_id)
                 return False
         
         # Validate score range and type
         score = user_data.get("overall_score", 0)
         if not isinstance(score, (int, float)):
-            logger.debug(f"User {user_id} has non-numeric score: {score} (type: {type(score)})")
+            logger.debug("User %s has non-numeric score: %s (type: %s)", user_id, score, type(score))
             return False
         
         if not (0 <= score <= 100):
-            logger.debug(f"User {user_id} has out-of-range score: {score}")
+            logger.debug("User %s has out-of-range score: %s", user_id, score)
             return False
         
         # Validate username format (basic check)
         github_username = user_data.get("github_username", "")
         if len(github_username) < 1 or len(github_username) > 39:  # GitHub username limits
-            logger.debug(f"User {user_id} has invalid github_username length: {github_username}")
+            logger.debug("User %s has invalid github_username length: %s", user_id, github_username)
             return False
         
         # Check for suspicious characters in username
         import re
         if not re.match(r'^[a-zA-Z0-9\-_]+$', github_username):
-            logger.debug(f"User {user_id} has invalid github_username format: {github_username}")
+            logger.debug("User %s has invalid github_username format: %s", user_id, github_username)
             return False
         
         return True
@@ -259,21 +261,15 @@ class RankingService:
         
         # Validate and clamp score range
         if not isinstance(user_score, (int, float)):
-            logger.warning(f"Non-numeric score provided: {user_score}")
+            logger.warning("Non-numeric score provided: %s", user_score)
             return 0.0
             
         if not (0 <= user_score <= 100):
-            logger.warning(f"Score {user_score} outside valid range [0, 100], clamping")
+            logger.warning("Score %s outside valid range [0, 100], clamping", user_score)
             user_score = max(0, min(100, user_score))
         
-        # Count users with strictly lower scores
-        users_below = sum(1 for score in all_scores if score < user_score)
-        total_users = len(all_scores)
-        
-        # Calculate percentile: percentage of users you scored better than
-        percentile = (users_below / total_users) * 100
-        
-        return round(percentile, 1)
+        # Percentage of users with strictly lower scores
+        return ScoreDistribution(all_scores).percentiles([user_score])[0]
     
     def calculate_rank_position(self, user_score: float, all_scores: List[float]) -> int:
         """
@@ -297,16 +293,11 @@ class RankingService:
         
         # Validate score
         if not isinstance(user_score, (int, float)):
-            logger.warning(f"Non-numeric score provided for ranking: {user_score}")
+            logger.warning("Non-numeric score provided for ranking: %s", user_score)
             return len(all_scores)  # Worst possible rank
         
-        # Count users with strictly better scores
-        users_above = sum(1 for score in all_scores if score > user_score)
-        
-        # Rank is 1 + number of users with better scores
-        rank = users_above + 1
-        
-        return rank
+        # Rank is 1 + number of users with strictly better scores
+        return ScoreDistribution(all_scores).competition_ranks([user_score])[0]
     
     def calculate_statistics(self, scores: List[float]) -> Dict[str, float]:
         """
@@ -318,25 +309,31 @@ class RankingService:
         Returns:
             Dictionary with statistical measures
         """
-        if not scores:
-            return {
-                "avg_score": 0.0,
-                "median_score": 0.0,
-                "min_score": 0.0,
-                "max_score": 0.0,
-                "total_users": 0
-            }
+        return ScoreDistribution(scores).summary()
+    
+    def calculate_group_rankings(self, scores: List[float]) -> Tuple[List[float], List[int], Dict[str, float]]:
+        """
+        Calculate every user's percentile and rank in a group in one pass
         
-        sorted_scores = sorted(scores)
-        total_users = len(scores)
+        Matches calculate_percentile() and calculate_rank_position() for each
+        score, but sorts the group once instead of scanning it per user.
         
-        return {
-            "avg_score": round(sum(scores) / total_users, 1),
-            "median_score": round(sorted_scores[total_users // 2], 1),
-            "min_score": round(min(scores), 1),
-            "max_score": round(max(scores), 1),
-            "total_users": total_users
-        }
+        Args:
+            scores: Scores of every user in the group
+        
+        Returns:
+            Tuple of (percentiles, ranks, statistics), percentiles and ranks
+            in the order of scores
+        """
+        distribution = ScoreDistribution(scores)
+        
+        if len(distribution) > 1 and (distribution.order_statistic(0) < 0 or distribution.order_statistic(-1) > 100):
+            logger.warning("Scores outside valid range [0, 100] in group, clamping for percentiles")
+        
+        percentiles = distribution.percentiles(clamp_scores(scores))
+        ranks = distribution.competition_ranks(scores)
+        
+        return percentiles, ranks, distribution.summary()
     
     # ========================================================================
     # Regional Ranking Methods
@@ -353,7 +350,7 @@ class RankingService:
             Dictionary with update statistics
         """
         try:
-            logger.info(f"Updating regional rankings for district: {district}")
+            logger.info("Updating regional rankings for district: %s", district)
             
             # Get joined user data for this district
             pipeline = [
@@ -399,11 +396,10 @@ class RankingService:
                 }
             ]
             
-            cursor = self.db[Collections.INTERNAL_USERS].aggregate(pipeline)
-            users = await cursor.to_list(None)
+            group = await RankedGroup.from_cursor(self.db[Collections.INTERNAL_USERS].aggregate(pipeline))
             
-            if not users:
-                logger.warning(f"No users found in district: {district}")
+            if not group.users:
+                logger.warning("No users found in district: %s", district)
                 return {
                     "success": True,
                     "district": district,
@@ -411,29 +407,25 @@ class RankingService:
                     "message": "No users in district"
                 }
             
-            total_users = len(users)
-            all_scores = [u["overall_score"] for u in users]
+            total_users = len(group)
             
-            # Calculate statistics using improved method
-            stats = self.calculate_statistics(all_scores)
+            # Percentiles, ranks and statistics for the whole group at once
+            percentiles, ranks, stats = self.calculate_group_rankings(group.scores)
             
-            logger.info(f"Found {total_users} users in district {district}")
+            logger.info("Found %s users in district %s", total_users, district)
             
             # Prepare regional ranking documents
             regional_rankings = []
             
-            for user in users:
-                percentile = self.calculate_percentile(user["overall_score"], all_scores)
-                rank = self.calculate_rank_position(user["overall_score"], all_scores)
-                
+            for user, percentile, rank in zip(group.users, percentiles, ranks):
                 regional_ranking = {
-                    "user_id": user["user_id"],
-                    "github_username": user["github_username"],
-                    "name": user["name"],
+                    "user_id": user.user_id,
+                    "github_username": user.github_username,
+                    "name": user.name,
                     "district": district,
-                    "state": user["state"],
-                    "region": user["region"],
-                    "overall_score": user["overall_score"],
+                    "state": user.state,
+                    "region": user.region,
+                    "overall_score": user.overall_score,
                     "rank": rank,
                     "total_users": stats["total_users"],
                     "percentile": percentile,
@@ -451,7 +443,7 @@ class RankingService:
                 # Insert new rankings
                 await self.db[Collections.REGIONAL_RANKINGS].insert_many(regional_rankings)
                 
-                logger.info(f"Updated {len(regional_rankings)} regional rankings for district {district}")
+                logger.info("Updated %s regional rankings for district %s", len(regional_rankings), district)
                 
                 return {
                     "success": True,
@@ -470,7 +462,7 @@ class RankingService:
             }
             
         except Exception as e:
-            logger.error(f"Error updating regional rankings for {district}: {e}")
+            logger.error("Error updating regional rankings for %s: %s", district, e)
             return {
                 "success": False,
                 "district": district,
@@ -498,7 +490,7 @@ class RankingService:
             return None
             
         except Exception as e:
-            logger.error(f"Error getting regional ranking for user {user_id}: {e}")
+            logger.error("Error getting regional ranking for user %s: %s", user_id, e)
             return None
     
     # ========================================================================
@@ -516,7 +508,7 @@ class RankingService:
             Dictionary with update statistics
         """
         try:
-            logger.info(f"Updating university rankings for: {university_short}")
+            logger.info("Updating university rankings for: %s", university_short)
             
             # Get joined user data for this university
             pipeline = [
@@ -561,11 +553,10 @@ class RankingService:
                 }
             ]
             
-            cursor = self.db[Collections.INTERNAL_USERS].aggregate(pipeline)
-            users = await cursor.to_list(None)
+            group = await RankedGroup.from_cursor(self.db[Collections.INTERNAL_USERS].aggregate(pipeline))
             
-            if not users:
-                logger.warning(f"No users found in university: {university_short}")
+            if not group.users:
+                logger.warning("No users found in university: %s", university_short)
                 return {
                     "success": True,
                     "university_short": university_short,
@@ -573,28 +564,24 @@ class RankingService:
                     "message": "No users in university"
                 }
             
-            total_users = len(users)
-            all_scores = [u["overall_score"] for u in users]
+            total_users = len(group)
             
-            # Calculate statistics using improved method
-            stats = self.calculate_statistics(all_scores)
+            # Percentiles, ranks and statistics for the whole group at once
+            percentiles, ranks, stats = self.calculate_group_rankings(group.scores)
             
-            logger.info(f"Found {total_users} users in university {university_short}")
+            logger.info("Found %s users in university %s", total_users, university_short)
             
             # Prepare university ranking documents
             university_rankings = []
             
-            for user in users:
-                percentile = self.calculate_percentile(user["overall_score"], all_scores)
-                rank = self.calculate_rank_position(user["overall_score"], all_scores)
-                
+            for user, percentile, rank in zip(group.users, percentiles, ranks):
                 university_ranking = {
-                    "user_id": user["user_id"],
-                    "github_username": user["github_username"],
-                    "name": user["name"],
-                    "university": user["university"],
+                    "user_id": user.user_id,
+                    "github_username": user.github_username,
+                    "name": user.name,
+                    "university": user.university,
                     "university_short": university_short,
-                    "overall_score": user["overall_score"],
+                    "overall_score": user.overall_score,
                     "rank": rank,
                     "total_users": stats["total_users"],
                     "percentile": percentile,
@@ -612,7 +599,7 @@ class RankingService:
                 # Insert new rankings
                 await self.db[Collections.UNIVERSITY_RANKINGS].insert_many(university_rankings)
                 
-                logger.info(f"Updated {len(university_rankings)} university rankings for {university_short}")
+                logger.info("Updated %s university rankings for %s", len(university_rankings), university_short)
                 
                 return {
                     "success": True,
@@ -631,7 +618,7 @@ class RankingService:
             }
             
         except Exception as e:
-            logger.error(f"Error updating university rankings for {university_short}: {e}")
+            logger.error("Error updating university rankings for %s: %s", university_short, e)
             return {
                 "success": False,
                 "university_short": university_short,
@@ -659,7 +646,7 @@ class RankingService:
             return None
             
         except Exception as e:
-            logger.error(f"Error getting university ranking for user {user_id}: {e}")
+            logger.error("Error getting university ranking for user %s: %s", user_id, e)
             return None
     
     # ========================================================================
@@ -753,18 +740,18 @@ class RankingService:
             if district:
                 results["regional_update"] = await self.update_regional_rankings(district)
             else:
-                logger.warning(f"User {user_id} has no district set, skipping regional ranking")
+                logger.warning("User %s has no district set, skipping regional ranking", user_id)
             
             # Update university rankings
             if university_short:
                 results["university_update"] = await self.update_university_rankings(university_short)
             else:
-                logger.warning(f"User {user_id} has no university_short set, skipping university ranking")
+                logger.warning("User %s has no university_short set, skipping university ranking", user_id)
             
             return results
             
         except Exception as e:
-            logger.error(f"Error updating all rankings for user {user_id}: {e}")
+            logger.error("Error updating all rankings for user %s: %s", user_id, e)
             return {
                 "success": False,
                 "user_id": user_id,
@@ -798,7 +785,7 @@ class RankingService:
             return leaderboard
             
         except Exception as e:
-            logger.error(f"Error getting regional leaderboard for {district}: {e}")
+            logger.error("Error getting regional leaderboard for %s: %s", district, e)
             return []
     
     async def get_university_leaderboard(self, university_short: str, limit: int = 10) -> List[Dict[str, Any]]:
@@ -824,7 +811,7 @@ class RankingService:
             return leaderboard
             
         except Exception as e:
-            logger.error(f"Error getting university leaderboard for {university_short}: {e}")
+            logger.error("Error getting university leaderboard for %s: %s", university_short, e)
             return []
     
     # ========================================================================
@@ -845,7 +832,7 @@ class RankingService:
             )
             return sorted(districts)
         except Exception as e:
-            logger.error(f"Error getting districts: {e}")
+            logger.error("Error getting districts: %s", e)
             return []
     
     async def get_all_universities(self) -> List[str]:
@@ -862,5 +849,5 @@ class RankingService:
             )
             return sorted(universities)
         except Exception as e:
-            logger.error(f"Error getting universities: {e}")
+            logger.error("Error getting universities: %s", e)
             return []
\ No newline at end of file
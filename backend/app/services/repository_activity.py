@@ -0,0 +1,106 @@
+"""
+Repository Activity
+Pull request and issue statistics in the shape the frontend expects, built
+from the batched GraphQL repository activity
+(GitHubGraphQLClient.get_repository_activity)
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+def _hours_between(start: Optional[str], end: Optional[str]) -> Optional[float]:
+    """Hours between two GitHub timestamps, or None if either is missing"""
+    if not start or not end:
+        return None
+    started = datetime.fromisoformat(start.replace('Z', '+00:00'))
+    ended = datetime.fromisoformat(end.replace('Z', '+00:00'))
+    return (ended - started).total_seconds() / 3600
+
+
+def summarize_pull_requests(pull_requests: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Shape a repository's batched pull request activity for the frontend
+
+    Counts are the repository totals; averages and the recent list come from
+    the most recently updated pull requests fetched with them.
+    """
+    if not pull_requests['total']:
+        return None
+
+    prs = pull_requests['items']
+    merge_times = [
+        hours for hours in (_hours_between(pr['created_at'], pr['merged_at']) for pr in prs)
+        if hours is not None
+    ]
+    additions = [pr['additions'] for pr in prs if pr.get('additions')]
+    deletions = [pr['deletions'] for pr in prs if pr.get('deletions')]
+
+    return {
+        'total': pull_requests['total'],
+        'open': pull_requests['open'],
+        'closed': pull_requests['closed'],
+        'merged': pull_requests['merged'],
+        # Frontend expects 'recent', not 'recent_prs'
+        'recent': [
+            {
+                'number': pr['number'],
+                'title': pr['title'],
+                'author': pr['user']['login'],
+                'state': 'merged' if pr['merged_at'] else pr['state'],
+                'createdAt': pr['created_at'],
+                'mergedAt': pr['merged_at'],
+                'url': pr['html_url'] or ''
+            }
+            for pr in prs[:10]
+        ],
+        'avgTimeToMerge': sum(merge_times) / len(merge_times) if merge_times else None,  # Frontend expects camelCase
+        'avg_additions': sum(additions) / len(additions) if additions else None,
+        'avg_deletions': sum(deletions) / len(deletions) if deletions else None
+    }
+
+
+def summarize_issues(issues: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Shape a repository's batched issue activity for the frontend
+
+    Counts are the repository totals; the close time, label distribution and
+    recent list come from the most recently updated issues fetched with them.
+    """
+    if not issues['total']:
+        return None
+
+    items = issues['items']
+    close_times = [
+        hours for hours in (
+            _hours_between(issue['created_at'], issue['closed_at'])
+            for issue in items if issue['state'] == 'closed'
+        )
+        if hours is not None
+    ]
+    labels_dist = {}
+    for issue in items:
+        for label in issue['labels']:
+            labels_dist[label['name']] = labels_dist.get(label['name'], 0) + 1
+
+    return {
+        'total': issues['total'],
+        'open': issues['open'],
+        'closed': issues['closed'],
+        # Frontend expects 'recent', not 'recent_issues'
+        'recent': [
+            {
+                'number': issue['number'],
+                'title': issue['title'],
+                'author': issue['user']['login'],
+                'state': issue['state'],
+                'createdAt': issue['created_at'],
+                'closedAt': issue['closed_at'],
+                'url': issue['html_url'] or '',
+                'labels': [label['name'] for label in issue['labels']]
+            }
+            for issue in items[:10]
+        ],
+        'avgTimeToClose': sum(close_times) / len(close_times) if close_times else None,  # Frontend expects camelCase
+        'labelsDistribution': labels_dist  # Frontend expects camelCase
+    }
@@ -5,12 +5,26 @@ Categorizes repositories into flagship, significant, and supporting tiers.
 """
 
 import logging
+import time
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
 logger = logging.getLogger(__name__)
 
+# (max days since update, points), checked in order
+ACTIVITY_THRESHOLDS = [(7, 10), (30, 8), (90, 5), (180, 3), (365, 1)]
+
+# (min engagement, points), checked in order
+ENGAGEMENT_THRESHOLDS = [(500, 10), (200, 8), (100, 6), (50, 4), (20, 2), (5, 1)]
+
 
 class RepositoryImportanceScorer:
     """
@@ -92,6 +106,101 @@ class RepositoryImportanceScorer:
         
         return final_score
     
+    def calculate_importance_scores(self, repositories: List[Dict[str, Any]]) -> List[int]:
+        """
+        Calculate importance scores for many repositories in one pass.
+        
+        Size, file count, activity and engagement buckets are computed with
+        NumPy over columnar arrays; only the test and CI/CD keyword checks
+        run per repository. Results match calculate_importance_score().
+        
+        Args:
+            repositories: List of repository data dictionaries
+            
+        Returns:
+            Integer scores from 0 to 100, in input order
+        """
+        if not repositories:
+            return []
+        
+        if not NUMPY_AVAILABLE:
+            return [self.calculate_importance_score(repo) for repo in repositories]
+        
+        count = len(repositories)
+        size_kb = np.zeros(count, dtype=np.float64)
+        file_count = np.zeros(count, dtype=np.float64)
+        days_since_update = np.full(count, np.nan, dtype=np.float64)
+        engagement = np.zeros(count, dtype=np.float64)
+        keyword_points = np.zeros(count, dtype=np.int64)
+        now_ts = time.time()
+        
+        for i, repo in enumerate(repositories):
+            size = repo.get('size', 0) or 0
+            size_kb[i] = size
+            
+            exact_file_count = repo.get('file_count')
+            if exact_file_count is None:
+                file_count[i] = size / 10 if size > 0 else 0
+            else:
+                file_count[i] = exact_file_count
+            
+            days_since_update[i] = self._days_since_update(repo.get('updated_at'), now_ts)
+            
+            stars = repo.get('stargazers_count', 0) or repo.get('stars', 0) or 0
+            forks = repo.get('forks_count', 0) or repo.get('forks', 0) or 0
+            watchers = repo.get('watchers_count', 0) or repo.get('watchers', 0) or 0
+            engagement[i] = stars + (forks * 2) + watchers
+            
+            keyword_points[i] = (10 if self._has_tests(repo) else 0) + (10 if self._has_ci_cd(repo) else 0)
+        
+        loc_scores = self._threshold_points(size_kb * 35, self.loc_thresholds, default=5)
+        file_count_scores = self._threshold_points(file_count, self.file_count_thresholds, default=5)
+        engagement_scores = self._threshold_points(engagement, ENGAGEMENT_THRESHOLDS, default=0)
+        
+        # NaN (missing or unparseable date) fails every comparison and scores 0
+        activity_scores = np.select(
+            [days_since_update <= max_days for max_days, _ in ACTIVITY_THRESHOLDS],
+            [points for _, points in ACTIVITY_THRESHOLDS],
+            default=0
+        )
+        
+        scores = loc_scores + file_count_scores + keyword_points + activity_scores + engagement_scores
+        scores = np.clip(scores, 0, 100)
+        
+        logger.debug(f"Calculated {count} repository importance scores in batch")
+        
+        return [int(score) for score in scores.tolist()]
+    
+    @staticmethod
+    def _threshold_points(values: "np.ndarray", thresholds: List[Tuple[int, int]], default: int) -> "np.ndarray":
+        """Vectorized lookup of descending (min value, points) thresholds"""
+        return np.select(
+            [values >= threshold for threshold, _ in thresholds],
+            [points for _, points in thresholds],
+            default=default
+        )
+    
+    @staticmethod
+    def _days_since_update(updated_at: Any, now_ts: float) -> float:
+        """
+        Whole days since updated_at, matching _calculate_activity_score().
+        
+        Naive datetimes are interpreted as local time.
+        
+        Returns:
+            Days since update, or NaN when missing or unparseable
+        """
+        if not updated_at:
+            return float('nan')
+        
+        try:
+            if isinstance(updated_at, str):
+                updated_at = datetime.fromisoformat(updated_at.replace('Z', '+00:00'))
+            return float((now_ts - updated_at.timestamp()) // 86400)
+        except Exception as e:
+            logger.warning(f"Error calculating activity score: {e}")
+            return float('nan')
+    
     def _calculate_loc_score(self, repo: Dict[str, Any]) -> int:
         """
         Calculate score based on lines of code (30 points max).
@@ -147,6 +147,7 @@ class ScanProgressEmitter:
         pr_progress: Optional[Dict[str, Any]] = None,
         issue_progress: Optional[Dict[str, Any]] = None,
         analysis_metrics: Optional[Dict[str, Any]] = None,
+        partial_results: Optional[Dict[str, Any]] = None,
         status: str = "in_progress"
     ):
         """
@@ -161,6 +162,7 @@ class ScanProgressEmitter:
             pr_progress: Pull request fetching progress
             issue_progress: Issue fetching progress
             analysis_metrics: Code analysis metrics
+            partial_results: Scored repositories available before the scan completes
             status: Current status (in_progress, completed, error, paused)
             
         Requirements: 1.1, 1.2, 1.3, 1.4, 1.5
@@ -200,6 +202,9 @@ class ScanProgressEmitter:
             if analysis_metrics:
                 event["analysisMetrics"] = analysis_metrics
             
+            if partial_results:
+                event["partialResults"] = partial_results
+            
             # Broadcast to user via WebSocket
             await self.websocket_manager.broadcast_to_user(self.user_id, {
                 "type": "scan_progress",
@@ -307,6 +312,60 @@ class ScanProgressEmitter:
             repository_progress=repository_progress
         )
     
+    async def emit_partial_results(
+        self,
+        repositories: List[Dict[str, Any]],
+        fetched: int,
+        total: int,
+        summary: Optional[Dict[str, int]] = None
+    ):
+        """
+        Emit a page of scored repositories as soon as it is available.
+        
+        Lets the UI render Stage 1 results while later pages are still
+        being fetched.
+        
+        Args:
+            repositories: Newly scored and categorized repositories
+            fetched: Repositories scored so far
+            total: Total repositories expected
+            summary: Running category counts
+        """
+        self.total_repositories = total
+        self.current_repository_index = fetched
+        
+        partial_results = {
+            "repositories": [
+                {
+                    "name": repo.get("name"),
+                    "fullName": repo.get("full_name"),
+                    "language": repo.get("language"),
+                    "stars": repo.get("stars", 0),
+                    "importanceScore": repo.get("importance_score", 0.0),
+                    "category": repo.get("category", "supporting")
+                }
+                for repo in repositories
+            ],
+            "fetched": fetched,
+            "total": total
+        }
+        
+        if summary:
+            partial_results["summary"] = summary
+        
+        await self.emit_progress(
+            phase=ScanPhase.FETCHING_REPOS,
+            current_operation={
+                "type": OperationType.FETCH_REPO.value,
+                "target": "",
+                "details": f"Scored {fetched} of {total} repositories",
+                "startTime": datetime.utcnow().isoformat()
+            },
+            phase_progress=fetched / max(total, 1),
+            repository_progress={"current": fetched, "total": total},
+            partial_results=partial_results
+        )
+    
     async def emit_pr_progress(
         self,
         repo_name: str,
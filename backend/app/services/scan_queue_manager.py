@@ -1,22 +1,41 @@
 """
 Scan Queue Manager
 
-This service manages queues for large scanning operations, providing
-resource management and preventing API rate limit exhaustion.
+This service is the admission-control front door for scanning work: quick
+scans, deep analyses and HR profile refreshes are queued here and dispatched
+to ScanOrchestrator / AnalysisOrchestrator.
+
+- Per-owner fair queuing: within a priority class owners take turns, so one
+  HR bulk refresh cannot starve developer scans
+- Priority aging: a class passed over by other classes' dispatches is
+  promoted, so LOW-priority work still gets a share under sustained load
+- Admission control on live CPU usage, event-loop lag and the shared GitHub
+  rate-limit budget
+- Estimated start times for every queued job
 """
 
 import asyncio
+import heapq
 import logging
-from typing import Dict, List, Any, Optional, Callable
-from datetime import datetime, timedelta
+import time
+import uuid
+from collections import OrderedDict, defaultdict, deque
 from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from enum import Enum
-import uuid
-import json
-from collections import defaultdict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
 
+from app.core.config import settings
 from .concurrent_data_fetcher import concurrent_fetcher, RequestPriority
 
+# Optional psutil import for CPU-based admission control
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+    psutil = None
+
 logger = logging.getLogger(__name__)
 
 class ScanType(Enum):
@@ -26,6 +45,9 @@ class ScanType(Enum):
     ISSUE_ANALYSIS = "issue_analysis"
     CONTRIBUTION_CALENDAR = "contribution_calendar"
     COMPREHENSIVE_SCAN = "comprehensive_scan"
+    QUICK_SCAN = "quick_scan"
+    DEEP_ANALYSIS = "deep_analysis"
+    HR_REFRESH = "hr_refresh"
 
 class ScanStatus(Enum):
     QUEUED = "queued"
@@ -34,6 +56,34 @@ class ScanStatus(Enum):
     FAILED = "failed"
     CANCELLED = "cancelled"
 
+# Fairness key shared by every HR refresh, so a bulk refresh takes a single
+# turn in the rotation instead of one turn per candidate
+HR_REFRESH_OWNER = "hr_refresh"
+
+# Request headers an HR refresh keeps for the scan's user-type routing; the
+# live request itself is never stored on a queued job
+HR_REFRESH_HEADERS = ("Authorization", "X-User-Type")
+
+# GitHub API budget (requests / GraphQL points) reserved while a job runs
+SCAN_RATE_LIMIT_COST = {
+    ScanType.QUICK_SCAN: 10,
+    ScanType.DEEP_ANALYSIS: 200,
+    ScanType.HR_REFRESH: 50
+}
+DEFAULT_RATE_LIMIT_COST = 50
+
+# Durations (seconds) used for start-time estimates until real samples exist
+DEFAULT_SCAN_DURATIONS = {
+    ScanType.QUICK_SCAN: 5.0,
+    ScanType.DEEP_ANALYSIS: 90.0,
+    ScanType.HR_REFRESH: 20.0
+}
+DEFAULT_SCAN_DURATION = 30.0
+
+class ScanQueueFullError(Exception):
+    """Raised when the queue is at capacity and cannot admit more jobs"""
+    pass
+
 @dataclass
 class ScanJob:
     """Represents a scanning job in the queue"""
@@ -55,6 +105,33 @@ class ScanJob:
     completed_subtasks: List[str] = field(default_factory=list)
     estimated_duration: Optional[float] = None
     actual_duration: Optional[float] = None
+    owner: Optional[str] = None  # fairness key, defaults to user_id
+    estimated_start_at: Optional[datetime] = None
+    admission_waits: int = 0
+    done: Optional[asyncio.Future] = field(default=None, repr=False)
+
+    def __post_init__(self):
+        if self.owner is None:
+            self.owner = self.user_id
+
+    def to_dict(self, position: Optional[int] = None) -> Dict[str, Any]:
+        """Client-facing job status"""
+        return {
+            "job_id": self.id,
+            "scan_type": self.scan_type.value,
+            "target": self.target,
+            "status": self.status.value,
+            "current_phase": self.current_phase,
+            "progress": self.progress,
+            "queue_position": position,
+            "created_at": self.created_at.isoformat(),
+            "estimated_start_at": self.estimated_start_at.isoformat() if self.estimated_start_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "estimated_duration": self.estimated_duration,
+            "actual_duration": self.actual_duration,
+            "error": self.error
+        }
 
 @dataclass
 class QueueStats:
@@ -67,278 +144,658 @@ class QueueStats:
     average_duration: float = 0.0
     throughput_per_hour: float = 0.0
 
+class FairScanQueue:
+    """
+    Priority classes are served in order; within a class, owners take turns
+    (round robin) and each owner's jobs run FIFO.
+
+    With aging enabled a waiting class gains one priority level for every
+    aging_dispatches jobs dispatched from other classes while it waited, so
+    LOW-priority jobs cannot starve. Serving a class resets its count, which
+    limits a promoted backlog to one dispatch per promotion.
+    """
+
+    def __init__(self, aging_dispatches: Optional[int] = None):
+        # priority value -> owner -> jobs; dict order is the rotation order
+        self._classes: Dict[int, "OrderedDict[str, Deque[ScanJob]]"] = defaultdict(OrderedDict)
+        self._size = 0
+        self.aging_dispatches = aging_dispatches
+        # priority value -> dispatches from other classes since it was last served
+        self._passed_over: Dict[int, int] = {}
+
+    def qsize(self) -> int:
+        return self._size
+
+    def put(self, job: ScanJob):
+        owners = self._classes[job.priority.value]
+        if not owners:
+            self._passed_over[job.priority.value] = 0
+        owners.setdefault(job.owner, deque()).append(job)
+        self._size += 1
+
+    def ordered(self) -> List[ScanJob]:
+        """Queued jobs in the order they would be dispatched"""
+        order = []
+        for priority in sorted(self._classes, key=self._effective_priority, reverse=True):
+            queues = list(self._classes[priority].values())
+            depth = max((len(queue) for queue in queues), default=0)
+            for level in range(depth):
+                order.extend(queue[level] for queue in queues if level < len(queue))
+        return order
+
+    def take(self, job: ScanJob) -> bool:
+        """Remove a job picked for dispatch; its owner moves to the back of the rotation"""
+        owners = self._classes.get(job.priority.value)
+        queue = owners.get(job.owner) if owners else None
+        if not queue or job not in queue:
+            return False
+        queue.remove(job)
+        if queue:
+            owners.move_to_end(job.owner)
+        else:
+            del owners[job.owner]
+        for priority in self._passed_over:
+            self._passed_over[priority] += 1
+        if owners:
+            self._passed_over[job.priority.value] = 0
+        else:
+            self._passed_over.pop(job.priority.value, None)
+        self._size -= 1
+        return True
+
+    def owners_waiting(self) -> int:
+        return sum(len(owners) for owners in self._classes.values())
+
+    def _effective_priority(self, priority: int) -> Tuple[int, int]:
+        """Sort key: aged priority (capped at CRITICAL), ties going to the higher base class"""
+        aged = priority
+        if self.aging_dispatches:
+            levels = self._passed_over.get(priority, 0) // self.aging_dispatches
+            aged = min(priority + levels, RequestPriority.CRITICAL.value)
+        return aged, priority
+
+class ResourceMonitor:
+    """Monitors system resources and API rate limits for admission control"""
+
+    def __init__(self,
+                 max_cpu_percent: float = 85.0,
+                 max_loop_lag: float = 0.25,
+                 min_rate_limit_remaining: int = 100,
+                 sample_interval: float = 0.5):
+        """
+        Initialize the resource monitor
+
+        Args:
+            max_cpu_percent: Refuse new scans above this system CPU usage
+            max_loop_lag: Refuse new scans when the event loop lags more (seconds)
+            min_rate_limit_remaining: GitHub requests kept in reserve after a job's cost
+            sample_interval: Seconds between CPU / loop-lag samples
+        """
+        self.max_cpu_percent = max_cpu_percent
+        self.max_loop_lag = max_loop_lag
+        self.min_rate_limit_remaining = min_rate_limit_remaining
+        self.sample_interval = sample_interval
+        self.cpu_percent: Optional[float] = None
+        self.loop_lag = 0.0
+        self.rejections = defaultdict(int)
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start sampling CPU usage and event-loop lag"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._sample())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _sample(self):
+        loop = asyncio.get_running_loop()
+        if PSUTIL_AVAILABLE:
+            psutil.cpu_percent(interval=None)  # first call only primes the counter
+
+        while True:
+            expected = loop.time() + self.sample_interval
+            await asyncio.sleep(self.sample_interval)
+            lag = max(0.0, loop.time() - expected)
+            # Smooth single spikes but react within a couple of samples
+            self.loop_lag = 0.5 * self.loop_lag + 0.5 * lag
+            if PSUTIL_AVAILABLE:
+                self.cpu_percent = psutil.cpu_percent(interval=None)
+
+    def rate_limit_remaining(self) -> Optional[int]:
+        """Remaining requests in the tightest GitHub bucket, None if all buckets have reset"""
+        now = datetime.now()
+        remaining = [
+            api_info.get('remaining', 0)
+            for api_info in concurrent_fetcher.rate_limiter.api_limits.values()
+            if not (api_info.get('reset_time') and now > api_info['reset_time'])
+        ]
+        return min(remaining) if remaining else None
+
+    def check_admission(self, job: Optional[ScanJob] = None, reserved_budget: int = 0) -> Optional[str]:
+        """
+        Decide whether a job may start now
+
+        Args:
+            job: Job to admit (its type determines the rate-limit cost)
+            reserved_budget: Rate-limit budget already reserved by running jobs
+
+        Returns:
+            None if the job may start, otherwise the reason it must wait
+        """
+        if self.cpu_percent is not None and self.cpu_percent > self.max_cpu_percent:
+            return "cpu"
+
+        if self.loop_lag > self.max_loop_lag:
+            return "event_loop_lag"
+
+        remaining = self.rate_limit_remaining()
+        if remaining is not None:
+            cost = SCAN_RATE_LIMIT_COST.get(job.scan_type, DEFAULT_RATE_LIMIT_COST) if job else 0
+            if remaining - reserved_budget - cost < self.min_rate_limit_remaining:
+                return "rate_limit"
+
+        return None
+
+    async def can_start_scan(self, job: Optional[ScanJob] = None, reserved_budget: int = 0) -> bool:
+        """Check if we can start a new scan based on resources"""
+        reason = self.check_admission(job, reserved_budget)
+        if reason:
+            self.rejections[reason] += 1
+            return False
+        return True
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "cpu_percent": self.cpu_percent,
+            "loop_lag_ms": round(self.loop_lag * 1000, 1),
+            "rate_limit_remaining": self.rate_limit_remaining(),
+            "max_cpu_percent": self.max_cpu_percent,
+            "max_loop_lag_ms": round(self.max_loop_lag * 1000, 1),
+            "min_rate_limit_remaining": self.min_rate_limit_remaining,
+            "rejections": dict(self.rejections)
+        }
+
 class ScanQueueManager:
-    """Manages scanning job queues with resource management"""
-    
-    def __init__(self, max_concurrent_scans: int = 5):
+    """Manages scanning job queues with fair scheduling and admission control"""
+
+    def __init__(self,
+                 max_concurrent_scans: int = 5,
+                 max_queued_jobs: int = 1000,
+                 admission_retry_interval: float = 1.0,
+                 resource_monitor: Optional[ResourceMonitor] = None,
+                 aging_dispatches: Optional[int] = None):
+        """
+        Initialize the scan queue manager
+
+        Args:
+            max_concurrent_scans: Jobs allowed to run at once
+            max_queued_jobs: Queue capacity; submissions beyond it raise ScanQueueFullError
+            admission_retry_interval: Seconds between admission checks while resources are busy
+            resource_monitor: Admission-control monitor (defaults to one with default thresholds)
+            aging_dispatches: Dispatches from other classes that promote a waiting
+                class by one priority level (None serves classes strictly in order)
+        """
         self.max_concurrent_scans = max_concurrent_scans
-        self.job_queue = asyncio.PriorityQueue()
-        self.active_jobs = {}
-        self.completed_jobs = {}
+        self.max_queued_jobs = max_queued_jobs
+        self.admission_retry_interval = admission_retry_interval
+        self.job_queue = FairScanQueue(aging_dispatches)
+        self.active_jobs: Dict[str, ScanJob] = {}
+        self.completed_jobs = OrderedDict()
         self.job_history = deque(maxlen=1000)
-        self.worker_tasks = []
         self.running = False
         self.stats = QueueStats()
-        self.resource_monitor = ResourceMonitor()
-        
+        self.resource_monitor = resource_monitor or ResourceMonitor()
+        self.executors: Dict[ScanType, Callable[[ScanJob], Awaitable[Any]]] = {
+            ScanType.QUICK_SCAN: self._run_quick_scan,
+            ScanType.DEEP_ANALYSIS: self._run_deep_analysis,
+            ScanType.HR_REFRESH: self._run_hr_refresh
+        }
+        self._queued: Dict[str, ScanJob] = {}
+        self._running_tasks: Dict[str, asyncio.Task] = {}
+        self._durations: Dict[ScanType, Deque[float]] = defaultdict(lambda: deque(maxlen=50))
+        self._dispatcher_task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
     async def start(self):
-        """Start the queue manager workers"""
+        """Start the resource monitor and the dispatcher"""
         if self.running:
             return
-            
+
         self.running = True
-        
-        # Start worker tasks
-        for i in range(self.max_concurrent_scans):
-            task = asyncio.create_task(self._worker(f"scan-worker-{i}"))
-            self.worker_tasks.append(task)
-        
-        logger.info(f"Started {len(self.worker_tasks)} scan queue workers")
-    
+        self._wakeup = asyncio.Event()
+        await self.resource_monitor.start()
+        self._dispatcher_task = asyncio.create_task(self._dispatch_loop())
+
+        logger.info(f"Started scan queue dispatcher ({self.max_concurrent_scans} concurrent scans)")
+
     async def stop(self):
-        """Stop the queue manager workers"""
+        """Stop dispatching and cancel running jobs"""
         if not self.running:
             return
-            
+
         self.running = False
-        
-        # Cancel all worker tasks
-        for task in self.worker_tasks:
+
+        if self._dispatcher_task:
+            self._dispatcher_task.cancel()
+            await asyncio.gather(self._dispatcher_task, return_exceptions=True)
+            self._dispatcher_task = None
+
+        running = list(self._running_tasks.values())
+        for task in running:
             task.cancel()
-        
-        # Wait for tasks to complete
-        await asyncio.gather(*self.worker_tasks, return_exceptions=True)
-        self.worker_tasks.clear()
-        
-        logger.info("Stopped scan queue workers")
-    
-    async def submit_scan_job(self, 
+        await asyncio.gather(*running, return_exceptions=True)
+        await self.resource_monitor.stop()
+
+        logger.info("Stopped scan queue dispatcher")
+
+    def register_executor(self, scan_type: ScanType, executor: Callable[[ScanJob], Awaitable[Any]]):
+        """Register the coroutine function that runs jobs of a scan type"""
+        self.executors[scan_type] = executor
+
+    async def submit_scan_job(self,
                              scan_type: ScanType,
                              user_id: str,
                              target: str,
                              parameters: Dict[str, Any] = None,
-                             priority: RequestPriority = RequestPriority.NORMAL) -> str:
-        """Submit a new scan job to the queue"""
-        
+                             priority: RequestPriority = RequestPriority.NORMAL,
+                             owner: Optional[str] = None) -> str:
+        """
+        Submit a new scan job to the queue
+
+        Args:
+            scan_type: Type of scan (must have a registered executor)
+            user_id: User the job belongs to
+            target: Username / repository being scanned
+            parameters: Executor parameters
+            priority: Priority class
+            owner: Fairness key (defaults to user_id)
+
+        Returns:
+            Job ID
+
+        Raises:
+            ValueError: If no executor is registered for the scan type
+            ScanQueueFullError: If the queue is at capacity
+        """
+        if scan_type not in self.executors:
+            raise ValueError(f"No executor registered for scan type {scan_type.value}")
+
+        if self.job_queue.qsize() >= self.max_queued_jobs:
+            raise ScanQueueFullError(f"Scan queue is full ({self.max_queued_jobs} jobs)")
+
         job_id = str(uuid.uuid4())
-        
+
         job = ScanJob(
             id=job_id,
             scan_type=scan_type,
             user_id=user_id,
             target=target,
             parameters=parameters or {},
-            priority=priority
+            priority=priority,
+            owner=owner,
+            estimated_duration=self._expected_duration(scan_type),
+            done=asyncio.get_running_loop().create_future()
         )
-        
-        # Add to queue with priority
-        priority_value = -priority.value
-        await self.job_queue.put((priority_value, job))
-        
+        # Nobody may wait on the job; mark failures as retrieved to avoid warnings
+        job.done.add_done_callback(lambda future: future.cancelled() or future.exception())
+
+        self.job_queue.put(job)
+        self._queued[job_id] = job
+
         self.stats.total_jobs += 1
-        self.stats.queued_jobs += 1
-        
-        logger.info(f"Submitted scan job {job_id} for {target} (type: {scan_type.value})")
-        
+        self.stats.queued_jobs = self.job_queue.qsize()
+        self._refresh_estimates()
+        self._notify()
+
+        logger.info(f"Submitted scan job {job_id} for {target} (type: {scan_type.value}, owner: {job.owner})")
+
         return job_id
-    
+
+    async def wait_for_job(self, job_id: str, timeout: Optional[float] = None) -> ScanJob:
+        """
+        Wait for a job to finish
+
+        Returns:
+            The completed job
+
+        Raises:
+            KeyError: If the job is unknown
+            Exception: The job's own error if it failed
+        """
+        job = await self.get_job_status(job_id)
+        if job is None:
+            raise KeyError(f"Unknown scan job {job_id}")
+        return await asyncio.wait_for(asyncio.shield(job.done), timeout=timeout)
+
+    async def run_scan_job(self,
+                          scan_type: ScanType,
+                          user_id: str,
+                          target: str,
+                          parameters: Dict[str, Any] = None,
+                          priority: RequestPriority = RequestPriority.NORMAL,
+                          owner: Optional[str] = None) -> Any:
+        """
+        Submit a job, wait for it and return its result
+
+        When the queue is not running (scripts, tests) the job runs inline.
+        """
+        if not self.running:
+            job = ScanJob(
+                id=str(uuid.uuid4()), scan_type=scan_type, user_id=user_id, target=target,
+                parameters=parameters or {}, priority=priority, owner=owner
+            )
+            return await self.executors[scan_type](job)
+
+        job_id = await self.submit_scan_job(scan_type, user_id, target, parameters, priority, owner)
+        job = await self.wait_for_job(job_id)
+        return job.result
+
     async def get_job_status(self, job_id: str) -> Optional[ScanJob]:
         """Get the status of a scan job"""
-        
-        # Check active jobs
+
+        # Check queued and active jobs
+        if job_id in self._queued:
+            self._refresh_estimates()
+            return self._queued[job_id]
+
         if job_id in self.active_jobs:
             return self.active_jobs[job_id]
-        
+
         # Check completed jobs
         if job_id in self.completed_jobs:
             return self.completed_jobs[job_id]
-        
-        # Check job history
-        for job in self.job_history:
+
+        return None
+
+    def get_queue_position(self, job_id: str) -> Optional[int]:
+        """Zero-based dispatch position of a queued job"""
+        for position, job in enumerate(self.job_queue.ordered()):
             if job.id == job_id:
-                return job
-        
+                return position
         return None
-    
+
     async def cancel_job(self, job_id: str) -> bool:
-        """Cancel a scan job"""
-        
-        # Check if job is active
-        if job_id in self.active_jobs:
-            job = self.active_jobs[job_id]
-            job.status = ScanStatus.CANCELLED
-            job.completed_at = datetime.now()
-            
-            # Move to completed jobs
-            self.completed_jobs[job_id] = job
-            del self.active_jobs[job_id]
-            
-            self.stats.running_jobs -= 1
-            
-            logger.info(f"Cancelled scan job {job_id}")
+        """Cancel a queued or running scan job"""
+
+        job = self._queued.get(job_id)
+        if job is not None and self.job_queue.take(job):
+            del self._queued[job_id]
+            self._finish(job, ScanStatus.CANCELLED)
+            self._refresh_estimates()
+            logger.info(f"Cancelled queued scan job {job_id}")
+            return True
+
+        task = self._running_tasks.get(job_id)
+        if task is not None:
+            task.cancel()
+            logger.info(f"Cancelled running scan job {job_id}")
             return True
-        
+
         return False
-    
+
     async def get_queue_stats(self) -> QueueStats:
         """Get current queue statistics"""
-        
+
         # Update current counts
         self.stats.queued_jobs = self.job_queue.qsize()
         self.stats.running_jobs = len(self.active_jobs)
-        
+
         # Calculate throughput
         completed_last_hour = len([
             job for job in self.job_history
-            if job.completed_at and 
+            if job.completed_at and
             (datetime.now() - job.completed_at).total_seconds() < 3600
         ])
         self.stats.throughput_per_hour = completed_last_hour
-        
+
         return self.stats
-    
-    async def _worker(self, worker_name: str):
-        """Worker task that processes scan jobs from the queue"""
-        logger.debug(f"Started scan worker {worker_name}")
-        
+
+    def get_admission_status(self) -> Dict[str, Any]:
+        """Resource readings, thresholds and admission rejections"""
+        return {
+            **self.resource_monitor.get_status(),
+            "reserved_rate_limit_budget": self._reserved_budget(),
+            "owners_waiting": self.job_queue.owners_waiting()
+        }
+
+    def _notify(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _dispatch_loop(self):
+        """Start admissible jobs whenever a slot is free"""
+        logger.debug("Started scan dispatcher")
+
         while self.running:
             try:
-                # Get next job from queue
+                self._wakeup.clear()
+                blocked = self._dispatch_ready_jobs()
+
+                # Wait for a submission or completion; poll while resources are busy
+                timeout = self.admission_retry_interval if blocked else None
                 try:
-                    priority, job = await asyncio.wait_for(
-                        self.job_queue.get(), timeout=1.0
-                    )
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
                 except asyncio.TimeoutError:
-                    continue
-                
-                # Check resource availability
-                if not await self.resource_monitor.can_start_scan():
-                    # Re-queue the job and wait
-                    await self.job_queue.put((priority, job))
-                    await asyncio.sleep(5)
-                    continue
-                
-                # Process the job
-                await self._process_scan_job(job, worker_name)
-                
+                    pass
+
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"Scan worker {worker_name} error: {e}")
+                logger.error(f"Scan dispatcher error: {e}")
                 await asyncio.sleep(1)
-        
-        logger.debug(f"Stopped scan worker {worker_name}")
-    
-    async def _process_scan_job(self, job: ScanJob, worker_name: str):
+
+        logger.debug("Stopped scan dispatcher")
+
+    def _dispatch_ready_jobs(self) -> bool:
+        """
+        Start queued jobs in fair order while slots are free
+
+        Returns:
+            True if jobs are waiting on admission control
+        """
+        blocked = False
+        while len(self.active_jobs) < self.max_concurrent_scans and self.job_queue.qsize():
+            reserved = self._reserved_budget()
+            for job in self.job_queue.ordered():
+                reason = self.resource_monitor.check_admission(job, reserved)
+                if reason is None:
+                    break
+                # A cheaper job further back may still fit the rate-limit budget
+                job.admission_waits += 1
+                self.resource_monitor.rejections[reason] += 1
+                if reason != "rate_limit":
+                    job = None
+                    break
+            else:
+                job = None
+
+            if job is None:
+                blocked = True
+                break
+
+            self.job_queue.take(job)
+            del self._queued[job.id]
+            self._start_job(job)
+
+        self._refresh_estimates()
+        return blocked
+
+    def _start_job(self, job: ScanJob):
+        job.status = ScanStatus.RUNNING
+        job.started_at = datetime.now()
+        job.current_phase = "Starting scan"
+        self.active_jobs[job.id] = job
+        self.stats.queued_jobs = self.job_queue.qsize()
+        self.stats.running_jobs = len(self.active_jobs)
+
+        logger.info(f"Starting scan job {job.id} ({job.scan_type.value}, owner: {job.owner})")
+        self._running_tasks[job.id] = asyncio.create_task(self._process_scan_job(job))
+
+    async def _process_scan_job(self, job: ScanJob):
         """Process a single scan job"""
-        
+        started = time.monotonic()
+
         try:
-            # Mark job as running
-            job.status = ScanStatus.RUNNING
-            job.started_at = datetime.now()
-            job.current_phase = "Starting scan"
-            
-            self.active_jobs[job.id] = job
-            self.stats.queued_jobs -= 1
-            self.stats.running_jobs += 1
-            
-            logger.info(f"Worker {worker_name} starting job {job.id} ({job.scan_type.value})")
-            
             # Execute the scan based on type
             result = await self._execute_scan(job)
-            
-            # Mark job as completed
-            job.status = ScanStatus.COMPLETED
-            job.completed_at = datetime.now()
+
             job.result = result
-            job.actual_duration = (job.completed_at - job.started_at).total_seconds()
-            
-            self.stats.completed_jobs += 1
-            
-            logger.info(f"Worker {worker_name} completed job {job.id} in {job.actual_duration:.2f}s")
-            
+            job.actual_duration = time.monotonic() - started
+            self._durations[job.scan_type].append(job.actual_duration)
+            self._finish(job, ScanStatus.COMPLETED)
+
+            logger.info(f"Completed scan job {job.id} in {job.actual_duration:.2f}s")
+
+        except asyncio.CancelledError:
+            job.actual_duration = time.monotonic() - started
+            self._finish(job, ScanStatus.CANCELLED)
+
         except Exception as e:
-            # Mark job as failed
-            job.status = ScanStatus.FAILED
-            job.completed_at = datetime.now()
-            job.error = str(e)
-            
-            if job.started_at:
-                job.actual_duration = (job.completed_at - job.started_at).total_seconds()
-            
-            self.stats.failed_jobs += 1
-            
-            logger.error(f"Worker {worker_name} failed job {job.id}: {e}")
-        
+            job.actual_duration = time.monotonic() - started
+            self._finish(job, ScanStatus.FAILED, error=e)
+
+            logger.error(f"Scan job {job.id} failed: {e}")
+
         finally:
-            # Clean up
-            if job.id in self.active_jobs:
-                del self.active_jobs[job.id]
-            
-            self.completed_jobs[job.id] = job
-            self.job_history.append(job)
-            self.stats.running_jobs -= 1
-            
-            # Update average duration
-            self._update_average_duration()
-    
+            self.active_jobs.pop(job.id, None)
+            self._running_tasks.pop(job.id, None)
+            self.stats.running_jobs = len(self.active_jobs)
+            self._notify()
+
+    def _finish(self, job: ScanJob, status: ScanStatus, error: Optional[Exception] = None):
+        job.status = status
+        job.completed_at = datetime.now()
+        job.current_phase = status.value.capitalize()
+
+        if status == ScanStatus.COMPLETED:
+            job.progress = 100.0
+            self.stats.completed_jobs += 1
+            if not job.done.done():
+                job.done.set_result(job)
+        elif status == ScanStatus.FAILED:
+            job.error = str(error)
+            self.stats.failed_jobs += 1
+            if not job.done.done():
+                job.done.set_exception(error)
+        elif not job.done.done():
+            job.done.cancel()
+
+        self.completed_jobs[job.id] = job
+        while len(self.completed_jobs) > self.job_history.maxlen:
+            self.completed_jobs.popitem(last=False)
+        self.job_history.append(job)
+        self.stats.queued_jobs = self.job_queue.qsize()
+
+        # Update average duration
+        self._update_average_duration()
+
     async def _execute_scan(self, job: ScanJob) -> Any:
-        """Execute a scan job based on its type"""
-        
-        # This would integrate with the GitHub comprehensive scanner
-        # For now, return a placeholder
-        
-        if job.scan_type == ScanType.COMPREHENSIVE_SCAN:
-            job.current_phase = "Comprehensive scanning"
-            # Would call GitHubComprehensiveScanner methods
-            await asyncio.sleep(2)  # Simulate work
-            return {"status": "completed", "data": "scan_result"}
-        
-        elif job.scan_type == ScanType.USER_PROFILE:
-            job.current_phase = "User profile analysis"
-            await asyncio.sleep(1)
-            return {"status": "completed", "profile": "user_data"}
-        
-        elif job.scan_type == ScanType.REPOSITORY_ANALYSIS:
-            job.current_phase = "Repository analysis"
-            await asyncio.sleep(3)
-            return {"status": "completed", "repositories": "repo_data"}
-        
-        else:
-            raise Exception(f"Unknown scan type: {job.scan_type}")
-    
+        """Execute a scan job with the executor registered for its type"""
+        return await self.executors[job.scan_type](job)
+
+    async def _run_quick_scan(self, job: ScanJob) -> Dict[str, Any]:
+        """Stage 1 quick scan through ScanOrchestrator"""
+        from backend.scoring.orchestration.scan_orchestrator import ScanOrchestrator
+
+        params = job.parameters
+        orchestrator = params.get('orchestrator') or ScanOrchestrator(
+            database=params.get('database'), logger=logger
+        )
+
+        job.current_phase = "Quick scan"
+        return await orchestrator.execute_quick_scan_streaming(
+            username=job.target,
+            token=params.get('token'),
+            user_id=params.get('scan_user_id', job.user_id),
+            store_results=params.get('store_results', True),
+            progress_emitter=params.get('progress_emitter')
+        )
+
+    async def _run_deep_analysis(self, job: ScanJob) -> Any:
+        """Deep analysis through an AnalysisOrchestrator whose state was already initiated"""
+        params = job.parameters
+
+        job.current_phase = "Deep analysis"
+        return await params['orchestrator'].run_analysis(
+            params['analysis_id'],
+            job.target,
+            params['repositories'],
+            params.get('max_evaluate', 15),
+            params.get('github_token')
+        )
+
+    async def _run_hr_refresh(self, job: ScanJob) -> Any:
+        """Forced re-scan of a candidate profile"""
+        from starlette.requests import Request
+        from app.routers.scan import scan_external_github_user
+
+        # The scan only reads the routing headers, so it gets a request carrying just those
+        headers = job.parameters.get('headers') or {}
+        request = Request({
+            'type': 'http',
+            'method': 'POST',
+            'path': f'/api/hr/candidates/{job.target}/refresh',
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers.items()]
+        })
+
+        job.current_phase = "Refreshing candidate profile"
+        return await scan_external_github_user(job.target, request=request, force_refresh=True)
+
+    def _expected_duration(self, scan_type: ScanType) -> float:
+        samples = self._durations.get(scan_type)
+        if samples:
+            return sum(samples) / len(samples)
+        return DEFAULT_SCAN_DURATIONS.get(scan_type, DEFAULT_SCAN_DURATION)
+
+    def _reserved_budget(self) -> int:
+        return sum(
+            SCAN_RATE_LIMIT_COST.get(job.scan_type, DEFAULT_RATE_LIMIT_COST)
+            for job in self.active_jobs.values()
+        )
+
+    def _refresh_estimates(self):
+        """
+        Estimate start times by replaying the dispatch order over the slots
+
+        Each slot frees up when its running job is expected to finish; queued
+        jobs take the earliest free slot in fair dispatch order.
+        """
+        now = datetime.now()
+        slots = []
+        for job in self.active_jobs.values():
+            expected_end = job.started_at + timedelta(seconds=self._expected_duration(job.scan_type))
+            slots.append(max(expected_end, now))
+        slots.extend([now] * max(0, self.max_concurrent_scans - len(slots)))
+        heapq.heapify(slots)
+
+        for job in self.job_queue.ordered():
+            start = heapq.heappop(slots)
+            job.estimated_start_at = start
+            heapq.heappush(slots, start + timedelta(seconds=self._expected_duration(job.scan_type)))
+
     def _update_average_duration(self):
         """Update average duration statistics"""
         completed_jobs = [job for job in self.job_history if job.actual_duration]
-        
+
         if completed_jobs:
             total_duration = sum(job.actual_duration for job in completed_jobs)
             self.stats.average_duration = total_duration / len(completed_jobs)
 
-class ResourceMonitor:
-    """Monitors system resources and API rate limits"""
-    
-    def __init__(self):
-        self.last_rate_check = None
-        self.rate_limit_cache = {}
-    
-    async def can_start_scan(self) -> bool:
-        """Check if we can start a new scan based on resources"""
-        
-        # Check rate limits (cache for 1 minute)
-        now = datetime.now()
-        if (not self.last_rate_check or 
-            (now - self.last_rate_check).total_seconds() > 60):
-            
-            # Would check GitHub API rate limits here
-            # For now, always allow
-            self.last_rate_check = now
-            return True
-        
-        return True
-
 # Global scan queue manager instance
-scan_queue_manager = ScanQueueManager()
+scan_queue_manager = ScanQueueManager(
+    max_concurrent_scans=settings.scan_queue_max_concurrent,
+    max_queued_jobs=settings.scan_queue_max_queued,
+    resource_monitor=ResourceMonitor(
+        max_cpu_percent=settings.scan_queue_max_cpu_percent,
+        max_loop_lag=settings.scan_queue_max_loop_lag_ms / 1000.0,
+        min_rate_limit_remaining=settings.scan_queue_min_rate_limit_remaining
+    ),
+    aging_dispatches=settings.scan_queue_aging_dispatches
+)
 
 async def initialize_scan_queue():
     """Initialize the global scan queue manager"""
@@ -349,4 +806,3 @@ async def shutdown_scan_queue():
     """Shutdown the global scan queue manager"""
     await scan_queue_manager.stop()
     logger.info("Scan queue manager shutdown")
-        
\ No newline at end of file
@@ -0,0 +1,234 @@
+"""
+Scan Results Refresher
+Stale-while-revalidate serving for /scan/results: the last persisted result is
+returned immediately and a deduplicated background job recomputes it,
+notifying the user's WebSocket connections when newer data is stored.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+from app.services.cache_service import cache_service
+
+logger = logging.getLogger(__name__)
+
+SCAN_RESULTS_COLLECTION = "scan_results_snapshots"
+
+
+class ScanResultsRefresher:
+    """Persists computed scan results and refreshes them off the request path"""
+
+    def __init__(
+        self,
+        stale_after: float = 1800.0,
+        cache_ttl: int = 1800,
+        max_concurrent_refreshes: int = 4
+    ):
+        """
+        Args:
+            stale_after: Seconds after which a persisted result is refreshed when served
+            cache_ttl: Seconds a snapshot stays in Redis in front of MongoDB
+            max_concurrent_refreshes: Refresh jobs allowed to run at the same time
+        """
+        self.stale_after = stale_after
+        self.cache_ttl = cache_ttl
+        self.max_concurrent_refreshes = max_concurrent_refreshes
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # user_id -> in-flight refresh task
+        self._refreshes: Dict[str, asyncio.Task] = {}
+        self.stats = {
+            "served_fresh": 0,
+            "served_stale": 0,
+            "served_missing": 0,
+            "refreshes_started": 0,
+            "refreshes_deduplicated": 0,
+            "refreshes_completed": 0,
+            "refreshes_failed": 0,
+            "invalidations": 0
+        }
+
+    async def get_snapshot(self, db, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the last persisted snapshot for a user (Redis first, then MongoDB)
+
+        Returns:
+            {"results": ..., "computed_at": ISO timestamp} or None
+        """
+        snapshot = await cache_service.get_scan_results(user_id)
+        if snapshot and "computed_at" in snapshot:
+            return snapshot
+
+        if db is None:
+            return None
+
+        document = await db[SCAN_RESULTS_COLLECTION].find_one({"user_id": user_id})
+        if not document:
+            return None
+
+        snapshot = {
+            "results": document["results"],
+            "computed_at": document["computed_at"].isoformat()
+        }
+        await cache_service.cache_scan_results(user_id, snapshot, self.cache_ttl)
+        return snapshot
+
+    async def invalidate(self, user_id: str, db=None) -> None:
+        """
+        Drop a user's persisted snapshot after a scan or analysis stored new data
+
+        The next serve finds no snapshot and recomputes it in the background.
+
+        Args:
+            user_id: User whose snapshot is dropped
+            db: Database holding the snapshot collection (the shared database when omitted)
+        """
+        try:
+            if db is None:
+                from app.db_connection import get_database
+                db = await get_database()
+            if db is not None:
+                await db[SCAN_RESULTS_COLLECTION].delete_one({"user_id": user_id})
+            await cache_service.invalidate_scan_results(user_id)
+            self.stats["invalidations"] += 1
+        except Exception as e:
+            logger.warning(f"Could not invalidate scan results snapshot for {user_id}: {e}")
+
+    def is_stale(self, snapshot: Dict[str, Any]) -> bool:
+        """Whether a snapshot is older than stale_after"""
+        computed_at = datetime.fromisoformat(snapshot["computed_at"])
+        return (datetime.utcnow() - computed_at).total_seconds() > self.stale_after
+
+    def is_refreshing(self, user_id: str) -> bool:
+        """Whether a refresh job is in flight for a user"""
+        task = self._refreshes.get(user_id)
+        return task is not None and not task.done()
+
+    async def serve(
+        self,
+        db,
+        user_id: str,
+        compute: Callable[[], Awaitable[Dict[str, Any]]],
+        empty_results: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Serve the last persisted result and schedule a refresh when it is stale or missing
+
+        Args:
+            db: Database holding the snapshot collection
+            user_id: User whose results are requested
+            compute: Coroutine factory recomputing the results (run in the background)
+            empty_results: Response body used while the first result is computed
+
+        Returns:
+            Scan results with a `freshness` block (computedAt, stale, refreshing)
+        """
+        snapshot = await self.get_snapshot(db, user_id)
+
+        if snapshot is None:
+            self.stats["served_missing"] += 1
+            self.schedule_refresh(db, user_id, compute)
+            results, computed_at, stale = dict(empty_results), None, True
+        else:
+            stale = self.is_stale(snapshot)
+            self.stats["served_stale" if stale else "served_fresh"] += 1
+            if stale:
+                self.schedule_refresh(db, user_id, compute)
+            results, computed_at = dict(snapshot["results"]), snapshot["computed_at"]
+
+        results["freshness"] = {
+            "computedAt": computed_at,
+            "stale": stale,
+            "refreshing": self.is_refreshing(user_id)
+        }
+        return results
+
+    def schedule_refresh(
+        self,
+        db,
+        user_id: str,
+        compute: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> bool:
+        """
+        Start a background refresh unless one is already running for the user
+
+        Returns:
+            True if a new refresh job was started
+        """
+        if self.is_refreshing(user_id):
+            self.stats["refreshes_deduplicated"] += 1
+            return False
+
+        self.stats["refreshes_started"] += 1
+        task = asyncio.create_task(self._refresh(db, user_id, compute))
+        self._refreshes[user_id] = task
+        task.add_done_callback(lambda t: self._refreshes.pop(user_id, None) if self._refreshes.get(user_id) is t else None)
+        return True
+
+    async def wait_for_refresh(self, user_id: str, timeout: Optional[float] = None) -> None:
+        """Wait for the in-flight refresh of a user, if any"""
+        task = self._refreshes.get(user_id)
+        if task is not None:
+            await asyncio.wait_for(asyncio.shield(task), timeout)
+
+    async def _refresh(self, db, user_id: str, compute: Callable[[], Awaitable[Dict[str, Any]]]):
+        """Recompute, persist and announce a user's scan results"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_refreshes)
+
+        try:
+            async with self._semaphore:
+                results = jsonable_encoder(await compute())
+                computed_at = datetime.utcnow()
+
+                if db is not None:
+                    await db[SCAN_RESULTS_COLLECTION].update_one(
+                        {"user_id": user_id},
+                        {"$set": {"results": results, "computed_at": computed_at}},
+                        upsert=True
+                    )
+                await cache_service.cache_scan_results(
+                    user_id,
+                    {"results": results, "computed_at": computed_at.isoformat()},
+                    self.cache_ttl
+                )
+
+            self.stats["refreshes_completed"] += 1
+            await self._notify(user_id, computed_at)
+
+        except Exception as e:
+            self.stats["refreshes_failed"] += 1
+            logger.error(f"Scan results refresh failed for {user_id}: {e}")
+
+    async def _notify(self, user_id: str, computed_at: datetime):
+        """Tell the user's WebSocket connections that newer results are available"""
+        try:
+            from app.websocket.scan_websocket import websocket_manager
+
+            await websocket_manager.broadcast_to_user(user_id, {
+                "type": "scan_results_updated",
+                "user_id": user_id,
+                "computed_at": computed_at.isoformat(),
+                "timestamp": datetime.utcnow().isoformat()
+            })
+        except Exception as e:
+            logger.warning(f"Could not notify {user_id} about refreshed scan results: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get serving and refresh statistics"""
+        return {
+            **self.stats,
+            "refreshes_in_flight": sum(1 for task in self._refreshes.values() if not task.done()),
+            "stale_after_seconds": self.stale_after
+        }
+
+
+# Global scan results refresher instance
+scan_results_refresher = ScanResultsRefresher(
+    stale_after=settings.scan_results_stale_after,
+    max_concurrent_refreshes=settings.scan_results_max_concurrent_refreshes
+)
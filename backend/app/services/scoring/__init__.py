@@ -3,13 +3,15 @@ Scoring Services
 Provides code analysis and scoring functionality
 """
 
-from .complexity_analyzer import ComplexityAnalyzer, ComplexityMetrics
-from .acid_scorer import ACIDScorer, ACIDScores
+from .complexity_analyzer import ComplexityAccumulator, ComplexityAnalyzer, ComplexityMetrics
+from .acid_scorer import ACIDAccumulator, ACIDScorer, ACIDScores
 from .overall_calculator import OverallScoreCalculator, OverallScoreBreakdown
 
 __all__ = [
+    'ComplexityAccumulator',
     'ComplexityAnalyzer',
     'ComplexityMetrics',
+    'ACIDAccumulator',
     'ACIDScorer',
     'ACIDScores',
     'OverallScoreCalculator',
@@ -6,11 +6,11 @@ Calculates ACID scores for code quality assessment
 
 import re
 import ast
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+from dataclasses import asdict, dataclass
 import logging
 
-from .complexity_analyzer import ComplexityAnalyzer, ComplexityMetrics
+from .complexity_analyzer import ComplexityAccumulator, ComplexityAnalyzer, ComplexityMetrics
 
 logger = logging.getLogger(__name__)
 
@@ -46,29 +46,88 @@ class ACIDScorer:
     def calculate_acid_scores(
         self,
         files: List[Tuple[str, str, str]],
-        repo_metadata: Dict[str, Any]
+        repo_metadata: Dict[str, Any],
+        previous: Optional['ACIDAccumulator'] = None,
+        removed: Iterable[str] = ()
     ) -> ACIDScores:
         """
         Calculate ACID scores for a repository
         
+        With ``previous`` the scores are updated incrementally: ``files`` are
+        the added or modified files, ``removed`` the deleted ones, and the
+        aggregate of the previous analysis is updated in place.
+        
         Args:
             files: List of (filename, language, code) tuples
             repo_metadata: Repository metadata (has_tests, has_ci_cd, etc.)
+            previous: Aggregate of an earlier analysis to apply the changes to
+            removed: Paths of files deleted since that analysis
+            
+        Returns:
+            ACIDScores object
+        """
+        accumulator = previous if previous is not None else ACIDAccumulator(self)
+        for filename in removed:
+            accumulator.remove_file(filename)
+        for filename, language, code in files:
+            accumulator.add_file(filename, language, code)
+        
+        return accumulator.scores(repo_metadata)
+    
+    def file_digest(self, filename: str, language: str, code: str) -> Dict[str, Any]:
+        """
+        Reduce one file to the values its ACID contribution is computed from
+        
+        Args:
+            filename: File path
+            language: Programming language
+            code: Source code
+            
+        Returns:
+            Digest with the file's language, line count, complexity metrics
+            (None if analysis failed) and naming/comment/style/coupling scores
+        """
+        try:
+            complexity = asdict(self.complexity_analyzer.analyze_code(code, language, filename))
+        except Exception as e:
+            self.logger.error(f"Error analyzing {filename}: {e}")
+            complexity = None
+        
+        return {
+            'language': language,
+            'lines': len(code.split('\n')),
+            'complexity': complexity,
+            'naming': self._analyze_naming_conventions(code, language),
+            'comment': self._analyze_documentation(code, language),
+            'style': self._analyze_code_style(code, language),
+            'coupling': self._analyze_coupling(code, language)
+        }
+    
+    def _scores_from(
+        self,
+        stats: 'ACIDAccumulator',
+        repo_metadata: Dict[str, Any]
+    ) -> ACIDScores:
+        """
+        Calculate ACID scores from per-file aggregates
+        
+        Args:
+            stats: Aggregates of the repository's files
+            repo_metadata: Repository metadata (has_tests, has_ci_cd, etc.)
             
         Returns:
             ACIDScores object
         """
-        if not files:
+        if not stats.file_count:
             return ACIDScores()
         
-        # Calculate complexity metrics
-        complexity = self.complexity_analyzer.analyze_repository(files)
+        complexity = stats.complexity()
         
         # Calculate each ACID component
-        atomicity = self._calculate_atomicity(files, complexity)
-        consistency = self._calculate_consistency(files, complexity)
-        isolation = self._calculate_isolation(files, repo_metadata)
-        durability = self._calculate_durability(files, repo_metadata, complexity)
+        atomicity = self._calculate_atomicity(stats, complexity)
+        consistency = self._calculate_consistency(stats, complexity)
+        isolation = self._calculate_isolation(stats, repo_metadata)
+        durability = self._calculate_durability(stats, repo_metadata, complexity)
         
         # Calculate overall score (weighted average)
         overall = (atomicity + consistency + isolation + durability) / 4.0
@@ -83,7 +142,7 @@ class ACIDScorer:
     
     def _calculate_atomicity(
         self,
-        files: List[Tuple[str, str, str]],
+        stats: 'ACIDAccumulator',
         complexity: ComplexityMetrics
     ) -> float:
         """
@@ -92,7 +151,7 @@ class ACIDScorer:
         Measures: Modularity, single responsibility, function size, cohesion
         
         Args:
-            files: List of code files
+            stats: Aggregates of the repository's files
             complexity: Complexity metrics
             
         Returns:
@@ -131,7 +190,7 @@ class ACIDScorer:
         
         # 3. Modularity (25 points)
         # More files with reasonable size indicates better modularity
-        file_count = len(files)
+        file_count = stats.file_count
         total_loc = complexity.lines_of_code
         
         if file_count > 0 and total_loc > 0:
@@ -171,7 +230,7 @@ class ACIDScorer:
     
     def _calculate_consistency(
         self,
-        files: List[Tuple[str, str, str]],
+        stats: 'ACIDAccumulator',
         complexity: ComplexityMetrics
     ) -> float:
         """
@@ -180,7 +239,7 @@ class ACIDScorer:
         Measures: Naming conventions, code style, documentation
         
         Args:
-            files: List of code files
+            stats: Aggregates of the repository's files
             complexity: Complexity metrics
             
         Returns:
@@ -188,31 +247,12 @@ class ACIDScorer:
         """
         score = 0.0
         
-        # Analyze all files
-        naming_scores = []
-        comment_scores = []
-        style_scores = []
-        
-        for filename, language, code in files:
-            # 1. Naming conventions (33 points)
-            naming_score = self._analyze_naming_conventions(code, language)
-            naming_scores.append(naming_score)
-            
-            # 2. Documentation/Comments (33 points)
-            comment_score = self._analyze_documentation(code, language)
-            comment_scores.append(comment_score)
-            
-            # 3. Code style consistency (34 points)
-            style_score = self._analyze_code_style(code, language)
-            style_scores.append(style_score)
-        
-        # Average scores across all files
-        if naming_scores:
-            score += sum(naming_scores) / len(naming_scores)
-        if comment_scores:
-            score += sum(comment_scores) / len(comment_scores)
-        if style_scores:
-            score += sum(style_scores) / len(style_scores)
+        # Average naming (33 points), documentation (33 points) and
+        # style (34 points) scores across all files
+        if stats.file_count:
+            score += stats.naming_total / stats.file_count
+            score += stats.comment_total / stats.file_count
+            score += stats.style_total / stats.file_count
         
         return min(100.0, max(0.0, score))
     
@@ -378,7 +418,7 @@ class ACIDScorer:
     
     def _calculate_isolation(
         self,
-        files: List[Tuple[str, str, str]],
+        stats: 'ACIDAccumulator',
         repo_metadata: Dict[str, Any]
     ) -> float:
         """
@@ -387,7 +427,7 @@ class ACIDScorer:
         Measures: Dependencies, architecture, coupling
         
         Args:
-            files: List of code files
+            stats: Aggregates of the repository's files
             repo_metadata: Repository metadata
             
         Returns:
@@ -396,67 +436,76 @@ class ACIDScorer:
         score = 0.0
         
         # 1. Dependency management (40 points)
-        # Check for dependency files
-        has_requirements = any('requirements' in f[0].lower() for f in files)
-        has_package_json = any('package.json' in f[0].lower() for f in files)
-        has_pom = any('pom.xml' in f[0].lower() for f in files)
-        has_gradle = any('build.gradle' in f[0].lower() for f in files)
-        
-        if has_requirements or has_package_json or has_pom or has_gradle:
+        if stats.has_dependency_file:
             dependency_score = 40.0
         else:
             dependency_score = 20.0
         
         # 2. Architecture separation (30 points)
         # Check for organized directory structure
-        unique_dirs = set()
-        for filename, _, _ in files:
-            parts = filename.split('/')
-            if len(parts) > 1:
-                unique_dirs.add(parts[0])
-        
-        if len(unique_dirs) >= 3:
+        if len(stats.top_level_dirs) >= 3:
             architecture_score = 30.0
-        elif len(unique_dirs) >= 2:
+        elif len(stats.top_level_dirs) >= 2:
             architecture_score = 20.0
         else:
             architecture_score = 10.0
         
         # 3. Import/coupling analysis (30 points)
-        # Analyze imports to estimate coupling
-        coupling_scores = []
-        
-        for filename, language, code in files:
-            if language.lower() == 'python':
-                imports = len(re.findall(r'^import\s+', code, re.MULTILINE))
-                imports += len(re.findall(r'^from\s+\w+\s+import', code, re.MULTILINE))
-            elif language.lower() in ['javascript', 'typescript']:
-                imports = len(re.findall(r'import\s+.*\s+from', code))
-                imports += len(re.findall(r'require\(', code))
-            elif language.lower() == 'java':
-                imports = len(re.findall(r'^import\s+', code, re.MULTILINE))
-            else:
-                imports = 0
-            
-            # Score based on import count (moderate is good)
-            if 0 < imports <= 10:
-                coupling_scores.append(30.0)
-            elif 10 < imports <= 20:
-                coupling_scores.append(20.0)
-            elif imports > 20:
-                coupling_scores.append(10.0)
-            else:
-                coupling_scores.append(15.0)
-        
-        coupling_score = sum(coupling_scores) / len(coupling_scores) if coupling_scores else 15.0
+        coupling_score = stats.coupling_total / stats.file_count if stats.file_count else 15.0
         
         score = dependency_score + architecture_score + coupling_score
         
         return min(100.0, max(0.0, score))
     
+    def _has_dependency_file(self, filename: str) -> bool:
+        """
+        Check whether a file declares dependencies
+        
+        Args:
+            filename: File path
+            
+        Returns:
+            True for requirements, package.json, pom.xml and build.gradle files
+        """
+        name = filename.lower()
+        return (
+            'requirements' in name or 'package.json' in name
+            or 'pom.xml' in name or 'build.gradle' in name
+        )
+    
+    def _analyze_coupling(self, code: str, language: str) -> float:
+        """
+        Estimate coupling from the number of imports
+        
+        Args:
+            code: Source code
+            language: Programming language
+            
+        Returns:
+            Coupling score (0-30, moderate import counts score best)
+        """
+        if language.lower() == 'python':
+            imports = len(re.findall(r'^import\s+', code, re.MULTILINE))
+            imports += len(re.findall(r'^from\s+\w+\s+import', code, re.MULTILINE))
+        elif language.lower() in ['javascript', 'typescript']:
+            imports = len(re.findall(r'import\s+.*\s+from', code))
+            imports += len(re.findall(r'require\(', code))
+        elif language.lower() == 'java':
+            imports = len(re.findall(r'^import\s+', code, re.MULTILINE))
+        else:
+            imports = 0
+        
+        if 0 < imports <= 10:
+            return 30.0
+        elif 10 < imports <= 20:
+            return 20.0
+        elif imports > 20:
+            return 10.0
+        return 15.0
+    
     def _calculate_durability(
         self,
-        files: List[Tuple[str, str, str]],
+        stats: 'ACIDAccumulator',
         repo_metadata: Dict[str, Any],
         complexity: ComplexityMetrics
     ) -> float:
@@ -466,7 +515,7 @@ class ACIDScorer:
         Measures: Tests, documentation, maintainability
         
         Args:
-            files: List of code files
+            stats: Aggregates of the repository's files
             repo_metadata: Repository metadata
             complexity: Complexity metrics
             
@@ -478,15 +527,11 @@ class ACIDScorer:
         # 1. Test coverage (40 points)
         has_tests = repo_metadata.get('has_tests', False)
         
-        # Count test files
-        test_files = sum(
-            1 for f in files
-            if 'test' in f[0].lower() or 'spec' in f[0].lower()
-        )
+        test_files = stats.test_file_count
         
         if has_tests and test_files > 0:
             # Estimate test coverage based on test file ratio
-            test_ratio = test_files / len(files)
+            test_ratio = test_files / stats.file_count
             
             if test_ratio >= 0.3:
                 test_score = 40.0
@@ -569,3 +614,187 @@ class ACIDScorer:
         }
         
         return descriptions.get(component.lower(), 'Unknown component')
+
+
+
+class ACIDAccumulator:
+    """
+    Mergeable, incremental ACID scoring, one file at a time
+    
+    Each file is reduced to a small digest (its per-file sub-scores and
+    complexity metrics) as soon as it is added, and the digests are folded
+    into sums and counts. The source of a repository is never held in memory
+    at once, and a file that changed or was deleted is handled by applying
+    the difference of its digests instead of re-scoring every file.
+    
+    Adding a repository's files and calling scores() gives the same result as
+    ACIDScorer.calculate_acid_scores on the full list. to_dict()/from_dict()
+    persist the digests between analyses.
+    """
+    
+    def __init__(self, scorer: Optional[ACIDScorer] = None):
+        """
+        Initialize an empty accumulator
+        
+        Args:
+            scorer: Scorer providing the per-file analyses (a new one if omitted)
+        """
+        self.scorer = scorer or ACIDScorer()
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.test_file_count = 0
+        self.dependency_file_count = 0
+        self.naming_total = 0.0
+        self.comment_total = 0.0
+        self.style_total = 0.0
+        self.coupling_total = 0.0
+        self.language_lines: Dict[str, int] = {}
+        self._dir_counts: Dict[str, int] = {}
+        self._complexity = ComplexityAccumulator()
+    
+    @property
+    def file_count(self) -> int:
+        """Number of files in the aggregate"""
+        return len(self.files)
+    
+    @property
+    def has_dependency_file(self) -> bool:
+        """Whether any file declares dependencies"""
+        return self.dependency_file_count > 0
+    
+    @property
+    def top_level_dirs(self) -> set:
+        """Top-level directories containing files"""
+        return set(self._dir_counts)
+    
+    def add_file(self, filename: str, language: str, code: str) -> None:
+        """
+        Analyze one file and fold it into the totals
+        
+        A file already in the aggregate (a modified file) is replaced.
+        
+        Args:
+            filename: File path within the repository
+            language: Programming language
+            code: Source code (not retained)
+        """
+        self.remove_file(filename)
+        digest = self.scorer.file_digest(filename, language, code)
+        self.files[filename] = digest
+        self._apply(filename, digest, 1)
+    
+    def remove_file(self, filename: str) -> bool:
+        """
+        Take a file out of the totals (deleted, renamed or about to be replaced)
+        
+        Args:
+            filename: File path within the repository
+            
+        Returns:
+            True if the file was part of the aggregate
+        """
+        digest = self.files.pop(filename, None)
+        if digest is None:
+            return False
+        self._apply(filename, digest, -1)
+        return True
+    
+    def _apply(self, filename: str, digest: Dict[str, Any], sign: int) -> None:
+        if digest.get('complexity') is not None:
+            metrics = ComplexityMetrics(**digest['complexity'])
+            if sign > 0:
+                self._complexity.add(metrics)
+            else:
+                self._complexity.remove(metrics)
+        
+        self.naming_total += sign * digest['naming']
+        self.comment_total += sign * digest['comment']
+        self.style_total += sign * digest['style']
+        self.coupling_total += sign * digest['coupling']
+        
+        if self.scorer._has_dependency_file(filename):
+            self.dependency_file_count += sign
+        parts = filename.split('/')
+        if len(parts) > 1:
+            _add_count(self._dir_counts, parts[0], sign)
+        name = filename.lower()
+        if 'test' in name or 'spec' in name:
+            self.test_file_count += sign
+        _add_count(self.language_lines, digest['language'], sign * digest['lines'])
+        
+        if not self.files:
+            # Drop accumulated rounding error along with the last file
+            self.naming_total = self.comment_total = self.style_total = self.coupling_total = 0.0
+    
+    def complexity(self) -> ComplexityMetrics:
+        """
+        Aggregated complexity of the files added so far
+        
+        Returns:
+            ComplexityMetrics object
+        """
+        return self._complexity.result()
+    
+    def scores(self, repo_metadata: Dict[str, Any]) -> ACIDScores:
+        """
+        ACID scores of the files added so far
+        
+        Args:
+            repo_metadata: Repository metadata (has_tests, has_ci_cd, etc.)
+            
+        Returns:
+            ACIDScores object
+        """
+        return self.scorer._scores_from(self, repo_metadata)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize the per-file digests for storage
+        
+        Returns:
+            Document safe for MongoDB (file paths are values, not keys)
+        """
+        return {
+            'version': DIGEST_VERSION,
+            'files': [{'path': path, **digest} for path, digest in self.files.items()]
+        }
+    
+    @classmethod
+    def from_dict(
+        cls,
+        data: Optional[Dict[str, Any]],
+        scorer: Optional[ACIDScorer] = None
+    ) -> Optional['ACIDAccumulator']:
+        """
+        Rebuild an accumulator from to_dict() output
+        
+        Args:
+            data: Stored document
+            scorer: Scorer providing the per-file analyses
+            
+        Returns:
+            ACIDAccumulator, or None if the document is missing or was written
+            by an incompatible version
+        """
+        if not data or data.get('version') != DIGEST_VERSION:
+            return None
+        
+        accumulator = cls(scorer)
+        for entry in data.get('files', []):
+            digest = dict(entry)
+            path = digest.pop('path')
+            accumulator.files[path] = digest
+            accumulator._apply(path, digest, 1)
+        return accumulator
+
+
+# Bump when the per-file digest or the scoring it feeds changes, so stored
+# aggregates are rebuilt from scratch instead of being merged
+DIGEST_VERSION = 1
+
+
+def _add_count(counts: Dict[str, int], key: str, delta: int) -> None:
+    value = counts.get(key, 0) + delta
+    if value:
+        counts[key] = value
+    else:
+        counts.pop(key, None)
@@ -25,6 +25,92 @@ class ComplexityMetrics:
     max_function_complexity: float = 0.0
 
 
+class ComplexityAccumulator:
+    """
+    Mergeable aggregate of per-file ComplexityMetrics
+
+    Keeps sums and counts rather than averages, so files can be added one at
+    a time (streaming) and removed again when they change or are deleted
+    (incremental re-evaluation) without re-analyzing the rest of the
+    repository.
+    """
+
+    def __init__(self):
+        """Initialize an empty aggregate"""
+        self._reset()
+
+    def _reset(self) -> None:
+        self.file_count = 0
+        self.lines_of_code = 0
+        self.function_count = 0
+        self.class_count = 0
+        self._cyclomatic_total = 0.0
+        self._cognitive_total = 0.0
+        self._maintainability_total = 0.0
+        # Multiset of per-file maxima, so the maximum survives removals
+        self._max_complexities: Dict[float, int] = {}
+
+    def add(self, metrics: ComplexityMetrics) -> None:
+        """
+        Add the metrics of one file
+
+        Args:
+            metrics: Metrics returned by ComplexityAnalyzer.analyze_code
+        """
+        self._apply(metrics, 1)
+
+    def remove(self, metrics: ComplexityMetrics) -> None:
+        """
+        Remove the metrics of a file added earlier
+
+        Args:
+            metrics: The metrics that were added for the file
+        """
+        self._apply(metrics, -1)
+        if self.file_count <= 0:
+            # Drop accumulated rounding error along with the last file
+            self._reset()
+
+    def _apply(self, metrics: ComplexityMetrics, sign: int) -> None:
+        self.file_count += sign
+        self.lines_of_code += sign * metrics.lines_of_code
+        self.function_count += sign * metrics.function_count
+        self.class_count += sign * metrics.class_count
+        self._cyclomatic_total += sign * metrics.cyclomatic_complexity
+        self._cognitive_total += sign * metrics.cognitive_complexity
+        self._maintainability_total += sign * metrics.maintainability_index
+
+        count = self._max_complexities.get(metrics.max_function_complexity, 0) + sign
+        if count > 0:
+            self._max_complexities[metrics.max_function_complexity] = count
+        else:
+            self._max_complexities.pop(metrics.max_function_complexity, None)
+
+    def result(self) -> ComplexityMetrics:
+        """
+        Aggregated metrics of the files added so far
+
+        Returns:
+            ComplexityMetrics (averages for complexity, totals for counts)
+        """
+        aggregated = ComplexityMetrics()
+        if self.file_count <= 0:
+            return aggregated
+
+        aggregated.lines_of_code = self.lines_of_code
+        aggregated.function_count = self.function_count
+        aggregated.class_count = self.class_count
+        aggregated.cyclomatic_complexity = self._cyclomatic_total / self.file_count
+        aggregated.cognitive_complexity = self._cognitive_total / self.file_count
+        aggregated.maintainability_index = self._maintainability_total / self.file_count
+
+        if self.function_count > 0:
+            aggregated.average_function_length = self.lines_of_code / self.function_count
+
+        aggregated.max_function_complexity = max(self._max_complexities)
+        return aggregated
+
+
 class ComplexityAnalyzer:
     """
     Analyzes code complexity for multiple programming languages
@@ -395,54 +481,15 @@ class ComplexityAnalyzer:
         Returns:
             Aggregated ComplexityMetrics
         """
-        if not files:
-            return ComplexityMetrics()
-        
-        all_metrics = []
+        accumulator = ComplexityAccumulator()
         
         for filename, language, code in files:
             try:
-                metrics = self.analyze_code(code, language, filename)
-                all_metrics.append(metrics)
+                accumulator.add(self.analyze_code(code, language, filename))
             except Exception as e:
                 self.logger.error(f"Error analyzing {filename}: {e}")
         
-        if not all_metrics:
-            return ComplexityMetrics()
-        
-        # Aggregate metrics
-        aggregated = ComplexityMetrics()
-        
-        aggregated.lines_of_code = sum(m.lines_of_code for m in all_metrics)
-        aggregated.function_count = sum(m.function_count for m in all_metrics)
-        aggregated.class_count = sum(m.class_count for m in all_metrics)
-        
-        # Average complexity metrics
-        if all_metrics:
-            aggregated.cyclomatic_complexity = sum(
-                m.cyclomatic_complexity for m in all_metrics
-            ) / len(all_metrics)
-            
-            aggregated.cognitive_complexity = sum(
-                m.cognitive_complexity for m in all_metrics
-            ) / len(all_metrics)
-            
-            aggregated.maintainability_index = sum(
-                m.maintainability_index for m in all_metrics
-            ) / len(all_metrics)
-        
-        # Calculate average function length
-        total_functions = aggregated.function_count
-        if total_functions > 0:
-            aggregated.average_function_length = aggregated.lines_of_code / total_functions
-        
-        # Find max complexity
-        if all_metrics:
-            aggregated.max_function_complexity = max(
-                m.max_function_complexity for m in all_metrics
-            )
-        
-        return aggregated
+        return accumulator.result()
     
     def get_complexity_grade(self, complexity: float) -> str:
         """
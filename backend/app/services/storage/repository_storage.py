@@ -218,7 +218,10 @@ class RepositoryStorageService:
         repo_id: str,
         acid_scores: Dict[str, float],
         complexity_metrics: Dict[str, float],
-        overall_score: float
+        overall_score: float,
+        analyzed_commit_sha: Optional[str] = None,
+        analysis_aggregates: Optional[Dict[str, Any]] = None,
+        analysis_pending_files: Optional[List[str]] = None
     ) -> bool:
         """
         Update repository with analysis results
@@ -228,6 +231,9 @@ class RepositoryStorageService:
             acid_scores: ACID scores dictionary
             complexity_metrics: Complexity metrics dictionary
             overall_score: Overall repository score
+            analyzed_commit_sha: Commit SHA the analysis was computed at
+            analysis_aggregates: Per-file ACID aggregates for incremental rescans
+            analysis_pending_files: Files the aggregates still miss (analyzed on the next rescan)
             
         Returns:
             True if updated successfully
@@ -242,6 +248,10 @@ class RepositoryStorageService:
             'analyzed_at': datetime.utcnow(),
             'updated_at': datetime.utcnow()
         }
+        if analyzed_commit_sha:
+            update_doc['analyzed_commit_sha'] = analyzed_commit_sha
+            update_doc['analysis_aggregates'] = analysis_aggregates
+            update_doc['analysis_pending_files'] = analysis_pending_files or []
         
         try:
             result = await self.collection.update_one(
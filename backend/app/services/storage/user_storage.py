@@ -9,6 +9,7 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 import logging
 
 from app.models.profile import UserProfile, UserProfileCreate, UserProfileUpdate
+from app.models.ranking import RankedUser, ranked_user_projection
 
 logger = logging.getLogger(__name__)
 
@@ -371,6 +372,64 @@ class UserStorageService:
         
         return users
     
+    async def get_ranked_users_by_region(
+        self,
+        region: str,
+        limit: int = 1000
+    ) -> List[RankedUser]:
+        """
+        Get ranking records for users in a specific region
+        
+        Same users and order as get_users_by_region(), but only the ranking
+        fields are loaded and no UserProfile models are built.
+        
+        Args:
+            region: Region code
+            limit: Maximum number of results
+            
+        Returns:
+            List of RankedUser records
+        """
+        cursor = self.collection.find(
+            {
+                'region': region,
+                'analysis_completed': True,
+                'overall_score': {'$ne': None}
+            },
+            ranked_user_projection('full_name')
+        ).sort('overall_score', -1).limit(limit)
+        
+        return [RankedUser.from_document(doc, 'full_name') async for doc in cursor]
+    
+    async def get_ranked_users_by_university(
+        self,
+        university: str,
+        limit: int = 1000
+    ) -> List[RankedUser]:
+        """
+        Get ranking records for users from a specific university
+        
+        Same users and order as get_users_by_university(), but only the
+        ranking fields are loaded and no UserProfile models are built.
+        
+        Args:
+            university: University name
+            limit: Maximum number of results
+            
+        Returns:
+            List of RankedUser records
+        """
+        cursor = self.collection.find(
+            {
+                'university': university,
+                'analysis_completed': True,
+                'overall_score': {'$ne': None}
+            },
+            ranked_user_projection('full_name')
+        ).sort('overall_score', -1).limit(limit)
+        
+        return [RankedUser.from_document(doc, 'full_name') async for doc in cursor]
+    
     async def count_users(self, filters: Optional[Dict[str, Any]] = None) -> int:
         """
         Count users matching filters
@@ -0,0 +1,73 @@
+"""
+Deep analysis jobs for the Celery worker consuming analysis_queue
+
+Jobs are acknowledged only after they finish (task_acks_late) and are
+requeued if the worker dies mid-job (task_reject_on_worker_lost), so a
+restarted worker picks them up again and resumes from the per-repository
+checkpoints kept in analysis_states.
+
+Each worker process connects the shared MongoDB client once, at process
+start, on the event loop its jobs run on.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from celery.signals import worker_process_init
+
+from app.celery_app import celery_app
+from app.services.analysis_jobs import run_orchestrated_analysis
+
+logger = logging.getLogger(__name__)
+
+# One event loop per worker process: the shared MongoDB client is bound to
+# the loop it was first used on, so it cannot be reused across fresh loops
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _run(coro):
+    global _worker_loop
+    if _worker_loop is None or _worker_loop.is_closed():
+        _worker_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_worker_loop)
+    return _worker_loop.run_until_complete(coro)
+
+
+@worker_process_init.connect
+def connect_worker_database(**kwargs):
+    """Connect the database analysis states live in (the API's app.db_connection)"""
+    from app.db_connection import connect_worker_database as connect
+
+    if _run(connect()) is None:
+        # Jobs fail and are retried until the database is reachable again
+        logger.error("Analysis worker started without a database connection")
+
+
+@celery_app.task(bind=True, max_retries=3, default_retry_delay=30)
+def run_deep_analysis(
+    self,
+    analysis_id: str,
+    username: str,
+    repositories: List[Dict[str, Any]],
+    max_evaluate: int = 15,
+    token_user_id: Optional[str] = None
+):
+    """
+    Run or resume an orchestrated deep analysis (/api/analysis/deep-analyze)
+
+    The GitHub token is resolved here from token_user_id, never sent with the job.
+    """
+    logger.info("Deep analysis job %s started for %s (attempt %s)", analysis_id, username, self.request.retries + 1)
+
+    try:
+        _run(run_orchestrated_analysis(analysis_id, username, repositories, max_evaluate, token_user_id))
+    except Exception as exc:
+        # Infrastructure errors (e.g. database unavailable); analysis errors are
+        # recorded on the analysis state by the orchestrator and do not raise
+        logger.error("Deep analysis job %s failed: %s", analysis_id, exc)
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc, countdown=30 * (2 ** self.request.retries))
+        raise
+
+    return {"analysis_id": analysis_id, "username": username}
@@ -1,6 +1,6 @@
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from typing import AsyncIterable, AsyncIterator, Dict, Any, List, Optional
 from datetime import datetime, timedelta
 import json
 import traceback
@@ -11,6 +11,8 @@ from celery.exceptions import Retry
 from app.celery_app import celery_app
 from app.services.github_scanner import GitHubScanner
 from app.services.github_api_service import GitHubAPIService
+from app.services.github_graphql_client import GitHubGraphQLClient
+from app.services.repository_activity import summarize_issues, summarize_pull_requests
 from app.services.evaluation_engine import EvaluationEngine
 from app.services.technology_detector import TechnologyDetector
 from app.services.cache_invalidation import cache_invalidation_service
@@ -87,7 +89,49 @@ class ScanProgressTracker:
                 upsert=True
             )
         except Exception as e:
-            logger.error(f"Failed to update progress in database: {e}")
+            logger.error("Failed to update progress in database: %s", e)
+
+async def _record_file_listing(files: AsyncIterable[Dict[str, Any]],
+                               listing: List[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+    """Pass files through unchanged, keeping a content-free entry for each in listing"""
+    async for file_info in files:
+        listing.append({key: value for key, value in file_info.items() if key != 'content'})
+        yield file_info
+        del file_info
+
+async def _emit_analysis_progress(files: AsyncIterable[Dict[str, Any]],
+                                  progress_emitter: ScanProgressEmitter,
+                                  repo_name: str,
+                                  max_files: int) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Pass files through to the evaluator, emitting analysis progress as each
+    one is taken and score calculation progress once the last is done
+    """
+    files_analyzed = 0
+    lines_of_code = 0
+    async for file_info in files:
+        files_analyzed += 1
+        lines_of_code += file_info.get('content', '').count('\n') + 1
+        # The file count is only known once the walk ends, so the cap is the total
+        await progress_emitter.emit_analysis_progress(
+            repo_name=repo_name,
+            current_file=file_info.get('path', 'unknown'),
+            files_analyzed=files_analyzed,
+            total_files=max(max_files, files_analyzed),
+            lines_of_code=lines_of_code,
+            api_calls_made=0,  # Could be tracked from github_scanner
+            api_calls_remaining=5000  # Could be fetched from rate limit
+        )
+        yield file_info
+        # Release the file while the evaluator waits for the next one
+        del file_info
+    
+    # Emit score calculation phase (Requirements: 1.3)
+    await progress_emitter.emit_score_calculation(
+        repo_name=repo_name,
+        calculation_type="ACID scores",
+        progress=0.0
+    )
 
 @celery_app.task(bind=True, max_retries=3, default_retry_delay=60)
 def scan_user_repositories(self, user_id: str, github_url: str, scan_type: str = "myself"):
@@ -95,7 +139,7 @@ def scan_user_repositories(self, user_id: str, github_url: str, scan_type: str =
     Main task to scan all repositories for a user
     """
     task_id = self.request.id
-    logger.info(f"Starting repository scan for user {user_id}, task {task_id}")
+    logger.info("Starting repository scan for user %s, task %s", user_id, task_id)
     
     try:
         # Run the async scan function
@@ -111,7 +155,7 @@ def scan_user_repositories(self, user_id: str, github_url: str, scan_type: str =
             loop.close()
             
     except Exception as exc:
-        logger.error(f"Scan failed for user {user_id}: {exc}")
+        logger.error("Scan failed for user %s: %s", user_id, exc)
         logger.error(traceback.format_exc())
         
         # Update progress to error state
@@ -127,7 +171,7 @@ def scan_user_repositories(self, user_id: str, github_url: str, scan_type: str =
         
         # Retry logic
         if self.request.retries < self.max_retries:
-            logger.info(f"Retrying scan for user {user_id}, attempt {self.request.retries + 1}")
+            logger.info("Retrying scan for user %s, attempt %s", user_id, self.request.retries + 1)
             raise self.retry(countdown=60 * (2 ** self.request.retries))
         
         raise exc
@@ -144,7 +188,7 @@ async def _scan_user_repositories_async(task_id: str, user_id: str, github_url:
         # Initialize services
         github_scanner = GitHubScanner(settings.GITHUB_TOKEN)
         github_api = GitHubAPIService(settings.GITHUB_TOKEN)
-        acid_evaluator = EvaluationEngine()
+        acid_evaluator = EvaluationEngine(max_file_bytes=settings.evaluation_max_file_bytes)
         tech_detector = TechnologyDetector()
         db = await get_database()
         
@@ -184,7 +228,7 @@ async def _scan_user_repositories_async(task_id: str, user_id: str, github_url:
         repositories = await github_scanner.fetch_user_repositories(username)
         tracker.total_repos = len(repositories)
         
-        logger.info(f"Found {len(repositories)} repositories for user {username}")
+        logger.info("Found %s repositories for user %s", len(repositories), username)
         
         # Emit account info (Requirements: 5.1, 5.2, 5.3, 5.4, 5.5)
         total_stars = sum(repo.get('stargazers_count', 0) for repo in repositories)
@@ -207,6 +251,17 @@ async def _scan_user_repositories_async(task_id: str, user_id: str, github_url:
         processed_repos = []
         display_only_repos = []
         
+        # PR and issue counts plus recent items for every scored repository in
+        # one or two GraphQL round trips instead of REST listings per repository
+        activity_by_repository = {}
+        try:
+            activity = await GitHubGraphQLClient(settings.GITHUB_TOKEN).get_repository_activity(
+                [repo['full_name'] for repo in repositories[:20]]
+            )
+            activity_by_repository = activity['repositories']
+        except Exception as e:
+            logger.warning("Failed to fetch PR/Issue activity for %s: %s", username, e)
+        
         # Process first 20 repositories with full evaluation
         for i, repo_data in enumerate(repositories[:20]):
             try:
@@ -247,26 +302,6 @@ async def _scan_user_repositories_async(task_id: str, user_id: str, github_url:
                     phase_progress=0.0
                 )
                 
-                # Fetch repository contents
-                contents = await github_scanner.fetch_repository_contents(
-                    repo_full_name, 
-                    max_files=50
-                )
-                
-                # Emit analysis progress for each file (Requirements: 1.3, 4.3, 4.4)
-                total_files = len(contents)
-                for file_idx, file_content in enumerate(contents):
-                    file_path = file_content.get('path', 'unknown')
-                    await progress_emitter.emit_analysis_progress(
-                        repo_name=repo_name,
-                        current_file=file_path,
-                        files_analyzed=file_idx + 1,
-                        total_files=total_files,
-                        lines_of_code=sum(len(f.get('content', '').split('\n')) for f in contents[:file_idx+1]),
-                        api_calls_made=0,  # Could be tracked from github_scanner
-                        api_calls_remaining=5000  # Could be fetched from rate limit
-                    )
-                
                 # Get commit history
                 commit_history = await github_scanner.get_commit_history(
                     repo_full_name, 
@@ -278,16 +313,22 @@ async def _scan_user_repositories_async(task_id: str, user_id: str, github_url:
                     repo_full_name
                 )
                 
-                # Emit score calculation phase (Requirements: 1.3)
-                await progress_emitter.emit_score_calculation(
-                    repo_name=repo_name,
-                    calculation_type="ACID scores",
-                    progress=0.0
+                # Stream repository contents into the evaluator, emitting analysis
+                # progress for each file (Requirements: 1.3, 4.3, 4.4); only a
+                # content-free listing is kept once a file has been analyzed
+                contents = []
+                files = _emit_analysis_progress(
+                    _record_file_listing(
+                        github_scanner.iter_repository_contents(repo_full_name, max_files=50), contents
+                    ),
+                    progress_emitter,
+                    repo_name,
+                    max_files=50
                 )
                 
                 # Calculate ACID scores
-                acid_scores = await acid_evaluator.evaluate_repository(
-                    repo_data, contents, commit_history, structure_analysis
+                acid_scores = await acid_evaluator.evaluate_repository_stream(
+                    repo_data, files, commit_history, structure_analysis
                 )
                 
                 # Emit score calculation completion
@@ -305,114 +346,13 @@ async def _scan_user_repositories_async(task_id: str, user_id: str, github_url:
                 try:
                     # Extract owner and repo from full_name
                     owner, repo = repo_full_name.split('/')
-                    logger.info(f"Fetching PR/Issue data for {owner}/{repo}")
-                    
-                    # Fetch pull requests
-                    prs = await github_api.get_pull_requests(
-                        owner=owner,
-                        repo=repo,
-                        state='all',
-                        per_page=100
-                    )
-                    logger.info(f"Fetched {len(prs) if prs else 0} PRs for {repo_name}")
-                    
-                    # Calculate PR statistics
-                    if prs:
-                        open_prs = [pr for pr in prs if pr.get('state') == 'open']
-                        closed_prs = [pr for pr in prs if pr.get('state') == 'closed' and not pr.get('merged_at')]
-                        merged_prs = [pr for pr in prs if pr.get('merged_at')]
-                        
-                        # Calculate average time to merge
-                        merge_times = []
-                        for pr in merged_prs:
-                            if pr.get('created_at') and pr.get('merged_at'):
-                                created = datetime.fromisoformat(pr['created_at'].replace('Z', '+00:00'))
-                                merged = datetime.fromisoformat(pr['merged_at'].replace('Z', '+00:00'))
-                                merge_times.append((merged - created).total_seconds() / 3600)
-                        
-                        avg_time_to_merge = sum(merge_times) / len(merge_times) if merge_times else None
-                        
-                        # Calculate average additions/deletions
-                        additions = [pr.get('additions', 0) for pr in prs if pr.get('additions')]
-                        deletions = [pr.get('deletions', 0) for pr in prs if pr.get('deletions')]
-                        
-                        # Transform PR data to match frontend expectations
-                        recent_prs_formatted = []
-                        for pr in prs[:10]:
-                            recent_prs_formatted.append({
-                                'number': pr.get('number'),
-                                'title': pr.get('title'),
-                                'author': pr.get('user', {}).get('login', 'unknown'),
-                                'state': 'merged' if pr.get('merged_at') else pr.get('state', 'open'),
-                                'createdAt': pr.get('created_at'),
-                                'mergedAt': pr.get('merged_at'),
-                                'url': pr.get('html_url', '')
-                            })
-                        
-                        pr_statistics = {
-                            'total': len(prs),
-                            'open': len(open_prs),
-                            'closed': len(closed_prs),
-                            'merged': len(merged_prs),
-                            'recent': recent_prs_formatted,  # Frontend expects 'recent', not 'recent_prs'
-                            'avgTimeToMerge': avg_time_to_merge,  # Frontend expects camelCase
-                            'avg_additions': sum(additions) / len(additions) if additions else None,
-                            'avg_deletions': sum(deletions) / len(deletions) if deletions else None
-                        }
-                    
-                    # Fetch issues (excluding PRs)
-                    issues = await github_api.get_issues(
-                        owner=owner,
-                        repo=repo,
-                        state='all',
-                        per_page=100
-                    )
-                    logger.info(f"Fetched {len(issues) if issues else 0} issues for {repo_name}")
+                    logger.info("Fetching PR/Issue data for %s/%s", owner, repo)
                     
-                    # Calculate issue statistics
-                    if issues:
-                        open_issues = [issue for issue in issues if issue.get('state') == 'open']
-                        closed_issues = [issue for issue in issues if issue.get('state') == 'closed']
-                        
-                        # Calculate average time to close
-                        close_times = []
-                        for issue in closed_issues:
-                            if issue.get('created_at') and issue.get('closed_at'):
-                                created = datetime.fromisoformat(issue['created_at'].replace('Z', '+00:00'))
-                                closed = datetime.fromisoformat(issue['closed_at'].replace('Z', '+00:00'))
-                                close_times.append((closed - created).total_seconds() / 3600)
-                        
-                        avg_time_to_close = sum(close_times) / len(close_times) if close_times else None
-                        
-                        # Calculate label distribution
-                        labels_dist = {}
-                        for issue in issues:
-                            for label in issue.get('labels', []):
-                                label_name = label.get('name', 'unknown')
-                                labels_dist[label_name] = labels_dist.get(label_name, 0) + 1
-                        
-                        # Transform issue data to match frontend expectations
-                        recent_issues_formatted = []
-                        for issue in issues[:10]:
-                            recent_issues_formatted.append({
-                                'number': issue.get('number'),
-                                'title': issue.get('title'),
-                                'author': issue.get('user', {}).get('login', 'unknown'),
-                                'state': issue.get('state', 'open'),
-                                'createdAt': issue.get('created_at'),
-                                'closedAt': issue.get('closed_at'),
-                                'url': issue.get('html_url', ''),
-                                'labels': [label.get('name') for label in issue.get('labels', [])]
-                            })
-                        
-                        issue_statistics = {
-                            'total': len(issues),
-                            'open': len(open_issues),
-                            'closed': len(closed_issues),
-                            'recent': recent_issues_formatted,  # Frontend expects 'recent', not 'recent_issues'
-                            'avgTimeToClose': avg_time_to_close,  # Frontend expects camelCase
-                            'labelsDistribution': labels_dist  # Frontend expects camelCase
-                        }
+                    # Pull requests and issues come from the batched per-user query
+                    repository_activity = activity_by_repository.get(repo_full_name)
+                    if repository_activity:
+                        pr_statistics = summarize_pull_requests(repository_activity['pull_requests'])
+                        issue_statistics = summarize_issues(repository_activity['issues'])
                     
                     # Fetch milestones and projects for roadmap
                     milestones = await github_api.get_milestones(
@@ -448,10 +388,10 @@ async def _scan_user_repositories_async(task_id: str, user_id: str, github_url:
                         }
                     
                 except Exception as e:
-                    logger.error(f"Failed to fetch PR/Issue/Roadmap data for {repo_name}: {e}")
-                    logger.error(f"Error details: {type(e).__name__}: {str(e)}")
+                    logger.error("Failed to fetch PR/Issue/Roadmap data for %s: %s", repo_name, e)
+                    logger.error("Error details: %s: %s", type(e).__name__, str(e))
                     import traceback
-                    logger.error(f"Traceback: {traceback.format_exc()}")
+                    logger.error("Traceback: %s", traceback.format_exc())
                     # Continue without this data
                 
                 # Combine all data
@@ -477,7 +417,7 @@ async def _scan_user_repositories_async(task_id: str, user_id: str, github_url:
                 await asyncio.sleep(0.5)
                 
             except Exception as e:
-                logger.warning(f"Failed to process repository {repo_data['name']}: {e}")
+                logger.warning("Failed to process repository %s: %s", repo_data['name'], e)
                 
                 # Emit error (Requirements: 3.3)
                 await progress_emitter.emit_error(
@@ -532,7 +472,7 @@ async def _scan_user_repositories_async(task_id: str, user_id: str, github_url:
                 await tracker.update_progress(increment=True)
                 
             except Exception as e:
-                logger.warning(f"Failed to add repository {repo_data['name']}: {e}")
+                logger.warning("Failed to add repository %s: %s", repo_data['name'], e)
                 
                 # Emit error
                 await progress_emitter.emit_error(
@@ -605,7 +545,7 @@ async def _scan_user_repositories_async(task_id: str, user_id: str, github_url:
             profile = await db.user_profiles.find_one({"user_id": user_id})
             
             if github_username and overall_scores.get('overall_score', 0) > 0:
-                logger.info(f"📊 [USER_RANKINGS] Storing scores and rankings for {github_username}")
+                logger.info("📊 [USER_RANKINGS] Storing scores and rankings for %s", github_username)
                 
                 # Prepare user_rankings document (single collection for everything)
                 user_ranking_doc = {
@@ -655,11 +595,11 @@ async def _scan_user_repositories_async(task_id: str, user_id: str, github_url:
                 )
                 
                 logger.info(f"✅ [USER_RANKINGS] Successfully stored scores")
-                logger.info(f"   - Username: {github_username}")
-                logger.info(f"   - Overall Score: {round(overall_scores.get('overall_score', 0), 1)}")
-                logger.info(f"   - Repository Count: {len(all_repositories)}")
-                logger.info(f"   - Region: {profile.get('region') if profile else 'N/A'}")
-                logger.info(f"   - University: {profile.get('university') if profile else 'N/A'}")
+                logger.info("   - Username: %s", github_username)
+                logger.info("   - Overall Score: %s", round(overall_scores.get('overall_score', 0), 1))
+                logger.info("   - Repository Count: %s", len(all_repositories))
+                logger.info("   - Region: %s", profile.get('region') if profile else 'N/A')
+                logger.info("   - University: %s", profile.get('university') if profile else 'N/A')
                 
                 # CRITICAL: Populate hr_view collection (primary collection for HR dashboard)
                 try:
@@ -725,14 +665,14 @@ async def _scan_user_repositories_async(task_id: str, user_id: str, github_url:
                     )
                     
                     if hr_result.get("success"):
-                        logger.info(f"✅ [HR_VIEW] Successfully stored developer profile for {github_username}")
+                        logger.info("✅ [HR_VIEW] Successfully stored developer profile for %s", github_username)
                     else:
-                        logger.error(f"❌ [HR_VIEW] Failed to store profile: {hr_result.get('error')}")
+                        logger.error("❌ [HR_VIEW] Failed to store profile: %s", hr_result.get('error'))
                         
                 except Exception as hr_error:
-                    logger.error(f"❌ [HR_VIEW] Error storing developer profile: {hr_error}")
+                    logger.error("❌ [HR_VIEW] Error storing developer profile: %s", hr_error)
                     import traceback
-                    logger.error(f"Traceback: {traceback.format_exc()}")
+                    logger.error("Traceback: %s", traceback.format_exc())
                 
                 # Trigger ranking calculation after populating user_rankings
                 try:
@@ -745,27 +685,27 @@ async def _scan_user_repositories_async(task_id: str, user_id: str, github_url:
                     
                     if ranking_result.get("success"):
                         logger.info(f"✅ Rankings calculated successfully (batch mode)")
-                        logger.info(f"   - Regional updated: {ranking_result.get('regional_updated', False)}")
-                        logger.info(f"   - University updated: {ranking_result.get('university_updated', False)}")
+                        logger.info("   - Regional updated: %s", ranking_result.get('regional_updated', False))
+                        logger.info("   - University updated: %s", ranking_result.get('university_updated', False))
                         
                         # Log ranking details
                         if ranking_result.get('regional_result'):
                             reg = ranking_result['regional_result']
-                            logger.info(f"   - Regional: {reg.get('users_updated', 0)} users updated")
+                            logger.info("   - Regional: %s users updated", reg.get('users_updated', 0))
                         if ranking_result.get('university_result'):
                             uni = ranking_result['university_result']
-                            logger.info(f"   - University: {uni.get('users_updated', 0)} users updated")
+                            logger.info("   - University: %s users updated", uni.get('users_updated', 0))
                     else:
-                        logger.warning(f"⚠️  Ranking calculation completed with error: {ranking_result.get('error')}")
+                        logger.warning("⚠️  Ranking calculation completed with error: %s", ranking_result.get('error'))
                         
                 except Exception as ranking_error:
-                    logger.error(f"❌ Error calculating rankings: {ranking_error}")
+                    logger.error("❌ Error calculating rankings: %s", ranking_error)
                     # Don't fail scan if ranking calculation fails
                     
         except Exception as details_error:
-            logger.error(f"❌ [USER_OVERALL_DETAILS] Error storing scan results: {details_error}")
+            logger.error("❌ [USER_OVERALL_DETAILS] Error storing scan results: %s", details_error)
             import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.error("Traceback: %s", traceback.format_exc())
             # Don't fail scan if storage fails
         
         # Invalidate relevant caches
@@ -786,7 +726,7 @@ async def _scan_user_repositories_async(task_id: str, user_id: str, github_url:
             current_repo="Scan completed successfully"
         )
         
-        logger.info(f"Successfully completed scan for user {user_id}")
+        logger.info("Successfully completed scan for user %s", user_id)
         
         return {
             'status': 'completed',
@@ -796,7 +736,7 @@ async def _scan_user_repositories_async(task_id: str, user_id: str, github_url:
         }
         
     except Exception as e:
-        logger.error(f"Error in repository scan: {e}")
+        logger.error("Error in repository scan: %s", e)
         
         # Emit error event
         await progress_emitter.emit_error(
@@ -817,7 +757,7 @@ def scan_single_repository(self, user_id: str, repo_url: str):
     Task to scan a single repository
     """
     task_id = self.request.id
-    logger.info(f"Starting single repository scan: {repo_url}")
+    logger.info("Starting single repository scan: %s", repo_url)
     
     try:
         loop = asyncio.new_event_loop()
@@ -832,7 +772,7 @@ def scan_single_repository(self, user_id: str, repo_url: str):
             loop.close()
             
     except Exception as exc:
-        logger.error(f"Single repository scan failed: {exc}")
+        logger.error("Single repository scan failed: %s", exc)
         
         if self.request.retries < self.max_retries:
             raise self.retry(countdown=30)
@@ -847,7 +787,7 @@ async def _scan_single_repository_async(task_id: str, user_id: str, repo_url: st
     try:
         # Initialize services
         github_scanner = GitHubScanner(settings.GITHUB_TOKEN)
-        acid_evaluator = EvaluationEngine()
+        acid_evaluator = EvaluationEngine(max_file_bytes=settings.evaluation_max_file_bytes)
         tech_detector = TechnologyDetector()
         
         # Extract owner and repo from URL
@@ -872,18 +812,20 @@ async def _scan_single_repository_async(task_id: str, user_id: str, repo_url: st
             current_repo=f"Analyzing {repo_name}..."
         )
         
-        # Fetch repository contents
-        contents = await github_scanner.fetch_repository_contents(repo_full_name, max_files=100)
-        
         # Get commit history
         commit_history = await github_scanner.get_commit_history(repo_full_name, limit=100)
         
         # Analyze repository structure
         structure_analysis = await github_scanner.analyze_repository_structure(repo_full_name)
         
-        # Calculate ACID scores
-        acid_scores = await acid_evaluator.evaluate_repository(
-            target_repo, contents, commit_history, structure_analysis
+        # Calculate ACID scores, streaming repository contents into the evaluator
+        # and keeping only a content-free listing
+        contents = []
+        acid_scores = await acid_evaluator.evaluate_repository_stream(
+            target_repo,
+            _record_file_listing(github_scanner.iter_repository_contents(repo_full_name, max_files=100), contents),
+            commit_history,
+            structure_analysis
         )
         
         # Create result
@@ -913,7 +855,7 @@ async def _scan_single_repository_async(task_id: str, user_id: str, repo_url: st
         }
         
     except Exception as e:
-        logger.error(f"Error in single repository scan: {e}")
+        logger.error("Error in single repository scan: %s", e)
         await tracker.update_progress(
             status=ScanStatus.ERROR,
             error=str(e)
@@ -936,7 +878,7 @@ def cleanup_expired_scans():
             loop.close()
             
     except Exception as e:
-        logger.error(f"Cleanup task failed: {e}")
+        logger.error("Cleanup task failed: %s", e)
         raise
 
 async def _cleanup_expired_scans_async():
@@ -959,7 +901,7 @@ async def _cleanup_expired_scans_async():
             "scan_completed_at": {"$lt": old_cutoff}
         })
         
-        logger.info(f"Cleanup completed: {progress_result.deleted_count} progress records, {results_result.deleted_count} scan results deleted")
+        logger.info("Cleanup completed: %s progress records, %s scan results deleted", progress_result.deleted_count, results_result.deleted_count)
         
         return {
             'progress_records_deleted': progress_result.deleted_count,
@@ -967,7 +909,7 @@ async def _cleanup_expired_scans_async():
         }
         
     except Exception as e:
-        logger.error(f"Error during cleanup: {e}")
+        logger.error("Error during cleanup: %s", e)
         raise
 
 # Helper function to get scan progress
@@ -985,7 +927,7 @@ async def get_scan_progress(task_id: str) -> Optional[Dict[str, Any]]:
         return None
         
     except Exception as e:
-        logger.error(f"Error getting scan progress: {e}")
+        logger.error("Error getting scan progress: %s", e)
         return None
 
 # Helper function to get scan result
@@ -1003,5 +945,5 @@ async def get_scan_result(task_id: str) -> Optional[Dict[str, Any]]:
         return None
         
     except Exception as e:
-        logger.error(f"Error getting scan result: {e}")
+        logger.error("Error getting scan result: %s", e)
         return None
\ No newline at end of file
@@ -13,20 +13,18 @@ import uuid
 from dotenv import load_dotenv
 
 # Legacy database imports removed - using multi-database system
-from app.routers import auth, scan, evaluation, performance, security, scan_simple, test_endpoint, profile, fast_scan, rankings
-from app.routers import rankings_enhanced, debug_rankings, debug_users
-from app.routers import quick_scan, deep_analysis, analytics_api
-from app.api import debug
+from app.routers.registry import include_routers
 from app.core.config import settings, validate_configuration
 from app.core.middleware import RateLimitMiddleware, SecurityValidationMiddleware, RequestLoggingMiddleware
+from app.core.auth_context import AuthContextMiddleware
 from app.core.error_handler import (
     application_error_handler, http_exception_handler, validation_exception_handler,
     general_exception_handler, ApplicationError
 )
-from app.core.logging_config import setup_logging
+from app.core.logging_config import setup_logging, shutdown_logging
+from app.core.audit_log import get_audit_logger, shutdown_audit_logger
 from app.core.monitoring import monitoring_system, record_response_time, record_error
 from app.websocket.scan_websocket import websocket_endpoint
-from app.services.performance_service import performance_service
 from app.services.concurrent_data_fetcher import initialize_concurrent_fetcher, shutdown_concurrent_fetcher
 from app.services.connection_pool_manager import initialize_connection_pools, shutdown_connection_pools
 from app.services.scan_queue_manager import initialize_scan_queue, shutdown_scan_queue
@@ -47,7 +45,11 @@ async def lifespan(app: FastAPI):
         log_level=settings.log_level,
         log_file=os.getenv("LOG_FILE", "logs/app.log"),
         enable_json_logging=settings.json_logging,
-        enable_console_logging=True
+        enable_console_logging=True,
+        async_logging=settings.log_async,
+        queue_size=settings.log_queue_size,
+        sample_max_per_window=settings.log_sample_max_per_window,
+        sample_window_seconds=settings.log_sample_window_seconds
     )
     
     # Local development environment - initialize all services
@@ -61,6 +63,11 @@ async def lifespan(app: FastAPI):
         # await asyncio.wait_for(initialize_database_system(), timeout=60.0)
         from app.services.cache_service import cache_service
         await cache_service.connect()
+        # Stage 2 REST requests revalidate through the shared ETag cache
+        from app.services.github_http_cache import configure_scoring_http_cache
+        configure_scoring_http_cache()
+        # Batched audit log writer (flushes in the background, drained on shutdown)
+        get_audit_logger(db_manager.get_database()).start()
         # await asyncio.wait_for(initialize_connection_pools(multi_db_manager, settings), timeout=15.0)
     except asyncio.TimeoutError:
         logger.error("❌ Application cannot start without database connections")
@@ -76,8 +83,7 @@ async def lifespan(app: FastAPI):
             initialize_connection_pools(
                 mongo_connection_string=settings.mongodb_url,
                 mongo_database=settings.database_name,
-                redis_url=settings.redis_url,
-                http_max_connections=50  # Standard connection pool size for local dev
+                redis_url=settings.redis_url
             ),
             timeout=15.0
         )
@@ -114,6 +120,12 @@ async def lifespan(app: FastAPI):
     await shutdown_concurrent_fetcher()
     await monitoring_system.stop_monitoring()
     
+    # Write pending audit entries before the database connection closes
+    try:
+        await shutdown_audit_logger()
+    except Exception as e:
+        logger.warning(f"Audit log drain failed: {e}")
+    
     # Disconnect cache service
     try:
         from app.services.cache_service import cache_service
@@ -130,6 +142,9 @@ async def lifespan(app: FastAPI):
         logger.warning(f"Multi-database shutdown failed: {e}")
     
     # Legacy database connection handling removed - using multi-database system
+    
+    # Flush queued log records and stop the logging writer thread
+    shutdown_logging()
 
 app = FastAPI(
     title="BroskiesHub API",
@@ -297,40 +312,12 @@ app.add_middleware(GZipMiddleware, minimum_size=1000)
 if settings.rate_limit_enabled:
     app.add_middleware(RateLimitMiddleware, default_requests_per_minute=settings.rate_limit_requests_per_minute)
 
-# Include routers
-app.include_router(auth.router, prefix="/auth", tags=["authentication"])
-app.include_router(scan.router, prefix="/scan", tags=["scanning"])
-app.include_router(scan_simple.router, prefix="/scan", tags=["scanning"])
-app.include_router(test_endpoint.router, prefix="/test", tags=["testing"])
-app.include_router(evaluation.router, prefix="/evaluation", tags=["evaluation"])
-app.include_router(performance.router, prefix="/performance", tags=["performance"])
-app.include_router(security.router, prefix="/security", tags=["security"])
-app.include_router(profile.router, prefix="/profile", tags=["profile"])
-app.include_router(rankings.router, prefix="/rankings", tags=["rankings"])
-app.include_router(rankings_enhanced.router, prefix="/rankings/v2", tags=["rankings-enhanced"])
-app.include_router(debug_rankings.router, prefix="/debug/rankings", tags=["debug-rankings"])
-app.include_router(debug_users.router, prefix="/debug/users", tags=["debug-users"])
-app.include_router(fast_scan.router, prefix="/scan", tags=["fast-scan"])
-app.include_router(debug.router, prefix="/debug", tags=["debug"])
-
-# New scoring system routers
-app.include_router(quick_scan.router, tags=["quick-scan"])
-app.include_router(deep_analysis.router, tags=["deep-analysis"])
-app.include_router(analytics_api.router, tags=["analytics"])
-
-# HR Dashboard routers
-from app.routers import hr_auth, hr_candidates, hr_admin
-app.include_router(hr_auth.router, tags=["hr-authentication"])
-app.include_router(hr_candidates.router, tags=["hr-candidates"])
-app.include_router(hr_admin.router, tags=["hr-admin"])
-
-# Import and include scores router
-from app.routers import scores
-app.include_router(scores.router, tags=["scores"])
+# Auth context middleware (outermost): verifies the bearer token once per request
+# and exposes the principal on request.state for dependencies and rate limiting
+app.add_middleware(AuthContextMiddleware)
 
-# Import and include health monitoring router
-from app.routers import health
-app.include_router(health.router, tags=["health-monitoring"])
+# Include routers (debug and test routers are not imported in production)
+include_routers(app)
 
 # WebSocket endpoint for real-time scan progress
 @app.websocket("/ws/scan-progress")
@@ -422,13 +409,17 @@ def setup_health_checks():
     async def github_api_health_check():
         """Check GitHub API connectivity"""
         try:
-            import httpx
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get("https://api.github.com/rate_limit")
-                if response.status_code == 200:
+            import aiohttp
+            from app.services.connection_pool_manager import get_http_pool
+            async with get_http_pool().request(
+                "GET",
+                f"{settings.github_api_url.rstrip('/')}/rate_limit",
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                if response.status == 200:
                     return {"healthy": True, "message": "GitHub API accessible"}
                 else:
-                    return {"healthy": False, "message": f"GitHub API returned {response.status_code}"}
+                    return {"healthy": False, "message": f"GitHub API returned {response.status}"}
         except Exception as e:
             return {"healthy": False, "message": f"GitHub API error: {str(e)}"}
     
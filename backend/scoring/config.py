@@ -3,9 +3,13 @@ Configuration for the scoring system
 Contains all thresholds, weights, and constants
 """
 
+import os
 from typing import Dict, Any
 from dataclasses import dataclass
 
+# Base URL for GitHub APIs (override to point at a local fake GitHub server)
+_GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+
 
 @dataclass
 class ScoringConfig:
@@ -44,8 +48,10 @@ class ScoringConfig:
     PROGRESS_UPDATE_INTERVAL_SECONDS: int = 2
     
     # GitHub API
-    GITHUB_GRAPHQL_ENDPOINT: str = "https://api.github.com/graphql"
-    GITHUB_REST_ENDPOINT: str = "https://api.github.com"
+    GITHUB_GRAPHQL_ENDPOINT: str = f"{_GITHUB_API_URL}/graphql"
+    GITHUB_REST_ENDPOINT: str = _GITHUB_API_URL
+    GRAPHQL_REPOS_PAGE_SIZE: int = 100  # GitHub maximum per page
+    MAX_REPOS_TO_SCAN: int = 1000
     MAX_RETRY_ATTEMPTS: int = 3
     RETRY_BACKOFF_BASE: float = 2.0
     
@@ -336,11 +336,13 @@ Fetches user profile and all repositories in a single optimized query
 
 import aiohttp
 import asyncio
-from typing import Dict, List, Tuple, Any, Optional
+import hashlib
+from typing import AsyncIterator, Dict, List, Tuple, Any, Optional
 from datetime import datetime
 import logging
 
 from ..config import get_config
+from .http_session import github_session
 from ..utils import get_logger
 
 
@@ -353,7 +355,7 @@ class GitHubGraphQLService:
     
     # Optimized GraphQL query to fetch everything in one request
     USER_AND_REPOS_QUERY = """
-    query GetUserAndRepos($username: String!) {
+    query GetUserAndRepos($username: String!, $first: Int!, $after: String) {
       user(login: $username) {
         id
         login
@@ -372,11 +374,16 @@ class GitHubGraphQLService:
         following { totalCount }
         
         repositories(
-          first: 100
+          first: $first
+          after: $after
           orderBy: {field: UPDATED_AT, direction: DESC}
           ownerAffiliations: OWNER
         ) {
           totalCount
+          pageInfo {
+            hasNextPage
+            endCursor
+          }
           nodes {
             id
             name
@@ -481,6 +488,32 @@ class GitHubGraphQLService:
     }
     """
     
+    # Cheap probe for the skip-unchanged check: a few scalar fields per repository
+    SCAN_FINGERPRINT_QUERY = """
+    query GetScanFingerprint($username: String!, $first: Int!, $after: String) {
+      user(login: $username) {
+        repositories(
+          first: $first
+          after: $after
+          orderBy: {field: PUSHED_AT, direction: DESC}
+          ownerAffiliations: OWNER
+        ) {
+          totalCount
+          pageInfo {
+            hasNextPage
+            endCursor
+          }
+          nodes {
+            id
+            pushedAt
+            updatedAt
+            stargazerCount
+          }
+        }
+      }
+    }
+    """
+    
     def __init__(self, logger: Optional[logging.Logger] = None):
         """
         Initialize GraphQL service
@@ -520,7 +553,7 @@ class GitHubGraphQLService:
             # Execute GraphQL query
             response_data = await self._execute_query(
                 self.USER_AND_REPOS_QUERY,
-                {"username": username},
+                {"username": username, "first": self.config.GRAPHQL_REPOS_PAGE_SIZE},
                 token
             )
             
@@ -537,6 +570,139 @@ class GitHubGraphQLService:
             self.logger.error(f"Failed to fetch user and repositories: {e}")
             raise RuntimeError(f"GraphQL query failed: {e}")
     
+    async def get_scan_fingerprint(
+        self,
+        username: str,
+        token: str
+    ) -> Dict[str, Any]:
+        """
+        Fingerprint of a user's repositories from a small paginated query
+        
+        Any push, metadata edit, star, new or deleted repository changes the
+        fingerprint, so an unchanged fingerprint means a quick scan would
+        produce the same results as the stored one. Only scalar fields are
+        requested, so every page is cheap; all pages up to MAX_REPOS_TO_SCAN
+        are read because edits and stars on older repositories do not move
+        them to the first page.
+        
+        Args:
+            username: GitHub username
+            token: GitHub OAuth token
+            
+        Returns:
+            Dictionary with repo_count, pushed_at and updated_at (latest ISO
+            timestamps) and stars_hash (digest of per-repository star counts)
+            
+        Raises:
+            ValueError: If username or token is invalid
+            RuntimeError: If the query fails
+        """
+        if not username or not token:
+            raise ValueError("Username and token are required")
+        
+        nodes: List[Dict[str, Any]] = []
+        cursor = None
+        
+        while True:
+            data = await self._execute_query(
+                self.SCAN_FINGERPRINT_QUERY,
+                {"username": username, "first": self.config.GRAPHQL_REPOS_PAGE_SIZE, "after": cursor},
+                token
+            )
+            
+            user = data.get('user')
+            if not user:
+                raise RuntimeError(f"User '{username}' not found")
+            
+            repositories = user.get('repositories') or {}
+            nodes.extend(repositories.get('nodes') or [])
+            page_info = repositories.get('pageInfo') or {}
+            if not page_info.get('hasNextPage') or len(nodes) >= self.config.MAX_REPOS_TO_SCAN:
+                break
+            cursor = page_info.get('endCursor')
+        
+        stars = hashlib.sha1(
+            ','.join(sorted(f"{node['id']}:{node.get('stargazerCount', 0)}" for node in nodes)).encode()
+        ).hexdigest()
+        
+        return {
+            'repo_count': repositories.get('totalCount', 0),
+            'pushed_at': max((node.get('pushedAt') or '' for node in nodes), default=''),
+            'updated_at': max((node.get('updatedAt') or '' for node in nodes), default=''),
+            'stars_hash': stars
+        }
+    
+    async def iter_repository_pages(
+        self,
+        username: str,
+        token: str,
+        max_repositories: Optional[int] = None
+    ) -> AsyncIterator[Tuple[Dict[str, Any], List[Dict[str, Any]], int]]:
+        """
+        Stream user profile and repositories page by page
+        
+        The next page is requested before the current one is yielded, so
+        the caller's scoring and storage of a page overlap with the fetch
+        of the following page.
+        
+        Args:
+            username: GitHub username
+            token: GitHub OAuth token
+            max_repositories: Stop after this many repositories (default: MAX_REPOS_TO_SCAN)
+            
+        Yields:
+            Tuple of (user_data, repositories_page, total_repositories)
+            
+        Raises:
+            ValueError: If username or token is invalid
+            RuntimeError: If a GraphQL query fails
+        """
+        if not username or not token:
+            raise ValueError("Username and token are required")
+        
+        limit = max_repositories or self.config.MAX_REPOS_TO_SCAN
+        page_size = min(self.config.GRAPHQL_REPOS_PAGE_SIZE, limit)
+        
+        self.logger.info(f"Streaming repositories for: {username} (page size {page_size})")
+        
+        def fetch_page(cursor: Optional[str]) -> asyncio.Task:
+            return asyncio.ensure_future(self._execute_query(
+                self.USER_AND_REPOS_QUERY,
+                {"username": username, "first": page_size, "after": cursor},
+                token
+            ))
+        
+        pending = fetch_page(None)
+        fetched = 0
+        
+        try:
+            while pending is not None:
+                try:
+                    response_data = await pending
+                except Exception as e:
+                    self.logger.error(f"Failed to fetch repository page: {e}")
+                    raise RuntimeError(f"GraphQL query failed: {e}")
+                pending = None
+                
+                user_data, repos_page = self._transform_response(response_data)
+                
+                repositories = response_data['user'].get('repositories') or {}
+                page_info = repositories.get('pageInfo') or {}
+                total = min(repositories.get('totalCount', 0), limit)
+                repos_page = repos_page[:limit - fetched]
+                fetched += len(repos_page)
+                
+                # Prefetch the next page while the caller processes this one
+                if page_info.get('hasNextPage') and fetched < limit:
+                    pending = fetch_page(page_info.get('endCursor'))
+                
+                yield user_data, repos_page, total
+            
+            self.logger.info(f"Streamed {fetched} repositories for {username}")
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
+    
     async def _execute_query(
         self,
         query: str,
@@ -574,7 +740,7 @@ class GitHubGraphQLService:
         
         for attempt in range(max_retries):
             try:
-                async with aiohttp.ClientSession() as session:
+                async with github_session() as session:
                     async with session.post(
                         self.endpoint,
                         json=payload,
@@ -0,0 +1,29 @@
+"""
+Shared conditional-request cache hook for the scoring GitHub clients
+
+The scoring package does not depend on the app. When the app starts it
+registers its github_http_cache here, so Stage 2 REST requests revalidate
+with ETags like every other GitHub client. Without a cache each request
+downloads the full response.
+"""
+
+from typing import Any, Optional
+
+_http_cache: Optional[Any] = None
+
+
+def set_http_cache(cache: Optional[Any]) -> None:
+    """
+    Register the default conditional-request cache (None disables caching)
+
+    Args:
+        cache: Object with the app's GitHubHTTPCache interface
+            (lookup/serve_fresh/revalidated/store)
+    """
+    global _http_cache
+    _http_cache = cache
+
+
+def get_http_cache() -> Optional[Any]:
+    """Return the registered cache, or None if the app registered none"""
+    return _http_cache
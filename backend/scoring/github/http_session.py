@@ -0,0 +1,37 @@
+"""
+Shared HTTP session hook for the scoring GitHub clients
+
+The scoring package does not depend on the app. When the app starts it
+registers its pooled session provider here, so Stage 1/Stage 2 requests
+reuse the same keep-alive connections (and timing hooks) as every other
+GitHub client. Without a provider each call opens its own session.
+"""
+
+from contextlib import asynccontextmanager
+from typing import Callable, Optional
+
+import aiohttp
+
+_session_provider: Optional[Callable[[], aiohttp.ClientSession]] = None
+
+
+def set_session_provider(provider: Optional[Callable[[], aiohttp.ClientSession]]) -> None:
+    """
+    Register the callable returning the shared session (None restores per-call sessions)
+
+    Args:
+        provider: Callable returning an open aiohttp.ClientSession for the running loop
+    """
+    global _session_provider
+    _session_provider = provider
+
+
+@asynccontextmanager
+async def github_session():
+    """Yield the shared session if one is registered, else a short-lived session"""
+    if _session_provider is not None:
+        yield _session_provider()
+        return
+
+    async with aiohttp.ClientSession() as session:
+        yield session
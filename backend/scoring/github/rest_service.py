@@ -358,6 +358,8 @@ import base64
 import logging
 
 from ..config import get_config
+from .http_cache import get_http_cache
+from .http_session import github_session
 from ..utils import get_logger
 
 
@@ -368,18 +370,29 @@ class GitHubRESTService:
     Performance target: <1.5 seconds per repository
     """
     
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    # The compare API lists at most 300 changed files
+    COMPARE_FILE_LIMIT = 300
+    
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        http_cache: Optional[Any] = None
+    ):
         """
         Initialize REST service
         
         Args:
             logger: Optional logger instance
+            http_cache: Optional conditional-request cache used to revalidate
+                GETs with ETags; defaults to the one the app registered
+                (see http_cache.set_http_cache)
         """
         self.config = get_config()
         self.logger = logger or get_logger(__name__)
         self.base_url = self.config.GITHUB_REST_ENDPOINT
         self.code_extensions = self.config.CODE_EXTENSIONS
         self.max_files = self.config.MAX_FILES_PER_REPO
+        self.http_cache = http_cache if http_cache is not None else get_http_cache()
     
     async def get_repository_contents(
         self,
@@ -408,11 +421,8 @@ class GitHubRESTService:
         self.logger.info(f"Fetching contents for {owner}/{repo}")
         
         try:
-            # Step 1: Get file tree
-            file_tree = await self._get_file_tree(owner, repo, token)
-            
-            # Step 2: Filter code files
-            code_files = self._filter_code_files(file_tree)
+            # Steps 1-2: Get file tree and filter code files
+            code_files = await self.list_code_files(owner, repo, token)
             
             # Step 3: Limit to max files
             if len(code_files) > self.max_files:
@@ -436,6 +446,131 @@ class GitHubRESTService:
             self.logger.error(f"Failed to fetch repository contents: {e}")
             raise RuntimeError(f"REST API failed: {e}")
     
+    async def list_code_files(
+        self,
+        owner: str,
+        repo: str,
+        token: str
+    ) -> List[Dict[str, Any]]:
+        """
+        List the code files of a repository without downloading them
+        
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            token: GitHub OAuth token
+            
+        Returns:
+            Code file entries (path, sha, size in bytes, url), smallest first
+        """
+        file_tree = await self._get_file_tree(owner, repo, token)
+        return self._filter_code_files(file_tree)
+    
+    async def download_file(
+        self,
+        owner: str,
+        repo: str,
+        file: Dict[str, Any],
+        token: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Download one file listed by list_code_files
+        
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            file: File entry from list_code_files
+            token: GitHub OAuth token
+            
+        Returns:
+            File with path, content, size and language, or None if it could
+            not be downloaded or decoded
+        """
+        return await self._download_single_file(owner, repo, file, token)
+    
+    async def get_head_commit(
+        self,
+        owner: str,
+        repo: str,
+        token: str
+    ) -> str:
+        """
+        Get the commit SHA at the tip of the default branch
+        
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            token: GitHub OAuth token
+            
+        Returns:
+            Commit SHA
+        """
+        headers = {
+            'Authorization': f'Bearer {token}',
+            'Accept': 'application/vnd.github.v3+json'
+        }
+        repo_data = await self._request_with_retry(
+            f"{self.base_url}/repos/{owner}/{repo}", headers
+        )
+        default_branch = repo_data.get('default_branch', 'main')
+        branch_data = await self._request_with_retry(
+            f"{self.base_url}/repos/{owner}/{repo}/branches/{default_branch}", headers
+        )
+        return branch_data['commit']['sha']
+    
+    async def compare_commits(
+        self,
+        owner: str,
+        repo: str,
+        base: str,
+        head: str,
+        token: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        List the code files changed between two commits (compare API)
+        
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            base: Commit SHA of the previous analysis
+            head: Current commit SHA
+            token: GitHub OAuth token
+            
+        Returns:
+            Dictionary with 'changed' (added/modified code file entries, as
+            from list_code_files but without sizes) and 'removed' (paths), or
+            None when the diff cannot be applied incrementally: history was
+            rewritten (base no longer an ancestor of head) or the change list
+            was truncated
+        """
+        headers = {
+            'Authorization': f'Bearer {token}',
+            'Accept': 'application/vnd.github.v3+json'
+        }
+        data = await self._request_with_retry(
+            f"{self.base_url}/repos/{owner}/{repo}/compare/{base}...{head}", headers
+        )
+        
+        if data.get('status') not in ('ahead', 'identical'):
+            return None
+        files = data.get('files') or []
+        if len(files) >= self.COMPARE_FILE_LIMIT:
+            return None
+        
+        changed, removed = [], []
+        for entry in files:
+            path = entry.get('filename', '')
+            status = entry.get('status')
+            
+            if status == 'renamed' and entry.get('previous_filename'):
+                removed.append(entry['previous_filename'])
+            if status == 'removed':
+                removed.append(path)
+            elif status != 'unchanged' and self._is_code_file(path):
+                changed.append({'path': path, 'sha': entry.get('sha'), 'size': 0, 'url': None})
+        
+        return {'changed': changed, 'removed': removed}
+    
     async def _get_file_tree(
         self,
         owner: str,
@@ -493,15 +628,27 @@ class GitHubRESTService:
         """
         last_error = None
         
+        cache_key, cached = None, None
+        if self.http_cache:
+            token = headers.get('Authorization', '').split(' ')[-1]
+            cache_key, cached = await self.http_cache.lookup(url, None, token)
+            if cached and cached.is_fresh():
+                return self.http_cache.serve_fresh(cached)
+            if cached:
+                headers = {**headers, **cached.conditional_headers()}
+        
         for attempt in range(max_retries):
             try:
-                async with aiohttp.ClientSession() as session:
+                async with github_session() as session:
                     async with session.get(
                         url,
                         headers=headers,
                         timeout=aiohttp.ClientTimeout(total=10)
                     ) as response:
                         
+                        if response.status == 304 and cached:
+                            return await self.http_cache.revalidated(cache_key, cached, response.headers)
+                        
                         # Handle rate limiting
                         if response.status == 429:
                             retry_after = int(response.headers.get('Retry-After', 60))
@@ -519,7 +666,10 @@ class GitHubRESTService:
                                 f"Request failed with status {response.status}: {error_text}"
                             )
                         
-                        return await response.json()
+                        data = await response.json()
+                        if cache_key:
+                            await self.http_cache.store(cache_key, url, response.headers, data)
+                        return data
                         
             except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 last_error = e
@@ -559,12 +709,8 @@ class GitHubRESTService:
             
             path = entry.get('path', '')
             
-            # Check if it's a code file
-            if any(path.endswith(ext) for ext in self.code_extensions):
-                # Skip test files and vendor directories
-                if self._should_skip_file(path):
-                    continue
-                
+            # Code files only, without test files and vendor directories
+            if self._is_code_file(path):
                 code_files.append({
                     'path': path,
                     'sha': entry.get('sha'),
@@ -577,6 +723,20 @@ class GitHubRESTService:
         
         return code_files
     
+    def _is_code_file(self, path: str) -> bool:
+        """
+        Check if a path is a code file worth analyzing
+        
+        Args:
+            path: File path
+            
+        Returns:
+            True for code extensions outside skipped directories
+        """
+        if not any(path.endswith(ext) for ext in self.code_extensions):
+            return False
+        return not self._should_skip_file(path)
+    
     def _should_skip_file(self, path: str) -> bool:
         """
         Check if file should be skipped
@@ -666,7 +826,7 @@ class GitHubRESTService:
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with github_session() as session:
                 async with session.get(
                     url,
                     headers=headers,
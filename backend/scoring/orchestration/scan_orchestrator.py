@@ -1,6 +1,6 @@
 """
 Stage 1 Quick Scan Orchestrator
-Orchestrates OAuth to GraphQL query flow with parallel importance calculation
+Orchestrates OAuth to GraphQL query flow with batched importance calculation
 Target: <1 second total execution time
 """
 
@@ -22,8 +22,10 @@ class ScanOrchestrator:
     Orchestrates Stage 1 quick scan workflow
     
     Workflow:
+    0. Probe the account fingerprint; if it matches the stored scan, return
+       the stored results (one small GraphQL query, no writes)
     1. Fetch user + repositories via GraphQL (0.5s)
-    2. Calculate importance scores in parallel (0.25s)
+    2. Calculate importance scores in one vectorized batch
     3. Categorize repositories (instant)
     4. Return results for database storage (0.2s)
     
@@ -89,13 +91,20 @@ class ScanOrchestrator:
         start_time = datetime.utcnow()
         
         try:
+            # Step 0: Skip the scan when nothing changed since the stored one
+            fingerprint, stored_result = None, None
+            if store_results and self.storage_service:
+                fingerprint, stored_result = await self._check_unchanged(username, token, user_id, start_time)
+            if stored_result is not None:
+                return stored_result
+            
             # Step 1: Fetch user and repositories via GraphQL (target: 0.5s)
             self.logger.info("Step 1: Fetching user and repositories...")
             user_data, repos_data = await self.graphql_service.get_user_and_repositories(
                 username, token
             )
             
-            # Step 2: Calculate importance scores in parallel (target: 0.25s)
+            # Step 2: Calculate importance scores in one batch (target: 0.25s)
             self.logger.info(f"Step 2: Calculating importance for {len(repos_data)} repositories...")
             repos_with_scores = await self._calculate_importance_parallel(repos_data)
             
@@ -111,7 +120,7 @@ class ScanOrchestrator:
             if store_results and self.storage_service:
                 self.logger.info("Step 4: Storing results in database...")
                 storage_result = await self.storage_service.store_scan_results(
-                    user_id, user_data, categorized_repos
+                    user_id, user_data, categorized_repos, fingerprint
                 )
             
             # Calculate total execution time
@@ -146,74 +155,228 @@ class ScanOrchestrator:
             self.logger.error(f"Quick scan failed: {e}")
             raise RuntimeError(f"Failed to execute quick scan: {e}")
     
-    async def _calculate_importance_parallel(
+    async def execute_quick_scan_streaming(
         self,
-        repositories: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+        username: str,
+        token: str,
+        user_id: Optional[str] = None,
+        store_results: bool = True,
+        progress_emitter: Optional[Any] = None
+    ) -> Dict[str, Any]:
         """
-        Calculate importance scores for all repositories in parallel
+        Execute Stage 1 quick scan over streamed repository pages
+        
+        Each GraphQL page is scored, categorized and written to the
+        database while the next page is being fetched. When a progress
+        emitter (ScanProgressEmitter) is given, every scored page is pushed
+        to the UI as a partial result.
         
         Args:
-            repositories: List of repository data
+            username: GitHub username
+            token: GitHub OAuth token
+            user_id: User ID for database storage (required if store_results=True)
+            store_results: Whether to store results in database
+            progress_emitter: Optional ScanProgressEmitter for partial results
             
         Returns:
-            List of repositories with importance scores added
+            Same structure as execute_quick_scan(), plus:
+                - pages: Number of pages fetched
+                - time_to_first_result: Seconds until the first page was scored
+                
+        Raises:
+            ValueError: If username or token is invalid
+            RuntimeError: If scan fails
         """
-        if not repositories:
-            return []
+        if not username or not token:
+            raise ValueError("Username and token are required")
         
-        # Create tasks for parallel execution
-        tasks = [
-            self._calculate_single_importance(repo)
-            for repo in repositories
-        ]
+        if store_results and not user_id:
+            raise ValueError("user_id is required when store_results=True")
         
-        # Execute all tasks in parallel
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        store = store_results and self.storage_service is not None
         
-        # Filter out any errors and log them
-        repos_with_scores = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                self.logger.error(
-                    f"Failed to calculate importance for repository "
-                    f"{repositories[i].get('name', 'unknown')}: {result}"
-                )
-                # Add repository with default score
-                repo = repositories[i].copy()
-                repo['importance_score'] = 0.0
-                repos_with_scores.append(repo)
-            else:
-                repos_with_scores.append(result)
+        self.logger.info(f"Starting streaming quick scan for user: {username}")
+        start_time = datetime.utcnow()
         
-        return repos_with_scores
+        user_data: Dict[str, Any] = {}
+        categorized_repos: List[Dict[str, Any]] = []
+        storage_tasks: List[asyncio.Task] = []
+        time_to_first_result = None
+        pages = 0
+        
+        try:
+            fingerprint, stored_result = None, None
+            if store:
+                fingerprint, stored_result = await self._check_unchanged(username, token, user_id, start_time)
+            if stored_result is not None:
+                if progress_emitter:
+                    await progress_emitter.emit_partial_results(
+                        repositories=stored_result['repositories'],
+                        fetched=len(stored_result['repositories']),
+                        total=len(stored_result['repositories']),
+                        summary=stored_result['summary']
+                    )
+                return {**stored_result, 'pages': 0, 'time_to_first_result': stored_result['scan_time']}
+            
+            async for user_data, repos_page, total in self.graphql_service.iter_repository_pages(
+                username, token
+            ):
+                pages += 1
+                
+                scored_page = await self._calculate_importance_parallel(repos_page)
+                categorized_page = self._categorize_repositories(scored_page)
+                categorized_repos.extend(categorized_page)
+                
+                if time_to_first_result is None:
+                    time_to_first_result = (datetime.utcnow() - start_time).total_seconds()
+                    self.logger.info(
+                        f"First {len(categorized_page)} repositories scored in "
+                        f"{time_to_first_result:.2f}s"
+                    )
+                
+                # Bulk write runs in the background while the next page is fetched
+                if store and categorized_page:
+                    storage_tasks.append(asyncio.ensure_future(
+                        self.storage_service.store_repository_page(user_id, categorized_page)
+                    ))
+                
+                if progress_emitter:
+                    await progress_emitter.emit_partial_results(
+                        repositories=categorized_page,
+                        fetched=len(categorized_repos),
+                        total=total,
+                        summary=self._generate_summary(categorized_repos)
+                    )
+            
+            summary = self._generate_summary(categorized_repos)
+            
+            storage_result = None
+            if store:
+                storage_start = datetime.utcnow()
+                stored_counts = await asyncio.gather(*storage_tasks)
+                user_result = await self.storage_service.store_user_profile(
+                    user_id, user_data, categorized_repos, fingerprint
+                )
+                storage_result = {
+                    'user_stored': user_result,
+                    'repositories_stored': sum(stored_counts),
+                    'storage_time': round((datetime.utcnow() - storage_start).total_seconds(), 2)
+                }
+            
+            scan_time = (datetime.utcnow() - start_time).total_seconds()
+            
+            self.logger.info(
+                f"Streaming quick scan completed in {scan_time:.2f}s over {pages} page(s) "
+                f"({summary['flagship']} flagship, {summary['significant']} significant, "
+                f"{summary['supporting']} supporting)"
+            )
+            
+            if scan_time > self.config.STAGE1_TARGET_SECONDS:
+                self.logger.warning(
+                    f"Scan time {scan_time:.2f}s exceeded target "
+                    f"{self.config.STAGE1_TARGET_SECONDS}s"
+                )
+            
+            result = {
+                'user': user_data,
+                'repositories': categorized_repos,
+                'summary': summary,
+                'scan_time': round(scan_time, 2),
+                'pages': pages,
+                'time_to_first_result': round(time_to_first_result or scan_time, 2)
+            }
+            
+            if storage_result:
+                result['storage_result'] = storage_result
+            
+            return result
+            
+        except Exception as e:
+            for task in storage_tasks:
+                task.cancel()
+            self.logger.error(f"Streaming quick scan failed: {e}")
+            raise RuntimeError(f"Failed to execute quick scan: {e}")
     
-    async def _calculate_single_importance(
+    async def _check_unchanged(
         self,
-        repo: Dict[str, Any]
-    ) -> Dict[str, Any]:
+        username: str,
+        token: str,
+        user_id: str,
+        start_time: datetime
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
         """
-        Calculate importance score for a single repository
+        Compare the account fingerprint with the one stored with the last scan
         
         Args:
-            repo: Repository data
+            username: GitHub username
+            token: GitHub OAuth token
+            user_id: User ID the scan is stored under
+            start_time: Scan start time
             
         Returns:
-            Repository data with importance_score added
+            Tuple of (current fingerprint or None if the probe failed,
+            stored scan result if the account is unchanged, else None)
         """
-        # Run in executor to avoid blocking
-        loop = asyncio.get_event_loop()
-        importance_score = await loop.run_in_executor(
-            None,
-            self.importance_scorer.calculate_score,
-            repo
+        try:
+            fingerprint = await self.graphql_service.get_scan_fingerprint(username, token)
+        except Exception as e:
+            # The full scan reports real failures; the probe is only an optimization
+            self.logger.warning(f"Fingerprint probe failed, running full scan: {e}")
+            return None, None
+        
+        if fingerprint != await self.storage_service.get_scan_fingerprint(user_id):
+            return fingerprint, None
+        
+        stored = await self.storage_service.get_stored_scan(user_id)
+        if not stored or not stored[1]:
+            return fingerprint, None
+        
+        user_data, repositories = stored
+        scan_time = (datetime.utcnow() - start_time).total_seconds()
+        self.logger.info(
+            f"Quick scan skipped for {username}: unchanged since last scan "
+            f"({len(repositories)} repositories, {scan_time:.2f}s)"
         )
         
-        # Add score to repository data
-        repo_with_score = repo.copy()
-        repo_with_score['importance_score'] = importance_score
+        return fingerprint, {
+            'user': user_data,
+            'repositories': repositories,
+            'summary': self._generate_summary(repositories),
+            'scan_time': round(scan_time, 2),
+            'unchanged': True,
+            'storage_result': {
+                'user_stored': user_id,
+                'repositories_stored': 0,
+                'storage_time': 0.0
+            }
+        }
+    
+    async def _calculate_importance_parallel(
+        self,
+        repositories: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Calculate importance scores for all repositories in one batch
+
+        Scoring is pure CPU work on metadata, so all repositories are scored
+        in a single vectorized pass instead of one task per repository.
+        Repositories with invalid data get a score of 0.0.
+
+        Args:
+            repositories: List of repository data
+            
+        Returns:
+            List of repositories with importance scores added
+        """
+        if not repositories:
+            return []
         
-        return repo_with_score
+        scores = self.importance_scorer.calculate_scores_batch(repositories)
+        
+        return [
+            {**repo, 'importance_score': score}
+            for repo, score in zip(repositories, scores)
+        ]
     
     def _categorize_repositories(
         self,
@@ -228,17 +391,14 @@ class ScanOrchestrator:
         Returns:
             List of repositories with category added
         """
-        categorized = []
-        
-        for repo in repositories:
-            importance_score = repo.get('importance_score', 0.0)
-            category = self.importance_scorer.categorize(importance_score)
-            
-            repo_categorized = repo.copy()
-            repo_categorized['category'] = category
-            categorized.append(repo_categorized)
+        categories = self.importance_scorer.categorize_batch(
+            [repo.get('importance_score', 0.0) for repo in repositories]
+        )
         
-        return categorized
+        return [
+            {**repo, 'category': category}
+            for repo, category in zip(repositories, categories)
+        ]
     
     def _generate_summary(
         self,
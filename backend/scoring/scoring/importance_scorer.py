@@ -4,14 +4,35 @@ Calculates repository importance without code analysis
 Target: <0.01 seconds per repository
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import logging
-from datetime import datetime, timedelta
+import math
+import time
+from datetime import datetime, timedelta, timezone
 
 from ..base import BaseScorer
 from ..config import get_config
 from ..utils import get_logger, clamp, safe_divide
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+SECONDS_PER_DAY = 86400
+UNIX_EPOCH = datetime(1970, 1, 1)
+
+# Size buckets in KB (lower bound, score), highest first
+SIZE_SCORE_BUCKETS = [
+    (10000, 100.0),
+    (5000, 90.0),
+    (1000, 80.0),
+    (500, 70.0),
+    (100, 60.0),
+]
+
 
 class ImportanceScorer(BaseScorer):
     """
@@ -82,6 +103,160 @@ class ImportanceScorer(BaseScorer):
         
         return round(importance_score, 1)
     
+    def calculate_scores_batch(self, repositories: List[Dict[str, Any]]) -> List[float]:
+        """
+        Calculate importance scores for many repositories in one pass
+
+        Metadata is gathered into columnar arrays (stars, forks, watchers,
+        size, age in days, quality points) and all four sub-scores are
+        computed with NumPy, giving the same result as calling
+        calculate_score() per repository. Falls back to the per-repository
+        path when NumPy is not installed.
+
+        Invalid repositories are logged and scored 0.0 instead of raising.
+
+        Args:
+            repositories: List of repository data dictionaries
+
+        Returns:
+            Importance scores (0-100) in input order
+        """
+        if not repositories:
+            return []
+
+        if not NUMPY_AVAILABLE:
+            return [self._calculate_score_or_default(repo) for repo in repositories]
+
+        count = len(repositories)
+        valid_index = []
+        valid_repos = []
+        for i, repo in enumerate(repositories):
+            if self.validate_input(repo):
+                valid_index.append(i)
+                valid_repos.append(repo)
+            else:
+                self.logger.error(
+                    f"Failed to calculate importance for repository "
+                    f"{repo.get('name', 'unknown') if isinstance(repo, dict) else 'unknown'}: "
+                    f"Invalid repository data"
+                )
+
+        scores = np.zeros(count, dtype=np.float64)
+        if valid_repos:
+            # Gather columns with list comprehensions; per-element ndarray writes are slower
+            stars = np.array([r.get('stars', 0) or 0 for r in valid_repos], dtype=np.float64)
+            forks = np.array([r.get('forks', 0) or 0 for r in valid_repos], dtype=np.float64)
+            watchers = np.array([r.get('watchers', 0) or 0 for r in valid_repos], dtype=np.float64)
+            size = np.array([r.get('size', 0) or 0 for r in valid_repos], dtype=np.float64)
+            updated_ts = np.array(
+                [self._to_timestamp(r.get('updated_at')) for r in valid_repos], dtype=np.float64
+            )
+
+            community = self._community_scores(stars, forks, watchers)
+            activity = self._activity_scores(updated_ts, time.time())
+            size_scores = self._size_scores(size)
+            quality = self._quality_scores(valid_repos)
+
+            valid_scores = (
+                community * self.community_weight +
+                activity * self.activity_weight +
+                size_scores * self.size_weight +
+                quality * self.quality_weight
+            )
+            scores[valid_index] = np.clip(valid_scores, 0.0, 100.0)
+
+        self.logger.debug(f"Calculated {count} importance scores in batch")
+
+        # Python round() keeps results identical to calculate_score()
+        return [round(score, 1) for score in scores.tolist()]
+
+    def _calculate_score_or_default(self, repo: Dict[str, Any]) -> float:
+        """Scalar fallback for calculate_scores_batch()"""
+        try:
+            return self.calculate_score(repo)
+        except ValueError as e:
+            self.logger.error(
+                f"Failed to calculate importance for repository "
+                f"{repo.get('name', 'unknown') if isinstance(repo, dict) else 'unknown'}: {e}"
+            )
+            return 0.0
+
+    @staticmethod
+    def _to_timestamp(updated_at: Any) -> float:
+        """
+        Convert updated_at to a POSIX timestamp
+
+        Naive datetimes are treated as UTC, as in _calculate_activity_score().
+
+        Returns:
+            Timestamp, or NaN for missing/unparseable values
+        """
+        if not updated_at:
+            return math.nan
+
+        if isinstance(updated_at, str):
+            try:
+                updated_at = datetime.fromisoformat(updated_at.replace('Z', '+00:00'))
+            except Exception:
+                return math.nan
+
+        if not isinstance(updated_at, datetime):
+            return math.nan
+
+        if updated_at.tzinfo is None:
+            return (updated_at - UNIX_EPOCH).total_seconds()
+
+        return updated_at.timestamp()
+
+    @staticmethod
+    def _community_scores(stars: "np.ndarray", forks: "np.ndarray", watchers: "np.ndarray") -> "np.ndarray":
+        """Vectorized _calculate_community_score()"""
+        raw = np.maximum((stars * 2) + (forks * 5) + (watchers * 1), 0.0)
+        normalized = np.minimum(100.0, (np.log10(raw + 1) / math.log10(101)) * 100)
+        return np.where(raw == 0, 0.0, np.clip(normalized, 0.0, 100.0))
+
+    @staticmethod
+    def _activity_scores(updated_ts: "np.ndarray", now_ts: float) -> "np.ndarray":
+        """Vectorized _calculate_activity_score(); NaN timestamps score 50"""
+        missing = np.isnan(updated_ts)
+        days_old = np.floor((now_ts - np.where(missing, now_ts, updated_ts)) / SECONDS_PER_DAY)
+
+        decayed = np.clip(60 - (days_old / 365 - 1) * 10, 0.0, 100.0)
+        scores = np.select(
+            [days_old < 30, days_old < 90, days_old < 180, days_old < 365],
+            [100.0, 90.0, 75.0, 60.0],
+            default=decayed
+        )
+        return np.where(missing, 50.0, scores)
+
+    @staticmethod
+    def _quality_scores(repositories: List[Dict[str, Any]]) -> "np.ndarray":
+        """Vectorized _calculate_quality_score()"""
+        has_readme = np.array([bool(r.get('has_readme')) for r in repositories])
+        has_license = np.array([bool(r.get('license') or r.get('has_license_file')) for r in repositories])
+        has_description = np.array([
+            bool(r.get('description')) and len(r['description'].strip()) > 10
+            for r in repositories
+        ])
+        topic_count = np.array([len(r.get('topics') or ()) for r in repositories], dtype=np.float64)
+
+        score = (
+            has_readme * 25.0 +
+            has_license * 25.0 +
+            has_description * 25.0 +
+            np.minimum(25.0, topic_count * 5)
+        )
+        return np.clip(score, 0.0, 100.0)
+
+    @staticmethod
+    def _size_scores(size: "np.ndarray") -> "np.ndarray":
+        """Vectorized _calculate_size_score()"""
+        return np.select(
+            [size >= threshold for threshold, _ in SIZE_SCORE_BUCKETS],
+            [score for _, score in SIZE_SCORE_BUCKETS],
+            default=50.0
+        )
+
     def validate_input(self, data: Dict[str, Any]) -> bool:
         """
         Validate repository data
@@ -148,7 +323,6 @@ class ImportanceScorer(BaseScorer):
             return 0.0
         
         # Logarithmic scaling
-        import math
         normalized = min(100, (math.log10(raw_score + 1) / math.log10(101)) * 100)
         
         return clamp(normalized, 0.0, 100.0)
@@ -178,7 +352,6 @@ class ImportanceScorer(BaseScorer):
         # Calculate days since last update
         now = datetime.utcnow()
         if updated_at.tzinfo:
-            from datetime import timezone
             now = datetime.now(timezone.utc)
         
         days_old = (now - updated_at).days
@@ -280,6 +453,27 @@ class ImportanceScorer(BaseScorer):
         else:
             return 'supporting'
     
+    def categorize_batch(self, importance_scores: List[float]) -> List[str]:
+        """
+        Categorize many importance scores at once
+
+        Args:
+            importance_scores: Importance scores (0-100)
+
+        Returns:
+            Categories in input order
+        """
+        if not NUMPY_AVAILABLE:
+            return [self.categorize(score) for score in importance_scores]
+
+        scores = np.asarray(importance_scores, dtype=np.float64)
+        categories = np.select(
+            [scores >= self.config.FLAGSHIP_THRESHOLD, scores >= self.config.SIGNIFICANT_THRESHOLD],
+            ['flagship', 'significant'],
+            default='supporting'
+        )
+        return categories.tolist()
+
     def get_category_description(self, category: str) -> str:
         """
         Get description for a category
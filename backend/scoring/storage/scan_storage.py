@@ -5,10 +5,11 @@ Target: <0.2 seconds for parallel writes
 """
 
 import asyncio
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime, timezone
 import logging
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
 
 from ..config import get_config
 from ..utils import get_logger
@@ -46,7 +47,8 @@ class ScanStorageService:
         self,
         user_id: str,
         user_data: Dict[str, Any],
-        repositories: List[Dict[str, Any]]
+        repositories: List[Dict[str, Any]],
+        fingerprint: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Store complete scan results in parallel
@@ -55,6 +57,7 @@ class ScanStorageService:
             user_id: User ID from auth system
             user_data: User profile data
             repositories: List of repositories with importance scores
+            fingerprint: Scan fingerprint the results were computed for
             
         Returns:
             Dictionary with storage results
@@ -71,7 +74,7 @@ class ScanStorageService:
         try:
             # Execute storage operations in parallel
             user_result, repos_result = await asyncio.gather(
-                self._store_user_profile(user_id, user_data, repositories),
+                self._store_user_profile(user_id, user_data, repositories, fingerprint),
                 self._store_repositories(user_id, repositories),
                 return_exceptions=True
             )
@@ -107,11 +110,99 @@ class ScanStorageService:
             self.logger.error(f"Failed to store scan results: {e}")
             raise RuntimeError(f"Storage failed: {e}")
     
+    async def store_repository_page(
+        self,
+        user_id: str,
+        repositories: List[Dict[str, Any]]
+    ) -> int:
+        """
+        Store one page of scored repositories (streaming quick scan)
+        
+        Args:
+            user_id: User ID
+            repositories: Page of repositories with importance scores and categories
+            
+        Returns:
+            Number of repositories stored
+        """
+        return await self._store_repositories(user_id, repositories)
+    
+    async def store_user_profile(
+        self,
+        user_id: str,
+        user_data: Dict[str, Any],
+        repositories: List[Dict[str, Any]],
+        fingerprint: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Store the user profile once all repository pages are categorized
+        
+        Args:
+            user_id: User ID
+            user_data: User profile data
+            repositories: All categorized repositories (for counts)
+            fingerprint: Scan fingerprint the results were computed for
+            
+        Returns:
+            User profile ID
+        """
+        return await self._store_user_profile(user_id, user_data, repositories, fingerprint)
+    
+    async def get_scan_fingerprint(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Fingerprint stored with the user's last quick scan
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            Fingerprint dictionary, or None if the user was never scanned
+        """
+        profile = await self.db.user_profiles.find_one(
+            {'user_id': user_id},
+            {'scan_fingerprint': 1}
+        )
+        return (profile or {}).get('scan_fingerprint')
+    
+    async def get_stored_scan(
+        self,
+        user_id: str
+    ) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Results of the user's last quick scan, as returned by the scan
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            Tuple of (user_data, repositories), or None if nothing is stored
+        """
+        profile = await self.db.user_profiles.find_one({'user_id': user_id})
+        if not profile:
+            return None
+        
+        repositories = await self.get_user_repositories(user_id)
+        for repo in repositories:
+            repo.pop('_id', None)
+        
+        user_data = {
+            'username': profile.get('github_username'),
+            **{
+                field: profile.get(field)
+                for field in (
+                    'name', 'bio', 'avatar_url', 'email', 'location',
+                    'company', 'website', 'twitter', 'followers', 'following'
+                )
+            }
+        }
+        return user_data, repositories
+    
     async def _store_user_profile(
         self,
         user_id: str,
         user_data: Dict[str, Any],
-        repositories: List[Dict[str, Any]]
+        repositories: List[Dict[str, Any]],
+        fingerprint: Optional[Dict[str, Any]] = None
     ) -> str:
         """
         Store or update user profile
@@ -120,6 +211,7 @@ class ScanStorageService:
             user_id: User ID
             user_data: User profile data
             repositories: List of repositories (for counts)
+            fingerprint: Scan fingerprint the results were computed for
             
         Returns:
             User profile ID
@@ -157,6 +249,8 @@ class ScanStorageService:
             'supporting_count': supporting_count,
             'updated_at': datetime.utcnow()
         }
+        if fingerprint:
+            profile_doc['scan_fingerprint'] = fingerprint
         
         # Upsert user profile
         result = await self.db.user_profiles.update_one(
@@ -180,78 +274,72 @@ class ScanStorageService:
         """
         Store repositories with importance scores
         
-        Uses bulk operations for performance
+        Uses bulk operations for performance. Existing documents are compared
+        with the scan first and only the fields that changed are written, so
+        rescanning an unchanged account issues no writes at all. A new push
+        marks the repository for re-analysis.
         
         Args:
             user_id: User ID
             repositories: List of repositories with importance scores
             
         Returns:
-            Number of repositories stored
+            Number of repositories stored (inserted or changed)
         """
         if not repositories:
             return 0
         
+        docs = [self._repository_document(user_id, repo) for repo in repositories]
+        
+        cursor = self.db.repositories.find(
+            {'user_id': user_id, 'github_id': {'$in': [doc['github_id'] for doc in docs]}},
+            {field: 1 for field in docs[0]}
+        )
+        existing = {doc['github_id']: doc for doc in await cursor.to_list(length=None)}
+        
         # Prepare bulk operations
         operations = []
+        now = datetime.utcnow()
         
-        for repo in repositories:
-            # Prepare repository document
-            repo_doc = {
-                'user_id': user_id,
-                'github_id': repo.get('github_id', repo.get('id')),
-                'name': repo.get('name'),
-                'full_name': repo.get('full_name'),
-                'description': repo.get('description'),
-                'url': repo.get('url'),
-                'homepage': repo.get('homepage'),
-                'stars': repo.get('stars', 0),
-                'forks': repo.get('forks', 0),
-                'watchers': repo.get('watchers', 0),
-                'size': repo.get('size', 0),
-                'language': repo.get('language'),
-                'languages': repo.get('languages', {}),
-                'topics': repo.get('topics', []),
-                'created_at': repo.get('created_at'),
-                'updated_at': repo.get('updated_at'),
-                'pushed_at': repo.get('pushed_at'),
-                'has_issues': repo.get('has_issues', False),
-                'has_wiki': repo.get('has_wiki', False),
-                'license': repo.get('license'),
-                'commit_count': repo.get('commit_count', 0),
-                'open_issues': repo.get('open_issues', 0),
-                'open_prs': repo.get('open_prs', 0),
-                'is_fork': repo.get('is_fork', False),
-                'is_private': repo.get('is_private', False),
-                'has_readme': repo.get('has_readme', False),
-                'has_license_file': repo.get('has_license_file', False),
-                'has_tests': repo.get('has_tests', False),
-                'has_ci_cd': repo.get('has_ci_cd', False),
-                # Importance scoring fields
-                'importance_score': repo.get('importance_score', 0.0),
-                'category': repo.get('category', 'supporting'),
-                # Analysis status
-                'analyzed': False,
-                'analyzed_at': None,
-                # Metadata
-                'updated_at': datetime.utcnow()
-            }
+        for repo_doc in docs:
+            stored = existing.get(repo_doc['github_id'])
             
-            # Create update operation
-            from pymongo import UpdateOne
-            operations.append(
-                UpdateOne(
-                    {
-                        'user_id': user_id,
-                        'github_id': repo_doc['github_id']
-                    },
-                    {
-                        '$set': repo_doc,
-                        '$setOnInsert': {'created_at': datetime.utcnow()}
-                    },
-                    upsert=True
+            if stored is None:
+                operations.append(
+                    UpdateOne(
+                        {
+                            'user_id': user_id,
+                            'github_id': repo_doc['github_id']
+                        },
+                        {
+                            '$set': {**repo_doc, 'updated_at': now},
+                            '$setOnInsert': {
+                                'created_at': now,
+                                'analyzed': False,
+                                'analyzed_at': None
+                            }
+                        },
+                        upsert=True
+                    )
                 )
-            )
+                continue
+            
+            changed = {
+                field: value for field, value in repo_doc.items()
+                if _comparable(stored.get(field)) != _comparable(value)
+            }
+            if not changed:
+                continue
+            
+            if 'pushed_at' in changed:
+                # New code: the stored deep analysis is out of date
+                changed.update({'analyzed': False, 'analyzed_at': None})
+            changed['updated_at'] = now
+            operations.append(UpdateOne({'_id': stored['_id']}, {'$set': changed}))
+        
+        if not operations:
+            self.logger.info(f"All {len(docs)} repositories unchanged, nothing to store")
+            return 0
         
         # Execute bulk write
         result = await self.db.repositories.bulk_write(operations, ordered=False)
@@ -261,11 +349,61 @@ class ScanStorageService:
         
         self.logger.info(
             f"Stored {total_stored} repositories "
-            f"({result.upserted_count} new, {result.modified_count} updated)"
+            f"({result.upserted_count} new, {result.modified_count} updated, "
+            f"{len(docs) - len(operations)} unchanged)"
         )
         
         return total_stored
     
+    def _repository_document(
+        self,
+        user_id: str,
+        repo: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Repository fields written by a quick scan
+        
+        Args:
+            user_id: User ID
+            repo: Repository with importance score and category
+            
+        Returns:
+            Repository document (without bookkeeping timestamps)
+        """
+        return {
+            'user_id': user_id,
+            'github_id': repo.get('github_id', repo.get('id')),
+            'name': repo.get('name'),
+            'full_name': repo.get('full_name'),
+            'description': repo.get('description'),
+            'url': repo.get('url'),
+            'homepage': repo.get('homepage'),
+            'stars': repo.get('stars', 0),
+            'forks': repo.get('forks', 0),
+            'watchers': repo.get('watchers', 0),
+            'size': repo.get('size', 0),
+            'language': repo.get('language'),
+            'languages': repo.get('languages', {}),
+            'topics': repo.get('topics', []),
+            'created_at': repo.get('created_at'),
+            'pushed_at': repo.get('pushed_at'),
+            'has_issues': repo.get('has_issues', False),
+            'has_wiki': repo.get('has_wiki', False),
+            'license': repo.get('license'),
+            'commit_count': repo.get('commit_count', 0),
+            'open_issues': repo.get('open_issues', 0),
+            'open_prs': repo.get('open_prs', 0),
+            'is_fork': repo.get('is_fork', False),
+            'is_private': repo.get('is_private', False),
+            'has_readme': repo.get('has_readme', False),
+            'has_license_file': repo.get('has_license_file', False),
+            'has_tests': repo.get('has_tests', False),
+            'has_ci_cd': repo.get('has_ci_cd', False),
+            # Importance scoring fields
+            'importance_score': repo.get('importance_score', 0.0),
+            'category': repo.get('category', 'supporting')
+        }
+    
     async def get_user_repositories(
         self,
         user_id: str,
@@ -385,3 +523,16 @@ class ScanStorageService:
             'significant': significant,
             'supporting': supporting
         }
+
+
+def _comparable(value: Any) -> Any:
+    """
+    Normalize a value the way MongoDB stores it, for change detection
+    
+    Datetimes come back naive (UTC) and truncated to milliseconds.
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.replace(microsecond=value.microsecond // 1000 * 1000)
+    return value
@@ -0,0 +1,19 @@
+"""
+Shared test configuration
+
+The application imports the scoring package as ``backend.scoring`` (see
+app.services.scan_queue_manager), so tests use the same import root. pytest
+only puts the test directories on sys.path; the backend directory (for
+``app``) and the repository root (for ``backend``) are added here, after
+the existing entries, so no installed package or PYTHONPATH is needed.
+"""
+
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPOSITORY_ROOT = os.path.dirname(BACKEND_DIR)
+
+for path in (BACKEND_DIR, REPOSITORY_ROOT):
+    if path not in sys.path:
+        sys.path.append(path)
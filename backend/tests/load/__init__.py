@@ -0,0 +1,3 @@
+"""
+Offline load-testing tools: fake GitHub API server and load driver
+"""
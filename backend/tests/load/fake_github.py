@@ -0,0 +1,1098 @@
+"""
+Fake GitHub API Server
+Local aiohttp stand-in for api.github.com used to load-test the scan pipeline
+
+Serves the REST and GraphQL endpoints our scanners use from:
+- Recorded fixtures (e.g. scan_result.json) or cassettes recorded from the real API
+- Synthesized accounts (hundreds of repositories, thousands of files per tree)
+
+and injects configurable latency plus GitHub-style rate limiting
+(X-RateLimit-* headers, 403 primary and 429 secondary limits).
+
+Point the backend at it with GITHUB_API_URL=http://127.0.0.1:8787
+
+Usage:
+    python -m tests.load.fake_github --fixture ../scan_result.json \
+        --synthesize bigdev:500:5000 --latency-ms 40 --rate-limit 5000
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple
+
+from aiohttp import web, ClientSession
+
+# Fixed reference date so synthesized accounts are identical between runs
+REFERENCE_DATE = datetime(2025, 1, 1)
+
+SYNTHETIC_LANGUAGES = [
+    ('Python', 'py', '#3572A5'),
+    ('JavaScript', 'js', '#f1e05a'),
+    ('TypeScript', 'ts', '#3178c6'),
+    ('Java', 'java', '#b07219'),
+    ('Go', 'go', '#00ADD8'),
+]
+
+LANGUAGE_COLORS = {name: color for name, _, color in SYNTHETIC_LANGUAGES}
+
+# Paths the scanners are expected to skip; synthesized trees include them on purpose
+SYNTHETIC_DIRECTORIES = [
+    'src', 'src/api', 'src/core', 'src/utils', 'lib',
+    'tests', 'docs', 'node_modules/pkg', 'dist', 'vendor/lib'
+]
+
+
+@dataclass
+class FakeGitHubConfig:
+    """Behavior knobs for the fake server"""
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    rate_limit: int = 5000  # Requests per window per token (per resource)
+    rate_limit_window_seconds: int = 3600
+    rate_limit_status: int = 403  # Status once the primary limit is exhausted (403 or 429)
+    secondary_limit_ratio: float = 0.0  # Fraction of requests rejected with a secondary 429
+    retry_after_seconds: int = 1
+    cache_max_age: int = 60  # Cache-Control max-age sent with ETags (GitHub uses 60)
+    default_username: Optional[str] = None  # Login returned by /user
+    seed: int = 1234
+
+
+@dataclass
+class FakeAccount:
+    """A GitHub account served by the fake server"""
+    user: Dict[str, Any]
+    repositories: List[Dict[str, Any]]
+    tree_sizes: Dict[str, int] = field(default_factory=dict)
+
+
+class FakeGitHubState:
+    """
+    Accounts, recorded responses, rate-limit buckets and request statistics
+
+    Shared by all handlers of one fake server instance.
+    """
+
+    def __init__(self, config: Optional[FakeGitHubConfig] = None):
+        self.config = config or FakeGitHubConfig()
+        self.accounts: Dict[str, FakeAccount] = {}
+        self.cassette: Dict[str, Dict[str, Any]] = {}
+        self.upstream_url: Optional[str] = None
+        self._rng = random.Random(self.config.seed)
+        self._buckets: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._tree_cache: Dict[str, List[Dict[str, Any]]] = {}
+        self.reset_stats()
+
+    # ------------------------------------------------------------------
+    # Accounts
+    # ------------------------------------------------------------------
+
+    def add_account(self, account: FakeAccount) -> None:
+        """Register an account (login is case-insensitive, like GitHub)"""
+        self.accounts[account.user['login'].lower()] = account
+        if not self.config.default_username:
+            self.config.default_username = account.user['login']
+
+    def get_account(self, login: str) -> Optional[FakeAccount]:
+        return self.accounts.get((login or '').lower())
+
+    def find_repository(self, owner: str, name: str) -> Optional[Dict[str, Any]]:
+        account = self.get_account(owner)
+        if not account:
+            return None
+        for repo in account.repositories:
+            if repo['name'].lower() == name.lower():
+                return repo
+        return None
+
+    def get_tree(self, owner: str, name: str) -> List[Dict[str, Any]]:
+        """Get (and memoize) the recursive git tree of a repository"""
+        key = f"{owner.lower()}/{name.lower()}"
+        if key not in self._tree_cache:
+            account = self.get_account(owner)
+            file_count = account.tree_sizes.get(name, 20) if account else 0
+            self._tree_cache[key] = synthesize_tree(key, file_count, self.config.seed)
+        return self._tree_cache[key]
+
+    # ------------------------------------------------------------------
+    # Rate limiting
+    # ------------------------------------------------------------------
+
+    def consume(self, token: str, resource: str) -> Dict[str, Any]:
+        """
+        Consume one request from a token's bucket
+
+        Returns:
+            Bucket snapshot with limit, remaining, reset, used and exhausted flag
+        """
+        now = time.time()
+        bucket = self._buckets.get((token, resource))
+        if not bucket or now >= bucket['reset']:
+            limit = self.config.rate_limit if token != 'anonymous' else min(60, self.config.rate_limit)
+            bucket = {
+                'limit': limit,
+                'used': 0,
+                'reset': int(now) + self.config.rate_limit_window_seconds
+            }
+            self._buckets[(token, resource)] = bucket
+
+        exhausted = bucket['used'] >= bucket['limit']
+        if not exhausted:
+            bucket['used'] += 1
+
+        return {
+            'limit': bucket['limit'],
+            'used': bucket['used'],
+            'remaining': max(0, bucket['limit'] - bucket['used']),
+            'reset': bucket['reset'],
+            'exhausted': exhausted
+        }
+
+    def refund(self, token: str, resource: str) -> Dict[str, Any]:
+        """Give back a consumed request (304 Not Modified is free on GitHub)"""
+        bucket = self._buckets[(token, resource)]
+        bucket['used'] = max(0, bucket['used'] - 1)
+        return {
+            'limit': bucket['limit'],
+            'used': bucket['used'],
+            'remaining': max(0, bucket['limit'] - bucket['used']),
+            'reset': bucket['reset'],
+            'exhausted': False
+        }
+
+    def peek(self, token: str, resource: str) -> Dict[str, Any]:
+        """Current bucket state without consuming (for /rate_limit)"""
+        bucket = self._buckets.get((token, resource))
+        limit = self.config.rate_limit if token != 'anonymous' else min(60, self.config.rate_limit)
+        if not bucket or time.time() >= bucket['reset']:
+            reset = int(time.time()) + self.config.rate_limit_window_seconds
+            return {'limit': limit, 'used': 0, 'remaining': limit, 'reset': reset}
+        return {
+            'limit': bucket['limit'],
+            'used': bucket['used'],
+            'remaining': max(0, bucket['limit'] - bucket['used']),
+            'reset': bucket['reset']
+        }
+
+    def secondary_limit_hit(self) -> bool:
+        ratio = self.config.secondary_limit_ratio
+        return ratio > 0 and self._rng.random() < ratio
+
+    def latency_seconds(self) -> float:
+        jitter = self.config.latency_jitter_ms
+        latency = self.config.latency_ms + (self._rng.uniform(-jitter, jitter) if jitter else 0.0)
+        return max(0.0, latency) / 1000.0
+
+    # ------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------
+
+    def reset_stats(self) -> None:
+        self.stats = {
+            'requests': 0,
+            'by_route': {},
+            'by_status': {},
+            'rate_limited_primary': 0,
+            'rate_limited_secondary': 0,
+            'cassette_hits': 0,
+            'recorded': 0,
+            'not_modified': 0,
+            'in_flight': 0,
+            'max_in_flight': 0,
+            'connections': set()
+        }
+
+    def snapshot_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        connections = stats.pop('connections')
+        stats['distinct_connections'] = len(connections)
+        stats['requests_per_connection'] = round(
+            stats['requests'] / len(connections), 2
+        ) if connections else 0.0
+        return stats
+
+    # ------------------------------------------------------------------
+    # Cassettes (record and replay)
+    # ------------------------------------------------------------------
+
+    def load_cassette(self, path: str) -> None:
+        with open(path, 'r', encoding='utf-8') as f:
+            self.cassette.update(json.load(f))
+
+    def save_cassette(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.cassette, f, indent=2, sort_keys=True)
+
+
+STATE_KEY = web.AppKey('state', FakeGitHubState)
+
+
+# ----------------------------------------------------------------------
+# Fixture loading and synthesis
+# ----------------------------------------------------------------------
+
+def _isoformat(value: datetime) -> str:
+    return value.replace(microsecond=0).isoformat() + 'Z'
+
+
+def _node_id(prefix: str, value: Any) -> str:
+    return base64.b64encode(f"{prefix}:{value}".encode()).decode()
+
+
+def _rest_repository(owner: Dict[str, Any], repo: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a repository dict to the REST API shape"""
+    login = owner['login']
+    name = repo['name']
+    license_value = repo.get('license')
+    if isinstance(license_value, str):
+        license_value = {'name': license_value, 'spdx_id': license_value}
+
+    return {
+        'id': repo.get('id'),
+        'node_id': repo.get('node_id') or _node_id('Repository', repo.get('id')),
+        'name': name,
+        'full_name': f"{login}/{name}",
+        'owner': {'login': login, 'id': owner['id'], 'type': 'User'},
+        'private': repo.get('private', False),
+        'fork': repo.get('fork', False),
+        'archived': repo.get('archived', False),
+        'disabled': repo.get('disabled', False),
+        'html_url': f"https://github.com/{login}/{name}",
+        'homepage': repo.get('homepage'),
+        'description': repo.get('description'),
+        'language': repo.get('language'),
+        'languages': repo.get('languages') or (
+            {repo['language']: repo.get('size', 1) * 1024} if repo.get('language') else {}
+        ),
+        'stargazers_count': repo.get('stargazers_count', 0),
+        'watchers_count': repo.get('watchers_count', 0),
+        'forks_count': repo.get('forks_count', 0),
+        'open_issues_count': repo.get('open_issues_count', 0),
+        'size': repo.get('size', 0),
+        'topics': repo.get('topics', []),
+        'license': license_value,
+        'default_branch': repo.get('default_branch') or 'main',
+        'has_issues': repo.get('has_issues', True),
+        'has_wiki': repo.get('has_wiki', False),
+        'created_at': repo.get('created_at'),
+        'updated_at': repo.get('updated_at'),
+        'pushed_at': repo.get('pushed_at'),
+        'commit_count': repo.get('commit_count', 10),
+    }
+
+
+def account_from_scan_result(data: Dict[str, Any]) -> FakeAccount:
+    """
+    Build an account from a stored scan result (scan_result.json format)
+
+    Args:
+        data: Parsed scan result with githubProfile and repositories
+
+    Returns:
+        FakeAccount
+    """
+    profile = data.get('githubProfile') or {}
+    login = profile.get('username') or data.get('username')
+    repositories = data.get('repositories') or []
+
+    user = {
+        'login': login,
+        'id': abs(hash(login)) % 10 ** 8,
+        'node_id': _node_id('User', login),
+        'name': profile.get('name'),
+        'bio': profile.get('bio'),
+        'avatar_url': profile.get('avatar_url'),
+        'location': profile.get('location'),
+        'company': profile.get('company'),
+        'blog': profile.get('blog'),
+        'email': profile.get('email'),
+        'twitter_username': profile.get('twitter_username'),
+        'hireable': profile.get('hireable'),
+        'public_repos': profile.get('public_repos', len(repositories)),
+        'public_gists': profile.get('public_gists', 0),
+        'followers': profile.get('followers', 0),
+        'following': profile.get('following', 0),
+        'created_at': profile.get('created_at'),
+        'updated_at': profile.get('created_at'),
+        'type': profile.get('type', 'User'),
+        'site_admin': profile.get('site_admin', False),
+        'html_url': f"https://github.com/{login}",
+    }
+
+    repos = [_rest_repository(user, repo) for repo in repositories]
+    # Small recorded repos get proportionally small trees
+    tree_sizes = {repo['name']: max(5, min(200, repo['size'] // 10)) for repo in repos}
+
+    return FakeAccount(user=user, repositories=repos, tree_sizes=tree_sizes)
+
+
+def synthesize_account(
+    username: str,
+    repo_count: int = 500,
+    files_per_repo: int = 5000,
+    seed: int = 1234
+) -> FakeAccount:
+    """
+    Synthesize a large account
+
+    Args:
+        username: Login of the account
+        repo_count: Number of owned repositories
+        files_per_repo: Files in each repository's git tree
+        seed: Random seed
+
+    Returns:
+        FakeAccount
+    """
+    rng = random.Random(f"{seed}:{username}")
+    user_id = 10 ** 7 + rng.randrange(10 ** 7)
+
+    user = {
+        'login': username,
+        'id': user_id,
+        'node_id': _node_id('User', user_id),
+        'name': f"Synthetic {username}",
+        'bio': 'Synthesized account for load testing',
+        'avatar_url': f"https://avatars.githubusercontent.com/u/{user_id}?v=4",
+        'location': 'Chennai, India',
+        'company': None,
+        'blog': '',
+        'email': None,
+        'twitter_username': None,
+        'hireable': None,
+        'public_repos': repo_count,
+        'public_gists': 0,
+        'followers': rng.randint(0, 500),
+        'following': rng.randint(0, 100),
+        'created_at': _isoformat(REFERENCE_DATE - timedelta(days=2000)),
+        'updated_at': _isoformat(REFERENCE_DATE),
+        'type': 'User',
+        'site_admin': False,
+        'html_url': f"https://github.com/{username}",
+    }
+
+    repos = []
+    tree_sizes = {}
+    for i in range(repo_count):
+        language, _, _ = SYNTHETIC_LANGUAGES[rng.randrange(len(SYNTHETIC_LANGUAGES))]
+        stars = int(rng.paretovariate(1.2)) - 1
+        created = REFERENCE_DATE - timedelta(days=rng.randint(30, 2000))
+        pushed = created + timedelta(days=rng.randint(0, (REFERENCE_DATE - created).days))
+        size_kb = rng.randint(10, 80000)
+        name = f"project-{i:04d}"
+
+        repos.append(_rest_repository(user, {
+            'id': user_id * 1000 + i,
+            'name': name,
+            'description': f"Synthetic {language} project {i}" if rng.random() < 0.8 else None,
+            'language': language,
+            'languages': {language: size_kb * 800, 'Shell': size_kb * 10},
+            'stargazers_count': stars,
+            'watchers_count': stars,
+            'forks_count': stars // rng.randint(2, 10),
+            'open_issues_count': rng.randint(0, 20),
+            'size': size_kb,
+            'topics': [f"topic-{t}" for t in range(rng.randint(0, 5))],
+            'license': 'MIT' if rng.random() < 0.5 else None,
+            'fork': rng.random() < 0.1,
+            'created_at': _isoformat(created),
+            'updated_at': _isoformat(pushed),
+            'pushed_at': _isoformat(pushed),
+            'commit_count': rng.randint(1, 2000),
+        }))
+        tree_sizes[name] = files_per_repo
+
+    return FakeAccount(user=user, repositories=repos, tree_sizes=tree_sizes)
+
+
+def synthesize_tree(repo_key: str, file_count: int, seed: int = 1234) -> List[Dict[str, Any]]:
+    """
+    Synthesize a recursive git tree
+
+    Args:
+        repo_key: owner/name (lowercased), used to derive the seed
+        file_count: Number of blobs in the tree
+        seed: Random seed
+
+    Returns:
+        List of tree entries in Git Trees API format
+    """
+    rng = random.Random(f"{seed}:{repo_key}")
+    entries = []
+
+    for directory in SYNTHETIC_DIRECTORIES:
+        entries.append({
+            'path': directory,
+            'mode': '040000',
+            'type': 'tree',
+            'sha': hashlib.sha1(f"{repo_key}/{directory}".encode()).hexdigest()
+        })
+
+    for i in range(file_count):
+        _, extension, _ = SYNTHETIC_LANGUAGES[rng.randrange(len(SYNTHETIC_LANGUAGES))]
+        directory = SYNTHETIC_DIRECTORIES[rng.randrange(len(SYNTHETIC_DIRECTORIES))]
+        path = f"{directory}/file_{i:05d}.{extension}"
+        entries.append({
+            'path': path,
+            'mode': '100644',
+            'type': 'blob',
+            'sha': hashlib.sha1(f"{repo_key}/{path}".encode()).hexdigest(),
+            'size': len(synthesize_file_content(path)),
+        })
+
+    return entries
+
+
+def synthesize_file_content(path: str) -> str:
+    """Deterministic source code for a synthesized file path"""
+    digest = int(hashlib.md5(path.encode()).hexdigest()[:8], 16)
+    functions = 2 + digest % 6
+    name = path.rsplit('/', 1)[-1].split('.')[0]
+
+    if path.endswith('.py'):
+        body = [f"def {name}_{i}(items):\n    return [x * {i} for x in items if x > {digest % 50}]\n"
+                for i in range(functions)]
+        return f'"""{name}"""\n\n' + '\n'.join(body)
+    if path.endswith('.go'):
+        body = [f"func F{i}(n int) int {{\n\tif n > {digest % 50} {{\n\t\treturn n\n\t}}\n\treturn {i}\n}}\n"
+                for i in range(functions)]
+        return 'package main\n\n' + '\n'.join(body)
+    if path.endswith('.java'):
+        body = [f"    public int m{i}(int n) {{ return n > {digest % 50} ? n : {i}; }}\n"
+                for i in range(functions)]
+        return f"public class C{digest % 1000} {{\n" + ''.join(body) + '}\n'
+    body = [f"export function f{i}(n) {{\n  if (n > {digest % 50}) {{ return n; }}\n  return {i};\n}}\n"
+            for i in range(functions)]
+    return '\n'.join(body)
+
+
+# ----------------------------------------------------------------------
+# GraphQL
+# ----------------------------------------------------------------------
+
+def _graphql_repository(account: FakeAccount, repo: Dict[str, Any]) -> Dict[str, Any]:
+    languages = repo.get('languages') or {}
+    primary = repo.get('language')
+    license_value = repo.get('license')
+
+    return {
+        'id': repo['node_id'],
+        'databaseId': repo['id'],
+        'name': repo['name'],
+        'nameWithOwner': repo['full_name'],
+        'description': repo.get('description'),
+        'url': repo['html_url'],
+        'homepageUrl': repo.get('homepage'),
+        'stargazerCount': repo['stargazers_count'],
+        'forkCount': repo['forks_count'],
+        'watchers': {'totalCount': repo['watchers_count']},
+        'diskUsage': repo['size'],
+        'primaryLanguage': {'name': primary, 'color': LANGUAGE_COLORS.get(primary)} if primary else None,
+        'languages': {
+            'totalCount': len(languages),
+            'edges': [
+                {'size': size, 'node': {'name': lang, 'color': LANGUAGE_COLORS.get(lang)}}
+                for lang, size in languages.items()
+            ]
+        },
+        'repositoryTopics': {'nodes': [{'topic': {'name': t}} for t in repo.get('topics', [])]},
+        'createdAt': repo.get('created_at'),
+        'updatedAt': repo.get('updated_at'),
+        'pushedAt': repo.get('pushed_at'),
+        'hasIssuesEnabled': repo.get('has_issues', True),
+        'hasWikiEnabled': repo.get('has_wiki', False),
+        'licenseInfo': {'name': license_value['name'], 'spdxId': license_value.get('spdx_id')} if license_value else None,
+        'defaultBranchRef': {
+            'name': repo['default_branch'],
+            'target': {'history': {'totalCount': repo.get('commit_count', 0)}}
+        },
+        'issues': {'totalCount': repo.get('open_issues_count', 0)},
+        'pullRequests': {'totalCount': 0},
+        'readme': {'id': _node_id('Blob', f"{repo['full_name']}/README.md")},
+        'license': {'id': _node_id('Blob', f"{repo['full_name']}/LICENSE")} if license_value else None,
+        'tests': None,
+        'githubActions': None,
+        'isFork': repo.get('fork', False),
+        'isPrivate': repo.get('private', False),
+        'isArchived': repo.get('archived', False),
+        'stargazers': {'totalCount': repo['stargazers_count']},
+    }
+
+
+def _graphql_user(account: FakeAccount, first: int, after: Optional[str]) -> Dict[str, Any]:
+    user = account.user
+    start = int(base64.b64decode(after).decode().split(':')[1]) + 1 if after else 0
+    page = account.repositories[start:start + first]
+    end_index = start + len(page) - 1
+
+    return {
+        'id': user['node_id'],
+        'login': user['login'],
+        'name': user.get('name'),
+        'bio': user.get('bio'),
+        'avatarUrl': user.get('avatar_url'),
+        'email': user.get('email'),
+        'location': user.get('location'),
+        'company': user.get('company'),
+        'websiteUrl': user.get('blog'),
+        'twitterUsername': user.get('twitter_username'),
+        'createdAt': user.get('created_at'),
+        'updatedAt': user.get('updated_at'),
+        'followers': {'totalCount': user.get('followers', 0)},
+        'following': {'totalCount': user.get('following', 0)},
+        'repositories': {
+            'totalCount': len(account.repositories),
+            'pageInfo': {
+                'hasNextPage': start + first < len(account.repositories),
+                'endCursor': base64.b64encode(f"cursor:{end_index}".encode()).decode() if page else None
+            },
+            'nodes': [_graphql_repository(account, repo) for repo in page]
+        }
+    }
+
+
+def execute_graphql(state: FakeGitHubState, token: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Answer the GraphQL queries issued by our scanners
+
+    Supports user(login:) / viewer profile + repositories queries with
+    cursor pagination and rateLimit. Other queries return a GraphQL error.
+    """
+    query = payload.get('query') or ''
+    variables = payload.get('variables') or {}
+    data: Dict[str, Any] = {}
+
+    first_match = re.search(r'repositories\s*\([^)]*first:\s*(\d+)', query)
+    first = int(variables.get('first') or (first_match.group(1) if first_match else 100))
+    after = variables.get('after') or variables.get('cursor')
+
+    if re.search(r'\buser\s*\(', query):
+        login = variables.get('username') or variables.get('login')
+        if not login:
+            login_match = re.search(r'user\s*\(\s*login:\s*"([^"]+)"', query)
+            login = login_match.group(1) if login_match else None
+        account = state.get_account(login)
+        if not account:
+            return {
+                'data': {'user': None},
+                'errors': [{
+                    'type': 'NOT_FOUND',
+                    'path': ['user'],
+                    'message': f"Could not resolve to a User with the login of '{login}'."
+                }]
+            }
+        data['user'] = _graphql_user(account, first, after)
+    elif re.search(r'\bviewer\b', query):
+        account = state.get_account(state.config.default_username)
+        data['viewer'] = _graphql_user(account, first, after) if account else None
+
+    if 'rateLimit' in query:
+        bucket = state.peek(token, 'graphql')
+        data['rateLimit'] = {
+            'limit': bucket['limit'],
+            'cost': 1,
+            'remaining': bucket['remaining'],
+            'resetAt': _isoformat(datetime.utcfromtimestamp(bucket['reset']))
+        }
+
+    if not data:
+        return {'errors': [{'message': 'Query not implemented by fake GitHub server'}]}
+
+    return {'data': data}
+
+
+# ----------------------------------------------------------------------
+# Middleware
+# ----------------------------------------------------------------------
+
+def _request_token(request: web.Request) -> str:
+    authorization = request.headers.get('Authorization', '')
+    parts = authorization.split(' ', 1)
+    return parts[1].strip() if len(parts) == 2 and parts[1].strip() else 'anonymous'
+
+
+def _cassette_key(method: str, path_qs: str, body: bytes) -> str:
+    if body:
+        return f"{method} {path_qs} {hashlib.sha1(body).hexdigest()}"
+    return f"{method} {path_qs}"
+
+
+def _rate_limit_headers(bucket: Dict[str, Any], resource: str) -> Dict[str, str]:
+    return {
+        'X-RateLimit-Limit': str(bucket['limit']),
+        'X-RateLimit-Remaining': str(bucket['remaining']),
+        'X-RateLimit-Reset': str(bucket['reset']),
+        'X-RateLimit-Used': str(bucket['used']),
+        'X-RateLimit-Resource': resource,
+    }
+
+
+@web.middleware
+async def fake_github_middleware(request: web.Request, handler):
+    """Latency injection, rate limiting, record/replay and statistics"""
+    state: FakeGitHubState = request.app[STATE_KEY]
+    stats = state.stats
+
+    if request.path.startswith('/_fake/'):
+        return await handler(request)
+
+    stats['requests'] += 1
+    stats['in_flight'] += 1
+    stats['max_in_flight'] = max(stats['max_in_flight'], stats['in_flight'])
+    peername = request.transport.get_extra_info('peername') if request.transport else None
+    if peername:
+        stats['connections'].add(tuple(peername[:2]))
+
+    try:
+        latency = state.latency_seconds()
+        if latency:
+            await asyncio.sleep(latency)
+
+        token = _request_token(request)
+        resource = 'graphql' if request.path == '/graphql' else 'core'
+
+        if request.path == '/rate_limit':
+            response = await handler(request)
+        elif state.secondary_limit_hit():
+            stats['rate_limited_secondary'] += 1
+            response = web.json_response(
+                {
+                    'message': 'You have exceeded a secondary rate limit. Please wait a few minutes before you try again.',
+                    'documentation_url': 'https://docs.github.com/rest/overview/resources-in-the-rest-api#secondary-rate-limits'
+                },
+                status=429,
+                headers={'Retry-After': str(state.config.retry_after_seconds)}
+            )
+        else:
+            bucket = state.consume(token, resource)
+            if bucket['exhausted']:
+                stats['rate_limited_primary'] += 1
+                headers = _rate_limit_headers(bucket, resource)
+                if state.config.rate_limit_status == 429:
+                    headers['Retry-After'] = str(max(1, bucket['reset'] - int(time.time())))
+                response = web.json_response(
+                    {
+                        'message': f"API rate limit exceeded for token {token[:4]}****.",
+                        'documentation_url': 'https://docs.github.com/rest/overview/resources-in-the-rest-api#rate-limiting'
+                    },
+                    status=state.config.rate_limit_status,
+                    headers=headers
+                )
+            else:
+                response = await _replay_or_handle(request, handler, state)
+                if request.method == 'GET' and response.status == 200:
+                    response = _apply_conditional(request, response, state)
+                    if response.status == 304:
+                        state.stats['not_modified'] += 1
+                        bucket = state.refund(token, resource)
+                response.headers.update(_rate_limit_headers(bucket, resource))
+
+        route = request.match_info.route.resource.canonical if request.match_info.route.resource else request.path
+        stats['by_route'][route] = stats['by_route'].get(route, 0) + 1
+        stats['by_status'][str(response.status)] = stats['by_status'].get(str(response.status), 0) + 1
+        return response
+    finally:
+        stats['in_flight'] -= 1
+
+
+def _apply_conditional(request: web.Request, response: web.Response, state: FakeGitHubState) -> web.Response:
+    """Add an ETag to a 200 response, or answer 304 when If-None-Match matches"""
+    body = response.body if isinstance(response.body, bytes) else b''
+    etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+    cache_headers = {
+        'ETag': etag,
+        'Cache-Control': f"private, max-age={state.config.cache_max_age}, s-maxage={state.config.cache_max_age}",
+        'Vary': 'Accept, Authorization'
+    }
+
+    if request.headers.get('If-None-Match') == etag:
+        return web.Response(status=304, headers=cache_headers)
+
+    response.headers.update(cache_headers)
+    return response
+
+
+async def _replay_or_handle(request: web.Request, handler, state: FakeGitHubState) -> web.StreamResponse:
+    body = await request.read() if request.can_read_body else b''
+    key = _cassette_key(request.method, request.path_qs, body)
+
+    recorded = state.cassette.get(key)
+    if recorded:
+        state.stats['cassette_hits'] += 1
+        return web.json_response(recorded['body'], status=recorded['status'])
+
+    if state.upstream_url:
+        return await _record_from_upstream(request, body, key, state)
+
+    return await handler(request)
+
+
+async def _record_from_upstream(
+    request: web.Request,
+    body: bytes,
+    key: str,
+    state: FakeGitHubState
+) -> web.Response:
+    """Proxy a request to the real API and store the response in the cassette"""
+    headers = {
+        name: value for name, value in request.headers.items()
+        if name.lower() in ('authorization', 'accept', 'content-type', 'user-agent')
+    }
+    async with ClientSession() as session:
+        async with session.request(
+            request.method,
+            f"{state.upstream_url.rstrip('/')}{request.path_qs}",
+            data=body or None,
+            headers=headers
+        ) as upstream:
+            payload = await upstream.json(content_type=None)
+            status = upstream.status
+
+    state.cassette[key] = {'status': status, 'body': payload}
+    state.stats['recorded'] += 1
+    return web.json_response(payload, status=status)
+
+
+# ----------------------------------------------------------------------
+# REST handlers
+# ----------------------------------------------------------------------
+
+def _not_found() -> web.Response:
+    return web.json_response(
+        {'message': 'Not Found', 'documentation_url': 'https://docs.github.com/rest'},
+        status=404
+    )
+
+
+def _paginate(request: web.Request, items: List[Any], default_per_page: int = 30) -> web.Response:
+    """Apply per_page/page and emit a GitHub-style Link header"""
+    per_page = min(100, max(1, int(request.query.get('per_page', default_per_page))))
+    page = max(1, int(request.query.get('page', 1)))
+    start = (page - 1) * per_page
+    body = items[start:start + per_page]
+
+    headers = {}
+    last_page = max(1, (len(items) + per_page - 1) // per_page)
+    if page < last_page:
+        base = request.url.with_query({**request.query, 'per_page': per_page})
+        links = [
+            f'<{base.update_query(page=page + 1)}>; rel="next"',
+            f'<{base.update_query(page=last_page)}>; rel="last"'
+        ]
+        headers['Link'] = ', '.join(links)
+
+    return web.json_response(body, headers=headers)
+
+
+def _rest_user_view(user: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in user.items()}
+
+
+def _rest_repo_view(repo: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in repo.items() if key not in ('languages', 'commit_count')}
+
+
+async def handle_rate_limit(request: web.Request) -> web.Response:
+    state: FakeGitHubState = request.app[STATE_KEY]
+    token = _request_token(request)
+    core = state.peek(token, 'core')
+    graphql = state.peek(token, 'graphql')
+    return web.json_response({
+        'resources': {'core': core, 'graphql': graphql},
+        'rate': core
+    })
+
+
+async def handle_authenticated_user(request: web.Request) -> web.Response:
+    state: FakeGitHubState = request.app[STATE_KEY]
+    account = state.get_account(state.config.default_username)
+    return web.json_response(_rest_user_view(account.user)) if account else _not_found()
+
+
+async def handle_user(request: web.Request) -> web.Response:
+    account = request.app[STATE_KEY].get_account(request.match_info['login'])
+    return web.json_response(_rest_user_view(account.user)) if account else _not_found()
+
+
+async def handle_user_repos(request: web.Request) -> web.Response:
+    state: FakeGitHubState = request.app[STATE_KEY]
+    login = request.match_info.get('login') or state.config.default_username
+    account = state.get_account(login)
+    if not account:
+        return _not_found()
+
+    repos = list(account.repositories)
+    if request.query.get('sort', 'full_name') in ('updated', 'pushed'):
+        key = 'updated_at' if request.query.get('sort') == 'updated' else 'pushed_at'
+        repos.sort(key=lambda r: r.get(key) or '', reverse=True)
+    return _paginate(request, [_rest_repo_view(r) for r in repos])
+
+
+async def handle_repo(request: web.Request) -> web.Response:
+    repo = request.app[STATE_KEY].find_repository(request.match_info['owner'], request.match_info['repo'])
+    return web.json_response(_rest_repo_view(repo)) if repo else _not_found()
+
+
+async def handle_repo_languages(request: web.Request) -> web.Response:
+    repo = request.app[STATE_KEY].find_repository(request.match_info['owner'], request.match_info['repo'])
+    return web.json_response(repo.get('languages') or {}) if repo else _not_found()
+
+
+async def handle_repo_topics(request: web.Request) -> web.Response:
+    repo = request.app[STATE_KEY].find_repository(request.match_info['owner'], request.match_info['repo'])
+    return web.json_response({'names': repo.get('topics', [])}) if repo else _not_found()
+
+
+async def handle_git_tree(request: web.Request) -> web.Response:
+    state: FakeGitHubState = request.app[STATE_KEY]
+    owner, name = request.match_info['owner'], request.match_info['repo']
+    if not state.find_repository(owner, name):
+        return _not_found()
+
+    tree = state.get_tree(owner, name)
+    if request.query.get('recursive') not in ('1', 'true'):
+        tree = [entry for entry in tree if '/' not in entry['path']]
+    return web.json_response({
+        'sha': hashlib.sha1(f"{owner}/{name}".encode()).hexdigest(),
+        'tree': tree,
+        'truncated': False
+    })
+
+
+async def handle_contents(request: web.Request) -> web.Response:
+    state: FakeGitHubState = request.app[STATE_KEY]
+    owner, name = request.match_info['owner'], request.match_info['repo']
+    path = request.match_info.get('path', '').strip('/')
+    if not state.find_repository(owner, name):
+        return _not_found()
+
+    tree = state.get_tree(owner, name)
+    entry = next((e for e in tree if e['path'] == path), None)
+
+    if entry and entry['type'] == 'blob':
+        content = synthesize_file_content(path)
+        return web.json_response({
+            'type': 'file',
+            'encoding': 'base64',
+            'name': path.rsplit('/', 1)[-1],
+            'path': path,
+            'sha': entry['sha'],
+            'size': len(content),
+            'content': base64.b64encode(content.encode()).decode()
+        })
+
+    # Directory listing (root when path is empty)
+    prefix = f"{path}/" if path else ''
+    children = [
+        e for e in tree
+        if e['path'].startswith(prefix) and '/' not in e['path'][len(prefix):]
+    ]
+    if path and not children:
+        return _not_found()
+
+    return web.json_response([
+        {
+            'type': 'file' if e['type'] == 'blob' else 'dir',
+            'name': e['path'].rsplit('/', 1)[-1],
+            'path': e['path'],
+            'sha': e['sha'],
+            'size': e.get('size', 0)
+        }
+        for e in children
+    ])
+
+
+def _synthetic_items(repo: Dict[str, Any], kind: str, count: int) -> List[Dict[str, Any]]:
+    rng = random.Random(f"{repo['full_name']}:{kind}")
+    created = datetime.fromisoformat((repo.get('created_at') or _isoformat(REFERENCE_DATE)).replace('Z', ''))
+    items = []
+    for i in range(count):
+        opened = created + timedelta(days=rng.randint(0, 365))
+        state = rng.choice(['open', 'closed', 'closed'])
+        closed = opened + timedelta(days=rng.randint(1, 30)) if state == 'closed' else None
+        items.append({
+            'id': rng.randrange(10 ** 9),
+            'number': count - i,
+            'title': f"Synthetic {kind} {count - i}",
+            'state': state,
+            'user': {'login': repo['owner']['login']},
+            'created_at': _isoformat(opened),
+            'updated_at': _isoformat(closed or opened),
+            'closed_at': _isoformat(closed) if closed else None,
+            'merged_at': _isoformat(closed) if kind == 'pull' and closed and rng.random() < 0.7 else None,
+            'comments': rng.randint(0, 10),
+            'labels': [],
+        })
+    return items
+
+
+async def handle_commits(request: web.Request) -> web.Response:
+    repo = request.app[STATE_KEY].find_repository(request.match_info['owner'], request.match_info['repo'])
+    if not repo:
+        return _not_found()
+
+    rng = random.Random(f"{repo['full_name']}:commits")
+    pushed = datetime.fromisoformat((repo.get('pushed_at') or _isoformat(REFERENCE_DATE)).replace('Z', ''))
+    commits = []
+    for i in range(min(repo.get('commit_count', 10), 300)):
+        date = _isoformat(pushed - timedelta(hours=i * rng.randint(1, 48)))
+        sha = hashlib.sha1(f"{repo['full_name']}:{i}".encode()).hexdigest()
+        commits.append({
+            'sha': sha,
+            'commit': {
+                'message': f"Synthetic change {i}",
+                'author': {'name': repo['owner']['login'], 'date': date},
+                'committer': {'name': repo['owner']['login'], 'date': date}
+            },
+            'author': {'login': repo['owner']['login']}
+        })
+    return _paginate(request, commits)
+
+
+async def handle_pulls(request: web.Request) -> web.Response:
+    repo = request.app[STATE_KEY].find_repository(request.match_info['owner'], request.match_info['repo'])
+    if not repo:
+        return _not_found()
+    items = _synthetic_items(repo, 'pull', 12)
+    wanted = request.query.get('state', 'open')
+    if wanted != 'all':
+        items = [item for item in items if item['state'] == wanted]
+    return _paginate(request, items)
+
+
+async def handle_issues(request: web.Request) -> web.Response:
+    repo = request.app[STATE_KEY].find_repository(request.match_info['owner'], request.match_info['repo'])
+    if not repo:
+        return _not_found()
+    items = _synthetic_items(repo, 'issue', repo.get('open_issues_count', 0) + 5)
+    wanted = request.query.get('state', 'open')
+    if wanted != 'all':
+        items = [item for item in items if item['state'] == wanted]
+    return _paginate(request, items)
+
+
+async def handle_contributors(request: web.Request) -> web.Response:
+    repo = request.app[STATE_KEY].find_repository(request.match_info['owner'], request.match_info['repo'])
+    if not repo:
+        return _not_found()
+    return _paginate(request, [{'login': repo['owner']['login'], 'contributions': repo.get('commit_count', 1)}])
+
+
+async def handle_graphql(request: web.Request) -> web.Response:
+    state: FakeGitHubState = request.app[STATE_KEY]
+    payload = await request.json()
+    return web.json_response(execute_graphql(state, _request_token(request), payload))
+
+
+async def handle_fake_stats(request: web.Request) -> web.Response:
+    return web.json_response(request.app[STATE_KEY].snapshot_stats())
+
+
+async def handle_fake_reset(request: web.Request) -> web.Response:
+    state: FakeGitHubState = request.app[STATE_KEY]
+    state.reset_stats()
+    state._buckets.clear()
+    return web.json_response({'reset': True})
+
+
+def create_app(state: Optional[FakeGitHubState] = None) -> web.Application:
+    """
+    Create the fake GitHub aiohttp application
+
+    Args:
+        state: Server state (accounts, config, cassette); a default empty state if omitted
+
+    Returns:
+        aiohttp Application
+    """
+    app = web.Application(middlewares=[fake_github_middleware])
+    app[STATE_KEY] = state or FakeGitHubState()
+
+    app.router.add_get('/rate_limit', handle_rate_limit)
+    app.router.add_get('/user', handle_authenticated_user)
+    app.router.add_get('/user/repos', handle_user_repos)
+    app.router.add_get('/users/{login}', handle_user)
+    app.router.add_get('/users/{login}/repos', handle_user_repos)
+    app.router.add_get('/repos/{owner}/{repo}', handle_repo)
+    app.router.add_get('/repos/{owner}/{repo}/languages', handle_repo_languages)
+    app.router.add_get('/repos/{owner}/{repo}/topics', handle_repo_topics)
+    app.router.add_get('/repos/{owner}/{repo}/git/trees/{ref}', handle_git_tree)
+    app.router.add_get('/repos/{owner}/{repo}/contents', handle_contents)
+    app.router.add_get('/repos/{owner}/{repo}/contents/{path:.*}', handle_contents)
+    app.router.add_get('/repos/{owner}/{repo}/commits', handle_commits)
+    app.router.add_get('/repos/{owner}/{repo}/pulls', handle_pulls)
+    app.router.add_get('/repos/{owner}/{repo}/issues', handle_issues)
+    app.router.add_get('/repos/{owner}/{repo}/contributors', handle_contributors)
+    app.router.add_post('/graphql', handle_graphql)
+    app.router.add_get('/_fake/stats', handle_fake_stats)
+    app.router.add_post('/_fake/reset', handle_fake_reset)
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake GitHub API server for load testing')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--fixture', action='append', default=[],
+                        help='Scan result JSON to serve (repeatable)')
+    parser.add_argument('--synthesize', action='append', default=[],
+                        help='Synthesize an account as login:repos:files (repeatable)')
+    parser.add_argument('--cassette', help='Replay responses from this cassette file')
+    parser.add_argument('--record', metavar='UPSTREAM',
+                        help='Proxy unknown requests to UPSTREAM and save them to --cassette on exit')
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=int, default=5000)
+    parser.add_argument('--rate-limit-window', type=int, default=3600)
+    parser.add_argument('--rate-limit-status', type=int, choices=[403, 429], default=403)
+    parser.add_argument('--secondary-limit-ratio', type=float, default=0.0)
+    parser.add_argument('--cache-max-age', type=int, default=60,
+                        help='Cache-Control max-age sent with ETags (0 forces revalidation)')
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args()
+
+    state = FakeGitHubState(FakeGitHubConfig(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.jitter_ms,
+        rate_limit=args.rate_limit,
+        rate_limit_window_seconds=args.rate_limit_window,
+        rate_limit_status=args.rate_limit_status,
+        secondary_limit_ratio=args.secondary_limit_ratio,
+        cache_max_age=args.cache_max_age,
+        seed=args.seed
+    ))
+
+    for path in args.fixture:
+        with open(path, 'r', encoding='utf-8') as f:
+            state.add_account(account_from_scan_result(json.load(f)))
+
+    for spec in args.synthesize:
+        login, repos, files = (spec.split(':') + ['500', '5000'])[:3]
+        state.add_account(synthesize_account(login, int(repos), int(files), seed=args.seed))
+
+    if args.cassette and not args.record:
+        state.load_cassette(args.cassette)
+    if args.record:
+        state.upstream_url = args.record
+
+    app = create_app(state)
+    if args.record and args.cassette:
+        async def save_cassette(app):
+            state.save_cassette(args.cassette)
+            print(f"Saved {len(state.cassette)} recorded responses to {args.cassette}")
+        app.on_shutdown.append(save_cassette)
+
+    print(f"Fake GitHub serving {len(state.accounts)} account(s) on http://{args.host}:{args.port}")
+    web.run_app(app, host=args.host, port=args.port, print=None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+"""
+Load Driver
+Replays concurrent scan traffic against a GitHub endpoint (normally the fake server)
+
+Scenarios:
+- quick_scan: Stage 1 GraphQL fetch through GitHubGraphQLService
+- deep_fetch: Stage 2 code download through GitHubRESTService
+- rest: raw REST calls (profile + paginated repository listing) on a shared session
+
+Usage:
+    python -m tests.load.load_driver --base-url http://127.0.0.1:8787 \
+        --username bigdev --scenario quick_scan --concurrency 50 --iterations 500
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+from typing import Dict, List, Any, Optional
+
+import aiohttp
+
+SCENARIOS = ('quick_scan', 'deep_fetch', 'rest')
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(percentile / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class LoadDriver:
+    """
+    Concurrent load generator for the scan pipeline's GitHub clients
+
+    Runs a scenario from a fixed number of workers until the iteration
+    budget or the duration is exhausted, and collects per-call latency
+    and outcome counts.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        username: str,
+        token: str = 'load-test-token',
+        scenario: str = 'quick_scan',
+        concurrency: int = 10,
+        iterations: Optional[int] = 100,
+        duration_seconds: Optional[float] = None,
+        repos_per_deep_fetch: int = 1
+    ):
+        if scenario not in SCENARIOS:
+            raise ValueError(f"Unknown scenario '{scenario}', expected one of {SCENARIOS}")
+
+        self.base_url = base_url.rstrip('/')
+        self.username = username
+        self.token = token
+        self.scenario = scenario
+        self.concurrency = concurrency
+        self.iterations = iterations
+        self.duration_seconds = duration_seconds
+        self.repos_per_deep_fetch = repos_per_deep_fetch
+
+        self.latencies: List[float] = []
+        self.outcomes: Dict[str, int] = {}
+        self._issued = 0
+        self._repo_names: List[str] = []
+
+    def _build_graphql_service(self):
+        from backend.scoring.github.graphql_service import GitHubGraphQLService
+        service = GitHubGraphQLService()
+        service.endpoint = f"{self.base_url}/graphql"
+        return service
+
+    def _build_rest_service(self):
+        from backend.scoring.github.rest_service import GitHubRESTService
+        service = GitHubRESTService()
+        service.base_url = self.base_url
+        return service
+
+    def _next_iteration(self, deadline: Optional[float]) -> bool:
+        if deadline is not None and time.perf_counter() >= deadline:
+            return False
+        if self.iterations is not None and self._issued >= self.iterations:
+            return False
+        self._issued += 1
+        return True
+
+    def _record(self, outcome: str, elapsed: float) -> None:
+        self.latencies.append(elapsed)
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+    async def _run_once(self, session: aiohttp.ClientSession, services: Dict[str, Any], iteration: int) -> None:
+        if self.scenario == 'quick_scan':
+            await services['graphql'].get_user_and_repositories(self.username, self.token)
+        elif self.scenario == 'deep_fetch':
+            for offset in range(self.repos_per_deep_fetch):
+                name = self._repo_names[(iteration + offset) % len(self._repo_names)]
+                await services['rest'].get_repository_contents(self.username, name, self.token)
+        else:
+            headers = {'Authorization': f'Bearer {self.token}'}
+            async with session.get(f"{self.base_url}/users/{self.username}", headers=headers) as response:
+                response.raise_for_status()
+                await response.json()
+            url = f"{self.base_url}/users/{self.username}/repos?per_page=100"
+            while url:
+                async with session.get(url, headers=headers) as response:
+                    response.raise_for_status()
+                    await response.json()
+                    url = response.links.get('next', {}).get('url')
+
+    async def _worker(self, session: aiohttp.ClientSession, services: Dict[str, Any], deadline: Optional[float]) -> None:
+        while self._next_iteration(deadline):
+            iteration = self._issued
+            start = time.perf_counter()
+            try:
+                await self._run_once(session, services, iteration)
+                outcome = 'ok'
+            except Exception as e:
+                message = str(e)
+                if '403' in message or 'rate limit' in message.lower():
+                    outcome = 'rate_limited'
+                elif '429' in message:
+                    outcome = 'secondary_limited'
+                else:
+                    outcome = type(e).__name__
+            self._record(outcome, time.perf_counter() - start)
+
+    async def _load_repo_names(self, session: aiohttp.ClientSession) -> None:
+        headers = {'Authorization': f'Bearer {self.token}'}
+        async with session.get(
+            f"{self.base_url}/users/{self.username}/repos?per_page=100",
+            headers=headers
+        ) as response:
+            response.raise_for_status()
+            self._repo_names = [repo['name'] for repo in await response.json()]
+        if not self._repo_names:
+            raise RuntimeError(f"No repositories for {self.username}")
+
+    async def _server_stats(self, session: aiohttp.ClientSession) -> Optional[Dict[str, Any]]:
+        """Fetch fake server statistics (None when talking to a real endpoint)"""
+        try:
+            async with session.get(f"{self.base_url}/_fake/stats") as response:
+                if response.status == 200:
+                    return await response.json()
+        except aiohttp.ClientError:
+            pass
+        return None
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Run the configured scenario
+
+        Returns:
+            Report with throughput, latency percentiles, outcomes and server stats
+        """
+        services = {}
+        if self.scenario == 'quick_scan':
+            services['graphql'] = self._build_graphql_service()
+        elif self.scenario == 'deep_fetch':
+            services['rest'] = self._build_rest_service()
+
+        async with aiohttp.ClientSession() as session:
+            try:
+                async with session.post(f"{self.base_url}/_fake/reset") as response:
+                    await response.read()
+            except aiohttp.ClientError:
+                pass
+
+            if self.scenario == 'deep_fetch':
+                await self._load_repo_names(session)
+
+            deadline = time.perf_counter() + self.duration_seconds if self.duration_seconds else None
+            started = time.perf_counter()
+            await asyncio.gather(*(
+                self._worker(session, services, deadline) for _ in range(self.concurrency)
+            ))
+            elapsed = time.perf_counter() - started
+
+            server_stats = await self._server_stats(session)
+
+        return {
+            'scenario': self.scenario,
+            'base_url': self.base_url,
+            'username': self.username,
+            'concurrency': self.concurrency,
+            'iterations': len(self.latencies),
+            'elapsed_seconds': round(elapsed, 3),
+            'throughput_per_second': round(len(self.latencies) / elapsed, 2) if elapsed else 0.0,
+            'latency_ms': {
+                'mean': round(statistics.mean(self.latencies) * 1000, 2) if self.latencies else 0.0,
+                'p50': round(_percentile(self.latencies, 50) * 1000, 2),
+                'p95': round(_percentile(self.latencies, 95) * 1000, 2),
+                'p99': round(_percentile(self.latencies, 99) * 1000, 2),
+                'max': round(max(self.latencies) * 1000, 2) if self.latencies else 0.0,
+            },
+            'outcomes': self.outcomes,
+            'server': server_stats,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent scan load driver')
+    parser.add_argument('--base-url', default='http://127.0.0.1:8787')
+    parser.add_argument('--username', required=True)
+    parser.add_argument('--token', default='load-test-token')
+    parser.add_argument('--scenario', choices=SCENARIOS, default='quick_scan')
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--duration', type=float, help='Run for N seconds instead of a fixed iteration count')
+    parser.add_argument('--repos-per-deep-fetch', type=int, default=1)
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    args = parser.parse_args()
+
+    # Client retry/backoff warnings would drown the report
+    logging.basicConfig(level=logging.ERROR)
+
+    driver = LoadDriver(
+        base_url=args.base_url,
+        username=args.username,
+        token=args.token,
+        scenario=args.scenario,
+        concurrency=args.concurrency,
+        iterations=None if args.duration else args.iterations,
+        duration_seconds=args.duration,
+        repos_per_deep_fetch=args.repos_per_deep_fetch
+    )
+    report = asyncio.run(driver.run())
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
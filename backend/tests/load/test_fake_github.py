@@ -0,0 +1,185 @@
+"""
+Tests for the fake GitHub API server and load driver
+"""
+
+import json
+import os
+
+import aiohttp
+import pytest
+from aiohttp.test_utils import TestServer
+
+from .fake_github import (
+    FakeGitHubConfig,
+    FakeGitHubState,
+    account_from_scan_result,
+    create_app,
+    synthesize_account,
+)
+from .load_driver import LoadDriver
+
+SCAN_RESULT_PATH = os.path.join(
+    os.path.dirname(__file__), '..', '..', '..', 'scan_result.json'
+)
+
+AUTH = {'Authorization': 'Bearer test-token'}
+
+
+def _state(**config) -> FakeGitHubState:
+    state = FakeGitHubState(FakeGitHubConfig(**config))
+    state.add_account(synthesize_account('bigdev', repo_count=250, files_per_repo=500, seed=7))
+    return state
+
+
+@pytest.mark.asyncio
+async def test_repository_listing_is_paginated_with_link_header():
+    server = TestServer(create_app(_state()))
+    await server.start_server()
+    try:
+        async with aiohttp.ClientSession() as session:
+            names = []
+            url = str(server.make_url('/users/bigdev/repos?per_page=100'))
+            pages = 0
+            while url:
+                async with session.get(url, headers=AUTH) as response:
+                    assert response.status == 200
+                    names.extend(repo['name'] for repo in await response.json())
+                    url = response.links.get('next', {}).get('url')
+                    url = str(url) if url else None
+                pages += 1
+
+        assert pages == 3
+        assert len(names) == len(set(names)) == 250
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_primary_rate_limit_returns_403_with_headers():
+    server = TestServer(create_app(_state(rate_limit=3)))
+    await server.start_server()
+    try:
+        async with aiohttp.ClientSession() as session:
+            remaining = []
+            for _ in range(3):
+                async with session.get(server.make_url('/users/bigdev'), headers=AUTH) as response:
+                    assert response.status == 200
+                    remaining.append(int(response.headers['X-RateLimit-Remaining']))
+
+            async with session.get(server.make_url('/users/bigdev'), headers=AUTH) as response:
+                assert response.status == 403
+                assert response.headers['X-RateLimit-Remaining'] == '0'
+                assert 'X-RateLimit-Reset' in response.headers
+                assert 'rate limit exceeded' in (await response.json())['message']
+
+            # Buckets are per token
+            async with session.get(
+                server.make_url('/users/bigdev'),
+                headers={'Authorization': 'Bearer other-token'}
+            ) as response:
+                assert response.status == 200
+
+        assert remaining == [2, 1, 0]
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_secondary_rate_limit_returns_429_with_retry_after():
+    server = TestServer(create_app(_state(secondary_limit_ratio=1.0, retry_after_seconds=2)))
+    await server.start_server()
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(server.make_url('/users/bigdev'), headers=AUTH) as response:
+                assert response.status == 429
+                assert response.headers['Retry-After'] == '2'
+
+            async with session.get(server.make_url('/_fake/stats')) as response:
+                stats = await response.json()
+
+        assert stats['rate_limited_secondary'] == 1
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_graphql_service_against_recorded_fixture():
+    from backend.scoring.github.graphql_service import GitHubGraphQLService
+
+    with open(SCAN_RESULT_PATH, 'r', encoding='utf-8') as f:
+        scan_result = json.load(f)
+
+    state = FakeGitHubState()
+    state.add_account(account_from_scan_result(scan_result))
+    server = TestServer(create_app(state))
+    await server.start_server()
+    try:
+        service = GitHubGraphQLService()
+        service.endpoint = str(server.make_url('/graphql'))
+        user, repositories = await service.get_user_and_repositories(scan_result['username'], 'test-token')
+
+        assert user['username'] == scan_result['username']
+        assert len(repositories) == len(scan_result['repositories'])
+        assert {repo['name'] for repo in repositories} == {
+            repo['name'] for repo in scan_result['repositories']
+        }
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_rest_service_caps_large_synthesized_tree():
+    from backend.scoring.github.rest_service import GitHubRESTService
+
+    server = TestServer(create_app(_state()))
+    await server.start_server()
+    try:
+        service = GitHubRESTService()
+        service.base_url = str(server.make_url('')).rstrip('/')
+        files = await service.get_repository_contents('bigdev', 'project-0001', 'test-token')
+
+        assert 0 < len(files) <= service.max_files
+        assert all(f['content'] for f in files)
+        assert not any(f['path'].startswith(('node_modules/', 'dist/', 'vendor/')) for f in files)
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_cassette_responses_are_replayed():
+    state = _state()
+    state.cassette['GET /users/recorded'] = {'status': 200, 'body': {'login': 'recorded', 'id': 1}}
+    server = TestServer(create_app(state))
+    await server.start_server()
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(server.make_url('/users/recorded'), headers=AUTH) as response:
+                assert response.status == 200
+                assert (await response.json())['login'] == 'recorded'
+                assert 'X-RateLimit-Limit' in response.headers
+
+        assert state.stats['cassette_hits'] == 1
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_load_driver_reports_latency_and_server_stats():
+    server = TestServer(create_app(_state(latency_ms=1)))
+    await server.start_server()
+    try:
+        driver = LoadDriver(
+            base_url=str(server.make_url('')),
+            username='bigdev',
+            scenario='rest',
+            concurrency=4,
+            iterations=8
+        )
+        report = await driver.run()
+
+        assert report['outcomes'] == {'ok': 8}
+        assert report['latency_ms']['p95'] >= report['latency_ms']['p50'] > 0
+        # One profile call plus three repository pages per iteration
+        assert report['server']['requests'] == 8 * 4
+    finally:
+        await server.close()
@@ -0,0 +1,160 @@
+"""
+Tests for the conditional-request (ETag) GitHub HTTP cache against the fake server
+"""
+
+import pytest
+from aiohttp.test_utils import TestServer
+
+from app.services.cache_service import CacheService
+from app.services.github_http_cache import GitHubHTTPCache
+
+from .fake_github import FakeGitHubConfig, FakeGitHubState, create_app, synthesize_account
+
+
+async def _start_server(cache_max_age: int = 0) -> TestServer:
+    state = FakeGitHubState(FakeGitHubConfig(cache_max_age=cache_max_age))
+    state.add_account(synthesize_account('bigdev', repo_count=5, files_per_repo=20, seed=11))
+    server = TestServer(create_app(state))
+    await server.start_server()
+    return server
+
+
+def _memory_cache(**kwargs) -> GitHubHTTPCache:
+    # A CacheService that never connected: entries stay in the in-process LRU
+    return GitHubHTTPCache(redis_cache=CacheService(), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_api_service_revalidates_with_304(monkeypatch):
+    from app.services import github_api_service
+    from app.services.github_api_service import GitHubAPIService
+
+    cache = _memory_cache()
+    monkeypatch.setattr(github_api_service, 'github_http_cache', cache)
+    server = await _start_server(cache_max_age=0)
+    try:
+        service = GitHubAPIService('test-token')
+        service.base_url = str(server.make_url('')).rstrip('/')
+
+        first = await service._make_request('GET', '/users/bigdev')
+        remaining_after_first = service.rate_limit_remaining
+        second = await service._make_request('GET', '/users/bigdev')
+
+        assert second == first
+        assert cache.stats['misses'] == 1
+        assert cache.stats['not_modified'] == 1
+        # 304 responses are not charged against the rate limit
+        assert service.rate_limit_remaining == remaining_after_first
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_fresh_entries_are_served_without_a_request(monkeypatch):
+    from app.services import github_api_service
+    from app.services.github_api_service import GitHubAPIService
+
+    cache = _memory_cache()
+    monkeypatch.setattr(github_api_service, 'github_http_cache', cache)
+    server = await _start_server(cache_max_age=60)
+    try:
+        service = GitHubAPIService('test-token')
+        service.base_url = str(server.make_url('')).rstrip('/')
+
+        await service._make_request('GET', '/repos/bigdev/project-0000/languages')
+        await service._make_request('GET', '/repos/bigdev/project-0000/languages')
+
+        assert cache.stats['hits'] == 1
+        assert cache.get_stats()['hit_ratio'] == 0.5
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_entries_are_isolated_per_token(monkeypatch):
+    from app.services import github_api_service
+    from app.services.github_api_service import GitHubAPIService
+
+    cache = _memory_cache()
+    monkeypatch.setattr(github_api_service, 'github_http_cache', cache)
+    server = await _start_server(cache_max_age=60)
+    try:
+        for token in ('token-a', 'token-b'):
+            service = GitHubAPIService(token)
+            service.base_url = str(server.make_url('')).rstrip('/')
+            await service._make_request('GET', '/users/bigdev')
+
+        assert cache.stats['misses'] == 2
+        assert cache.stats['hits'] == 0
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_fast_scanner_uses_shared_cache(monkeypatch):
+    from app.services import fast_github_scanner
+    from app.services.fast_github_scanner import FastGitHubScanner
+
+    cache = _memory_cache()
+    monkeypatch.setattr(fast_github_scanner, 'github_http_cache', cache)
+    server = await _start_server(cache_max_age=0)
+    try:
+        for _ in range(2):
+            # A new scanner per scan: its own in-memory cache starts empty
+            async with FastGitHubScanner('test-token') as scanner:
+                scanner.base_url = str(server.make_url('')).rstrip('/')
+                repo = await scanner._make_request('/repos/bigdev/project-0001')
+                assert repo['name'] == 'project-0001'
+
+        assert cache.stats['misses'] == 1
+        assert cache.stats['not_modified'] == 1
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_rest_service_tree_revalidation_uses_disk_backend(tmp_path):
+    from backend.scoring.github.rest_service import GitHubRESTService
+
+    cache = _memory_cache(cache_dir=str(tmp_path))
+    server = await _start_server(cache_max_age=0)
+    try:
+        service = GitHubRESTService(http_cache=cache)
+        service.base_url = str(server.make_url('')).rstrip('/')
+
+        first = await service._get_file_tree('bigdev', 'project-0002', 'test-token')
+        # Drop the in-process layer: the second scan must come from disk
+        cache.clear_memory()
+        second = await service._get_file_tree('bigdev', 'project-0002', 'test-token')
+
+        assert first == second
+        assert cache.stats['misses'] == 2  # repository info + tree
+        assert cache.stats['not_modified'] == 2
+        assert len(list(tmp_path.glob('*.json'))) == 2
+        assert cache.get_stats()['backend'] == 'disk'
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_rest_service_defaults_to_registered_cache(monkeypatch):
+    from app.services import github_http_cache as cache_module
+    from backend.scoring.github import http_cache
+    from backend.scoring.github.rest_service import GitHubRESTService
+
+    cache = _memory_cache()
+    monkeypatch.setattr(cache_module, 'github_http_cache', cache)
+    server = await _start_server(cache_max_age=0)
+    cache_module.configure_scoring_http_cache()
+    try:
+        service = GitHubRESTService()
+        service.base_url = str(server.make_url('')).rstrip('/')
+
+        await service._get_file_tree('bigdev', 'project-0003', 'test-token')
+        await service._get_file_tree('bigdev', 'project-0003', 'test-token')
+
+        assert service.http_cache is cache
+        assert cache.stats['not_modified'] == 2
+    finally:
+        http_cache.set_http_cache(None)
+        await server.close()
@@ -0,0 +1,79 @@
+"""
+Tests for the shared keep-alive HTTP pool used by every GitHub client
+"""
+
+import pytest
+from aiohttp.test_utils import TestServer
+
+from app.services import connection_pool_manager as pool_module
+from app.services.connection_pool_manager import HTTPConnectionPool
+
+from .fake_github import FakeGitHubConfig, FakeGitHubState, create_app, synthesize_account
+
+
+async def _start_server() -> TestServer:
+    state = FakeGitHubState(FakeGitHubConfig())
+    state.add_account(synthesize_account('pooldev', repo_count=5, files_per_repo=5, seed=3))
+    server = TestServer(create_app(state))
+    await server.start_server()
+    return server
+
+
+@pytest.fixture
+def http_pool(monkeypatch):
+    """A fresh shared pool installed as the process-wide one"""
+    pool = HTTPConnectionPool(max_connections=10, max_connections_per_host=4)
+    monkeypatch.setattr(pool_module.connection_pool_manager, 'http_pool', pool)
+    monkeypatch.setattr(pool_module, 'record_metric', lambda *args, **kwargs: None)
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_clients_reuse_pooled_connections_and_record_timings(http_pool):
+    from app.services.github_api_service import GitHubAPIService
+    from app.services.github_graphql_client import GitHubGraphQLClient
+
+    server = await _start_server()
+    try:
+        service = GitHubAPIService('test-token')
+        service.base_url = str(server.make_url('')).rstrip('/')
+        for i in range(5):
+            repo = await service._make_request('GET', f'/repos/pooldev/project-{i:04d}/languages')
+            assert isinstance(repo, dict)
+
+        graphql = GitHubGraphQLClient('test-token')
+        graphql.endpoint = str(server.make_url('/graphql'))
+        data = await graphql.execute_query('query($login: String!) { user(login: $login) { login } }', {'login': 'pooldev'})
+        assert data['user']['login'] == 'pooldev'
+
+        stats = http_pool.get_timing_stats()
+        assert stats['requests'] == 6
+        assert stats['new_connections'] == 1
+        assert stats['reuse_rate'] == pytest.approx(5 / 6)
+        assert stats['timings']['connect']['samples'] == 1
+        assert stats['timings']['ttfb']['samples'] == 6
+        assert stats['timings']['download']['samples'] == 6
+    finally:
+        await http_pool.close()
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_scoring_clients_use_registered_session(http_pool):
+    from backend.scoring.github import http_session
+    from backend.scoring.github.graphql_service import GitHubGraphQLService
+
+    server = await _start_server()
+    pool_module._configure_scoring_http_session(http_pool)
+    try:
+        service = GitHubGraphQLService()
+        service.endpoint = str(server.make_url('/graphql'))
+        pages = [repos async for _, repos, _ in service.iter_repository_pages('pooldev', 'test-token')]
+
+        assert sum(len(repos) for repos in pages) == 5
+        assert http_pool.get_timing_stats()['requests'] == len(pages)
+        assert not http_pool.session.closed
+    finally:
+        http_session.set_session_provider(None)
+        await http_pool.close()
+        await server.close()
@@ -0,0 +1,164 @@
+"""
+Tests for the skip-unchanged quick scan: fingerprint probe and change-only repository writes
+"""
+
+import copy
+
+import pytest
+import pytest_asyncio
+from aiohttp.test_utils import TestServer
+
+from .fake_github import FakeGitHubConfig, FakeGitHubState, create_app, synthesize_account
+
+
+class _Result:
+    def __init__(self, upserted_count=0, modified_count=0, upserted_id=None):
+        self.upserted_count = upserted_count
+        self.modified_count = modified_count
+        self.upserted_id = upserted_id
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, *args, **kwargs):
+        return self
+
+    async def to_list(self, length=None):
+        return [copy.deepcopy(doc) for doc in self.docs]
+
+
+def _matches(doc, query):
+    for field, expected in query.items():
+        if isinstance(expected, dict) and '$in' in expected:
+            if doc.get(field) not in expected['$in']:
+                return False
+        elif doc.get(field) != expected:
+            return False
+    return True
+
+
+class MemoryCollection:
+    """Just enough of a Motor collection for ScanStorageService, counting writes"""
+
+    def __init__(self):
+        self.docs = []
+        self.writes = 0
+
+    def find(self, query, projection=None):
+        return _Cursor([doc for doc in self.docs if _matches(doc, query)])
+
+    async def find_one(self, query, projection=None):
+        docs = await self.find(query).to_list()
+        return docs[0] if docs else None
+
+    def _upsert(self, query, update, upsert):
+        self.writes += 1
+        doc = next((doc for doc in self.docs if _matches(doc, query)), None)
+        if doc is None:
+            if not upsert:
+                return _Result()
+            doc = {'_id': len(self.docs) + 1, **{k: v for k, v in query.items() if not isinstance(v, dict)}}
+            doc.update(update.get('$setOnInsert', {}))
+            doc.update(update['$set'])
+            self.docs.append(doc)
+            return _Result(upserted_count=1, upserted_id=doc['_id'])
+        doc.update(update['$set'])
+        return _Result(modified_count=1)
+
+    async def update_one(self, query, update, upsert=False):
+        return self._upsert(query, update, upsert)
+
+    async def bulk_write(self, operations, ordered=True):
+        results = [self._upsert(op._filter, op._doc, op._upsert) for op in operations]
+        return _Result(
+            upserted_count=sum(r.upserted_count for r in results),
+            modified_count=sum(r.modified_count for r in results)
+        )
+
+
+class MemoryDatabase:
+    def __init__(self):
+        self.user_profiles = MemoryCollection()
+        self.repositories = MemoryCollection()
+
+    @property
+    def writes(self):
+        return self.user_profiles.writes + self.repositories.writes
+
+
+@pytest_asyncio.fixture
+async def fake_github():
+    state = FakeGitHubState(FakeGitHubConfig())
+    state.add_account(synthesize_account('devfp', repo_count=30, files_per_repo=10, seed=11))
+    server = TestServer(create_app(state))
+    await server.start_server()
+    try:
+        yield state, server
+    finally:
+        await server.close()
+
+
+def _orchestrator(server, database):
+    from backend.scoring.orchestration.scan_orchestrator import ScanOrchestrator
+
+    orchestrator = ScanOrchestrator(database=database)
+    orchestrator.graphql_service.endpoint = str(server.make_url('/graphql'))
+    return orchestrator
+
+
+@pytest.mark.asyncio
+async def test_unchanged_account_costs_one_probe_and_no_writes(fake_github):
+    state, server = fake_github
+    database = MemoryDatabase()
+
+    first = await _orchestrator(server, database).execute_quick_scan('devfp', 'test-token', user_id='user-1')
+    assert first['storage_result']['repositories_stored'] == 30
+
+    state.reset_stats()
+    writes = database.writes
+    second = await _orchestrator(server, database).execute_quick_scan('devfp', 'test-token', user_id='user-1')
+
+    assert second['unchanged'] is True
+    assert state.stats['requests'] == 1
+    assert database.writes == writes
+    assert second['summary'] == first['summary']
+    assert sorted(r['name'] for r in second['repositories']) == sorted(r['name'] for r in first['repositories'])
+
+
+@pytest.mark.asyncio
+async def test_changed_account_rescans_and_writes_only_changed_repositories(fake_github):
+    state, server = fake_github
+    database = MemoryDatabase()
+    await _orchestrator(server, database).execute_quick_scan('devfp', 'test-token', user_id='user-1')
+
+    repo = state.get_account('devfp').repositories[3]
+    stored = next(doc for doc in database.repositories.docs if doc['name'] == repo['name'])
+    stored['analyzed'] = True
+    repo['stargazers_count'] += 1
+
+    result = await _orchestrator(server, database).execute_quick_scan('devfp', 'test-token', user_id='user-1')
+
+    assert 'unchanged' not in result
+    assert result['storage_result']['repositories_stored'] == 1
+    assert stored['stars'] == repo['stargazers_count']
+    # A star is not a push: the earlier deep analysis stays valid
+    assert stored['analyzed'] is True
+
+
+@pytest.mark.asyncio
+async def test_fingerprint_covers_repositories_beyond_the_first_page(fake_github):
+    from backend.scoring.github.graphql_service import GitHubGraphQLService
+
+    state, server = fake_github
+    state.add_account(synthesize_account('devmany', repo_count=130, files_per_repo=1, seed=12))
+    service = GitHubGraphQLService()
+    service.endpoint = str(server.make_url('/graphql'))
+
+    before = await service.get_scan_fingerprint('devmany', 'test-token')
+    state.get_account('devmany').repositories[-1]['stargazers_count'] += 1
+    after = await service.get_scan_fingerprint('devmany', 'test-token')
+
+    assert before['repo_count'] == 130
+    assert before['stars_hash'] != after['stars_hash']
@@ -0,0 +1,109 @@
+"""
+Tests for the shared GraphQL repository snapshot used by GitHubComprehensiveScanner
+"""
+
+import asyncio
+from collections import Counter
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.github_comprehensive_scanner import GitHubComprehensiveScanner
+
+from .fake_github import _graphql_user, synthesize_account
+
+
+def _scanner(account, delay: float = 0.0):
+    """Scanner whose GraphQL queries are answered from a synthesized fake account"""
+    with patch.object(GitHubComprehensiveScanner, '_initialize_user'):
+        scanner = GitHubComprehensiveScanner('test-token')
+
+    scanner.queries = []
+
+    async def execute_query(query, variables=None):
+        scanner.queries.append(variables)
+        await asyncio.sleep(delay)
+        return {'user': _graphql_user(account, variables['first'], variables['after'])}
+
+    scanner.graphql_client.execute_query = execute_query
+    return scanner
+
+
+def _user(login: str):
+    user = MagicMock()
+    user.login = login
+    user.created_at = datetime(2015, 1, 1)
+    user.get_repos.side_effect = AssertionError("section builders must use the repository snapshot")
+    return user
+
+
+@pytest.mark.asyncio
+async def test_snapshot_paginates_in_pages_of_100():
+    account = synthesize_account('bigdev', repo_count=250, files_per_repo=5, seed=3)
+    scanner = _scanner(account)
+
+    repos = await scanner.graphql_client.get_repository_snapshot('bigdev')
+
+    assert len(repos) == 250
+    assert [q['first'] for q in scanner.queries] == [100, 100, 100]
+    first = account.repositories[0]
+    assert repos[0]['id'] == first['id']
+    assert repos[0]['full_name'] == first['full_name']
+    assert repos[0]['languages'] == (first.get('languages') or {})
+    assert repos[0]['topics'] == first.get('topics', [])
+    assert repos[0]['created_at'].tzinfo is not None
+
+
+@pytest.mark.asyncio
+async def test_profile_sections_share_one_snapshot():
+    account = synthesize_account('bigdev', repo_count=120, files_per_repo=5, seed=5)
+    scanner = _scanner(account, delay=0.02)
+    user = _user('bigdev')
+
+    overview, languages, achievements = await asyncio.gather(
+        scanner._get_repository_overview(user),
+        scanner._get_language_statistics(user),
+        scanner._get_achievement_metrics(user)
+    )
+
+    # Two pages for 120 repositories, fetched once for all three sections
+    assert len(scanner.queries) == 2
+    user.get_repos.assert_not_called()
+
+    repos = account.repositories
+    assert overview['total_repositories'] == 120
+    assert overview['total_stars'] == sum(r['stargazers_count'] for r in repos)
+    assert achievements['total_stars_earned'] == overview['total_stars']
+
+    expected_bytes = Counter()
+    for repo in repos:
+        expected_bytes.update(repo.get('languages') or {})
+    breakdown = languages['language_breakdown']
+    assert {lang: data['total_bytes'] for lang, data in breakdown.items() if data['total_bytes']} == dict(expected_bytes)
+
+    # A later call within the TTL reuses the snapshot
+    await scanner._get_repository_overview(user)
+    assert len(scanner.queries) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_snapshot_is_not_cached():
+    account = synthesize_account('bigdev', repo_count=3, files_per_repo=5, seed=7)
+    scanner = _scanner(account)
+    calls = []
+
+    async def fail_once(username, **kwargs):
+        calls.append(username)
+        if len(calls) == 1:
+            raise Exception("Repository snapshot query failed: boom")
+        return []
+
+    scanner.graphql_client.get_repository_snapshot = fail_once
+    user = _user('bigdev')
+    user.get_repos.side_effect = RuntimeError("REST unavailable")
+
+    with pytest.raises(RuntimeError):
+        await scanner._get_repository_snapshot(user)
+    assert await scanner._get_repository_snapshot(user) == []
+    assert len(calls) == 2
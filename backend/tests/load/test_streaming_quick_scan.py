@@ -0,0 +1,112 @@
+"""
+Tests for streamed GraphQL pagination and the streaming Stage 1 quick scan
+"""
+
+import pytest
+from aiohttp.test_utils import TestServer
+
+from .fake_github import FakeGitHubConfig, FakeGitHubState, create_app, synthesize_account
+
+
+class RecordingEmitter:
+    """Collects partial results like ScanProgressEmitter would broadcast them"""
+
+    def __init__(self):
+        self.events = []
+
+    async def emit_partial_results(self, repositories, fetched, total, summary=None):
+        self.events.append({'count': len(repositories), 'fetched': fetched, 'total': total, 'summary': summary})
+
+
+class RecordingStorage:
+    """In-memory stand-in for ScanStorageService"""
+
+    def __init__(self):
+        self.pages = []
+        self.profile = None
+
+    async def store_repository_page(self, user_id, repositories):
+        self.pages.append(len(repositories))
+        return len(repositories)
+
+    async def store_user_profile(self, user_id, user_data, repositories, fingerprint=None):
+        self.profile = (user_id, user_data['username'], len(repositories))
+        return user_id
+
+    async def get_scan_fingerprint(self, user_id):
+        return None
+
+
+async def _start_server(repo_count: int) -> TestServer:
+    state = FakeGitHubState(FakeGitHubConfig())
+    state.add_account(synthesize_account('bigdev', repo_count=repo_count, files_per_repo=10, seed=3))
+    server = TestServer(create_app(state))
+    await server.start_server()
+    return server
+
+
+@pytest.mark.asyncio
+async def test_iter_repository_pages_streams_every_page():
+    from backend.scoring.github.graphql_service import GitHubGraphQLService
+
+    server = await _start_server(250)
+    try:
+        service = GitHubGraphQLService()
+        service.endpoint = str(server.make_url('/graphql'))
+
+        pages = []
+        async for user, repos, total in service.iter_repository_pages('bigdev', 'test-token'):
+            assert user['username'] == 'bigdev'
+            assert total == 250
+            pages.append([repo['name'] for repo in repos])
+
+        assert [len(page) for page in pages] == [100, 100, 50]
+        assert len({name for page in pages for name in page}) == 250
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_iter_repository_pages_respects_max_repositories():
+    from backend.scoring.github.graphql_service import GitHubGraphQLService
+
+    server = await _start_server(250)
+    try:
+        service = GitHubGraphQLService()
+        service.endpoint = str(server.make_url('/graphql'))
+
+        counts = [
+            len(repos)
+            async for _, repos, _ in service.iter_repository_pages('bigdev', 'test-token', max_repositories=120)
+        ]
+
+        assert counts == [100, 20]
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_streaming_quick_scan_emits_partial_results_and_stores_pages():
+    from backend.scoring.orchestration.scan_orchestrator import ScanOrchestrator
+
+    server = await _start_server(230)
+    try:
+        orchestrator = ScanOrchestrator()
+        orchestrator.graphql_service.endpoint = str(server.make_url('/graphql'))
+        orchestrator.storage_service = RecordingStorage()
+        emitter = RecordingEmitter()
+
+        result = await orchestrator.execute_quick_scan_streaming(
+            'bigdev', 'test-token', user_id='user-1', progress_emitter=emitter
+        )
+
+        assert result['pages'] == 3
+        assert result['summary']['total'] == 230
+        assert all('category' in repo for repo in result['repositories'])
+        assert [event['fetched'] for event in emitter.events] == [100, 200, 230]
+        assert emitter.events[-1]['summary'] == result['summary']
+        assert orchestrator.storage_service.pages == [100, 100, 30]
+        assert orchestrator.storage_service.profile == ('user-1', 'bigdev', 230)
+        assert result['storage_result']['repositories_stored'] == 230
+    finally:
+        await server.close()
@@ -0,0 +1,115 @@
+"""
+Shared fixtures for the offline performance benchmarks
+
+Benchmarks use pytest-benchmark. Databases are replaced with in-memory
+stand-ins (mongomock-motor for MongoDB, fakeredis for Redis) so that the
+numbers measure our Python code rather than network latency.
+
+Run and store a JSON baseline:
+    pytest tests/perf --benchmark-autosave --benchmark-storage=tests/perf/.benchmarks
+
+Compare against the latest stored baseline:
+    pytest tests/perf --benchmark-compare --benchmark-compare-fail=mean:20% \
+        --benchmark-storage=tests/perf/.benchmarks
+"""
+
+import asyncio
+import logging
+
+import pytest
+
+from .synthetic import (
+    generate_language_corpus,
+    generate_repository_files,
+    generate_repository_metadata,
+    generate_user_population,
+)
+
+try:
+    import pytest_benchmark
+except ImportError:
+    pytest_benchmark = None
+
+# Synthetic fixture configuration, recorded in every JSON baseline
+PERF_SEED = 42
+REPO_FILE_COUNTS = [10, 50]
+CORPUS_FILES_PER_LANGUAGE = 10
+REPO_METADATA_COUNT = 500
+USER_POPULATION_SIZE = 500
+
+
+def pytest_configure(config):
+    """Register the perf marker so benchmarks can be deselected with -m 'not perf'"""
+    config.addinivalue_line("markers", "perf: offline performance benchmark")
+
+
+if pytest_benchmark is not None:
+    def pytest_benchmark_update_json(config, benchmarks, output_json):
+        """Record the synthetic fixture shape alongside the timings"""
+        output_json['synthetic_fixtures'] = {
+            'seed': PERF_SEED,
+            'repo_file_counts': REPO_FILE_COUNTS,
+            'corpus_files_per_language': CORPUS_FILES_PER_LANGUAGE,
+            'repo_metadata_count': REPO_METADATA_COUNT,
+            'user_population_size': USER_POPULATION_SIZE,
+        }
+
+
+@pytest.fixture(scope="session", autouse=True)
+def quiet_logging():
+    """Silence INFO logging so benchmarks do not time log formatting"""
+    logging.disable(logging.INFO)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+@pytest.fixture(scope="module")
+def event_loop_runner():
+    """Run coroutines on a dedicated loop so benchmark targets stay synchronous"""
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture(scope="session", params=REPO_FILE_COUNTS, ids=lambda n: f"{n}files")
+def repository_files(request):
+    """Synthetic multi-language repository contents"""
+    return generate_repository_files(request.param, seed=PERF_SEED)
+
+
+@pytest.fixture(scope="session")
+def language_corpus():
+    """Synthetic source files in every language with an analyzer grammar"""
+    return generate_language_corpus(CORPUS_FILES_PER_LANGUAGE, seed=PERF_SEED)
+
+
+@pytest.fixture(scope="session")
+def repository_metadata():
+    """Synthetic Stage 1 repository metadata for importance scoring"""
+    return generate_repository_metadata(REPO_METADATA_COUNT, seed=PERF_SEED)
+
+
+@pytest.fixture(scope="session")
+def user_population():
+    """Synthetic user_profiles documents for ranking calculations"""
+    return generate_user_population(USER_POPULATION_SIZE, seed=PERF_SEED)
+
+
+@pytest.fixture
+def mongo_database(event_loop_runner, user_population):
+    """In-memory Motor-compatible database seeded with the user population"""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+
+    client = mongomock_motor.AsyncMongoMockClient()
+    database = client['broskies_perf']
+    event_loop_runner(
+        database.user_profiles.insert_many([dict(user) for user in user_population])
+    )
+    return database
+
+
+@pytest.fixture
+def redis_client():
+    """In-memory async Redis client"""
+    fakeredis = pytest.importorskip("fakeredis")
+    return fakeredis.aioredis.FakeRedis(decode_responses=True)
@@ -0,0 +1,469 @@
+"""
+Deterministic synthetic fixtures for performance benchmarks
+
+Every generator takes an explicit seed so that the same arguments always
+produce byte-identical repositories and user populations. Timing numbers
+are therefore comparable across commits and machines.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Tuple
+
+# Fixed reference date so that "recent" activity never drifts between runs
+REFERENCE_DATE = datetime(2025, 1, 1)
+
+LANGUAGE_EXTENSIONS = {
+    'Python': 'py',
+    'JavaScript': 'js',
+    'TypeScript': 'ts',
+    'Java': 'java',
+    'Go': 'go',
+}
+
+REGIONS = ['IN', 'US', 'UK', 'DE', 'SG']
+
+UNIVERSITIES = [
+    ('Indian Institute of Technology Delhi', 'IIT Delhi'),
+    ('Anna University', 'AU'),
+    ('Vellore Institute of Technology', 'VIT'),
+    ('National Institute of Technology Trichy', 'NIT Trichy'),
+    ('Delhi Technological University', 'DTU'),
+]
+
+
+def _python_source(rng: random.Random, functions: int) -> str:
+    lines = ['"""Synthetic module"""', 'import os', 'import json', '']
+    for i in range(functions):
+        lines.append(f'def handler_{i}(items, limit={rng.randint(1, 50)}):')
+        lines.append(f'    """Process batch {i}"""')
+        lines.append('    total = 0')
+        lines.append('    for item in items:')
+        lines.append(f'        if item > {rng.randint(0, 100)}:')
+        lines.append('            total += item')
+        lines.append('        elif item < 0 and limit:')
+        lines.append('            total -= 1')
+        lines.append('    return total')
+        lines.append('')
+    lines.append(f'class Service{rng.randint(0, 999)}:')
+    lines.append('    def run(self):')
+    lines.append('        return [handler_0(range(10))]')
+    return '\n'.join(lines) + '\n'
+
+
+def _javascript_source(rng: random.Random, functions: int, typed: bool = False) -> str:
+    annotation = ': number[]' if typed else ''
+    lines = ["import express from 'express';", "const app = express();", '']
+    for i in range(functions):
+        lines.append(f'// Handler {i}')
+        lines.append(f'function handler{i}(items{annotation}) {{')
+        lines.append('  let total = 0;')
+        lines.append('  for (const item of items) {')
+        lines.append(f'    if (item > {rng.randint(0, 100)} && item !== 7) {{')
+        lines.append('      total += item;')
+        lines.append('    } else {')
+        lines.append('      total -= 1;')
+        lines.append('    }')
+        lines.append('  }')
+        lines.append('  return total;')
+        lines.append('}')
+        lines.append('')
+    lines.append(f"app.get('/api/{rng.randint(0, 999)}', (req, res) => res.json(handler0([1, 2])));")
+    return '\n'.join(lines) + '\n'
+
+
+def _java_source(rng: random.Random, functions: int) -> str:
+    lines = ['package com.example;', '', 'import java.util.List;', '',
+             f'public class Service{rng.randint(0, 999)} {{']
+    for i in range(functions):
+        lines.append(f'    /** Handler {i} */')
+        lines.append(f'    public int handler{i}(List<Integer> items) {{')
+        lines.append('        int total = 0;')
+        lines.append('        for (int item : items) {')
+        lines.append(f'            if (item > {rng.randint(0, 100)}) {{')
+        lines.append('                total += item;')
+        lines.append('            } else if (item < 0) {')
+        lines.append('                total--;')
+        lines.append('            }')
+        lines.append('        }')
+        lines.append('        return total;')
+        lines.append('    }')
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def _go_source(rng: random.Random, functions: int) -> str:
+    lines = ['package main', '', 'import "fmt"', '']
+    for i in range(functions):
+        lines.append(f'// Handler{i} sums items')
+        lines.append(f'func Handler{i}(items []int) int {{')
+        lines.append('\ttotal := 0')
+        lines.append('\tfor _, item := range items {')
+        lines.append(f'\t\tif item > {rng.randint(0, 100)} {{')
+        lines.append('\t\t\ttotal += item')
+        lines.append('\t\t}')
+        lines.append('\t}')
+        lines.append('\treturn total')
+        lines.append('}')
+        lines.append('')
+    lines.append('func main() { fmt.Println(Handler0([]int{1, 2})) }')
+    return '\n'.join(lines) + '\n'
+
+
+def _cpp_source(rng: random.Random, functions: int) -> str:
+    lines = ['#include <vector>', '#include <memory>', '', 'namespace service {', '',
+             f'class Handler{rng.randint(0, 999)} {{', ' public:']
+    for i in range(functions):
+        lines.append(f'    // Handler {i}')
+        lines.append(f'    int handle{i}(const std::vector<int>& items, int limit) const {{')
+        lines.append('        int total = 0;')
+        lines.append('        for (auto item : items) {')
+        lines.append(f'            if (item > {rng.randint(0, 100)} && limit > 0) {{')
+        lines.append('                total += item;')
+        lines.append('            } else {')
+        lines.append('                total -= 1;')
+        lines.append('            }')
+        lines.append('        }')
+        lines.append('        return total > limit ? limit : total;')
+        lines.append('    }')
+    lines.extend(['};', '', '}  // namespace service'])
+    return '\n'.join(lines) + '\n'
+
+
+def _csharp_source(rng: random.Random, functions: int) -> str:
+    lines = ['using System.Linq;', '', 'namespace Example', '{',
+             f'    public class Service{rng.randint(0, 999)}', '    {',
+             '        public int Limit { get; set; }']
+    for i in range(functions):
+        lines.append(f'        /// <summary>Handler {i}</summary>')
+        lines.append(f'        public int Handle{i}(int[] items)')
+        lines.append('        {')
+        lines.append('            var total = 0;')
+        lines.append('            foreach (var item in items.Where(x => x != 7))')
+        lines.append('            {')
+        lines.append(f'                if (item > {rng.randint(0, 100)} || item < -1)')
+        lines.append('                {')
+        lines.append('                    total += item;')
+        lines.append('                }')
+        lines.append('            }')
+        lines.append('            return total;')
+        lines.append('        }')
+    lines.extend(['    }', '}'])
+    return '\n'.join(lines) + '\n'
+
+
+def _ruby_source(rng: random.Random, functions: int) -> str:
+    lines = ["require 'json'", '', f'class Service{rng.randint(0, 999)}']
+    for i in range(functions):
+        lines.append(f'  # Handler {i}')
+        lines.append(f'  def handle_{i}(items, limit = {rng.randint(1, 50)})')
+        lines.append('    total = 0')
+        lines.append('    items.each do |item|')
+        lines.append(f'      if item > {rng.randint(0, 100)} && limit')
+        lines.append('        total += item')
+        lines.append('      else')
+        lines.append('        total -= 1')
+        lines.append('      end')
+        lines.append('    end')
+        lines.append('    total')
+        lines.append('  end')
+    lines.append('end')
+    return '\n'.join(lines) + '\n'
+
+
+def _php_source(rng: random.Random, functions: int) -> str:
+    lines = ['<?php', '', 'namespace App;', '', f'class Service{rng.randint(0, 999)}', '{']
+    for i in range(functions):
+        lines.append(f'    // Handler {i}')
+        lines.append(f'    public function handle{i}(array $items, int $limit): int')
+        lines.append('    {')
+        lines.append('        $total = 0;')
+        lines.append('        foreach ($items as $item) {')
+        lines.append(f'            if ($item > {rng.randint(0, 100)} && $limit) {{')
+        lines.append('                $total += $item;')
+        lines.append('            }')
+        lines.append('        }')
+        lines.append('        return $total;')
+        lines.append('    }')
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def _swift_source(rng: random.Random, functions: int) -> str:
+    lines = ['import Foundation', '', f'struct Service{rng.randint(0, 999)} {{']
+    for i in range(functions):
+        lines.append(f'    /// Handler {i}')
+        lines.append(f'    func handle{i}(_ items: [Int], limit: Int) -> Int {{')
+        lines.append('        var total = 0')
+        lines.append('        for item in items {')
+        lines.append(f'            if item > {rng.randint(0, 100)} && limit > 0 {{')
+        lines.append('                total += item')
+        lines.append('            }')
+        lines.append('        }')
+        lines.append('        return total')
+        lines.append('    }')
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def _kotlin_source(rng: random.Random, functions: int) -> str:
+    lines = ['package com.example', '', f'class Service{rng.randint(0, 999)} {{']
+    for i in range(functions):
+        lines.append(f'    // Handler {i}')
+        lines.append(f'    fun handle{i}(items: List<Int>, limit: Int): Int {{')
+        lines.append('        var total = 0')
+        lines.append('        for (item in items) {')
+        lines.append(f'            if (item > {rng.randint(0, 100)} || limit == 0) {{')
+        lines.append('                total += item')
+        lines.append('            } else {')
+        lines.append('                total -= 1')
+        lines.append('            }')
+        lines.append('        }')
+        lines.append('        return total')
+        lines.append('    }')
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def _rust_source(rng: random.Random, functions: int) -> str:
+    lines = ['use std::collections::HashMap;', '', f'pub struct Service{rng.randint(0, 999)};', '']
+    for i in range(functions):
+        lines.append(f'/// Handler {i}')
+        lines.append(f'pub fn handle_{i}(items: &[i32], limit: i32) -> i32 {{')
+        lines.append('    let mut total = 0;')
+        lines.append('    for item in items {')
+        lines.append('        match item {')
+        lines.append(f'            x if *x > {rng.randint(0, 100)} && limit > 0 => total += x,')
+        lines.append('            _ => total -= 1,')
+        lines.append('        }')
+        lines.append('    }')
+        lines.append('    total')
+        lines.append('}')
+        lines.append('')
+    return '\n'.join(lines) + '\n'
+
+
+# Every language with a grammar in app.services.code_analysis, for the analyzer corpus
+CORPUS_LANGUAGES = {
+    **LANGUAGE_EXTENSIONS,
+    'C++': 'cpp',
+    'C#': 'cs',
+    'Ruby': 'rb',
+    'PHP': 'php',
+    'Swift': 'swift',
+    'Kotlin': 'kt',
+    'Rust': 'rs',
+}
+
+_CORPUS_SOURCES = {
+    'C++': _cpp_source,
+    'C#': _csharp_source,
+    'Ruby': _ruby_source,
+    'PHP': _php_source,
+    'Swift': _swift_source,
+    'Kotlin': _kotlin_source,
+    'Rust': _rust_source,
+}
+
+
+def _source_for(language: str, rng: random.Random, functions: int) -> str:
+    if language in _CORPUS_SOURCES:
+        return _CORPUS_SOURCES[language](rng, functions)
+    if language == 'Python':
+        return _python_source(rng, functions)
+    if language == 'JavaScript':
+        return _javascript_source(rng, functions)
+    if language == 'TypeScript':
+        return _javascript_source(rng, functions, typed=True)
+    if language == 'Java':
+        return _java_source(rng, functions)
+    return _go_source(rng, functions)
+
+
+def generate_repository_files(
+    file_count: int,
+    seed: int = 42,
+    functions_per_file: int = 8
+) -> List[Dict[str, Any]]:
+    """
+    Generate repository file contents in several languages
+
+    Args:
+        file_count: Number of source files to generate
+        seed: Random seed
+        functions_per_file: Functions emitted per source file
+
+    Returns:
+        List of file dicts shaped like scanner output
+        (name, path, size, content, language)
+    """
+    rng = random.Random(seed)
+    languages = list(LANGUAGE_EXTENSIONS)
+    directories = ['src', 'src/api', 'src/core', 'lib', 'tests']
+
+    files = [
+        {
+            'name': 'README.md',
+            'path': 'README.md',
+            'content': '# Synthetic project\n\n## Installation\n\npip install .\n\n## Usage\n\nRun it.\n',
+            'language': 'Markdown',
+        },
+        {
+            'name': 'requirements.txt',
+            'path': 'requirements.txt',
+            'content': 'fastapi==0.104.1\npymongo==4.6.0\nredis==5.0.0\npytest==7.4.0\n',
+            'language': 'Text',
+        },
+        {
+            'name': 'package.json',
+            'path': 'package.json',
+            'content': '{"dependencies": {"express": "^4.18.0", "react": "^18.2.0"}, '
+                       '"devDependencies": {"jest": "^29.0.0"}}\n',
+            'language': 'JSON',
+        },
+    ]
+
+    for i in range(file_count):
+        language = languages[i % len(languages)]
+        directory = directories[rng.randrange(len(directories))]
+        prefix = 'test_' if directory == 'tests' else ''
+        name = f'{prefix}module_{i}.{LANGUAGE_EXTENSIONS[language]}'
+        content = _source_for(language, rng, functions_per_file)
+        files.append({
+            'name': name,
+            'path': f'{directory}/{name}',
+            'size': len(content),
+            'content': content,
+            'language': language,
+        })
+
+    for file_info in files:
+        file_info.setdefault('size', len(file_info['content']))
+
+    return files
+
+
+def generate_language_corpus(
+    files_per_language: int,
+    seed: int = 42,
+    functions_per_file: int = 8
+) -> List[Dict[str, Any]]:
+    """
+    Generate source files in every CORPUS_LANGUAGES language
+
+    Args:
+        files_per_language: Files generated per language
+        seed: Random seed
+        functions_per_file: Functions emitted per source file
+
+    Returns:
+        List of file dicts shaped like scanner output
+        (name, path, size, content, language)
+    """
+    rng = random.Random(seed)
+    files = []
+
+    for language, extension in CORPUS_LANGUAGES.items():
+        for i in range(files_per_language):
+            content = _source_for(language, rng, functions_per_file)
+            name = f'module_{i}.{extension}'
+            files.append({
+                'name': name,
+                'path': f'src/{extension}/{name}',
+                'size': len(content),
+                'content': content,
+                'language': language,
+            })
+
+    return files
+
+
+def as_code_tuples(files: List[Dict[str, Any]]) -> List[Tuple[str, str, str]]:
+    """
+    Convert file dicts to the (filename, language, code) tuples used by
+    ComplexityAnalyzer and ACIDScorer
+
+    Args:
+        files: File dicts from generate_repository_files
+
+    Returns:
+        List of (filename, language, code) tuples for source files only
+    """
+    return [
+        (f['path'], f['language'].lower(), f['content'])
+        for f in files
+        if f['language'] in LANGUAGE_EXTENSIONS
+    ]
+
+
+def generate_repository_metadata(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Generate repository metadata in the Stage 1 (importance scoring) shape
+
+    Args:
+        count: Number of repositories
+        seed: Random seed
+
+    Returns:
+        List of repository dicts
+    """
+    rng = random.Random(seed)
+    repos = []
+
+    for i in range(count):
+        # Long-tailed popularity, like real accounts
+        stars = int(rng.paretovariate(1.2)) - 1
+        updated_at = REFERENCE_DATE - timedelta(days=rng.randint(0, 1500))
+        repos.append({
+            'github_id': str(100000 + i),
+            'name': f'repo-{i}',
+            'full_name': f'synthetic/repo-{i}',
+            'stars': stars,
+            'forks': stars // rng.randint(2, 10),
+            'watchers': stars,
+            'size': rng.randint(10, 50000),
+            'updated_at': updated_at.isoformat(),
+            'has_readme': rng.random() < 0.8,
+            'license': 'MIT' if rng.random() < 0.5 else None,
+            'description': f'Synthetic repository number {i}' if rng.random() < 0.7 else '',
+            'topics': [f'topic-{t}' for t in range(rng.randint(0, 6))],
+        })
+
+    return repos
+
+
+def generate_user_population(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Generate user_profiles documents for ranking calculations
+
+    Args:
+        count: Number of users
+        seed: Random seed
+
+    Returns:
+        List of user profile documents ready for insert_many
+    """
+    rng = random.Random(seed)
+    users = []
+
+    for i in range(count):
+        university, university_short = UNIVERSITIES[rng.randrange(len(UNIVERSITIES))]
+        users.append({
+            'user_id': f'user_{i:06d}',
+            'github_username': f'dev{i:06d}',
+            'full_name': f'Developer {i}',
+            'university': university,
+            'university_short': university_short,
+            'nationality': 'Indian',
+            'state': 'Tamil Nadu',
+            'district': 'Madurai',
+            'region': REGIONS[rng.randrange(len(REGIONS))],
+            # Rounded scores create ties, which ranking code must handle
+            'overall_score': round(rng.uniform(20.0, 98.0), 1),
+            'analysis_completed': True,
+            'scan_completed': True,
+            'created_at': REFERENCE_DATE,
+            'updated_at': REFERENCE_DATE,
+        })
+
+    return users
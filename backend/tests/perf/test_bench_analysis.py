@@ -0,0 +1,128 @@
+"""
+Benchmarks for Stage 2 code analysis
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from app.services.code_analysis import analyze_source
+from app.services.evaluation_engine import EvaluationEngine
+from app.services.technology_detector import TechnologyDetector
+from app.services.scoring import ACIDScorer, ComplexityAnalyzer
+
+from .synthetic import as_code_tuples
+
+pytestmark = pytest.mark.perf
+
+ROUNDS = 5
+
+REPO_DATA = {
+    'id': 1,
+    'name': 'synthetic-repo',
+    'full_name': 'synthetic/synthetic-repo',
+    'description': 'Synthetic repository for benchmarks',
+    'language': 'Python',
+    'size': 1200,
+    'stargazers_count': 12,
+    'forks_count': 3,
+    'topics': ['benchmark'],
+}
+
+REPO_METADATA = {
+    'has_tests': True,
+    'has_ci_cd': True,
+    'has_readme': True,
+    'has_license': True,
+}
+
+
+def test_evaluation_engine_evaluate_repository(benchmark, event_loop_runner, repository_files):
+    """Benchmark the full EvaluationEngine pipeline"""
+    engine = EvaluationEngine()
+    benchmark.extra_info['files'] = len(repository_files)
+
+    result = benchmark.pedantic(
+        lambda: event_loop_runner(
+            engine.evaluate_repository(REPO_DATA, repository_files, {'commits': []}, {})
+        ),
+        rounds=ROUNDS,
+        warmup_rounds=1
+    )
+
+    assert 0 <= result['overall_score'] <= 100
+
+
+def test_evaluation_engine_language_corpus(benchmark, event_loop_runner, language_corpus):
+    """Benchmark the full EvaluationEngine pipeline over every analyzer language"""
+    engine = EvaluationEngine()
+    benchmark.extra_info['files'] = len(language_corpus)
+
+    result = benchmark.pedantic(
+        lambda: event_loop_runner(
+            engine.evaluate_repository(REPO_DATA, language_corpus, {'commits': []}, {})
+        ),
+        rounds=ROUNDS,
+        warmup_rounds=1
+    )
+
+    assert set(result['detailed_code_metrics']['languages_detected']) == set(engine.supported_languages)
+
+
+def test_source_analyzer_language_corpus(benchmark, language_corpus):
+    """Benchmark the single-pass source analyzer alone"""
+    benchmark.extra_info['files'] = len(language_corpus)
+
+    def analyze_corpus():
+        return [analyze_source(f['content'], f['language']) for f in language_corpus]
+
+    metrics = benchmark.pedantic(analyze_corpus, rounds=ROUNDS, warmup_rounds=1)
+
+    assert all(m.functions for m in metrics)
+
+
+def test_acid_scorer_calculate_acid_scores(benchmark, repository_files):
+    """Benchmark ACID scoring (includes complexity analysis)"""
+    scorer = ACIDScorer()
+    files = as_code_tuples(repository_files)
+    benchmark.extra_info['files'] = len(files)
+
+    scores = benchmark.pedantic(
+        scorer.calculate_acid_scores,
+        args=(files, REPO_METADATA),
+        rounds=ROUNDS,
+        warmup_rounds=1
+    )
+
+    assert 0 <= scores.overall <= 100
+
+
+def test_complexity_analyzer_analyze_repository(benchmark, repository_files):
+    """Benchmark repository complexity aggregation"""
+    analyzer = ComplexityAnalyzer()
+    files = as_code_tuples(repository_files)
+    benchmark.extra_info['files'] = len(files)
+
+    metrics = benchmark.pedantic(
+        analyzer.analyze_repository,
+        args=(files,),
+        rounds=ROUNDS,
+        warmup_rounds=1
+    )
+
+    assert metrics.lines_of_code > 0
+
+
+def test_technology_detector_analyze_technology_stack(benchmark, repository_files):
+    """Benchmark technology stack detection"""
+    detector = TechnologyDetector()
+    benchmark.extra_info['files'] = len(repository_files)
+
+    analysis = benchmark.pedantic(
+        detector.analyze_technology_stack,
+        args=(repository_files, REPO_DATA),
+        rounds=ROUNDS,
+        warmup_rounds=1
+    )
+
+    assert analysis['languages']
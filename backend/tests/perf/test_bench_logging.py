@@ -0,0 +1,82 @@
+"""
+Benchmarks for event-loop time spent in logging under load
+
+Each round runs concurrent scan-like tasks that log per-repository messages
+through the file + JSON handlers, comparing the synchronous pipeline with the
+queue-based one (formatting and I/O on the writer thread) and with sampling.
+Timings are CPU time of the event-loop thread (time.thread_time), so the
+writer thread's work is not counted against the loop.
+"""
+
+import asyncio
+import logging
+import time
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from app.core.logging_config import setup_logging, shutdown_logging
+
+pytestmark = pytest.mark.perf
+
+ROUNDS = 5
+TASKS = 50
+RECORDS_PER_TASK = 40
+
+PIPELINES = {
+    "sync": {"async_logging": False, "sample_max_per_window": 0},
+    "async": {"async_logging": True, "sample_max_per_window": 0},
+    "async_sampled": {"async_logging": True, "sample_max_per_window": 50},
+}
+
+
+@pytest.fixture
+def configured_logging(request, tmp_path):
+    """Configure the pipeline under test, then restore pytest's root handlers"""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    logging.disable(logging.NOTSET)
+
+    setup_logging(
+        log_level="INFO",
+        log_file=str(tmp_path / "bench.log"),
+        enable_json_logging=True,
+        enable_console_logging=False,
+        **PIPELINES[request.param]
+    )
+    yield request.param
+
+    shutdown_logging()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+    logging.disable(logging.INFO)
+
+
+async def _scan_like_load():
+    logger = logging.getLogger("app.services.bench_scanner")
+
+    async def scan(task: int):
+        for i in range(RECORDS_PER_TASK):
+            logger.info("Fetched %s PRs for %s/%s", i, f"user{task}", f"repo{i}", extra={"task": task})
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*[scan(task) for task in range(TASKS)])
+
+
+@pytest.mark.benchmark(timer=time.thread_time)
+@pytest.mark.parametrize("configured_logging", list(PIPELINES), indirect=True)
+def test_event_loop_time_in_logging(benchmark, event_loop_runner, configured_logging):
+    """Benchmark loop-thread time for TASKS x RECORDS_PER_TASK log calls"""
+    benchmark.extra_info['pipeline'] = configured_logging
+    benchmark.extra_info['records'] = TASKS * RECORDS_PER_TASK
+
+    benchmark.pedantic(
+        lambda: event_loop_runner(_scan_like_load()),
+        rounds=ROUNDS,
+        warmup_rounds=1
+    )
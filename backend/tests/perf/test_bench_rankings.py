@@ -0,0 +1,55 @@
+"""
+Benchmarks for regional and university ranking calculators
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from app.services.ranking import RegionalRankingCalculator, UniversityRankingCalculator
+
+pytestmark = pytest.mark.perf
+
+ROUNDS = 3
+
+
+def test_regional_calculate_all_rankings(benchmark, event_loop_runner, mongo_database, user_population):
+    """Benchmark recomputing every regional ranking"""
+    calculator = RegionalRankingCalculator(mongo_database)
+    benchmark.extra_info['users'] = len(user_population)
+
+    results = benchmark.pedantic(
+        lambda: event_loop_runner(calculator.calculate_all_rankings()),
+        rounds=ROUNDS,
+        warmup_rounds=1
+    )
+
+    assert sum(results.values()) == len(user_population)
+
+
+def test_university_calculate_all_rankings(benchmark, event_loop_runner, mongo_database, user_population):
+    """Benchmark recomputing every university ranking"""
+    calculator = UniversityRankingCalculator(mongo_database)
+    benchmark.extra_info['users'] = len(user_population)
+
+    results = benchmark.pedantic(
+        lambda: event_loop_runner(calculator.calculate_all_rankings()),
+        rounds=ROUNDS,
+        warmup_rounds=1
+    )
+
+    assert sum(results.values()) == len(user_population)
+
+
+def test_regional_calculate_user_ranking(benchmark, event_loop_runner, mongo_database, user_population):
+    """Benchmark a single user's regional ranking (scan completion path)"""
+    calculator = RegionalRankingCalculator(mongo_database)
+    user_id = user_population[len(user_population) // 2]['user_id']
+
+    ranking = benchmark.pedantic(
+        lambda: event_loop_runner(calculator.calculate_user_ranking(user_id)),
+        rounds=ROUNDS * 3,
+        warmup_rounds=1
+    )
+
+    assert 1 <= ranking['rank'] <= ranking['total_users']
@@ -0,0 +1,68 @@
+"""
+Benchmarks for Stage 1 importance scoring
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from backend.scoring.scoring import ImportanceScorer
+from app.services.cache_service import CacheService
+
+pytestmark = pytest.mark.perf
+
+ROUNDS = 10
+
+
+def test_importance_scorer_calculate_and_categorize(benchmark, repository_metadata):
+    """Benchmark scoring and categorizing a whole account's repositories"""
+    scorer = ImportanceScorer()
+    benchmark.extra_info['repositories'] = len(repository_metadata)
+
+    def score_all():
+        categories = []
+        for repo in repository_metadata:
+            categories.append(scorer.categorize(scorer.calculate_score(repo)))
+        return categories
+
+    categories = benchmark.pedantic(score_all, rounds=ROUNDS, warmup_rounds=1)
+
+    assert len(categories) == len(repository_metadata)
+
+
+def test_importance_scorer_batch_calculate_and_categorize(benchmark, repository_metadata):
+    """Benchmark the vectorized batch path used by ScanOrchestrator"""
+    scorer = ImportanceScorer()
+    benchmark.extra_info['repositories'] = len(repository_metadata)
+
+    categories = benchmark.pedantic(
+        lambda: scorer.categorize_batch(scorer.calculate_scores_batch(repository_metadata)),
+        rounds=ROUNDS,
+        warmup_rounds=1
+    )
+
+    assert len(categories) == len(repository_metadata)
+
+
+def test_importance_scores_cache_round_trip(benchmark, event_loop_runner, redis_client, repository_metadata):
+    """Benchmark caching and reading back importance scores through CacheService"""
+    scorer = ImportanceScorer()
+    scores = {
+        repo['github_id']: scorer.calculate_score(repo)
+        for repo in repository_metadata
+    }
+
+    cache = CacheService()
+    cache.redis_client = redis_client
+
+    async def round_trip():
+        await cache.cache_importance_scores('synthetic', scores)
+        return await cache.get_importance_scores('synthetic')
+
+    cached = benchmark.pedantic(
+        lambda: event_loop_runner(round_trip()),
+        rounds=ROUNDS,
+        warmup_rounds=1
+    )
+
+    assert cached == scores
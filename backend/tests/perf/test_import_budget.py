@@ -0,0 +1,93 @@
+"""
+Startup import budget
+
+Each check imports modules in a fresh interpreter under ``python -X importtime``
+and fails when the cumulative import time of a module exceeds its budget, or
+when a module drags in something that should only load on first use.
+
+Budgets are generous (roughly 2-3x a cold import without cached bytecode) so
+they catch regressions such as a new eager import of the model layer, not
+machine noise. Set IMPORT_BUDGET_SCALE to loosen them on slow runners.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Tuple
+
+import pytest
+
+pytestmark = pytest.mark.perf
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+REPO_ROOT = BACKEND_DIR.parent
+
+# Cumulative import time budget per module, in milliseconds
+IMPORT_BUDGETS_MS = {
+    "app.database": 750,
+    "app.models.profile": 400,
+    "app.services.evaluation_engine": 200,
+    "app.services.performance_service": 800,
+}
+
+BUDGET_SCALE = float(os.getenv("IMPORT_BUDGET_SCALE", "1.0"))
+
+
+def _run(code: str) -> Tuple[str, Dict[str, int]]:
+    """
+    Run code in a fresh interpreter with -X importtime
+
+    Returns:
+        (stdout, cumulative import time in microseconds per module)
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_us, name = line.split("|", 2)
+        if cumulative_us.strip().isdigit():
+            cumulative[name.strip()] = int(cumulative_us)
+    return result.stdout, cumulative
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS_MS))
+def test_module_import_within_budget(module):
+    _, cumulative = _run(f"import {module}")
+
+    elapsed_ms = cumulative[module] / 1000
+    budget_ms = IMPORT_BUDGETS_MS[module] * BUDGET_SCALE
+    assert elapsed_ms <= budget_ms, f"importing {module} took {elapsed_ms:.0f}ms (budget {budget_ms:.0f}ms)"
+
+
+def test_heavy_work_is_deferred_to_first_use():
+    stdout, cumulative = _run(
+        "import app.database, app.models.profile, app.services.evaluation_engine as engine\n"
+        "print(app.models.profile._INDIAN_COLLEGES_CACHE is None, engine._compiled.cache_info().currsize)"
+    )
+
+    # Schema management and migrations pull in the full model layer
+    assert "app.database.migrations" not in cumulative
+    assert "app.models.comprehensive_models" not in cumulative
+    # The colleges list is read and no pattern table is compiled at import
+    assert stdout.split() == ["True", "0"]
+
+
+def test_production_skips_debug_routers():
+    from app.routers.registry import ROUTER_SPECS, iter_router_specs
+
+    production = [spec.module for spec in iter_router_specs(include_debug=False)]
+    development = [spec.module for spec in iter_router_specs(include_debug=True)]
+
+    assert "app.api.debug" not in production
+    assert "app.routers.test_endpoint" not in production
+    assert not any(".debug_" in module for module in production)
+    assert development == [spec.module for spec in ROUTER_SPECS]
@@ -0,0 +1,251 @@
+"""
+Tests for durable deep-analysis jobs: checkpoint resume, completion event and dispatch
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services import analysis_jobs
+from app.services import analysis_orchestrator as orchestrator_module
+from app.services.analysis_orchestrator import AnalysisOrchestrator, AnalysisStatus
+
+IMPORTANCE_SCORES = [92, 85, 81, 70, 64, 12]
+
+
+def _repositories():
+    return [{'name': f'repo{i}', 'full_name': f'dev/repo{i}'} for i in range(len(IMPORTANCE_SCORES))]
+
+
+@pytest.fixture
+def orchestrator(monkeypatch):
+    """In-memory orchestrator with deterministic scoring and a counting evaluator"""
+    monkeypatch.setattr(settings, 'deep_analysis_backend', 'local')
+    orchestrator = AnalysisOrchestrator()
+    orchestrator.evaluated = []
+
+    async def evaluate(repo, github_token=None):
+        orchestrator.evaluated.append(repo['name'])
+        return {'overall_score': 70.0}
+
+    async def no_rankings(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(orchestrator.scorer, 'calculate_importance_scores', lambda repos: IMPORTANCE_SCORES[:len(repos)])
+    monkeypatch.setattr(orchestrator.evaluator, 'evaluate_repository_simple', evaluate)
+    monkeypatch.setattr(orchestrator, '_update_user_rankings_with_categories', no_rankings)
+    return orchestrator
+
+
+class _ScanCollection:
+    def __init__(self):
+        self.updates = []
+
+    async def update_one(self, query, update):
+        self.updates.append((query, update['$set']))
+
+        class _Result:
+            modified_count = 1
+        return _Result()
+
+
+class TestResumeFromCheckpoints:
+    """A restarted job skips repositories evaluated before the restart"""
+
+    @pytest.mark.asyncio
+    async def test_checkpointed_repositories_are_not_evaluated_again(self, orchestrator):
+        analysis_id = 'resume-1'
+        await orchestrator.state_storage.store_state(analysis_id, {'status': AnalysisStatus.EVALUATING})
+        await orchestrator.state_storage.save_checkpoint('resume-1', 'dev/repo0', {'overall_score': 88.0})
+        await orchestrator.state_storage.save_checkpoint('resume-1', 'dev/repo1', {'overall_score': 81.0})
+
+        await orchestrator.run_analysis(analysis_id, 'dev', _repositories(), max_evaluate=5)
+
+        state = await orchestrator.get_analysis_status(analysis_id)
+        assert state['status'] == AnalysisStatus.COMPLETE
+        assert orchestrator.evaluated == ['repo2', 'repo3', 'repo4']
+        assert state['evaluated_count'] == 5
+        checkpoints = await orchestrator.state_storage.get_checkpoints(analysis_id)
+        assert sorted(checkpoints) == [f'dev/repo{i}' for i in range(5)]
+        assert checkpoints['dev/repo0'] == {'overall_score': 88.0}
+
+    @pytest.mark.asyncio
+    async def test_finished_analysis_is_not_run_again(self, orchestrator, monkeypatch):
+        events = []
+
+        async def on_finished(state, database=None):
+            events.append(state['status'])
+
+        monkeypatch.setattr(orchestrator_module, 'handle_analysis_finished', on_finished)
+        analysis_id = 'done-1'
+        await orchestrator.state_storage.store_state(analysis_id, {'status': AnalysisStatus.COMPLETE})
+
+        await orchestrator.run_analysis(analysis_id, 'dev', _repositories(), max_evaluate=5)
+
+        assert orchestrator.evaluated == []
+        assert events == [AnalysisStatus.COMPLETE]
+
+
+class TestCompletionEvent:
+    """Finishing an analysis updates its scan document without polling"""
+
+    @pytest.mark.asyncio
+    async def test_completion_updates_tagged_scan_document(self, orchestrator):
+        scans = _ScanCollection()
+        database = {'external_users': scans}
+        analysis_id = await orchestrator.initiate_analysis(
+            'dev', _repositories(), max_evaluate=5,
+            scan_target={'scan_collection': 'external_users'}, analysis_id='event-1'
+        )
+        state = await orchestrator.get_analysis_status(analysis_id)
+        await analysis_jobs.handle_analysis_finished(state, database)
+        assert scans.updates == []  # not finished yet
+
+        await asyncio.sleep(0.05)  # the in-process job runs to completion
+        await analysis_jobs.handle_analysis_finished(await orchestrator.get_analysis_status(analysis_id), database)
+
+        query, update = scans.updates[-1]
+        assert query == {'analysis_id': 'event-1'}
+        assert update['deepAnalysisComplete'] is True
+        assert update['deepAnalysisInProgress'] is False
+        assert update['overallScore'] > 0
+
+    @pytest.mark.asyncio
+    async def test_failed_analysis_marks_scan_document(self):
+        scans = _ScanCollection()
+        state = {
+            'analysis_id': 'event-2', 'status': AnalysisStatus.FAILED, 'error': 'boom',
+            'scan_target': {'scan_collection': 'internal_users'}
+        }
+
+        await analysis_jobs.handle_analysis_finished(state, {'internal_users': scans})
+
+        query, update = scans.updates[0]
+        assert query['analysis_id'] == 'event-2'
+        assert update['deepAnalysisError'] is True
+
+
+class TestDispatch:
+    """Durable dispatch with an in-process fallback"""
+
+    def test_enqueue_publishes_to_analysis_queue(self, monkeypatch):
+        from app.tasks import analysis_tasks
+
+        published = {}
+
+        class _Result:
+            id = 'celery-task-1'
+
+        def apply_async(kwargs=None, queue=None, retry=True):
+            published.update(kwargs=kwargs, queue=queue, retry=retry)
+            return _Result()
+
+        monkeypatch.setattr(settings, 'deep_analysis_backend', 'celery')
+        monkeypatch.setattr(analysis_tasks.run_deep_analysis, 'apply_async', apply_async)
+
+        job_id = analysis_jobs.enqueue_durable_job('run_deep_analysis', analysis_id='a1', username='dev')
+
+        assert job_id == 'celery-task-1'
+        assert published == {'kwargs': {'analysis_id': 'a1', 'username': 'dev'}, 'queue': 'analysis_queue', 'retry': False}
+
+    def test_broker_failure_or_local_backend_runs_in_process(self, monkeypatch):
+        from app.tasks import analysis_tasks
+
+        def broker_down(**kwargs):
+            raise ConnectionError("broker unavailable")
+
+        monkeypatch.setattr(analysis_tasks.run_deep_analysis, 'apply_async', broker_down)
+        monkeypatch.setattr(settings, 'deep_analysis_backend', 'celery')
+        assert analysis_jobs.enqueue_durable_job('run_deep_analysis', analysis_id='a2') is None
+
+        monkeypatch.setattr(settings, 'deep_analysis_backend', 'local')
+        assert analysis_jobs.enqueue_durable_job('run_deep_analysis', analysis_id='a3') is None
+
+    @pytest.mark.asyncio
+    async def test_in_memory_state_is_never_sent_to_the_worker(self, orchestrator, monkeypatch):
+        monkeypatch.setattr(settings, 'deep_analysis_backend', 'celery')
+        monkeypatch.setattr(orchestrator_module, 'enqueue_durable_job', lambda *a, **k: pytest.fail("enqueued"))
+
+        analysis_id = await orchestrator.initiate_analysis('dev', _repositories(), max_evaluate=5)
+        await asyncio.sleep(0.05)
+
+        assert (await orchestrator.get_analysis_status(analysis_id))['status'] == AnalysisStatus.COMPLETE
+
+
+class TestJobToken:
+    """The GitHub token stays out of the broker; the worker resolves it from the user id"""
+
+    @pytest.mark.asyncio
+    async def test_durable_job_carries_the_user_id_not_the_token(self, monkeypatch):
+        from app.services.analysis_state_storage import AnalysisStateStorage
+
+        mongomock_motor = pytest.importorskip("mongomock_motor")
+        published = {}
+
+        def enqueue(task_name, **kwargs):
+            published.update(kwargs)
+            return 'celery-task-2'
+
+        monkeypatch.setattr(orchestrator_module, 'enqueue_durable_job', enqueue)
+        storage = AnalysisStateStorage(mongomock_motor.AsyncMongoMockClient()['analysis_jobs'])
+        orchestrator = AnalysisOrchestrator(state_storage=storage)
+
+        await orchestrator.initiate_analysis(
+            'dev', _repositories(), github_token='gho_secret', token_user_id='user-1', analysis_id='token-1'
+        )
+
+        assert published['token_user_id'] == 'user-1'
+        assert 'gho_secret' not in repr(published)
+
+    @pytest.mark.asyncio
+    async def test_worker_resolves_the_stored_token(self, monkeypatch):
+        from app.database.connection_manager import mongo_connection_manager
+
+        mongomock_motor = pytest.importorskip("mongomock_motor")
+        database = mongomock_motor.AsyncMongoMockClient()['users_database']
+        await database.users.insert_one({'_id': 'user-1', 'github_token': 'gho_user'})
+        monkeypatch.setattr(mongo_connection_manager, 'get_database', lambda name=None: database)
+        monkeypatch.setattr(settings, 'github_token', 'ghp_system')
+
+        assert await analysis_jobs.resolve_job_github_token('user-1') == 'gho_user'
+        assert await analysis_jobs.resolve_job_github_token('user-2') == 'ghp_system'
+        assert await analysis_jobs.resolve_job_github_token(None) == 'ghp_system'
+
+
+class TestWorkerDatabase:
+    """Jobs use the database analysis states are stored on, never the in-memory fallback"""
+
+    @pytest.mark.asyncio
+    async def test_completion_event_uses_the_state_database(self, monkeypatch):
+        from app import db_connection
+
+        scans = _ScanCollection()
+
+        async def get_database():
+            return {'external_users': scans}
+
+        monkeypatch.setattr(db_connection, 'get_database', get_database)
+        state = {
+            'analysis_id': 'event-3', 'status': AnalysisStatus.FAILED, 'error': 'boom',
+            'scan_target': {'scan_collection': 'external_users'}
+        }
+
+        await analysis_jobs.handle_analysis_finished(state)
+
+        assert scans.updates[0][0]['analysis_id'] == 'event-3'
+
+    @pytest.mark.asyncio
+    async def test_in_memory_fallback_fails_the_job(self, monkeypatch):
+        from app import db_connection
+
+        class _MockDatabase:
+            is_mock = True
+
+        async def get_database():
+            return _MockDatabase()
+
+        monkeypatch.setattr(db_connection, 'get_database', get_database)
+
+        with pytest.raises(RuntimeError):
+            await analysis_jobs.run_orchestrated_analysis('a4', 'dev', _repositories())
@@ -0,0 +1,94 @@
+"""
+Tests for batched, fire-and-forget audit log writes
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.audit_log import AuditLogger
+from app.enhanced_logging import AUDIT_TRAIL_SIZE, EnhancedLogger
+
+
+class _AuditCollection:
+    """In-memory audit_logs collection recording insert_many batches"""
+
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+
+    async def insert_one(self, document):
+        raise AssertionError("audit entries must be written in batches")
+
+    async def insert_many(self, documents, ordered=True):
+        if self.fail:
+            raise RuntimeError("mongo unavailable")
+        self.batches.append(list(documents))
+
+
+class _Database:
+    def __init__(self, fail: bool = False):
+        self.audit_logs = _AuditCollection(fail)
+
+
+async def _log(audit: AuditLogger, count: int, start: int = 0):
+    for i in range(start, start + count):
+        await audit.log_operation("quick_scan", f"user{i}", "repository", resource_id=str(i))
+
+
+class TestAuditLogger:
+    """Ring buffer, size/time flush thresholds and shutdown drain"""
+
+    @pytest.mark.asyncio
+    async def test_flushes_on_batch_size_and_interval(self):
+        db = _Database()
+        audit = AuditLogger(db, batch_size=5, flush_interval=0.05)
+
+        await _log(audit, 5)
+        await asyncio.sleep(0.01)
+        assert [len(batch) for batch in db.audit_logs.batches] == [5]
+
+        # Fewer than batch_size entries are written once the interval elapses
+        await _log(audit, 2, start=5)
+        await asyncio.sleep(0.1)
+        assert [len(batch) for batch in db.audit_logs.batches] == [5, 2]
+
+        await audit.stop()
+        stats = audit.get_stats()
+        assert stats["written"] == 7 and stats["pending"] == 0 and not stats["running"]
+
+    @pytest.mark.asyncio
+    async def test_full_ring_drops_oldest_and_stop_drains(self):
+        db = _Database()
+        audit = AuditLogger(db, buffer_size=10, batch_size=100, flush_interval=60)
+
+        await _log(audit, 15)
+        stats = audit.get_stats()
+        assert stats["pending"] == 10
+        assert stats["dropped"] == 5
+        assert stats["backpressure_events"] == 2
+        assert db.audit_logs.batches == []
+
+        await audit.stop()
+        written = [entry["user_id"] for batch in db.audit_logs.batches for entry in batch]
+        assert written == [f"user{i}" for i in range(5, 15)]
+
+    @pytest.mark.asyncio
+    async def test_failed_writes_are_counted_not_raised(self):
+        audit = AuditLogger(_Database(fail=True), batch_size=3, flush_interval=60)
+
+        await _log(audit, 3)
+        await audit.stop()
+
+        assert audit.get_stats()["failed_writes"] == 3
+        assert audit.get_stats()["written"] == 0
+
+
+def test_enhanced_logger_audit_trail_is_bounded():
+    enhanced = EnhancedLogger("tests.enhanced_logging")
+
+    for i in range(AUDIT_TRAIL_SIZE + 50):
+        enhanced.log_internal_operation(f"scan {i}", user_id="internal_u1")
+
+    assert len(enhanced.audit_trail) == AUDIT_TRAIL_SIZE
+    assert enhanced.audit_trail[0]["message"] == "scan 50"
@@ -0,0 +1,153 @@
+"""
+Tests for per-request auth context, the verified-token LRU and the user document cache
+"""
+
+import time
+from datetime import timedelta
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core import security
+from app.core.auth_context import AuthContextMiddleware, UserDocumentCache, get_auth_context
+from app.core.security import VerifiedTokenCache, create_access_token, get_current_user_optional
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    """Count real JWT decodes and start from an empty verified-token cache"""
+    calls = []
+    original = security.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(security.jwt, "decode", counting_decode)
+    monkeypatch.setattr(security, "verified_token_cache", VerifiedTokenCache(max_size=16))
+    return calls
+
+
+def _token(user_id: str = "u1", **claims) -> str:
+    return create_access_token({"sub": user_id, "user_type": "developer", "email": "dev@example.com", **claims})
+
+
+class TestVerifiedTokenCache:
+    """Signature verification is cached per token until exp"""
+
+    def test_repeated_verification_decodes_once(self, decode_calls):
+        token = _token()
+
+        first = security.verify_token(token)
+        first["sub"] = "tampered"
+        second = security.verify_token(token)
+
+        assert len(decode_calls) == 1
+        assert second["sub"] == "u1"
+
+    def test_entries_expire_with_the_token_and_lru_is_bounded(self):
+        cache = VerifiedTokenCache(max_size=2)
+        cache.put("expired", {"sub": "a", "exp": time.time() - 1})
+        assert cache.get("expired") is None
+
+        for name in ("t1", "t2", "t3"):
+            cache.put(name, {"sub": name, "exp": time.time() + 60})
+        assert cache.get("t1") is None
+        assert cache.get("t3")["sub"] == "t3"
+        assert cache.get_stats()["size"] == 2
+
+    def test_invalid_tokens_are_not_cached(self, decode_calls):
+        token = _token() + "x"
+
+        for _ in range(2):
+            with pytest.raises(Exception):
+                security.verify_token(token)
+        assert len(decode_calls) == 2
+
+
+class TestAuthContextMiddleware:
+    """One verification per request, shared by every dependency"""
+
+    def _app(self) -> FastAPI:
+        app = FastAPI()
+        app.add_middleware(AuthContextMiddleware)
+
+        @app.get("/whoami")
+        async def whoami(request: Request):
+            # UserTypeDetector.route_user_operation resolves the user twice
+            first = await get_current_user_optional(request)
+            second = await get_current_user_optional(request)
+            context = get_auth_context(request)
+            return {
+                "same_user": first is second,
+                "user_id": getattr(first, "id", None),
+                "state_user_id": getattr(request.state, "user_id", None),
+                "error": context.error
+            }
+
+        return app
+
+    def test_token_verified_once_per_request(self, decode_calls):
+        client = TestClient(self._app())
+        token = _token("dev-42")
+
+        body = client.get("/whoami", headers={"Authorization": f"Bearer {token}"}).json()
+        assert body == {"same_user": True, "user_id": "dev-42", "state_user_id": "dev-42", "error": None}
+        assert len(decode_calls) == 1
+
+        # Later requests with the same token reuse the verified claims
+        client.get("/whoami", headers={"Authorization": f"Bearer {token}"})
+        assert len(decode_calls) == 1
+
+    def test_missing_and_invalid_tokens(self, decode_calls):
+        client = TestClient(self._app())
+
+        anonymous = client.get("/whoami").json()
+        assert anonymous["user_id"] is None and anonymous["error"] is None
+
+        expired = create_access_token({"sub": "u1", "user_type": "developer"}, expires_delta=timedelta(seconds=-5))
+        invalid = client.get("/whoami", headers={"Authorization": f"Bearer {expired}"}).json()
+        assert invalid["user_id"] is None
+        assert invalid["state_user_id"] is None
+        assert invalid["error"]
+
+
+class TestUserDocumentCache:
+    """Short-TTL user documents with explicit invalidation"""
+
+    @pytest.mark.asyncio
+    async def test_get_or_load_hits_cache_until_invalidated(self):
+        cache = UserDocumentCache(ttl=60)
+        loads = []
+
+        async def load():
+            loads.append(1)
+            return {"_id": "u1", "github_username": f"dev{len(loads)}"}
+
+        first = await cache.get_or_load("internal_users", "u1", load)
+        first["github_username"] = "mutated"
+        second = await cache.get_or_load("internal_users", "u1", load)
+        assert second["github_username"] == "dev1"
+        assert len(loads) == 1
+
+        cache.invalidate("u1")
+        third = await cache.get_or_load("internal_users", "u1", load)
+        assert third["github_username"] == "dev2"
+
+    @pytest.mark.asyncio
+    async def test_expired_and_missing_documents_are_reloaded(self):
+        cache = UserDocumentCache(ttl=0.01)
+        loads = []
+
+        async def load_missing():
+            loads.append(1)
+            return None
+
+        assert await cache.get_or_load("users", "ghost", load_missing) is None
+        assert await cache.get_or_load("users", "ghost", load_missing) is None
+        assert len(loads) == 2
+
+        cache.set("users", "u1", {"_id": "u1"})
+        time.sleep(0.02)
+        assert cache.get("users", "u1") is None
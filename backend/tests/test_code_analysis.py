@@ -0,0 +1,278 @@
+"""
+Tests for the grammar-driven source analyzer and its use by EvaluationEngine
+"""
+
+import asyncio
+
+import pytest
+
+from app.services import evaluation_engine
+from app.services.code_analysis import GRAMMARS, analyze_source, get_grammar
+from app.services.evaluation_engine import EvaluationEngine
+
+PYTHON_SOURCE = '''"""Module docstring"""
+import os
+
+
+class Repository(Base):
+    """Stores things"""
+
+    def save(self, item, force):
+        # persist the item
+        if item and force:
+            for key in item:
+                if key:
+                    return 1
+        elif force:
+            return 2
+        else:
+            return 3
+
+    def load(self):
+        return [x for x in self.items if x]
+
+
+def main():
+    text = """not a
+comment"""
+    return text
+'''
+
+JAVASCRIPT_SOURCE = '''// Service module
+class Service {
+  constructor(client, options) {
+    this.client = client;
+  }
+
+  fetch(id) {
+    if (id && this.client) {
+      return this.client.get("/items/" + id); // inline comment
+    } else if (id) {
+      return null;
+    }
+    return id ? 1 : 0;
+  }
+}
+
+/* block
+   comment */
+function helper(a) {
+  const twice = (y) => y * 2;
+  return twice(a);
+}
+'''
+
+GO_SOURCE = '''package main
+
+type Server struct {
+\tname string
+}
+
+func (s *Server) Handle(w Writer, r *Request) error {
+\tfor i := 0; i < 10; i++ {
+\t\tif r == nil {
+\t\t\treturn nil
+\t\t}
+\t}
+\treturn nil
+}
+'''
+
+RUBY_SOURCE = '''# A service
+class Service < Base
+  def initialize(client)
+    @client = client
+  end
+
+  def run(items)
+    items.each do |item|
+      puts item unless item.empty?
+    end
+    if items.any?
+      1
+    elsif @client
+      2
+    end
+  end
+end
+'''
+
+
+def _spans(metrics):
+    return [(f.name, f.start_line, f.end_line, f.parameters) for f in metrics.functions]
+
+
+class TestLineCounts:
+    """Code, comment and blank lines always add up to the file's lines"""
+
+    @pytest.mark.parametrize('language, source', [
+        ('Python', PYTHON_SOURCE),
+        ('JavaScript', JAVASCRIPT_SOURCE),
+        ('Go', GO_SOURCE),
+        ('Ruby', RUBY_SOURCE),
+    ])
+    def test_lines_add_up(self, language, source):
+        metrics = analyze_source(source, language)
+
+        assert metrics.total_lines == len(source.split('\n'))
+        assert metrics.code_lines + metrics.comment_lines + metrics.blank_lines == metrics.total_lines
+
+    def test_docstrings_are_comments_but_strings_are_code(self):
+        metrics = analyze_source(PYTHON_SOURCE, 'Python')
+
+        # Module docstring, class docstring and the `#` comment
+        assert metrics.comment_lines == 3
+        assert metrics.blank_lines == 7
+
+    def test_block_and_trailing_comments(self):
+        metrics = analyze_source(JAVASCRIPT_SOURCE, 'JavaScript')
+
+        # `// Service module` and the two-line block comment; the trailing
+        # comment shares its line with code
+        assert metrics.comment_lines == 3
+
+    def test_comment_markers_inside_strings_are_ignored(self):
+        metrics = analyze_source('url = "http://example.com"  # real\n', 'Python')
+
+        assert metrics.code_lines == 1
+        assert metrics.comment_lines == 0
+
+
+class TestFunctionSpans:
+    """Functions and classes are found with their names, lines and parameters"""
+
+    def test_python(self):
+        metrics = analyze_source(PYTHON_SOURCE, 'Python')
+
+        assert _spans(metrics) == [('save', 8, 17, 3), ('load', 19, 20, 1), ('main', 23, 26, 0)]
+        assert [(c.name, c.start_line, c.end_line, c.method_count) for c in metrics.classes] == [
+            ('Repository', 5, 20, 2)
+        ]
+
+    def test_javascript_methods_and_arrow_functions(self):
+        metrics = analyze_source(JAVASCRIPT_SOURCE, 'JavaScript')
+
+        assert _spans(metrics) == [
+            ('constructor', 3, 5, 2), ('fetch', 7, 14, 1), ('helper', 19, 22, 1), ('twice', 20, 20, 1)
+        ]
+        assert metrics.classes[0].method_count == 2
+
+    def test_go_receivers_and_structs(self):
+        metrics = analyze_source(GO_SOURCE, 'Go')
+
+        assert _spans(metrics) == [('Handle', 7, 14, 2)]
+        assert [c.name for c in metrics.classes] == ['Server']
+
+    def test_ruby_end_blocks(self):
+        metrics = analyze_source(RUBY_SOURCE, 'Ruby')
+
+        assert _spans(metrics) == [('initialize', 3, 5, 1), ('run', 7, 16, 1)]
+        assert [(c.name, c.end_line) for c in metrics.classes] == [('Service', 17)]
+
+
+class TestComplexity:
+    """Cyclomatic and cognitive complexity follow the grammar's branch tokens"""
+
+    def test_python_complexity(self):
+        metrics = analyze_source(PYTHON_SOURCE, 'Python')
+
+        save = metrics.functions[0]
+        # if, and, for, if, elif
+        assert save.cyclomatic_complexity == 6
+        assert metrics.max_nesting == 3
+        # if(1) and(1) for(2) if(3) elif(1) else(1) in save; for(1) if(1) in load
+        assert metrics.cognitive_complexity == 11
+
+    def test_javascript_complexity(self):
+        fetch = analyze_source(JAVASCRIPT_SOURCE, 'JavaScript').functions[1]
+
+        # if, &&, else if, ternary
+        assert fetch.cyclomatic_complexity == 5
+
+    def test_ruby_predicate_methods_are_not_ternaries(self):
+        metrics = analyze_source(RUBY_SOURCE, 'Ruby')
+
+        # unless, if, elsif
+        assert metrics.cyclomatic_complexity == 4
+
+    def test_halstead_counts(self):
+        metrics = analyze_source('a = b + 1\nc = a + b\n', 'Python')
+
+        assert (metrics.distinct_operators, metrics.total_operators) == (2, 4)
+        assert (metrics.distinct_operands, metrics.total_operands) == (4, 6)
+        halstead = metrics.halstead()
+        assert halstead['vocabulary'] == 6
+        assert halstead['length'] == 10
+
+
+class TestGrammars:
+    """Every analyzer language has a grammar; other languages fall back to line counts"""
+
+    def test_engine_languages_have_grammars(self):
+        assert set(EvaluationEngine().supported_languages) == set(GRAMMARS)
+
+    def test_unknown_language_falls_back(self):
+        assert get_grammar('COBOL').name == 'Generic'
+
+        metrics = analyze_source('# comment\nMOVE A TO B\n', 'COBOL')
+        assert (metrics.code_lines, metrics.comment_lines, metrics.functions) == (1, 1, [])
+
+
+class TestEvaluationEngineIntegration:
+    """The engine reads every per-file metric from one analysis"""
+
+    def test_generic_complexity_uses_spans(self):
+        engine = EvaluationEngine()
+
+        analysis = engine._analyze_code_complexity_strict(GO_SOURCE, 'Go', 'main.go')
+
+        assert [f['name'] for f in analysis['function_complexity']] == ['Handle']
+        assert analysis['class_complexity'][0]['name'] == 'Server'
+        assert analysis['nesting_depth'] == 2
+
+    @pytest.mark.asyncio
+    async def test_each_file_is_analyzed_once_per_evaluation(self, monkeypatch):
+        calls = []
+
+        def counting_analyze(content, language):
+            calls.append(language)
+            return analyze_source(content, language)
+
+        monkeypatch.setattr(evaluation_engine, 'analyze_source', counting_analyze)
+        engine = EvaluationEngine()
+        contents = [
+            {'name': 'main.go', 'path': 'main.go', 'content': GO_SOURCE, 'language': 'Go'},
+            {'name': 'service.rb', 'path': 'lib/service.rb', 'content': RUBY_SOURCE, 'language': 'Ruby'},
+        ]
+
+        await engine.evaluate_repository({'id': 1, 'name': 'repo'}, contents, {'commits': []}, {})
+
+        assert sorted(calls) == ['Go', 'Ruby']
+        assert evaluation_engine._metrics_memo.get() is None
+
+    @pytest.mark.asyncio
+    async def test_concurrent_evaluations_keep_separate_memos(self):
+        engine = EvaluationEngine()
+        memos = {}
+        inside = asyncio.Event()
+        release = asyncio.Event()
+
+        async def evaluate(name, wait):
+            with engine._memoized_source_metrics():
+                engine._source_metrics(GO_SOURCE if name == 'go' else RUBY_SOURCE, 'Go' if name == 'go' else 'Ruby')
+                memos[name] = evaluation_engine._metrics_memo.get()
+                if wait:
+                    inside.set()
+                    await release.wait()
+                else:
+                    await inside.wait()
+            if not wait:
+                release.set()
+            return evaluation_engine._metrics_memo.get()
+
+        first, second = await asyncio.gather(evaluate('go', True), evaluate('ruby', False))
+
+        assert memos['go'] is not memos['ruby']
+        assert [language for language, _ in memos['go']] == ['Go']
+        assert [language for language, _ in memos['ruby']] == ['Ruby']
+        assert first is None and second is None
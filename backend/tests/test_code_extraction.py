@@ -0,0 +1,310 @@
+"""
+Tests for streaming code extraction: download priority, the per-analysis
+budget, the in-flight window, parity with whole-repository scoring and
+incremental re-evaluation from commit diffs
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.orchestration import AnalysisOrchestrator
+from app.services.orchestration.code_extraction import (
+    PRIORITY_ENTRY_POINT,
+    PRIORITY_GENERATED,
+    PRIORITY_SOURCE,
+    PRIORITY_SUPPORTING,
+    ExtractionBudget,
+    file_priority,
+    stream_code_files,
+)
+from app.services.scoring import ACIDScorer
+
+SOURCES = {
+    'vendor/lib/util.py': 'def vendored():\n    return 1\n',
+    'examples/demo.py': 'print("demo")\n',
+    'src/core/models.py': 'class Model:\n    """A model"""\n\n    def save(self):\n        return True\n',
+    'main.py': 'import os\nfrom src import app\n\n\ndef main():\n    app.run()\n',
+    'src/api/routes.py': 'from fastapi import APIRouter\n\nrouter = APIRouter()\n',
+    'requirements.py': 'DEPS = ["fastapi"]\n',
+    'proto/user_pb2.py': '# Generated by the protocol buffer compiler\n',
+}
+
+
+class FakeRESTService:
+    """GitHubRESTService stand-in serving SOURCES and recording concurrency"""
+
+    def __init__(self, sources=None, fail=(), head='c1', changes=None):
+        self.sources = dict(sources or SOURCES)
+        self.fail = set(fail)
+        self.head = head
+        self.changes = changes
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.downloaded = []
+
+    async def list_code_files(self, owner, repo, token):
+        return [
+            {'path': path, 'size': len(code.encode()), 'sha': path, 'url': path}
+            for path, code in self.sources.items()
+        ]
+
+    async def get_head_commit(self, owner, repo, token):
+        return self.head
+
+    async def compare_commits(self, owner, repo, base, head, token):
+        return self.changes
+
+    async def download_file(self, owner, repo, file, token):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            if file['path'] in self.fail:
+                return None
+            self.downloaded.append(file['path'])
+            return {
+                'path': file['path'],
+                'content': self.sources[file['path']],
+                'size': file['size'],
+                'language': 'Python'
+            }
+        finally:
+            self.in_flight -= 1
+
+
+def _budget(max_bytes=10 ** 6, max_files=100):
+    return ExtractionBudget(max_bytes=max_bytes, max_files=max_files)
+
+
+async def _collect(rest, budget, max_files=50, window=8):
+    return [
+        item async for item in stream_code_files(rest, 'dev', 'repo', 'token', budget, max_files, window)
+    ]
+
+
+class TestFilePriority:
+    """Entry points and source directories come before generated or vendored code"""
+
+    def test_priority_tiers(self):
+        assert file_priority('main.py') == PRIORITY_ENTRY_POINT
+        assert file_priority('cmd/server/main.go') == PRIORITY_ENTRY_POINT
+        assert file_priority('src/core/models.py') == PRIORITY_SOURCE
+        assert file_priority('examples/demo.py') == PRIORITY_SUPPORTING
+        assert file_priority('vendor/lib/util.py') == PRIORITY_GENERATED
+        assert file_priority('proto/user_pb2.py') == PRIORITY_GENERATED
+
+    @pytest.mark.asyncio
+    async def test_files_stream_in_priority_order(self):
+        files = await _collect(FakeRESTService(), _budget(), window=1)
+
+        paths = [path for path, _, _ in files]
+        assert paths[0] == 'main.py'
+        assert paths.index('src/api/routes.py') < paths.index('examples/demo.py')
+        assert paths[-2:] == ['proto/user_pb2.py', 'vendor/lib/util.py']
+
+
+class TestExtractionBudget:
+    """Bytes, files and concurrency stay within the configured limits"""
+
+    @pytest.mark.asyncio
+    async def test_budget_is_shared_across_repositories(self):
+        budget = _budget(max_files=5)
+
+        first = await _collect(FakeRESTService(), budget)
+        second = await _collect(FakeRESTService(), budget)
+
+        assert len(first) == 5
+        assert second == []
+        assert budget.exhausted
+
+    @pytest.mark.asyncio
+    async def test_byte_budget_skips_files_that_do_not_fit(self):
+        max_bytes = len(SOURCES['main.py'].encode()) + len(SOURCES['requirements.py'].encode())
+        budget = _budget(max_bytes=max_bytes)
+
+        files = await _collect(FakeRESTService(), budget)
+
+        assert budget.bytes_used <= max_bytes
+        assert [path for path, _, _ in files] == ['main.py', 'requirements.py']
+
+    @pytest.mark.asyncio
+    async def test_downloads_are_bounded_by_the_window(self):
+        sources = {f'src/module_{i}.py': f'VALUE = {i}\n' for i in range(40)}
+        rest = FakeRESTService(sources)
+
+        files = await _collect(rest, _budget(), max_files=40, window=4)
+
+        assert len(files) == 40
+        assert rest.max_in_flight <= 4
+
+    @pytest.mark.asyncio
+    async def test_failed_downloads_return_their_reservation(self):
+        budget = _budget()
+        rest = FakeRESTService(fail={'main.py'})
+
+        files = await _collect(rest, budget)
+
+        assert 'main.py' not in [path for path, _, _ in files]
+        assert budget.files_used == len(SOURCES) - 1
+        assert budget.bytes_used == sum(len(code.encode()) for path, code in SOURCES.items() if path != 'main.py')
+
+    @pytest.mark.asyncio
+    async def test_files_left_out_by_the_budget_or_failures_are_pending(self):
+        pending = []
+        files = [
+            item async for item in stream_code_files(
+                FakeRESTService(fail={'main.py'}), 'dev', 'repo', 'token', _budget(max_files=3), 50, 8,
+                pending=pending
+            )
+        ]
+
+        delivered = [path for path, _, _ in files]
+        assert len(delivered) == 3
+        assert 'main.py' in pending
+        assert sorted(delivered + pending) == sorted(SOURCES)
+
+
+class _Database:
+    """Collections are never touched: results storage is replaced in the test"""
+
+    def __getattr__(self, name):
+        return None
+
+    def __getitem__(self, name):
+        return None
+
+
+def _orchestrator(rest, monkeypatch):
+    orchestrator = AnalysisOrchestrator(_Database(), rest)
+    orchestrator.stored = {}
+
+    async def store(repo_id, user_id, acid_scores, complexity, overall_score, language_stats, file_count, **kwargs):
+        orchestrator.stored.update(
+            acid=acid_scores, language_stats=language_stats, file_count=file_count, **kwargs
+        )
+
+    monkeypatch.setattr(orchestrator, '_store_analysis_results', store)
+    return orchestrator
+
+
+def _repo(**fields):
+    return {'id': 'r1', 'name': 'repo', 'full_name': 'dev/repo', 'has_readme': True, 'has_tests': True, **fields}
+
+
+def _expected_scores(sources):
+    files = [(path, 'Python', code) for path, code in sources.items()]
+    return ACIDScorer().calculate_acid_scores(files, {'has_readme': True, 'has_tests': True})
+
+
+class TestStreamingAnalysis:
+    """Streaming a repository scores it exactly like analyzing all its files at once"""
+
+    @pytest.mark.asyncio
+    async def test_streamed_scores_match_whole_repository_scores(self, monkeypatch):
+        orchestrator = _orchestrator(FakeRESTService(), monkeypatch)
+
+        result = await orchestrator._analyze_single_repository(_repo(), 'token', 'user-1', _budget())
+
+        stored = orchestrator.stored
+        assert result['success'] is True
+        assert stored['acid'] == _expected_scores(SOURCES)
+        assert stored['file_count'] == len(SOURCES)
+        assert stored['language_stats'] == {'Python': sum(len(code.split('\n')) for code in SOURCES.values())}
+        assert stored['commit_sha'] == 'c1'
+
+
+class TestIncrementalAnalysis:
+    """Rescans download only the files changed since the analyzed commit"""
+
+    async def _first_analysis(self, monkeypatch):
+        orchestrator = _orchestrator(FakeRESTService(), monkeypatch)
+        await orchestrator._analyze_single_repository(_repo(), 'token', 'user-1', _budget())
+        return orchestrator.stored['aggregates']
+
+    @pytest.mark.asyncio
+    async def test_rescan_applies_commit_diff(self, monkeypatch):
+        aggregates = await self._first_analysis(monkeypatch)
+
+        sources = dict(SOURCES)
+        sources['main.py'] = 'def main():\n    """Entry point"""\n    return 0\n'
+        sources['src/core/cache.py'] = 'CACHE = {}\n\n\ndef get(key):\n    return CACHE.get(key)\n'
+        del sources['examples/demo.py']
+        rest = FakeRESTService(sources, head='c2', changes={
+            'changed': [{'path': 'main.py', 'size': 0}, {'path': 'src/core/cache.py', 'size': 0}],
+            'removed': ['examples/demo.py']
+        })
+        orchestrator = _orchestrator(rest, monkeypatch)
+
+        repo = _repo(analyzed_commit_sha='c1', analysis_aggregates=aggregates)
+        await orchestrator._analyze_single_repository(repo, 'token', 'user-1', _budget())
+
+        assert sorted(rest.downloaded) == ['main.py', 'src/core/cache.py']
+        assert orchestrator.stored['acid'] == _expected_scores(sources)
+        assert orchestrator.stored['file_count'] == len(sources)
+        assert orchestrator.stored['commit_sha'] == 'c2'
+
+    @pytest.mark.asyncio
+    async def test_unchanged_repository_downloads_nothing(self, monkeypatch):
+        aggregates = await self._first_analysis(monkeypatch)
+        rest = FakeRESTService(head='c1')
+        orchestrator = _orchestrator(rest, monkeypatch)
+
+        repo = _repo(analyzed_commit_sha='c1', analysis_aggregates=aggregates)
+        await orchestrator._analyze_single_repository(repo, 'token', 'user-1', _budget())
+
+        assert rest.downloaded == []
+        assert orchestrator.stored['acid'] == _expected_scores(SOURCES)
+
+    @pytest.mark.asyncio
+    async def test_truncated_analysis_is_completed_by_the_next_rescan(self, monkeypatch):
+        orchestrator = _orchestrator(FakeRESTService(), monkeypatch)
+        await orchestrator._analyze_single_repository(_repo(), 'token', 'user-1', _budget(max_files=4))
+        first = orchestrator.stored
+
+        assert first['commit_sha'] == 'c1'
+        assert len(first['pending_files']) == len(SOURCES) - 4
+
+        rest = FakeRESTService(head='c1')
+        orchestrator = _orchestrator(rest, monkeypatch)
+        repo = _repo(analyzed_commit_sha='c1', analysis_aggregates=first['aggregates'],
+                     analysis_pending_files=first['pending_files'])
+        await orchestrator._analyze_single_repository(repo, 'token', 'user-1', _budget())
+
+        assert sorted(rest.downloaded) == sorted(first['pending_files'])
+        assert orchestrator.stored['pending_files'] == []
+        assert orchestrator.stored['acid'] == _expected_scores(SOURCES)
+
+    @pytest.mark.asyncio
+    async def test_failed_download_of_a_modified_file_is_retried(self, monkeypatch):
+        aggregates = await self._first_analysis(monkeypatch)
+
+        sources = dict(SOURCES)
+        sources['main.py'] = 'def main():\n    """Entry point"""\n    return 0\n'
+        changes = {'changed': [{'path': 'main.py', 'size': 0}], 'removed': []}
+        orchestrator = _orchestrator(FakeRESTService(sources, fail={'main.py'}, head='c2', changes=changes), monkeypatch)
+        await orchestrator._analyze_single_repository(
+            _repo(analyzed_commit_sha='c1', analysis_aggregates=aggregates), 'token', 'user-1', _budget()
+        )
+        assert orchestrator.stored['pending_files'] == ['main.py']
+
+        rest = FakeRESTService(sources, head='c2')
+        retry = _orchestrator(rest, monkeypatch)
+        repo = _repo(analyzed_commit_sha='c2', analysis_aggregates=orchestrator.stored['aggregates'],
+                     analysis_pending_files=['main.py'])
+        await retry._analyze_single_repository(repo, 'token', 'user-1', _budget())
+
+        assert rest.downloaded == ['main.py']
+        assert retry.stored['acid'] == _expected_scores(sources)
+
+    @pytest.mark.asyncio
+    async def test_unusable_diff_falls_back_to_full_scan(self, monkeypatch):
+        aggregates = await self._first_analysis(monkeypatch)
+        rest = FakeRESTService(head='c9', changes=None)  # e.g. history rewritten by a force push
+        orchestrator = _orchestrator(rest, monkeypatch)
+
+        repo = _repo(analyzed_commit_sha='c1', analysis_aggregates=aggregates)
+        await orchestrator._analyze_single_repository(repo, 'token', 'user-1', _budget())
+
+        assert sorted(rest.downloaded) == sorted(SOURCES)
+        assert orchestrator.stored['acid'] == _expected_scores(SOURCES)
@@ -0,0 +1,181 @@
+"""
+Tests for ConcurrentDataFetcher future-based completion, cancellation,
+result retention and adaptive worker scaling
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.concurrent_data_fetcher import ConcurrentDataFetcher
+
+
+async def _echo(value, delay: float = 0.0):
+    await asyncio.sleep(delay)
+    return value
+
+
+class TestConcurrentDataFetcher:
+    """Completion, cancellation and retention behaviour"""
+
+    @pytest.mark.asyncio
+    async def test_get_result_wakes_without_polling(self):
+        fetcher = ConcurrentDataFetcher(max_concurrent_requests=4, min_workers=1)
+        await fetcher.start()
+        try:
+            started = time.monotonic()
+            request_id = await fetcher.submit_request('fast', _echo, 42)
+            result = await fetcher.get_result(request_id, timeout=5)
+
+            assert result.success and result.result == 42
+            assert time.monotonic() - started < 0.05
+            assert fetcher.get_stats()['pending_results'] == 0
+        finally:
+            await fetcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_submit_batch_keeps_order_and_deduplicates_ids(self):
+        fetcher = ConcurrentDataFetcher(max_concurrent_requests=4, min_workers=1)
+        await fetcher.start()
+        try:
+            first, second = await asyncio.gather(
+                fetcher.submit_batch([('same', _echo, (1, 0.05), {})]),
+                fetcher.submit_batch([('same', _echo, (2, 0.01), {})])
+            )
+
+            assert [r.result for r in first + second] == [1, 2]
+            assert {first[0].request_id, second[0].request_id} == {'same', 'same#2'}
+        finally:
+            await fetcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_cancels_running_request(self):
+        fetcher = ConcurrentDataFetcher(max_concurrent_requests=2, min_workers=1)
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def slow():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        await fetcher.start()
+        try:
+            request_id = await fetcher.submit_request('slow', slow, max_retries=0)
+            waiter = asyncio.create_task(fetcher.get_result(request_id))
+            await asyncio.wait_for(started.wait(), timeout=1)
+
+            waiter.cancel()
+            await asyncio.wait_for(cancelled.wait(), timeout=1)
+            await asyncio.sleep(0.01)
+
+            assert fetcher.get_stats()['cancelled_requests'] == 1
+            assert fetcher.active_requests == {}
+        finally:
+            await fetcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_timed_out_request_is_skipped_while_queued(self):
+        fetcher = ConcurrentDataFetcher(max_concurrent_requests=1, min_workers=1)
+        calls = []
+
+        def record(name):
+            calls.append(name)
+            return name
+
+        await fetcher.start()
+        try:
+            blocker = await fetcher.submit_request('blocker', _echo, 'done', 0.1)
+            queued = await fetcher.submit_request('queued', record, 'queued')
+
+            with pytest.raises(asyncio.TimeoutError):
+                await fetcher.get_result(queued, timeout=0.01)
+            assert (await fetcher.get_result(blocker, timeout=5)).result == 'done'
+            await asyncio.sleep(0.05)
+
+            assert calls == []
+        finally:
+            await fetcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_uncollected_results_expire(self):
+        fetcher = ConcurrentDataFetcher(min_workers=1, result_ttl=0.05)
+        await fetcher.start()
+        try:
+            request_id = await fetcher.submit_request('orphan', _echo, 'x')
+            await asyncio.sleep(0.02)
+            assert fetcher.get_stats()['retained_results'] == 1
+
+            await asyncio.sleep(0.1)
+            stats = fetcher.get_stats()
+
+            assert stats['retained_results'] == 0
+            assert stats['expired_results'] == 1
+            with pytest.raises(KeyError):
+                await fetcher.get_result(request_id)
+        finally:
+            await fetcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_latency_stats_split_queue_wait_and_service_time(self):
+        fetcher = ConcurrentDataFetcher(max_concurrent_requests=1, min_workers=1)
+        await fetcher.start()
+        try:
+            await fetcher.submit_batch([(f'r{i}', _echo, (i, 0.02), {}) for i in range(5)])
+            latency = fetcher.get_latency_stats()
+
+            assert latency['service_time']['samples'] == 5
+            assert latency['service_time']['p95'] >= 0.02
+            # One worker: later requests wait for the earlier ones
+            assert latency['queue_wait']['max'] >= 0.06
+            assert latency['total']['p95'] >= latency['service_time']['p95']
+        finally:
+            await fetcher.stop()
+
+
+class TestAdaptiveWorkers:
+    """Worker pool scaling with queue depth and rate-limit headroom"""
+
+    @pytest.mark.asyncio
+    async def test_scales_up_with_queue_depth_and_back_down_when_idle(self):
+        fetcher = ConcurrentDataFetcher(max_concurrent_requests=8, min_workers=1, idle_timeout=0.05)
+        await fetcher.start()
+        try:
+            assert fetcher.get_stats()['worker_count'] == 1
+
+            ids = [await fetcher.submit_request(f'r{i}', _echo, i, 0.05) for i in range(8)]
+            assert fetcher.get_stats()['worker_count'] == 8
+
+            await asyncio.gather(*[fetcher.get_result(i, timeout=5) for i in ids])
+            await asyncio.sleep(0.3)
+
+            assert fetcher.get_stats()['worker_count'] == 1
+        finally:
+            await fetcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_low_rate_limit_headroom_caps_workers(self):
+        fetcher = ConcurrentDataFetcher(max_concurrent_requests=10, min_workers=2)
+        reset = int((datetime.now() + timedelta(hours=1)).timestamp())
+        fetcher.rate_limiter.update_limits('github_rest', {
+            'X-RateLimit-Limit': '5000',
+            'X-RateLimit-Remaining': '1000',
+            'X-RateLimit-Reset': str(reset)
+        })
+        await fetcher.start()
+        try:
+            ids = [await fetcher.submit_request(f'r{i}', _echo, i, 0.02) for i in range(10)]
+            stats = fetcher.get_stats()
+
+            # 20% headroom: 2 + int(8 * 0.2) workers
+            assert stats['rate_limit_headroom'] == 0.2
+            assert stats['worker_count'] == 3
+            results = await asyncio.gather(*[fetcher.get_result(i, timeout=5) for i in ids])
+            assert all(r.success for r in results)
+        finally:
+            await fetcher.stop()
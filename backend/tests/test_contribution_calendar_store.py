@@ -0,0 +1,225 @@
+"""
+Tests for the incrementally synced contribution calendar store
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from app.services import github_graphql_client
+from app.services.contribution_calendar_store import (
+    ContributionCalendar,
+    ContributionCalendarStore,
+)
+from app.services.github_graphql_client import GitHubGraphQLClient
+
+TODAY = date.today()
+
+
+def _days(counts, start):
+    return [
+        ((start + timedelta(days=i)).isoformat(), count, f'#c{min(count, 4)}')
+        for i, count in enumerate(counts)
+    ]
+
+
+def reference_streaks(calendar_data):
+    """The from-scratch streak scan the GraphQL client used to run per request"""
+    current_streak = longest_streak = temp_streak = 0
+    streak_ranges = []
+    streak_start = None
+    for i, day in enumerate(calendar_data):
+        if day['count'] > 0:
+            if temp_streak == 0:
+                streak_start = day['date']
+            temp_streak += 1
+            longest_streak = max(longest_streak, temp_streak)
+        else:
+            if temp_streak > 0:
+                streak_ranges.append({"start": streak_start, "end": calendar_data[i - 1]['date'], "length": temp_streak})
+            temp_streak = 0
+    if temp_streak > 0:
+        streak_ranges.append({"start": streak_start, "end": calendar_data[-1]['date'], "length": temp_streak})
+    for day in reversed(calendar_data):
+        if date.fromisoformat(day['date']) > TODAY:
+            continue
+        if day['count'] > 0:
+            current_streak += 1
+        else:
+            break
+    return {
+        "current_streak": current_streak,
+        "longest_streak": longest_streak,
+        "streak_ranges": sorted(streak_ranges, key=lambda x: x['length'], reverse=True)[:10]
+    }
+
+
+def reference_monthly_and_weekdays(calendar_data):
+    weekday_totals = defaultdict(int)
+    monthly = defaultdict(int)
+    for day in calendar_data:
+        day_date = date.fromisoformat(day['date'])
+        weekday_totals[day_date.weekday()] += day['count']
+        monthly[day_date.strftime('%Y-%m')] += day['count']
+    return [weekday_totals[i] for i in range(7)], dict(monthly)
+
+
+class TestIncrementalMerge:
+    """Merging new days and trimming old ones keeps every aggregate exact"""
+
+    @given(
+        st.lists(st.integers(min_value=0, max_value=12), min_size=1, max_size=120),
+        st.lists(
+            st.tuples(st.integers(min_value=0, max_value=12), st.lists(st.integers(0, 12), max_size=20)),
+            max_size=6
+        ),
+        st.integers(min_value=20, max_value=100),
+    )
+    @settings(max_examples=100, deadline=None)
+    def test_property_incremental_matches_rebuild(self, initial, syncs, window):
+        """Each sync refetches the last stored day and appends new ones, as the client does"""
+        total_days = len(initial) + sum(len(new_days) for _, new_days in syncs)
+        start = TODAY - timedelta(days=total_days - 1)
+        truth = list(initial)
+
+        record = ContributionCalendar('octocat')
+        record.merge(_days(initial, start))
+        for last_day_count, new_days in syncs:
+            since = len(truth) - 1
+            truth[since] = last_day_count
+            truth.extend(new_days)
+            record.merge(_days(truth[since:], start + timedelta(days=since)))
+            record.trim(start + timedelta(days=max(0, len(truth) - window)))
+
+        window_start = max(0, len(truth) - window)
+        kept = truth[window_start:]
+        rebuilt = ContributionCalendar('octocat')
+        rebuilt.merge(_days(kept, start + timedelta(days=window_start)))
+        calendar_data = rebuilt.calendar_days()
+
+        assert record.calendar_days() == calendar_data
+        assert record.runs == rebuilt.runs
+        assert record.streaks(TODAY) == reference_streaks(calendar_data)
+        assert record.patterns() == rebuilt.patterns()
+        assert record.count_days == rebuilt.count_days
+        assert record.total_contributions == sum(kept)
+        assert (record.weekday_totals, record.monthly_totals) == reference_monthly_and_weekdays(calendar_data)
+
+    def test_round_trip_keeps_aggregates(self):
+        record = ContributionCalendar('octocat')
+        record.merge(_days([0, 3, 4, 0, 11, 2], TODAY - timedelta(days=5)))
+        record.summary = {'total_commits': 7}
+
+        restored = ContributionCalendar.from_dict(record.to_dict())
+
+        assert restored.calendar_days() == record.calendar_days()
+        assert restored.streaks(TODAY) == record.streaks(TODAY)
+        assert restored.patterns() == record.patterns()
+        assert restored.count_days == record.count_days
+        assert restored.summary == {'total_commits': 7}
+
+    def test_gaps_are_stored_as_empty_days(self):
+        record = ContributionCalendar('octocat')
+        record.merge(_days([1], TODAY - timedelta(days=3)))
+        record.merge(_days([2], TODAY))
+
+        assert [day['count'] for day in record.calendar_days()] == [1, 0, 0, 2]
+        assert record.streaks(TODAY)['current_streak'] == 1
+
+
+def _graphql_calendar(counts, start, full=False):
+    weeks = [{'contributionDays': [
+        {'date': day, 'contributionCount': count, 'color': color, 'weekday': 0}
+        for day, count, color in _days(counts, start)
+    ]}]
+    collection = {'contributionCalendar': {'totalContributions': sum(counts), 'weeks': weeks}}
+    user = {'contributionsCollection': collection}
+    if full:
+        collection.update({
+            'totalCommitContributions': 5,
+            'totalIssueContributions': 1,
+            'totalPullRequestContributions': 2,
+            'totalPullRequestReviewContributions': 0,
+            'totalRepositoryContributions': 1,
+            'commitContributionsByRepository': [],
+            'pullRequestContributionsByRepository': [],
+        })
+        user['repositoriesContributedTo'] = {'totalCount': 0, 'nodes': []}
+    return {'user': user}
+
+
+class TestClientSync:
+    """The GraphQL client reads stored calendars and fetches only new days"""
+
+    @pytest.fixture
+    def store(self, tmp_path, monkeypatch):
+        store = ContributionCalendarStore(cache_dir=str(tmp_path), redis_cache=_NoRedis())
+        monkeypatch.setattr(github_graphql_client, 'contribution_calendar_store', store)
+        return store
+
+    @pytest.mark.asyncio
+    async def test_full_then_local_then_incremental(self, store, monkeypatch):
+        queries = []
+        responses = [
+            _graphql_calendar([1, 0, 2, 3], TODAY - timedelta(days=4), full=True),
+            _graphql_calendar([5, 4], TODAY - timedelta(days=1)),
+        ]
+
+        async def execute_query(query, variables=None):
+            queries.append((query, variables))
+            return responses[len(queries) - 1]
+
+        client = GitHubGraphQLClient('token')
+        monkeypatch.setattr(client, 'execute_query', execute_query)
+
+        first = await client.get_contribution_calendar('octocat')
+        second = await client.get_contribution_calendar('octocat')
+
+        assert len(queries) == 1
+        assert second['calendar_data'] == first['calendar_data']
+        assert first['total_commits'] == 5
+        assert first['contribution_streaks']['current_streak'] == 2
+
+        # Pretend the sync interval passed and the process restarted
+        record = await store.load('octocat')
+        record.synced_at -= 3600
+        await store.save(record)
+        store.clear_memory()
+
+        third = await client.get_contribution_calendar('octocat')
+
+        query, variables = queries[1]
+        assert 'totalCommitContributions' not in query
+        assert variables['from'] == f"{(TODAY - timedelta(days=1)).isoformat()}T00:00:00Z"
+        assert [day['count'] for day in third['calendar_data']] == [1, 0, 2, 5, 4]
+        assert third['total_contributions'] == 12
+        assert third['contribution_streaks']['current_streak'] == 3
+        assert third['total_commits'] == 5
+
+    @pytest.mark.asyncio
+    async def test_failed_incremental_sync_serves_stored_calendar(self, store, monkeypatch):
+        calls = []
+
+        async def execute_query(query, variables=None):
+            calls.append(variables)
+            if len(calls) > 1:
+                raise Exception("GraphQL query failed: 502")
+            return _graphql_calendar([1, 2], TODAY - timedelta(days=1), full=True)
+
+        client = GitHubGraphQLClient('token')
+        monkeypatch.setattr(client, 'execute_query', execute_query)
+
+        await client.get_contribution_calendar('octocat')
+        (await store.load('octocat')).synced_at -= 3600
+
+        calendar = await client.get_contribution_calendar('octocat')
+
+        assert len(calls) == 2
+        assert calendar['total_contributions'] == 3
+
+
+class _NoRedis:
+    """CacheService stand-in with no Redis connection, so the store uses its directory"""
+    redis_client = None
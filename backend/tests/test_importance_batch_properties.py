@@ -0,0 +1,77 @@
+"""
+Property-Based Tests for Batch Importance Scoring
+Batch (vectorized) scoring must agree with the per-repository scorers
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from hypothesis import given, settings, strategies as st
+
+from app.services.repository_importance_scorer import RepositoryImportanceScorer
+from backend.scoring.scoring import ImportanceScorer
+
+NOW = datetime.utcnow()
+
+updated_at_values = st.one_of(
+    st.none(),
+    st.just('not-a-date'),
+    st.integers(min_value=0, max_value=3000).map(lambda days: NOW - timedelta(days=days, hours=1)),
+    st.integers(min_value=0, max_value=3000).map(
+        lambda days: (datetime.now(timezone.utc) - timedelta(days=days, hours=1)).isoformat()
+    ),
+)
+
+repositories = st.fixed_dictionaries(
+    {
+        'name': st.text(min_size=1, max_size=10),
+        'stars': st.integers(min_value=0, max_value=100000),
+        'forks': st.integers(min_value=0, max_value=20000),
+        'watchers': st.integers(min_value=0, max_value=100000),
+        'size': st.integers(min_value=0, max_value=500000),
+        'updated_at': updated_at_values,
+    },
+    optional={
+        'description': st.one_of(st.none(), st.sampled_from(['', 'short', 'Tested with pytest and CI/CD'])),
+        'topics': st.lists(st.sampled_from(['python', 'testing', 'ci', 'web']), max_size=6),
+        'has_readme': st.booleans(),
+        'license': st.one_of(st.none(), st.just('MIT')),
+        'file_count': st.one_of(st.none(), st.integers(min_value=0, max_value=500)),
+        'has_tests': st.booleans(),
+        'has_ci_cd': st.booleans(),
+    }
+)
+
+
+class TestImportanceBatchProperties:
+    """Batch scoring parity with the scalar scoring paths"""
+
+    @given(st.lists(repositories, max_size=40))
+    @settings(max_examples=50, deadline=None)
+    def test_property_stage1_batch_matches_scalar(self, repos):
+        """calculate_scores_batch() equals calculate_score() for every repository"""
+        scorer = ImportanceScorer()
+
+        batch_scores = scorer.calculate_scores_batch(repos)
+
+        assert batch_scores == [scorer.calculate_score(repo) for repo in repos]
+        assert scorer.categorize_batch(batch_scores) == [scorer.categorize(score) for score in batch_scores]
+
+    @given(st.lists(repositories, max_size=40))
+    @settings(max_examples=50, deadline=None)
+    def test_property_repository_importance_batch_matches_scalar(self, repos):
+        """calculate_importance_scores() equals calculate_importance_score() for every repository"""
+        scorer = RepositoryImportanceScorer()
+
+        assert scorer.calculate_importance_scores(repos) == [
+            scorer.calculate_importance_score(repo) for repo in repos
+        ]
+
+    def test_invalid_repository_scores_zero_in_batch(self):
+        """Invalid repositories score 0.0 without failing the rest of the batch"""
+        scorer = ImportanceScorer()
+        valid = {'name': 'ok', 'stars': 10, 'forks': 2, 'size': 2000, 'updated_at': NOW}
+
+        scores = scorer.calculate_scores_batch([valid, {'name': 'missing-fields'}])
+
+        assert scores[0] == scorer.calculate_score(valid)
+        assert scores[1] == 0.0
@@ -0,0 +1,118 @@
+"""
+Tests for the queue-based logging pipeline, sampling and the JSON formatter
+"""
+
+import json
+import logging
+
+import pytest
+
+from app.core import logging_config
+from app.core.logging_config import (
+    AsyncQueueHandler,
+    JSONFormatter,
+    SamplingFilter,
+    get_logging_stats,
+    setup_logging,
+    shutdown_logging,
+)
+
+
+@pytest.fixture
+def restore_logging():
+    """Put the root logger back the way pytest configured it"""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    # The perf benchmarks disable INFO for the whole session
+    disabled = logging.root.manager.disable
+    logging.disable(logging.NOTSET)
+    yield
+    shutdown_logging()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+    logging.disable(disabled)
+
+
+def _record(msg: str, *args, level: int = logging.INFO, name: str = "app.services.test") -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+class TestSamplingFilter:
+    """Per-template rate limiting of repetitive records"""
+
+    def test_repetitive_template_is_limited_and_counted(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(logging_config.time, "monotonic", lambda: now[0])
+        sampling = SamplingFilter(max_per_window=3, window=10.0)
+
+        passed = [sampling.filter(_record("Processing repo %s", i)) for i in range(10)]
+        assert passed.count(True) == 3
+        assert sampling.suppressed_total == 7
+
+        # A different template and warnings are never sampled out
+        assert sampling.filter(_record("Finished %s", "x"))
+        assert all(sampling.filter(_record("Processing repo %s", i, level=logging.WARNING)) for i in range(5))
+
+        # Next window: the first record reports what was dropped
+        now[0] += 11
+        record = _record("Processing repo %s", 99)
+        assert sampling.filter(record)
+        assert record.sampled_suppressed == 7
+
+
+class TestAsyncPipeline:
+    """Writer-thread pipeline with the JSON formatter"""
+
+    def test_records_are_written_by_listener_as_json(self, tmp_path, restore_logging):
+        log_file = tmp_path / "app.log"
+        setup_logging(
+            log_file=str(log_file),
+            enable_json_logging=True,
+            enable_console_logging=False,
+            sample_max_per_window=5
+        )
+        root = logging.getLogger()
+        assert [type(h) for h in root.handlers] == [AsyncQueueHandler]
+
+        logger = logging.getLogger("app.services.pipeline")
+        for i in range(20):
+            logger.info("Fetched %s PRs for %s", i, "repo", extra={"attempt": i})
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Scan %s failed", "alice")
+
+        stats = get_logging_stats()
+        shutdown_logging()
+
+        entries = [json.loads(line) for line in log_file.read_text().splitlines()]
+        fetched = [e for e in entries if e["message"].startswith("Fetched")]
+        assert [e["message"] for e in fetched] == [f"Fetched {i} PRs for repo" for i in range(5)]
+        assert fetched[0]["extra"]["attempt"] == 0
+        failure = next(e for e in entries if e["message"] == "Scan alice failed")
+        assert "ValueError: boom" in failure["exception"]
+        assert stats["async"] and stats["sampled_out"] == 15
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        import queue
+
+        handler = AsyncQueueHandler(queue.Queue(maxsize=2))
+        for i in range(5):
+            handler.handle(_record("event %s", i))
+
+        assert handler.queue.qsize() == 2
+        assert handler.dropped == 3
+
+
+def test_json_formatter_serializes_non_json_extras():
+    record = _record("Ranking %s", "done")
+    record.payload = {1: object(), "when": logging}
+
+    data = json.loads(JSONFormatter().format(record))
+
+    assert data["message"] == "Ranking done"
+    assert set(data["extra"]["payload"]) == {"1", "when"}
@@ -0,0 +1,173 @@
+"""
+Tests for the shared, deployment-aware MongoDB connection manager
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app import db_connection
+from app.core.config import settings
+from app.database.connection import DatabaseManager
+from app.database.connection_manager import (
+    HeartbeatMonitor,
+    MongoConnectionManager,
+    PoolWaitMonitor,
+    detect_deployment,
+    get_pool_config,
+)
+
+
+class _FakeAdmin:
+    def __init__(self):
+        self.pings = 0
+
+    async def command(self, name):
+        assert name == "ping"
+        self.pings += 1
+        return {"ok": 1}
+
+
+class _FakeClient(dict):
+    """Stand-in for AsyncIOMotorClient recording pings and options"""
+
+    def __init__(self, url, **params):
+        super().__init__()
+        self.url = url
+        self.params = params
+        self.admin = _FakeAdmin()
+        self.closed = False
+
+    def __missing__(self, name):
+        self[name] = SimpleNamespace(name=name)
+        return self[name]
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = MongoConnectionManager()
+    monkeypatch.setattr(manager, "_create_client", lambda url, **params: _FakeClient(url, **params))
+    return manager
+
+
+class TestPoolConfig:
+    """Pool sizes follow the deployment unless configured"""
+
+    def test_deployment_detection_and_defaults(self, monkeypatch):
+        for name in ("VERCEL", "VERCEL_ENV", "AWS_LAMBDA_FUNCTION_NAME", "KUBERNETES_SERVICE_HOST"):
+            monkeypatch.delenv(name, raising=False)
+        monkeypatch.setattr(settings, "mongo_deployment", "auto")
+        monkeypatch.setattr(settings, "mongo_max_pool_size", None)
+        monkeypatch.setattr(settings, "mongo_min_pool_size", None)
+
+        assert detect_deployment() == "server"
+        monkeypatch.setenv("KUBERNETES_SERVICE_HOST", "10.0.0.1")
+        assert detect_deployment() == "kubernetes"
+        assert get_pool_config()["maxPoolSize"] == 100
+        monkeypatch.setenv("VERCEL", "1")
+        assert detect_deployment() == "serverless"
+        assert (get_pool_config()["maxPoolSize"], get_pool_config()["minPoolSize"]) == (1, 0)
+
+    def test_explicit_settings_override_defaults(self, monkeypatch):
+        monkeypatch.setattr(settings, "mongo_deployment", "serverless")
+        monkeypatch.setattr(settings, "mongo_max_pool_size", 8)
+        monkeypatch.setattr(settings, "mongo_min_pool_size", 20)
+
+        config = get_pool_config()
+        assert config["maxPoolSize"] == 8
+        assert config["minPoolSize"] == 8
+
+
+class TestMonitors:
+    """Pool wait metrics and heartbeat-based health"""
+
+    def test_pool_wait_metrics(self):
+        monitor = PoolWaitMonitor()
+        for _ in range(3):
+            monitor.connection_check_out_started(None)
+            monitor.connection_checked_out(None)
+        monitor.connection_checked_in(None)
+        monitor.connection_check_out_failed(None)
+
+        stats = monitor.get_stats()
+        assert stats["checkouts"] == 3
+        assert stats["in_use"] == 2
+        assert stats["checkout_failures"] == 1
+        assert stats["max_wait_ms"] >= stats["avg_wait_ms"] >= 0
+
+    def test_health_follows_heartbeats(self):
+        monitor = HeartbeatMonitor()
+        assert monitor.healthy is None
+
+        monitor.succeeded(SimpleNamespace(duration=0.004))
+        monitor.failed(SimpleNamespace(reply=ConnectionError("reset")))
+        assert monitor.healthy is True
+
+        monitor.failed(SimpleNamespace(reply=ConnectionError("reset")))
+        assert monitor.healthy is False
+        assert monitor.get_stats()["last_error"] == "reset"
+
+        monitor.succeeded(SimpleNamespace(duration=0.004))
+        assert monitor.healthy is True
+
+
+class TestSharedClient:
+    """One client for every database entry point, pinged only at connect"""
+
+    @pytest.mark.asyncio
+    async def test_connect_once_and_share_client(self, manager, monkeypatch):
+        from app.database import connection
+
+        monkeypatch.setattr(connection, "mongo_connection_manager", manager)
+        database_manager = DatabaseManager()
+
+        await database_manager.connect_to_database()
+        await manager.connect("mongodb://other", "other_db")
+
+        assert manager.client.admin.pings == 1
+        assert database_manager.client is manager.client
+        assert manager.get_database("git_Evaluator").name == "git_Evaluator"
+        assert manager.get_stats()["connected"]
+
+        await database_manager.close_database_connection()
+        assert not manager.connected
+
+    @pytest.mark.asyncio
+    async def test_each_caller_gets_the_database_it_asked_for(self, manager):
+        first = await manager.connect("mongodb://localhost", "git_Evaluator")
+        second = await manager.connect("mongodb://localhost", "broskies_hub")
+
+        assert (first.name, second.name) == ("git_Evaluator", "broskies_hub")
+        assert (await manager.connect()).name == settings.database_name
+        assert manager.client.admin.pings == 1
+
+    @pytest.mark.asyncio
+    async def test_db_connection_cleanup_keeps_the_shared_client_open(self, manager, monkeypatch):
+        await manager.connect("mongodb://localhost", "git_Evaluator")
+        monkeypatch.setattr(db_connection.db, "client", manager.client)
+        monkeypatch.setattr(db_connection.db, "database", manager.get_database("git_Evaluator"))
+        client = manager.client
+
+        await db_connection._cleanup_stale_connections()
+        monkeypatch.setattr(db_connection.db, "client", manager.client)
+        await db_connection.close_mongo_connection()
+
+        assert not client.closed
+        assert manager.connected
+        assert db_connection.db.client is None and db_connection.db.database is None
+
+    @pytest.mark.asyncio
+    async def test_get_database_does_not_ping_after_idle(self, manager, monkeypatch):
+        await manager.connect("mongodb://localhost", "git_Evaluator")
+        monkeypatch.setattr(db_connection.db, "client", manager.client)
+        monkeypatch.setattr(db_connection.db, "database", manager.get_database())
+        # Idle far longer than the old 5 minute staleness window
+        monkeypatch.setattr(db_connection.db, "last_activity", 0)
+
+        database = await db_connection.get_database()
+
+        assert database is manager.database
+        assert manager.client.admin.pings == 1
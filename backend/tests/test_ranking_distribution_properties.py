@@ -0,0 +1,212 @@
+"""
+Property-Based Tests for Vectorized Ranking Math
+ScoreDistribution must reproduce the per-user rank, percentile and statistics
+semantics every ranking service used before
+"""
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from app.services.enhanced_ranking_service import EnhancedRankingService
+from app.services.ranking import RegionalRankingCalculator, ScoreDistribution, UniversityRankingCalculator
+from app.services.ranking import score_distribution
+from app.services.ranking.score_distribution import NUMPY_AVAILABLE
+from app.services.ranking_service import RankingService
+
+# Round scores make ties and bucket edges likely
+score_values = st.one_of(
+    st.sampled_from([0.0, 19.9, 20.0, 40.0, 50.0, 60.0, 79.95, 80.0, 100.0]),
+    st.floats(min_value=0, max_value=100, allow_nan=False),
+)
+score_lists = st.lists(score_values, max_size=60)
+user_scores = st.one_of(score_values, st.floats(min_value=-50, max_value=150, allow_nan=False))
+
+
+# Reference implementations: the linear scans the services used to run per user
+
+def reference_percentile(user_score, all_scores):
+    if not all_scores:
+        return 0.0
+    if len(all_scores) == 1:
+        return 100.0
+    user_score = max(0, min(100, user_score))
+    users_below = sum(1 for score in all_scores if score < user_score)
+    return round((users_below / len(all_scores)) * 100, 1)
+
+
+def reference_rank_position(user_score, all_scores):
+    if len(all_scores) <= 1:
+        return 1
+    return sum(1 for score in all_scores if score > user_score) + 1
+
+
+def reference_statistics(scores):
+    if not scores:
+        return {"avg_score": 0.0, "median_score": 0.0, "min_score": 0.0, "max_score": 0.0, "total_users": 0}
+    sorted_scores = sorted(scores)
+    return {
+        "avg_score": round(sum(scores) / len(scores), 1),
+        "median_score": round(sorted_scores[len(scores) // 2], 1),
+        "min_score": round(min(scores), 1),
+        "max_score": round(max(scores), 1),
+        "total_users": len(scores)
+    }
+
+
+def reference_accurate_percentile(user_score, all_scores):
+    if not all_scores:
+        return {"percentile": 0.0, "rank": 1, "total": 0}
+    if len(all_scores) == 1:
+        return {"percentile": 100.0, "rank": 1, "total": 1}
+    below = sum(1 for score in all_scores if score < user_score)
+    equal = sum(1 for score in all_scores if score == user_score)
+    above = sum(1 for score in all_scores if score > user_score)
+    return {
+        "percentile": round((below / len(all_scores)) * 100, 1),
+        "rank": above + 1,
+        "total": len(all_scores),
+        "scores_above": above,
+        "scores_equal": equal,
+        "scores_below": below
+    }
+
+
+def reference_distribution(scores):
+    distribution = {"0-20": 0, "20-40": 0, "40-60": 0, "60-80": 0, "80-100": 0}
+    for score in scores:
+        if score < 20:
+            distribution["0-20"] += 1
+        elif score < 40:
+            distribution["20-40"] += 1
+        elif score < 60:
+            distribution["40-60"] += 1
+        elif score < 80:
+            distribution["60-80"] += 1
+        else:
+            distribution["80-100"] += 1
+    return distribution
+
+
+def reference_rank_and_percentile(user_score, all_scores):
+    if not all_scores:
+        return 1, 100.0, 1
+    rank = 1
+    for score in sorted(all_scores, reverse=True):
+        if score > user_score:
+            rank += 1
+        else:
+            break
+    total = len(all_scores)
+    percentile = ((total - rank) / total * 100) if total > 1 else 100.0
+    return rank, round(percentile, 1), total
+
+
+def _services():
+    return RankingService(None), EnhancedRankingService(None)
+
+
+class TestScoreDistributionProperties:
+    """Vectorized ranking math matches the per-user scans it replaced"""
+
+    @given(score_lists, user_scores)
+    @settings(max_examples=200, deadline=None)
+    def test_property_ranking_service_scalars_match(self, scores, user_score):
+        """calculate_percentile() and calculate_rank_position() keep their semantics"""
+        service, _ = _services()
+
+        assert service.calculate_percentile(user_score, scores) == reference_percentile(user_score, scores)
+        assert service.calculate_rank_position(user_score, scores) == reference_rank_position(user_score, scores)
+
+    @given(score_lists)
+    @settings(max_examples=200, deadline=None)
+    def test_property_statistics_match(self, scores):
+        """calculate_statistics() keeps the upper median and left-to-right average"""
+        service, _ = _services()
+
+        assert service.calculate_statistics(scores) == reference_statistics(scores)
+
+    @given(st.lists(st.floats(min_value=-20, max_value=120, allow_nan=False), min_size=1, max_size=60))
+    @settings(max_examples=200, deadline=None)
+    def test_property_group_rankings_match_per_user(self, scores):
+        """One group call equals calling the scalar methods for every user"""
+        service, _ = _services()
+
+        percentiles, ranks, stats = service.calculate_group_rankings(scores)
+
+        assert percentiles == [reference_percentile(score, scores) for score in scores]
+        assert ranks == [reference_rank_position(score, scores) for score in scores]
+        assert stats == reference_statistics(scores)
+
+    @given(score_lists, user_scores)
+    @settings(max_examples=200, deadline=None)
+    def test_property_accurate_percentile_matches(self, scores, user_score):
+        """calculate_accurate_percentile() keeps its counts, rank and percentile"""
+        _, enhanced = _services()
+
+        assert enhanced.calculate_accurate_percentile(user_score, scores) == \
+            reference_accurate_percentile(user_score, scores)
+
+    @given(st.lists(score_values, min_size=1, max_size=60))
+    @settings(max_examples=200, deadline=None)
+    def test_property_batch_percentiles_match(self, scores):
+        """Batch rankings and the descending-order median match the per-user path"""
+        _, enhanced = _services()
+        distribution = ScoreDistribution(scores)
+
+        rankings = enhanced._accurate_percentiles(distribution, scores)
+
+        for score, ranking in zip(scores, rankings):
+            expected = reference_accurate_percentile(score, scores)
+            assert (ranking["percentile"], ranking["rank"]) == (expected["percentile"], expected["rank"])
+        assert distribution.lower_median == sorted(scores, reverse=True)[len(scores) // 2]
+        assert distribution.mean == sum(scores) / len(scores)
+
+    @given(score_lists)
+    @settings(max_examples=200, deadline=None)
+    def test_property_distribution_matches(self, scores):
+        """Histogram buckets via searchsorted equal the if/elif bucketing"""
+        _, enhanced = _services()
+
+        assert enhanced._calculate_distribution(scores) == reference_distribution(scores)
+
+    @given(score_lists, user_scores)
+    @settings(max_examples=200, deadline=None)
+    def test_property_calculator_rank_and_percentile_match(self, scores, user_score):
+        """Both calculators' _calculate_rank_and_percentile() keep their semantics"""
+        expected = reference_rank_and_percentile(user_score, scores)
+
+        for calculator_class in (RegionalRankingCalculator, UniversityRankingCalculator):
+            calculator = calculator_class.__new__(calculator_class)
+            assert calculator._calculate_rank_and_percentile(user_score, scores) == expected
+
+    @given(st.lists(score_values, min_size=1, max_size=60))
+    @settings(max_examples=100, deadline=None)
+    def test_property_quartiles_are_ordered_order_statistics(self, scores):
+        """Quartiles are nearest-rank order statistics around the upper median"""
+        distribution = ScoreDistribution(scores)
+        sorted_scores = sorted(scores)
+
+        q1, median, q3 = distribution.quartiles()
+
+        assert q1 <= median <= q3
+        assert median == distribution.median == sorted_scores[len(scores) // 2]
+        assert (q1, q3) == (sorted_scores[len(scores) // 4], sorted_scores[(3 * len(scores)) // 4])
+
+    @pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy not installed")
+    @given(score_lists, st.lists(user_scores, max_size=10))
+    @settings(max_examples=100, deadline=None)
+    def test_property_pure_python_fallback_matches(self, scores, values):
+        """The bisect fallback answers exactly like the NumPy path"""
+        vectorized = ScoreDistribution(scores)
+
+        score_distribution.NUMPY_AVAILABLE = False
+        try:
+            fallback = ScoreDistribution(scores)
+            assert fallback.counts(values) == vectorized.counts(values)
+            assert fallback.competition_ranks(values) == vectorized.competition_ranks(values)
+            assert fallback.percentiles(values) == vectorized.percentiles(values)
+            assert fallback.rank_percentiles(values) == vectorized.rank_percentiles(values)
+            assert fallback.histogram() == vectorized.histogram()
+            assert fallback.summary() == vectorized.summary()
+        finally:
+            score_distribution.NUMPY_AVAILABLE = NUMPY_AVAILABLE
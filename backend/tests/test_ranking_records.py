@@ -0,0 +1,101 @@
+"""
+Tests for compact ranking records and their projection-fed storage queries
+"""
+
+import pytest
+
+from app.models.ranking import RankedGroup, RankedUser, ranked_user_projection
+from app.services.ranking import RegionalRankingCalculator
+from app.services.storage import UserStorageService
+
+PROFILES = [
+    {
+        'user_id': f'user_{i}',
+        'github_username': f'dev{i}',
+        'full_name': f'Developer {i}',
+        'description': 'x' * 200,
+        'university': 'Anna University' if i % 2 else 'Madras University',
+        'university_short': 'anna' if i % 2 else 'madras',
+        'nationality': 'Indian',
+        'state': 'Tamil Nadu',
+        'district': 'Madurai',
+        'region': 'IN' if i < 8 else 'US',
+        # Ties at 50.0 and 70.0
+        'overall_score': [50.0, 70.0, 50.0, 90.5, 70.0, 20.0, 65.0, 50.0, 80.0, 40.0][i],
+        'analysis_completed': True,
+    }
+    for i in range(10)
+]
+
+
+@pytest.fixture
+def database():
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    return mongomock_motor.AsyncMongoMockClient()['ranking_records']
+
+
+async def _seed(database):
+    await database.user_profiles.insert_many([dict(profile) for profile in PROFILES])
+
+
+class TestRankedRecords:
+    """Records keep only the ranking fields, in slots"""
+
+    def test_records_have_no_instance_dict(self):
+        user = RankedUser.from_document(PROFILES[0], 'full_name')
+
+        assert not hasattr(user, '__dict__')
+        assert (user.user_id, user.name, user.overall_score, user.region) == ('user_0', 'Developer 0', 50.0, 'IN')
+
+    def test_projection_loads_only_ranking_fields(self):
+        projection = ranked_user_projection('full_name')
+
+        assert projection['full_name'] == 1
+        assert projection['_id'] == 0
+        assert 'description' not in projection
+
+    def test_group_scores_follow_users(self):
+        group = RankedGroup([RankedUser.from_document(doc, 'full_name') for doc in PROFILES])
+
+        assert len(group) == len(PROFILES)
+        assert group.score_list() == [doc['overall_score'] for doc in PROFILES]
+
+
+class TestRankedStorageQueries:
+    """Projection queries return the same users, in the same order, as the model queries"""
+
+    @pytest.mark.asyncio
+    async def test_ranked_users_by_region_match_profiles(self, database):
+        await _seed(database)
+        storage = UserStorageService(database)
+
+        profiles = await storage.get_users_by_region('IN')
+        records = await storage.get_ranked_users_by_region('IN')
+
+        assert [(r.user_id, r.name, r.overall_score) for r in records] == [
+            (p.user_id, p.full_name, p.overall_score) for p in profiles
+        ]
+
+    @pytest.mark.asyncio
+    async def test_ranked_users_by_university_match_profiles(self, database):
+        await _seed(database)
+        storage = UserStorageService(database)
+
+        profiles = await storage.get_users_by_university('Anna University')
+        records = await storage.get_ranked_users_by_university('Anna University')
+
+        assert [(r.user_id, r.university_short) for r in records] == [
+            (p.user_id, p.university_short) for p in profiles
+        ]
+
+    @pytest.mark.asyncio
+    async def test_region_rankings_are_stored_from_records(self, database):
+        await _seed(database)
+
+        count = await RegionalRankingCalculator(database).calculate_region_rankings('IN')
+
+        stored = await database.regional_scores.find({}, {'_id': 0}).sort('rank_in_region', 1).to_list(None)
+        assert count == 8
+        assert [doc['rank_in_region'] for doc in stored] == list(range(1, 9))
+        assert stored[0]['name'] == 'Developer 3'
+        assert stored[0]['percentile_region'] == 87.5
@@ -0,0 +1,320 @@
+"""
+Tests for batched pull request and issue activity over GraphQL
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app.services.github_api_service import GitHubAPIService
+from app.services.github_graphql_client import USER_ACTIVITY_SEARCHES, GitHubGraphQLClient
+from app.services.issue_analyzer import IssueAnalyzer
+from app.services.pull_request_analyzer import PullRequestAnalyzer
+from app.services.repository_activity import summarize_issues, summarize_pull_requests
+
+
+def _pull_request_node(number, state, author='octocat', **fields):
+    node = {
+        'number': number,
+        'title': f'PR {number}',
+        'state': state,
+        'merged': state == 'MERGED',
+        'url': f'https://github.com/o/r/pull/{number}',
+        'createdAt': '2024-01-01T00:00:00Z',
+        'updatedAt': '2024-01-03T00:00:00Z',
+        'closedAt': '2024-01-02T12:00:00Z' if state != 'OPEN' else None,
+        'mergedAt': '2024-01-02T12:00:00Z' if state == 'MERGED' else None,
+        'additions': 10 * number,
+        'deletions': number,
+        'changedFiles': 2,
+        'author': {'login': author},
+        'commits': {'totalCount': 1},
+        'labels': {'nodes': [{'name': 'enhancement'}]},
+    }
+    node.update(fields)
+    return node
+
+
+def _issue_node(number, state, author='octocat', **fields):
+    node = {
+        'number': number,
+        'title': f'Issue {number}',
+        'state': state,
+        'url': f'https://github.com/o/r/issues/{number}',
+        'createdAt': '2024-01-01T00:00:00Z',
+        'updatedAt': '2024-01-03T00:00:00Z',
+        'closedAt': '2024-01-01T06:00:00Z' if state == 'CLOSED' else None,
+        'author': {'login': author},
+        'labels': {'nodes': [{'name': 'bug'}]},
+    }
+    node.update(fields)
+    return node
+
+
+def _repository_node(pull_requests=(), issues=()):
+    def count(nodes, state=None):
+        return {'totalCount': len([node for node in nodes if state is None or node['state'] == state])}
+
+    return {
+        'pullRequests': count(pull_requests),
+        'openPullRequests': count(pull_requests, 'OPEN'),
+        'closedPullRequests': count(pull_requests, 'CLOSED'),
+        'mergedPullRequests': count(pull_requests, 'MERGED'),
+        'recentPullRequests': {'nodes': list(pull_requests)},
+        'issues': count(issues),
+        'openIssues': count(issues, 'OPEN'),
+        'closedIssues': count(issues, 'CLOSED'),
+        'recentIssues': {'nodes': list(issues)},
+    }
+
+
+def _fake_execute(nodes_by_repository, queries):
+    """execute_query stand-in answering each aliased repository from nodes_by_repository"""
+    async def execute_query(query, variables=None, allow_partial=False):
+        queries.append((query, variables))
+        data = {}
+        index = 0
+        while f'owner{index}' in variables:
+            full_name = f"{variables[f'owner{index}']}/{variables[f'name{index}']}"
+            data[f'repository{index}'] = nodes_by_repository.get(full_name)
+            index += 1
+        for alias in USER_ACTIVITY_SEARCHES:
+            if alias in variables:
+                data[alias] = {'issueCount': len(alias)}
+        return data
+    return execute_query
+
+
+def reference_pull_request_statistics(prs):
+    """The per-repository REST shaping the scan task used before batching"""
+    open_prs = [pr for pr in prs if pr.get('state') == 'open']
+    closed_prs = [pr for pr in prs if pr.get('state') == 'closed' and not pr.get('merged_at')]
+    merged_prs = [pr for pr in prs if pr.get('merged_at')]
+    merge_times = []
+    for pr in merged_prs:
+        created = datetime.fromisoformat(pr['created_at'].replace('Z', '+00:00'))
+        merged = datetime.fromisoformat(pr['merged_at'].replace('Z', '+00:00'))
+        merge_times.append((merged - created).total_seconds() / 3600)
+    additions = [pr.get('additions', 0) for pr in prs if pr.get('additions')]
+    deletions = [pr.get('deletions', 0) for pr in prs if pr.get('deletions')]
+    return {
+        'total': len(prs),
+        'open': len(open_prs),
+        'closed': len(closed_prs),
+        'merged': len(merged_prs),
+        'recent': [
+            {
+                'number': pr.get('number'),
+                'title': pr.get('title'),
+                'author': pr.get('user', {}).get('login', 'unknown'),
+                'state': 'merged' if pr.get('merged_at') else pr.get('state', 'open'),
+                'createdAt': pr.get('created_at'),
+                'mergedAt': pr.get('merged_at'),
+                'url': pr.get('html_url', '')
+            }
+            for pr in prs[:10]
+        ],
+        'avgTimeToMerge': sum(merge_times) / len(merge_times) if merge_times else None,
+        'avg_additions': sum(additions) / len(additions) if additions else None,
+        'avg_deletions': sum(deletions) / len(deletions) if deletions else None
+    }
+
+
+class TestRepositoryActivityQuery:
+    """One aliased query answers counts and recent items for a batch of repositories"""
+
+    def test_query_aliases_repositories_and_user_searches(self):
+        query, variables = GitHubGraphQLClient._repository_activity_query(['o/a', 'o/b'], 'octocat', 5, False)
+
+        assert 'repository1: repository(owner: $owner1, name: $name1)' in query
+        assert 'mergedPullRequests: pullRequests(states: MERGED)' in query
+        assert 'authoredMergedPullRequests: search(query: $authoredMergedPullRequests, type: ISSUE)' in query
+        assert variables['authoredMergedPullRequests'] == 'is:pr is:merged author:octocat'
+        assert (variables['name1'], variables['itemsFirst'], variables['withItems']) == ('b', 5, True)
+
+    def test_user_only_query_declares_no_repository_fragments(self):
+        query, variables = GitHubGraphQLClient._repository_activity_query([], 'octocat', 5, False)
+
+        assert 'fragment' not in query
+        assert 'itemsFirst' not in variables
+
+    @pytest.mark.asyncio
+    async def test_batches_repositories_and_counts_user_once(self, monkeypatch):
+        queries = []
+        nodes = {
+            f'o/r{index}': _repository_node(
+                [_pull_request_node(1, 'MERGED'), _pull_request_node(2, 'CLOSED'), _pull_request_node(3, 'OPEN')],
+                [_issue_node(4, 'CLOSED')]
+            )
+            for index in range(25)
+        }
+        client = GitHubGraphQLClient('token')
+        monkeypatch.setattr(client, 'execute_query', _fake_execute(nodes, queries))
+
+        activity = await client.get_repository_activity(list(nodes), username='octocat')
+
+        assert len(queries) == 3
+        assert sum('authoredIssues' in variables for _, variables in queries) == 1
+        assert len(activity['repositories']) == 25
+        assert activity['user']['issues']['total'] == len('authoredIssues')
+
+        pull_requests = activity['repositories']['o/r7']['pull_requests']
+        assert (pull_requests['total'], pull_requests['open'], pull_requests['closed'], pull_requests['merged']) == (3, 1, 1, 1)
+        merged = pull_requests['items'][0]
+        assert (merged['state'], merged['merged'], merged['user']['login']) == ('closed', True, 'octocat')
+        assert activity['repositories']['o/r7']['issues']['items'][0]['labels'] == [{'name': 'bug'}]
+
+
+class _Response:
+    status = 200
+    headers = {}
+
+    def __init__(self, body):
+        self.body = body
+
+    async def json(self, content_type=None):
+        return self.body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class _Pool:
+    """HTTP pool stand-in answering every GraphQL request with one body"""
+
+    def __init__(self, body):
+        self.body = body
+
+    def request(self, method, url, **kwargs):
+        return _Response(self.body)
+
+
+class TestPartialResults:
+    """A repository GitHub cannot resolve fails only its own alias"""
+
+    @pytest.mark.asyncio
+    async def test_errored_aliases_are_skipped(self, monkeypatch):
+        from app.services import github_graphql_client
+
+        body = {
+            'data': {'repository0': _repository_node([_pull_request_node(1, 'OPEN')]), 'repository1': None},
+            'errors': [{'type': 'NOT_FOUND', 'path': ['repository1'], 'message': 'Could not resolve to a Repository'}]
+        }
+        monkeypatch.setattr(github_graphql_client, 'get_http_pool', lambda: _Pool(body))
+
+        activity = await GitHubGraphQLClient('token').get_repository_activity(['o/a', 'o/gone'])
+
+        assert list(activity['repositories']) == ['o/a']
+        assert activity['repositories']['o/a']['pull_requests']['open'] == 1
+
+    @pytest.mark.asyncio
+    async def test_errors_without_a_path_still_fail_the_query(self, monkeypatch):
+        from app.services import github_graphql_client
+
+        body = {'data': None, 'errors': [{'message': 'Something went wrong'}]}
+        monkeypatch.setattr(github_graphql_client, 'get_http_pool', lambda: _Pool(body))
+
+        with pytest.raises(Exception):
+            await GitHubGraphQLClient('token').execute_query('query { viewer { login } }', allow_partial=True)
+
+
+class TestRepositoryActivityConsumers:
+    """Scans, counts and analyzers read the batched activity"""
+
+    @pytest.mark.asyncio
+    async def test_summaries_match_rest_shaping(self, monkeypatch):
+        queries = []
+        client = GitHubGraphQLClient('token')
+        monkeypatch.setattr(client, 'execute_query', _fake_execute({'o/r': _repository_node(
+            [_pull_request_node(1, 'MERGED'), _pull_request_node(2, 'CLOSED'), _pull_request_node(3, 'OPEN')],
+            [_issue_node(4, 'CLOSED'), _issue_node(5, 'OPEN', labels={'nodes': []})]
+        )}, queries))
+
+        activity = (await client.get_repository_activity(['o/r']))['repositories']['o/r']
+
+        pull_requests = summarize_pull_requests(activity['pull_requests'])
+        assert pull_requests == reference_pull_request_statistics(activity['pull_requests']['items'])
+        assert pull_requests['avgTimeToMerge'] == 36.0
+
+        issues = summarize_issues(activity['issues'])
+        assert (issues['total'], issues['open'], issues['closed']) == (2, 1, 1)
+        assert issues['avgTimeToClose'] == 6.0
+        assert issues['labelsDistribution'] == {'bug': 1}
+        assert summarize_issues({'total': 0, 'open': 0, 'closed': 0, 'items': []}) is None
+
+    @pytest.mark.asyncio
+    async def test_pr_issue_counts_query_once_and_cache(self, monkeypatch):
+        queries = []
+        nodes = {'o/a': _repository_node([_pull_request_node(1, 'MERGED')]), 'o/b': _repository_node()}
+        execute = _fake_execute(nodes, queries)
+
+        async def execute_query(self, query, variables=None, allow_partial=False):
+            return await execute(query, variables)
+
+        # The service builds its own client, so patch the class
+        monkeypatch.setattr(GitHubGraphQLClient, 'execute_query', execute_query)
+
+        service = GitHubAPIService('token', cache_service=_MemoryCache())
+        counts = await service.get_pr_issue_counts_batch(['o/a', 'o/b'])
+        again = await service.get_pr_issue_counts('o', 'a')
+
+        assert len(queries) == 1
+        assert queries[0][1]['withItems'] is False
+        assert counts['o/a']['pull_requests'] == {'total': 1, 'open': 0, 'closed': 0, 'merged': 1}
+        assert again == counts['o/a']
+
+    @pytest.mark.asyncio
+    async def test_analyzers_use_one_query_for_all_repositories(self, monkeypatch):
+        queries = []
+        reviewed = _pull_request_node(
+            1, 'MERGED', body='Breaking change to the API',
+            files={'nodes': [{'path': 'tests/test_api.py'}]},
+            reviews={'totalCount': 1, 'nodes': [
+                {'author': {'login': 'reviewer'}, 'state': 'APPROVED', 'submittedAt': '2024-01-01T02:00:00Z'}
+            ]},
+            comments={'totalCount': 3}
+        )
+        nodes = {
+            'octocat/a': _repository_node([reviewed, _pull_request_node(2, 'OPEN', author='someone')],
+                                          [_issue_node(3, 'OPEN', assignees={'nodes': [{'login': 'dev'}]},
+                                                       milestone=None, body='', comments={'totalCount': 0})]),
+            'octocat/b': _repository_node(),
+        }
+        repositories = [{'full_name': name, 'name': name.split('/')[1], 'owner': {'login': 'octocat'}} for name in nodes]
+
+        pr_analyzer = PullRequestAnalyzer('token')
+        issue_analyzer = IssueAnalyzer('token')
+        monkeypatch.setattr(pr_analyzer.graphql_client, 'execute_query', _fake_execute(nodes, queries))
+        monkeypatch.setattr(issue_analyzer.graphql_client, 'execute_query', _fake_execute(nodes, queries))
+
+        pr_analysis = await pr_analyzer.analyze_repositories_pull_requests(repositories)
+        issue_analysis = await issue_analyzer.analyze_repositories_issues(repositories)
+
+        assert len(queries) == 2
+        assert pr_analysis['summary']['total_pull_requests'] == 1
+        assert pr_analysis['summary']['merge_rate'] == 100.0
+        assert pr_analysis['summary']['repositories_with_prs'] == 1
+        assert pr_analysis['collaboration']['unique_reviewers'] == ['reviewer']
+        pr_data = pr_analysis['repository_breakdown'][0]['pull_requests'][0]
+        assert (pr_data['has_tests'], pr_data['is_breaking_change'], pr_data['approved_reviews']) == (True, True, 1)
+        assert pr_data['time_to_first_review_hours'] == 2.0
+
+        assert issue_analysis['summary']['total_issues'] == 1
+        assert issue_analysis['collaboration']['unique_assignees'] == ['dev']
+        assert issue_analysis['repository_breakdown'][0]['issues'][0]['issue_type'] == 'bug'
+
+
+class _MemoryCache:
+    """CacheService stand-in keeping values in a dictionary"""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key, prefix=""):
+        return self.values.get((prefix, key))
+
+    async def set(self, key, value, prefix="", ttl=None):
+        self.values[(prefix, key)] = value
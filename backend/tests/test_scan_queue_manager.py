@@ -0,0 +1,254 @@
+"""
+Tests for ScanQueueManager fair scheduling, admission control and start-time estimates
+"""
+
+import asyncio
+import sys
+import types
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services import concurrent_data_fetcher
+from app.services.concurrent_data_fetcher import RequestPriority
+from app.services.scan_queue_manager import (
+    HR_REFRESH_OWNER,
+    FairScanQueue,
+    ResourceMonitor,
+    ScanJob,
+    ScanQueueManager,
+    ScanStatus,
+    ScanType,
+)
+
+
+def _manager(max_concurrent_scans: int = 1, **monitor_kwargs) -> ScanQueueManager:
+    manager = ScanQueueManager(
+        max_concurrent_scans=max_concurrent_scans,
+        admission_retry_interval=0.02,
+        resource_monitor=ResourceMonitor(**monitor_kwargs)
+    )
+    manager.order = []
+
+    async def record(job: ScanJob):
+        manager.order.append(job.target)
+        await asyncio.sleep(job.parameters.get('delay', 0))
+        if job.parameters.get('fail'):
+            raise RuntimeError(f"scan of {job.target} failed")
+        return {'target': job.target}
+
+    for scan_type in (ScanType.QUICK_SCAN, ScanType.DEEP_ANALYSIS, ScanType.HR_REFRESH):
+        manager.register_executor(scan_type, record)
+    return manager
+
+
+async def _drain(manager: ScanQueueManager, timeout: float = 5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while manager.job_queue.qsize() or manager.active_jobs:
+        assert asyncio.get_running_loop().time() < deadline, "queue did not drain"
+        await asyncio.sleep(0.01)
+
+
+class TestFairQueuing:
+    """Per-owner round robin within a priority class"""
+
+    @pytest.mark.asyncio
+    async def test_bulk_hr_refresh_does_not_starve_developer_scans(self):
+        manager = _manager()
+        for i in range(5):
+            await manager.submit_scan_job(ScanType.HR_REFRESH, HR_REFRESH_OWNER, f'candidate-{i}')
+        await manager.submit_scan_job(ScanType.QUICK_SCAN, 'dev-a', 'alice')
+        await manager.submit_scan_job(ScanType.QUICK_SCAN, 'dev-b', 'bob')
+
+        await manager.start()
+        try:
+            await _drain(manager)
+        finally:
+            await manager.stop()
+
+        assert manager.order[:4] == ['candidate-0', 'alice', 'bob', 'candidate-1']
+        assert manager.order[4:] == ['candidate-2', 'candidate-3', 'candidate-4']
+
+    @pytest.mark.asyncio
+    async def test_higher_priority_class_runs_first(self):
+        manager = _manager()
+        await manager.submit_scan_job(ScanType.HR_REFRESH, HR_REFRESH_OWNER, 'candidate', priority=RequestPriority.LOW)
+        await manager.submit_scan_job(ScanType.QUICK_SCAN, 'dev-a', 'alice', priority=RequestPriority.HIGH)
+
+        await manager.start()
+        try:
+            await _drain(manager)
+        finally:
+            await manager.stop()
+
+        assert manager.order == ['alice', 'candidate']
+
+
+    def test_passed_over_low_class_is_promoted(self):
+        queue = FairScanQueue(aging_dispatches=2)
+        for i in range(3):
+            queue.put(ScanJob(id=f'low-{i}', scan_type=ScanType.HR_REFRESH, user_id=HR_REFRESH_OWNER,
+                              target=f'candidate-{i}', priority=RequestPriority.LOW))
+        for i in range(8):
+            queue.put(ScanJob(id=f'normal-{i}', scan_type=ScanType.QUICK_SCAN, user_id=f'dev-{i}', target=f'user-{i}'))
+
+        dispatched = []
+        while queue.qsize():
+            job = queue.ordered()[0]
+            queue.take(job)
+            dispatched.append(job.target)
+
+        # LOW ties NORMAL after two skips and overtakes it after four, then starts over
+        assert dispatched[:10] == [
+            'user-0', 'user-1', 'user-2', 'user-3', 'candidate-0',
+            'user-4', 'user-5', 'user-6', 'user-7', 'candidate-1'
+        ]
+
+    def test_strict_priority_without_aging(self):
+        queue = FairScanQueue()
+        queue.put(ScanJob(id='low', scan_type=ScanType.HR_REFRESH, user_id=HR_REFRESH_OWNER,
+                          target='candidate', priority=RequestPriority.LOW))
+        for i in range(20):
+            queue.put(ScanJob(id=f'normal-{i}', scan_type=ScanType.QUICK_SCAN, user_id=f'dev-{i}', target=f'user-{i}'))
+
+        dispatched = []
+        while queue.qsize():
+            job = queue.ordered()[0]
+            queue.take(job)
+            dispatched.append(job.target)
+
+        assert dispatched[-1] == 'candidate'
+
+
+class TestHRRefresh:
+    """HR refresh jobs carry only the routing headers, never the live request"""
+
+    @pytest.mark.asyncio
+    async def test_scan_receives_a_request_with_the_routing_headers(self, monkeypatch):
+        seen = {}
+
+        async def scan_external_github_user(username, request, force_refresh=False):
+            seen.update(username=username, force_refresh=force_refresh, headers=dict(request.headers))
+            return {'username': username}
+
+        monkeypatch.setitem(sys.modules, 'app.routers.scan', types.SimpleNamespace(
+            scan_external_github_user=scan_external_github_user
+        ))
+        manager = ScanQueueManager(max_concurrent_scans=1, admission_retry_interval=0.02)
+        await manager.start()
+        try:
+            result = await manager.run_scan_job(
+                ScanType.HR_REFRESH, HR_REFRESH_OWNER, 'candidate',
+                parameters={'headers': {'X-User-Type': 'internal'}}
+            )
+        finally:
+            await manager.stop()
+
+        assert result == {'username': 'candidate'}
+        assert seen == {'username': 'candidate', 'force_refresh': True, 'headers': {'x-user-type': 'internal'}}
+
+
+class TestAdmissionControl:
+    """CPU, event-loop lag and GitHub rate-limit budget"""
+
+    def test_cpu_and_loop_lag_thresholds(self):
+        monitor = ResourceMonitor(max_cpu_percent=80.0, max_loop_lag=0.1)
+        job = ScanJob(id='j', scan_type=ScanType.QUICK_SCAN, user_id='u', target='t')
+
+        assert monitor.check_admission(job) is None
+        monitor.cpu_percent = 95.0
+        assert monitor.check_admission(job) == 'cpu'
+        monitor.cpu_percent = 10.0
+        monitor.loop_lag = 0.5
+        assert monitor.check_admission(job) == 'event_loop_lag'
+
+    @pytest.mark.asyncio
+    async def test_low_rate_limit_budget_admits_cheaper_jobs_first(self, monkeypatch):
+        reset_time = datetime.now() + timedelta(hours=1)
+        monkeypatch.setitem(
+            concurrent_data_fetcher.concurrent_fetcher.rate_limiter.api_limits,
+            'github_rest',
+            {'limit': 5000, 'remaining': 150, 'reset_time': reset_time}
+        )
+        manager = _manager(max_concurrent_scans=2, min_rate_limit_remaining=100)
+        deep_id = await manager.submit_scan_job(ScanType.DEEP_ANALYSIS, 'dev-a', 'deep')
+        await manager.submit_scan_job(ScanType.QUICK_SCAN, 'dev-b', 'quick')
+
+        await manager.start()
+        try:
+            await asyncio.sleep(0.1)
+
+            assert manager.order == ['quick']
+            assert (await manager.get_job_status(deep_id)).status == ScanStatus.QUEUED
+            assert manager.get_admission_status()['rejections']['rate_limit'] >= 1
+
+            # Quota resets: the deep analysis is admitted on the next check
+            monkeypatch.setitem(
+                concurrent_data_fetcher.concurrent_fetcher.rate_limiter.api_limits,
+                'github_rest',
+                {'limit': 5000, 'remaining': 5000, 'reset_time': reset_time}
+            )
+            await _drain(manager)
+        finally:
+            await manager.stop()
+
+        assert manager.order == ['quick', 'deep']
+
+
+class TestJobLifecycle:
+    """Estimates, results, failures and cancellation"""
+
+    @pytest.mark.asyncio
+    async def test_estimated_start_times_follow_dispatch_order(self):
+        manager = _manager(max_concurrent_scans=1)
+        ids = [await manager.submit_scan_job(ScanType.QUICK_SCAN, f'dev-{i}', f'user-{i}') for i in range(3)]
+
+        jobs = [await manager.get_job_status(job_id) for job_id in ids]
+        offsets = [(job.estimated_start_at - jobs[0].estimated_start_at).total_seconds() for job in jobs]
+
+        # Quick scans default to 5 s each with a single slot
+        assert offsets == pytest.approx([0.0, 5.0, 10.0], abs=0.01)
+        assert manager.get_queue_position(ids[2]) == 2
+        assert jobs[2].to_dict(position=2)['estimated_start_at'] is not None
+
+    @pytest.mark.asyncio
+    async def test_run_scan_job_returns_result_and_raises_failures(self):
+        manager = _manager(max_concurrent_scans=2)
+        await manager.start()
+        try:
+            result = await manager.run_scan_job(ScanType.QUICK_SCAN, 'dev-a', 'alice')
+            assert result == {'target': 'alice'}
+
+            with pytest.raises(RuntimeError, match='bob failed'):
+                await manager.run_scan_job(ScanType.QUICK_SCAN, 'dev-b', 'bob', parameters={'fail': True})
+
+            stats = await manager.get_queue_stats()
+            assert (stats.completed_jobs, stats.failed_jobs) == (1, 1)
+        finally:
+            await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_cancel_queued_and_running_jobs(self):
+        manager = _manager(max_concurrent_scans=1)
+        await manager.start()
+        try:
+            running_id = await manager.submit_scan_job(ScanType.QUICK_SCAN, 'dev-a', 'slow', parameters={'delay': 10})
+            queued_id = await manager.submit_scan_job(ScanType.QUICK_SCAN, 'dev-b', 'queued')
+            await asyncio.sleep(0.05)
+
+            assert await manager.cancel_job(queued_id)
+            assert await manager.cancel_job(running_id)
+            await _drain(manager)
+
+            assert (await manager.get_job_status(queued_id)).status == ScanStatus.CANCELLED
+            assert (await manager.get_job_status(running_id)).status == ScanStatus.CANCELLED
+            assert manager.order == ['slow']
+        finally:
+            await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_unregistered_scan_type_is_rejected(self):
+        manager = _manager()
+
+        with pytest.raises(ValueError):
+            await manager.submit_scan_job(ScanType.ISSUE_ANALYSIS, 'dev-a', 'repo')
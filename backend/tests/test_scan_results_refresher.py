@@ -0,0 +1,190 @@
+"""
+Tests for stale-while-revalidate serving of /scan/results
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services import cache_invalidation, scan_results_refresher as refresher_module
+from app.services.scan_results_refresher import SCAN_RESULTS_COLLECTION, ScanResultsRefresher
+from app.websocket import scan_websocket
+
+EMPTY = {"userId": "u1", "overallScore": 0}
+
+
+class _Collection:
+    """Minimal in-memory stand-in for a motor collection"""
+
+    def __init__(self):
+        self.documents = {}
+
+    async def find_one(self, query):
+        return self.documents.get(query["user_id"])
+
+    async def update_one(self, query, update, upsert=False):
+        document = self.documents.setdefault(query["user_id"], {"user_id": query["user_id"]})
+        document.update(update["$set"])
+
+    async def delete_one(self, query):
+        self.documents.pop(query["user_id"], None)
+
+
+class _Database(dict):
+    def __missing__(self, name):
+        self[name] = _Collection()
+        return self[name]
+
+
+@pytest.fixture
+def notifications(monkeypatch):
+    sent = []
+
+    async def broadcast_to_user(user_id, message):
+        sent.append((user_id, message))
+
+    monkeypatch.setattr(scan_websocket.websocket_manager, "broadcast_to_user", broadcast_to_user)
+    return sent
+
+
+class TestScanResultsRefresher:
+    """Serving persisted results and refreshing them in the background"""
+
+    @pytest.mark.asyncio
+    async def test_missing_result_returns_immediately_and_refreshes(self, notifications):
+        refresher = ScanResultsRefresher()
+        db = _Database()
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            return {"userId": "u1", "overallScore": 72.5}
+
+        first = await refresher.serve(db, "u1", compute, EMPTY)
+        assert first["overallScore"] == 0
+        assert first["freshness"] == {"computedAt": None, "stale": True, "refreshing": True}
+
+        release.set()
+        await refresher.wait_for_refresh("u1", timeout=1)
+
+        second = await refresher.serve(db, "u1", compute, EMPTY)
+        assert second["overallScore"] == 72.5
+        assert second["freshness"]["stale"] is False
+        assert second["freshness"]["computedAt"] is not None
+        assert [(user, message["type"]) for user, message in notifications] == [("u1", "scan_results_updated")]
+
+    @pytest.mark.asyncio
+    async def test_stale_result_is_served_while_one_refresh_runs(self, notifications):
+        refresher = ScanResultsRefresher(stale_after=60)
+        db = _Database()
+        db[SCAN_RESULTS_COLLECTION].documents["u1"] = {
+            "user_id": "u1",
+            "results": {"userId": "u1", "overallScore": 40},
+            "computed_at": datetime.utcnow() - timedelta(hours=2)
+        }
+        calls = []
+        release = asyncio.Event()
+
+        async def compute():
+            calls.append(1)
+            await release.wait()
+            return {"userId": "u1", "overallScore": 55}
+
+        responses = await asyncio.gather(*[refresher.serve(db, "u1", compute, EMPTY) for _ in range(5)])
+
+        assert all(r["overallScore"] == 40 and r["freshness"]["stale"] for r in responses)
+        release.set()
+        await refresher.wait_for_refresh("u1", timeout=1)
+
+        assert len(calls) == 1
+        assert refresher.get_stats()["refreshes_deduplicated"] == 4
+        assert db[SCAN_RESULTS_COLLECTION].documents["u1"]["results"]["overallScore"] == 55
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_last_result(self, notifications):
+        refresher = ScanResultsRefresher(stale_after=0)
+        db = _Database()
+        db[SCAN_RESULTS_COLLECTION].documents["u1"] = {
+            "user_id": "u1",
+            "results": {"userId": "u1", "overallScore": 40},
+            "computed_at": datetime.utcnow() - timedelta(minutes=5)
+        }
+
+        async def compute():
+            raise RuntimeError("GitHub unavailable")
+
+        response = await refresher.serve(db, "u1", compute, EMPTY)
+        await refresher.wait_for_refresh("u1", timeout=1)
+
+        assert response["overallScore"] == 40
+        assert refresher.get_stats()["refreshes_failed"] == 1
+        assert not refresher.is_refreshing("u1")
+        assert notifications == []
+
+
+class TestInvalidationOnCompletion:
+    """A finished scan or analysis drops the snapshot, so the next serve recomputes it"""
+
+    @staticmethod
+    def _fresh_snapshot(db):
+        db[SCAN_RESULTS_COLLECTION].documents["u1"] = {
+            "user_id": "u1",
+            "results": {"userId": "u1", "overallScore": 40},
+            "computed_at": datetime.utcnow()
+        }
+
+    @staticmethod
+    async def _serve_after_completion(refresher, db):
+        async def compute():
+            return {"userId": "u1", "overallScore": 81}
+
+        response = await refresher.serve(db, "u1", compute, EMPTY)
+        await refresher.wait_for_refresh("u1", timeout=1)
+        return response
+
+    @pytest.mark.asyncio
+    async def test_scan_completion_triggers_refresh(self, notifications, monkeypatch):
+        from app import db_connection
+
+        refresher = ScanResultsRefresher(stale_after=1800)
+        db = _Database()
+        self._fresh_snapshot(db)
+
+        async def get_database():
+            return db
+
+        monkeypatch.setattr(db_connection, "get_database", get_database)
+        monkeypatch.setattr(cache_invalidation, "scan_results_refresher", refresher)
+
+        assert await cache_invalidation.cache_invalidation_service.invalidate_on_scan_completion("u1", ["dev/repo"])
+        response = await self._serve_after_completion(refresher, db)
+
+        assert response["freshness"]["refreshing"] is True
+        assert refresher.get_stats()["refreshes_completed"] == 1
+        assert db[SCAN_RESULTS_COLLECTION].documents["u1"]["results"]["overallScore"] == 81
+
+    @pytest.mark.asyncio
+    async def test_analysis_completion_triggers_refresh(self, notifications, monkeypatch):
+        from app.services import analysis_jobs
+
+        refresher = ScanResultsRefresher(stale_after=1800)
+        db = _Database()
+        self._fresh_snapshot(db)
+        monkeypatch.setattr(refresher_module, "scan_results_refresher", refresher)
+        state = {
+            "analysis_id": "a1", "status": "complete", "username": "dev",
+            "scan_target": {"scan_collection": "internal_users", "results_user_id": "u1"}
+        }
+
+        async def update_one(query, update):
+            class _Result:
+                modified_count = 1
+            return _Result()
+
+        db["internal_users"].update_one = update_one
+        await analysis_jobs.handle_analysis_finished(state, db)
+        response = await self._serve_after_completion(refresher, db)
+
+        assert response["freshness"]["refreshing"] is True
+        assert db[SCAN_RESULTS_COLLECTION].documents["u1"]["results"]["overallScore"] == 81
@@ -0,0 +1,118 @@
+"""
+Tests for streaming repository evaluation with bounded per-file memory
+"""
+
+import gc
+import weakref
+
+import pytest
+
+from app.services.evaluation_engine import EvaluationEngine, _sample_content
+
+REPO_DATA = {'id': 1, 'name': 'repo'}
+
+PYTHON_SOURCE = '''"""Service module"""
+import os
+
+
+class Service:
+    """Wraps a client"""
+
+    def fetch(self, item):
+        if item:
+            return os.path.join("a", item)
+        return None
+'''
+
+FILES = [
+    {'name': 'service.py', 'path': 'src/service.py', 'content': PYTHON_SOURCE, 'language': 'Python'},
+    {'name': 'test_service.py', 'path': 'tests/test_service.py', 'content': 'def test_x():\n    assert 1\n',
+     'language': 'Python'},
+    {'name': 'README.md', 'path': 'README.md', 'content': '# Service\n## Installation\n`pip install`\n'},
+    {'name': 'ci.yml', 'path': '.github/workflows/ci.yml', 'content': 'steps:\n  - run: pytest\n'},
+    {'name': 'empty.js', 'path': 'src/empty.js', 'content': '', 'language': 'JavaScript'},
+]
+
+
+class FileDict(dict):
+    """A file dict that can be weakly referenced"""
+
+
+async def _stream(files):
+    for file_info in files:
+        yield file_info
+
+
+def _comparable(result):
+    result = dict(result)
+    result.pop('evaluation_timestamp')
+    result.pop('memory_profile')
+    return result
+
+
+class TestSampleContent:
+    """Oversized files are analyzed from whole head and tail lines"""
+
+    def test_small_content_is_untouched(self):
+        assert _sample_content('a\nb\n', 100) == ('a\nb\n', False)
+
+    def test_oversized_content_keeps_head_and_tail_lines(self):
+        content = ''.join(f'line {i}\n' for i in range(1000))
+
+        sampled, was_sampled = _sample_content(content, 200)
+
+        assert was_sampled
+        assert len(sampled) <= 200
+        assert sampled.startswith('line 0\n')
+        assert sampled.endswith('line 999\n')
+        assert all(line.startswith('line ') for line in sampled.split('\n') if line)
+
+
+class TestStreamingEvaluation:
+    """Streaming evaluation matches list evaluation without holding file contents"""
+
+    @pytest.mark.asyncio
+    async def test_stream_matches_list(self):
+        engine = EvaluationEngine()
+
+        listed = await engine.evaluate_repository(REPO_DATA, FILES, {'commits': []}, {})
+        streamed = await engine.evaluate_repository_stream(REPO_DATA, _stream(FILES), {'commits': []}, {})
+
+        assert _comparable(streamed) == _comparable(listed)
+        assert streamed['detailed_code_metrics']['total_files_analyzed'] == len(FILES)
+
+    @pytest.mark.asyncio
+    async def test_files_are_released_once_digested(self):
+        refs = []
+        released = []
+
+        async def files():
+            for source in FILES:
+                file_info = FileDict(source)
+                refs.append(weakref.ref(file_info))
+                yield file_info
+                del file_info
+                gc.collect()
+                released.append(refs[-1]() is None)
+
+        await EvaluationEngine().evaluate_repository_stream(REPO_DATA, files(), {'commits': []}, {})
+
+        assert released == [True] * len(FILES)
+
+    @pytest.mark.asyncio
+    async def test_memory_profile_reports_sampled_files(self):
+        engine = EvaluationEngine(max_file_bytes=256)
+        large = 'x = 1\n' * 200
+        files = FILES + [{'name': 'big.py', 'path': 'src/big.py', 'content': large, 'language': 'Python'}]
+
+        result = await engine.evaluate_repository_stream(REPO_DATA, _stream(files), {'commits': []}, {})
+
+        profile = result['memory_profile']
+        assert profile['files'] == len(files)
+        assert profile['sampled_files'] == 1
+        assert profile['peak_file_bytes'] == len(large)
+        assert profile['analyzed_bytes'] == sum(len(f['content']) for f in files)
+        assert profile['max_file_bytes'] == 256
+        assert set(profile) == {
+            'files', 'sampled_files', 'analyzed_bytes', 'peak_file_bytes', 'max_file_bytes', 'process_max_rss_bytes'
+        }